@@ -0,0 +1,33 @@
+"""Add keyset pagination index for files registry.
+
+Revision ID: 20261016_0003
+Revises: 20251201_0002
+Create Date: 2026-10-16 14:00:00.000000
+
+Keyset (cursor) пагинация GET /api/v1/files:
+- Partial index (created_at, file_id) для активных файлов (deleted_at IS NULL)
+- Условие (created_at, file_id) < (:created_at, :file_id) - range scan по индексу
+  вместо OFFSET
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261016_0003'
+down_revision = '20251201_0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_files_active_created_file_id',
+        'files',
+        ['created_at', 'file_id'],
+        unique=False,
+        postgresql_where=sa.text("deleted_at IS NULL")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_files_active_created_file_id', table_name='files')
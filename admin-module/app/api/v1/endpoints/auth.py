@@ -28,6 +28,7 @@ router = APIRouter()
     responses={
         401: {"model": OAuth2ErrorResponse, "description": "Invalid client credentials"},
         403: {"model": OAuth2ErrorResponse, "description": "Access denied"},
+        503: {"description": "Password hash pool saturated (Retry-After)"},
     },
     summary="OAuth 2.0 Token Endpoint (Client Credentials Grant)"
 )
@@ -54,6 +55,8 @@ async def oauth2_token(
 
     **Security:**
     - Client Secret передается один раз и хранится в bcrypt hash
+    - bcrypt выполняется в пуле потоков; повторная выдача токена с теми же
+      credentials в течение PASSWORD_CREDENTIAL_CACHE_TTL_SECONDS - без bcrypt
     - Access токен живет 30 минут
     - Refresh токен живет 7 дней
     - Автоматическая ротация secret каждые 90 дней
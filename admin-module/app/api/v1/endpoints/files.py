@@ -561,6 +561,8 @@ async def delete_file(
     **Pagination:**
     - page: Номер страницы (1-based, default: 1)
     - page_size: Размер страницы (1-1000, default: 50)
+    - cursor: Курсор next_cursor предыдущего ответа (keyset пагинация, page игнорируется)
+    - exact_total: false - total по оценке планировщика PostgreSQL вместо COUNT(*)
 
     **Filters:**
     - retention_policy: temporary или permanent
@@ -588,6 +590,15 @@ async def list_files(
         False,
         description="Включать ли удаленные файлы (требуется ADMIN роль)"
     ),
+    cursor: Optional[str] = Query(
+        None,
+        max_length=512,
+        description="Курсор следующей страницы (next_cursor предыдущего ответа)"
+    ),
+    exact_total: bool = Query(
+        True,
+        description="Точный total (COUNT(*)); false - оценка планировщика PostgreSQL"
+    ),
     db: AsyncSession = Depends(get_db),
     file_service: FileService = Depends(get_file_service),
     current_account: ServiceAccount = Depends(get_current_service_account)
@@ -601,6 +612,8 @@ async def list_files(
         retention_policy: Фильтр по retention policy
         storage_element_id: Фильтр по Storage Element
         include_deleted: Включать ли удаленные файлы
+        cursor: Курсор keyset пагинации
+        exact_total: Точный total или оценка планировщика
         db: Database session
         file_service: FileService instance
         current_account: Authenticated Service Account
@@ -609,6 +622,7 @@ async def list_files(
         FileListResponse: Список файлов с metadata
 
     Raises:
+        HTTPException 400: Некорректный cursor
         HTTPException 403: Недостаточно прав для include_deleted=True
     """
     # Материализуем атрибуты для избежания MissingGreenlet
@@ -641,14 +655,26 @@ async def list_files(
         }
     )
 
-    result = await file_service.list_files(
-        db=db,
-        page=page,
-        page_size=page_size,
-        retention_policy=retention_policy,
-        storage_element_id=storage_element_id,
-        include_deleted=include_deleted
-    )
+    try:
+        result = await file_service.list_files(
+            db=db,
+            page=page,
+            page_size=page_size,
+            retention_policy=retention_policy,
+            storage_element_id=storage_element_id,
+            include_deleted=include_deleted,
+            cursor=cursor,
+            exact_total=exact_total
+        )
+    except ValueError as e:
+        logger.warning(
+            "File list validation error",
+            extra={"error": str(e), "client_id": client_id}
+        )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
     logger.info(
         "File list retrieved",
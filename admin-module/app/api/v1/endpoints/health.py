@@ -4,7 +4,7 @@ Health check endpoints для Admin Module.
 Поддерживает liveness, readiness проверки и Prometheus metrics.
 
 ВАЖНО: Readiness probe использует асинхронную архитектуру:
-- Background job (APScheduler) периодически проверяет состояние БД и Redis
+- Background job (scheduler) периодически проверяет состояние БД и Redis
 - Результат сохраняется в HealthStateService
 - Endpoint /health/ready читает из кеша и отвечает мгновенно (без I/O операций)
 
@@ -0,0 +1,335 @@
+"""
+Asyncio scheduler периодических задач Admin Module.
+
+Задачи выполняются в event loop приложения и используют общие пулы
+PostgreSQL и Redis - без потоков APScheduler, asyncio.run() и
+standalone подключений на каждый запуск.
+
+- Интервальные задачи с jitter: реплики не запускают задачи одновременно
+- Без перекрытия: следующий запуск задачи - только после завершения
+  предыдущего, пропущенные интервалы не накапливаются
+- Leader lease в Redis: задачи leader_only выполняет одна реплика кластера
+- Prometheus: scheduler_job_duration_seconds{job},
+  scheduler_job_runs_total{job, result}, scheduler_leader
+"""
+
+import asyncio
+import logging
+import random
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.core.metrics import (
+    scheduler_job_duration_seconds,
+    scheduler_job_runs_total,
+    scheduler_leader,
+)
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] - ключ lease, ARGV: instance_id, lease_ms
+# Продление своего lease или захват свободного; 1 - экземпляр leader
+LEADER_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+    return 1
+end
+return 0
+"""
+
+# Освобождение lease только владельцем
+LEADER_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class LeaderLease:
+    """
+    Cluster-wide leader lease в Redis (SET NX PX с продлением владельцем).
+
+    Экземпляр считает себя leader до истечения 2/3 срока lease с момента
+    последнего успешного продления: при недоступности Redis leadership
+    теряется раньше, чем lease может захватить другая реплика.
+    """
+
+    def __init__(
+        self,
+        get_redis: Callable[[], Awaitable],
+        key: str = "scheduler:leader",
+        lease_seconds: int = 30,
+        instance_id: Optional[str] = None,
+    ):
+        """
+        Args:
+            get_redis: Coroutine функция, возвращающая redis.asyncio клиент
+            key: Ключ lease в Redis
+            lease_seconds: Время жизни lease
+            instance_id: Идентификатор экземпляра (по умолчанию hostname + uuid)
+        """
+        self._get_redis = get_redis
+        self.key = key
+        self.lease_seconds = lease_seconds
+        self.instance_id = instance_id or f"{socket.gethostname()}:{uuid.uuid4().hex[:8]}"
+        self._valid_until = 0.0
+
+    @property
+    def is_leader(self) -> bool:
+        return self._valid_until > time.monotonic()
+
+    @property
+    def renew_interval(self) -> float:
+        return self.lease_seconds / 3
+
+    async def refresh(self) -> bool:
+        """
+        Захват или продление lease.
+
+        Returns:
+            bool: Экземпляр является leader
+        """
+        was_leader = self.is_leader
+        started = time.monotonic()
+        try:
+            client = await self._get_redis()
+            acquired = await client.eval(
+                LEADER_LEASE_SCRIPT, 1, self.key, self.instance_id, int(self.lease_seconds * 1000)
+            )
+        except Exception as e:
+            logger.warning(f"Scheduler leader lease refresh failed: {e}")
+        else:
+            self._valid_until = started + self.lease_seconds * 2 / 3 if int(acquired) == 1 else 0.0
+
+        if self.is_leader != was_leader:
+            logger.info(
+                f"Scheduler leadership {'acquired' if self.is_leader else 'lost'}",
+                extra={"instance_id": self.instance_id}
+            )
+        scheduler_leader.set(1 if self.is_leader else 0)
+        return self.is_leader
+
+    async def release(self) -> None:
+        """Освобождение lease (shutdown) - другая реплика сразу становится leader."""
+        if self._valid_until == 0.0:
+            return
+
+        self._valid_until = 0.0
+        scheduler_leader.set(0)
+        try:
+            client = await self._get_redis()
+            await client.eval(LEADER_RELEASE_SCRIPT, 1, self.key, self.instance_id)
+        except Exception as e:
+            logger.warning(f"Scheduler leader lease release failed: {e}")
+
+
+@dataclass
+class ScheduledJob:
+    """Периодическая задача scheduler."""
+
+    id: str
+    name: str
+    func: Callable[[], Awaitable[None]]
+    interval_seconds: float
+    jitter_seconds: float = 0.0
+    leader_only: bool = False
+    next_run_time: Optional[datetime] = None
+    running: bool = False
+
+    def next_delay(self, elapsed: float = 0.0) -> float:
+        """Задержка до следующего запуска с учётом длительности предыдущего."""
+        jitter = random.uniform(0, self.jitter_seconds) if self.jitter_seconds > 0 else 0.0
+        return max(0.0, self.interval_seconds - elapsed) + jitter
+
+
+class AsyncScheduler:
+    """
+    Scheduler интервальных задач в event loop приложения.
+
+    Usage:
+        scheduler = AsyncScheduler(leader_lease=LeaderLease(get_redis))
+        scheduler.add_job(storage_health_check_job, "storage_health_check",
+                          "Storage Element Health Check", interval_seconds=60,
+                          jitter_seconds=5, leader_only=True)
+        scheduler.start()
+        ...
+        await scheduler.shutdown()
+    """
+
+    def __init__(
+        self,
+        leader_lease: Optional[LeaderLease] = None,
+        shutdown_timeout_seconds: float = 30,
+    ):
+        """
+        Args:
+            leader_lease: Leader lease для задач leader_only
+                (None - все задачи выполняются на каждом экземпляре)
+            shutdown_timeout_seconds: Ожидание выполняемых задач при shutdown
+        """
+        self.leader_lease = leader_lease
+        self.shutdown_timeout = shutdown_timeout_seconds
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._stopping: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks) and not self._stopping.is_set()
+
+    @property
+    def is_leader(self) -> bool:
+        return self.leader_lease is None or self.leader_lease.is_leader
+
+    def add_job(
+        self,
+        func: Callable[[], Awaitable[None]],
+        id: str,
+        name: str,
+        interval_seconds: float,
+        jitter_seconds: float = 0.0,
+        leader_only: bool = False,
+    ) -> ScheduledJob:
+        """
+        Регистрация периодической задачи (до start()).
+
+        Args:
+            func: Coroutine функция задачи
+            id: Идентификатор задачи (label метрик)
+            name: Название задачи
+            interval_seconds: Интервал между запусками
+            jitter_seconds: Максимальная случайная задержка запуска
+            leader_only: Выполнять только на экземпляре с leader lease
+
+        Returns:
+            ScheduledJob: Зарегистрированная задача
+        """
+        job = ScheduledJob(
+            id=id,
+            name=name,
+            func=func,
+            interval_seconds=interval_seconds,
+            jitter_seconds=jitter_seconds,
+            leader_only=leader_only,
+        )
+        self.jobs[id] = job
+        return job
+
+    def start(self) -> None:
+        """Запуск задач в текущем event loop (lifespan startup)."""
+        if self._tasks:
+            logger.warning("Scheduler already started")
+            return
+
+        self._stopping = asyncio.Event()
+        if self.leader_lease is not None and any(job.leader_only for job in self.jobs.values()):
+            self._tasks.append(asyncio.create_task(self._lease_loop(), name="scheduler:leader_lease"))
+        for job in self.jobs.values():
+            self._tasks.append(asyncio.create_task(self._job_loop(job), name=f"scheduler:{job.id}"))
+
+    async def shutdown(self) -> None:
+        """
+        Остановка scheduler (lifespan shutdown).
+
+        Выполняемые задачи завершаются в пределах shutdown_timeout,
+        затем отменяются. Leader lease освобождается.
+        """
+        if not self._tasks:
+            return
+
+        self._stopping.set()
+        _, pending = await asyncio.wait(self._tasks, timeout=self.shutdown_timeout)
+        for task in pending:
+            logger.warning(f"Scheduler task {task.get_name()} cancelled on shutdown")
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+        if self.leader_lease is not None:
+            await self.leader_lease.release()
+
+    async def run_job(self, job_id: str) -> str:
+        """
+        Однократный запуск задачи.
+
+        Returns:
+            str: Результат (success, error, skipped)
+        """
+        job = self.jobs[job_id]
+        if job.running:
+            # Предыдущий запуск ещё выполняется - без перекрытия
+            scheduler_job_runs_total.labels(job=job.id, result="skipped").inc()
+            return "skipped"
+
+        if job.leader_only and not self.is_leader:
+            logger.debug(f"Job {job.id} skipped: instance is not scheduler leader")
+            scheduler_job_runs_total.labels(job=job.id, result="skipped").inc()
+            return "skipped"
+
+        job.running = True
+        started = time.perf_counter()
+        result = "error"
+        try:
+            await job.func()
+            result = "success"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.id} raised exception: {e}", exc_info=True, extra={"job_id": job.id})
+        finally:
+            job.running = False
+            duration = time.perf_counter() - started
+            scheduler_job_duration_seconds.labels(job=job.id).observe(duration)
+            scheduler_job_runs_total.labels(job=job.id, result=result).inc()
+
+        logger.debug(f"Job {job.id} finished: {result} in {duration:.3f}s", extra={"job_id": job.id})
+        return result
+
+    async def _wait_stopping(self, delay: float) -> bool:
+        """Ожидание delay секунд; True - scheduler останавливается."""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _job_loop(self, job: ScheduledJob) -> None:
+        delay = job.next_delay()
+        while True:
+            job.next_run_time = datetime.now(timezone.utc) + timedelta(seconds=delay)
+            if await self._wait_stopping(delay):
+                return
+
+            started = time.monotonic()
+            await self.run_job(job.id)
+            delay = job.next_delay(elapsed=time.monotonic() - started)
+
+    async def _lease_loop(self) -> None:
+        while True:
+            await self.leader_lease.refresh()
+            if await self._wait_stopping(self.leader_lease.renew_interval):
+                return
+
+    def get_status(self) -> dict:
+        """Статус scheduler и его задач."""
+        return {
+            "running": self.running,
+            "leader": self.is_leader,
+            "jobs": [
+                {
+                    "id": job.id,
+                    "name": job.name,
+                    "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None,
+                    "pending": job.running,
+                    "leader_only": job.leader_only,
+                }
+                for job in self.jobs.values()
+            ],
+        }
@@ -431,6 +431,10 @@ class RateLimitSettings(BaseSettings):
     enabled: bool = Field(default=True, alias="RATE_LIMIT_ENABLED")
     requests_per_minute: int = Field(default=60, alias="RATE_LIMIT_REQUESTS_PER_MINUTE")
     burst: int = Field(default=10, alias="RATE_LIMIT_BURST")
+    window_seconds: int = Field(default=60, ge=1, le=3600, alias="RATE_LIMIT_WINDOW_SECONDS")
+    # Доля лимита Service Account, которую экземпляр получает из Redis за одно
+    # обращение и расходует локально (0 - каждый запрос проверяется в Redis)
+    local_fraction: float = Field(default=0.1, ge=0.0, le=0.5, alias="RATE_LIMIT_LOCAL_FRACTION")
 
     model_config = SettingsConfigDict(env_prefix="RATE_LIMIT_", case_sensitive=False, extra="allow")
 
@@ -550,6 +554,16 @@ class EventPublishingSettings(BaseSettings):
         alias="EVENT_STREAM_RETENTION_HOURS",
         description="Время хранения events в stream (часы)"
     )
+    stream_partitions: int = Field(
+        default=1,
+        ge=1,
+        le=256,
+        alias="EVENT_STREAM_PARTITIONS",
+        description=(
+            "Количество partition streams ({stream_name}:{N}, N = crc32(file_id) % partitions); "
+            "1 - единый stream без суффикса. Должно совпадать с Query Module"
+        )
+    )
 
     # Legacy Pub/Sub channels (deprecated, будут удалены после миграции)
     channel_file_created: str = Field(
@@ -693,12 +707,41 @@ class InitialAdminSettings(BaseSettings):
 
 
 class SchedulerSettings(BaseSettings):
-    """Настройки APScheduler для background задач."""
+    """Настройки asyncio scheduler для background задач."""
 
     enabled: bool = Field(default=True, alias="SCHEDULER_ENABLED")
     jwt_rotation_enabled: bool = Field(default=True, alias="SCHEDULER_JWT_ROTATION_ENABLED")
     jwt_rotation_interval_hours: int = Field(default=24, alias="SCHEDULER_JWT_ROTATION_INTERVAL_HOURS")
-    timezone: str = Field(default="UTC", alias="SCHEDULER_TIMEZONE")
+
+    # Случайная задержка запуска задач (не больше 10% интервала задачи)
+    jitter_seconds: float = Field(
+        default=5.0,
+        ge=0,
+        le=300,
+        alias="SCHEDULER_JITTER_SECONDS",
+        description="Максимальный jitter запуска задач в секундах (0-300)"
+    )
+
+    # Leader lease - тяжелые задачи выполняет одна реплика Admin Module
+    leader_election_enabled: bool = Field(
+        default=True,
+        alias="SCHEDULER_LEADER_ELECTION_ENABLED",
+        description="Выполнять кластерные задачи только на реплике с leader lease в Redis"
+    )
+    leader_lease_seconds: int = Field(
+        default=30,
+        ge=5,
+        le=300,
+        alias="SCHEDULER_LEADER_LEASE_SECONDS",
+        description="Время жизни leader lease в секундах (5-300)"
+    )
+    shutdown_timeout_seconds: int = Field(
+        default=30,
+        ge=1,
+        le=300,
+        alias="SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS",
+        description="Ожидание выполняемых задач при shutdown в секундах (1-300)"
+    )
 
     # Storage Health Check - периодический опрос состояния storage elements
     storage_health_check_enabled: bool = Field(
@@ -713,6 +756,20 @@ class SchedulerSettings(BaseSettings):
         alias="SCHEDULER_STORAGE_HEALTH_CHECK_INTERVAL_SECONDS",
         description="Интервал проверки storage elements в секундах (10-3600)"
     )
+    storage_health_check_concurrency: int = Field(
+        default=20,
+        ge=1,
+        le=200,
+        alias="SCHEDULER_STORAGE_HEALTH_CHECK_CONCURRENCY",
+        description="Максимум одновременных опросов storage elements (1-200)"
+    )
+    storage_health_check_timeout_seconds: int = Field(
+        default=5,
+        ge=1,
+        le=60,
+        alias="SCHEDULER_STORAGE_HEALTH_CHECK_TIMEOUT_SECONDS",
+        description="Таймаут опроса одного storage element в секундах (1-60)"
+    )
 
     # Readiness Health Check - периодическая проверка состояния БД и Redis для /health/ready
     readiness_check_enabled: bool = Field(
@@ -765,7 +822,7 @@ class SchedulerSettings(BaseSettings):
 
     model_config = SettingsConfigDict(env_prefix="SCHEDULER_", case_sensitive=False, extra="allow")
 
-    @field_validator("enabled", "jwt_rotation_enabled", "storage_health_check_enabled", "readiness_check_enabled", "gc_enabled", mode="before")
+    @field_validator("enabled", "jwt_rotation_enabled", "storage_health_check_enabled", "readiness_check_enabled", "gc_enabled", "leader_election_enabled", mode="before")
     @classmethod
     def parse_bool_fields(cls, v):
         """Парсинг boolean полей из environment variables."""
@@ -907,6 +964,25 @@ class SecuritySettings(BaseSettings):
         return v
 
 
+class AuditSettings(BaseSettings):
+    """
+    Настройки фоновой записи audit logs (AuditMiddleware).
+
+    Middleware только ставит запись в очередь; AuditWriter пишет пакеты
+    multi-row INSERT. Пакет, не записанный за write_timeout_seconds (или при
+    ошибке PostgreSQL), дописывается в локальный append-only файл spill_path
+    и переносится в audit_logs после восстановления записи.
+    """
+
+    queue_size: int = Field(default=10000, ge=100, le=1000000, alias="AUDIT_QUEUE_SIZE")
+    flush_size: int = Field(default=200, ge=1, le=1000, alias="AUDIT_FLUSH_SIZE")
+    flush_interval_ms: int = Field(default=500, ge=50, le=60000, alias="AUDIT_FLUSH_INTERVAL_MS")
+    write_timeout_seconds: float = Field(default=2.0, ge=0.1, le=60.0, alias="AUDIT_WRITE_TIMEOUT_SECONDS")
+    spill_path: str = Field(default="data/audit_spill.jsonl", alias="AUDIT_SPILL_PATH")
+
+    model_config = SettingsConfigDict(env_prefix="AUDIT_", case_sensitive=False, extra="allow")
+
+
 class PasswordSettings(BaseSettings):
     """
     Настройки Password Policy для повышенной безопасности.
@@ -968,6 +1044,34 @@ class PasswordSettings(BaseSettings):
         alias="PASSWORD_EXPIRATION_WARNING_DAYS",
         description="За сколько дней предупреждать о скором истечении пароля"
     )
+    hash_workers: int = Field(
+        default=4,
+        ge=1,
+        le=64,
+        alias="PASSWORD_HASH_WORKERS",
+        description="Потоки пула bcrypt (проверка и хеширование паролей вне event loop)"
+    )
+    hash_max_pending: int = Field(
+        default=64,
+        ge=1,
+        le=10000,
+        alias="PASSWORD_HASH_MAX_PENDING",
+        description="Максимум ожидающих и выполняемых операций bcrypt (сверх - 503)"
+    )
+    credential_cache_ttl_seconds: int = Field(
+        default=60,
+        ge=0,
+        le=3600,
+        alias="PASSWORD_CREDENTIAL_CACHE_TTL_SECONDS",
+        description="Время жизни подтверждённых client credentials в кэше (0 - кэш отключен)"
+    )
+    credential_cache_size: int = Field(
+        default=10000,
+        ge=1,
+        le=1000000,
+        alias="PASSWORD_CREDENTIAL_CACHE_SIZE",
+        description="Максимум записей кэша подтверждённых client credentials"
+    )
 
     model_config = SettingsConfigDict(env_prefix="PASSWORD_", case_sensitive=False, extra="allow")
 
@@ -1167,6 +1271,7 @@ class Settings(BaseSettings):
     scheduler: SchedulerSettings = Field(default_factory=SchedulerSettings)
     initial_admin: InitialAdminSettings = Field(default_factory=InitialAdminSettings)
     security: SecuritySettings = Field(default_factory=SecuritySettings)
+    audit: AuditSettings = Field(default_factory=AuditSettings)
     password: PasswordSettings = Field(default_factory=PasswordSettings)
     initial_service_account: InitialServiceAccountSettings = Field(default_factory=InitialServiceAccountSettings)
 
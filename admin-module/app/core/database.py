@@ -35,7 +35,7 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
-# Создаем синхронный engine для background задач (APScheduler)
+# Создаем синхронный engine для sync кода (JWT ключи, admin users, запись audit spill в потоке)
 sync_engine = create_engine(
     settings.database.sync_url,
     echo=settings.database.echo,
@@ -45,7 +45,7 @@ sync_engine = create_engine(
     poolclass=QueuePool,
 )
 
-# Создаем синхронную фабрику сессий для background задач
+# Создаем синхронную фабрику сессий
 SyncSessionLocal = sessionmaker(
     bind=sync_engine,
     class_=Session,
@@ -82,7 +82,7 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 def get_sync_session() -> Generator[Session, None, None]:
     """
     Генератор для получения синхронной database session.
-    Используется в background задачах (APScheduler) и миграциях.
+    Используется в sync endpoints и сервисах (JWT ключи, admin users).
 
     Yields:
         Session: SQLAlchemy sync session
@@ -213,118 +213,3 @@ async def close_db() -> None:
     await engine.dispose()
     logger.info("Database connections closed")
 
-
-async def create_standalone_async_session() -> AsyncSession:
-    """
-    Создание standalone async session для background задач.
-
-    ВАЖНО: Эта функция создает новый engine и session для использования
-    в отдельном event loop (например, в APScheduler background jobs).
-
-    НЕ ИСПОЛЬЗОВАТЬ в FastAPI endpoints - там используйте get_db().
-
-    Returns:
-        AsyncSession: Новая async session с собственным engine
-
-    Example:
-        async def background_task():
-            session = await create_standalone_async_session()
-            try:
-                # Работа с сессией
-                result = await session.execute(select(Model))
-            finally:
-                await session.close()
-    """
-    # Создаем отдельный engine для этого event loop
-    standalone_engine = create_async_engine(
-        settings.database.url,
-        echo=False,  # Отключаем echo для background jobs
-        pool_pre_ping=True,
-        pool_size=2,  # Маленький пул для background jobs
-        max_overflow=1,
-        connect_args={"ssl": False},
-    )
-
-    # Создаем session maker
-    standalone_session_maker = async_sessionmaker(
-        standalone_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-        autocommit=False,
-        autoflush=False,
-    )
-
-    return standalone_session_maker()
-
-
-async def check_db_connection_standalone() -> bool:
-    """
-    Standalone версия проверки подключения к базе данных.
-
-    Создаёт собственный engine для использования в отдельном event loop
-    (например, в APScheduler background jobs с asyncio.run()).
-
-    ВАЖНО: НЕ ИСПОЛЬЗОВАТЬ в FastAPI endpoints - там используйте check_db_connection().
-
-    Returns:
-        bool: True если подключение работает, False иначе
-    """
-    standalone_engine = None
-    try:
-        standalone_engine = create_async_engine(
-            settings.database.url,
-            echo=False,
-            pool_pre_ping=True,
-            pool_size=1,
-            max_overflow=0,
-            connect_args={"ssl": False},
-        )
-        async with standalone_engine.begin() as conn:
-            await conn.execute(text("SELECT 1"))
-        return True
-    except Exception as e:
-        logger.error(f"Standalone database connection check failed: {e}")
-        return False
-    finally:
-        if standalone_engine:
-            await standalone_engine.dispose()
-
-
-async def check_db_tables_standalone() -> tuple[bool, list[str]]:
-    """
-    Standalone версия проверки наличия всех необходимых таблиц.
-
-    Создаёт собственный engine для использования в отдельном event loop
-    (например, в APScheduler background jobs с asyncio.run()).
-
-    ВАЖНО: НЕ ИСПОЛЬЗОВАТЬ в FastAPI endpoints - там используйте check_db_tables().
-
-    Returns:
-        tuple: (all_present, missing_tables)
-            - all_present: True если все таблицы существуют
-            - missing_tables: Список отсутствующих таблиц
-    """
-    standalone_engine = None
-    try:
-        standalone_engine = create_async_engine(
-            settings.database.url,
-            echo=False,
-            pool_pre_ping=True,
-            pool_size=1,
-            max_overflow=0,
-            connect_args={"ssl": False},
-        )
-        async with standalone_engine.begin() as conn:
-            result = await conn.execute(text(
-                "SELECT table_name FROM information_schema.tables "
-                "WHERE table_schema = 'public'"
-            ))
-            existing_tables = {row[0] for row in result.fetchall()}
-            missing_tables = [t for t in REQUIRED_TABLES if t not in existing_tables]
-            return len(missing_tables) == 0, missing_tables
-    except Exception as e:
-        logger.error(f"Standalone failed to check database tables: {e}")
-        return False, REQUIRED_TABLES
-    finally:
-        if standalone_engine:
-            await standalone_engine.dispose()
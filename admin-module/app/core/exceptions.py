@@ -105,3 +105,19 @@ class StorageElementNotFoundError(StorageElementSyncError):
     def __init__(self, storage_element_id: int):
         message = f"Storage element с ID {storage_element_id} не найден"
         super().__init__(message, storage_element_id)
+
+
+# =============================================================================
+# Password Hashing Exceptions
+# =============================================================================
+
+class PasswordHashBusyError(AdminModuleException):
+    """
+    Пул проверки паролей (bcrypt) заполнен.
+
+    Возникает когда ожидающих и выполняемых операций больше
+    PASSWORD_HASH_MAX_PENDING - клиент должен повторить запрос позже.
+    """
+    def __init__(self, pending: int):
+        self.pending = pending
+        super().__init__(f"Password hash pool is saturated ({pending} operations pending)")
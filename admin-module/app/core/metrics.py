@@ -92,6 +92,42 @@ token_validation_duration_seconds = Histogram(
 )
 
 
+# Gauge: Операции bcrypt в пуле (ожидающие и выполняемые)
+password_hash_pending = Gauge(
+    "password_hash_pending",
+    "Password hash operations queued or running in the worker pool"
+)
+
+# Histogram: Ожидание свободного worker пула bcrypt (в секундах)
+password_hash_queue_seconds = Histogram(
+    "password_hash_queue_seconds",
+    "Time a password hash operation waited for a pool worker",
+    ["operation"],  # verify, hash, history
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+)
+
+# Histogram: Длительность операции bcrypt в worker (в секундах)
+password_hash_duration_seconds = Histogram(
+    "password_hash_duration_seconds",
+    "Time taken by a password hash operation in the worker pool",
+    ["operation"],  # verify, hash, history
+    buckets=[0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0]
+)
+
+# Counter: Операции bcrypt, отклонённые из-за заполненного пула
+password_hash_rejected_total = Counter(
+    "password_hash_rejected_total",
+    "Total number of password hash operations rejected (pool saturated)"
+)
+
+# Counter: Проверки client credentials через кэш подтверждённых credentials
+credential_cache_lookups_total = Counter(
+    "credential_cache_lookups_total",
+    "Total number of verified-credential cache lookups",
+    ["result"]  # hit, miss
+)
+
+
 # ============================================================================
 # SERVICE ACCOUNT METRICS
 # ============================================================================
@@ -140,6 +176,71 @@ service_discovery_events_total = Counter(
 )
 
 
+# ============================================================================
+# AUDIT LOG WRITER METRICS
+# ============================================================================
+
+# Gauge: Записи audit в очереди AuditWriter
+audit_queue_depth = Gauge(
+    "audit_queue_depth",
+    "Audit records waiting in the in-process queue"
+)
+
+# Histogram: Длительность записи пакета audit logs в PostgreSQL (в секундах)
+audit_flush_duration_seconds = Histogram(
+    "audit_flush_duration_seconds",
+    "Time taken to write a batch of audit records",
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+)
+
+# Counter: Записи audit, сохранённые в PostgreSQL
+audit_records_written_total = Counter(
+    "audit_records_written_total",
+    "Total number of audit records written to PostgreSQL",
+    ["source"]  # queue, spill
+)
+
+# Counter: Записи audit, отложенные в spill файл
+audit_records_spilled_total = Counter(
+    "audit_records_spilled_total",
+    "Total number of audit records spilled to the local file",
+    ["reason"]  # timeout, error, queue_full, shutdown
+)
+
+# Counter: Отброшенные записи audit
+audit_records_dropped_total = Counter(
+    "audit_records_dropped_total",
+    "Total number of audit records dropped or rejected",
+    ["reason"]  # spill_failed, rejected, overflow
+)
+
+
+# ============================================================================
+# SCHEDULER METRICS
+# ============================================================================
+
+# Histogram: Длительность выполнения задач scheduler (в секундах)
+scheduler_job_duration_seconds = Histogram(
+    "scheduler_job_duration_seconds",
+    "Run time of a scheduled background job",
+    ["job"],
+    buckets=[0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0]
+)
+
+# Counter: Запуски задач scheduler
+scheduler_job_runs_total = Counter(
+    "scheduler_job_runs_total",
+    "Total number of scheduled background job runs",
+    ["job", "result"]  # success, error, skipped
+)
+
+# Gauge: Экземпляр держит leader lease scheduler (1 - leader)
+scheduler_leader = Gauge(
+    "scheduler_leader",
+    "Whether this instance holds the scheduler leader lease"
+)
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -0,0 +1,185 @@
+"""
+Пул проверки и хеширования паролей (bcrypt) для Admin Module.
+
+bcrypt (work factor 12) занимает ~250 мс CPU на операцию. Вызов в async
+handler блокирует event loop: пакет запросов /api/v1/auth/token от ingester
+и query узлов останавливает весь Admin Module.
+
+- password_hash_pool выполняет bcrypt в отдельных потоках (bcrypt освобождает
+  GIL на время хеширования) с ограничением числа ожидающих операций:
+  сверх PASSWORD_HASH_MAX_PENDING - PasswordHashBusyError (HTTP 503)
+- credential_cache хранит подтверждённые client credentials service accounts
+  PASSWORD_CREDENTIAL_CACHE_TTL_SECONDS: повторная выдача токена тому же
+  service account не выполняет bcrypt
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Tuple, TypeVar
+
+from app.core.config import settings
+from app.core.exceptions import PasswordHashBusyError
+from app.core.metrics import (
+    credential_cache_lookups_total,
+    password_hash_duration_seconds,
+    password_hash_pending,
+    password_hash_queue_seconds,
+    password_hash_rejected_total,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PasswordHashPool:
+    """
+    Ограниченный пул потоков для bcrypt операций.
+
+    Usage:
+        is_valid = await password_hash_pool.run("verify", verify_secret, secret, secret_hash)
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        """
+        Args:
+            max_workers: Количество потоков bcrypt
+            max_pending: Максимум ожидающих и выполняемых операций
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, operation: str, func: Callable[..., T], *args) -> T:
+        """
+        Выполнение bcrypt операции в пуле.
+
+        Args:
+            operation: Тип операции (label метрик: verify, hash, history)
+            func: Синхронная функция bcrypt
+            *args: Аргументы func
+
+        Returns:
+            T: Результат func
+
+        Raises:
+            PasswordHashBusyError: Пул заполнен
+        """
+        if self._pending >= self.max_pending:
+            password_hash_rejected_total.inc()
+            logger.warning(
+                "Password hash pool saturated, request rejected",
+                extra={"operation": operation, "pending": self._pending}
+            )
+            raise PasswordHashBusyError(self._pending)
+
+        submitted = time.perf_counter()
+
+        def job() -> T:
+            started = time.perf_counter()
+            password_hash_queue_seconds.labels(operation=operation).observe(started - submitted)
+            try:
+                return func(*args)
+            finally:
+                password_hash_duration_seconds.labels(operation=operation).observe(
+                    time.perf_counter() - started
+                )
+
+        self._pending += 1
+        password_hash_pending.set(self._pending)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        finally:
+            self._pending -= 1
+            password_hash_pending.set(self._pending)
+
+    def shutdown(self) -> None:
+        """Остановка пула (lifespan shutdown)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class VerifiedCredentialCache:
+    """
+    Кэш подтверждённых bcrypt client credentials.
+
+    Ключ - HMAC-SHA256 (client_id, client_secret) на случайном ключе процесса:
+    секрет не хранится в памяти в открытом или предсказуемом виде. Запись
+    действительна только для того же client_secret_hash - ротация secret
+    сразу делает запись недействительной.
+    """
+
+    def __init__(self, ttl_seconds: int, max_size: int):
+        """
+        Args:
+            ttl_seconds: Время жизни записи (0 - кэш отключен)
+            max_size: Максимум записей
+        """
+        self.ttl = ttl_seconds
+        self.max_size = max_size
+        self._key = secrets.token_bytes(32)
+        self._entries: Dict[bytes, Tuple[str, float]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _cache_key(self, client_id: str, client_secret: str) -> bytes:
+        message = f"{client_id}\0{client_secret}".encode("utf-8")
+        return hmac.new(self._key, message, hashlib.sha256).digest()
+
+    def is_verified(self, client_id: str, client_secret: str, secret_hash: str) -> bool:
+        """Credentials подтверждены bcrypt в течение TTL для текущего secret_hash."""
+        if not self.enabled:
+            return False
+
+        key = self._cache_key(client_id, client_secret)
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic() and hmac.compare_digest(entry[0], secret_hash):
+            credential_cache_lookups_total.labels(result="hit").inc()
+            return True
+
+        if entry is not None:
+            del self._entries[key]
+        credential_cache_lookups_total.labels(result="miss").inc()
+        return False
+
+    def remember(self, client_id: str, client_secret: str, secret_hash: str) -> None:
+        """Сохранение credentials, подтверждённых bcrypt."""
+        if not self.enabled:
+            return
+
+        key = self._cache_key(client_id, client_secret)
+        self._entries.pop(key, None)
+
+        if len(self._entries) >= self.max_size:
+            now = time.monotonic()
+            self._entries = {key: entry for key, entry in self._entries.items() if entry[1] > now}
+            while len(self._entries) >= self.max_size:
+                # Самая старая запись (dict сохраняет порядок вставки)
+                del self._entries[next(iter(self._entries))]
+
+        self._entries[key] = (secret_hash, time.monotonic() + self.ttl)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Singleton instances
+password_hash_pool = PasswordHashPool(
+    max_workers=settings.password.hash_workers,
+    max_pending=settings.password.hash_max_pending,
+)
+credential_cache = VerifiedCredentialCache(
+    ttl_seconds=settings.password.credential_cache_ttl_seconds,
+    max_size=settings.password.credential_cache_size,
+)
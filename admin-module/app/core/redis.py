@@ -94,40 +94,6 @@ async def check_redis_with_error() -> tuple[bool, Optional[str]]:
         return False, error_message
 
 
-async def check_redis_with_error_standalone() -> tuple[bool, Optional[str]]:
-    """
-    Standalone версия проверки подключения к Redis с возвратом текста ошибки.
-
-    Создаёт собственный Redis клиент для использования в отдельном event loop
-    (например, в APScheduler background jobs с asyncio.run()).
-
-    ВАЖНО: НЕ ИСПОЛЬЗОВАТЬ в FastAPI endpoints - там используйте check_redis_with_error().
-
-    Returns:
-        tuple: (is_ok, error_message)
-            - is_ok: True если подключение работает
-            - error_message: Текст ошибки или None если всё в порядке
-    """
-    standalone_client = None
-    try:
-        standalone_client = await aioredis.from_url(
-            settings.redis.url,
-            max_connections=1,
-            socket_timeout=settings.redis.socket_timeout,
-            socket_connect_timeout=settings.redis.socket_connect_timeout,
-            decode_responses=True,
-        )
-        await standalone_client.ping()
-        return True, None
-    except Exception as e:
-        error_message = str(e)
-        logger.warning(f"Standalone Redis connection check failed: {error_message}")
-        return False, error_message
-    finally:
-        if standalone_client:
-            await standalone_client.close()
-
-
 async def close_redis() -> None:
     """
     Закрытие Redis подключений (async).
@@ -304,77 +270,3 @@ class ServiceDiscovery:
 # Глобальный экземпляр Service Discovery
 service_discovery = ServiceDiscovery()
 
-
-async def publish_storage_element_config_standalone(
-    config: dict,
-    action: str = "manual",
-    storage_element_id: Optional[int] = None,
-    storage_element_name: Optional[str] = None
-) -> int:
-    """
-    Standalone функция публикации конфигурации для background jobs.
-
-    Создает собственный Redis client для использования в отдельном event loop
-    (например, в APScheduler background jobs).
-
-    ВАЖНО: НЕ ИСПОЛЬЗОВАТЬ в FastAPI endpoints - там используйте service_discovery.
-
-    Args:
-        config: Конфигурация storage elements
-        action: Тип действия (created/updated/deleted/synced/scheduled/startup)
-        storage_element_id: ID storage element (опционально)
-        storage_element_name: Имя storage element (опционально)
-
-    Returns:
-        int: Количество подписчиков, получивших обновление
-    """
-    try:
-        # Создаем standalone Redis client для этого event loop
-        standalone_redis = await aioredis.from_url(
-            settings.redis.url,
-            max_connections=2,
-            socket_timeout=settings.redis.socket_timeout,
-            socket_connect_timeout=settings.redis.socket_connect_timeout,
-            decode_responses=True,
-        )
-
-        try:
-            # Сохраняем конфигурацию в Redis
-            await standalone_redis.set(
-                settings.service_discovery.storage_element_config_key,
-                json.dumps(config),
-                ex=3600  # TTL 1 час
-            )
-
-            # Формируем событие для Pub/Sub
-            event = {
-                "event": "storage_element_config_updated",
-                "timestamp": datetime.utcnow().isoformat(),
-                "action": action,
-                "version": config.get("version", 1),
-                "count": config.get("count", 0)
-            }
-
-            if storage_element_id:
-                event["storage_element_id"] = storage_element_id
-            if storage_element_name:
-                event["storage_element_name"] = storage_element_name
-
-            # Публикуем событие об обновлении
-            subscribers = await standalone_redis.publish(
-                settings.service_discovery.redis_channel,
-                json.dumps(event)
-            )
-
-            logger.info(
-                f"Published storage element config (standalone): action={action}, "
-                f"count={config.get('count', 0)}, subscribers={subscribers}"
-            )
-            return subscribers
-
-        finally:
-            await standalone_redis.close()
-
-    except Exception as e:
-        logger.error(f"Failed to publish storage element config (standalone): {e}")
-        return 0
@@ -1,24 +1,28 @@
 """
-APScheduler background задачи для Admin Module.
+Background задачи Admin Module (asyncio scheduler в event loop приложения).
 
 Функции:
 - Автоматическая ротация JWT ключей каждые 24 часа
 - Периодическая публикация конфигурации Storage Elements в Redis
 - Периодическая проверка состояния Storage Elements (health check)
-- Background job scheduling с error handling
+- Периодическая проверка готовности (readiness) для /health/ready
+- Garbage Collection файлов
 - Graceful shutdown при остановке приложения
+
+Задачи выполняются AsyncScheduler (app.core.async_scheduler) в event loop
+FastAPI с общими пулами PostgreSQL (AsyncSessionLocal) и Redis (get_redis).
+Кластерные задачи (leader_only) выполняет только реплика, держащая leader
+lease в Redis; readiness check выполняется на каждой реплике.
 """
 
-import asyncio
 import logging
+from datetime import datetime
 from typing import Optional
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
-from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
-from pytz import timezone as pytz_timezone
 
+from app.core.async_scheduler import AsyncScheduler, LeaderLease
 from app.core.config import settings
-from app.core.database import get_sync_session, create_standalone_async_session
+from app.core.database import AsyncSessionLocal
+from app.core.redis import get_redis
 from app.services.jwt_key_rotation_service import get_rotation_service
 from app.services.storage_element_publish_service import storage_element_publish_service
 from app.services.storage_sync_service import storage_sync_service
@@ -27,10 +31,10 @@ from app.services.garbage_collector_service import GarbageCollectorService
 logger = logging.getLogger(__name__)
 
 # Global scheduler instance
-_scheduler: Optional[BackgroundScheduler] = None
+_scheduler: Optional[AsyncScheduler] = None
 
 
-def jwt_rotation_job() -> None:
+async def jwt_rotation_job() -> None:
     """
     Background задача для ротации JWT ключей.
 
@@ -38,48 +42,29 @@ def jwt_rotation_job() -> None:
     Использует distributed locking через Redis для cluster-safe операций.
 
     Процесс:
-    1. Создание database session
-    2. Проверка необходимости ротации
-    3. Выполнение ротации с distributed locking
-    4. Cleanup session
-
-    Note:
-        Эта функция должна быть максимально устойчивой к ошибкам,
-        так как она выполняется автоматически без вмешательства пользователя.
+    1. Проверка необходимости ротации
+    2. Выполнение ротации с distributed locking
     """
     logger.info("JWT key rotation job started")
 
-    session = None
-    try:
-        # Создаем синхронную database session
-        session = next(get_sync_session())
-
-        # Получаем rotation service
-        rotation_service = get_rotation_service()
+    rotation_service = await get_rotation_service()
 
+    async with AsyncSessionLocal() as session:
         # Проверяем необходимость ротации
-        if not rotation_service.check_rotation_needed(session):
+        if not await rotation_service.check_rotation_needed(session):
             logger.info("JWT key rotation not needed, skipping")
             return
 
         # Выполняем ротацию с distributed locking
-        success = rotation_service.rotate_keys(session)
-
-        if success:
-            logger.info("JWT key rotation job completed successfully")
-        else:
-            logger.error("JWT key rotation job failed - check logs for details")
-
-    except Exception as e:
-        logger.error(f"JWT key rotation job failed with exception: {e}", exc_info=True)
+        success = await rotation_service.rotate_keys(session)
 
-    finally:
-        # Закрываем session
-        if session:
-            session.close()
+    if success:
+        logger.info("JWT key rotation job completed successfully")
+    else:
+        logger.error("JWT key rotation job failed - check logs for details")
 
 
-def storage_element_publish_job() -> None:
+async def storage_element_publish_job() -> None:
     """
     Background задача для периодической публикации конфигурации Storage Elements в Redis.
 
@@ -88,56 +73,28 @@ def storage_element_publish_job() -> None:
 
     Ingester и Query модули подписываются на обновления через Redis Pub/Sub
     и получают актуальную конфигурацию без перезапуска.
-
-    Процесс:
-    1. Создание async database session
-    2. Получение всех storage elements
-    3. Публикация конфигурации в Redis
-    4. Cleanup session
-
-    Note:
-        Эта функция запускает async код через asyncio.run(),
-        так как APScheduler BackgroundScheduler работает синхронно.
     """
     logger.debug("Storage element publish job started")
 
-    async def _publish():
-        """Внутренняя async функция для публикации."""
-        # Создаем standalone session для нового event loop
-        session = await create_standalone_async_session()
-        try:
-            # Используем standalone метод с собственным Redis client
-            subscribers = await storage_element_publish_service.publish_scheduled_standalone(session)
-            logger.debug(
-                f"Storage element config published to {subscribers} subscribers"
-            )
-        except Exception as e:
-            logger.error(
-                f"Storage element publish job failed: {e}",
-                exc_info=True
-            )
-        finally:
-            await session.close()
+    async with AsyncSessionLocal() as session:
+        subscribers = await storage_element_publish_service.publish_scheduled(session)
 
-    try:
-        # Запускаем async функцию в sync контексте
-        asyncio.run(_publish())
-    except Exception as e:
-        logger.error(f"Storage element publish job failed with exception: {e}", exc_info=True)
+    logger.debug(f"Storage element config published to {subscribers} subscribers")
 
 
-def storage_health_check_job() -> None:
+async def storage_health_check_job() -> None:
     """
     Background задача для периодической проверки состояния Storage Elements.
 
-    Выполняется периодически согласно настройкам scheduler.storage_health_check_interval_seconds.
-    Опрашивает /api/v1/info каждого Storage Element и синхронизирует данные в БД.
+    Использует общий пул соединений БД и общий keep-alive HTTP клиент
+    StorageDiscoveryService.
 
     Процесс:
     1. Получение всех Storage Elements из БД
-    2. Опрос /api/v1/info для каждого элемента
+    2. Параллельный опрос /api/v1/info (SCHEDULER_STORAGE_HEALTH_CHECK_CONCURRENCY,
+       таймаут SCHEDULER_STORAGE_HEALTH_CHECK_TIMEOUT_SECONDS на элемент)
     3. Обновление mode, status, capacity, used_bytes, file_count при изменении
-    4. Публикация изменений в Redis для Service Discovery
+    4. Публикация изменений в Redis для Service Discovery (только при изменениях)
 
     Note:
         При изменении режима (mode) Storage Element логируется событие.
@@ -146,221 +103,134 @@ def storage_health_check_job() -> None:
     """
     logger.debug("Storage health check job started")
 
-    async def _health_check():
-        """Внутренняя async функция для health check."""
-        session = await create_standalone_async_session()
-        try:
-            # Синхронизируем все storage elements (включая offline для обновления статуса)
-            results = await storage_sync_service.sync_all_storage_elements(
-                session,
-                only_online=False  # Проверяем все элементы
-            )
-
-            # Подсчитываем статистику
-            success_count = sum(1 for r in results if r.success)
-            failed_count = len(results) - success_count
-            changes_count = sum(len(r.changes) for r in results)
-
-            # Логируем только если есть изменения или ошибки
-            if changes_count > 0 or failed_count > 0:
-                logger.info(
-                    f"Storage health check completed: "
-                    f"{success_count} synced, {failed_count} failed, "
-                    f"{changes_count} changes detected"
-                )
-            else:
-                logger.debug(
-                    f"Storage health check completed: "
-                    f"{success_count} synced, no changes"
-                )
-
-        except Exception as e:
-            logger.error(
-                f"Storage health check job failed: {e}",
-                exc_info=True
-            )
-        finally:
-            await session.close()
+    async with AsyncSessionLocal() as session:
+        # Синхронизируем все storage elements (включая offline для обновления статуса)
+        results = await storage_sync_service.sync_all_storage_elements(
+            session,
+            only_online=False  # Проверяем все элементы
+        )
 
-    try:
-        asyncio.run(_health_check())
-    except Exception as e:
-        logger.error(f"Storage health check job failed with exception: {e}", exc_info=True)
+    # Подсчитываем статистику
+    success_count = sum(1 for r in results if r.success)
+    failed_count = len(results) - success_count
+    changes_count = sum(len(r.changes) for r in results)
+
+    # Логируем только если есть изменения или ошибки
+    if changes_count > 0 or failed_count > 0:
+        logger.info(
+            f"Storage health check completed: "
+            f"{success_count} synced, {failed_count} failed, "
+            f"{changes_count} changes detected"
+        )
+    else:
+        logger.debug(
+            f"Storage health check completed: "
+            f"{success_count} synced, no changes"
+        )
 
 
-def readiness_health_check_job() -> None:
+async def _check_readiness():
     """
-    Background задача для периодической проверки readiness состояния.
+    Проверка подключения к БД, наличия таблиц и подключения к Redis.
 
-    Проверяет подключение к БД, наличие необходимых таблиц, подключение к Redis.
-    Результат сохраняется в HealthStateService для мгновенного ответа /health/ready.
+    Результат сохраняется в HealthStateService для мгновенного ответа
+    /health/ready.
 
-    Важно: Эта задача обеспечивает асинхронную архитектуру readiness probe.
-    Endpoint /health/ready читает из кеша и отвечает мгновенно, без выполнения
-    реальных проверок при каждом запросе.
-
-    Процесс:
-    1. Проверка подключения к PostgreSQL
-    2. Проверка наличия всех необходимых таблиц
-    3. Проверка подключения к Redis
-    4. Сохранение результата в HealthStateService
+    Returns:
+        HealthState: Сохранённое состояние
     """
-    logger.debug("Readiness health check job started")
-
-    async def _check():
-        """
-        Внутренняя async функция для проверки состояния.
-
-        ВАЖНО: Использует standalone функции для БД и Redis,
-        которые создают собственные подключения для этого event loop.
-        Это необходимо, т.к. asyncio.run() создаёт новый event loop,
-        и глобальные подключения asyncpg/redis не работают корректно.
-        """
-        from app.services.health_state_service import (
-            health_state_service,
-            HealthState,
-            DatabaseHealth,
-            RedisHealth
+    from app.services.health_state_service import (
+        health_state_service, HealthState, DatabaseHealth, RedisHealth
+    )
+    from app.core.database import check_db_connection, check_db_tables
+    from app.core.redis import check_redis_with_error
+
+    # Проверка подключения к БД
+    db_ok = await check_db_connection()
+
+    # Проверка наличия таблиц (только если подключение успешно)
+    if db_ok:
+        tables_ok, missing_tables = await check_db_tables()
+    else:
+        tables_ok, missing_tables = False, []
+
+    # Проверка подключения к Redis
+    redis_ok, redis_error = await check_redis_with_error()
+
+    # Формируем состояние БД
+    if db_ok and tables_ok:
+        db_health = DatabaseHealth(ok=True, error=None, missing_tables=[])
+    elif not db_ok:
+        db_health = DatabaseHealth(
+            ok=False,
+            error="Connection failed",
+            missing_tables=[]
         )
-        from app.core.database import check_db_connection_standalone, check_db_tables_standalone
-        from app.core.redis import check_redis_with_error_standalone
-        from datetime import datetime
-
-        # Проверка подключения к БД (standalone версия для background job)
-        db_ok = await check_db_connection_standalone()
-
-        # Проверка наличия таблиц (только если подключение успешно)
-        if db_ok:
-            tables_ok, missing_tables = await check_db_tables_standalone()
-        else:
-            tables_ok, missing_tables = False, []
-
-        # Проверка подключения к Redis (standalone версия для background job)
-        redis_ok, redis_error = await check_redis_with_error_standalone()
-
-        # Формируем состояние БД
-        if db_ok and tables_ok:
-            db_health = DatabaseHealth(ok=True, error=None, missing_tables=[])
-        elif not db_ok:
-            db_health = DatabaseHealth(
-                ok=False,
-                error="Connection failed",
-                missing_tables=[]
-            )
-        else:
-            db_health = DatabaseHealth(
-                ok=False,
-                error=f"Missing tables: {missing_tables}",
-                missing_tables=missing_tables
-            )
-
-        # Формируем состояние Redis
-        redis_health = RedisHealth(ok=redis_ok, error=redis_error)
-
-        # Определяем готовность (только БД критична)
-        is_ready = db_health.ok
-        reason = None if is_ready else f"Database not ready: {db_health.error}"
-        warnings = [f"Redis unavailable: {redis_error}"] if not redis_ok else []
-
-        # Создаем и сохраняем состояние
-        state = HealthState(
-            database=db_health,
-            redis=redis_health,
-            last_check=datetime.utcnow(),
-            is_ready=is_ready,
-            reason=reason,
-            warnings=warnings
+    else:
+        db_health = DatabaseHealth(
+            ok=False,
+            error=f"Missing tables: {missing_tables}",
+            missing_tables=missing_tables
         )
 
-        health_state_service.update_state(state)
+    # Формируем состояние Redis
+    redis_health = RedisHealth(ok=redis_ok, error=redis_error)
+
+    # Определяем готовность (только БД критична)
+    is_ready = db_health.ok
+    reason = None if is_ready else f"Database not ready: {db_health.error}"
+    warnings = [f"Redis unavailable: {redis_error}"] if not redis_ok else []
+
+    # Создаем и сохраняем состояние
+    state = HealthState(
+        database=db_health,
+        redis=redis_health,
+        last_check=datetime.utcnow(),
+        is_ready=is_ready,
+        reason=reason,
+        warnings=warnings
+    )
 
-        logger.debug(
-            f"Readiness health check completed: is_ready={is_ready}, "
-            f"db_ok={db_health.ok}, redis_ok={redis_ok}"
-        )
+    health_state_service.update_state(state)
+    return state
 
-    try:
-        asyncio.run(_check())
-    except Exception as e:
-        logger.error(f"Readiness health check job failed with exception: {e}", exc_info=True)
 
+async def readiness_health_check_job() -> None:
+    """
+    Background задача для периодической проверки readiness состояния.
 
-async def readiness_health_check_async() -> None:
+    Важно: Эта задача обеспечивает асинхронную архитектуру readiness probe.
+    Endpoint /health/ready читает из кеша и отвечает мгновенно, без выполнения
+    реальных проверок при каждом запросе. Выполняется на каждой реплике.
     """
-    Асинхронная версия проверки готовности для вызова из async контекста.
+    state = await _check_readiness()
+
+    logger.debug(
+        f"Readiness health check completed: is_ready={state.is_ready}, "
+        f"db_ok={state.database.ok}, redis_ok={state.redis.ok}"
+    )
 
-    Используется для первичной проверки при startup в lifespan FastAPI,
-    где уже есть работающий event loop.
 
-    ВАЖНО: НЕ ИСПОЛЬЗОВАТЬ в APScheduler jobs - там нужен readiness_health_check_job()
-    с asyncio.run() для создания отдельного event loop в другом потоке.
+async def readiness_health_check_async() -> None:
     """
-    from datetime import datetime
-    from app.services.health_state_service import (
-        health_state_service, HealthState, DatabaseHealth, RedisHealth
-    )
-    from app.core.database import check_db_connection, check_db_tables
-    from app.core.redis import check_redis_with_error
+    Первичная проверка готовности при startup в lifespan FastAPI.
 
+    Наполняет HealthStateService начальным состоянием до первого
+    запроса к /health/ready.
+    """
     try:
-        # Проверка подключения к БД
-        db_ok = await check_db_connection()
-
-        # Проверка наличия таблиц (только если подключение успешно)
-        if db_ok:
-            tables_ok, missing_tables = await check_db_tables()
-        else:
-            tables_ok, missing_tables = False, []
-
-        # Проверка подключения к Redis
-        redis_ok, redis_error = await check_redis_with_error()
-
-        # Формируем состояние БД
-        if db_ok and tables_ok:
-            db_health = DatabaseHealth(ok=True, error=None, missing_tables=[])
-        elif not db_ok:
-            db_health = DatabaseHealth(
-                ok=False,
-                error="Connection failed",
-                missing_tables=[]
-            )
-        else:
-            db_health = DatabaseHealth(
-                ok=False,
-                error=f"Missing tables: {missing_tables}",
-                missing_tables=missing_tables
-            )
-
-        # Формируем состояние Redis
-        redis_health = RedisHealth(ok=redis_ok, error=redis_error)
-
-        # Определяем готовность (только БД критична)
-        is_ready = db_health.ok
-        reason = None if is_ready else f"Database not ready: {db_health.error}"
-        warnings = [f"Redis unavailable: {redis_error}"] if not redis_ok else []
-
-        # Создаем и сохраняем состояние
-        state = HealthState(
-            database=db_health,
-            redis=redis_health,
-            last_check=datetime.utcnow(),
-            is_ready=is_ready,
-            reason=reason,
-            warnings=warnings
-        )
-
-        health_state_service.update_state(state)
+        state = await _check_readiness()
 
         logger.info(
-            f"Initial readiness check completed: is_ready={is_ready}, "
-            f"db_ok={db_health.ok}, redis_ok={redis_ok}"
+            f"Initial readiness check completed: is_ready={state.is_ready}, "
+            f"db_ok={state.database.ok}, redis_ok={state.redis.ok}"
         )
 
     except Exception as e:
         logger.error(f"Initial readiness health check failed: {e}", exc_info=True)
 
 
-def garbage_collection_job() -> None:
+async def garbage_collection_job() -> None:
     """
     Background задача для Garbage Collection файлов.
 
@@ -369,94 +239,69 @@ def garbage_collection_job() -> None:
     1. TTL-based cleanup: удаление temporary файлов с истекшим TTL
     2. Finalized files cleanup: удаление из Edit SE после финализации (+24h safety)
     3. Cleanup queue processing: обработка очереди на удаление
-
-    Note:
-        Эта функция запускает async код через asyncio.run(),
-        так как APScheduler BackgroundScheduler работает синхронно.
     """
     logger.info("Garbage Collection job started")
 
-    async def _gc():
-        """Внутренняя async функция для GC."""
-        # Создаем standalone session для нового event loop
-        session = await create_standalone_async_session()
-        try:
-            # Создаем GC service с настройками из config
-            gc_service = GarbageCollectorService(
-                batch_size=settings.scheduler.gc_batch_size,
-                safety_margin_hours=settings.scheduler.gc_safety_margin_hours,
-                orphan_grace_days=settings.scheduler.gc_orphan_grace_days,
-            )
-
-            # Запускаем GC
-            result = await gc_service.run_garbage_collection(session)
-
-            # Логируем результат
-            if result.total_failed > 0 or result.errors:
-                logger.warning(
-                    f"Garbage Collection completed with issues: "
-                    f"cleaned={result.total_cleaned}, failed={result.total_failed}, "
-                    f"duration={result.duration_seconds:.2f}s, "
-                    f"errors={len(result.errors)}"
-                )
-            else:
-                logger.info(
-                    f"Garbage Collection completed successfully: "
-                    f"cleaned={result.total_cleaned}, duration={result.duration_seconds:.2f}s"
-                )
-
-        except Exception as e:
-            logger.error(f"Garbage Collection job failed: {e}", exc_info=True)
-        finally:
-            await session.close()
-
-    try:
-        asyncio.run(_gc())
-    except Exception as e:
-        logger.error(f"Garbage Collection job failed with exception: {e}", exc_info=True)
-
-
-def job_listener(event) -> None:
-    """
-    Listener для событий APScheduler.
+    # Создаем GC service с настройками из config
+    gc_service = GarbageCollectorService(
+        batch_size=settings.scheduler.gc_batch_size,
+        safety_margin_hours=settings.scheduler.gc_safety_margin_hours,
+        orphan_grace_days=settings.scheduler.gc_orphan_grace_days,
+    )
 
-    Args:
-        event: Событие от APScheduler (EVENT_JOB_EXECUTED или EVENT_JOB_ERROR)
+    async with AsyncSessionLocal() as session:
+        result = await gc_service.run_garbage_collection(session)
 
-    Логирует выполнение и ошибки background задач для мониторинга.
-    """
-    if event.exception:
-        logger.error(
-            f"Job {event.job_id} raised exception: {event.exception}",
-            extra={
-                "job_id": event.job_id,
-                "scheduled_run_time": event.scheduled_run_time.isoformat() if event.scheduled_run_time else None
-            }
+    # Логируем результат
+    if result.total_failed > 0 or result.errors:
+        logger.warning(
+            f"Garbage Collection completed with issues: "
+            f"cleaned={result.total_cleaned}, failed={result.total_failed}, "
+            f"duration={result.duration_seconds:.2f}s, "
+            f"errors={len(result.errors)}"
         )
     else:
-        logger.debug(
-            f"Job {event.job_id} executed successfully",
-            extra={
-                "job_id": event.job_id,
-                "scheduled_run_time": event.scheduled_run_time.isoformat() if event.scheduled_run_time else None
-            }
+        logger.info(
+            f"Garbage Collection completed successfully: "
+            f"cleaned={result.total_cleaned}, duration={result.duration_seconds:.2f}s"
         )
 
 
-def init_scheduler() -> Optional[BackgroundScheduler]:
-    """
-    Инициализация APScheduler с background задачами.
+def _jitter(interval_seconds: float) -> float:
+    """Jitter задачи: SCHEDULER_JITTER_SECONDS, но не больше 10% интервала."""
+    return min(settings.scheduler.jitter_seconds, interval_seconds / 10)
+
+
+def _add_job(
+    scheduler: AsyncScheduler,
+    func,
+    id: str,
+    name: str,
+    interval_seconds: float,
+    leader_only: bool
+) -> None:
+    scheduler.add_job(
+        func,
+        id=id,
+        name=name,
+        interval_seconds=interval_seconds,
+        jitter_seconds=_jitter(interval_seconds),
+        leader_only=leader_only,
+    )
+    logger.info(
+        f"{name} job scheduled: interval={interval_seconds}s, "
+        f"leader_only={leader_only}"
+    )
 
-    Returns:
-        Optional[BackgroundScheduler]: Scheduler instance или None если disabled
 
-    Raises:
-        Exception: При ошибке инициализации scheduler
+def init_scheduler() -> Optional[AsyncScheduler]:
+    """
+    Инициализация и запуск scheduler с background задачами.
+
+    Вызывается из lifespan FastAPI (задачи создаются в работающем event loop).
 
-    Example:
-        @app.on_event("startup")
-        async def startup_event():
-            init_scheduler()
+    Returns:
+        Optional[AsyncScheduler]: Scheduler instance или None если disabled
     """
     global _scheduler
 
@@ -468,150 +313,85 @@ def init_scheduler() -> Optional[BackgroundScheduler]:
         logger.warning("Scheduler already initialized")
         return _scheduler
 
-    try:
-        # Создаем scheduler с timezone из конфигурации
-        tz = pytz_timezone(settings.scheduler.timezone)
-        _scheduler = BackgroundScheduler(timezone=tz)
-
-        # Добавляем listener для событий
-        _scheduler.add_listener(
-            job_listener,
-            EVENT_JOB_EXECUTED | EVENT_JOB_ERROR
+    leader_lease = None
+    if settings.scheduler.leader_election_enabled:
+        leader_lease = LeaderLease(
+            get_redis,
+            key="scheduler:leader",
+            lease_seconds=settings.scheduler.leader_lease_seconds,
         )
 
-        # JWT Key Rotation job
-        if settings.scheduler.jwt_rotation_enabled:
-            _scheduler.add_job(
-                func=jwt_rotation_job,
-                trigger=IntervalTrigger(
-                    hours=settings.scheduler.jwt_rotation_interval_hours,
-                    timezone=tz
-                ),
-                id="jwt_key_rotation",
-                name="JWT Key Rotation",
-                replace_existing=True,
-                max_instances=1,  # Только одна инстанция job может выполняться одновременно
-                coalesce=True,  # Если пропущено несколько запусков, выполнить только один
-                misfire_grace_time=3600  # 1 час grace period для missed jobs
-            )
-
-            logger.info(
-                f"JWT key rotation job scheduled: "
-                f"interval={settings.scheduler.jwt_rotation_interval_hours}h, "
-                f"timezone={settings.scheduler.timezone}"
-            )
-
-        # Storage Element Publish job для Service Discovery
-        if settings.service_discovery.enabled:
-            _scheduler.add_job(
-                func=storage_element_publish_job,
-                trigger=IntervalTrigger(
-                    seconds=settings.service_discovery.publish_interval_seconds,
-                    timezone=tz
-                ),
-                id="storage_element_publish",
-                name="Storage Element Config Publish",
-                replace_existing=True,
-                max_instances=1,  # Только одна инстанция job может выполняться одновременно
-                coalesce=True,  # Если пропущено несколько запусков, выполнить только один
-                misfire_grace_time=60  # 1 минута grace period для missed jobs
-            )
-
-            logger.info(
-                f"Storage element publish job scheduled: "
-                f"interval={settings.service_discovery.publish_interval_seconds}s, "
-                f"timezone={settings.scheduler.timezone}"
-            )
-
-        # Storage Health Check job - периодическая проверка состояния storage elements
-        if settings.scheduler.storage_health_check_enabled:
-            _scheduler.add_job(
-                func=storage_health_check_job,
-                trigger=IntervalTrigger(
-                    seconds=settings.scheduler.storage_health_check_interval_seconds,
-                    timezone=tz
-                ),
-                id="storage_health_check",
-                name="Storage Element Health Check",
-                replace_existing=True,
-                max_instances=1,  # Только одна инстанция job может выполняться одновременно
-                coalesce=True,  # Если пропущено несколько запусков, выполнить только один
-                misfire_grace_time=120  # 2 минуты grace period для missed jobs
-            )
-
-            logger.info(
-                f"Storage health check job scheduled: "
-                f"interval={settings.scheduler.storage_health_check_interval_seconds}s, "
-                f"timezone={settings.scheduler.timezone}"
-            )
-
-        # Readiness Health Check job - периодическая проверка состояния БД и Redis
-        if settings.scheduler.readiness_check_enabled:
-            _scheduler.add_job(
-                func=readiness_health_check_job,
-                trigger=IntervalTrigger(
-                    seconds=settings.scheduler.readiness_check_interval_seconds,
-                    timezone=tz
-                ),
-                id="readiness_health_check",
-                name="Readiness Health Check",
-                replace_existing=True,
-                max_instances=1,  # Только одна инстанция job может выполняться одновременно
-                coalesce=True,  # Если пропущено несколько запусков, выполнить только один
-                misfire_grace_time=30  # 30 секунд grace period для missed jobs
-            )
-
-            logger.info(
-                f"Readiness health check job scheduled: "
-                f"interval={settings.scheduler.readiness_check_interval_seconds}s, "
-                f"timezone={settings.scheduler.timezone}"
-            )
-
-        # Garbage Collection job - периодическая очистка файлов
-        if settings.scheduler.gc_enabled:
-            _scheduler.add_job(
-                func=garbage_collection_job,
-                trigger=IntervalTrigger(
-                    hours=settings.scheduler.gc_interval_hours,
-                    timezone=tz
-                ),
-                id="garbage_collection",
-                name="Garbage Collection",
-                replace_existing=True,
-                max_instances=1,  # Только одна инстанция job может выполняться одновременно
-                coalesce=True,  # Если пропущено несколько запусков, выполнить только один
-                misfire_grace_time=3600  # 1 час grace period для missed jobs
-            )
-
-            logger.info(
-                f"Garbage Collection job scheduled: "
-                f"interval={settings.scheduler.gc_interval_hours}h, "
-                f"batch_size={settings.scheduler.gc_batch_size}, "
-                f"safety_margin={settings.scheduler.gc_safety_margin_hours}h, "
-                f"timezone={settings.scheduler.timezone}"
-            )
-
-        # Запускаем scheduler
-        _scheduler.start()
-        logger.info("APScheduler started successfully")
+    scheduler = AsyncScheduler(
+        leader_lease=leader_lease,
+        shutdown_timeout_seconds=settings.scheduler.shutdown_timeout_seconds,
+    )
 
-        return _scheduler
+    # JWT Key Rotation job
+    if settings.scheduler.jwt_rotation_enabled:
+        _add_job(
+            scheduler, jwt_rotation_job,
+            id="jwt_key_rotation",
+            name="JWT Key Rotation",
+            interval_seconds=settings.scheduler.jwt_rotation_interval_hours * 3600,
+            leader_only=True
+        )
 
-    except Exception as e:
-        logger.error(f"Failed to initialize scheduler: {e}", exc_info=True)
-        raise
+    # Storage Element Publish job для Service Discovery
+    if settings.service_discovery.enabled:
+        _add_job(
+            scheduler, storage_element_publish_job,
+            id="storage_element_publish",
+            name="Storage Element Config Publish",
+            interval_seconds=settings.service_discovery.publish_interval_seconds,
+            leader_only=True
+        )
 
+    # Storage Health Check job - периодическая проверка состояния storage elements
+    if settings.scheduler.storage_health_check_enabled:
+        _add_job(
+            scheduler, storage_health_check_job,
+            id="storage_health_check",
+            name="Storage Element Health Check",
+            interval_seconds=settings.scheduler.storage_health_check_interval_seconds,
+            leader_only=True
+        )
 
-def shutdown_scheduler() -> None:
+    # Readiness Health Check job - состояние БД и Redis каждой реплики
+    if settings.scheduler.readiness_check_enabled:
+        _add_job(
+            scheduler, readiness_health_check_job,
+            id="readiness_health_check",
+            name="Readiness Health Check",
+            interval_seconds=settings.scheduler.readiness_check_interval_seconds,
+            leader_only=False
+        )
+
+    # Garbage Collection job - периодическая очистка файлов
+    if settings.scheduler.gc_enabled:
+        _add_job(
+            scheduler, garbage_collection_job,
+            id="garbage_collection",
+            name="Garbage Collection",
+            interval_seconds=settings.scheduler.gc_interval_hours * 3600,
+            leader_only=True
+        )
+
+    scheduler.start()
+    _scheduler = scheduler
+    logger.info(
+        f"Scheduler started: {len(scheduler.jobs)} jobs, "
+        f"leader_election={settings.scheduler.leader_election_enabled}"
+    )
+
+    return _scheduler
+
+
+async def shutdown_scheduler() -> None:
     """
     Graceful shutdown scheduler при остановке приложения.
 
-    Ожидает завершения всех running jobs (до 30 секунд).
-
-    Example:
-        @app.on_event("shutdown")
-        async def shutdown_event():
-            shutdown_scheduler()
+    Ожидает завершения выполняемых задач (SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS)
+    и освобождает leader lease.
     """
     global _scheduler
 
@@ -620,30 +400,22 @@ def shutdown_scheduler() -> None:
 
     try:
         logger.info("Shutting down scheduler...")
-
-        # Ожидаем завершения running jobs (максимум 30 секунд)
-        _scheduler.shutdown(wait=True)
-
-        _scheduler = None
+        await _scheduler.shutdown()
         logger.info("Scheduler shut down successfully")
 
     except Exception as e:
         logger.error(f"Error during scheduler shutdown: {e}", exc_info=True)
 
+    finally:
+        _scheduler = None
 
-def get_scheduler() -> Optional[BackgroundScheduler]:
+
+def get_scheduler() -> Optional[AsyncScheduler]:
     """
     Получение текущего scheduler instance.
 
     Returns:
-        Optional[BackgroundScheduler]: Scheduler instance или None если не инициализирован
-
-    Example:
-        scheduler = get_scheduler()
-        if scheduler:
-            jobs = scheduler.get_jobs()
-            for job in jobs:
-                print(f"Job: {job.name}, Next run: {job.next_run_time}")
+        Optional[AsyncScheduler]: Scheduler instance или None если не инициализирован
     """
     return _scheduler
 
@@ -659,12 +431,14 @@ def get_scheduler_status() -> dict:
         {
             "enabled": true,
             "running": true,
+            "leader": true,
             "jobs": [
                 {
                     "id": "jwt_key_rotation",
                     "name": "JWT Key Rotation",
-                    "next_run_time": "2025-11-17T16:00:00Z",
-                    "pending": false
+                    "next_run_time": "2025-11-17T16:00:00+00:00",
+                    "pending": false,
+                    "leader_only": true
                 }
             ]
         }
@@ -676,26 +450,7 @@ def get_scheduler_status() -> dict:
             "jobs": []
         }
 
-    try:
-        jobs_info = []
-        for job in _scheduler.get_jobs():
-            jobs_info.append({
-                "id": job.id,
-                "name": job.name,
-                "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None,
-                "pending": job.pending
-            })
-
-        return {
-            "enabled": settings.scheduler.enabled,
-            "running": _scheduler.running,
-            "jobs": jobs_info
-        }
-
-    except Exception as e:
-        logger.error(f"Error getting scheduler status: {e}")
-        return {
-            "enabled": settings.scheduler.enabled,
-            "running": False,
-            "error": str(e)
-        }
+    return {
+        "enabled": settings.scheduler.enabled,
+        **_scheduler.get_status()
+    }
@@ -10,10 +10,14 @@ from contextlib import asynccontextmanager
 from datetime import datetime
 
 from app.core.config import settings
+from app.core.exceptions import PasswordHashBusyError
+from app.core.password_hashing import password_hash_pool
 from app.core.database import init_db, close_db, check_db_connection, get_db
 from app.core.redis import close_redis, check_redis_connection, service_discovery
 from app.services.storage_element_publish_service import storage_element_publish_service
 from app.services.event_publisher import event_publisher
+from app.services.audit_writer import audit_writer
+from app.services.storage_discovery_service import storage_discovery_service
 from app.core.logging_config import setup_logging, get_logger
 from app.core.observability import setup_observability
 from app.core.scheduler import init_scheduler, shutdown_scheduler
@@ -78,9 +82,11 @@ async def lifespan(app: FastAPI):
                 await db.close()
             break  # Получаем только одну сессию
 
-        # Инициализация APScheduler для background задач
+        # Фоновая запись audit logs (AuditMiddleware только ставит записи в очередь)
+        await audit_writer.start()
+
+        # Scheduler background задач в event loop приложения
         init_scheduler()
-        logger.info("APScheduler initialized")
 
         # Запуск первичной проверки готовности сразу при старте
         # Это наполняет HealthStateService начальным состоянием до первого запроса к /health/ready
@@ -119,9 +125,9 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"Failed to stop JWT key file watcher: {e}")
 
-        # Остановка APScheduler (с ожиданием завершения running jobs)
-        shutdown_scheduler()
-        logger.info("APScheduler shut down")
+        # Остановка scheduler (с ожиданием завершения running jobs)
+        await shutdown_scheduler()
+        await storage_discovery_service.aclose()
 
         # PHASE 1: Закрытие EventPublisher
         await event_publisher.close()
@@ -129,7 +135,11 @@ async def lifespan(app: FastAPI):
 
         await service_discovery.close()  # Async вызов
         await close_redis()  # Async вызов
+
+        # Запись оставшихся audit logs (не записанные - в spill файл)
+        await audit_writer.close()
         await close_db()
+        password_hash_pool.shutdown()
         logger.info("Application shutdown complete")
 
     except Exception as e:
@@ -249,6 +259,16 @@ async def not_found_handler(request, exc):
     )
 
 
+@app.exception_handler(PasswordHashBusyError)
+async def password_hash_busy_handler(request, exc):
+    """Handler для заполненного пула bcrypt (token/login endpoints)."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication service is busy, retry later"},
+        headers={"Retry-After": "1", "Cache-Control": "no-store"}
+    )
+
+
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
     """Handler для 500 ошибок."""
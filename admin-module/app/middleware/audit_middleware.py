@@ -4,12 +4,13 @@ Audit Middleware для автоматического логирования HT
 Функции:
 - Автоматическое логирование всех HTTP requests
 - Context extraction (IP, user agent, request ID)
-- Actor tracking из JWT токенов
+- Actor tracking из JWT токенов (в AuditWriter, вне request path)
 - Selective logging (только важные endpoints)
-- Asynchronous audit log creation
+- Asynchronous audit log creation (очередь AuditWriter, пакетный INSERT)
 """
 
 import time
+from datetime import datetime, timezone
 from typing import Callable, Optional
 import logging
 
@@ -17,9 +18,8 @@ from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
-from app.core.database import get_sync_session
 from app.services.audit_service import AuditService
-from app.services.token_service import token_service
+from app.services.audit_writer import audit_writer
 
 logger = logging.getLogger(__name__)
 
@@ -67,7 +67,6 @@ class AuditMiddleware(BaseHTTPMiddleware):
             app: ASGI application
         """
         super().__init__(app)
-        self.audit_service = AuditService()
 
     def _should_log_request(self, path: str, status_code: int) -> bool:
         """
@@ -99,59 +98,29 @@ class AuditMiddleware(BaseHTTPMiddleware):
 
         return False
 
-    def _extract_actor_from_token(self, request: Request) -> dict:
+    @staticmethod
+    def _extract_bearer_token(request: Request) -> Optional[str]:
         """
-        Извлечение actor information из JWT токена.
+        JWT токен из Authorization header (actor определяет AuditWriter).
 
         Args:
             request: FastAPI Request
 
         Returns:
-            dict: Actor info (user_id, service_account_id, actor_type)
+            Optional[str]: Токен или None
         """
-        result = {
-            "user_id": None,
-            "service_account_id": None,
-            "actor_type": "anonymous"
-        }
-
-        # Извлекаем токен из Authorization header
         auth_header = request.headers.get("authorization")
         if not auth_header or not auth_header.startswith("Bearer "):
-            return result
-
-        token = auth_header.split(" ", 1)[1]
-
-        # Декодируем токен
-        try:
-            sync_session = next(get_sync_session())
-            try:
-                payload = token_service.decode_token(token, session=sync_session)
-
-                # User или Service Account
-                if "sub" in payload:
-                    user_id = int(payload["sub"])
-
-                    # Проверяем тип токена по claims
-                    if "service_account" in payload.get("type", ""):
-                        result["service_account_id"] = user_id
-                        result["actor_type"] = "service_account"
-                    else:
-                        result["user_id"] = user_id
-                        result["actor_type"] = "user"
-
-            finally:
-                sync_session.close()
-
-        except Exception as e:
-            logger.debug(f"Failed to extract actor from token: {e}")
-
-        return result
+            return None
+        return auth_header.split(" ", 1)[1]
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """
         Обработка HTTP request с audit logging.
 
+        Audit запись только ставится в очередь AuditWriter -
+        request не ждёт PostgreSQL и проверки JWT.
+
         Args:
             request: FastAPI Request
             call_next: Next middleware/handler
@@ -176,68 +145,23 @@ class AuditMiddleware(BaseHTTPMiddleware):
 
         finally:
             # Проверяем необходимость логирования
-            should_log = self._should_log_request(request.url.path, status_code)
-
-            if should_log:
-                # Вычисляем длительность request
-                duration_ms = (time.time() - start_time) * 1000
-
-                # Извлекаем actor information
-                actor_info = self._extract_actor_from_token(request)
-
-                # Определяем action из HTTP method
-                method_to_action = {
-                    "GET": "read",
-                    "POST": "create",
-                    "PUT": "update",
-                    "PATCH": "update",
-                    "DELETE": "delete"
-                }
-                action = method_to_action.get(request.method, "unknown")
-
-                # Формируем event type
-                path_parts = request.url.path.split("/")
-                resource_type = path_parts[-1] if len(path_parts) > 1 else "unknown"
-                event_type = f"http_{action}_{resource_type}"
-
-                # Дополнительные данные
-                data = {
-                    "method": request.method,
-                    "path": request.url.path,
-                    "query_params": str(request.query_params),
-                    "status_code": status_code,
-                    "duration_ms": round(duration_ms, 2)
-                }
-
-                # Severity
-                if status_code >= 500:
-                    severity = "error"
-                elif status_code >= 400:
-                    severity = "warning"
-                else:
-                    severity = "info"
-
-                # Создаем audit log entry
+            if self._should_log_request(request.url.path, status_code):
                 try:
-                    sync_session = next(get_sync_session())
-                    try:
-                        self.audit_service.log_security_event(
-                            session=sync_session,
-                            event_type=event_type,
-                            severity=severity,
-                            success=(status_code < 400),
-                            user_id=actor_info["user_id"],
-                            service_account_id=actor_info["service_account_id"],
-                            error_message=error_message,
-                            request=request,
-                            data=data
-                        )
-                    finally:
-                        sync_session.close()
-
+                    audit_writer.enqueue({
+                        "created_at": datetime.now(timezone.utc),
+                        "method": request.method,
+                        "path": request.url.path,
+                        "query_params": str(request.query_params),
+                        "status_code": status_code,
+                        "duration_ms": round((time.time() - start_time) * 1000, 2),
+                        "error_message": error_message,
+                        **AuditService._extract_request_context(request),
+                        # Только в памяти: в spill файл попадает определённый actor
+                        "token": self._extract_bearer_token(request),
+                    })
                 except Exception as e:
                     # Не прерываем request из-за audit logging failure
-                    logger.error(f"Failed to create audit log: {e}", exc_info=True)
+                    logger.error(f"Failed to enqueue audit log: {e}", exc_info=True)
 
         # Возвращаем response ПОСЛЕ finally блока
         return response
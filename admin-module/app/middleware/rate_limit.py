@@ -3,6 +3,7 @@ Rate Limiting Middleware для Service Accounts.
 
 Использует асинхронный Redis (redis.asyncio) для хранения счетчиков запросов.
 Каждый Service Account имеет свой rate_limit (по умолчанию 100 req/min).
+Проверка окна - SlidingWindowRateLimiter (один атомарный Lua round-trip).
 
 ВАЖНО: Middleware работает в АСИНХРОННОМ режиме для неблокирующей работы с event loop.
 """
@@ -11,10 +12,12 @@ import time
 from typing import Optional, Tuple
 import logging
 
-from fastapi import Request, Response, HTTPException, status
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.core.config import settings
+from app.core.rate_limiter import SlidingWindowRateLimiter
 from app.core.redis import get_redis
 
 logger = logging.getLogger(__name__)
@@ -30,9 +33,10 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     Алгоритм:
     1. Извлекаем client_id из JWT токена в заголовке Authorization
     2. Получаем rate_limit для этого Service Account из токена
-    3. Проверяем количество запросов за последнюю минуту в Redis (async)
+    3. Атомарно проверяем и учитываем запрос в окне за последнюю минуту
+       (Lua скрипт в Redis; часть запросов - по локальным токенам без Redis)
     4. Если превышен лимит - возвращаем 429 Too Many Requests
-    5. Иначе инкрементируем счетчик и пропускаем запрос
+    5. Иначе пропускаем запрос
 
     ВАЖНО: Все операции с Redis выполняются асинхронно.
     """
@@ -45,8 +49,13 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             app: FastAPI приложение
         """
         super().__init__(app)
-        # Redis клиент получаем асинхронно при первом вызове
-        self._redis_initialized = False
+        # Redis клиент limiter получает асинхронно при первой проверке
+        self.limiter = SlidingWindowRateLimiter(
+            get_redis,
+            key_prefix="rate_limit",
+            window_seconds=settings.rate_limit.window_seconds,
+            local_fraction=settings.rate_limit.local_fraction,
+        )
 
     def _extract_client_id_from_token(self, request: Request) -> Optional[Tuple[str, int]]:
         """
@@ -90,67 +99,6 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             logger.debug(f"Failed to extract client_id from token: {e}")
             return None
 
-    async def _check_rate_limit(
-        self,
-        client_id: str,
-        rate_limit: int,
-        window_seconds: int = 60
-    ) -> Tuple[bool, int, int]:
-        """
-        Асинхронная проверка rate limit для client_id.
-
-        Использует Redis Sorted Set для Sliding Window алгоритма.
-
-        Args:
-            client_id: Client ID Service Account
-            rate_limit: Максимальное количество запросов в окне
-            window_seconds: Размер окна в секундах (по умолчанию 60 сек)
-
-        Returns:
-            Tuple[bool, int, int]: (allowed, current_count, retry_after_seconds)
-        """
-        try:
-            # Получаем async Redis клиент
-            redis_client = await get_redis()
-
-            # Ключ в Redis для этого Service Account
-            key = f"rate_limit:{client_id}"
-
-            # Текущее время в секундах (с точностью до миллисекунд)
-            now = time.time()
-            window_start = now - window_seconds
-
-            # Удаляем старые записи вне окна
-            await redis_client.zremrangebyscore(key, 0, window_start)
-
-            # Получаем количество запросов в текущем окне
-            current_count = await redis_client.zcard(key)
-
-            if current_count >= rate_limit:
-                # Лимит превышен - вычисляем время до следующего окна
-                oldest_entries = await redis_client.zrange(key, 0, 0, withscores=True)
-                if oldest_entries:
-                    oldest_timestamp = float(oldest_entries[0][1])
-                    retry_after = int(oldest_timestamp + window_seconds - now) + 1
-                else:
-                    retry_after = window_seconds
-                return False, current_count, retry_after
-
-            # Добавляем текущий запрос в sorted set
-            # Score = timestamp, Value = уникальный ID запроса
-            request_id = f"{now}:{id(self)}"
-            await redis_client.zadd(key, {request_id: now})
-
-            # Устанавливаем TTL на ключ (2x окна для надежности)
-            await redis_client.expire(key, window_seconds * 2)
-
-            return True, current_count + 1, 0
-
-        except Exception as e:
-            logger.warning(f"Rate limit check failed (Redis unavailable): {e}")
-            # При ошибке Redis - пропускаем запрос (fail-open)
-            return True, 0, 0
-
     async def dispatch(self, request: Request, call_next) -> Response:
         """
         Асинхронная обработка запроса с проверкой rate limit.
@@ -160,52 +108,44 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             call_next: Следующий middleware/handler
 
         Returns:
-            Response: HTTP Response
-
-        Raises:
-            HTTPException: 429 Too Many Requests если лимит превышен
+            Response: HTTP Response (429 Too Many Requests если лимит превышен)
         """
         # Извлекаем client_id и rate_limit из токена
-        result = self._extract_client_id_from_token(request)
+        result = self._extract_client_id_from_token(request) if settings.rate_limit.enabled else None
 
         if result:
             client_id, rate_limit = result
 
-            # Асинхронная проверка rate limit
-            allowed, current_count, retry_after = await self._check_rate_limit(
-                client_id=client_id,
-                rate_limit=rate_limit
-            )
+            # Атомарная проверка rate limit (один round-trip или локальный токен)
+            decision = await self.limiter.check(client_id, rate_limit)
 
-            if not allowed:
+            if not decision.allowed:
                 # Лимит превышен - возвращаем 429
-                logger.warning(
-                    f"Rate limit exceeded for {client_id}: "
-                    f"{current_count}/{rate_limit} requests"
-                )
+                logger.warning(f"Rate limit exceeded for {client_id}: {rate_limit} requests")
 
-                raise HTTPException(
+                # HTTPException из BaseHTTPMiddleware не обрабатывается
+                # exception handlers FastAPI - формируем ответ напрямую
+                return JSONResponse(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail={
+                    content={"detail": {
                         "error": "rate_limit_exceeded",
                         "message": f"Rate limit exceeded: {rate_limit} requests per minute",
-                        "retry_after": retry_after,
-                        "current_usage": current_count,
+                        "retry_after": decision.retry_after,
                         "limit": rate_limit
-                    },
+                    }},
                     headers={
-                        "Retry-After": str(retry_after),
+                        "Retry-After": str(decision.retry_after),
                         "X-RateLimit-Limit": str(rate_limit),
                         "X-RateLimit-Remaining": "0",
-                        "X-RateLimit-Reset": str(int(time.time() + retry_after))
+                        "X-RateLimit-Reset": str(int(time.time() + decision.retry_after))
                     }
                 )
 
             # Добавляем заголовки с информацией о rate limit
             response = await call_next(request)
             response.headers["X-RateLimit-Limit"] = str(rate_limit)
-            response.headers["X-RateLimit-Remaining"] = str(rate_limit - current_count)
-            response.headers["X-RateLimit-Reset"] = str(int(time.time() + 60))
+            response.headers["X-RateLimit-Remaining"] = str(decision.remaining)
+            response.headers["X-RateLimit-Reset"] = str(int(time.time() + settings.rate_limit.window_seconds))
 
             return response
 
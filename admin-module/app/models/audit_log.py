@@ -216,6 +216,71 @@ class AuditLog(Base):
 
         return signature
 
+    @classmethod
+    def signed_values(
+        cls,
+        event_type: str,
+        action: str,
+        success: bool,
+        actor_type: str = "system",
+        service_account_id: Optional[uuid.UUID] = None,
+        admin_user_id: Optional[uuid.UUID] = None,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        request_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        data: Optional[Dict[str, Any]] = None,
+        severity: str = "info",
+        error_message: Optional[str] = None,
+        created_at: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Значения столбцов audit log entry с HMAC подписью (для multi-row INSERT).
+
+        created_at входит в подпись и сохраняется тем же значением -
+        verify_signature() проверяет запись без расхождения timestamp.
+
+        Returns:
+            Dict[str, Any]: Значения столбцов audit_logs (без id)
+        """
+        created_at = created_at or datetime.now(timezone.utc)
+
+        signature_data = {
+            "event_type": event_type,
+            "action": action,
+            "success": success,
+            "actor_type": actor_type,
+            "service_account_id": str(service_account_id) if service_account_id else None,
+            "admin_user_id": str(admin_user_id) if admin_user_id else None,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "severity": severity,
+            "data": data if data else {},
+            "timestamp": created_at.isoformat()
+        }
+
+        return {
+            "event_type": event_type,
+            "severity": severity,
+            "service_account_id": service_account_id,
+            "admin_user_id": admin_user_id,
+            "actor_type": actor_type,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "action": action,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "request_id": request_id,
+            "session_id": session_id,
+            "data": data,
+            "success": success,
+            "error_message": error_message,
+            "hmac_signature": cls._compute_hmac(signature_data),
+            "created_at": created_at,
+        }
+
     @classmethod
     def create_entry(
         cls,
@@ -272,43 +337,24 @@ class AuditLog(Base):
                 data={"username": user.username}
             )
         """
-        # Подготовка данных для HMAC signature
-        signature_data = {
-            "event_type": event_type,
-            "action": action,
-            "success": success,
-            "actor_type": actor_type,
-            "service_account_id": str(service_account_id) if service_account_id else None,
-            "admin_user_id": str(admin_user_id) if admin_user_id else None,
-            "resource_type": resource_type,
-            "resource_id": resource_id,
-            "severity": severity,
-            "data": data if data else {},
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
-
-        # Вычисляем HMAC signature
-        hmac_signature = cls._compute_hmac(signature_data)
-
-        # Создаем audit log entry
-        audit_log = cls(
+        # Создаем audit log entry с HMAC signature
+        audit_log = cls(**cls.signed_values(
             event_type=event_type,
-            severity=severity,
+            action=action,
+            success=success,
+            actor_type=actor_type,
             service_account_id=service_account_id,
             admin_user_id=admin_user_id,
-            actor_type=actor_type,
             resource_type=resource_type,
             resource_id=resource_id,
-            action=action,
             ip_address=ip_address,
             user_agent=user_agent,
             request_id=request_id,
             session_id=session_id,
             data=data,
-            success=success,
-            error_message=error_message,
-            hmac_signature=hmac_signature
-        )
+            severity=severity,
+            error_message=error_message
+        ))
 
         session.add(audit_log)
         session.commit()
@@ -391,6 +391,16 @@ class FileListResponse(BaseModel):
         description="Общее количество страниц"
     )
 
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Курсор следующей страницы (keyset пагинация); None - страниц больше нет"
+    )
+
+    total_is_estimate: bool = Field(
+        False,
+        description="total - оценка планировщика PostgreSQL, а не точный COUNT(*)"
+    )
+
     model_config = {
         "json_schema_extra": {
             "example": {
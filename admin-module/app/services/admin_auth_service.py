@@ -17,6 +17,7 @@ from passlib.context import CryptContext
 from app.models.admin_user import AdminUser, AdminRole
 from app.services.token_service import TokenService
 from app.core.password_policy import PasswordPolicy, PasswordValidator, PasswordGenerator
+from app.core.password_hashing import password_hash_pool
 from app.services.audit_service import AuditService
 from app.core.database import get_sync_session
 
@@ -138,6 +139,7 @@ class AdminAuthService:
             InvalidCredentialsError: Неверные учетные данные
             AccountLockedError: Аккаунт заблокирован
             AccountDisabledError: Аккаунт отключен
+            PasswordHashBusyError: Пул bcrypt заполнен
         """
         # Найти пользователя по username
         result = await db.execute(
@@ -183,8 +185,8 @@ class AdminAuthService:
                 f"Account is locked until {admin_user.locked_until.isoformat()}"
             )
 
-        # Проверка пароля
-        if not self.verify_password(password, admin_user.password_hash):
+        # Проверка пароля (bcrypt в пуле потоков, не в event loop)
+        if not await password_hash_pool.run("verify", self.verify_password, password, admin_user.password_hash):
             logger.warning(f"Invalid password for username: {username}")
 
             # Увеличиваем счетчик неудачных попыток
@@ -318,7 +320,9 @@ class AdminAuthService:
             ValueError: Пароль не соответствует политике
         """
         # Проверка текущего пароля
-        if not self.verify_password(current_password, admin_user.password_hash):
+        if not await password_hash_pool.run(
+            "verify", self.verify_password, current_password, admin_user.password_hash
+        ):
             logger.warning(f"Invalid current password for admin: {admin_user.username}")
             raise InvalidCredentialsError("Invalid current password")
 
@@ -328,7 +332,7 @@ class AdminAuthService:
             raise ValueError(f"Password policy violation: {', '.join(errors)}")
 
         # Хеширование нового пароля
-        new_password_hash = self.hash_password(new_password)
+        new_password_hash = await password_hash_pool.run("hash", self.hash_password, new_password)
 
         # Проверка истории паролей
         if admin_user.is_password_in_history(new_password_hash):
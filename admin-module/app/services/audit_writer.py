@@ -0,0 +1,545 @@
+"""
+Audit Writer - фоновая запись audit logs HTTP requests.
+
+AuditMiddleware не обращается к PostgreSQL в request path:
+- enqueue() кладёт компактную запись в ограниченную очередь в памяти
+- Фоновая задача собирает пакет до AUDIT_FLUSH_SIZE записей или
+  AUDIT_FLUSH_INTERVAL_MS, определяет actor по JWT (sync session в thread pool)
+  и сохраняет пакет одним multi-row INSERT в audit_logs
+- Пакет не записан за AUDIT_WRITE_TIMEOUT_SECONDS или ошибка PostgreSQL -
+  строки (с HMAC подписью) дописываются в append-only файл AUDIT_SPILL_PATH
+- После успешной записи пакета spill файл переносится в audit_logs
+- Очередь заполнена или writer не запущен - запись попадает в overflow буфер,
+  фоновая задача дописывает его в spill файл (actor не определяется);
+  enqueue() никогда не выполняет файловый I/O в event loop
+- Остановка - не записанные за timeout записи дописываются в spill файл
+
+JWT токены в spill файл не попадают: actor определяется до записи строк.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, SyncSessionLocal
+from app.core.metrics import (
+    audit_flush_duration_seconds,
+    audit_queue_depth,
+    audit_records_dropped_total,
+    audit_records_spilled_total,
+    audit_records_written_total,
+)
+from app.models.audit_log import AuditLog
+from app.services.token_service import token_service
+
+logger = logging.getLogger(__name__)
+
+# Действие audit log по HTTP method
+METHOD_TO_ACTION = {
+    "GET": "read",
+    "POST": "create",
+    "PUT": "update",
+    "PATCH": "update",
+    "DELETE": "delete"
+}
+
+# Максимум закэшированных actor (по токену, до истечения токена)
+ACTOR_CACHE_SIZE = 1024
+
+ANONYMOUS_ACTOR: Dict[str, Any] = {"actor_type": "system", "service_account_id": None, "username": None}
+
+
+def actor_from_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Actor audit log по payload JWT токена.
+
+    Service account - sub содержит UUID; admin user - sub содержит username.
+    """
+    subject = payload.get("sub")
+    if not subject:
+        return ANONYMOUS_ACTOR
+
+    if "service_account" in payload.get("type", ""):
+        try:
+            service_account_id = uuid.UUID(str(subject))
+        except ValueError:
+            service_account_id = None
+        return {"actor_type": "service_account", "service_account_id": service_account_id, "username": None}
+
+    return {"actor_type": "admin_user", "service_account_id": None, "username": subject}
+
+
+def build_row(record: Dict[str, Any], actor: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Строка audit_logs (с HMAC подписью) по записи AuditMiddleware.
+
+    Args:
+        record: Компактная запись request (AuditMiddleware)
+        actor: Actor (actor_from_payload)
+
+    Returns:
+        Dict[str, Any]: Значения столбцов audit_logs
+    """
+    status_code = record["status_code"]
+    path = record["path"]
+
+    resource_type = path.split("/")[-1] or "unknown"
+    event_type = f"http_{METHOD_TO_ACTION.get(record['method'], 'unknown')}_{resource_type}"
+
+    data = {
+        "method": record["method"],
+        "path": path,
+        "query_params": record["query_params"],
+        "status_code": status_code,
+        "duration_ms": record["duration_ms"]
+    }
+    if actor["username"]:
+        data["username"] = actor["username"]
+
+    if status_code >= 500:
+        severity = "error"
+    elif status_code >= 400:
+        severity = "warning"
+    else:
+        severity = "info"
+
+    # Как AuditService.log_security_event: action - последняя часть event_type.
+    # Длины по столбцам audit_logs: одна слишком длинная строка не должна
+    # отклонять весь пакет
+    return AuditLog.signed_values(
+        event_type=event_type[:100],
+        action=event_type.split("_")[-1][:50],
+        success=status_code < 400,
+        actor_type=actor["actor_type"],
+        service_account_id=actor["service_account_id"],
+        ip_address=record["ip_address"],
+        user_agent=record["user_agent"],
+        request_id=(record["request_id"] or None) and record["request_id"][:36],
+        data=data,
+        severity=severity,
+        error_message=record["error_message"],
+        created_at=record["created_at"]
+    )
+
+
+def dump_row(row: Dict[str, Any]) -> str:
+    """Строка spill файла (JSON)."""
+    return json.dumps(row, default=str, ensure_ascii=False)
+
+
+def load_row(line: str) -> Dict[str, Any]:
+    """Строка audit_logs из строки spill файла."""
+    row = json.loads(line)
+    row["created_at"] = datetime.fromisoformat(row["created_at"])
+    for column in ("service_account_id", "admin_user_id"):
+        if row.get(column):
+            row[column] = uuid.UUID(row[column])
+    return row
+
+
+class AuditWriter:
+    """
+    Ограниченная очередь audit записей с фоновой пакетной записью и spill файлом.
+
+    Usage:
+        await audit_writer.start()
+        audit_writer.enqueue(record)  # не блокирует
+        await audit_writer.close()    # запись/spill оставшихся записей
+    """
+
+    def __init__(
+        self,
+        queue_size: int,
+        flush_size: int,
+        flush_interval_ms: int,
+        write_timeout_seconds: float,
+        spill_path: str,
+    ):
+        """
+        Args:
+            queue_size: Ёмкость очереди
+            flush_size: Максимум записей в пакете
+            flush_interval_ms: Максимальная задержка записи неполного пакета
+            write_timeout_seconds: Максимальное ожидание INSERT пакета
+            spill_path: Append-only файл строк, не записанных в PostgreSQL
+        """
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.write_timeout = write_timeout_seconds
+        self.spill_path = Path(spill_path)
+        self.replay_path = self.spill_path.with_name(self.spill_path.name + ".replay")
+        self.rejected_path = self.spill_path.with_name(self.spill_path.name + ".rejected")
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._batch: List[Dict[str, Any]] = []
+        self._inflight: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+        # Записи сверх очереди - в spill файл фоновой задачей
+        self._overflow: List[Dict[str, Any]] = []
+        self._overflow_limit = queue_size
+        self._spill_task: Optional[asyncio.Task] = None
+        # Дописывание spill файла (thread pool) и его перенос в .replay
+        # не пересекаются: строка целиком попадает в один из файлов
+        self._spill_lock = threading.Lock()
+        self._actor_cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Запуск фоновой записи (lifespan startup, после init_db())."""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            "Audit writer started",
+            extra={
+                "queue_size": self._queue.maxsize,
+                "flush_size": self.flush_size,
+                "flush_interval_ms": int(self.flush_interval * 1000),
+                "spill_path": str(self.spill_path),
+            }
+        )
+
+    def enqueue(self, record: Dict[str, Any]) -> bool:
+        """
+        Постановка записи request в очередь без ожидания.
+
+        Writer не запущен или очередь заполнена - запись попадает в overflow
+        буфер (не больше queue_size записей), который фоновая задача
+        дописывает в spill файл без определения actor.
+
+        Returns:
+            bool: False если запись не поставлена в очередь
+        """
+        if self.running:
+            try:
+                self._queue.put_nowait(record)
+            except asyncio.QueueFull:
+                pass
+            else:
+                audit_queue_depth.set(self._queue.qsize())
+                return True
+
+        if len(self._overflow) >= self._overflow_limit:
+            audit_records_dropped_total.labels(reason="overflow").inc()
+            return False
+
+        self._overflow.append(record)
+        if self._spill_task is None or self._spill_task.done():
+            self._spill_task = asyncio.get_running_loop().create_task(self._spill_overflow())
+        return False
+
+    def _spill_records(self, records: List[Dict[str, Any]], reason: str) -> None:
+        """Строки без actor по записям request - в spill файл (thread pool)."""
+        self._spill([build_row(record, ANONYMOUS_ACTOR) for record in records], reason)
+
+    async def _spill_overflow(self) -> None:
+        """Перенос overflow буфера в spill файл (файловый I/O и fsync - в thread pool)."""
+        while self._overflow:
+            records, self._overflow = self._overflow, []
+            await asyncio.to_thread(self._spill_records, records, "queue_full")
+
+    async def _fill_batch(self) -> None:
+        """Ожидание первой записи и сбор пакета до flush_size или flush_interval."""
+        self._batch.append(await self._queue.get())
+        deadline = time.monotonic() + self.flush_interval
+
+        while len(self._batch) < self.flush_size:
+            try:
+                self._batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                self._batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+    def _resolve_actors(self, tokens: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Actor по JWT токенам пакета (thread pool: sync session и RSA проверка).
+
+        Одна sync session на пакет; actor кэшируется до истечения токена.
+        """
+        actors: Dict[str, Dict[str, Any]] = {}
+        now = time.time()
+        session = None
+
+        try:
+            for token in tokens:
+                cached = self._actor_cache.get(token)
+                if cached is not None and cached[1] > now:
+                    actors[token] = cached[0]
+                    continue
+
+                if session is None:
+                    session = SyncSessionLocal()
+                try:
+                    payload = token_service.decode_token(token, session=session)
+                except Exception as e:
+                    logger.debug(f"Failed to extract actor from token: {e}")
+                    actors[token] = ANONYMOUS_ACTOR
+                    continue
+
+                actors[token] = actor_from_payload(payload)
+                if len(self._actor_cache) >= ACTOR_CACHE_SIZE:
+                    self._actor_cache.clear()
+                self._actor_cache[token] = (actors[token], float(payload.get("exp", 0)))
+        finally:
+            if session is not None:
+                session.close()
+
+        return actors
+
+    async def _build_rows(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        actors: Dict[str, Dict[str, Any]] = {}
+        tokens = list({record["token"] for record in batch if record.get("token")})
+        if tokens:
+            try:
+                actors = await asyncio.to_thread(self._resolve_actors, tokens)
+            except Exception as e:
+                logger.warning("Audit actor resolution failed", extra={"error": str(e)})
+
+        return [
+            build_row(record, actors.get(record.get("token"), ANONYMOUS_ACTOR))
+            for record in batch
+        ]
+
+    async def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        """Multi-row INSERT в audit_logs (одна транзакция)."""
+        async with AsyncSessionLocal() as session:
+            await session.execute(insert(AuditLog).values(rows))
+            await session.commit()
+
+    def _spill(self, rows: List[Dict[str, Any]], reason: str) -> None:
+        """Дописывание строк в append-only spill файл."""
+        try:
+            with self._spill_lock:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                with self.spill_path.open("a", encoding="utf-8") as spill:
+                    spill.write("".join(dump_row(row) + "\n" for row in rows))
+                    spill.flush()
+                    os.fsync(spill.fileno())
+        except OSError as e:
+            audit_records_dropped_total.labels(reason="spill_failed").inc(len(rows))
+            logger.error(
+                "Audit spill failed, records dropped",
+                extra={"records": len(rows), "spill_path": str(self.spill_path), "error": str(e)}
+            )
+            return
+
+        audit_records_spilled_total.labels(reason=reason).inc(len(rows))
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        rows = await self._build_rows(batch)
+        started = time.perf_counter()
+
+        try:
+            # Отмена INSERT по таймауту: запись может уже быть сохранена,
+            # повтор из spill файла даёт дубликат, а не потерю записи
+            await asyncio.wait_for(self._insert(rows), self.write_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Audit batch write timed out, records spilled", extra={"records": len(rows)})
+            await asyncio.to_thread(self._spill, rows, "timeout")
+            return
+        except Exception as e:
+            logger.warning(
+                "Audit batch write failed, records spilled",
+                extra={"records": len(rows), "error": str(e)}
+            )
+            await asyncio.to_thread(self._spill, rows, "error")
+            return
+
+        audit_records_written_total.labels(source="queue").inc(len(rows))
+        audit_flush_duration_seconds.observe(time.perf_counter() - started)
+
+        await self._replay_pending()
+
+    def _take_spill(self) -> bool:
+        """
+        Переименование spill файла в .replay (thread pool).
+
+        Returns:
+            bool: False если spill файла нет
+        """
+        with self._spill_lock:
+            if not self.spill_path.exists():
+                return False
+            os.replace(self.spill_path, self.replay_path)
+            return True
+
+    def _read_replay(self) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Строки replay файла и нечитаемые строки (оборванная запись)."""
+        rows, broken = [], []
+        with self.replay_path.open(encoding="utf-8") as replay:
+            for line in replay:
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(load_row(line))
+                except (ValueError, KeyError, TypeError):
+                    broken.append(line if line.endswith("\n") else line + "\n")
+        return rows, broken
+
+    def _write_replay(self, rows: List[Dict[str, Any]]) -> None:
+        """Замена replay файла оставшимися строками."""
+        tmp_path = self.replay_path.with_name(self.replay_path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as replay:
+            replay.write("".join(dump_row(row) + "\n" for row in rows))
+            replay.flush()
+            os.fsync(replay.fileno())
+        os.replace(tmp_path, self.replay_path)
+
+    def _reject(self, lines: List[str]) -> None:
+        """Строки, которые PostgreSQL не принимает - в rejected файл для разбора."""
+        with self.rejected_path.open("a", encoding="utf-8") as rejected:
+            rejected.write("".join(lines))
+        audit_records_dropped_total.labels(reason="rejected").inc(len(lines))
+
+    async def replay_spill(self) -> int:
+        """
+        Перенос строк spill файла в audit_logs пакетами flush_size.
+
+        Spill файл переименовывается в .replay под lock spill файла (новые
+        строки пишутся в новый spill файл). Ошибка записи - непереносённые строки остаются в .replay
+        до следующей успешной записи пакета.
+
+        Returns:
+            int: Количество перенесённых строк
+        """
+        if not self.replay_path.exists():
+            if not await asyncio.to_thread(self._take_spill):
+                return 0
+
+        rows, broken = await asyncio.to_thread(self._read_replay)
+        if broken:
+            await asyncio.to_thread(self._reject, broken)
+
+        replayed = 0
+        for offset in range(0, len(rows), self.flush_size):
+            chunk = rows[offset:offset + self.flush_size]
+            try:
+                await asyncio.wait_for(self._insert(chunk), self.write_timeout)
+            except (IntegrityError, DataError) as e:
+                logger.error(
+                    "Audit spill records rejected by PostgreSQL",
+                    extra={"records": len(chunk), "rejected_path": str(self.rejected_path), "error": str(e)}
+                )
+                await asyncio.to_thread(self._reject, [dump_row(row) + "\n" for row in chunk])
+                continue
+            except Exception as e:
+                logger.warning(
+                    "Audit spill replay interrupted",
+                    extra={"replayed": replayed, "remaining": len(rows) - offset, "error": str(e)}
+                )
+                await asyncio.to_thread(self._write_replay, rows[offset:])
+                return replayed
+
+            replayed += len(chunk)
+            audit_records_written_total.labels(source="spill").inc(len(chunk))
+
+        self.replay_path.unlink(missing_ok=True)
+        if replayed:
+            logger.info("Audit spill records replayed", extra={"records": replayed})
+        return replayed
+
+    async def _replay_pending(self) -> None:
+        """Перенос spill файла, оставшегося от прошлых пакетов или запусков."""
+        if not (self.replay_path.exists() or self.spill_path.exists()):
+            return
+        try:
+            await self.replay_spill()
+        except Exception as e:
+            logger.error("Audit spill replay failed", extra={"error": str(e)}, exc_info=True)
+
+    async def _run(self) -> None:
+        """Фоновый цикл записи пакетов."""
+        await self._replay_pending()
+
+        while True:
+            await self._fill_batch()
+
+            # Остановка writer не прерывает запись пакета (close() дожидается её).
+            # Пакет остаётся в self._batch до конца записи - прерванная
+            # по timeout запись дописывается в spill файл при close()
+            self._inflight = asyncio.ensure_future(self._flush(list(self._batch)))
+            await asyncio.shield(self._inflight)
+            self._inflight = None
+            self._batch = []
+
+            audit_queue_depth.set(self._queue.qsize())
+
+    async def _drain(self) -> None:
+        """Запись текущего пакета и оставшихся в очереди записей."""
+        if self._inflight is not None:
+            await self._inflight
+            self._inflight = None
+            self._batch = []
+
+        while self._batch or not self._queue.empty():
+            while len(self._batch) < self.flush_size and not self._queue.empty():
+                self._batch.append(self._queue.get_nowait())
+            await self._flush(self._batch)
+            self._batch = []
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """
+        Остановка и запись оставшихся записей (lifespan shutdown, до close_db()).
+
+        Не записанные за timeout записи дописываются в spill файл.
+
+        Args:
+            timeout: Максимальное ожидание записи оставшихся записей (секунды)
+        """
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        try:
+            await asyncio.wait_for(self._drain(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+        remaining = self._batch + [self._queue.get_nowait() for _ in range(self._queue.qsize())]
+        self._batch = []
+        if remaining:
+            await asyncio.to_thread(self._spill_records, remaining, "shutdown")
+        audit_queue_depth.set(0)
+
+        if self._spill_task is not None:
+            await self._spill_task
+            self._spill_task = None
+
+        logger.info("Audit writer stopped", extra={"spilled": len(remaining)})
+
+
+# Singleton instance
+audit_writer = AuditWriter(
+    queue_size=settings.audit.queue_size,
+    flush_size=settings.audit.flush_size,
+    flush_interval_ms=settings.audit.flush_interval_ms,
+    write_timeout_seconds=settings.audit.write_timeout_seconds,
+    spill_path=settings.audit.spill_path,
+)
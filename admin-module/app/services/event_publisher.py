@@ -20,10 +20,17 @@ Advantages over Pub/Sub:
 - Consumer Groups с ACK для tracking обработки
 - Pending Entry List (PEL) для retry failed events
 - MAXLEN для automatic cleanup старых events
+
+Partitioning (EVENT_STREAM_PARTITIONS > 1):
+- Events распределяются по streams {stream_name}:{N}, N = crc32(file_id) % partitions
+- Все events одного файла попадают в один partition - порядок по файлу сохраняется
+- Partition streams независимы: в Redis Cluster распределяются по разным shards
+- Query Module экземпляры динамически захватывают partitions (lease в Redis)
 """
 
 import logging
 import json
+import zlib
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
@@ -42,6 +49,23 @@ from app.schemas.events import (
 logger = logging.getLogger(__name__)
 
 
+def stream_partition(file_id: UUID | str, partitions: int) -> int:
+    """
+    Номер partition stream для файла.
+
+    crc32 стабилен между процессами и языками (в отличие от hash() Python)
+    и вычисляется Query Module по той же формуле.
+    """
+    return zlib.crc32(str(file_id).encode()) % partitions
+
+
+def partition_stream_name(stream_name: str, partition: int, partitions: int) -> str:
+    """Имя partition stream (без суффикса при единственном partition)."""
+    if partitions <= 1:
+        return stream_name
+    return f"{stream_name}:{partition}"
+
+
 class EventPublisher:
     """
     Сервис для публикации file events в Redis Streams (XADD).
@@ -82,12 +106,23 @@ class EventPublisher:
                     "stream_name": settings.event_publishing.stream_name,
                     "stream_maxlen": settings.event_publishing.stream_maxlen,
                     "stream_retention_hours": settings.event_publishing.stream_retention_hours,
+                    "stream_partitions": settings.event_publishing.stream_partitions,
                 }
             )
         except Exception as e:
             logger.error(f"Failed to initialize EventPublisher: {e}", exc_info=True)
             self._initialized = False
 
+    @staticmethod
+    def stream_for(file_id: UUID) -> str:
+        """Stream для events файла (partition по file_id)."""
+        partitions = settings.event_publishing.stream_partitions
+        return partition_stream_name(
+            settings.event_publishing.stream_name,
+            stream_partition(file_id, partitions),
+            partitions,
+        )
+
     async def publish_file_created(
         self,
         file_id: UUID,
@@ -142,8 +177,9 @@ class EventPublisher:
             }
 
             # XADD в Redis Stream с automatic cleanup
+            stream_name = self.stream_for(file_id)
             event_id = await self.redis.xadd(
-                name=settings.event_publishing.stream_name,
+                name=stream_name,
                 fields=event_data,
                 maxlen=settings.event_publishing.stream_maxlen,
                 approximate=True,  # Approximate MAXLEN для performance
@@ -155,7 +191,7 @@ class EventPublisher:
                     "event_id": event_id,
                     "file_id": str(file_id),
                     "storage_element_id": storage_element_id,
-                    "stream_name": settings.event_publishing.stream_name,
+                    "stream_name": stream_name,
                 }
             )
 
@@ -213,8 +249,9 @@ class EventPublisher:
             }
 
             # XADD в Redis Stream с automatic cleanup
+            stream_name = self.stream_for(file_id)
             event_id = await self.redis.xadd(
-                name=settings.event_publishing.stream_name,
+                name=stream_name,
                 fields=event_data,
                 maxlen=settings.event_publishing.stream_maxlen,
                 approximate=True,
@@ -226,7 +263,7 @@ class EventPublisher:
                     "event_id": event_id,
                     "file_id": str(file_id),
                     "storage_element_id": storage_element_id,
-                    "stream_name": settings.event_publishing.stream_name,
+                    "stream_name": stream_name,
                 }
             )
 
@@ -285,8 +322,9 @@ class EventPublisher:
             }
 
             # XADD в Redis Stream с automatic cleanup
+            stream_name = self.stream_for(file_id)
             event_id = await self.redis.xadd(
-                name=settings.event_publishing.stream_name,
+                name=stream_name,
                 fields=event_data,
                 maxlen=settings.event_publishing.stream_maxlen,
                 approximate=True,
@@ -298,7 +336,7 @@ class EventPublisher:
                     "event_id": event_id,
                     "file_id": str(file_id),
                     "storage_element_id": storage_element_id,
-                    "stream_name": settings.event_publishing.stream_name,
+                    "stream_name": stream_name,
                 }
             )
 
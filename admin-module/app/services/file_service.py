@@ -38,6 +38,7 @@ from app.schemas.file import (
 )
 from app.schemas.events import FileMetadataEvent
 from app.services.event_publisher import event_publisher
+from app.utils.pagination import decode_cursor, encode_cursor, estimate_count, keyset_condition
 
 logger = logging.getLogger(__name__)
 
@@ -412,11 +413,16 @@ class FileService:
         page_size: int = 50,
         retention_policy: Optional[RetentionPolicy] = None,
         storage_element_id: Optional[str] = None,
-        include_deleted: bool = False
+        include_deleted: bool = False,
+        cursor: Optional[str] = None,
+        exact_total: bool = True
     ) -> FileListResponse:
         """
         Получение списка файлов с pagination и фильтрацией.
 
+        Поддерживает page-based и keyset (cursor) пагинацию. С cursor
+        страница выбирается по (created_at, file_id) без OFFSET, page игнорируется.
+
         Args:
             db: AsyncSession
             page: Номер страницы (1-based)
@@ -424,9 +430,14 @@ class FileService:
             retention_policy: Фильтр по retention policy
             storage_element_id: Фильтр по storage element
             include_deleted: Включать ли удаленные файлы
+            cursor: Курсор следующей страницы (next_cursor предыдущего ответа)
+            exact_total: Точный total (COUNT(*)); False - оценка планировщика
 
         Returns:
             FileListResponse: Список файлов с метаданными pagination
+
+        Raises:
+            ValueError: Некорректный cursor
         """
         logger.debug(
             "Listing files with filters",
@@ -435,13 +446,16 @@ class FileService:
                 "page_size": page_size,
                 "retention_policy": retention_policy.value if retention_policy else None,
                 "storage_element_id": storage_element_id,
-                "include_deleted": include_deleted
+                "include_deleted": include_deleted,
+                "cursor": cursor is not None,
+                "exact_total": exact_total
             }
         )
 
         # Валидация параметров
         page = max(1, page)
         page_size = min(1000, max(1, page_size))
+        keyset = decode_cursor(cursor, "created_at", UUID) if cursor else None
 
         # Построение запроса
         query = select(File)
@@ -460,21 +474,40 @@ class FileService:
             query = query.where(and_(*filters))
             count_query = count_query.where(and_(*filters))
 
-        # Подсчет total
-        total_result = await db.execute(count_query)
-        total = total_result.scalar_one()
+        # Подсчет total (оценка планировщика или точный COUNT(*))
+        total = None
+        if not exact_total:
+            total = await estimate_count(db, select(File.file_id).where(*filters))
+        total_is_estimate = total is not None
+        if total is None:
+            total_result = await db.execute(count_query)
+            total = total_result.scalar_one()
 
-        # Pagination
-        offset = (page - 1) * page_size
-        query = query.offset(offset).limit(page_size)
+        # Pagination: keyset по курсору или OFFSET
+        if keyset:
+            query = query.where(keyset_condition(File.created_at, File.file_id, *keyset))
+        else:
+            offset = (page - 1) * page_size
+            query = query.offset(offset)
 
-        # Сортировка: новые файлы первыми
-        query = query.order_by(File.created_at.desc())
+        # LIMIT + 1 - признак следующей страницы
+        query = query.limit(page_size + 1)
+
+        # Сортировка: новые файлы первыми (file_id - tie-breaker для keyset)
+        query = query.order_by(File.created_at.desc(), File.file_id.desc())
 
         # Выполнение запроса
         result = await db.execute(query)
         files = result.scalars().all()
 
+        next_cursor = None
+        if len(files) > page_size:
+            files = files[:page_size]
+            next_cursor = encode_cursor("created_at", files[-1].created_at, files[-1].file_id)
+
+        if total_is_estimate:
+            total = max(total, len(files))
+
         # Расчет total_pages
         total_pages = (total + page_size - 1) // page_size if total > 0 else 0
 
@@ -482,6 +515,7 @@ class FileService:
             "Files list retrieved",
             extra={
                 "total": total,
+                "total_is_estimate": total_is_estimate,
                 "page": page,
                 "page_size": page_size,
                 "returned_count": len(files)
@@ -493,7 +527,9 @@ class FileService:
             total=total,
             page=page,
             page_size=page_size,
-            total_pages=total_pages
+            total_pages=total_pages,
+            next_cursor=next_cursor,
+            total_is_estimate=total_is_estimate
         )
 
     def _to_event_metadata(self, file: File) -> FileMetadataEvent:
@@ -2,11 +2,9 @@
 Сервис хранения кешированного состояния health checks.
 
 Используется для асинхронной архитектуры readiness probe:
-- Background job периодически проверяет состояние БД и Redis
+- Задача asyncio scheduler периодически проверяет состояние БД и Redis
 - Результат сохраняется в этом сервисе
 - /health/ready endpoint читает из кеша мгновенно (без I/O операций)
-
-Thread-safe для использования из APScheduler background jobs.
 """
 
 from dataclasses import dataclass, field
@@ -58,8 +56,7 @@ class HealthStateService:
     """
     Singleton сервис для хранения кешированного состояния health checks.
 
-    Thread-safe для использования из APScheduler background jobs.
-    Background job вызывает update_state(), endpoint вызывает get_state().
+    Задача scheduler вызывает update_state(), endpoint вызывает get_state().
 
     Example:
         # В background job (scheduler.py):
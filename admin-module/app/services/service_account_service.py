@@ -27,6 +27,7 @@ from app.models.service_account import (
     ServiceAccountStatus
 )
 from app.core.config import settings
+from app.core.password_hashing import credential_cache, password_hash_pool
 from app.core.password_policy import (
     PasswordPolicy,
     PasswordValidator,
@@ -171,7 +172,7 @@ class ServiceAccountService:
         # Генерация client_id и client_secret
         client_id = ServiceAccount.generate_client_id(name, environment)
         client_secret = self.generate_client_secret()
-        client_secret_hash = self.hash_secret(client_secret)
+        client_secret_hash = await password_hash_pool.run("hash", self.hash_secret, client_secret)
 
         # Расчет срока истечения secret (90 дней)
         secret_expires_at = ServiceAccount.calculate_secret_expiry(days=90)
@@ -399,11 +400,14 @@ class ServiceAccountService:
 
             # Проверка password history - запрещаем reuse
             current_history = service_account.secret_history or []
-            is_reused = self.password_history.check_reuse(candidate_secret, current_history)
+            # bcrypt verify по истории секретов - в пуле, не в event loop
+            is_reused = await password_hash_pool.run(
+                "history", self.password_history.check_reuse, candidate_secret, current_history
+            )
 
             if not is_reused:
                 new_secret = candidate_secret
-                new_hash = self.hash_secret(new_secret)
+                new_hash = await password_hash_pool.run("hash", self.hash_secret, new_secret)
                 break
 
             logger.warning(
@@ -500,6 +504,9 @@ class ServiceAccountService:
 
         Returns:
             Optional[ServiceAccount]: Service Account если аутентификация успешна, None иначе
+
+        Raises:
+            PasswordHashBusyError: Пул bcrypt заполнен
         """
         # Получение Service Account по client_id
         service_account = await self.get_by_client_id(db, client_id)
@@ -515,10 +522,14 @@ class ServiceAccountService:
             )
             return None
 
-        # Проверка client_secret
-        if not self.verify_secret(client_secret, service_account.client_secret_hash):
-            logger.warning(f"Invalid client_secret for Service Account: {client_id}")
-            return None
+        # Проверка client_secret: bcrypt в пуле потоков, повторные запросы
+        # с теми же credentials - через кэш подтверждённых credentials
+        secret_hash = service_account.client_secret_hash
+        if not credential_cache.is_verified(client_id, client_secret, secret_hash):
+            if not await password_hash_pool.run("verify", self.verify_secret, client_secret, secret_hash):
+                logger.warning(f"Invalid client_secret for Service Account: {client_id}")
+                return None
+            credential_cache.remember(client_id, client_secret, secret_hash)
 
         # Успешная аутентификация - обновляем last_used_at
         service_account.update_last_used()
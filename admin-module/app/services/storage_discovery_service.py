@@ -3,8 +3,13 @@ Storage Discovery Service для автоматического обнаруже
 
 Сервис для получения информации о storage element по его URL
 и автоматического заполнения данных при регистрации.
+
+Запросы выполняются через общий httpx.AsyncClient с keep-alive пулом:
+периодический health check сотен storage elements не открывает новое
+TCP соединение на каждый опрос.
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from typing import Optional
@@ -64,6 +69,9 @@ class StorageDiscoveryService:
     - Получение информации о storage element по URL
     - Валидация доступности storage element
     - Парсинг и валидация ответа от /api/v1/info endpoint
+
+    Общий HTTP клиент создаётся при первом запросе в текущем event loop
+    и закрывается через aclose() при shutdown приложения.
     """
 
     # Настройки по умолчанию
@@ -78,14 +86,48 @@ class StorageDiscoveryService:
         "priority", "element_id"  # Service Discovery (Sequential Fill)
     }
 
-    def __init__(self, timeout_seconds: Optional[int] = None):
+    def __init__(
+        self,
+        timeout_seconds: Optional[int] = None,
+        max_connections: int = 20
+    ):
         """
         Инициализация сервиса.
 
         Args:
             timeout_seconds: Таймаут для HTTP запросов (секунды)
+            max_connections: Максимум соединений (и keep-alive соединений) общего клиента
         """
         self.timeout_seconds = timeout_seconds or self.DEFAULT_TIMEOUT_SECONDS
+        self.max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Общий keep-alive клиент для текущего event loop.
+
+        Соединения httpx привязаны к event loop, в котором созданы:
+        вызов из другого loop получает новый клиент.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Закрытие общего HTTP клиента (lifespan shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
 
     def _normalize_url(self, api_url: str) -> str:
         """
@@ -174,7 +216,8 @@ class StorageDiscoveryService:
 
     async def discover_storage_element(
         self,
-        api_url: str
+        api_url: str,
+        timeout_seconds: Optional[float] = None
     ) -> StorageElementDiscoveryResult:
         """
         Получить информацию о storage element по URL.
@@ -184,6 +227,7 @@ class StorageDiscoveryService:
 
         Args:
             api_url: URL API storage element
+            timeout_seconds: Таймаут запроса (по умолчанию timeout_seconds сервиса)
 
         Returns:
             StorageElementDiscoveryResult: Информация о storage element
@@ -195,60 +239,60 @@ class StorageDiscoveryService:
         """
         info_url = self._build_info_url(api_url)
         normalized_url = self._normalize_url(api_url)
+        timeout = timeout_seconds or self.timeout_seconds
 
-        logger.info(f"Выполняю discovery storage element: {info_url}")
+        logger.debug(f"Выполняю discovery storage element: {info_url}")
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
-                response = await client.get(info_url)
-
-                if response.status_code != 200:
-                    raise StorageElementUnreachableError(
-                        api_url=normalized_url,
-                        reason=f"HTTP {response.status_code}: {response.text[:200]}"
-                    )
-
-                try:
-                    data = response.json()
-                except Exception as e:
-                    raise StorageElementInvalidResponseError(
-                        api_url=normalized_url,
-                        reason=f"Ответ не является валидным JSON: {e}"
-                    )
-
-                # Валидируем структуру ответа
-                self._validate_response(data, normalized_url)
-
-                # Формируем результат
-                result = StorageElementDiscoveryResult(
-                    name=str(data["name"]),
-                    display_name=str(data["display_name"]),
-                    version=str(data["version"]),
-                    mode=str(data["mode"]),
-                    storage_type=str(data["storage_type"]),
-                    base_path=str(data["base_path"]),
-                    capacity_bytes=int(data["capacity_bytes"]),
-                    used_bytes=int(data["used_bytes"]),
-                    file_count=int(data["file_count"]),
-                    status=str(data["status"]),
-                    priority=int(data["priority"]),
-                    element_id=str(data["element_id"]),
-                    api_url=normalized_url
+            response = await self._get_client().get(info_url, timeout=timeout)
+
+            if response.status_code != 200:
+                raise StorageElementUnreachableError(
+                    api_url=normalized_url,
+                    reason=f"HTTP {response.status_code}: {response.text[:200]}"
                 )
 
-                logger.info(
-                    f"Discovery успешен для {normalized_url}: "
-                    f"name={result.display_name}, mode={result.mode}, "
-                    f"type={result.storage_type}"
+            try:
+                data = response.json()
+            except Exception as e:
+                raise StorageElementInvalidResponseError(
+                    api_url=normalized_url,
+                    reason=f"Ответ не является валидным JSON: {e}"
                 )
 
-                return result
+            # Валидируем структуру ответа
+            self._validate_response(data, normalized_url)
+
+            # Формируем результат
+            result = StorageElementDiscoveryResult(
+                name=str(data["name"]),
+                display_name=str(data["display_name"]),
+                version=str(data["version"]),
+                mode=str(data["mode"]),
+                storage_type=str(data["storage_type"]),
+                base_path=str(data["base_path"]),
+                capacity_bytes=int(data["capacity_bytes"]),
+                used_bytes=int(data["used_bytes"]),
+                file_count=int(data["file_count"]),
+                status=str(data["status"]),
+                priority=int(data["priority"]),
+                element_id=str(data["element_id"]),
+                api_url=normalized_url
+            )
+
+            logger.debug(
+                f"Discovery успешен для {normalized_url}: "
+                f"name={result.display_name}, mode={result.mode}, "
+                f"type={result.storage_type}"
+            )
+
+            return result
 
         except httpx.TimeoutException:
             logger.warning(f"Timeout при запросе к {info_url}")
             raise StorageElementTimeoutError(
                 api_url=normalized_url,
-                timeout_seconds=self.timeout_seconds
+                timeout_seconds=timeout
             )
 
         except httpx.ConnectError as e:
@@ -296,4 +340,6 @@ class StorageDiscoveryService:
 
 
 # Глобальный экземпляр сервиса
-storage_discovery_service = StorageDiscoveryService()
+storage_discovery_service = StorageDiscoveryService(
+    max_connections=settings.scheduler.storage_health_check_concurrency
+)
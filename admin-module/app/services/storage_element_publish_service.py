@@ -19,7 +19,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.redis import service_discovery, publish_storage_element_config_standalone
+from app.core.redis import service_discovery
 from app.models.storage_element import StorageElement, StorageStatus, StorageMode
 
 logger = logging.getLogger(__name__)
@@ -314,10 +314,11 @@ class StorageElementPublishService:
 
     async def publish_scheduled(self, db: AsyncSession) -> int:
         """
-        Периодическая публикация по расписанию (используется в FastAPI context).
+        Периодическая публикация по расписанию.
 
-        Вызывается APScheduler каждые N секунд (настраивается в config).
-        Для background jobs используйте publish_scheduled_standalone().
+        Вызывается задачей storage_element_publish_job asyncio scheduler
+        (app.core.scheduler) в event loop приложения каждые
+        SERVICE_DISCOVERY_PUBLISH_INTERVAL секунд.
 
         Args:
             db: AsyncSession
@@ -330,52 +331,6 @@ class StorageElementPublishService:
             action="scheduled"
         )
 
-    async def publish_scheduled_standalone(self, db: AsyncSession) -> int:
-        """
-        Периодическая публикация для background jobs (отдельный event loop).
-
-        Использует standalone Redis client, который работает в отдельном event loop.
-        ВАЖНО: Используйте этот метод ТОЛЬКО в APScheduler background jobs,
-        для FastAPI endpoints используйте publish_scheduled().
-
-        Args:
-            db: AsyncSession (standalone, созданный через create_standalone_async_session)
-
-        Returns:
-            int: Количество подписчиков
-        """
-        if not settings.service_discovery.enabled:
-            logger.debug("Service Discovery отключен, публикация пропущена")
-            return 0
-
-        try:
-            # Получаем storage elements
-            storage_elements = await self.get_all_storage_elements(db)
-
-            # Формируем конфигурацию
-            config = self._build_storage_element_config(storage_elements)
-
-            # Публикуем через standalone функцию (собственный Redis client)
-            subscribers = await publish_storage_element_config_standalone(
-                config=config,
-                action="scheduled"
-            )
-
-            logger.info(
-                f"Опубликована конфигурация storage elements (standalone): "
-                f"action=scheduled, count={config['count']}, "
-                f"version={config['version']}, subscribers={subscribers}"
-            )
-
-            return subscribers
-
-        except Exception as e:
-            logger.error(
-                f"Ошибка публикации конфигурации storage elements (standalone): {e}",
-                exc_info=True
-            )
-            return 0
-
     async def publish_startup(self, db: AsyncSession) -> int:
         """
         Публикация при запуске приложения.
@@ -5,12 +5,13 @@ Storage Sync Service для синхронизации информации о s
 storage elements с их актуальным состоянием.
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.storage_element import (
@@ -18,13 +19,16 @@ from app.models.storage_element import (
     StorageMode,
     StorageStatus,
 )
+from app.core.config import settings
 from app.core.exceptions import (
     StorageElementNotFoundError,
     StorageElementDiscoveryError,
+    StorageElementTimeoutError,
 )
 from app.services.storage_discovery_service import (
     StorageDiscoveryService,
     StorageElementDiscoveryResult,
+    storage_discovery_service,
 )
 from app.services.storage_element_publish_service import storage_element_publish_service
 
@@ -63,7 +67,7 @@ class StorageSyncService:
 
     Функции:
     - Ручная синхронизация отдельного storage element
-    - Массовая синхронизация всех storage elements
+    - Массовая синхронизация всех storage elements (параллельный discovery)
     - Отслеживание изменений (diff) при синхронизации
     """
 
@@ -72,9 +76,10 @@ class StorageSyncService:
         Инициализация сервиса.
 
         Args:
-            discovery_service: Сервис для discovery (опционально, создается по умолчанию)
+            discovery_service: Сервис для discovery (по умолчанию общий
+                storage_discovery_service с keep-alive HTTP клиентом)
         """
-        self.discovery_service = discovery_service or StorageDiscoveryService()
+        self.discovery_service = discovery_service or storage_discovery_service
 
     def _map_status(self, discovered_status: str) -> StorageStatus:
         """
@@ -211,6 +216,115 @@ class StorageSyncService:
         storage_element.element_id = discovery_result.element_id
         storage_element.last_health_check = datetime.now(timezone.utc)
 
+    def _apply_discovery(
+        self,
+        storage_element: StorageElement,
+        discovery_result: Optional[StorageElementDiscoveryResult],
+        error: Optional[Exception] = None
+    ) -> SyncResult:
+        """
+        Применить результат discovery к storage element (без commit).
+
+        Объект изменяется только при отличиях от discovered состояния.
+        Недоступный storage element помечается OFFLINE; если он уже
+        OFFLINE - изменений нет.
+
+        Args:
+            storage_element: Объект для обновления
+            discovery_result: Данные от storage element (None при ошибке)
+            error: Ошибка discovery
+
+        Returns:
+            SyncResult: Результат синхронизации с изменениями
+        """
+        if error is None:
+            changes = self._collect_changes(storage_element, discovery_result)
+            if changes:
+                self._apply_changes(storage_element, discovery_result)
+                logger.info(
+                    f"Синхронизация {storage_element.name}: "
+                    f"{len(changes)} изменений применено"
+                )
+                for change in changes:
+                    logger.debug(
+                        f"  {change.field}: {change.old_value} -> {change.new_value}"
+                    )
+            else:
+                logger.debug(f"Синхронизация {storage_element.name}: без изменений")
+
+            return SyncResult(
+                storage_element_id=storage_element.id,
+                storage_element_name=storage_element.name,
+                success=True,
+                changes=changes
+            )
+
+        if not isinstance(error, StorageElementDiscoveryError):
+            logger.error(
+                f"Неожиданная ошибка синхронизации {storage_element.name}: {error}"
+            )
+            return SyncResult(
+                storage_element_id=storage_element.id,
+                storage_element_name=storage_element.name,
+                success=False,
+                error=f"Неожиданная ошибка: {error}"
+            )
+
+        logger.warning(f"Ошибка синхронизации {storage_element.name}: {error}")
+
+        # При ошибке discovery - помечаем как offline
+        changes = []
+        if storage_element.status != StorageStatus.OFFLINE:
+            changes.append(SyncChange(
+                field="status",
+                old_value=storage_element.status.value,
+                new_value=StorageStatus.OFFLINE.value
+            ))
+            storage_element.status = StorageStatus.OFFLINE
+            storage_element.last_health_check = datetime.now(timezone.utc)
+
+        return SyncResult(
+            storage_element_id=storage_element.id,
+            storage_element_name=storage_element.name,
+            success=False,
+            error=str(error),
+            changes=changes
+        )
+
+    async def _discover(
+        self,
+        api_url: str,
+        semaphore: asyncio.Semaphore,
+        timeout_seconds: float
+    ) -> Tuple[Optional[StorageElementDiscoveryResult], Optional[Exception]]:
+        """
+        Discovery одного storage element в рамках общего лимита параллельности.
+
+        asyncio.wait_for ограничивает весь опрос (таймауты httpx действуют
+        на каждую фазу запроса отдельно): медленный узел не задерживает
+        синхронизацию остальных дольше timeout_seconds.
+
+        Returns:
+            Tuple: (результат discovery, ошибка)
+        """
+        async with semaphore:
+            try:
+                discovery_result = await asyncio.wait_for(
+                    self.discovery_service.discover_storage_element(
+                        api_url,
+                        timeout_seconds=timeout_seconds
+                    ),
+                    timeout=timeout_seconds
+                )
+                return discovery_result, None
+            except asyncio.TimeoutError:
+                return None, StorageElementTimeoutError(
+                    api_url=api_url,
+                    timeout_seconds=timeout_seconds
+                )
+            except Exception as e:
+                return None, e
+
     async def sync_storage_element(
         self,
         db: AsyncSession,
@@ -246,71 +360,31 @@ class StorageSyncService:
             f"(ID: {storage_element_id})"
         )
 
+        discovery_result, error = None, None
         try:
-            # Выполняем discovery
             discovery_result = await self.discovery_service.discover_storage_element(
                 storage_element.api_url
             )
+        except Exception as e:
+            error = e
 
-            # Собираем изменения
-            changes = self._collect_changes(storage_element, discovery_result)
-
-            # Применяем изменения
-            self._apply_changes(storage_element, discovery_result)
+        sync_result = self._apply_discovery(storage_element, discovery_result, error)
+        if error is not None and not isinstance(error, StorageElementDiscoveryError):
+            # Неожиданная ошибка - состояние в БД не изменяется
+            return sync_result
 
+        try:
+            storage_element.last_health_check = datetime.now(timezone.utc)
             await db.commit()
 
-            # Публикуем обновления в Redis для Service Discovery
+            # Публикуем в Redis только если были изменения
             # Это критически важно для корректной работы Sequential Fill Algorithm
-            if changes:
-                logger.info(
-                    f"Синхронизация {storage_element.name}: "
-                    f"{len(changes)} изменений применено"
-                )
-                for change in changes:
-                    logger.debug(
-                        f"  {change.field}: {change.old_value} -> {change.new_value}"
-                    )
-                # Публикуем в Redis только если были изменения
+            if sync_result.has_changes:
                 await storage_element_publish_service.publish_on_sync(
                     db, storage_element
                 )
-            else:
-                logger.debug(f"Синхронизация {storage_element.name}: без изменений")
-
-            return SyncResult(
-                storage_element_id=storage_element_id,
-                storage_element_name=storage_element.name,
-                success=True,
-                changes=changes
-            )
-
-        except StorageElementDiscoveryError as e:
-            logger.warning(
-                f"Ошибка синхронизации {storage_element.name}: {e}"
-            )
 
-            # При ошибке discovery - помечаем как offline
-            storage_element.status = StorageStatus.OFFLINE
-            storage_element.last_health_check = datetime.now(timezone.utc)
-            await db.commit()
-
-            # Публикуем изменение статуса в Redis
-            await storage_element_publish_service.publish_on_sync(
-                db, storage_element
-            )
-
-            return SyncResult(
-                storage_element_id=storage_element_id,
-                storage_element_name=storage_element.name,
-                success=False,
-                error=str(e),
-                changes=[SyncChange(
-                    field="status",
-                    old_value=storage_element.status.value,
-                    new_value=StorageStatus.OFFLINE.value
-                )]
-            )
+            return sync_result
 
         except Exception as e:
             logger.error(
@@ -328,14 +402,28 @@ class StorageSyncService:
     async def sync_all_storage_elements(
         self,
         db: AsyncSession,
-        only_online: bool = True
+        only_online: bool = True,
+        concurrency: Optional[int] = None,
+        timeout_seconds: Optional[float] = None
     ) -> List[SyncResult]:
         """
         Синхронизировать все storage elements.
 
+        Discovery выполняется параллельно (не более concurrency опросов
+        одновременно, общий keep-alive HTTP клиент), изменения применяются
+        к БД последовательно в одной сессии:
+        - строки storage elements обновляются только при отличиях
+        - last_health_check остальных опрошенных элементов - одним UPDATE
+        - один commit и одна публикация конфигурации в Redis, только если
+          что-то изменилось
+
         Args:
             db: Сессия базы данных
             only_online: Синхронизировать только online элементы
+            concurrency: Максимум одновременных опросов
+                (по умолчанию SCHEDULER_STORAGE_HEALTH_CHECK_CONCURRENCY)
+            timeout_seconds: Таймаут опроса одного storage element
+                (по умолчанию SCHEDULER_STORAGE_HEALTH_CHECK_TIMEOUT_SECONDS)
 
         Returns:
             List[SyncResult]: Результаты синхронизации
@@ -348,12 +436,46 @@ class StorageSyncService:
         result = await db.execute(query)
         storage_elements = result.scalars().all()
 
+        if not storage_elements:
+            return []
+
         logger.info(f"Начало массовой синхронизации: {len(storage_elements)} элементов")
 
+        semaphore = asyncio.Semaphore(
+            concurrency or settings.scheduler.storage_health_check_concurrency
+        )
+        timeout = timeout_seconds or settings.scheduler.storage_health_check_timeout_seconds
+
+        outcomes = await asyncio.gather(*(
+            self._discover(storage_element.api_url, semaphore, timeout)
+            for storage_element in storage_elements
+        ))
+
         results = []
-        for storage_element in storage_elements:
-            sync_result = await self.sync_storage_element(db, storage_element.id)
+        checked_ids = []
+        for storage_element, (discovery_result, error) in zip(storage_elements, outcomes):
+            sync_result = self._apply_discovery(storage_element, discovery_result, error)
             results.append(sync_result)
+            if not sync_result.has_changes and (error is None or isinstance(error, StorageElementDiscoveryError)):
+                checked_ids.append(storage_element.id)
+
+        has_changes = any(r.has_changes for r in results)
+        try:
+            if checked_ids:
+                await db.execute(
+                    update(StorageElement)
+                    .where(StorageElement.id.in_(checked_ids))
+                    .values(last_health_check=datetime.now(timezone.utc))
+                    .execution_options(synchronize_session=False)
+                )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+        # publish_on_sync публикует конфигурацию всех storage elements
+        if has_changes:
+            await storage_element_publish_service.publish_on_sync(db)
 
         # Подсчитываем статистику
         success_count = sum(1 for r in results if r.success)
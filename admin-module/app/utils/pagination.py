@@ -0,0 +1,139 @@
+"""
+Keyset (cursor) пагинация.
+
+Курсор - непрозрачный токен base64url(JSON [поле сортировки, значение, id])
+последней записи страницы. Следующая страница выбирается условием
+(sort_column, id) < (value, id) вместо OFFSET: стоимость запроса не растёт
+с глубиной листания, а вставки новых файлов не сдвигают страницы.
+Курсор выдаётся только для полей с составным индексом (sort_column, id).
+
+Точный COUNT(*) по большой таблице заменяется оценкой планировщика
+(EXPLAIN, статистика pg_class/pg_statistic).
+
+Vendored модуль: эталонная копия - admin-module/app/utils/pagination.py,
+в Query Module и Storage Element копируется без изменений (проверка -
+tests/test_vendored_modules.py в корне репозитория).
+"""
+
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+logger = logging.getLogger(__name__)
+
+_DATETIME_TAG = "dt"
+
+
+def encode_cursor(sort_key: str, sort_value: Any, item_id: Any) -> str:
+    """
+    Кодирование курсора по последней записи страницы.
+
+    Args:
+        sort_key: Имя поля сортировки (курсор действителен только для него)
+        sort_value: Значение поля сортировки последней записи
+        item_id: Идентификатор последней записи (tie-breaker)
+
+    Returns:
+        str: Непрозрачный токен продолжения
+    """
+    if isinstance(sort_value, datetime):
+        sort_value = {_DATETIME_TAG: sort_value.isoformat()}
+
+    payload = json.dumps([sort_key, sort_value, str(item_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str, id_type: Callable[[str], Any] = str) -> Tuple[Any, Any]:
+    """
+    Декодирование курсора.
+
+    Args:
+        cursor: Токен продолжения из предыдущего ответа
+        sort_key: Текущее поле сортировки
+        id_type: Тип идентификатора записи (str, UUID)
+
+    Returns:
+        Tuple[Any, Any]: (значение поля сортировки, id)
+
+    Raises:
+        ValueError: Повреждённый курсор или курсор другой сортировки
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key, sort_value, item_id = json.loads(raw)
+        if isinstance(sort_value, dict):
+            sort_value = datetime.fromisoformat(sort_value[_DATETIME_TAG])
+        item_id = id_type(item_id)
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+
+    if key != sort_key:
+        raise ValueError(f"Cursor was issued for sort by '{key}', not '{sort_key}'")
+
+    return sort_value, item_id
+
+
+def keyset_condition(sort_column, id_column, sort_value: Any, item_id: Any, descending: bool = True):
+    """
+    Условие keyset пагинации: записи строго после курсора.
+
+    Row comparison (sort_column, id) использует составной индекс
+    (sort_column, id) как range scan.
+    """
+    row = tuple_(sort_column, id_column)
+    if descending:
+        return row < tuple_(sort_value, item_id)
+    return row > tuple_(sort_value, item_id)
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) запроса с bind параметрами исходного запроса."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain)
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def estimate_count(db: AsyncSession, query: Select) -> Optional[int]:
+    """
+    Оценка количества строк запроса по статистике планировщика.
+
+    Значения фильтров передаются bind параметрами (как в самом запросе),
+    а не подставляются литералами в текст EXPLAIN.
+
+    Args:
+        db: Database session
+        query: SELECT с фильтрами (без LIMIT/OFFSET)
+
+    Returns:
+        Optional[int]: Оценка (Plan Rows) или None - оценка недоступна,
+            вызывающий код выполняет точный COUNT(*)
+    """
+    try:
+        # SAVEPOINT: ошибка EXPLAIN не прерывает транзакцию запроса
+        async with db.begin_nested():
+            result = await db.execute(_Explain(query))
+            plan = result.scalar()
+    except (SQLAlchemyError, NotImplementedError) as e:
+        logger.debug("Count estimate unavailable", extra={"error": str(e)})
+        return None
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,125 @@
+"""
+Load test выдачи токенов OAuth 2.0 (POST /api/v1/auth/token).
+
+Вызывает handler oauth2_token конкурентно для нескольких service accounts
+с настоящим bcrypt (rounds=12); PostgreSQL и подпись JWT заменены
+заглушками - измеряется стоимость проверки client_secret.
+
+Проверяет:
+- Event loop не блокируется bcrypt: задержка heartbeat задачи во время
+  пакета первых (cold) запросов остаётся малой
+- Повторные запросы тех же credentials проходят через кэш без bcrypt
+- Throughput cold и warm выдачи токенов (tokens/sec)
+
+Run:
+    pytest tests/performance/test_token_issuance_load.py -m slow -s
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.api.v1.endpoints.auth import oauth2_token
+from app.core.password_hashing import credential_cache, password_hash_pool
+from app.schemas.service_account import OAuth2TokenRequest
+from app.services.service_account_service import ServiceAccountService
+
+ACCOUNTS = 8
+WARM_REQUESTS = 2000
+HEARTBEAT_INTERVAL = 0.01
+
+
+def _accounts():
+    accounts = {}
+    for index in range(ACCOUNTS):
+        secret = f"Load-Test-Secret-{index}!"
+        account = MagicMock()
+        account.can_authenticate.return_value = True
+        account.client_secret_hash = ServiceAccountService.hash_secret(secret)
+        accounts[f"sa_load_{index}"] = (account, secret)
+    return accounts
+
+
+async def _issue(accounts, client_id):
+    _, secret = accounts[client_id]
+    return await oauth2_token(
+        request=OAuth2TokenRequest(grant_type="client_credentials", client_id=client_id, client_secret=secret),
+        db=AsyncMock()
+    )
+
+
+async def _max_loop_lag(work):
+    """Выполнение work и максимальная задержка heartbeat задачи event loop."""
+    lags = []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            lags.append(time.perf_counter() - started - HEARTBEAT_INTERVAL)
+
+    task = asyncio.create_task(heartbeat())
+    try:
+        await work
+    finally:
+        done.set()
+        await task
+    return max(lags, default=0.0)
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_token_issuance_throughput():
+    accounts = _accounts()
+    credential_cache.clear()
+
+    async def get_by_client_id(self, db, client_id):
+        return accounts[client_id][0]
+
+    verify_calls = 0
+    pool_run = password_hash_pool.run
+
+    async def counting_run(operation, func, *args):
+        nonlocal verify_calls
+        if operation == "verify":
+            verify_calls += 1
+        return await pool_run(operation, func, *args)
+
+    with patch.object(ServiceAccountService, "get_by_client_id", get_by_client_id), \
+            patch.object(password_hash_pool, "run", counting_run), \
+            patch("app.api.v1.endpoints.auth.get_sync_session", lambda: iter([MagicMock()])), \
+            patch(
+                "app.api.v1.endpoints.auth.token_service.create_service_account_token_pair",
+                return_value=("access", "refresh")
+            ):
+        # Cold: bcrypt для каждого service account в пуле потоков
+        started = time.perf_counter()
+        lag = await _max_loop_lag(asyncio.gather(*(_issue(accounts, client_id) for client_id in accounts)))
+        cold_elapsed = time.perf_counter() - started
+        cold_verify_calls = verify_calls
+
+        # Warm: повторная выдача токенов - кэш подтверждённых credentials
+        client_ids = list(accounts) * (WARM_REQUESTS // ACCOUNTS)
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(_issue(accounts, client_id) for client_id in client_ids))
+        warm_elapsed = time.perf_counter() - started
+
+    print(
+        f"\ncold: {ACCOUNTS} tokens in {cold_elapsed:.2f}s "
+        f"({ACCOUNTS / cold_elapsed:.1f} tokens/sec, workers={password_hash_pool.max_workers}, "
+        f"max loop lag {lag * 1000:.1f} ms)"
+        f"\nwarm: {len(responses)} tokens in {warm_elapsed:.2f}s "
+        f"({len(responses) / warm_elapsed:.0f} tokens/sec)"
+    )
+
+    assert all(response.access_token == "access" for response in responses)
+    # Один bcrypt (~250 мс) в event loop дал бы задержку всего цикла
+    assert lag < 0.1
+    assert cold_verify_calls == ACCOUNTS
+    # Попадания в кэш не вызывают bcrypt
+    assert verify_calls == cold_verify_calls
+    # Сравнение задержки одного запроса: суммарное время пакетов зависит от машины
+    assert warm_elapsed / len(responses) < cold_elapsed / ACCOUNTS
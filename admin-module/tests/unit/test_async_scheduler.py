@@ -0,0 +1,185 @@
+"""
+Unit тесты для AsyncScheduler и LeaderLease.
+
+Redis заменён заглушкой, повторяющей Lua скрипты lease в памяти.
+
+Тестирование:
+1. Периодический запуск задач в event loop и graceful shutdown
+2. Jitter и отсутствие перекрытия запусков
+3. Задачи leader_only выполняет только держатель leader lease
+4. Метрики длительности выполнения задач
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.async_scheduler import (
+    LEADER_LEASE_SCRIPT,
+    LEADER_RELEASE_SCRIPT,
+    AsyncScheduler,
+    LeaderLease,
+    ScheduledJob,
+)
+
+
+class _FakeRedis:
+    """Ключи lease в памяти (семантика LEADER_*_SCRIPT, без TTL)."""
+
+    def __init__(self):
+        self.values = {}
+        self.available = True
+
+    async def eval(self, script, numkeys, key, instance_id, *args):
+        if not self.available:
+            raise ConnectionError("redis down")
+        owner = self.values.get(key)
+        if script == LEADER_LEASE_SCRIPT:
+            if owner in (None, instance_id):
+                self.values[key] = instance_id
+                return 1
+            return 0
+        if script == LEADER_RELEASE_SCRIPT and owner == instance_id:
+            del self.values[key]
+            return 1
+        return 0
+
+
+def _lease(redis, instance_id):
+    async def get_redis():
+        return redis
+    return LeaderLease(get_redis, key="scheduler:leader", lease_seconds=30, instance_id=instance_id)
+
+
+class TestLeaderLease:
+    """Тесты LeaderLease."""
+
+    @pytest.mark.asyncio
+    async def test_single_leader_and_failover(self):
+        redis = _FakeRedis()
+        first, second = _lease(redis, "admin-1"), _lease(redis, "admin-2")
+
+        assert await first.refresh()
+        assert not await second.refresh()
+        # Продление своего lease
+        assert await first.refresh()
+
+        await first.release()
+        assert not first.is_leader
+        assert await second.refresh()
+
+    @pytest.mark.asyncio
+    async def test_leadership_expires_locally_without_redis(self):
+        redis = _FakeRedis()
+        lease = _lease(redis, "admin-1")
+
+        with patch("app.core.async_scheduler.time.monotonic", return_value=100.0):
+            assert await lease.refresh()
+
+        redis.available = False
+        with patch("app.core.async_scheduler.time.monotonic", return_value=110.0):
+            assert await lease.refresh()
+        # 2/3 срока lease - раньше, чем lease истечёт в Redis
+        with patch("app.core.async_scheduler.time.monotonic", return_value=121.0):
+            assert not await lease.refresh()
+
+
+class TestScheduledJob:
+    """Тесты расчёта задержки запуска."""
+
+    def test_jitter_bounds(self):
+        job = ScheduledJob(id="job", name="Job", func=None, interval_seconds=60, jitter_seconds=5)
+
+        delays = [job.next_delay() for _ in range(100)]
+
+        assert all(60 <= delay <= 65 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_long_run_shortens_next_delay(self):
+        job = ScheduledJob(id="job", name="Job", func=None, interval_seconds=60)
+
+        assert job.next_delay(elapsed=45) == 15
+        # Пропущенные интервалы не накапливаются
+        assert job.next_delay(elapsed=200) == 0
+
+
+@pytest.mark.asyncio
+class TestAsyncScheduler:
+    """Тесты AsyncScheduler."""
+
+    async def test_runs_periodically_until_shutdown(self):
+        runs = []
+
+        async def job():
+            runs.append(asyncio.get_running_loop())
+
+        scheduler = AsyncScheduler(shutdown_timeout_seconds=1)
+        scheduler.add_job(job, id="tick", name="Tick", interval_seconds=0.02)
+        scheduler.start()
+        await asyncio.sleep(0.15)
+        await scheduler.shutdown()
+        count = len(runs)
+        await asyncio.sleep(0.05)
+
+        assert count >= 3
+        assert len(runs) == count
+        assert all(loop is asyncio.get_running_loop() for loop in runs)
+        assert not scheduler.running
+
+    async def test_overlapping_run_skipped(self):
+        release = asyncio.Event()
+
+        async def job():
+            await release.wait()
+
+        scheduler = AsyncScheduler()
+        scheduler.add_job(job, id="slow_job", name="Slow", interval_seconds=60)
+
+        first = asyncio.ensure_future(scheduler.run_job("slow_job"))
+        await asyncio.sleep(0)
+
+        assert await scheduler.run_job("slow_job") == "skipped"
+        release.set()
+        assert await first == "success"
+
+    async def test_leader_only_job_requires_lease(self):
+        redis = _FakeRedis()
+        redis.values["scheduler:leader"] = "admin-2"
+        runs = []
+
+        async def job():
+            runs.append(1)
+
+        scheduler = AsyncScheduler(leader_lease=_lease(redis, "admin-1"))
+        scheduler.add_job(job, id="gc", name="GC", interval_seconds=60, leader_only=True)
+        scheduler.add_job(job, id="readiness", name="Readiness", interval_seconds=60)
+
+        await scheduler.leader_lease.refresh()
+        assert await scheduler.run_job("gc") == "skipped"
+        assert await scheduler.run_job("readiness") == "success"
+
+        del redis.values["scheduler:leader"]
+        await scheduler.leader_lease.refresh()
+        assert await scheduler.run_job("gc") == "success"
+        assert len(runs) == 2
+
+    async def test_duration_histogram_and_errors(self):
+        async def failing_job():
+            raise RuntimeError("boom")
+
+        scheduler = AsyncScheduler()
+        scheduler.add_job(failing_job, id="metrics_job", name="Metrics", interval_seconds=60)
+
+        def sample(name, **labels):
+            return REGISTRY.get_sample_value(name, {"job": "metrics_job", **labels}) or 0
+
+        count_before = sample("scheduler_job_duration_seconds_count")
+        errors_before = sample("scheduler_job_runs_total", result="error")
+
+        assert await scheduler.run_job("metrics_job") == "error"
+
+        assert sample("scheduler_job_duration_seconds_count") == count_before + 1
+        assert sample("scheduler_job_runs_total", result="error") == errors_before + 1
+        assert not scheduler.jobs["metrics_job"].running
@@ -0,0 +1,231 @@
+"""
+Unit тесты для AuditWriter.
+
+Тестирование фоновой записи audit logs:
+1. Строки audit_logs с HMAC подписью по записи AuditMiddleware
+2. Пакетная запись из очереди
+3. Spill файл при ошибке PostgreSQL и заполненной очереди (фоновой задачей)
+4. Перенос spill файла в audit_logs
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from typing import List
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app.models.audit_log import AuditLog
+from app.services.audit_writer import (
+    ANONYMOUS_ACTOR,
+    AuditWriter,
+    actor_from_payload,
+    build_row,
+    dump_row,
+    load_row,
+)
+
+
+def _record(path: str = "/api/v1/service-accounts", status_code: int = 201, token: str = None) -> dict:
+    return {
+        "created_at": datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc),
+        "method": "POST",
+        "path": path,
+        "query_params": "",
+        "status_code": status_code,
+        "duration_ms": 12.5,
+        "error_message": None,
+        "ip_address": "10.0.0.1",
+        "user_agent": "pytest",
+        "request_id": "req-1",
+        "token": token,
+    }
+
+
+class _RecordingWriter(AuditWriter):
+    def __init__(self, tmp_path, **kwargs):
+        params = {
+            "queue_size": 100,
+            "flush_size": 3,
+            "flush_interval_ms": 50,
+            "write_timeout_seconds": 1.0,
+            "spill_path": str(tmp_path / "audit_spill.jsonl"),
+        }
+        params.update(kwargs)
+        super().__init__(**params)
+        self.batches: List[List[dict]] = []
+        self.fail = False
+
+    async def _insert(self, rows):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        self.batches.append(list(rows))
+
+
+class TestAuditRows:
+    """Тесты построения строк audit_logs."""
+
+    def test_build_row_matches_middleware_event(self):
+        row = build_row(_record(status_code=403), ANONYMOUS_ACTOR)
+
+        assert row["event_type"] == "http_create_service-accounts"
+        assert row["action"] == "service-accounts"
+        assert row["severity"] == "warning"
+        assert row["success"] is False
+        assert row["actor_type"] == "system"
+        assert row["data"]["duration_ms"] == 12.5
+        assert row["created_at"] == datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+        assert "token" not in row
+        assert len(row["hmac_signature"]) == 64
+
+    def test_signature_verifies_with_stored_created_at(self):
+        row = build_row(_record(), ANONYMOUS_ACTOR)
+
+        assert AuditLog(**row).verify_signature()
+
+    def test_actor_from_payload(self):
+        service_account_id = uuid4()
+
+        actor = actor_from_payload({"sub": str(service_account_id), "type": "service_account"})
+        assert actor["actor_type"] == "service_account"
+        assert actor["service_account_id"] == service_account_id
+
+        actor = actor_from_payload({"sub": "admin", "type": "admin_user"})
+        assert actor["actor_type"] == "admin_user"
+        assert build_row(_record(), actor)["data"]["username"] == "admin"
+
+        assert actor_from_payload({}) is ANONYMOUS_ACTOR
+
+    def test_spill_line_roundtrip(self):
+        row = build_row(_record(), actor_from_payload({"sub": str(uuid4()), "type": "service_account"}))
+
+        assert load_row(dump_row(row)) == row
+
+
+@pytest.mark.asyncio
+class TestAuditWriter:
+    """Тесты фоновой записи и spill файла."""
+
+    async def test_flush_by_size_and_interval(self, tmp_path):
+        writer = _RecordingWriter(tmp_path)
+        await writer.start()
+
+        for _ in range(4):
+            assert writer.enqueue(_record())
+        await asyncio.sleep(0.15)
+
+        assert [len(batch) for batch in writer.batches] == [3, 1]
+        await writer.close()
+
+    async def test_actor_resolved_once_per_token(self, tmp_path):
+        writer = _RecordingWriter(tmp_path)
+        await writer.start()
+
+        with patch(
+            "app.services.audit_writer.token_service.decode_token",
+            return_value={"sub": "admin", "type": "admin_user", "exp": 4102444800},
+        ) as decode_token, patch("app.services.audit_writer.SyncSessionLocal"):
+            for _ in range(3):
+                writer.enqueue(_record(token="header.payload.signature"))
+            await asyncio.sleep(0.1)
+
+        assert decode_token.call_count == 1
+        assert all(row["actor_type"] == "admin_user" for row in writer.batches[0])
+        await writer.close()
+
+    async def test_write_error_spills_and_replays(self, tmp_path):
+        writer = _RecordingWriter(tmp_path, flush_size=2)
+        await writer.start()
+
+        writer.fail = True
+        writer.enqueue(_record(token="secret-token"))
+        writer.enqueue(_record())
+        await asyncio.sleep(0.05)
+
+        spilled = writer.spill_path.read_text(encoding="utf-8")
+        assert len(spilled.splitlines()) == 2
+        assert "secret-token" not in spilled
+        assert writer.batches == []
+
+        writer.fail = False
+        writer.enqueue(_record())
+        await writer.close()
+
+        # Пакет из очереди и затем перенесённые строки spill файла
+        assert [len(batch) for batch in writer.batches] == [1, 2]
+        assert not writer.spill_path.exists()
+        assert not writer.replay_path.exists()
+
+    async def test_replay_failure_keeps_remaining_rows(self, tmp_path):
+        writer = _RecordingWriter(tmp_path, flush_size=2)
+        writer.spill_path.write_text(
+            "".join(dump_row(build_row(_record(), ANONYMOUS_ACTOR)) + "\n" for _ in range(3)),
+            encoding="utf-8",
+        )
+
+        writer.fail = True
+        assert await writer.replay_spill() == 0
+        assert len(writer.replay_path.read_text(encoding="utf-8").splitlines()) == 3
+
+        writer.fail = False
+        assert await writer.replay_spill() == 3
+        assert not writer.replay_path.exists()
+
+    async def test_replay_waits_for_spill_in_progress(self, tmp_path):
+        """Строки, дописываемые в spill файл во время переноса, не теряются."""
+        writer = _RecordingWriter(tmp_path, flush_size=10)
+        line = dump_row(build_row(_record(), ANONYMOUS_ACTOR)) + "\n"
+        writer.spill_path.write_text(line, encoding="utf-8")
+
+        # Дописывание spill файла в thread pool ещё не завершено
+        writer._spill_lock.acquire()
+        replay = asyncio.create_task(writer.replay_spill())
+        await asyncio.sleep(0.05)
+        assert not writer.replay_path.exists()
+
+        with writer.spill_path.open("a", encoding="utf-8") as spill:
+            spill.write(line * 2)
+        writer._spill_lock.release()
+
+        assert await replay == 3
+        assert not writer.spill_path.exists()
+        assert not writer.replay_path.exists()
+
+    async def test_not_running_writer_spills_record(self, tmp_path):
+        writer = _RecordingWriter(tmp_path)
+
+        with patch("app.services.audit_writer.os.fsync") as fsync:
+            assert writer.enqueue(_record()) is False
+            # enqueue не пишет в файл в event loop
+            assert not writer.spill_path.exists()
+            await writer._spill_task
+
+        fsync.assert_called_once()
+        row = json.loads(writer.spill_path.read_text(encoding="utf-8"))
+        assert row["event_type"] == "http_create_service-accounts"
+
+    async def test_queue_full_overflow_spilled_in_background(self, tmp_path):
+        writer = _RecordingWriter(tmp_path, queue_size=2, flush_interval_ms=10000)
+        writer._task = asyncio.get_running_loop().create_future()  # writer "запущен", очередь не читается
+
+        results = [writer.enqueue(_record()) for _ in range(5)]
+
+        assert results == [True, True, False, False, False]
+        assert not writer.spill_path.exists()
+        await writer._spill_task
+        assert len(writer.spill_path.read_text(encoding="utf-8").splitlines()) == 2
+        writer._task.cancel()
+
+    async def test_close_flushes_queue(self, tmp_path):
+        writer = _RecordingWriter(tmp_path, flush_size=10, flush_interval_ms=10000)
+        await writer.start()
+
+        for _ in range(5):
+            writer.enqueue(_record())
+        await writer.close()
+
+        assert [len(batch) for batch in writer.batches] == [5]
+        assert not writer.running
+        assert not writer.spill_path.exists()
@@ -0,0 +1,62 @@
+"""
+Unit tests для partitioning file events по streams.
+
+Тестирует:
+- Стабильный номер partition по file_id (crc32)
+- Имя stream: без суффикса при одном partition, {stream}:{N} иначе
+- XADD в partition stream файла
+"""
+
+import zlib
+from collections import Counter
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services.event_publisher import EventPublisher, partition_stream_name, stream_partition
+
+
+class TestStreamPartition:
+    """Тесты для stream_partition / partition_stream_name."""
+
+    def test_partition_is_crc32_of_file_id(self):
+        file_id = uuid4()
+
+        assert stream_partition(file_id, 8) == zlib.crc32(str(file_id).encode()) % 8
+        assert stream_partition(str(file_id), 8) == stream_partition(file_id, 8)
+
+    def test_partitions_are_balanced(self):
+        counts = Counter(stream_partition(uuid4(), 4) for _ in range(4000))
+
+        assert set(counts) == {0, 1, 2, 3}
+        assert min(counts.values()) > 800
+
+    def test_single_partition_keeps_stream_name(self):
+        assert partition_stream_name("file-events", 0, 1) == "file-events"
+        assert partition_stream_name("file-events", 3, 4) == "file-events:3"
+
+
+class TestEventPublisherPartitions:
+    """Тесты публикации в partition streams."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("partitions", [1, 4])
+    async def test_events_of_file_go_to_one_stream(self, partitions):
+        publisher = EventPublisher()
+        publisher.redis = AsyncMock()
+        publisher.redis.xadd.return_value = "1-0"
+        publisher._initialized = True
+        file_id = uuid4()
+
+        with patch("app.services.event_publisher.settings") as mock_settings:
+            mock_settings.event_publishing.enabled = True
+            mock_settings.event_publishing.stream_name = "file-events"
+            mock_settings.event_publishing.stream_maxlen = 10000
+            mock_settings.event_publishing.stream_partitions = partitions
+
+            await publisher.publish_file_deleted(file_id=file_id, storage_element_id=1)
+            await publisher.publish_file_deleted(file_id=file_id, storage_element_id=1)
+
+        expected = partition_stream_name("file-events", stream_partition(file_id, partitions), partitions)
+        assert [call.kwargs["name"] for call in publisher.redis.xadd.await_args_list] == [expected, expected]
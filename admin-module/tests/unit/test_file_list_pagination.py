@@ -0,0 +1,123 @@
+"""
+Unit тесты keyset (cursor) пагинации реестра файлов.
+
+Тестирование:
+1. Курсор продолжения (round-trip, повреждённый токен)
+2. FileService.list_files: LIMIT + 1, next_cursor, keyset вместо OFFSET
+3. Оценка total планировщиком (exact_total=False)
+"""
+
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.file_service import FileService
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def _mock_file(index: int) -> MagicMock:
+    file = MagicMock()
+    file.file_id = uuid4()
+    file.created_at = datetime(2026, 1, 1, tzinfo=timezone.utc) - timedelta(minutes=index)
+    return file
+
+
+def _rows_result(files: list) -> MagicMock:
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = files
+    return result
+
+
+@pytest.fixture
+def mock_db():
+    """AsyncSession mock с SAVEPOINT для EXPLAIN."""
+    db = AsyncMock()
+
+    @asynccontextmanager
+    async def begin_nested():
+        yield
+
+    db.begin_nested = begin_nested
+    return db
+
+
+@pytest.fixture
+def file_service():
+    """FileService без сериализации File → FileResponse."""
+    service = FileService()
+    with patch.object(service, "_to_response", side_effect=lambda f: None):
+        yield service
+
+
+class TestCursor:
+    """Тесты курсора продолжения."""
+
+    def test_round_trip(self):
+        created_at = datetime(2026, 1, 1, 8, 15, 30, tzinfo=timezone.utc)
+        file_id = uuid4()
+
+        cursor = encode_cursor("created_at", created_at, file_id)
+
+        assert decode_cursor(cursor, "created_at", UUID) == (created_at, file_id)
+
+    def test_invalid_cursor(self):
+        with pytest.raises(ValueError):
+            decode_cursor("bm90LWpzb24", "created_at", UUID)
+
+
+@pytest.mark.asyncio
+class TestListFilesKeyset:
+    """Тесты keyset пагинации FileService.list_files."""
+
+    async def test_next_cursor_points_to_last_file(self, file_service, mock_db):
+        files = [_mock_file(i) for i in range(3)]
+        count_result = MagicMock()
+        count_result.scalar_one.return_value = 10
+        mock_db.execute.side_effect = [count_result, _rows_result(files)]
+
+        with patch("app.services.file_service.FileListResponse") as response_cls:
+            await file_service.list_files(mock_db, page_size=2)
+
+        kwargs = response_cls.call_args.kwargs
+        assert len(kwargs["files"]) == 2
+        assert decode_cursor(kwargs["next_cursor"], "created_at", UUID) == (files[1].created_at, files[1].file_id)
+        assert kwargs["total"] == 10
+        assert kwargs["total_is_estimate"] is False
+
+    async def test_cursor_uses_keyset_without_offset(self, file_service, mock_db):
+        cursor = encode_cursor("created_at", datetime(2026, 1, 1, tzinfo=timezone.utc), uuid4())
+        count_result = MagicMock()
+        count_result.scalar_one.return_value = 10
+        mock_db.execute.side_effect = [count_result, _rows_result([])]
+
+        with patch("app.services.file_service.FileListResponse") as response_cls:
+            await file_service.list_files(mock_db, page=5, page_size=2, cursor=cursor)
+
+        sql = str(mock_db.execute.await_args_list[1].args[0].compile(dialect=postgresql.dialect()))
+        assert "OFFSET" not in sql
+        assert "(files.created_at, files.file_id) <" in sql
+        assert response_cls.call_args.kwargs["next_cursor"] is None
+
+    async def test_invalid_cursor_raises_value_error(self, file_service, mock_db):
+        with pytest.raises(ValueError):
+            await file_service.list_files(mock_db, cursor="garbage")
+
+        mock_db.execute.assert_not_awaited()
+
+    async def test_estimated_total(self, file_service, mock_db):
+        explain_result = MagicMock()
+        explain_result.scalar.return_value = '[{"Plan": {"Plan Rows": 250000}}]'
+        mock_db.execute.side_effect = [explain_result, _rows_result([_mock_file(0)])]
+
+        with patch("app.services.file_service.FileListResponse") as response_cls:
+            await file_service.list_files(mock_db, page_size=50, exact_total=False)
+
+        kwargs = response_cls.call_args.kwargs
+        assert kwargs["total"] == 250000
+        assert kwargs["total_is_estimate"] is True
+        assert kwargs["total_pages"] == 5000
+        assert str(mock_db.execute.await_args_list[0].args[0]).startswith("EXPLAIN (FORMAT JSON)")
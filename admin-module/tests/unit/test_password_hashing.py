@@ -0,0 +1,148 @@
+"""
+Unit тесты для пула bcrypt и кэша подтверждённых client credentials.
+
+Тестирование:
+1. Выполнение операций в пуле и ограничение ожидающих операций
+2. Попадание в кэш и промах после ротации secret / истечения TTL
+3. authenticate_service_account без bcrypt для подтверждённых credentials
+4. rotate_secret: проверка истории секретов в пуле bcrypt
+"""
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.exceptions import PasswordHashBusyError
+from app.core.password_hashing import PasswordHashPool, VerifiedCredentialCache
+from app.services.service_account_service import ServiceAccountService
+
+
+@pytest.mark.asyncio
+class TestPasswordHashPool:
+    """Тесты PasswordHashPool."""
+
+    async def test_runs_outside_event_loop_thread(self):
+        pool = PasswordHashPool(max_workers=2, max_pending=4)
+
+        thread_name = await pool.run("verify", lambda: threading.current_thread().name)
+
+        assert thread_name.startswith("password-hash")
+        assert pool.pending == 0
+        pool.shutdown()
+
+    async def test_rejects_when_saturated(self):
+        pool = PasswordHashPool(max_workers=1, max_pending=2)
+        release = threading.Event()
+
+        running = [asyncio.ensure_future(pool.run("verify", release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(PasswordHashBusyError):
+            await pool.run("verify", release.wait)
+
+        release.set()
+        assert await asyncio.gather(*running) == [True, True]
+        assert pool.pending == 0
+        pool.shutdown()
+
+
+class TestVerifiedCredentialCache:
+    """Тесты VerifiedCredentialCache."""
+
+    def test_hit_requires_same_secret_and_hash(self):
+        cache = VerifiedCredentialCache(ttl_seconds=60, max_size=10)
+        cache.remember("sa_app", "secret", "hash-v1")
+
+        assert cache.is_verified("sa_app", "secret", "hash-v1")
+        assert not cache.is_verified("sa_app", "other-secret", "hash-v1")
+        # Ротация secret - client_secret_hash изменился
+        assert not cache.is_verified("sa_app", "secret", "hash-v2")
+
+    def test_expired_entry_is_miss(self):
+        cache = VerifiedCredentialCache(ttl_seconds=60, max_size=10)
+
+        with patch("app.core.password_hashing.time.monotonic", return_value=1000.0):
+            cache.remember("sa_app", "secret", "hash")
+        with patch("app.core.password_hashing.time.monotonic", return_value=1061.0):
+            assert not cache.is_verified("sa_app", "secret", "hash")
+
+    def test_disabled_and_bounded(self):
+        disabled = VerifiedCredentialCache(ttl_seconds=0, max_size=10)
+        disabled.remember("sa_app", "secret", "hash")
+        assert not disabled.is_verified("sa_app", "secret", "hash")
+
+        cache = VerifiedCredentialCache(ttl_seconds=60, max_size=2)
+        for index in range(3):
+            cache.remember(f"sa_{index}", "secret", "hash")
+
+        assert not cache.is_verified("sa_0", "secret", "hash")
+        assert cache.is_verified("sa_2", "secret", "hash")
+
+    def test_secret_not_stored(self):
+        cache = VerifiedCredentialCache(ttl_seconds=60, max_size=10)
+        cache.remember("sa_app", "plain-secret", "hash")
+
+        assert all(b"plain-secret" not in key for key in cache._entries)
+
+
+@pytest.mark.asyncio
+class TestAuthenticateServiceAccountCache:
+    """authenticate_service_account с кэшем подтверждённых credentials."""
+
+    async def test_repeated_grant_skips_bcrypt(self):
+        service = ServiceAccountService()
+        account = MagicMock()
+        account.can_authenticate.return_value = True
+        account.client_secret_hash = "stored-hash"
+
+        cache = VerifiedCredentialCache(ttl_seconds=60, max_size=10)
+        with patch.object(service, "get_by_client_id", AsyncMock(return_value=account)), \
+                patch.object(ServiceAccountService, "verify_secret", return_value=True) as verify_secret, \
+                patch("app.services.service_account_service.credential_cache", cache):
+            for _ in range(3):
+                assert await service.authenticate_service_account(AsyncMock(), "sa_app", "secret") is account
+
+        assert verify_secret.call_count == 1
+
+    async def test_invalid_secret_not_cached(self):
+        service = ServiceAccountService()
+        account = MagicMock()
+        account.can_authenticate.return_value = True
+        account.client_secret_hash = "stored-hash"
+
+        cache = VerifiedCredentialCache(ttl_seconds=60, max_size=10)
+        with patch.object(service, "get_by_client_id", AsyncMock(return_value=account)), \
+                patch.object(ServiceAccountService, "verify_secret", return_value=False) as verify_secret, \
+                patch("app.services.service_account_service.credential_cache", cache):
+            for _ in range(2):
+                assert await service.authenticate_service_account(AsyncMock(), "sa_app", "wrong") is None
+
+        assert verify_secret.call_count == 2
+
+
+@pytest.mark.asyncio
+class TestRotateSecretHistoryCheck:
+    """rotate_secret проверяет историю секретов вне event loop."""
+
+    async def test_history_check_runs_in_pool(self):
+        service = ServiceAccountService()
+        account = MagicMock()
+        account.secret_history = ["old-hash-1", "old-hash-2"]
+        account.client_secret_hash = "current-hash"
+        check_threads = []
+
+        def check_reuse(secret, history):
+            check_threads.append(threading.get_ident())
+            return False
+
+        with patch.object(service, "get_by_id", AsyncMock(return_value=account)), \
+                patch.object(service.password_history, "check_reuse", side_effect=check_reuse), \
+                patch.object(ServiceAccountService, "hash_secret", return_value="new-hash"):
+            rotated, new_secret = await service.rotate_secret(AsyncMock(), account.id)
+
+        assert rotated is account
+        assert account.client_secret_hash == "new-hash"
+        assert check_threads and check_threads[0] != threading.get_ident()
+
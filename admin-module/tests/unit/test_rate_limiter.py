@@ -0,0 +1,127 @@
+"""
+Unit тесты для SlidingWindowRateLimiter.
+
+Redis заменён заглушкой, повторяющей Lua скрипт окна
+(ZREM, ZREMRANGEBYSCORE, ZCARD, ZADD) в памяти.
+
+Тестирование:
+1. Один вызов скрипта на проверку, отказ сверх лимита с Retry-After
+2. Локальные токены: запросы без обращения к Redis
+3. Возврат неиспользованных локальных токенов в окно
+4. Fail-open при недоступном Redis
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.core.rate_limiter import SlidingWindowRateLimiter
+
+
+class _FakeRedis:
+    """Окна rate limit в памяти (семантика SLIDING_WINDOW_SCRIPT)."""
+
+    def __init__(self):
+        self.windows = {}
+        self.now_ms = 1_000_000
+        self.calls = 0
+
+    def register_script(self, script):
+        async def run(keys, args):
+            self.calls += 1
+            return self._evaluate(keys[0], *args)
+        return run
+
+    def _evaluate(self, key, window, limit, requested, member_prefix, *release):
+        members = self.windows.setdefault(key, {})
+        for member in release:
+            members.pop(member, None)
+        for member, score in list(members.items()):
+            if score <= self.now_ms - window:
+                del members[member]
+
+        count = len(members)
+        granted = min(requested, limit - count)
+        if granted <= 0:
+            return [0, count, min(members.values()) + window - self.now_ms]
+
+        for i in range(1, granted + 1):
+            members[f"{member_prefix}:{i}"] = self.now_ms
+        return [granted, count + granted, 0]
+
+
+@pytest.fixture
+def redis():
+    return _FakeRedis()
+
+
+def _limiter(redis, **kwargs):
+    async def get_redis():
+        return redis
+    return SlidingWindowRateLimiter(get_redis, key_prefix="test", **kwargs)
+
+
+@pytest.mark.asyncio
+class TestSlidingWindowRateLimiter:
+    """Тесты SlidingWindowRateLimiter."""
+
+    async def test_rejects_over_limit(self, redis):
+        limiter = _limiter(redis)
+
+        decisions = [await limiter.check("sa_app", limit=3) for _ in range(4)]
+
+        assert [decision.allowed for decision in decisions] == [True, True, True, False]
+        assert [decision.remaining for decision in decisions[:3]] == [2, 1, 0]
+        assert decisions[3].retry_after == 60
+        assert redis.calls == 4
+
+    async def test_window_slides(self, redis):
+        limiter = _limiter(redis)
+        for _ in range(3):
+            await limiter.check("sa_app", limit=3)
+
+        redis.now_ms += 60_001
+
+        assert (await limiter.check("sa_app", limit=3)).allowed
+
+    async def test_local_tokens_skip_redis(self, redis):
+        limiter = _limiter(redis, local_fraction=0.1)
+
+        decisions = [await limiter.check("sa_app", limit=100) for _ in range(25)]
+
+        assert all(decision.allowed for decision in decisions)
+        # 10 токенов за обращение: запросы 1, 11 и 21 идут в Redis
+        assert redis.calls == 3
+        assert decisions[-1].remaining == 75
+        assert len(redis.windows["test:sa_app"]) == 30
+
+    async def test_local_tokens_respect_global_limit(self, redis):
+        limiter = _limiter(redis, local_fraction=0.5)
+
+        decisions = [await limiter.check("sa_app", limit=4) for _ in range(5)]
+
+        assert [decision.allowed for decision in decisions] == [True, True, True, True, False]
+
+    async def test_expired_local_tokens_released(self, redis):
+        limiter = _limiter(redis, local_fraction=0.1, local_ttl_seconds=1.0)
+
+        with patch("app.core.rate_limiter.time.monotonic", return_value=100.0):
+            await limiter.check("sa_app", limit=100)
+        assert len(redis.windows["test:sa_app"]) == 10
+
+        with patch("app.core.rate_limiter.time.monotonic", return_value=102.0):
+            await limiter.check("sa_app", limit=100)
+
+        # 9 неиспользованных токенов возвращены, 10 новых получены
+        assert len(redis.windows["test:sa_app"]) == 11
+        assert redis.calls == 2
+
+    async def test_fail_open_when_redis_unavailable(self):
+        async def get_redis():
+            raise ConnectionError("redis down")
+
+        limiter = SlidingWindowRateLimiter(get_redis)
+        decision = await limiter.check("sa_app", limit=1)
+
+        assert decision.allowed
+        assert decision.remaining == 1
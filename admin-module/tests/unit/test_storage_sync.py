@@ -0,0 +1,179 @@
+"""
+Unit тесты для StorageSyncService.sync_all_storage_elements.
+
+Discovery заменён заглушкой, PostgreSQL и Redis - mock объектами.
+
+Тестирование:
+1. Ограничение числа одновременных опросов storage elements
+2. Таймаут медленного storage element не задерживает остальные
+3. Commit изменений и публикация в Redis только при отличиях
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.exceptions import StorageElementTimeoutError, StorageElementUnreachableError
+from app.models.storage_element import StorageMode, StorageStatus
+from app.services.storage_discovery_service import StorageElementDiscoveryResult
+from app.services.storage_sync_service import StorageSyncService
+
+
+def _storage_element(index, status=StorageStatus.ONLINE):
+    return SimpleNamespace(
+        id=index,
+        name=f"se-{index}",
+        api_url=f"http://se-{index}:8010",
+        mode=StorageMode.RW,
+        status=status,
+        capacity_bytes=1000,
+        used_bytes=100,
+        file_count=10,
+        priority=100,
+        element_id=f"se-{index:02d}",
+        last_health_check=None,
+    )
+
+
+def _discovery_result(storage_element, **overrides):
+    data = dict(
+        name=storage_element.name,
+        display_name=storage_element.name,
+        version="1.0.0",
+        mode="rw",
+        storage_type="local",
+        base_path="/data",
+        capacity_bytes=1000,
+        used_bytes=100,
+        file_count=10,
+        status="operational",
+        priority=100,
+        element_id=storage_element.element_id,
+        api_url=storage_element.api_url,
+    )
+    data.update(overrides)
+    return StorageElementDiscoveryResult(**data)
+
+
+class _FakeDiscovery:
+    """Discovery с задержкой и учётом одновременных запросов."""
+
+    def __init__(self, storage_elements, delay=0.01):
+        self.by_url = {se.api_url: se for se in storage_elements}
+        self.delay = delay
+        self.overrides = {}
+        self.errors = {}
+        self.slow_urls = set()
+        self.active = 0
+        self.max_active = 0
+
+    async def discover_storage_element(self, api_url, timeout_seconds=None):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(60 if api_url in self.slow_urls else self.delay)
+            if api_url in self.errors:
+                raise self.errors[api_url]
+            return _discovery_result(self.by_url[api_url], **self.overrides.get(api_url, {}))
+        finally:
+            self.active -= 1
+
+
+def _session(storage_elements):
+    session = AsyncMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = storage_elements
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+@pytest.mark.asyncio
+class TestSyncAllStorageElements:
+    """Тесты параллельной синхронизации storage elements."""
+
+    async def test_concurrency_is_bounded(self):
+        storage_elements = [_storage_element(i) for i in range(12)]
+        discovery = _FakeDiscovery(storage_elements)
+        service = StorageSyncService(discovery_service=discovery)
+
+        with patch("app.services.storage_sync_service.storage_element_publish_service") as publisher:
+            results = await service.sync_all_storage_elements(
+                _session(storage_elements), only_online=False, concurrency=3, timeout_seconds=1
+            )
+
+        assert len(results) == 12
+        assert all(result.success for result in results)
+        assert discovery.max_active == 3
+        publisher.publish_on_sync.assert_not_called()
+
+    async def test_slow_element_times_out_without_delaying_others(self):
+        storage_elements = [_storage_element(i) for i in range(5)]
+        discovery = _FakeDiscovery(storage_elements)
+        discovery.slow_urls.add(storage_elements[0].api_url)
+        service = StorageSyncService(discovery_service=discovery)
+
+        started = time.perf_counter()
+        with patch("app.services.storage_sync_service.storage_element_publish_service") as publisher:
+            publisher.publish_on_sync = AsyncMock()
+            results = await service.sync_all_storage_elements(
+                _session(storage_elements), only_online=False, concurrency=5, timeout_seconds=0.2
+            )
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 1
+        assert not results[0].success
+        assert "Timeout" in results[0].error
+        assert storage_elements[0].status == StorageStatus.OFFLINE
+        assert all(result.success for result in results[1:])
+        publisher.publish_on_sync.assert_awaited_once()
+
+    async def test_publishes_once_only_on_changes(self):
+        storage_elements = [_storage_element(i) for i in range(3)]
+        discovery = _FakeDiscovery(storage_elements)
+        discovery.overrides[storage_elements[1].api_url] = {"used_bytes": 500}
+        discovery.overrides[storage_elements[2].api_url] = {"mode": "ro"}
+        service = StorageSyncService(discovery_service=discovery)
+        session = _session(storage_elements)
+
+        with patch("app.services.storage_sync_service.storage_element_publish_service") as publisher:
+            publisher.publish_on_sync = AsyncMock()
+            results = await service.sync_all_storage_elements(session, only_online=False, concurrency=3)
+
+        assert [len(result.changes) for result in results] == [0, 1, 1]
+        assert storage_elements[1].used_bytes == 500
+        assert storage_elements[2].mode == StorageMode.RO
+        # Неизменённый элемент не обновляется через ORM
+        assert storage_elements[0].last_health_check is None
+        session.commit.assert_awaited_once()
+        publisher.publish_on_sync.assert_awaited_once()
+
+    async def test_offline_element_stays_unpublished(self):
+        storage_elements = [_storage_element(1, status=StorageStatus.OFFLINE)]
+        discovery = _FakeDiscovery(storage_elements)
+        discovery.errors[storage_elements[0].api_url] = StorageElementUnreachableError(
+            api_url=storage_elements[0].api_url, reason="connection refused"
+        )
+        service = StorageSyncService(discovery_service=discovery)
+
+        with patch("app.services.storage_sync_service.storage_element_publish_service") as publisher:
+            publisher.publish_on_sync = AsyncMock()
+            results = await service.sync_all_storage_elements(
+                _session(storage_elements), only_online=False, concurrency=1
+            )
+
+        assert not results[0].success
+        assert not results[0].has_changes
+        publisher.publish_on_sync.assert_not_called()
+
+    async def test_timeout_error_type(self):
+        storage_elements = [_storage_element(1)]
+        discovery = _FakeDiscovery(storage_elements)
+        discovery.slow_urls.add(storage_elements[0].api_url)
+        service = StorageSyncService(discovery_service=discovery)
+
+        _, error = await service._discover(storage_elements[0].api_url, asyncio.Semaphore(1), 0.05)
+
+        assert isinstance(error, StorageElementTimeoutError)
@@ -12,9 +12,12 @@ Sprint 15: Добавлена поддержка Retention Policy:
 import logging
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, File, Form, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from app.core.config import settings
+from app.core.rate_limiter import SlidingWindowRateLimiter
+from app.core.redis import get_redis_client
 from app.core.security import UserContext, jwt_validator
 from app.core.exceptions import (
     InvalidTokenException,
@@ -36,6 +39,14 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 security = HTTPBearer()
 
+# Окна rate limit в Redis общие для всех экземпляров Ingester Module
+rate_limiter = SlidingWindowRateLimiter(
+    get_redis_client,
+    key_prefix="rate_limit:ingester",
+    window_seconds=settings.rate_limit.window_seconds,
+    local_fraction=settings.rate_limit.local_fraction,
+)
+
 
 def get_upload_service() -> UploadService:
     """
@@ -62,18 +73,57 @@ async def get_current_user(
 
     Raises:
         HTTPException: 401 если токен невалидный или истек
+        HTTPException: 429 если превышен rate_limit Service Account
     """
     try:
         user = jwt_validator.validate_token(credentials.credentials)
-        return user
     except (InvalidTokenException, TokenExpiredException, AuthenticationException) as e:
-        from fastapi import HTTPException
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=str(e),
             headers={"WWW-Authenticate": "Bearer"}
         )
 
+    await enforce_rate_limit(user)
+    return user
+
+
+async def enforce_rate_limit(user: UserContext) -> None:
+    """
+    Проверка rate_limit Service Account (RATE_LIMIT_ENABLED).
+
+    Args:
+        user: Контекст пользователя из JWT
+
+    Raises:
+        HTTPException: 429 если лимит запросов превышен
+    """
+    if not settings.rate_limit.enabled or not user.is_service_account or not user.rate_limit:
+        return
+
+    decision = await rate_limiter.check(user.client_id or user.identifier, user.rate_limit)
+    if decision.allowed:
+        return
+
+    logger.warning(
+        "Rate limit exceeded",
+        extra={"client_id": user.client_id, "limit": user.rate_limit}
+    )
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail={
+            "error": "rate_limit_exceeded",
+            "message": f"Rate limit exceeded: {user.rate_limit} requests per {settings.rate_limit.window_seconds} seconds",
+            "retry_after": decision.retry_after,
+            "limit": user.rate_limit
+        },
+        headers={
+            "Retry-After": str(decision.retry_after),
+            "X-RateLimit-Limit": str(user.rate_limit),
+            "X-RateLimit-Remaining": "0"
+        },
+    )
+
 
 @router.post(
     "/upload",
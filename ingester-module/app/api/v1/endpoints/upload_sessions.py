@@ -0,0 +1,214 @@
+"""
+Ingester Module - Upload Session Endpoints.
+
+Resumable multipart upload для больших файлов:
+1. POST   /files/sessions                       - создание сессии
+2. PUT    /files/sessions/{id}/parts/{n}        - загрузка части (raw body)
+3. GET    /files/sessions/{id}/parts            - список загруженных частей
+4. POST   /files/sessions/{id}/complete         - завершение загрузки
+5. DELETE /files/sessions/{id}                  - отмена загрузки
+
+Части независимы: их можно загружать параллельно и повторять после обрыва.
+"""
+
+import logging
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from redis.exceptions import RedisError
+
+from app.api.v1.endpoints.upload import get_current_user
+from app.core.exceptions import (
+    FileSizeLimitExceededException,
+    StorageElementUnavailableException,
+    UploadSessionNotFoundException,
+    UploadSessionStateException,
+)
+from app.core.security import UserContext
+from app.schemas.upload import UploadResponse
+from app.schemas.upload_session import (
+    UploadPartInfo,
+    UploadPartsResponse,
+    UploadSessionCreateRequest,
+    UploadSessionResponse,
+)
+from app.services.upload_session_service import UploadSessionService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+def get_upload_session_service() -> UploadSessionService:
+    """
+    Dependency для получения upload session service.
+
+    Returns:
+        UploadSessionService instance из main.py
+    """
+    from app.main import upload_session_service
+    return upload_session_service
+
+
+def _to_http_exception(e: Exception) -> HTTPException:
+    """Преобразование исключений upload session в HTTPException."""
+    if isinstance(e, UploadSessionNotFoundException):
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
+    if isinstance(e, UploadSessionStateException):
+        return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=e.message)
+    if isinstance(e, FileSizeLimitExceededException):
+        return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=e.message)
+    if isinstance(e, StorageElementUnavailableException):
+        return HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=e.message)
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Upload session storage unavailable"
+    )
+
+
+_SESSION_ERRORS = (
+    UploadSessionNotFoundException,
+    UploadSessionStateException,
+    FileSizeLimitExceededException,
+    StorageElementUnavailableException,
+    RedisError,
+)
+
+
+@router.post(
+    "",
+    response_model=UploadSessionResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create Upload Session",
+    description="Создать resumable upload session для загрузки файла частями"
+)
+async def create_session(
+    request: UploadSessionCreateRequest,
+    user: Annotated[UserContext, Depends(get_current_user)],
+    session_svc: Annotated[UploadSessionService, Depends(get_upload_session_service)],
+) -> UploadSessionResponse:
+    """
+    Создание upload session.
+
+    Storage Element выбирается при создании сессии: все части
+    пишутся в staging area этого SE.
+    """
+    try:
+        return await session_svc.create_session(request, user.user_id, user.username)
+    except _SESSION_ERRORS as e:
+        raise _to_http_exception(e)
+
+
+@router.get(
+    "/{session_id}",
+    response_model=UploadSessionResponse,
+    summary="Get Upload Session",
+    description="Получить состояние upload session"
+)
+async def get_session(
+    session_id: str,
+    user: Annotated[UserContext, Depends(get_current_user)],
+    session_svc: Annotated[UploadSessionService, Depends(get_upload_session_service)],
+) -> UploadSessionResponse:
+    """Состояние upload session."""
+    try:
+        return await session_svc.get_session(session_id, user.user_id)
+    except _SESSION_ERRORS as e:
+        raise _to_http_exception(e)
+
+
+@router.put(
+    "/{session_id}/parts/{part_number}",
+    response_model=UploadPartInfo,
+    summary="Upload Part",
+    description="""
+    Загрузить часть N (тело запроса - содержимое части, application/octet-stream).
+
+    Размер части: part_size, последняя часть - остаток файла.
+    Опциональный заголовок `X-Part-SHA256` - checksum части для проверки.
+    """
+)
+async def upload_part(
+    session_id: str,
+    part_number: int,
+    http_request: Request,
+    user: Annotated[UserContext, Depends(get_current_user)],
+    session_svc: Annotated[UploadSessionService, Depends(get_upload_session_service)],
+    content_length: Annotated[Optional[int], Header()] = None,
+    x_part_sha256: Annotated[Optional[str], Header()] = None,
+) -> UploadPartInfo:
+    """Потоковая загрузка части в staging Storage Element."""
+    try:
+        return await session_svc.upload_part(
+            session_id=session_id,
+            part_number=part_number,
+            stream=http_request.stream(),
+            content_length=content_length,
+            user_id=user.user_id,
+            expected_checksum=x_part_sha256,
+        )
+    except _SESSION_ERRORS as e:
+        logger.warning(
+            "Upload session part failed",
+            extra={
+                "session_id": session_id,
+                "part_number": part_number,
+                "error": str(e),
+            }
+        )
+        raise _to_http_exception(e)
+
+
+@router.get(
+    "/{session_id}/parts",
+    response_model=UploadPartsResponse,
+    summary="List Uploaded Parts",
+    description="Получить список загруженных и недостающих частей"
+)
+async def list_parts(
+    session_id: str,
+    user: Annotated[UserContext, Depends(get_current_user)],
+    session_svc: Annotated[UploadSessionService, Depends(get_upload_session_service)],
+) -> UploadPartsResponse:
+    """Список частей для возобновления загрузки."""
+    try:
+        return await session_svc.list_parts(session_id, user.user_id)
+    except _SESSION_ERRORS as e:
+        raise _to_http_exception(e)
+
+
+@router.post(
+    "/{session_id}/complete",
+    response_model=UploadResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Complete Upload Session",
+    description="Создать файл из загруженных частей и зарегистрировать его"
+)
+async def complete_session(
+    session_id: str,
+    user: Annotated[UserContext, Depends(get_current_user)],
+    session_svc: Annotated[UploadSessionService, Depends(get_upload_session_service)],
+) -> UploadResponse:
+    """Завершение upload session."""
+    try:
+        return await session_svc.complete(session_id, user.user_id)
+    except _SESSION_ERRORS as e:
+        raise _to_http_exception(e)
+
+
+@router.delete(
+    "/{session_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Abort Upload Session",
+    description="Отменить загрузку и удалить загруженные части"
+)
+async def abort_session(
+    session_id: str,
+    user: Annotated[UserContext, Depends(get_current_user)],
+    session_svc: Annotated[UploadSessionService, Depends(get_upload_session_service)],
+) -> None:
+    """Отмена upload session."""
+    try:
+        await session_svc.abort(session_id, user.user_id)
+    except _SESSION_ERRORS as e:
+        raise _to_http_exception(e)
@@ -9,7 +9,7 @@ Sprint 16: Health router перенесён на /health (без /api/v1 prefix)
 
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import upload, finalize
+from app.api.v1.endpoints import upload, upload_sessions, finalize
 
 # Создание главного router для API v1
 api_router = APIRouter()
@@ -23,6 +23,13 @@ api_router.include_router(
     tags=["upload"]
 )
 
+# Resumable multipart upload sessions для больших файлов
+api_router.include_router(
+    upload_sessions.router,
+    prefix="/files/sessions",
+    tags=["upload-sessions"]
+)
+
 # Sprint 15: Finalize endpoint для Two-Phase Commit
 api_router.include_router(
     finalize.router,
@@ -141,6 +141,24 @@ class StorageElementSettings(BaseSettings):
         default=100,
         description="Размер HTTP connection pool для каждого SE endpoint"
     )
+    upload_buffer_size: int = Field(
+        default=1024 * 1024,
+        ge=64 * 1024,
+        le=64 * 1024 * 1024,
+        description="Размер буфера потоковой передачи файла в SE (bytes). "
+                    "Ограничивает пиковое потребление памяти на одну загрузку"
+    )
+    dedup_precheck: bool = Field(
+        default=True,
+        description="Перед передачей сжатого файла проверять, хранится ли его содержимое "
+                    "на SE (content-addressed дедупликация), и создавать файл без передачи"
+    )
+
+    @field_validator("dedup_precheck", mode="before")
+    @classmethod
+    def parse_dedup_precheck(cls, v):
+        """Парсинг boolean из environment variable"""
+        return parse_bool_from_env(v)
 
 
 class RedisSettings(BaseSettings):
@@ -193,6 +211,17 @@ class CompressionSettings(BaseSettings):
     algorithm: str = "gzip"  # gzip или brotli
     level: int = 6  # 1-9 для gzip, 0-11 для brotli
     min_size: int = 1024  # Минимальный размер файла для сжатия (bytes)
+    max_workers: int = Field(
+        default=4,
+        ge=1,
+        le=64,
+        description="Размер пула потоков сжатия (одновременно сжимаемые файлы)"
+    )
+    spool_max_size: int = Field(
+        default=8 * 1024 * 1024,
+        ge=0,
+        description="Порог (bytes), после которого сжатый файл пишется во временный файл на диске"
+    )
 
     @field_validator("enabled", mode="before")
     @classmethod
@@ -201,6 +230,59 @@ class CompressionSettings(BaseSettings):
         return parse_bool_from_env(v)
 
 
+class UploadSessionSettings(BaseSettings):
+    """
+    Настройки resumable multipart upload sessions.
+
+    Состояние сессий и загруженных частей хранится в Redis,
+    части пишутся напрямую в staging area выбранного Storage Element.
+    """
+
+    model_config = SettingsConfigDict(
+        env_prefix="UPLOAD_SESSION_",
+        case_sensitive=False
+    )
+
+    ttl_seconds: int = Field(
+        default=24 * 3600,
+        ge=300,
+        description="Время жизни неактивной сессии в Redis (продлевается при загрузке части)"
+    )
+    default_part_size: int = Field(
+        default=64 * 1024 * 1024,
+        ge=64 * 1024,
+        description="Размер части по умолчанию в байтах"
+    )
+    min_part_size: int = Field(
+        default=1024 * 1024,
+        ge=1,
+        description="Минимальный размер части в байтах (кроме последней)"
+    )
+    max_part_size: int = Field(
+        default=512 * 1024 * 1024,
+        ge=64 * 1024,
+        description="Максимальный размер части в байтах (не больше STORAGE_STAGING_MAX_PART_SIZE на SE)"
+    )
+    max_file_size: int = Field(
+        default=100 * 1024 * 1024 * 1024,
+        gt=0,
+        description="Максимальный размер файла для multipart upload в байтах"
+    )
+    key_prefix: str = Field(
+        default="ingester:upload_session",
+        description="Префикс ключей сессий в Redis"
+    )
+    complete_lease_seconds: int = Field(
+        default=300,
+        ge=30,
+        description=(
+            "Время, в течение которого complete сессии считается выполняющимся; "
+            "неподтверждённый SE complete (таймаут) сверяется с SE после его истечения. "
+            "Должно превышать STORAGE_ELEMENT_TIMEOUT"
+        )
+    )
+
+
 class LoggingSettings(BaseSettings):
     """Настройки логирования."""
 
@@ -472,6 +554,43 @@ class CORSSettings(BaseSettings):
         return v
 
 
+class RateLimitSettings(BaseSettings):
+    """
+    Rate limiting запросов Service Accounts (лимит из claim rate_limit JWT).
+
+    Окна в Redis общие для всех экземпляров Ingester Module
+    (ключи rate_limit:ingester:{client_id}).
+    """
+
+    model_config = SettingsConfigDict(
+        env_prefix="RATE_LIMIT_",
+        case_sensitive=False
+    )
+
+    enabled: bool = Field(
+        default=False,
+        description="Проверка rate_limit Service Accounts"
+    )
+    window_seconds: int = Field(
+        default=60,
+        ge=1,
+        le=3600,
+        description="Окно rate limit в секундах"
+    )
+    local_fraction: float = Field(
+        default=0.1,
+        ge=0.0,
+        le=0.5,
+        description="Доля лимита, получаемая экземпляром из Redis за одно обращение (0 - каждый запрос в Redis)"
+    )
+
+    @field_validator("enabled", mode="before")
+    @classmethod
+    def parse_bool_fields(cls, v):
+        """Парсинг boolean полей из environment variables."""
+        return parse_bool_from_env(v)
+
+
 class ServiceAccountSettings(BaseSettings):
     """
     OAuth 2.0 Service Account configuration для machine-to-machine аутентификации.
@@ -527,8 +646,10 @@ class Settings(BaseSettings):
     storage_element: StorageElementSettings = Field(default_factory=StorageElementSettings)
     redis: RedisSettings = Field(default_factory=RedisSettings)
     compression: CompressionSettings = Field(default_factory=CompressionSettings)
+    upload_session: UploadSessionSettings = Field(default_factory=UploadSessionSettings)
     logging: LoggingSettings = Field(default_factory=LoggingSettings)
     cors: CORSSettings = Field(default_factory=CORSSettings)
+    rate_limit: RateLimitSettings = Field(default_factory=RateLimitSettings)
     capacity_monitor: CapacityMonitorSettings = Field(default_factory=CapacityMonitorSettings)
 
 
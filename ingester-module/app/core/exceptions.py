@@ -94,6 +94,21 @@ class InvalidFileTypeException(UploadException):
     pass
 
 
+class UploadSessionNotFoundException(UploadException):
+    """Upload session не найдена или истекла."""
+    pass
+
+
+class UploadSessionStateException(UploadException):
+    """
+    Операция недопустима в текущем состоянии upload session.
+
+    Например: неполный набор частей при complete, некорректный номер
+    или размер части, повторное завершение сессии.
+    """
+    pass
+
+
 # Service Discovery Exceptions
 class ServiceDiscoveryException(IngesterException):
     """Ошибка Service Discovery."""
@@ -0,0 +1,233 @@
+"""
+Sliding Window Rate Limiter на Redis.
+
+Модуль не зависит от остального приложения (одинаковый в Admin, Ingester
+и Query Module) - Redis клиент передаётся coroutine функцией.
+
+Vendored модуль: эталонная копия - admin-module/app/core/rate_limiter.py,
+в Ingester и Query Module копируется без изменений (проверка -
+tests/test_vendored_modules.py в корне репозитория).
+
+Алгоритм:
+- Окно запросов ключа - Redis Sorted Set (score = время запроса, мс)
+- Очистка окна, подсчёт, добавление запросов и TTL выполняются одним
+  Lua скриптом: один round-trip и атомарность при конкурентных запросах
+  (раздельные ZREMRANGEBYSCORE/ZCARD/ZADD пропускали запросы сверх лимита)
+- Время берётся из Redis (TIME): окна экземпляров сервиса не зависят
+  от расхождения часов
+
+Локальная предварительная проверка (local_fraction > 0):
+- Экземпляр получает из Redis не один, а до limit * local_fraction
+  запросов сразу (token bucket экземпляра) и пропускает следующие запросы
+  ключа без Redis, пока токены не закончатся или не истечёт local_ttl
+- Неиспользованные токены возвращаются в окно (ZREM) при следующем
+  обращении к Redis по этому ключу
+- Общий лимит сохраняется: каждый токен - запись в окне Redis
+
+Redis недоступен - запрос пропускается (fail-open).
+"""
+
+import itertools
+import logging
+import math
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Максимум токенов, получаемых экземпляром из Redis за одно обращение
+MAX_LOCAL_BATCH = 1000
+
+# KEYS[1] - окно ключа
+# ARGV: window_ms, limit, requested, member_prefix, members to release...
+# Returns: {granted, count, retry_after_ms}
+SLIDING_WINDOW_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local key = KEYS[1]
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+if #ARGV > 4 then
+    redis.call('ZREM', key, unpack(ARGV, 5))
+end
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+
+local count = redis.call('ZCARD', key)
+local granted = math.min(requested, limit - count)
+if granted <= 0 then
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    local retry_after = window
+    if oldest[2] then
+        retry_after = tonumber(oldest[2]) + window - now
+    end
+    return {0, count, retry_after}
+end
+
+for i = 1, granted do
+    redis.call('ZADD', key, now, ARGV[4] .. ':' .. i)
+end
+redis.call('PEXPIRE', key, window)
+return {granted, count + granted, 0}
+"""
+
+
+@dataclass
+class RateLimitDecision:
+    """Результат проверки rate limit."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int = 0  # секунды (для Retry-After)
+
+
+@dataclass
+class _LocalBucket:
+    """Токены ключа, полученные экземпляром из окна Redis."""
+
+    members: List[str] = field(default_factory=list)
+    remaining: int = 0
+    expires_at: float = 0.0
+
+
+class SlidingWindowRateLimiter:
+    """
+    Sliding window rate limiter (один Lua round-trip на проверку).
+
+    Usage:
+        limiter = SlidingWindowRateLimiter(get_redis, key_prefix="rate_limit")
+        decision = await limiter.check(client_id, limit=100)
+        if not decision.allowed:
+            ...  # 429, Retry-After: decision.retry_after
+    """
+
+    def __init__(
+        self,
+        get_redis: Callable[[], Awaitable],
+        key_prefix: str = "rate_limit",
+        window_seconds: int = 60,
+        local_fraction: float = 0.0,
+        local_ttl_seconds: float = 1.0,
+        max_local_keys: int = 10000,
+    ):
+        """
+        Args:
+            get_redis: Coroutine функция, возвращающая redis.asyncio клиент
+            key_prefix: Префикс ключей окон в Redis
+            window_seconds: Размер окна (секунды)
+            local_fraction: Доля лимита, получаемая экземпляром за одно
+                обращение к Redis (0 - без локальной проверки)
+            local_ttl_seconds: Время жизни локальных токенов
+            max_local_keys: Максимум ключей с локальными токенами
+        """
+        self._get_redis = get_redis
+        self.key_prefix = key_prefix
+        self.window_seconds = window_seconds
+        self.local_fraction = local_fraction
+        self.local_ttl = local_ttl_seconds
+        self.max_local_keys = max_local_keys
+        self._instance = uuid.uuid4().hex[:12]
+        self._sequence = itertools.count()
+        self._buckets: Dict[str, _LocalBucket] = {}
+        self._script = None
+        self._script_client = None
+
+    def _batch_size(self, limit: int) -> int:
+        if self.local_fraction <= 0:
+            return 1
+        return max(1, min(MAX_LOCAL_BATCH, int(limit * self.local_fraction)))
+
+    def _take_local(self, key: str, limit: int) -> Optional[RateLimitDecision]:
+        """Запрос за счёт локальных токенов (без Redis)."""
+        bucket = self._buckets.get(key)
+        if bucket is None or not bucket.members or bucket.expires_at <= time.monotonic():
+            return None
+
+        bucket.members.pop()
+        return RateLimitDecision(allowed=True, limit=limit, remaining=bucket.remaining + len(bucket.members))
+
+    def _store_local(self, key: str, members: List[str], remaining: int) -> None:
+        """Сохранение локальных токенов (конкурентные обращения ключа объединяются)."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_local_keys:
+                self._buckets.pop(next(iter(self._buckets)))
+            bucket = self._buckets[key] = _LocalBucket()
+
+        bucket.members.extend(members)
+        bucket.remaining = remaining
+        bucket.expires_at = time.monotonic() + self.local_ttl
+
+    async def _evaluate(
+        self,
+        key: str,
+        limit: int,
+        requested: int,
+        release: List[str]
+    ) -> Tuple[int, int, int, str]:
+        """Lua скрипт окна: (granted, count, retry_after_ms, member_prefix)."""
+        client = await self._get_redis()
+        if self._script is None or self._script_client is not client:
+            self._script = client.register_script(SLIDING_WINDOW_SCRIPT)
+            self._script_client = client
+
+        member_prefix = f"{self._instance}:{next(self._sequence)}"
+        result = await self._script(
+            keys=[f"{self.key_prefix}:{key}"],
+            args=[self.window_seconds * 1000, limit, requested, member_prefix, *release],
+        )
+        granted, count, retry_after_ms = (int(value) for value in result)
+        return granted, count, retry_after_ms, member_prefix
+
+    async def check(self, key: str, limit: int) -> RateLimitDecision:
+        """
+        Проверка и учёт запроса ключа.
+
+        Args:
+            key: Ключ лимита (например, client_id Service Account)
+            limit: Максимум запросов в окне
+
+        Returns:
+            RateLimitDecision: allowed, remaining, retry_after
+        """
+        decision = self._take_local(key, limit)
+        if decision is not None:
+            return decision
+
+        # Неиспользованные токены возвращаются в окно тем же вызовом
+        bucket = self._buckets.pop(key, None)
+        release = bucket.members if bucket is not None else []
+        requested = self._batch_size(limit)
+
+        try:
+            granted, count, retry_after_ms, member_prefix = await self._evaluate(key, limit, requested, release)
+        except Exception as e:
+            logger.warning(f"Rate limit check failed (Redis unavailable): {e}")
+            # При ошибке Redis - пропускаем запрос (fail-open)
+            return RateLimitDecision(allowed=True, limit=limit, remaining=limit)
+
+        if granted <= 0:
+            return RateLimitDecision(
+                allowed=False,
+                limit=limit,
+                remaining=0,
+                retry_after=max(1, math.ceil(retry_after_ms / 1000))
+            )
+
+        remaining = max(0, limit - count)
+        if granted > 1:
+            # Первый токен - текущий запрос, остальные - локальные
+            self._store_local(key, [f"{member_prefix}:{i}" for i in range(2, granted + 1)], remaining)
+
+        return RateLimitDecision(allowed=True, limit=limit, remaining=remaining + granted - 1)
+
+    async def reset(self, key: str) -> None:
+        """Удаление окна и локальных токенов ключа."""
+        self._buckets.pop(key, None)
+        client = await self._get_redis()
+        await client.delete(f"{self.key_prefix}:{key}")
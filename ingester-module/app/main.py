@@ -18,6 +18,7 @@ from app.core.exceptions import NoAvailableStorageException
 from app.api.v1.router import api_router
 from app.services.auth_service import AuthService
 from app.services.upload_service import UploadService
+from app.services.upload_session_service import UploadSessionService
 from app.services.storage_selector import init_storage_selector, close_storage_selector
 from app.services.admin_client import init_admin_client, close_admin_client
 from app.core.redis import get_redis_client, close_redis_client
@@ -49,6 +50,9 @@ auth_service = AuthService(
 # Инициализация Upload Service с аутентификацией
 upload_service = UploadService(auth_service=auth_service)
 
+# Resumable multipart upload sessions (состояние в Redis)
+upload_session_service = UploadSessionService(upload_service)
+
 # Sprint 15: Инициализация FinalizeService для Two-Phase Commit
 finalize_service = FinalizeService(auth_service=auth_service)
 
@@ -0,0 +1,111 @@
+"""
+Ingester Module - Upload Session Schemas.
+
+Pydantic модели для resumable multipart upload sessions.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.upload import RetentionPolicy, DEFAULT_TTL_DAYS, MIN_TTL_DAYS, MAX_TTL_DAYS
+
+
+class UploadSessionStatus(str, Enum):
+    """Статус upload session."""
+    ACTIVE = "active"
+    COMPLETING = "completing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class UploadSessionCreateRequest(BaseModel):
+    """
+    Запрос на создание upload session.
+
+    Attributes:
+        filename: Имя файла
+        content_type: MIME тип файла
+        file_size: Итоговый размер файла в байтах
+        part_size: Размер части (default: UPLOAD_SESSION_DEFAULT_PART_SIZE)
+        description: Описание файла
+        retention_policy: Политика хранения (temporary/permanent)
+        ttl_days: TTL в днях для temporary файлов
+        metadata: Пользовательские метаданные
+    """
+    filename: str = Field(..., min_length=1, max_length=500)
+    content_type: Optional[str] = Field(None, max_length=255)
+    file_size: int = Field(..., gt=0, description="Итоговый размер файла в байтах")
+    part_size: Optional[int] = Field(None, gt=0, description="Размер части в байтах")
+    description: Optional[str] = Field(None, max_length=1000)
+    retention_policy: RetentionPolicy = Field(
+        RetentionPolicy.TEMPORARY,
+        description="Политика хранения: temporary (Edit SE) или permanent (RW SE)"
+    )
+    ttl_days: Optional[int] = Field(
+        DEFAULT_TTL_DAYS,
+        ge=MIN_TTL_DAYS,
+        le=MAX_TTL_DAYS,
+        description=f"TTL в днях для temporary файлов ({MIN_TTL_DAYS}-{MAX_TTL_DAYS})"
+    )
+    metadata: Optional[dict] = Field(None, description="Пользовательские метаданные (JSON)")
+
+
+class UploadSessionResponse(BaseModel):
+    """
+    Состояние upload session.
+
+    Attributes:
+        session_id: ID сессии (используется в URL частей)
+        status: Статус сессии
+        filename: Имя файла
+        file_size: Итоговый размер файла
+        part_size: Размер части
+        total_parts: Количество частей
+        uploaded_parts: Количество загруженных частей
+        storage_element_id: SE, в staging которого пишутся части
+        expires_at: Время истечения сессии при отсутствии активности
+    """
+    session_id: str
+    status: UploadSessionStatus
+    filename: str
+    file_size: int
+    part_size: int
+    total_parts: int
+    uploaded_parts: int = 0
+    storage_element_id: str
+    expires_at: datetime
+
+
+class UploadPartInfo(BaseModel):
+    """
+    Загруженная часть.
+
+    Attributes:
+        part_number: Номер части (1..total_parts)
+        size: Размер части в байтах
+        checksum: SHA-256 части
+        uploaded_at: Время загрузки
+    """
+    part_number: int
+    size: int
+    checksum: str
+    uploaded_at: datetime
+
+
+class UploadPartsResponse(BaseModel):
+    """
+    Список загруженных частей.
+
+    Attributes:
+        session_id: ID сессии
+        total_parts: Количество частей
+        parts: Загруженные части (по возрастанию номера)
+        missing_parts: Номера ещё не загруженных частей
+    """
+    session_id: str
+    total_parts: int
+    parts: list[UploadPartInfo]
+    missing_parts: list[int]
@@ -0,0 +1,344 @@
+"""
+Ingester Module - Compression Stage.
+
+Сжатие файлов (GZIP/Brotli) перед передачей в Storage Element.
+
+Сжатие выполняется потоково в bounded пуле рабочих потоков, чтобы не блокировать
+event loop: файл читается блоками из UploadFile, результат пишется в
+SpooledTemporaryFile (в памяти до порога, далее на диск). Пиковое потребление
+памяти на одну загрузку ограничено размером блока и порогом spool.
+
+Файлы уже сжатых форматов (JPEG, PNG, видео, архивы и т.д.) не сжимаются.
+Если сжатие не даёт выигрыша по размеру, передаётся оригинал.
+"""
+
+import asyncio
+import hashlib
+import logging
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Optional
+
+import brotli
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.core.config import settings
+from app.schemas.upload import CompressionAlgorithm, UploadRequest
+
+logger = logging.getLogger(__name__)
+
+# MIME типы, которые уже сжаты - повторное сжатие даёт только накладные расходы
+ALREADY_COMPRESSED_MIME_TYPES = frozenset({
+    # Изображения
+    "image/jpeg",
+    "image/png",
+    "image/gif",
+    "image/webp",
+    "image/avif",
+    "image/heic",
+    "image/heif",
+    # Аудио
+    "audio/mpeg",
+    "audio/mp4",
+    "audio/aac",
+    "audio/ogg",
+    "audio/opus",
+    "audio/webm",
+    "audio/flac",
+    # Архивы и сжатые потоки
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/vnd.rar",
+    "application/x-bzip2",
+    "application/x-xz",
+    "application/zstd",
+    "application/x-brotli",
+    # Office Open XML / OpenDocument (ZIP контейнеры)
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    "application/vnd.oasis.opendocument.text",
+    "application/vnd.oasis.opendocument.spreadsheet",
+    "application/epub+zip",
+})
+
+# Префиксы MIME типов, которые всегда сжаты (video/*)
+ALREADY_COMPRESSED_MIME_PREFIXES = ("video/",)
+
+# Максимальный уровень сжатия для каждого алгоритма
+_MAX_LEVEL = {
+    CompressionAlgorithm.GZIP: 9,
+    CompressionAlgorithm.BROTLI: 11,
+}
+
+
+@dataclass
+class CompressionResult:
+    """
+    Результат сжатия файла.
+
+    Attributes:
+        file: Сжатое содержимое (UploadFile поверх SpooledTemporaryFile)
+        algorithm: Использованный алгоритм
+        original_size: Размер до сжатия (bytes)
+        compressed_size: Размер после сжатия (bytes)
+        checksum: SHA-256 сжатого содержимого (известен до передачи в SE)
+    """
+    file: UploadFile
+    algorithm: CompressionAlgorithm
+    original_size: int
+    compressed_size: int
+    checksum: str
+
+    @property
+    def ratio(self) -> float:
+        """Коэффициент сжатия (original_size / compressed_size)."""
+        return round(self.original_size / self.compressed_size, 3)
+
+    async def close(self) -> None:
+        """Освобождение временного файла со сжатым содержимым."""
+        await self.file.close()
+
+
+def is_already_compressed(content_type: Optional[str]) -> bool:
+    """
+    Проверка, является ли MIME тип уже сжатым форматом.
+
+    Args:
+        content_type: MIME тип файла (может содержать параметры)
+
+    Returns:
+        bool: True если повторное сжатие бессмысленно
+    """
+    if not content_type:
+        return False
+
+    mime_type = content_type.split(";", 1)[0].strip().lower()
+    return (
+        mime_type in ALREADY_COMPRESSED_MIME_TYPES
+        or mime_type.startswith(ALREADY_COMPRESSED_MIME_PREFIXES)
+    )
+
+
+def _new_compressor(algorithm: CompressionAlgorithm, level: int):
+    """
+    Создание потокового компрессора.
+
+    Returns:
+        Объект с методами compress(data) -> bytes и flush() -> bytes
+    """
+    level = max(0, min(level, _MAX_LEVEL[algorithm]))
+    if algorithm == CompressionAlgorithm.GZIP:
+        # wbits=31: gzip контейнер (заголовок + CRC32), совместим с Content-Encoding: gzip
+        return zlib.compressobj(level, zlib.DEFLATED, 31)
+    return _BrotliCompressor(level)
+
+
+class _BrotliCompressor:
+    """Адаптер brotli.Compressor к интерфейсу zlib (compress/flush)."""
+
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+def _compress_to_spool(
+    source: BinaryIO,
+    algorithm: CompressionAlgorithm,
+    level: int,
+    chunk_size: int,
+    spool_max_size: int,
+) -> tuple[SpooledTemporaryFile, int, int, str]:
+    """
+    Синхронное потоковое сжатие (выполняется в рабочем потоке).
+
+    Args:
+        source: Исходный файл (читается с начала)
+        algorithm: Алгоритм сжатия
+        level: Уровень сжатия
+        chunk_size: Размер блока чтения
+        spool_max_size: Порог, после которого результат пишется на диск
+
+    Returns:
+        tuple: (сжатый файл, исходный размер, сжатый размер, SHA-256 сжатого содержимого)
+    """
+    compressor = _new_compressor(algorithm, level)
+    output = SpooledTemporaryFile(max_size=spool_max_size)
+    hasher = hashlib.sha256()
+    original_size = 0
+    compressed_size = 0
+
+    try:
+        source.seek(0)
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            original_size += len(chunk)
+            compressed = compressor.compress(chunk)
+            if compressed:
+                output.write(compressed)
+                hasher.update(compressed)
+                compressed_size += len(compressed)
+
+        tail = compressor.flush()
+        output.write(tail)
+        hasher.update(tail)
+        compressed_size += len(tail)
+        output.seek(0)
+    except Exception:
+        output.close()
+        raise
+
+    return output, original_size, compressed_size, hasher.hexdigest()
+
+
+class CompressionService:
+    """
+    Потоковое сжатие загружаемых файлов в bounded пуле потоков.
+
+    zlib и brotli освобождают GIL на время сжатия блока, поэтому пул потоков
+    даёт реальный параллелизм без накладных расходов на межпроцессную передачу.
+    Размер пула ограничивает число одновременно сжимаемых файлов.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_workers: Размер пула (default: COMPRESSION_MAX_WORKERS)
+        """
+        self._max_workers = max_workers or settings.compression.max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Ленивое создание пула потоков."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="compression",
+            )
+        return self._executor
+
+    def should_compress(
+        self,
+        request: UploadRequest,
+        content_type: Optional[str],
+        file_size: int,
+    ) -> bool:
+        """
+        Решение о сжатии файла.
+
+        Сжатие выполняется если:
+        - Запрошено клиентом (compress=True) и включено в конфигурации
+        - Алгоритм отличен от none
+        - Размер файла не меньше COMPRESSION_MIN_SIZE
+        - Формат не является уже сжатым
+
+        Args:
+            request: Параметры загрузки
+            content_type: MIME тип файла
+            file_size: Размер файла в байтах
+
+        Returns:
+            bool: True если файл нужно сжать
+        """
+        if not (request.compress and settings.compression.enabled):
+            return False
+        if request.compression_algorithm == CompressionAlgorithm.NONE:
+            return False
+        if file_size < settings.compression.min_size:
+            return False
+        if is_already_compressed(content_type):
+            logger.debug(
+                "Compression skipped for already compressed content type",
+                extra={"content_type": content_type}
+            )
+            return False
+        return True
+
+    async def compress(
+        self,
+        file: UploadFile,
+        algorithm: CompressionAlgorithm,
+        chunk_size: int,
+    ) -> Optional[CompressionResult]:
+        """
+        Сжатие файла без блокировки event loop.
+
+        Args:
+            file: Загруженный файл
+            algorithm: Алгоритм сжатия (gzip/brotli)
+            chunk_size: Размер блока чтения
+
+        Returns:
+            Optional[CompressionResult]: Сжатый файл или None, если сжатие
+                не уменьшило размер (передаётся оригинал)
+        """
+        loop = asyncio.get_running_loop()
+        output, original_size, compressed_size, checksum = await loop.run_in_executor(
+            self._get_executor(),
+            _compress_to_spool,
+            file.file,
+            algorithm,
+            settings.compression.level,
+            chunk_size,
+            settings.compression.spool_max_size,
+        )
+        await file.seek(0)
+
+        if compressed_size >= original_size:
+            output.close()
+            logger.info(
+                "Compression skipped: no size reduction",
+                extra={
+                    "uploaded_filename": file.filename,
+                    "algorithm": algorithm.value,
+                    "original_size": original_size,
+                    "compressed_size": compressed_size,
+                }
+            )
+            return None
+
+        result = CompressionResult(
+            file=UploadFile(
+                file=output,
+                filename=file.filename,
+                size=compressed_size,
+                headers=Headers({"content-type": file.content_type or "application/octet-stream"}),
+            ),
+            algorithm=algorithm,
+            original_size=original_size,
+            compressed_size=compressed_size,
+            checksum=checksum,
+        )
+
+        logger.info(
+            "File compressed",
+            extra={
+                "uploaded_filename": file.filename,
+                "algorithm": algorithm.value,
+                "original_size": original_size,
+                "compressed_size": compressed_size,
+                "compression_ratio": result.ratio,
+            }
+        )
+
+        return result
+
+    def shutdown(self) -> None:
+        """Остановка пула потоков (lifespan shutdown)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            logger.info("Compression executor stopped")
@@ -0,0 +1,199 @@
+"""
+Ingester Module - Streaming Upload.
+
+Потоковая передача файла в Storage Element без буферизации всего файла в памяти.
+
+Файл читается из UploadFile блоками фиксированного размера, SHA-256 считается
+инкрементально, а multipart/form-data тело формируется на лету и отдаётся
+httpx как async iterable. Пиковое потребление памяти на одну загрузку
+ограничено размером буфера (STORAGE_ELEMENT_UPLOAD_BUFFER_SIZE).
+"""
+
+import hashlib
+import logging
+import os
+import secrets
+from typing import AsyncIterator, Optional
+
+from fastapi import UploadFile
+
+from app.core.exceptions import UploadException
+
+logger = logging.getLogger(__name__)
+
+
+def _quote_form_param(value: str) -> str:
+    """
+    Экранирование значения параметра Content-Disposition.
+
+    Повторяет поведение httpx (HTML5 form encoding): кавычки и переводы строк
+    заменяются percent-encoding, остальные символы передаются в UTF-8.
+
+    Args:
+        value: Имя поля или имя файла
+
+    Returns:
+        str: Безопасное значение для заголовка
+    """
+    return (
+        value.replace("\\", "\\\\")
+        .replace('"', "%22")
+        .replace("\r", "%0D")
+        .replace("\n", "%0A")
+    )
+
+
+def resolve_upload_size(file: UploadFile) -> int:
+    """
+    Определение размера загруженного файла без чтения содержимого.
+
+    Starlette заполняет UploadFile.size при разборе multipart запроса.
+    Если размер неизвестен, он определяется через seek() по spooled файлу.
+
+    Args:
+        file: Загруженный файл
+
+    Returns:
+        int: Размер файла в байтах
+    """
+    size = getattr(file, "size", None)
+    if isinstance(size, int):
+        return size
+
+    underlying = file.file
+    position = underlying.tell()
+    try:
+        underlying.seek(0, os.SEEK_END)
+        return underlying.tell()
+    finally:
+        underlying.seek(position)
+
+
+class StreamingMultipartBody:
+    """
+    Потоковое multipart/form-data тело запроса к Storage Element.
+
+    Формат совместим с endpoint POST /api/v1/files/upload Storage Element:
+    текстовые form поля + одно файловое поле "file".
+
+    Тело может быть итерировано повторно (retry на другой SE при 507):
+    каждая итерация начинается с начала файла и заново считает checksum.
+
+    Attributes:
+        checksum: SHA-256 переданных данных (доступен после полной итерации)
+        bytes_sent: Количество переданных байт файла в последней итерации
+    """
+
+    def __init__(
+        self,
+        file: UploadFile,
+        fields: dict[str, str],
+        filename: Optional[str],
+        content_type: Optional[str],
+        file_size: int,
+        chunk_size: int,
+    ):
+        """
+        Инициализация потокового тела.
+
+        Args:
+            file: Загруженный файл (spooled на диск средствами Starlette)
+            fields: Текстовые form поля
+            filename: Имя файла
+            content_type: MIME тип файла
+            file_size: Ожидаемый размер файла в байтах
+            chunk_size: Размер блока чтения (ограничивает пиковое потребление памяти)
+        """
+        self._file = file
+        self._file_size = file_size
+        self._chunk_size = chunk_size
+        self._boundary = secrets.token_hex(16)
+
+        self._preamble = self._render_preamble(
+            fields=fields,
+            filename=filename or "unknown",
+            content_type=content_type or "application/octet-stream",
+        )
+        self._epilogue = f"\r\n--{self._boundary}--\r\n".encode("ascii")
+
+        self._checksum: Optional[str] = None
+        self.bytes_sent = 0
+
+    def _render_preamble(self, fields: dict[str, str], filename: str, content_type: str) -> bytes:
+        """Формирование form полей и заголовка файловой части."""
+        parts = []
+        for name, value in fields.items():
+            parts.append(
+                f"--{self._boundary}\r\n"
+                f'Content-Disposition: form-data; name="{_quote_form_param(name)}"\r\n'
+                f"\r\n"
+                f"{value}\r\n"
+            )
+        parts.append(
+            f"--{self._boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{_quote_form_param(filename)}"\r\n'
+            f"Content-Type: {content_type}\r\n"
+            f"\r\n"
+        )
+        return "".join(parts).encode("utf-8")
+
+    @property
+    def content_type(self) -> str:
+        """Значение заголовка Content-Type с boundary."""
+        return f"multipart/form-data; boundary={self._boundary}"
+
+    @property
+    def content_length(self) -> int:
+        """Точный размер тела (позволяет обойтись без chunked transfer encoding)."""
+        return len(self._preamble) + self._file_size + len(self._epilogue)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Заголовки запроса для передачи тела."""
+        return {
+            "Content-Type": self.content_type,
+            "Content-Length": str(self.content_length),
+        }
+
+    @property
+    def checksum(self) -> Optional[str]:
+        """SHA-256 hex digest переданного файла или None до завершения передачи."""
+        return self._checksum
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """
+        Генерация тела запроса блоками.
+
+        Raises:
+            UploadException: Фактический размер файла не совпал с ожидаемым
+        """
+        await self._file.seek(0)
+        hasher = hashlib.sha256()
+        self._checksum = None
+        self.bytes_sent = 0
+
+        yield self._preamble
+
+        while True:
+            chunk = await self._file.read(self._chunk_size)
+            if not chunk:
+                break
+
+            self.bytes_sent += len(chunk)
+            if self.bytes_sent > self._file_size:
+                raise UploadException(
+                    f"File grew during upload: expected {self._file_size} bytes"
+                )
+
+            hasher.update(chunk)
+            yield chunk
+
+        if self.bytes_sent != self._file_size:
+            raise UploadException(
+                f"File size mismatch: expected {self._file_size} bytes, "
+                f"read {self.bytes_sent} bytes"
+            )
+
+        self._checksum = hasher.hexdigest()
+
+        yield self._epilogue
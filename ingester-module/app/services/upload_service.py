@@ -19,7 +19,6 @@ Sprint 16: Удаление STORAGE_ELEMENT_BASE_URL fallback.
 MVP реализация без Saga и Circuit Breaker (будет добавлено позже).
 """
 
-import hashlib
 import logging
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
@@ -45,6 +44,8 @@ from app.schemas.upload import (
     DEFAULT_TTL_DAYS  # Sprint 15
 )
 from app.services.auth_service import AuthService
+from app.services.streaming_upload import StreamingMultipartBody, resolve_upload_size
+from app.services.compression import CompressionService, CompressionResult
 from app.core.metrics import record_lazy_se_config_reload  # Sprint 21
 
 # TYPE_CHECKING для избежания circular imports
@@ -99,6 +100,9 @@ class UploadService:
         # Кеш HTTP клиентов для разных SE endpoints
         self._se_clients: dict[str, httpx.AsyncClient] = {}
 
+        # Сжатие файлов в пуле потоков (не блокирует event loop)
+        self._compression_service = CompressionService()
+
     def set_storage_selector(self, storage_selector: "StorageSelector") -> None:
         """
         Установка StorageSelector для динамического выбора SE.
@@ -200,6 +204,8 @@ class UploadService:
         self._se_clients.clear()
         logger.info("All HTTP clients closed")
 
+        self._compression_service.shutdown()
+
     async def upload_file(
         self,
         file: UploadFile,
@@ -225,6 +231,16 @@ class UploadService:
         - Интеграция с AdaptiveCapacityMonitor для lazy update
         - Исключение failed SE из повторного выбора
 
+        Streaming upload: файл не читается в память целиком.
+        - Размер берётся из UploadFile.size
+        - Содержимое передаётся в SE блоками upload_buffer_size
+        - SHA-256 считается инкрементально во время передачи
+
+        Compression: при compress=True файл сжимается (gzip/brotli) в пуле потоков.
+        - Уже сжатые форматы и файлы меньше COMPRESSION_MIN_SIZE не сжимаются
+        - В SE передаётся сжатое содержимое + compressed/compression_algorithm/original_size
+        - file_size и checksum относятся к хранимому (сжатому) содержимому
+
         Args:
             file: Загружаемый файл
             request: Параметры загрузки
@@ -251,9 +267,8 @@ class UploadService:
             }
         )
 
-        # Чтение содержимого файла
-        content = await file.read()
-        file_size = len(content)
+        # Размер известен после разбора multipart запроса - содержимое не читается в память
+        file_size = resolve_upload_size(file)
 
         # Проверка размера файла
         if file_size > self._max_file_size:
@@ -261,9 +276,6 @@ class UploadService:
                 f"File size {file_size} exceeds limit {self._max_file_size}"
             )
 
-        # Расчет checksum
-        checksum = hashlib.sha256(content).hexdigest()
-
         # Sprint 15: Расчёт TTL expiration для temporary файлов
         ttl_expires_at = None
         if request.retention_policy == RetentionPolicy.TEMPORARY and request.ttl_days:
@@ -275,11 +287,6 @@ class UploadService:
             retention_policy=request.retention_policy
         )
 
-        # Формирование данных для Storage Element
-        files = {
-            'file': (file.filename, content, file.content_type or 'application/octet-stream')
-        }
-
         # Sprint 15: Включаем retention policy в данные для SE
         data = {
             'description': request.description or '',
@@ -296,9 +303,93 @@ class UploadService:
             import json
             data['metadata'] = json.dumps(request.metadata)
 
-        # TODO: Добавить сжатие если request.compress=True
         # TODO: Добавить Circuit Breaker pattern
 
+        # Сжатие в пуле потоков; оригинал передаётся если сжатие не уменьшает размер
+        compression: Optional[CompressionResult] = None
+        if self._compression_service.should_compress(request, file.content_type, file_size):
+            compression = await self._compression_service.compress(
+                file=file,
+                algorithm=request.compression_algorithm,
+                chunk_size=settings.storage_element.upload_buffer_size,
+            )
+
+        try:
+            return await self._upload_with_retry(
+                file=file,
+                request=request,
+                user_id=user_id,
+                data=data,
+                file_size=file_size,
+                ttl_expires_at=ttl_expires_at,
+                compression=compression,
+            )
+        finally:
+            if compression is not None:
+                await compression.close()
+
+    async def _upload_with_retry(
+        self,
+        file: UploadFile,
+        request: UploadRequest,
+        user_id: str,
+        data: dict[str, str],
+        file_size: int,
+        ttl_expires_at: Optional[datetime],
+        compression: Optional[CompressionResult],
+    ) -> UploadResponse:
+        """
+        Передача файла в SE с retry при 507 и регистрация в Admin Module.
+
+        Args:
+            file: Исходный загруженный файл
+            request: Параметры загрузки
+            user_id: ID пользователя
+            data: Form поля для SE
+            file_size: Исходный размер файла
+            ttl_expires_at: Дата истечения TTL
+            compression: Результат сжатия (None - файл передаётся без сжатия)
+
+        Returns:
+            UploadResponse: Результат загрузки
+        """
+        source = file
+        stored_size = file_size
+        if compression is not None:
+            source = compression.file
+            stored_size = compression.compressed_size
+            data = {
+                **data,
+                'compressed': 'true',
+                'compression_algorithm': compression.algorithm.value,
+                'original_size': str(compression.original_size),
+            }
+
+        # Content-addressed дедупликация: SHA-256 сжатого содержимого известен
+        # до передачи, SE может создать файл из уже хранящегося blob
+        blob_link: Optional[dict] = None
+        if compression is not None and settings.storage_element.dedup_precheck:
+            blob_link = {
+                'checksum': compression.checksum,
+                'file_size': stored_size,
+                'original_filename': file.filename or 'unknown',
+                'content_type': file.content_type,
+                'description': request.description,
+                'compression_algorithm': compression.algorithm.value,
+                'original_size': compression.original_size,
+                'metadata': request.metadata,
+            }
+
+        # Потоковое multipart тело: файл читается блоками, SHA-256 считается на лету
+        body = StreamingMultipartBody(
+            file=source,
+            fields=data,
+            filename=file.filename,
+            content_type=file.content_type,
+            file_size=stored_size,
+            chunk_size=settings.storage_element.upload_buffer_size,
+        )
+
         # Sprint 17: Retry logic при 507 Insufficient Storage
         # Исключаем SE которые вернули 507 и пробуем другие
         excluded_se_ids: set[str] = set()
@@ -307,21 +398,22 @@ class UploadService:
         for attempt in range(self.DEFAULT_MAX_RETRIES):
             try:
                 result = await self._upload_to_storage_element(
-                    content=content,
-                    filename=file.filename,
-                    content_type=file.content_type,
-                    data=data,
-                    file_size=file_size,
+                    body=body,
+                    file_size=stored_size,
                     retention_policy=request.retention_policy,
                     excluded_se_ids=excluded_se_ids,
+                    blob_link=blob_link,
                 )
 
+                checksum = body.checksum
+
                 logger.info(
                     "File uploaded successfully",
                     extra={
                         "file_id": result["file_id"],
                         "uploaded_filename": file.filename,
-                        "file_size": file_size,
+                        "file_size": stored_size,
+                        "compressed": compression is not None,
                         "user_id": user_id,
                         "storage_element_url": result["storage_element_url"],
                         "storage_element_id": result["storage_element_id"],
@@ -332,17 +424,12 @@ class UploadService:
                 )
 
                 # Sprint 15.2: Регистрация файла в Admin Module file registry
-                try:
-                    from app.services.admin_client import get_admin_client, AdminClientError
-
-                    admin_client = await get_admin_client()
-
-                    # Подготовка данных для регистрации
-                    file_register_data = {
+                await self.register_in_file_registry(
+                    {
                         "file_id": str(result['file_id']),
                         "original_filename": file.filename or "unknown",
                         "storage_filename": result.get('storage_filename', result['file_id']),
-                        "file_size": file_size,
+                        "file_size": stored_size,
                         "checksum_sha256": result.get('checksum', checksum),
                         "content_type": file.content_type,
                         "description": request.description,
@@ -351,47 +438,24 @@ class UploadService:
                         "ttl_days": request.ttl_days,
                         "storage_element_id": result["storage_element_id"],
                         "storage_path": f"/files/{result['file_id']}",
-                        "compressed": request.compress,
-                        "compression_algorithm": request.compression_algorithm.value if request.compress else None,
-                        "original_size": file_size if request.compress else None,
+                        "compressed": compression is not None,
+                        "compression_algorithm": compression.algorithm.value if compression else None,
+                        "original_size": compression.original_size if compression else None,
                         "uploaded_by": user_id,
                         "upload_source_ip": None,  # TODO: extract from request
                         "user_metadata": request.metadata,
-                    }
-
-                    # Регистрация в file registry
-                    registry_result = await admin_client.register_file(file_register_data)
-
-                    logger.info(
-                        "File registered in Admin Module registry",
-                        extra={
-                            "file_id": str(result['file_id']),
-                            "registry_file_id": registry_result.get('file_id'),
-                        }
-                    )
-
-                except AdminClientError as e:
-                    # NON-CRITICAL: Файл загружен в SE, но не зарегистрирован в Admin Module
-                    # Может быть зарегистрирован позже через reconciliation job
-                    logger.error(
-                        "Failed to register file in Admin Module registry",
-                        extra={
-                            "file_id": str(result['file_id']),
-                            "error": str(e),
-                            "user_id": user_id
-                        }
-                    )
-                    # Не прерываем операцию - файл уже в SE
-                    # TODO Sprint 15.3: Implement reconciliation job для retry
+                    },
+                    user_id=user_id,
+                )
 
                 # Sprint 15: Формирование ответа с retention policy info
                 return UploadResponse(
                     file_id=UUID(result['file_id']),
                     original_filename=file.filename or "unknown",
                     storage_filename=result.get('original_filename', ''),
-                    file_size=file_size,
-                    compressed=request.compress,
-                    compression_ratio=None,  # TODO: calculate if compressed
+                    file_size=stored_size,
+                    compressed=compression is not None,
+                    compression_ratio=compression.ratio if compression else None,
                     checksum=result.get('checksum', checksum),
                     uploaded_at=datetime.now(timezone.utc),
                     storage_element_url=result["storage_element_url"],
@@ -413,7 +477,7 @@ class UploadService:
                         "attempt": attempt + 1,
                         "max_retries": self.DEFAULT_MAX_RETRIES,
                         "excluded_se_ids": list(excluded_se_ids),
-                        "file_size": file_size,
+                        "file_size": stored_size,
                     }
                 )
 
@@ -464,29 +528,70 @@ class UploadService:
             "Upload failed after all retry attempts"
         )
 
+    async def register_in_file_registry(self, file_register_data: dict, user_id: str) -> None:
+        """
+        Регистрация загруженного файла в Admin Module file registry.
+
+        Sprint 15.2: NON-CRITICAL операция - файл уже в SE, при ошибке
+        может быть зарегистрирован позже через reconciliation job.
+
+        Args:
+            file_register_data: Данные файла для регистрации
+            user_id: ID пользователя (для логирования)
+        """
+        from app.services.admin_client import get_admin_client, AdminClientError
+
+        try:
+            admin_client = await get_admin_client()
+
+            # Регистрация в file registry
+            registry_result = await admin_client.register_file(file_register_data)
+
+            logger.info(
+                "File registered in Admin Module registry",
+                extra={
+                    "file_id": file_register_data["file_id"],
+                    "registry_file_id": registry_result.get('file_id'),
+                }
+            )
+
+        except AdminClientError as e:
+            # NON-CRITICAL: Файл загружен в SE, но не зарегистрирован в Admin Module
+            # Может быть зарегистрирован позже через reconciliation job
+            logger.error(
+                "Failed to register file in Admin Module registry",
+                extra={
+                    "file_id": file_register_data["file_id"],
+                    "error": str(e),
+                    "user_id": user_id
+                }
+            )
+            # Не прерываем операцию - файл уже в SE
+            # TODO Sprint 15.3: Implement reconciliation job для retry
+
     async def _upload_to_storage_element(
         self,
-        content: bytes,
-        filename: str,
-        content_type: Optional[str],
-        data: dict,
+        body: StreamingMultipartBody,
         file_size: int,
         retention_policy: RetentionPolicy,
         excluded_se_ids: set[str],
+        blob_link: Optional[dict] = None,
     ) -> dict:
         """
         Внутренний метод для загрузки файла на конкретный SE.
 
         Sprint 17: Выделен из upload_file для поддержки retry logic.
 
+        Файл передаётся потоково: тело перечитывается с начала на каждой попытке,
+        поэтому retry на другой SE не требует буферизации содержимого.
+
         Args:
-            content: Содержимое файла
-            filename: Имя файла
-            content_type: MIME тип
-            data: Данные для multipart form
+            body: Потоковое multipart тело (form поля + файл)
             file_size: Размер файла
             retention_policy: Политика хранения
             excluded_se_ids: Множество ID SE для исключения из выбора
+            blob_link: Checksum и метаданные для создания файла из существующего
+                blob (None - содержимое всегда передаётся)
 
         Returns:
             dict: Результат от Storage Element + storage_element_url, storage_element_id
@@ -503,11 +608,6 @@ class UploadService:
             excluded_se_ids=excluded_se_ids,
         )
 
-        # Формирование файла для multipart
-        files = {
-            'file': (filename, content, content_type or 'application/octet-stream')
-        }
-
         try:
             # Получить JWT access token для аутентификации
             access_token = await self.auth_service.get_access_token()
@@ -515,12 +615,21 @@ class UploadService:
             # Используем клиент для выбранного SE endpoint
             client = await self._get_client_for_endpoint(storage_element_url)
 
+            # Содержимое уже хранится на SE - файл создаётся без передачи данных
+            result = None
+            if blob_link is not None:
+                result = await self._create_from_existing_blob(client, access_token, blob_link)
+
+            if result is not None:
+                result["storage_element_url"] = storage_element_url
+                result["storage_element_id"] = storage_element_id
+                return result
+
             # Отправка запроса в Storage Element с Authorization header
             response = await client.post(
                 "/api/v1/files/upload",
-                headers={'Authorization': f'Bearer {access_token}'},
-                files=files,
-                data=data
+                headers={'Authorization': f'Bearer {access_token}', **body.headers},
+                content=body,
             )
 
             # Sprint 17: Проверка на 507 Insufficient Storage
@@ -588,6 +697,56 @@ class UploadService:
                 f"Cannot connect to Storage Element: {str(e)}"
             )
 
+    async def _create_from_existing_blob(
+        self,
+        client: httpx.AsyncClient,
+        access_token: str,
+        blob_link: dict,
+    ) -> Optional[dict]:
+        """
+        Создание файла на SE из уже хранящегося blob (без передачи содержимого).
+
+        Любой ответ кроме 201 (blob не найден, дедупликация выключена на SE,
+        старая версия SE без blobs API) означает обычную загрузку.
+
+        Args:
+            client: HTTP клиент выбранного SE
+            access_token: JWT access token
+            blob_link: Checksum и метаданные файла
+
+        Returns:
+            Optional[dict]: Результат от Storage Element или None
+        """
+        checksum = blob_link['checksum']
+        payload = {key: value for key, value in blob_link.items() if key != 'checksum'}
+
+        try:
+            response = await client.post(
+                f"/api/v1/blobs/{checksum}/files",
+                headers={'Authorization': f'Bearer {access_token}'},
+                json=payload,
+            )
+        except httpx.RequestError as e:
+            logger.debug(
+                "Blob pre-check failed, falling back to upload",
+                extra={"checksum": checksum, "error": str(e)}
+            )
+            return None
+
+        if response.status_code == 201:
+            logger.info(
+                "File deduplicated on Storage Element",
+                extra={"checksum": checksum, "file_size": blob_link['file_size']}
+            )
+            return response.json()
+
+        if response.status_code != 404:
+            logger.warning(
+                "Blob link rejected, falling back to upload",
+                extra={"checksum": checksum, "status_code": response.status_code}
+            )
+        return None
+
     async def _select_storage_element_with_id(
         self,
         file_size: int,
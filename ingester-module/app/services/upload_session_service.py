@@ -0,0 +1,810 @@
+"""
+Ingester Module - Upload Session Service.
+
+Resumable multipart upload для больших файлов (multi-GB) через нестабильные каналы.
+
+Протокол:
+1. create_session: выбор SE, создание staging области на SE, сессия в Redis
+2. upload_part: часть потоково передаётся в staging SE (части независимы,
+   могут загружаться параллельно и повторно)
+3. list_parts: какие части уже загружены (возобновление после обрыва)
+4. complete: SE создаёт файл из частей, регистрация в Admin Module
+5. abort: очистка staging SE и сессии
+
+Состояние в Redis:
+- {prefix}:{session_id}        - HASH: data (JSON параметров сессии, не меняется
+                                 после создания), status
+- {prefix}:{session_id}:parts  - HASH part_number → JSON части (size, checksum)
+
+Запись части и смена статуса - Lua скрипты с проверкой статуса: часть,
+загруженная параллельно с complete, не возвращает сессию в ACTIVE.
+
+file_id файла назначается при создании сессии и передаётся в SE complete.
+Если исход SE complete неизвестен (таймаут, обрыв ответа), сессия остаётся
+COMPLETING: после истечения complete lease повторный complete сверяется с SE
+(файл с этим file_id уже создан → только регистрация) вместо повторной
+отправки частей, которых в staging SE уже может не быть.
+TTL ключей продлевается при каждой загруженной части.
+Сжатие для upload sessions не применяется: части передаются в SE как есть.
+"""
+
+import hashlib
+import json
+import logging
+import secrets
+import time
+from datetime import datetime, timezone, timedelta
+from typing import AsyncIterator, Optional
+from uuid import UUID, uuid4
+
+import httpx
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.core.exceptions import (
+    FileSizeLimitExceededException,
+    StorageElementUnavailableException,
+    UploadSessionNotFoundException,
+    UploadSessionStateException,
+)
+from app.schemas.upload import RetentionPolicy, UploadResponse
+from app.schemas.upload_session import (
+    UploadPartInfo,
+    UploadPartsResponse,
+    UploadSessionCreateRequest,
+    UploadSessionResponse,
+    UploadSessionStatus,
+)
+from app.services.upload_service import UploadService
+
+logger = logging.getLogger(__name__)
+
+# KEYS: сессия, части; ARGV: part_number, JSON части, ttl, ожидаемый статус
+# Returns: 1 - часть записана, 0 - статус сессии изменился, -1 - сессии нет
+RECORD_PART_SCRIPT = """
+local status = redis.call('HGET', KEYS[1], 'status')
+if not status then
+    return -1
+end
+if status ~= ARGV[4] then
+    return 0
+end
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return 1
+"""
+
+# KEYS: сессия; ARGV: ожидаемый статус, новый статус
+# Returns: 1 - статус изменён, 0 - текущий статус не совпал с ожидаемым
+SET_STATUS_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'status') ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'status', ARGV[2])
+return 1
+"""
+
+# KEYS: сессия; ARGV: текущее время, срок complete lease (unix time)
+# Returns: предыдущий статус (active, completing с истёкшим lease)
+# или false - complete уже выполняется либо сессия не активна
+CLAIM_COMPLETE_SCRIPT = """
+local status = redis.call('HGET', KEYS[1], 'status')
+if status == 'completing' then
+    if tonumber(redis.call('HGET', KEYS[1], 'completing_until') or '0') > tonumber(ARGV[1]) then
+        return false
+    end
+elseif status ~= 'active' then
+    return false
+end
+redis.call('HSET', KEYS[1], 'status', 'completing', 'completing_until', ARGV[2])
+return status
+"""
+
+
+class UploadSessionService:
+    """
+    Сервис resumable multipart upload sessions.
+
+    Использует UploadService для выбора SE, HTTP клиентов, аутентификации
+    и регистрации файла в Admin Module.
+    """
+
+    def __init__(self, upload_service: UploadService, redis_client: Optional[Redis] = None):
+        """
+        Args:
+            upload_service: UploadService (SE selection, HTTP clients, registry)
+            redis_client: Async Redis клиент (default: get_redis_client())
+        """
+        self.upload_service = upload_service
+        self._redis = redis_client
+
+    async def _get_redis(self) -> Redis:
+        if self._redis is None:
+            from app.core.redis import get_redis_client
+            self._redis = await get_redis_client()
+        return self._redis
+
+    @staticmethod
+    def _session_key(session_id: str) -> str:
+        return f"{settings.upload_session.key_prefix}:{session_id}"
+
+    @staticmethod
+    def _parts_key(session_id: str) -> str:
+        return f"{settings.upload_session.key_prefix}:{session_id}:parts"
+
+    # ------------------------------------------------------------------
+    # Session state
+    # ------------------------------------------------------------------
+
+    async def _load_session(self, session_id: str, user_id: str) -> dict:
+        """
+        Загрузка сессии из Redis с проверкой владельца.
+
+        Raises:
+            UploadSessionNotFoundException: Сессия не найдена, истекла или чужая
+        """
+        redis = await self._get_redis()
+        pipe = redis.pipeline(transaction=True)
+        pipe.hmget(self._session_key(session_id), "data", "status")
+        pipe.ttl(self._session_key(session_id))
+        (raw, status), ttl = await pipe.execute()
+        if raw is None or status is None:
+            raise UploadSessionNotFoundException(
+                f"Upload session {session_id} not found or expired",
+                details={"session_id": session_id}
+            )
+
+        session = json.loads(raw)
+        if session["user_id"] != user_id:
+            # Не раскрываем существование чужой сессии
+            raise UploadSessionNotFoundException(
+                f"Upload session {session_id} not found or expired",
+                details={"session_id": session_id}
+            )
+        session["status"] = status
+        session["expires_at"] = (datetime.now(timezone.utc) + timedelta(seconds=max(ttl, 0))).isoformat()
+        return session
+
+    async def _create_session(self, session: dict) -> None:
+        """Сохранение новой сессии (data + status) с TTL."""
+        redis = await self._get_redis()
+        ttl = settings.upload_session.ttl_seconds
+        data = {key: value for key, value in session.items() if key != "status"}
+        session["expires_at"] = (datetime.now(timezone.utc) + timedelta(seconds=ttl)).isoformat()
+
+        pipe = redis.pipeline(transaction=True)
+        pipe.hset(
+            self._session_key(session["session_id"]),
+            mapping={"data": json.dumps(data), "status": session["status"]},
+        )
+        pipe.expire(self._session_key(session["session_id"]), ttl)
+        await pipe.execute()
+
+    async def _record_part(self, session: dict, part: UploadPartInfo) -> None:
+        """
+        Атомарная запись части с продлением TTL - только в активную сессию.
+
+        Raises:
+            UploadSessionNotFoundException: Сессия истекла во время загрузки части
+            UploadSessionStateException: Сессия завершается или завершена
+        """
+        redis = await self._get_redis()
+        session_id = session["session_id"]
+        recorded = int(await redis.eval(
+            RECORD_PART_SCRIPT,
+            2,
+            self._session_key(session_id),
+            self._parts_key(session_id),
+            str(part.part_number),
+            part.model_dump_json(),
+            settings.upload_session.ttl_seconds,
+            UploadSessionStatus.ACTIVE.value,
+        ))
+        if recorded == -1:
+            raise UploadSessionNotFoundException(
+                f"Upload session {session_id} not found or expired",
+                details={"session_id": session_id}
+            )
+        if recorded == 0:
+            raise UploadSessionStateException(
+                f"Upload session {session_id} is no longer active",
+                details={"session_id": session_id, "part_number": part.part_number}
+            )
+
+    async def _set_status(
+        self,
+        session: dict,
+        expected: UploadSessionStatus,
+        status: UploadSessionStatus
+    ) -> bool:
+        """Смена статуса сессии только из ожидаемого (compare-and-set)."""
+        redis = await self._get_redis()
+        changed = int(await redis.eval(
+            SET_STATUS_SCRIPT, 1, self._session_key(session["session_id"]), expected.value, status.value
+        ))
+        if changed:
+            session["status"] = status.value
+        return bool(changed)
+
+    async def _claim_completion(self, session: dict) -> Optional[UploadSessionStatus]:
+        """
+        Переход в COMPLETING с complete lease.
+
+        Returns:
+            Optional[UploadSessionStatus]: Предыдущий статус (ACTIVE или COMPLETING
+            с истёкшим lease) или None - complete уже выполняется
+        """
+        redis = await self._get_redis()
+        now = time.time()
+        previous = await redis.eval(
+            CLAIM_COMPLETE_SCRIPT,
+            1,
+            self._session_key(session["session_id"]),
+            now,
+            now + settings.upload_session.complete_lease_seconds,
+        )
+        if previous is None:
+            return None
+        session["status"] = UploadSessionStatus.COMPLETING.value
+        return UploadSessionStatus(previous)
+
+    async def _load_parts(self, session_id: str) -> dict[int, dict]:
+        redis = await self._get_redis()
+        raw_parts = await redis.hgetall(self._parts_key(session_id))
+        return {int(number): json.loads(value) for number, value in raw_parts.items()}
+
+    @staticmethod
+    def _require_active(session: dict) -> None:
+        if session["status"] != UploadSessionStatus.ACTIVE.value:
+            raise UploadSessionStateException(
+                f"Upload session {session['session_id']} is {session['status']}",
+                details={"session_id": session["session_id"], "status": session["status"]}
+            )
+
+    @staticmethod
+    def _part_size_for(session: dict, part_number: int) -> int:
+        """
+        Ожидаемый размер части.
+
+        Raises:
+            UploadSessionStateException: Номер части вне диапазона
+        """
+        if part_number < 1 or part_number > session["total_parts"]:
+            raise UploadSessionStateException(
+                f"Part number {part_number} out of range 1..{session['total_parts']}",
+                details={"part_number": part_number, "total_parts": session["total_parts"]}
+            )
+        offset = (part_number - 1) * session["part_size"]
+        return min(session["part_size"], session["file_size"] - offset)
+
+    @staticmethod
+    def _to_response(session: dict, uploaded_parts: int) -> UploadSessionResponse:
+        return UploadSessionResponse(
+            session_id=session["session_id"],
+            status=UploadSessionStatus(session["status"]),
+            filename=session["filename"],
+            file_size=session["file_size"],
+            part_size=session["part_size"],
+            total_parts=session["total_parts"],
+            uploaded_parts=uploaded_parts,
+            storage_element_id=session["storage_element_id"],
+            expires_at=datetime.fromisoformat(session["expires_at"]),
+        )
+
+    # ------------------------------------------------------------------
+    # Storage Element calls
+    # ------------------------------------------------------------------
+
+    async def _se_request(
+        self,
+        session: dict,
+        method: str,
+        path: str,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Запрос к staging API Storage Element сессии.
+
+        Raises:
+            UploadSessionNotFoundException: SE не знает о загрузке (staging удалён)
+            UploadSessionStateException: SE отклонил часть/complete (4xx)
+            StorageElementUnavailableException: SE недоступен или 5xx
+        """
+        access_token = await self.upload_service.auth_service.get_access_token()
+        client = await self.upload_service._get_client_for_endpoint(session["storage_element_url"])
+        headers = {"Authorization": f"Bearer {access_token}", **kwargs.pop("headers", {})}
+
+        try:
+            response = await client.request(method, path, headers=headers, **kwargs)
+        except httpx.RequestError as e:
+            logger.error(
+                "Storage Element connection error during upload session",
+                extra={
+                    "session_id": session["session_id"],
+                    "storage_element_id": session["storage_element_id"],
+                    "error": str(e),
+                }
+            )
+            raise StorageElementUnavailableException(
+                f"Cannot connect to Storage Element: {str(e)}",
+                # Соединение не установлено - запрос до SE не дошёл
+                details={"connected": not isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))}
+            )
+
+        if response.status_code == 404:
+            raise UploadSessionNotFoundException(
+                f"Upload session {session['session_id']} not found on Storage Element",
+                details={"session_id": session["session_id"]}
+            )
+        if 400 <= response.status_code < 500:
+            detail = None
+            if response.content:
+                # Ответ proxy/ingress (HTML 413/429) - не JSON
+                try:
+                    body = response.json()
+                except ValueError:
+                    body = None
+                detail = body.get("detail") if isinstance(body, dict) else response.text
+            raise UploadSessionStateException(
+                detail or f"Storage Element rejected request: {response.status_code}",
+                details={"session_id": session["session_id"], "status_code": response.status_code}
+            )
+        if response.status_code >= 500:
+            raise StorageElementUnavailableException(
+                f"Storage Element returned error: {response.status_code}",
+                details={"status_code": response.status_code}
+            )
+
+        return response
+
+    @staticmethod
+    def _se_outcome_unknown(error: BaseException) -> bool:
+        """
+        Ошибка запроса, после которой SE мог выполнить операцию.
+
+        Ответ SE (4xx/5xx) и неустановленное соединение - операция не выполнена;
+        таймаут, обрыв ответа и отмена запроса - исход неизвестен.
+        """
+        if isinstance(error, (UploadSessionStateException, UploadSessionNotFoundException)):
+            return False
+        if isinstance(error, StorageElementUnavailableException):
+            return "status_code" not in error.details and error.details.get("connected", True)
+        return True
+
+    async def _se_complete(self, session: dict) -> dict:
+        """SE complete: создание файла с file_id сессии из staging."""
+        response = await self._se_request(
+            session,
+            "POST",
+            f"/api/v1/uploads/{session['session_id']}/complete",
+            json={
+                "original_filename": session["filename"],
+                "content_type": session["content_type"],
+                "description": session["description"],
+                "metadata": session["metadata"],
+                "file_id": session["file_id"],
+            },
+        )
+        result = response.json()
+        return {
+            "file_id": str(result["file_id"]),
+            "storage_filename": result.get("storage_filename", str(result["file_id"])),
+            "file_size": result["file_size"],
+            "checksum": result["checksum"],
+        }
+
+    async def _find_se_file(self, session: dict) -> Optional[dict]:
+        """
+        Файл сессии на SE (создан неподтверждённым complete).
+
+        Returns:
+            Optional[dict]: Файл в формате результата _se_complete или None
+        """
+        try:
+            response = await self._se_request(session, "GET", f"/api/v1/files/{session['file_id']}")
+        except UploadSessionNotFoundException:
+            return None
+        metadata = response.json()
+        return {
+            "file_id": str(metadata["file_id"]),
+            "storage_filename": metadata["storage_filename"],
+            "file_size": metadata["file_size"],
+            "checksum": metadata["checksum"],
+        }
+
+    async def _recover_completion(self, session: dict, error: Exception) -> dict:
+        """
+        SE отклонил complete: сверка с SE перед откатом статуса.
+
+        Файл мог быть создан предыдущей неподтверждённой попыткой complete
+        (staging уже удалён или file_id занят) - тогда используется он.
+
+        Raises:
+            Exception: error, если файл на SE не создан
+        """
+        try:
+            result = await self._find_se_file(session)
+        except StorageElementUnavailableException:
+            result = None
+        if result is not None:
+            return result
+
+        if isinstance(error, UploadSessionNotFoundException):
+            # Staging удалён, файл не создан - части потеряны
+            await self._set_status(session, UploadSessionStatus.COMPLETING, UploadSessionStatus.FAILED)
+        else:
+            # Части остаются в staging - complete можно повторить
+            await self._set_status(session, UploadSessionStatus.COMPLETING, UploadSessionStatus.ACTIVE)
+        raise error
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def create_session(
+        self,
+        request: UploadSessionCreateRequest,
+        user_id: str,
+        username: str
+    ) -> UploadSessionResponse:
+        """
+        Создание upload session.
+
+        Args:
+            request: Параметры файла и загрузки
+            user_id: ID пользователя
+            username: Имя пользователя
+
+        Returns:
+            UploadSessionResponse: Созданная сессия
+
+        Raises:
+            FileSizeLimitExceededException: Превышен лимит размера
+            UploadSessionStateException: Некорректный размер части
+            NoAvailableStorageException: Нет подходящего SE
+        """
+        config = settings.upload_session
+        if request.file_size > config.max_file_size:
+            raise FileSizeLimitExceededException(
+                f"File size {request.file_size} exceeds limit {config.max_file_size}"
+            )
+
+        part_size = request.part_size or config.default_part_size
+        if not config.min_part_size <= part_size <= config.max_part_size:
+            raise UploadSessionStateException(
+                f"part_size must be between {config.min_part_size} and {config.max_part_size}",
+                details={"part_size": part_size}
+            )
+        part_size = min(part_size, request.file_size)
+
+        storage_element_url, storage_element_id = await self.upload_service._select_storage_element_with_id(
+            file_size=request.file_size,
+            retention_policy=request.retention_policy,
+        )
+
+        session = {
+            "session_id": secrets.token_urlsafe(24),
+            "status": UploadSessionStatus.ACTIVE.value,
+            # file_id назначается заранее: повторный complete не создаёт второй файл
+            "file_id": str(uuid4()),
+            "user_id": user_id,
+            "username": username,
+            "filename": request.filename,
+            "content_type": request.content_type,
+            "file_size": request.file_size,
+            "part_size": part_size,
+            "total_parts": -(-request.file_size // part_size),
+            "description": request.description,
+            "retention_policy": request.retention_policy.value,
+            "ttl_days": request.ttl_days if request.retention_policy == RetentionPolicy.TEMPORARY else None,
+            "metadata": request.metadata,
+            "storage_element_url": storage_element_url,
+            "storage_element_id": storage_element_id,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        await self._se_request(
+            session,
+            "POST",
+            "/api/v1/uploads",
+            json={
+                "upload_id": session["session_id"],
+                "file_size": session["file_size"],
+                "part_size": session["part_size"],
+            },
+        )
+        await self._create_session(session)
+
+        logger.info(
+            "Upload session created",
+            extra={
+                "session_id": session["session_id"],
+                "uploaded_filename": request.filename,
+                "file_size": request.file_size,
+                "part_size": part_size,
+                "total_parts": session["total_parts"],
+                "storage_element_id": storage_element_id,
+                "user_id": user_id,
+            }
+        )
+
+        return self._to_response(session, uploaded_parts=0)
+
+    async def get_session(self, session_id: str, user_id: str) -> UploadSessionResponse:
+        """
+        Состояние upload session.
+
+        Raises:
+            UploadSessionNotFoundException: Сессия не найдена
+        """
+        session = await self._load_session(session_id, user_id)
+        parts = await self._load_parts(session_id)
+        return self._to_response(session, uploaded_parts=len(parts))
+
+    async def upload_part(
+        self,
+        session_id: str,
+        part_number: int,
+        stream: AsyncIterator[bytes],
+        content_length: Optional[int],
+        user_id: str,
+        expected_checksum: Optional[str] = None,
+    ) -> UploadPartInfo:
+        """
+        Потоковая передача части в staging Storage Element.
+
+        Повторная загрузка части (retry) перезаписывает её.
+
+        Args:
+            session_id: ID сессии
+            part_number: Номер части (1..total_parts)
+            stream: Тело запроса клиента
+            content_length: Content-Length запроса клиента
+            user_id: ID пользователя
+            expected_checksum: SHA-256 части от клиента (опционально)
+
+        Returns:
+            UploadPartInfo: Загруженная часть
+
+        Raises:
+            UploadSessionNotFoundException: Сессия не найдена
+            UploadSessionStateException: Некорректный номер/размер части или checksum
+            StorageElementUnavailableException: SE недоступен
+        """
+        session = await self._load_session(session_id, user_id)
+        self._require_active(session)
+        expected_size = self._part_size_for(session, part_number)
+
+        if content_length is not None and content_length != expected_size:
+            raise UploadSessionStateException(
+                f"Part {part_number} must be {expected_size} bytes, got Content-Length {content_length}",
+                details={"part_number": part_number, "expected_size": expected_size}
+            )
+
+        part_hash = hashlib.sha256()
+
+        async def hashed_stream() -> AsyncIterator[bytes]:
+            async for chunk in stream:
+                part_hash.update(chunk)
+                yield chunk
+
+        response = await self._se_request(
+            session,
+            "PUT",
+            f"/api/v1/uploads/{session_id}/parts/{part_number}",
+            content=hashed_stream(),
+            headers={
+                "Content-Type": "application/octet-stream",
+                "Content-Length": str(expected_size),
+            },
+        )
+        result = response.json()
+
+        checksum = part_hash.hexdigest()
+        if result["checksum"] != checksum or (expected_checksum and expected_checksum.lower() != checksum):
+            raise UploadSessionStateException(
+                f"Part {part_number} checksum mismatch",
+                details={
+                    "part_number": part_number,
+                    "checksum": checksum,
+                    "storage_element_checksum": result["checksum"],
+                    "expected_checksum": expected_checksum,
+                }
+            )
+
+        part = UploadPartInfo(
+            part_number=part_number,
+            size=result["size"],
+            checksum=checksum,
+            uploaded_at=datetime.now(timezone.utc),
+        )
+
+        await self._record_part(session, part)
+
+        logger.debug(
+            "Upload session part uploaded",
+            extra={"session_id": session_id, "part_number": part_number, "size": part.size}
+        )
+
+        return part
+
+    async def list_parts(self, session_id: str, user_id: str) -> UploadPartsResponse:
+        """
+        Список загруженных частей (для возобновления загрузки).
+
+        Raises:
+            UploadSessionNotFoundException: Сессия не найдена
+        """
+        session = await self._load_session(session_id, user_id)
+        parts = await self._load_parts(session_id)
+
+        return UploadPartsResponse(
+            session_id=session_id,
+            total_parts=session["total_parts"],
+            parts=[UploadPartInfo(**parts[number]) for number in sorted(parts)],
+            missing_parts=[n for n in range(1, session["total_parts"] + 1) if n not in parts],
+        )
+
+    async def complete(self, session_id: str, user_id: str) -> UploadResponse:
+        """
+        Завершение загрузки: SE создаёт файл из частей.
+
+        Итоговый SHA-256 вычисляется на SE инкрементально при приёме частей,
+        файл целиком повторно не читается.
+
+        Повторный вызов после неподтверждённого SE complete (таймаут) -
+        сверка с SE по file_id сессии после истечения complete lease.
+
+        Returns:
+            UploadResponse: Результат загрузки (как у POST /files/upload)
+
+        Raises:
+            UploadSessionNotFoundException: Сессия не найдена
+            UploadSessionStateException: Загружены не все части / сессия не активна
+            StorageElementUnavailableException: SE недоступен
+        """
+        session = await self._load_session(session_id, user_id)
+        if session["status"] != UploadSessionStatus.COMPLETING.value:
+            self._require_active(session)
+
+            parts = await self._load_parts(session_id)
+            missing = [n for n in range(1, session["total_parts"] + 1) if n not in parts]
+            if missing:
+                raise UploadSessionStateException(
+                    f"Upload session {session_id} is incomplete: {len(missing)} parts missing",
+                    details={"session_id": session_id, "missing_parts": missing[:100]}
+                )
+
+        previous = await self._claim_completion(session)
+        if previous is None:
+            raise UploadSessionStateException(
+                f"Upload session {session_id} is already being completed",
+                details={"session_id": session_id}
+            )
+
+        try:
+            if previous == UploadSessionStatus.COMPLETING:
+                # Исход предыдущего SE complete неизвестен - файл мог быть создан
+                result = await self._find_se_file(session) or await self._se_complete(session)
+            else:
+                result = await self._se_complete(session)
+        except BaseException as e:
+            if self._se_outcome_unknown(e):
+                # SE мог создать файл и удалить staging - без отката в ACTIVE
+                logger.warning(
+                    "Upload session completion outcome unknown, session stays completing",
+                    extra={
+                        "session_id": session_id,
+                        "file_id": session["file_id"],
+                        "storage_element_id": session["storage_element_id"],
+                        "error": repr(e),
+                    }
+                )
+                raise
+            result = await self._recover_completion(session, e)
+
+        retention_policy = RetentionPolicy(session["retention_policy"])
+        ttl_expires_at = None
+        if retention_policy == RetentionPolicy.TEMPORARY and session["ttl_days"]:
+            ttl_expires_at = datetime.now(timezone.utc) + timedelta(days=session["ttl_days"])
+
+        try:
+            await self.upload_service.register_in_file_registry(
+                {
+                    "file_id": str(result["file_id"]),
+                    "original_filename": session["filename"],
+                    "storage_filename": result["storage_filename"],
+                    "file_size": result["file_size"],
+                    "checksum_sha256": result["checksum"],
+                    "content_type": session["content_type"],
+                    "description": session["description"],
+                    "retention_policy": retention_policy.value,
+                    "ttl_expires_at": ttl_expires_at.isoformat() if ttl_expires_at else None,
+                    "ttl_days": session["ttl_days"],
+                    "storage_element_id": session["storage_element_id"],
+                    "storage_path": f"/files/{result['file_id']}",
+                    "compressed": False,
+                    "compression_algorithm": None,
+                    "original_size": None,
+                    "uploaded_by": user_id,
+                    "upload_source_ip": None,
+                    "user_metadata": session["metadata"],
+                },
+                user_id=user_id,
+            )
+        except BaseException:
+            # Файл уже создан на SE из staging - повтор complete невозможен
+            logger.error(
+                "Upload session file registration failed",
+                extra={
+                    "session_id": session_id,
+                    "file_id": str(result["file_id"]),
+                    "storage_element_id": session["storage_element_id"],
+                    "user_id": user_id,
+                }
+            )
+            await self._set_status(session, UploadSessionStatus.COMPLETING, UploadSessionStatus.FAILED)
+            raise
+
+        await self._delete_session(session_id)
+
+        logger.info(
+            "Upload session completed",
+            extra={
+                "session_id": session_id,
+                "file_id": str(result["file_id"]),
+                "file_size": result["file_size"],
+                "total_parts": session["total_parts"],
+                "storage_element_id": session["storage_element_id"],
+                "user_id": user_id,
+            }
+        )
+
+        return UploadResponse(
+            file_id=UUID(str(result["file_id"])),
+            original_filename=session["filename"],
+            storage_filename=result["storage_filename"],
+            file_size=result["file_size"],
+            checksum=result["checksum"],
+            uploaded_at=datetime.now(timezone.utc),
+            storage_element_url=session["storage_element_url"],
+            retention_policy=retention_policy,
+            ttl_expires_at=ttl_expires_at,
+            storage_element_id=session["storage_element_id"],
+        )
+
+    async def abort(self, session_id: str, user_id: str) -> None:
+        """
+        Отмена загрузки: очистка staging SE и сессии в Redis.
+
+        Raises:
+            UploadSessionNotFoundException: Сессия не найдена
+            UploadSessionStateException: Сессия завершается (SE complete использует staging)
+        """
+        session = await self._load_session(session_id, user_id)
+        if session["status"] == UploadSessionStatus.ACTIVE.value:
+            # FAILED до удаления staging: complete не начнётся параллельно с abort
+            if not await self._set_status(session, UploadSessionStatus.ACTIVE, UploadSessionStatus.FAILED):
+                session["status"] = UploadSessionStatus.COMPLETING.value
+        if session["status"] == UploadSessionStatus.COMPLETING.value:
+            raise UploadSessionStateException(
+                f"Upload session {session_id} is being completed and cannot be aborted",
+                details={"session_id": session_id, "status": session["status"]}
+            )
+
+        try:
+            await self._se_request(session, "DELETE", f"/api/v1/uploads/{session_id}")
+        except UploadSessionNotFoundException:
+            pass
+
+        await self._delete_session(session_id)
+
+        logger.info(
+            "Upload session aborted",
+            extra={"session_id": session_id, "user_id": user_id}
+        )
+
+    async def _delete_session(self, session_id: str) -> None:
+        redis = await self._get_redis()
+        await redis.delete(self._session_key(session_id), self._parts_key(session_id))
@@ -0,0 +1,160 @@
+"""
+Memory benchmarks for streaming uploads to Storage Element.
+
+Compares peak memory of:
+- buffered: legacy path (await file.read() + httpx multipart files=...)
+- streaming: StreamingMultipartBody with bounded read buffer
+
+Across file sizes and concurrency levels. Peak Python heap is measured via
+tracemalloc (deterministic, used for assertions); RSS growth is sampled from
+/proc/self/statm and reported for reference.
+
+Run:
+    pytest tests/performance/test_streaming_upload_memory.py -m benchmark -s
+"""
+
+import asyncio
+import os
+import tracemalloc
+from tempfile import SpooledTemporaryFile
+
+import httpx
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.services.streaming_upload import StreamingMultipartBody
+
+MB = 1024 * 1024
+BUFFER_SIZE = 1 * MB
+
+FILE_SIZES_MB = [8, 32, 128]
+CONCURRENCY = [1, 4, 8]
+
+
+def _make_upload_file(size: int) -> UploadFile:
+    """UploadFile spooled на диск, как после разбора запроса Starlette."""
+    spooled = SpooledTemporaryFile(max_size=MB)
+    block = os.urandom(MB)
+    remaining = size
+    while remaining > 0:
+        spooled.write(block[:min(MB, remaining)])
+        remaining -= MB
+    spooled.seek(0)
+    return UploadFile(
+        file=spooled,
+        filename="benchmark.bin",
+        size=size,
+        headers=Headers({"content-type": "application/octet-stream"}),
+    )
+
+
+def _rss_bytes() -> int:
+    """Текущий RSS процесса (Linux)."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class _DrainTransport(httpx.AsyncBaseTransport):
+    """
+    Storage Element stand-in: читает тело потоково и отбрасывает его.
+
+    httpx.MockTransport не подходит - он буферизует тело запроса целиком.
+    """
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        received = 0
+        async for chunk in request.stream:
+            received += len(chunk)
+        return httpx.Response(201, json={"received": received})
+
+
+async def _upload_buffered(client: httpx.AsyncClient, file: UploadFile) -> None:
+    content = await file.read()
+    await client.post(
+        "/api/v1/files/upload",
+        files={"file": (file.filename, content, file.content_type)},
+        data={"description": ""},
+    )
+
+
+async def _upload_streaming(client: httpx.AsyncClient, file: UploadFile) -> None:
+    body = StreamingMultipartBody(
+        file=file,
+        fields={"description": ""},
+        filename=file.filename,
+        content_type=file.content_type,
+        file_size=file.size,
+        chunk_size=BUFFER_SIZE,
+    )
+    await client.post("/api/v1/files/upload", headers=body.headers, content=body)
+
+
+async def _measure(upload, size: int, concurrency: int) -> tuple[int, int]:
+    """
+    Выполнение concurrency параллельных загрузок.
+
+    Returns:
+        tuple: (peak tracemalloc bytes, peak RSS growth bytes)
+    """
+    files = [_make_upload_file(size) for _ in range(concurrency)]
+    client = httpx.AsyncClient(base_url="http://se", transport=_DrainTransport())
+
+    rss_start = _rss_bytes()
+    rss_peak = rss_start
+    done = asyncio.Event()
+
+    async def sample_rss():
+        nonlocal rss_peak
+        while not done.is_set():
+            rss_peak = max(rss_peak, _rss_bytes())
+            await asyncio.sleep(0.005)
+
+    tracemalloc.start()
+    sampler = asyncio.create_task(sample_rss())
+    try:
+        await asyncio.gather(*(upload(client, f) for f in files))
+    finally:
+        done.set()
+        await sampler
+        _, heap_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        await client.aclose()
+        for f in files:
+            f.file.close()
+
+    return heap_peak, rss_peak - rss_start
+
+
+@pytest.mark.benchmark
+@pytest.mark.slow
+@pytest.mark.asyncio
+class TestStreamingUploadMemory:
+    """Peak memory: buffered vs streaming upload."""
+
+    @pytest.mark.parametrize("concurrency", CONCURRENCY)
+    @pytest.mark.parametrize("size_mb", FILE_SIZES_MB)
+    async def test_streaming_memory_is_bounded(self, size_mb: int, concurrency: int):
+        """
+        Benchmark: peak memory streaming upload.
+
+        Target: peak heap per upload <= 4 x buffer size, независимо от размера файла.
+        """
+        size = size_mb * MB
+
+        streaming_heap, streaming_rss = await _measure(_upload_streaming, size, concurrency)
+        buffered_heap, buffered_rss = await _measure(_upload_buffered, size, concurrency)
+
+        print(
+            f"\nsize={size_mb}MB concurrency={concurrency} | "
+            f"buffered: heap={buffered_heap / MB:.1f}MB rss+={buffered_rss / MB:.1f}MB | "
+            f"streaming: heap={streaming_heap / MB:.1f}MB rss+={streaming_rss / MB:.1f}MB"
+        )
+
+        assert streaming_heap <= concurrency * 4 * BUFFER_SIZE, (
+            f"Streaming peak heap {streaming_heap / MB:.1f}MB exceeds bound "
+            f"{concurrency * 4 * BUFFER_SIZE / MB:.0f}MB"
+        )
+        assert buffered_heap >= concurrency * size, (
+            "Buffered baseline expected to hold the whole file in memory"
+        )
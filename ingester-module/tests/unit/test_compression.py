@@ -0,0 +1,256 @@
+"""
+Unit tests для стадии сжатия (CompressionService).
+
+Тестирует:
+- Решение о сжатии (запрос, конфигурация, min_size, уже сжатые MIME типы)
+- Потоковое сжатие gzip/brotli в пуле потоков
+- Отказ от сжатия без выигрыша по размеру
+- upload_file(): передача сжатого файла в SE и регистрация в Admin Module
+- upload_file(): создание файла из существующего blob без передачи содержимого
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from tempfile import SpooledTemporaryFile
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import brotli
+import httpx
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+from starlette.formparsers import MultiPartParser
+
+from app.schemas.upload import CompressionAlgorithm, RetentionPolicy, UploadRequest
+from app.services.compression import CompressionService, is_already_compressed
+from app.services.upload_service import UploadService
+
+TEXT_CONTENT = b"ArtStore archive line with repetitive text content\n" * 2000
+
+
+def make_upload_file(content: bytes, content_type: str = "text/plain") -> UploadFile:
+    """Создание реального UploadFile поверх SpooledTemporaryFile."""
+    spooled = SpooledTemporaryFile(max_size=1024)
+    spooled.write(content)
+    spooled.seek(0)
+    return UploadFile(
+        file=spooled,
+        filename="archive.txt",
+        size=len(content),
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+class TestShouldCompress:
+    """Тесты решения о сжатии."""
+
+    def setup_method(self):
+        self.service = CompressionService(max_workers=1)
+
+    def test_compress_requested(self):
+        request = UploadRequest(compress=True)
+        assert self.service.should_compress(request, "text/plain", 10_000) is True
+
+    def test_compress_not_requested(self):
+        request = UploadRequest(compress=False)
+        assert self.service.should_compress(request, "text/plain", 10_000) is False
+
+    def test_algorithm_none(self):
+        request = UploadRequest(compress=True, compression_algorithm=CompressionAlgorithm.NONE)
+        assert self.service.should_compress(request, "text/plain", 10_000) is False
+
+    def test_disabled_in_settings(self):
+        request = UploadRequest(compress=True)
+        with patch("app.services.compression.settings.compression.enabled", False):
+            assert self.service.should_compress(request, "text/plain", 10_000) is False
+
+    def test_below_min_size(self):
+        request = UploadRequest(compress=True)
+        with patch("app.services.compression.settings.compression.min_size", 4096):
+            assert self.service.should_compress(request, "text/plain", 4095) is False
+
+    @pytest.mark.parametrize("content_type", [
+        "image/jpeg",
+        "IMAGE/PNG",
+        "video/mp4",
+        "application/zip",
+        "application/gzip; charset=binary",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ])
+    def test_already_compressed_skipped(self, content_type):
+        request = UploadRequest(compress=True)
+        assert is_already_compressed(content_type) is True
+        assert self.service.should_compress(request, content_type, 10_000) is False
+
+    @pytest.mark.parametrize("content_type", [None, "text/plain", "application/pdf", "application/json"])
+    def test_compressible_types(self, content_type):
+        assert is_already_compressed(content_type) is False
+
+
+@pytest.mark.asyncio
+class TestCompress:
+    """Тесты потокового сжатия."""
+
+    async def test_gzip(self):
+        service = CompressionService(max_workers=1)
+        upload = make_upload_file(TEXT_CONTENT)
+
+        result = await service.compress(upload, CompressionAlgorithm.GZIP, chunk_size=4096)
+        try:
+            compressed = await result.file.read()
+            assert gzip.decompress(compressed) == TEXT_CONTENT
+            assert result.original_size == len(TEXT_CONTENT)
+            assert result.compressed_size == len(compressed)
+            assert result.checksum == hashlib.sha256(compressed).hexdigest()
+            assert result.file.size == len(compressed)
+            assert result.ratio == round(len(TEXT_CONTENT) / len(compressed), 3)
+            assert result.ratio > 1
+            # Исходный файл возвращён в начало для повторного чтения
+            assert upload.file.tell() == 0
+        finally:
+            await result.close()
+            service.shutdown()
+
+    async def test_brotli(self):
+        service = CompressionService(max_workers=1)
+        upload = make_upload_file(TEXT_CONTENT)
+
+        result = await service.compress(upload, CompressionAlgorithm.BROTLI, chunk_size=4096)
+        try:
+            assert brotli.decompress(await result.file.read()) == TEXT_CONTENT
+            assert result.algorithm == CompressionAlgorithm.BROTLI
+        finally:
+            await result.close()
+            service.shutdown()
+
+    async def test_incompressible_returns_none(self):
+        """Случайные данные не сжимаются - передаётся оригинал."""
+        service = CompressionService(max_workers=1)
+        upload = make_upload_file(os.urandom(64 * 1024), content_type="application/octet-stream")
+
+        assert await service.compress(upload, CompressionAlgorithm.GZIP, chunk_size=4096) is None
+        service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_upload_file_sends_compressed_content():
+    """upload_file() передаёт в SE сжатый файл и параметры сжатия."""
+    upload = make_upload_file(TEXT_CONTENT)
+    file_id = str(uuid4())
+    received = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/api/v1/blobs/"):
+            # Содержимое ещё не хранится на SE
+            return httpx.Response(404, json={"detail": "Blob not found"})
+
+        raw = await request.aread()
+
+        async def stream():
+            yield raw
+
+        parser = MultiPartParser(Headers({"content-type": request.headers["content-type"]}), stream())
+        form = await parser.parse()
+        received["form"] = form
+        received["file"] = await form["file"].read()
+        return httpx.Response(201, json={"file_id": file_id, "original_filename": "archive.txt"})
+
+    auth_service = MagicMock()
+    auth_service.get_access_token = AsyncMock(return_value="token")
+
+    service = UploadService(auth_service=auth_service)
+    client = httpx.AsyncClient(base_url="http://se-01:8010", transport=httpx.MockTransport(handler))
+    admin_client = MagicMock()
+    admin_client.register_file = AsyncMock(return_value={"file_id": file_id})
+
+    with patch.object(
+        service, "_select_storage_element_with_id",
+        AsyncMock(return_value=("http://se-01:8010", "se-01"))
+    ), patch.object(service, "_get_client_for_endpoint", AsyncMock(return_value=client)), \
+            patch("app.services.admin_client.get_admin_client", AsyncMock(return_value=admin_client)):
+        result = await service.upload_file(
+            file=upload,
+            request=UploadRequest(
+                retention_policy=RetentionPolicy.TEMPORARY,
+                compress=True,
+                compression_algorithm=CompressionAlgorithm.GZIP,
+            ),
+            user_id="user-1",
+            username="tester",
+        )
+
+    await client.aclose()
+    await service.close()
+
+    form = received["form"]
+    assert gzip.decompress(received["file"]) == TEXT_CONTENT
+    assert form["compressed"] == "true"
+    assert form["compression_algorithm"] == "gzip"
+    assert form["original_size"] == str(len(TEXT_CONTENT))
+
+    assert result.compressed is True
+    assert result.file_size == len(received["file"])
+    assert result.compression_ratio == round(len(TEXT_CONTENT) / len(received["file"]), 3)
+
+    registered = admin_client.register_file.call_args.args[0]
+    assert registered["compressed"] is True
+    assert registered["compression_algorithm"] == "gzip"
+    assert registered["original_size"] == len(TEXT_CONTENT)
+    assert registered["file_size"] == len(received["file"])
+
+
+@pytest.mark.asyncio
+async def test_upload_file_links_existing_blob():
+    """Содержимое уже хранится на SE - файл создаётся без передачи данных."""
+    upload = make_upload_file(TEXT_CONTENT)
+    file_id = str(uuid4())
+    requests: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        body = json.loads(await request.aread())
+        checksum = request.url.path.split("/")[-2]
+        return httpx.Response(201, json={
+            "file_id": file_id,
+            "original_filename": body["original_filename"],
+            "file_size": body["file_size"],
+            "checksum": checksum,
+        })
+
+    auth_service = MagicMock()
+    auth_service.get_access_token = AsyncMock(return_value="token")
+
+    service = UploadService(auth_service=auth_service)
+    client = httpx.AsyncClient(base_url="http://se-01:8010", transport=httpx.MockTransport(handler))
+    admin_client = MagicMock()
+    admin_client.register_file = AsyncMock(return_value={"file_id": file_id})
+
+    with patch.object(
+        service, "_select_storage_element_with_id",
+        AsyncMock(return_value=("http://se-01:8010", "se-01"))
+    ), patch.object(service, "_get_client_for_endpoint", AsyncMock(return_value=client)), \
+            patch("app.services.admin_client.get_admin_client", AsyncMock(return_value=admin_client)):
+        result = await service.upload_file(
+            file=upload,
+            request=UploadRequest(compress=True, compression_algorithm=CompressionAlgorithm.GZIP),
+            user_id="user-1",
+            username="tester",
+        )
+
+    await client.aclose()
+    await service.close()
+
+    # Единственный запрос - ссылка на blob, multipart загрузки нет
+    assert len(requests) == 1
+    link_body = json.loads(requests[0].content)
+    assert requests[0].url.path == f"/api/v1/blobs/{result.checksum}/files"
+    assert link_body["compression_algorithm"] == "gzip"
+    assert link_body["original_size"] == len(TEXT_CONTENT)
+
+    assert str(result.file_id) == file_id
+    assert result.compressed is True
+    assert result.file_size == link_body["file_size"]
+    assert admin_client.register_file.call_args.args[0]["checksum_sha256"] == result.checksum
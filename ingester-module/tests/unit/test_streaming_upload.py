@@ -0,0 +1,240 @@
+"""
+Unit tests для потоковой загрузки файлов (StreamingMultipartBody).
+
+Тестирует:
+- Корректность multipart/form-data тела (совместимость с SE endpoint)
+- Инкрементальный SHA-256
+- Повторную итерацию тела (retry на другой SE)
+- Контроль размера файла
+- upload_file() без буферизации файла целиком
+"""
+
+import hashlib
+import json
+from tempfile import SpooledTemporaryFile
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+from starlette.formparsers import MultiPartParser
+
+from app.core.exceptions import UploadException
+from app.schemas.upload import UploadRequest, RetentionPolicy
+from app.services.streaming_upload import StreamingMultipartBody, resolve_upload_size
+from app.services.upload_service import UploadService
+
+
+def make_upload_file(content: bytes, filename: str = "document.pdf", size: int | None = None) -> UploadFile:
+    """Создание реального UploadFile поверх SpooledTemporaryFile."""
+    spooled = SpooledTemporaryFile(max_size=1024)
+    spooled.write(content)
+    spooled.seek(0)
+    return UploadFile(
+        file=spooled,
+        filename=filename,
+        size=len(content) if size is None else size,
+        headers=Headers({"content-type": "application/pdf"}),
+    )
+
+
+async def collect(body: StreamingMultipartBody) -> bytes:
+    """Сборка потокового тела в bytes."""
+    return b"".join([chunk async for chunk in body])
+
+
+async def parse_multipart(raw: bytes, content_type: str):
+    """Разбор тела тем же парсером, что использует Storage Element (Starlette)."""
+
+    async def stream():
+        yield raw
+
+    parser = MultiPartParser(Headers({"content-type": content_type}), stream())
+    return await parser.parse()
+
+
+@pytest.mark.asyncio
+class TestStreamingMultipartBody:
+    """Тесты StreamingMultipartBody."""
+
+    async def test_body_parsed_by_starlette(self):
+        """Тело разбирается Starlette как обычная multipart форма."""
+        content = b"x" * 5000 + b"tail"
+        upload = make_upload_file(content, filename='отчёт "Q1".pdf')
+        body = StreamingMultipartBody(
+            file=upload,
+            fields={"description": "Описание", "retention_policy": "temporary"},
+            filename=upload.filename,
+            content_type=upload.content_type,
+            file_size=len(content),
+            chunk_size=1024,
+        )
+
+        raw = await collect(body)
+        form = await parse_multipart(raw, body.content_type)
+
+        assert form["description"] == "Описание"
+        assert form["retention_policy"] == "temporary"
+        assert form["file"].filename == "отчёт %22Q1%22.pdf"
+        assert form["file"].content_type == "application/pdf"
+        assert await form["file"].read() == content
+
+    async def test_content_length_matches_body(self):
+        """Content-Length совпадает с фактическим размером тела."""
+        content = b"0123456789" * 100
+        upload = make_upload_file(content)
+        body = StreamingMultipartBody(
+            file=upload, fields={"description": ""}, filename=upload.filename,
+            content_type=None, file_size=len(content), chunk_size=64,
+        )
+
+        raw = await collect(body)
+
+        assert len(raw) == body.content_length
+        assert body.headers["Content-Length"] == str(len(raw))
+        assert b"Content-Type: application/octet-stream" in raw
+
+    async def test_checksum_and_chunking(self):
+        """SHA-256 считается инкрементально, блоки не превышают chunk_size."""
+        content = bytes(range(256)) * 40
+        upload = make_upload_file(content)
+        body = StreamingMultipartBody(
+            file=upload, fields={}, filename="a.bin", content_type=None,
+            file_size=len(content), chunk_size=1000,
+        )
+
+        assert body.checksum is None
+
+        chunks = [chunk async for chunk in body]
+        file_chunks = chunks[1:-1]
+
+        assert all(len(chunk) <= 1000 for chunk in file_chunks)
+        assert b"".join(file_chunks) == content
+        assert body.bytes_sent == len(content)
+        assert body.checksum == hashlib.sha256(content).hexdigest()
+
+    async def test_body_is_reiterable(self):
+        """Повторная итерация начинается с начала файла (retry при 507)."""
+        content = b"retry-me" * 100
+        upload = make_upload_file(content)
+        body = StreamingMultipartBody(
+            file=upload, fields={"a": "b"}, filename="a.bin", content_type=None,
+            file_size=len(content), chunk_size=128,
+        )
+
+        first = await collect(body)
+        second = await collect(body)
+
+        assert first == second
+        assert body.checksum == hashlib.sha256(content).hexdigest()
+
+    async def test_size_mismatch_raises(self):
+        """Несовпадение фактического размера с заявленным прерывает передачу."""
+        content = b"short"
+        upload = make_upload_file(content)
+        body = StreamingMultipartBody(
+            file=upload, fields={}, filename="a.bin", content_type=None,
+            file_size=len(content) + 10, chunk_size=64,
+        )
+
+        with pytest.raises(UploadException, match="size mismatch"):
+            await collect(body)
+
+        assert body.checksum is None
+
+    async def test_file_grew_raises(self):
+        """Файл больше заявленного размера прерывает передачу."""
+        upload = make_upload_file(b"y" * 100)
+        body = StreamingMultipartBody(
+            file=upload, fields={}, filename="a.bin", content_type=None,
+            file_size=10, chunk_size=64,
+        )
+
+        with pytest.raises(UploadException, match="grew"):
+            await collect(body)
+
+
+def test_resolve_upload_size_falls_back_to_seek():
+    """Без UploadFile.size размер определяется через seek без смены позиции."""
+    upload = make_upload_file(b"z" * 321)
+    upload.size = None
+    upload.file.seek(7)
+
+    assert resolve_upload_size(upload) == 321
+    assert upload.file.tell() == 7
+
+
+@pytest.mark.asyncio
+async def test_upload_file_streams_to_storage_element():
+    """upload_file() передаёт файл потоково и возвращает вычисленный checksum."""
+    content = b"streamed content " * 1000
+    upload = make_upload_file(content)
+    upload.read = AsyncMock(side_effect=upload.read)
+    file_id = str(uuid4())
+    received = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        raw = await request.aread()
+        received["headers"] = request.headers
+        received["form"] = await parse_multipart(raw, request.headers["content-type"])
+        received["file"] = await received["form"]["file"].read()
+        return httpx.Response(201, json={"file_id": file_id, "original_filename": "document.pdf"})
+
+    auth_service = MagicMock()
+    auth_service.get_access_token = AsyncMock(return_value="token")
+
+    from app.services.storage_selector import StorageElementInfo, CapacityStatus
+    selector = MagicMock()
+    selector.select_storage_element = AsyncMock(return_value=StorageElementInfo(
+        element_id="se-01",
+        endpoint="http://se-01:8010",
+        mode="edit",
+        priority=100,
+        capacity_total=10 * 1024 ** 3,
+        capacity_used=0,
+        capacity_free=10 * 1024 ** 3,
+        capacity_percent=0.0,
+        capacity_status=CapacityStatus.OK,
+        health_status="healthy",
+        last_updated=None,
+    ))
+
+    service = UploadService(auth_service=auth_service)
+    service.set_storage_selector(selector)
+    client = httpx.AsyncClient(base_url="http://se-01:8010", transport=httpx.MockTransport(handler))
+
+    admin_client = MagicMock()
+    admin_client.register_file = AsyncMock(return_value={"file_id": file_id})
+
+    with patch.object(service, "_get_client_for_endpoint", AsyncMock(return_value=client)), \
+            patch("app.services.admin_client.get_admin_client", AsyncMock(return_value=admin_client)), \
+            patch("app.services.upload_service.settings.storage_element.upload_buffer_size", 4096):
+        result = await service.upload_file(
+            file=upload,
+            request=UploadRequest(
+                description="desc",
+                retention_policy=RetentionPolicy.TEMPORARY,
+                metadata={"k": "v"},
+            ),
+            user_id="user-1",
+            username="tester",
+        )
+
+    await client.aclose()
+
+    expected_checksum = hashlib.sha256(content).hexdigest()
+    assert received["file"] == content
+    assert received["form"]["uploaded_by_username"] == "tester"
+    assert json.loads(received["form"]["metadata"]) == {"k": "v"}
+    assert received["headers"]["authorization"] == "Bearer token"
+    assert result.checksum == expected_checksum
+    assert result.file_size == len(content)
+
+    # Файл читался блоками, а не целиком
+    read_sizes = [call.args[0] for call in upload.read.call_args_list]
+    assert read_sizes and all(size == 4096 for size in read_sizes)
+
+    registered = admin_client.register_file.call_args.args[0]
+    assert registered["checksum_sha256"] == expected_checksum
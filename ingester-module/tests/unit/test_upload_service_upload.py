@@ -165,6 +165,7 @@ class TestUploadServiceUploadFile:
         mock_large_file = MagicMock(spec=UploadFile)
         mock_large_file.filename = "oversized_file.bin"
         mock_large_file.content_type = "application/octet-stream"
+        mock_large_file.size = len(large_content)
         mock_large_file.read = AsyncMock(return_value=large_content)
 
         # Should raise FileSizeLimitExceededException
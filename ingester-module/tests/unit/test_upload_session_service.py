@@ -0,0 +1,480 @@
+"""
+Unit tests для UploadSessionService (resumable multipart upload).
+
+Тестирует:
+- Создание сессии: выбор SE, staging на SE, состояние в Redis
+- Загрузку частей: проверка размера, checksum, повторная загрузка
+- list_parts: недостающие части для возобновления
+- complete: проверка полноты, регистрация в Admin Module, очистка Redis
+- Статус сессии при параллельной загрузке частей и ошибках complete,
+  сверка с SE после таймаута complete
+- abort и изоляцию сессий разных пользователей
+"""
+
+import asyncio
+import fnmatch
+import hashlib
+import json
+import os
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import (
+    FileSizeLimitExceededException,
+    StorageElementUnavailableException,
+    UploadSessionNotFoundException,
+    UploadSessionStateException,
+)
+from app.schemas.upload import RetentionPolicy
+from app.schemas.upload_session import UploadSessionCreateRequest, UploadSessionStatus
+from app.services.upload_service import UploadService
+from app.services.upload_session_service import (
+    CLAIM_COMPLETE_SCRIPT,
+    RECORD_PART_SCRIPT,
+    SET_STATUS_SCRIPT,
+    UploadSessionService,
+)
+
+PART_SIZE = 1024 * 1024
+CONTENT = os.urandom(PART_SIZE * 2 + 100)  # 3 части, последняя 100 байт
+
+
+class FakeRedis:
+    """Минимальный in-memory Redis для операций UploadSessionService."""
+
+    def __init__(self):
+        self.strings: dict[str, str] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.ttls: dict[str, int] = {}
+
+    async def get(self, key):
+        return self.strings.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.strings[key] = value
+        self.ttls[key] = ex
+
+    async def hset(self, key, field=None, value=None, mapping=None):
+        values = self.hashes.setdefault(key, {})
+        if field is not None:
+            values[field] = value
+        values.update(mapping or {})
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def hmget(self, key, *fields):
+        return [self.hashes.get(key, {}).get(field) for field in fields]
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def expire(self, key, seconds):
+        if key in self.hashes:
+            self.ttls[key] = seconds
+
+    async def ttl(self, key):
+        return self.ttls.get(key, -2) if key in self.hashes else -2
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        """Семантика Lua скриптов UploadSessionService."""
+        keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        status = await self.hget(keys[0], "status")
+        if script == RECORD_PART_SCRIPT:
+            if status is None:
+                return -1
+            if status != args[3]:
+                return 0
+            await self.hset(keys[1], args[0], args[1])
+            for key in keys:
+                await self.expire(key, args[2])
+            return 1
+        if script == SET_STATUS_SCRIPT:
+            if status != args[0]:
+                return 0
+            await self.hset(keys[0], "status", args[1])
+            return 1
+        if script == CLAIM_COMPLETE_SCRIPT:
+            if status == "completing":
+                if float(await self.hget(keys[0], "completing_until") or 0) > float(args[0]):
+                    return None
+            elif status != "active":
+                return None
+            await self.hset(keys[0], mapping={"status": "completing", "completing_until": str(args[1])})
+            return status
+        raise NotImplementedError(script)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.strings.pop(key, None)
+            self.hashes.pop(key, None)
+
+    def keys_matching(self, pattern):
+        return [k for k in [*self.strings, *self.hashes] if fnmatch.fnmatch(k, pattern)]
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def hset(self, *args, **kwargs):
+        self.calls.append(self.redis.hset(*args, **kwargs))
+
+    def hmget(self, *args):
+        self.calls.append(self.redis.hmget(*args))
+
+    def expire(self, *args):
+        self.calls.append(self.redis.expire(*args))
+
+    def ttl(self, *args):
+        self.calls.append(self.redis.ttl(*args))
+
+    async def execute(self):
+        return [await call for call in self.calls]
+
+
+class FakeStorageElement:
+    """Staging API Storage Element поверх httpx.MockTransport."""
+
+    def __init__(self):
+        self.uploads: dict[str, dict] = {}
+        self.files: dict[str, dict] = {}
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/api/v1/files/"):
+            file = self.files.get(request.url.path.split("/")[4])
+            if file is None:
+                return httpx.Response(404, json={"detail": "File not found"})
+            return httpx.Response(200, json=file)
+
+        parts = request.url.path.split("/")[4:]  # /api/v1/uploads/...
+        if request.method == "POST" and not parts:
+            body = json.loads(request.content)
+            self.uploads[body["upload_id"]] = {"params": body, "parts": {}}
+            return httpx.Response(201, json={**body, "total_parts": 3})
+
+        upload = self.uploads.get(parts[0])
+        if upload is None:
+            return httpx.Response(404, json={"detail": "Upload not found"})
+
+        if request.method == "PUT":
+            data = request.content
+            upload["parts"][int(parts[2])] = data
+            return httpx.Response(200, json={
+                "part_number": int(parts[2]),
+                "size": len(data),
+                "checksum": hashlib.sha256(data).hexdigest(),
+                "offset": (int(parts[2]) - 1) * PART_SIZE,
+            })
+        if request.method == "POST" and parts[1] == "complete":
+            data = b"".join(upload["parts"][n] for n in sorted(upload["parts"]))
+            body = json.loads(request.content)
+            self.files[body["file_id"]] = {
+                "file_id": body["file_id"],
+                "original_filename": body["original_filename"],
+                "storage_filename": f"{body['file_id']}.bin",
+                "file_size": len(data),
+                "checksum": hashlib.sha256(data).hexdigest(),
+            }
+            # Staging удаляется после создания файла
+            del self.uploads[parts[0]]
+            return httpx.Response(201, json={
+                "file_id": body["file_id"],
+                "original_filename": body["original_filename"],
+                "file_size": len(data),
+                "checksum": hashlib.sha256(data).hexdigest(),
+                "message": "File uploaded successfully",
+            })
+        if request.method == "DELETE":
+            del self.uploads[parts[0]]
+            return httpx.Response(204)
+        return httpx.Response(405)
+
+
+async def _stream(data: bytes, chunk_size: int = 64 * 1024):
+    for i in range(0, len(data), chunk_size):
+        yield data[i:i + chunk_size]
+
+
+def _part(n: int) -> bytes:
+    return CONTENT[(n - 1) * PART_SIZE:n * PART_SIZE]
+
+
+@pytest.fixture
+def storage_element():
+    return FakeStorageElement()
+
+
+@pytest.fixture
+def redis():
+    return FakeRedis()
+
+
+@pytest.fixture
+def session_service(storage_element, redis):
+    auth_service = MagicMock()
+    auth_service.get_access_token = AsyncMock(return_value="token")
+    upload_service = UploadService(auth_service=auth_service)
+
+    client = httpx.AsyncClient(
+        base_url="http://se-01:8010",
+        transport=httpx.MockTransport(storage_element.handler)
+    )
+    admin_client = MagicMock()
+    admin_client.register_file = AsyncMock(side_effect=lambda data, **kwargs: {"file_id": data["file_id"]})
+
+    with patch.object(
+        upload_service, "_select_storage_element_with_id",
+        AsyncMock(return_value=("http://se-01:8010", "se-01"))
+    ), patch.object(upload_service, "_get_client_for_endpoint", AsyncMock(return_value=client)), \
+            patch("app.services.admin_client.get_admin_client", AsyncMock(return_value=admin_client)):
+        service = UploadSessionService(upload_service, redis_client=redis)
+        service.admin_client = admin_client
+        yield service
+
+
+def _create_request(**overrides) -> UploadSessionCreateRequest:
+    params = {
+        "filename": "archive.bin",
+        "content_type": "application/octet-stream",
+        "file_size": len(CONTENT),
+        "part_size": PART_SIZE,
+        "retention_policy": RetentionPolicy.PERMANENT,
+    }
+    params.update(overrides)
+    return UploadSessionCreateRequest(**params)
+
+
+@pytest.mark.asyncio
+class TestUploadSessionService:
+    """Тесты UploadSessionService."""
+
+    async def test_create_session(self, session_service, storage_element, redis):
+        session = await session_service.create_session(_create_request(), "user-1", "alice")
+
+        assert session.total_parts == 3
+        assert session.status == UploadSessionStatus.ACTIVE
+        assert session.storage_element_id == "se-01"
+        assert storage_element.uploads[session.session_id]["params"]["part_size"] == PART_SIZE
+        assert redis.keys_matching(f"*:{session.session_id}")
+
+    async def test_create_session_part_size_out_of_range(self, session_service):
+        with pytest.raises(UploadSessionStateException):
+            await session_service.create_session(_create_request(part_size=1024), "user-1", "alice")
+
+    async def test_create_session_file_too_large(self, session_service):
+        with patch("app.services.upload_session_service.settings.upload_session.max_file_size", 1024):
+            with pytest.raises(FileSizeLimitExceededException):
+                await session_service.create_session(_create_request(), "user-1", "alice")
+
+    async def test_parallel_parts_and_complete(self, session_service, storage_element, redis):
+        session = await session_service.create_session(_create_request(), "user-1", "alice")
+
+        parts = await asyncio.gather(*(
+            session_service.upload_part(session.session_id, n, _stream(_part(n)), len(_part(n)), "user-1")
+            for n in (3, 1, 2)
+        ))
+        assert [p.size for p in parts] == [100, PART_SIZE, PART_SIZE]
+
+        listing = await session_service.list_parts(session.session_id, "user-1")
+        assert [p.part_number for p in listing.parts] == [1, 2, 3]
+        assert listing.missing_parts == []
+
+        result = await session_service.complete(session.session_id, "user-1")
+
+        assert result.checksum == hashlib.sha256(CONTENT).hexdigest()
+        assert result.file_size == len(CONTENT)
+        registered = session_service.admin_client.register_file.call_args.args[0]
+        assert registered["checksum_sha256"] == result.checksum
+        assert registered["storage_element_id"] == "se-01"
+        assert registered["retention_policy"] == "permanent"
+        assert result.storage_filename == registered["storage_filename"] == registered["file_id"]
+        assert redis.keys_matching(f"*{session.session_id}*") == []
+
+    async def test_resume_lists_missing_parts(self, session_service):
+        session = await session_service.create_session(_create_request(), "user-1", "alice")
+        await session_service.upload_part(session.session_id, 2, _stream(_part(2)), PART_SIZE, "user-1")
+
+        listing = await session_service.list_parts(session.session_id, "user-1")
+        assert listing.missing_parts == [1, 3]
+
+        state = await session_service.get_session(session.session_id, "user-1")
+        assert state.uploaded_parts == 1
+
+    async def test_complete_incomplete_session(self, session_service):
+        session = await session_service.create_session(_create_request(), "user-1", "alice")
+        await session_service.upload_part(session.session_id, 1, _stream(_part(1)), PART_SIZE, "user-1")
+
+        with pytest.raises(UploadSessionStateException) as exc_info:
+            await session_service.complete(session.session_id, "user-1")
+        assert exc_info.value.details["missing_parts"] == [2, 3]
+
+        # Сессия остаётся активной - загрузку можно продолжить
+        state = await session_service.get_session(session.session_id, "user-1")
+        assert state.status == UploadSessionStatus.ACTIVE
+
+    async def test_part_during_complete_keeps_completing_status(self, session_service, storage_element):
+        session = await session_service.create_session(_create_request(), "user-1", "alice")
+        for n in (1, 2, 3):
+            await session_service.upload_part(session.session_id, n, _stream(_part(n)), len(_part(n)), "user-1")
+
+        se_complete = asyncio.Event()
+        release = asyncio.Event()
+        handler = storage_element.handler
+
+        async def slow_complete(request):
+            if request.url.path.endswith("/complete"):
+                se_complete.set()
+                await release.wait()
+            return handler(request)
+
+        client = await session_service.upload_service._get_client_for_endpoint("http://se-01:8010")
+        client._transport = httpx.MockTransport(slow_complete)
+
+        completing = asyncio.create_task(session_service.complete(session.session_id, "user-1"))
+        await se_complete.wait()
+
+        # Повтор части во время complete не возвращает сессию в ACTIVE
+        with pytest.raises(UploadSessionStateException):
+            await session_service.upload_part(session.session_id, 1, _stream(_part(1)), PART_SIZE, "user-1")
+        state = await session_service.get_session(session.session_id, "user-1")
+        assert state.status == UploadSessionStatus.COMPLETING
+
+        # Повторный complete отклоняется
+        with pytest.raises(UploadSessionStateException):
+            await session_service.complete(session.session_id, "user-1")
+
+        release.set()
+        result = await completing
+        assert result.file_size == len(CONTENT)
+
+    async def test_complete_storage_element_failure_resets_active(self, session_service, storage_element):
+        session = await session_service.create_session(_create_request(), "user-1", "alice")
+        for n in (1, 2, 3):
+            await session_service.upload_part(session.session_id, n, _stream(_part(n)), len(_part(n)), "user-1")
+
+        client = await session_service.upload_service._get_client_for_endpoint("http://se-01:8010")
+        client._transport = httpx.MockTransport(lambda request: httpx.Response(503))
+
+        with pytest.raises(StorageElementUnavailableException):
+            await session_service.complete(session.session_id, "user-1")
+
+        state = await session_service.get_session(session.session_id, "user-1")
+        assert state.status == UploadSessionStatus.ACTIVE
+
+    async def test_complete_timeout_reconciled_with_storage_element(self, session_service, storage_element):
+        session = await session_service.create_session(_create_request(), "user-1", "alice")
+        for n in (1, 2, 3):
+            await session_service.upload_part(session.session_id, n, _stream(_part(n)), len(_part(n)), "user-1")
+
+        handler = storage_element.handler
+
+        def timeout_after_complete(request):
+            response = handler(request)
+            if request.url.path.endswith("/complete"):
+                # SE создал файл и удалил staging, ответ не получен
+                raise httpx.ReadTimeout("timed out", request=request)
+            return response
+
+        client = await session_service.upload_service._get_client_for_endpoint("http://se-01:8010")
+        client._transport = httpx.MockTransport(timeout_after_complete)
+
+        with pytest.raises(StorageElementUnavailableException):
+            await session_service.complete(session.session_id, "user-1")
+
+        state = await session_service.get_session(session.session_id, "user-1")
+        assert state.status == UploadSessionStatus.COMPLETING
+        with pytest.raises(UploadSessionStateException):
+            await session_service.abort(session.session_id, "user-1")
+        # До истечения complete lease повтор отклоняется
+        with pytest.raises(UploadSessionStateException):
+            await session_service.complete(session.session_id, "user-1")
+
+        lease_expired = time.time() + settings.upload_session.complete_lease_seconds + 1
+        with patch("app.services.upload_session_service.time.time", return_value=lease_expired):
+            result = await session_service.complete(session.session_id, "user-1")
+
+        assert result.file_size == len(CONTENT)
+        assert result.checksum == hashlib.sha256(CONTENT).hexdigest()
+        assert list(storage_element.files) == [str(result.file_id)]
+        registered = session_service.admin_client.register_file.call_args.args[0]
+        assert registered["storage_filename"] == f"{result.file_id}.bin"
+
+    async def test_complete_registration_failure_marks_failed(self, session_service):
+        session = await session_service.create_session(_create_request(), "user-1", "alice")
+        for n in (1, 2, 3):
+            await session_service.upload_part(session.session_id, n, _stream(_part(n)), len(_part(n)), "user-1")
+
+        with patch.object(
+            session_service.upload_service, "register_in_file_registry",
+            AsyncMock(side_effect=RuntimeError("admin module down"))
+        ):
+            with pytest.raises(RuntimeError):
+                await session_service.complete(session.session_id, "user-1")
+
+        state = await session_service.get_session(session.session_id, "user-1")
+        assert state.status == UploadSessionStatus.FAILED
+        with pytest.raises(UploadSessionStateException):
+            await session_service.upload_part(session.session_id, 1, _stream(_part(1)), PART_SIZE, "user-1")
+
+    async def test_non_json_rejection_from_proxy(self, session_service):
+        session = await session_service.create_session(_create_request(), "user-1", "alice")
+
+        client = await session_service.upload_service._get_client_for_endpoint("http://se-01:8010")
+        client._transport = httpx.MockTransport(
+            lambda request: httpx.Response(413, text="<html>413 Request Entity Too Large</html>")
+        )
+
+        with pytest.raises(UploadSessionStateException) as exc_info:
+            await session_service.upload_part(session.session_id, 1, _stream(_part(1)), PART_SIZE, "user-1")
+        assert "413 Request Entity Too Large" in exc_info.value.message
+        assert exc_info.value.details["status_code"] == 413
+
+    async def test_part_size_mismatch(self, session_service):
+        session = await session_service.create_session(_create_request(), "user-1", "alice")
+
+        with pytest.raises(UploadSessionStateException):
+            await session_service.upload_part(session.session_id, 1, _stream(b"x"), 1, "user-1")
+
+    async def test_part_number_out_of_range(self, session_service):
+        session = await session_service.create_session(_create_request(), "user-1", "alice")
+
+        with pytest.raises(UploadSessionStateException):
+            await session_service.upload_part(session.session_id, 4, _stream(b"x"), 1, "user-1")
+
+    async def test_part_checksum_mismatch(self, session_service):
+        session = await session_service.create_session(_create_request(), "user-1", "alice")
+
+        with pytest.raises(UploadSessionStateException):
+            await session_service.upload_part(
+                session.session_id, 3, _stream(_part(3)), 100, "user-1",
+                expected_checksum="0" * 64
+            )
+
+        listing = await session_service.list_parts(session.session_id, "user-1")
+        assert listing.parts == []
+
+    async def test_session_of_other_user_not_found(self, session_service):
+        session = await session_service.create_session(_create_request(), "user-1", "alice")
+
+        with pytest.raises(UploadSessionNotFoundException):
+            await session_service.list_parts(session.session_id, "user-2")
+
+    async def test_abort(self, session_service, storage_element, redis):
+        session = await session_service.create_session(_create_request(), "user-1", "alice")
+        await session_service.upload_part(session.session_id, 1, _stream(_part(1)), PART_SIZE, "user-1")
+
+        await session_service.abort(session.session_id, "user-1")
+
+        assert session.session_id not in storage_element.uploads
+        assert redis.keys_matching(f"*{session.session_id}*") == []
+        with pytest.raises(UploadSessionNotFoundException):
+            await session_service.get_session(session.session_id, "user-1")
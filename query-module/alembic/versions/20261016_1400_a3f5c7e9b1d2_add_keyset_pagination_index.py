@@ -0,0 +1,37 @@
+"""Add keyset pagination index
+
+Revision ID: a3f5c7e9b1d2
+Revises: 37c8ac1775a7
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f5c7e9b1d2'
+down_revision: Union[str, None] = '37c8ac1775a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Составной индекс (created_at, id) для keyset (cursor) пагинации поиска.
+
+    Условие (created_at, id) < (:created_at, :id) выполняется как range scan
+    по индексу вместо сканирования и отбрасывания OFFSET строк.
+    """
+    op.create_index(
+        'idx_file_metadata_created_id',
+        'file_metadata_cache',
+        ['created_at', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Удаление индекса keyset пагинации."""
+    op.drop_index('idx_file_metadata_created_id', table_name='file_metadata_cache')
@@ -0,0 +1,68 @@
+"""Add weighted search vector and trigram indexes
+
+Revision ID: b4e6d8f0a2c3
+Revises: a3f5c7e9b1d2
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e6d8f0a2c3'
+down_revision: Union[str, None] = 'a3f5c7e9b1d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Ранжированный Full-Text Search и substring поиск по индексам.
+
+    - search_vector заполняется для существующих записей тем же выражением,
+      что и CacheSyncService (app.db.search_vector): имя файла (A), теги (B),
+      описание (C). Конфигурация - SEARCH_DEFAULT_LANGUAGE (по умолчанию russian).
+    - pg_trgm GIN индексы на filename и description: ILIKE '%q%' выполняется
+      bitmap index scan вместо последовательного сканирования.
+    """
+    import os
+    language = os.getenv("SEARCH_DEFAULT_LANGUAGE", "russian").replace("'", "")
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.execute(
+        f"""
+        UPDATE file_metadata_cache SET search_vector =
+            setweight(to_tsvector('{language}'::regconfig,
+                filename || ' ' || regexp_replace(filename, '[._-]+', ' ', 'g')), 'A')
+            || setweight(to_tsvector('{language}'::regconfig,
+                coalesce(array_to_string(tags, ' '), '')), 'B')
+            || setweight(to_tsvector('{language}'::regconfig,
+                coalesce(description, '')), 'C')
+        """
+    )
+
+    op.create_index(
+        'idx_file_metadata_filename_trgm',
+        'file_metadata_cache',
+        ['filename'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'filename': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'idx_file_metadata_description_trgm',
+        'file_metadata_cache',
+        ['description'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'description': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Удаление trigram индексов (search_vector и расширение pg_trgm сохраняются)."""
+    op.drop_index('idx_file_metadata_description_trgm', table_name='file_metadata_cache')
+    op.drop_index('idx_file_metadata_filename_trgm', table_name='file_metadata_cache')
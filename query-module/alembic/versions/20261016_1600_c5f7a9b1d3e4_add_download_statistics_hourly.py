@@ -0,0 +1,74 @@
+"""Add hourly download statistics rollup
+
+Revision ID: c5f7a9b1d3e4
+Revises: b4e6d8f0a2c3
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5f7a9b1d3e4'
+down_revision: Union[str, None] = 'b4e6d8f0a2c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Почасовые агрегаты статистики скачиваний.
+
+    DownloadStatsWriter обновляет строку (hour, file_id, storage_element_id)
+    приращениями в транзакции INSERT сырых записей - dashboard читает
+    агрегаты без сканирования download_statistics. Существующие записи
+    download_statistics переносятся в агрегаты.
+    """
+    op.create_table(
+        'download_statistics_hourly',
+        sa.Column('hour', sa.DateTime(timezone=True), nullable=False, comment='Начало часа (UTC)'),
+        sa.Column('file_id', sa.String(length=36), nullable=False, comment='UUID файла'),
+        sa.Column('storage_element_id', sa.String(length=50), nullable=False, comment='ID Storage Element'),
+        sa.Column('download_count', sa.BigInteger(), nullable=False, comment='Количество скачиваний за час'),
+        sa.Column('resumed_count', sa.BigInteger(), nullable=False, comment='Из них resumed (HTTP Range request)'),
+        sa.Column('bytes_transferred', sa.BigInteger(), nullable=False, comment='Передано bytes за час'),
+        sa.Column('download_time_ms', sa.BigInteger(), nullable=False, comment='Суммарное время скачиваний за час (мс)'),
+        sa.Column('last_download_at', sa.DateTime(timezone=True), nullable=False, comment='Последнее скачивание в пределах часа'),
+        sa.PrimaryKeyConstraint('hour', 'file_id', 'storage_element_id'),
+        comment='Почасовые агрегаты статистики скачиваний для dashboard'
+    )
+    op.create_index(
+        'idx_download_stats_hourly_file_hour',
+        'download_statistics_hourly',
+        ['file_id', 'hour'],
+        unique=False
+    )
+
+    op.execute(
+        """
+        INSERT INTO download_statistics_hourly (
+            hour, file_id, storage_element_id, download_count, resumed_count,
+            bytes_transferred, download_time_ms, last_download_at
+        )
+        SELECT
+            date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+            file_id,
+            storage_element_id,
+            count(*),
+            count(*) FILTER (WHERE was_resumed),
+            sum(bytes_transferred),
+            sum(download_time_ms),
+            max(created_at)
+        FROM download_statistics
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    """Удаление почасовых агрегатов."""
+    op.drop_index('idx_download_stats_hourly_file_hour', table_name='download_statistics_hourly')
+    op.drop_table('download_statistics_hourly')
@@ -0,0 +1,141 @@
+"""Partition search_history by day
+
+Revision ID: d6a8b0c2e4f5
+Revises: c5f7a9b1d3e4
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6a8b0c2e4f5'
+down_revision: Union[str, None] = 'c5f7a9b1d3e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = (
+    ('idx_search_history_created', ['created_at']),
+    ('idx_search_history_mode', ['search_mode', 'created_at']),
+    ('idx_search_history_username_created', ['username', 'created_at']),
+    ('ix_search_history_created_at', ['created_at']),
+    ('ix_search_history_username', ['username']),
+)
+
+
+def upgrade() -> None:
+    """
+    Секционирование search_history по дням (RANGE created_at).
+
+    SearchHistoryWriter удаляет partitions старше срока хранения через
+    DROP TABLE вместо DELETE. Primary Key включает ключ секционирования
+    (id, created_at). Переносятся записи в пределах срока хранения
+    STATS_SEARCH_HISTORY_RETENTION_DAYS (по умолчанию 30 дней);
+    partitions создаются на STATS_SEARCH_HISTORY_PARTITIONS_AHEAD дней
+    вперёд (по умолчанию 7). search_history_default принимает записи вне
+    дневных partitions: INSERT не завершается ошибкой, если обслуживание
+    partitions запаздывает.
+    """
+    import os
+    retention_days = int(os.getenv("STATS_SEARCH_HISTORY_RETENTION_DAYS", "30"))
+    partitions_ahead = int(os.getenv("STATS_SEARCH_HISTORY_PARTITIONS_AHEAD", "7"))
+
+    for name, _ in _INDEXES:
+        op.drop_index(name, table_name='search_history')
+    op.execute("ALTER TABLE search_history RENAME TO search_history_old")
+    op.execute("ALTER TABLE search_history_old RENAME CONSTRAINT search_history_pkey TO search_history_old_pkey")
+
+    op.execute(
+        """
+        CREATE TABLE search_history (
+            id INTEGER NOT NULL DEFAULT nextval('search_history_id_seq'),
+            query_text TEXT,
+            search_mode VARCHAR(20) NOT NULL,
+            filters_applied TEXT,
+            results_count INTEGER NOT NULL,
+            response_time_ms INTEGER NOT NULL,
+            username VARCHAR(255),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            CONSTRAINT search_history_pkey PRIMARY KEY (id, created_at),
+            CONSTRAINT check_response_time_positive CHECK (response_time_ms >= 0),
+            CONSTRAINT check_results_count_positive CHECK (results_count >= 0)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE search_history_id_seq OWNED BY search_history.id")
+    op.execute("COMMENT ON TABLE search_history IS 'История поисковых запросов для аналитики и оптимизации'")
+
+    for name, columns in _INDEXES:
+        op.create_index(name, 'search_history', columns, unique=False)
+
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            day DATE;
+        BEGIN
+            FOR day IN
+                SELECT generate_series(
+                    (now() AT TIME ZONE 'UTC')::date - {retention_days},
+                    (now() AT TIME ZONE 'UTC')::date + {partitions_ahead},
+                    interval '1 day'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF search_history '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    'search_history_p' || to_char(day, 'YYYYMMDD'),
+                    day::text || ' 00:00:00+00',
+                    (day + 1)::text || ' 00:00:00+00'
+                );
+            END LOOP;
+        END $$
+        """
+    )
+
+    op.execute("CREATE TABLE search_history_default PARTITION OF search_history DEFAULT")
+
+    op.execute(
+        f"""
+        INSERT INTO search_history
+        SELECT * FROM search_history_old
+        WHERE created_at >= date_trunc('day', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+            - interval '{retention_days} days'
+        """
+    )
+    op.execute("DROP TABLE search_history_old")
+
+
+def downgrade() -> None:
+    """Возврат к несекционированной таблице (записи всех partitions сохраняются)."""
+    op.execute("ALTER TABLE search_history RENAME TO search_history_partitioned")
+    op.execute("ALTER TABLE search_history_partitioned RENAME CONSTRAINT search_history_pkey TO search_history_partitioned_pkey")
+    for name, _ in _INDEXES:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_partitioned")
+
+    op.execute(
+        """
+        CREATE TABLE search_history (
+            id INTEGER NOT NULL DEFAULT nextval('search_history_id_seq'),
+            query_text TEXT,
+            search_mode VARCHAR(20) NOT NULL,
+            filters_applied TEXT,
+            results_count INTEGER NOT NULL,
+            response_time_ms INTEGER NOT NULL,
+            username VARCHAR(255),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            CONSTRAINT search_history_pkey PRIMARY KEY (id),
+            CONSTRAINT check_response_time_positive CHECK (response_time_ms >= 0),
+            CONSTRAINT check_results_count_positive CHECK (results_count >= 0)
+        )
+        """
+    )
+    op.execute("INSERT INTO search_history SELECT * FROM search_history_partitioned")
+    op.execute("ALTER SEQUENCE search_history_id_seq OWNED BY search_history.id")
+    op.execute("COMMENT ON TABLE search_history IS 'История поисковых запросов для аналитики и оптимизации'")
+    op.execute("DROP TABLE search_history_partitioned")
+
+    for name, columns in _INDEXES:
+        op.create_index(name, 'search_history', columns, unique=False)
@@ -0,0 +1,41 @@
+"""Add keyset pagination indexes for sort fields
+
+Revision ID: e7b9c1d3f5a6
+Revises: d6a8b0c2e4f5
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b9c1d3f5a6'
+down_revision: Union[str, None] = 'd6a8b0c2e4f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = (
+    ('idx_file_metadata_updated_id', ['updated_at', 'id']),
+    ('idx_file_metadata_size_id', ['file_size', 'id']),
+    ('idx_file_metadata_filename_id', ['filename', 'id']),
+)
+
+
+def upgrade() -> None:
+    """
+    Составные индексы (поле сортировки, id) для keyset пагинации поиска.
+
+    Курсор выдаётся для сортировки по created_at (idx_file_metadata_created_id),
+    updated_at, file_size и filename: условие (поле, id) < (:value, :id)
+    выполняется range scan по индексу в обоих направлениях сортировки.
+    """
+    for name, columns in _INDEXES:
+        op.create_index(name, 'file_metadata_cache', columns, unique=False)
+
+
+def downgrade() -> None:
+    """Удаление индексов keyset пагинации по полям сортировки."""
+    for name, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name='file_metadata_cache')
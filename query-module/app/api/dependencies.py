@@ -3,6 +3,7 @@ Query Module - API Dependencies.
 
 FastAPI dependencies для:
 - JWT authentication
+- Rate limiting Service Accounts (SlidingWindowRateLimiter)
 - Database session management
 - User context extraction
 """
@@ -13,12 +14,60 @@ from typing import Annotated
 from fastapi import Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.rate_limiter import SlidingWindowRateLimiter
+from app.core.redis import get_redis
 from app.core.security import jwt_validator, UserContext
 from app.core.exceptions import InvalidTokenException, TokenExpiredException
 from app.db.database import get_db_session
 
 logger = logging.getLogger(__name__)
 
+# Окна rate limit в Redis общие для всех экземпляров Query Module
+rate_limiter = SlidingWindowRateLimiter(
+    get_redis,
+    key_prefix="rate_limit:query",
+    window_seconds=settings.rate_limit.window_seconds,
+    local_fraction=settings.rate_limit.local_fraction,
+)
+
+
+async def enforce_rate_limit(user: UserContext) -> None:
+    """
+    Проверка rate_limit Service Account (RATE_LIMIT_ENABLED).
+
+    Args:
+        user: Контекст пользователя из JWT
+
+    Raises:
+        HTTPException: 429 если лимит запросов превышен
+    """
+    if not settings.rate_limit.enabled or not user.is_service_account or not user.rate_limit:
+        return
+
+    decision = await rate_limiter.check(user.client_id or user.identifier, user.rate_limit)
+    if decision.allowed:
+        return
+
+    logger.warning(
+        "Rate limit exceeded",
+        extra={"client_id": user.client_id, "limit": user.rate_limit}
+    )
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail={
+            "error": "rate_limit_exceeded",
+            "message": f"Rate limit exceeded: {user.rate_limit} requests per {settings.rate_limit.window_seconds} seconds",
+            "retry_after": decision.retry_after,
+            "limit": user.rate_limit
+        },
+        headers={
+            "Retry-After": str(decision.retry_after),
+            "X-RateLimit-Limit": str(user.rate_limit),
+            "X-RateLimit-Remaining": "0"
+        },
+    )
+
 
 async def get_current_user(
     authorization: Annotated[str | None, Header()] = None
@@ -34,6 +83,7 @@ async def get_current_user(
 
     Raises:
         HTTPException: 401 если токен невалиден или отсутствует
+        HTTPException: 429 если превышен rate_limit Service Account
     """
     if not authorization:
         raise HTTPException(
@@ -56,6 +106,7 @@ async def get_current_user(
 
         # Валидация JWT токена
         user_context = jwt_validator.validate_token(token)
+        await enforce_rate_limit(user_context)
 
         logger.debug(
             "User authenticated",
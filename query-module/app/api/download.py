@@ -2,23 +2,29 @@
 Query Module - Download API Router.
 
 REST API endpoints для скачивания файлов:
-- GET /api/download/{file_id} - Скачивание файла
+- GET /api/download/{file_id} - Скачивание файла (proxy или redirect на Storage Element)
 - GET /api/download/{file_id}/metadata - Метаданные для скачивания
 - GET /api/download/{file_id}/progress - Прогресс скачивания
+- GET /api/download/{file_id}/stats - Статистика скачиваний файла
+- GET /api/download/stats/hourly - Скачивания по часам (admin dashboard)
 """
 
 import logging
+from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, HTTPException, status, Header
-from fastapi.responses import StreamingResponse
-from typing import Annotated, Optional
+from fastapi import APIRouter, HTTPException, status, Header, Query
+from fastapi.responses import RedirectResponse, StreamingResponse
+from typing import Annotated, Any, Dict, List, Literal, Optional
 
 from app.api.dependencies import CurrentUser
+from app.core.config import settings
 from app.services.download_service import download_service
-from app.services.cache_service import cache_service
+from app.services.download_stats import download_stats_writer
+from app.services.metadata_resolver import metadata_resolver
 from app.schemas.download import (
     DownloadMetadata,
     DownloadProgress,
+    DownloadStats,
     RangeRequest
 )
 from app.core.exceptions import (
@@ -59,8 +65,8 @@ async def get_download_metadata(
         HTTPException 503: Storage Element недоступен
     """
     try:
-        # Получение метаданных из кеша
-        cached_metadata = cache_service.get_file_metadata(file_id)
+        # Метаданные: local cache → Redis → PostgreSQL
+        cached_metadata = await metadata_resolver.resolve(file_id)
         if not cached_metadata:
             raise FileNotFoundException(
                 f"File metadata not found: {file_id}",
@@ -108,25 +114,86 @@ async def get_download_metadata(
         )
 
 
+@router.get("/stats/hourly")
+async def get_hourly_download_stats(
+    current_user: CurrentUser,
+    hours: Annotated[int, Query(ge=1, le=24 * 90, description="Период (часы)")] = 24
+) -> List[Dict[str, Any]]:
+    """
+    Скачивания по часам за период (admin dashboard).
+
+    Читает почасовые агрегаты download_statistics_hourly, не сканируя
+    сырые записи download_statistics.
+
+    Args:
+        current_user: Authenticated user context (admin)
+        hours: Период в часах до текущего момента
+
+    Returns:
+        List[Dict[str, Any]]: [{hour, download_count, resumed_count, bytes_transferred,
+            download_time_ms}] по возрастанию hour
+
+    Raises:
+        HTTPException 403: Недостаточно прав
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin role required"
+        )
+
+    return await download_stats_writer.get_hourly_stats(
+        since=datetime.now(timezone.utc) - timedelta(hours=hours)
+    )
+
+
+@router.get("/{file_id}/stats", response_model=DownloadStats)
+async def get_download_stats(
+    file_id: str,
+    current_user: CurrentUser
+) -> DownloadStats:
+    """
+    Статистика скачиваний файла (по почасовым агрегатам).
+
+    Args:
+        file_id: UUID файла
+        current_user: Authenticated user context
+
+    Returns:
+        DownloadStats: Количество скачиваний, переданные bytes, последнее скачивание
+    """
+    return await download_stats_writer.get_file_stats(file_id)
+
+
 @router.get("/{file_id}")
 async def download_file(
     file_id: str,
     current_user: CurrentUser,
-    range_header: Annotated[Optional[str], Header(alias="Range")] = None
+    range_header: Annotated[Optional[str], Header(alias="Range")] = None,
+    delivery: Annotated[
+        Optional[Literal["proxy", "redirect"]],
+        Query(description="Режим скачивания (по умолчанию DOWNLOAD_MODE)")
+    ] = None
 ):
     """
     Скачивание файла с поддержкой resumable downloads.
 
     Поддерживает HTTP Range requests для возобновления прерванных скачиваний.
-    Использует streaming для эффективной передачи больших файлов.
+
+    Режимы (delivery, по умолчанию DOWNLOAD_MODE):
+    - redirect: 307 на публичный URL Storage Element (DOWNLOAD_PUBLIC_URLS)
+      с короткоживущим подписанным токеном (file_id + диапазон Range);
+      содержимое не проходит через Query Module. SE без публичного URL - proxy
+    - proxy: streaming через Query Module (внутренние клиенты, без ключа подписи)
 
     Args:
         file_id: UUID файла
         current_user: Authenticated user context
         range_header: HTTP Range header (optional)
+        delivery: Режим скачивания (optional)
 
     Returns:
-        StreamingResponse: File content stream
+        RedirectResponse | StreamingResponse: Redirect на SE или поток содержимого
 
     Raises:
         HTTPException 404: Файл не найден
@@ -134,8 +201,8 @@ async def download_file(
         HTTPException 503: Storage Element недоступен
     """
     try:
-        # Получение метаданных из кеша
-        cached_metadata = cache_service.get_file_metadata(file_id)
+        # Метаданные: local cache → Redis → PostgreSQL
+        cached_metadata = await metadata_resolver.resolve(file_id)
         if not cached_metadata:
             raise FileNotFoundException(
                 f"File metadata not found: {file_id}",
@@ -172,11 +239,48 @@ async def download_file(
                 )
                 # Игнорируем некорректный Range header
 
+        # Redirect: клиент скачивает напрямую с SE, токен ограничен файлом и диапазоном.
+        # SE без публичного URL (DOWNLOAD_PUBLIC_URLS) - proxy
+        public_url = None
+        if (delivery or settings.download.mode) == "redirect" and settings.download.redirect_enabled:
+            public_url = download_service.public_storage_element_url(cached_metadata.get("storage_element_id"))
+            if public_url is None:
+                logger.debug(
+                    "No public URL for Storage Element, falling back to proxy",
+                    extra={"file_id": file_id, "storage_element_id": cached_metadata.get("storage_element_id")}
+                )
+
+        if public_url is not None:
+            redirect_url = download_service.build_redirect_url(
+                file_id=file_id,
+                public_url=public_url,
+                range_request=range_request
+            )
+
+            logger.info(
+                "File download redirected to Storage Element",
+                extra={
+                    "file_id": file_id,
+                    "public_url": public_url,
+                    "range": range_header if range_request else None,
+                    "user_id": current_user.user_id
+                }
+            )
+
+            return RedirectResponse(
+                redirect_url,
+                status_code=settings.download.redirect_status_code,
+                headers={"Cache-Control": "no-store"}
+            )
+
         # Streaming download
         file_stream = download_service.download_file_stream(
             file_id=file_id,
             storage_element_url=storage_element_url,
-            range_request=range_request
+            range_request=range_request,
+            chunk_size=settings.download.chunk_size,
+            storage_element_id=cached_metadata.get("storage_element_id") or None,
+            username=current_user.username
         )
 
         # Response headers
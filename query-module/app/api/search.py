@@ -3,21 +3,28 @@ Query Module - Search API Router.
 
 REST API endpoints для поиска файлов:
 - POST /api/search - Поиск файлов с фильтрацией
+- GET /api/search/suggest - Автодополнение по префиксу
 - GET /api/search/{file_id} - Получение метаданных файла
 """
 
 import logging
-from typing import Annotated
+from typing import Annotated, Optional
 
 from fastapi import APIRouter, HTTPException, status, Query
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import CurrentUser, DatabaseSession
-from app.schemas.search import SearchRequest, SearchResponse, FileMetadataResponse
+from app.core.config import settings
+from app.schemas.search import (
+    SearchRequest,
+    SearchResponse,
+    FileMetadataResponse,
+    SuggestResponse,
+    Suggestion
+)
 from app.services.search_service import SearchService
-from app.services.cache_service import cache_service
-from app.db.models import FileMetadata
+from app.services.metadata_resolver import metadata_resolver
+from app.services.suggest_index import suggest_index
 from app.core.exceptions import (
     SearchException,
     InvalidSearchQueryException,
@@ -116,10 +123,47 @@ async def search_files(
         )
 
 
+@router.get("/suggest", response_model=SuggestResponse)
+async def suggest(
+    current_user: CurrentUser,
+    prefix: Annotated[str, Query(min_length=1, max_length=100, description="Префикс")],
+    limit: Annotated[
+        Optional[int], Query(ge=1, le=50, description="Подсказок каждого типа")
+    ] = None
+) -> SuggestResponse:
+    """
+    Автодополнение: имена файлов, теги и пользователи по префиксу.
+
+    Подсказки берутся из prefix индекса (Redis sorted sets или память процесса),
+    без обращения к PostgreSQL; внутри каждого типа - по убыванию числа файлов.
+
+    Args:
+        current_user: Authenticated user context
+        prefix: Введённый префикс (регистр не учитывается)
+        limit: Количество подсказок каждого типа (по умолчанию SEARCH_SUGGEST_LIMIT)
+
+    Returns:
+        SuggestResponse: Подсказки по типам
+    """
+    if not settings.search.suggest_enabled or not prefix.strip():
+        return SuggestResponse(prefix=prefix)
+
+    suggestions = await suggest_index.suggest(prefix, limit or settings.search.suggest_limit)
+
+    def to_schema(kind: str) -> list[Suggestion]:
+        return [Suggestion(value=value, count=count) for value, count in suggestions[kind]]
+
+    return SuggestResponse(
+        prefix=prefix,
+        filenames=to_schema("filename"),
+        tags=to_schema("tag"),
+        usernames=to_schema("username")
+    )
+
+
 @router.get("/{file_id}", response_model=FileMetadataResponse)
 async def get_file_metadata(
     file_id: str,
-    db: DatabaseSession,
     current_user: CurrentUser
 ) -> FileMetadataResponse:
     """
@@ -129,7 +173,6 @@ async def get_file_metadata(
 
     Args:
         file_id: UUID файла
-        db: Database session
         current_user: Authenticated user context
 
     Returns:
@@ -139,57 +182,22 @@ async def get_file_metadata(
         HTTPException 404: Файл не найден
         HTTPException 401: Не авторизован
     """
-    # Проверка кеша
-    cached_metadata = cache_service.get_file_metadata(file_id)
-    if cached_metadata:
-        logger.debug(
-            "File metadata from cache",
-            extra={"file_id": file_id, "user_id": current_user.user_id}
-        )
-        return FileMetadataResponse(**cached_metadata)
-
-    # Запрос из БД
+    # Метаданные: local cache → Redis → PostgreSQL
     try:
-        query = select(FileMetadata).where(FileMetadata.id == file_id)
-        result = await db.execute(query)
-        file_metadata = result.scalar_one_or_none()
+        metadata = await metadata_resolver.resolve(file_id)
 
-        if not file_metadata:
+        if not metadata:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"File not found: {file_id}"
             )
 
-        # Конвертация в response schema
-        response = FileMetadataResponse(
-            id=file_metadata.id,
-            filename=file_metadata.filename,
-            storage_filename=file_metadata.storage_filename,
-            file_size=file_metadata.file_size,
-            mime_type=file_metadata.mime_type,
-            sha256_hash=file_metadata.sha256_hash,
-            username=file_metadata.username,
-            tags=file_metadata.tags or [],
-            description=file_metadata.description,
-            created_at=file_metadata.created_at,
-            updated_at=file_metadata.updated_at,
-            storage_element_id=file_metadata.storage_element_id,
-            relevance_score=None
-        )
-
-        # Кеширование метаданных
-        cache_service.set_file_metadata(file_id, response.dict())
-
-        logger.info(
+        logger.debug(
             "File metadata retrieved",
-            extra={
-                "file_id": file_id,
-                "filename": file_metadata.filename,
-                "user_id": current_user.user_id
-            }
+            extra={"file_id": file_id, "user_id": current_user.user_id}
         )
 
-        return response
+        return FileMetadataResponse(**metadata)
 
     except HTTPException:
         raise
@@ -6,7 +6,7 @@ A ?>445@6:>9 .env D09;>2 8 20;840F859.
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -212,7 +212,16 @@ class CacheSettings(BaseSettings):
         default=300, ge=10, le=3600, description="TTL local cache (A5:)"
     )
     local_max_size: int = Field(
-        default=1000, ge=100, le=10000, description="0:A8<C< M;5<5=B>2 2 local cache"
+        default=1000, ge=100, le=1000000, description="0:A8<C< M;5<5=B>2 2 local cache"
+    )
+    local_max_bytes: int = Field(
+        default=0, ge=0, description="Byte budget local cache по оценке размера значений (0 - только лимит записей)"
+    )
+    negative_ttl: int = Field(
+        default=5, ge=0, le=300, description="TTL кеширования отсутствующих файлов (секунды, 0 - отключено)"
+    )
+    search_ttl: int = Field(
+        default=60, ge=5, le=3600, description="TTL кеша результатов поиска (секунды, local и Redis)"
     )
 
     # Redis cache
@@ -263,6 +272,61 @@ class SearchSettings(BaseSettings):
         default=0.8, ge=0.0, le=1.0, description="5A B53>2 2 @0=68@>20=88"
     )
 
+    # Autocomplete (GET /api/search/suggest)
+    suggest_enabled: bool = Field(
+        default=True, description="Prefix индекс автодополнения (имена файлов, теги, пользователи)"
+    )
+    suggest_limit: int = Field(
+        default=10, ge=1, le=50, description="Количество подсказок каждого типа по умолчанию"
+    )
+    suggest_scan_limit: int = Field(
+        default=200, ge=10, le=5000,
+        description="Кандидатов по префиксу, из которых выбираются самые частые подсказки"
+    )
+
+    @field_validator("suggest_enabled", mode="before")
+    @classmethod
+    def parse_bool_fields(cls, v):
+        """Парсинг boolean полей из environment variables."""
+        return parse_bool_from_env(v)
+
+
+class EventSettings(BaseSettings):
+    """Настройки потребления file-events из Redis Streams (EventSubscriber)."""
+
+    model_config = SettingsConfigDict(env_prefix="EVENT_")
+
+    stream_name: str = Field(
+        default="file-events", description="Redis Stream с событиями файлов (Admin Module EventPublisher)"
+    )
+    consumer_group: str = Field(
+        default="query-module-consumers", description="Consumer Group экземпляров Query Module"
+    )
+    batch_enabled: bool = Field(
+        default=True,
+        description="Пакетная обработка: слияние событий по file_id, один upsert/DELETE и один XACK на пакет"
+    )
+    # le=1000: multi-row upsert - 18 bind параметров на строку при лимите PostgreSQL 32767
+    batch_size: int = Field(
+        default=500, ge=1, le=1000, description="Максимум событий за один XREADGROUP"
+    )
+    block_ms: int = Field(
+        default=5000, ge=100, le=60000, description="Таймаут блокирующего XREADGROUP (мс)"
+    )
+    stream_partitions: int = Field(
+        default=1, ge=1, le=256,
+        description="Partition streams {stream_name}:{N} (как EVENT_STREAM_PARTITIONS Admin Module); 1 - единый stream"
+    )
+    partition_lease_seconds: int = Field(
+        default=30, ge=5, le=300,
+        description="Lease владения partition: через это время partitions упавшего экземпляра перераспределяются"
+    )
+
+    @field_validator("batch_enabled", mode="before")
+    @classmethod
+    def parse_bool_fields(cls, v):
+        """Парсинг boolean полей из environment variables."""
+        return parse_bool_from_env(v)
 
 
 class DownloadSettings(BaseSettings):
@@ -294,18 +358,133 @@ class DownloadSettings(BaseSettings):
 
     # Download settings
     chunk_size: int = Field(
-        default=8192, ge=1024, le=1048576, description="Размер chunk для streaming (bytes)"
+        default=262144, ge=8192, le=8388608, description="Размер chunk для streaming в proxy режиме (bytes)"
     )
     enable_resume: bool = Field(
         default=True, description="Разрешить resumable downloads"
     )
 
+    # Redirect режим: клиент скачивает напрямую с Storage Element по подписанному токену
+    mode: str = Field(
+        default="proxy",
+        description="Режим скачивания по умолчанию: proxy (через Query Module) или redirect (на Storage Element)"
+    )
+    signing_key: Optional[str] = Field(
+        default=None,
+        description="Общий с Storage Element ключ HMAC подписи токенов скачивания (без ключа - только proxy)"
+    )
+    token_ttl_seconds: int = Field(
+        default=60, ge=5, le=3600, description="Время жизни токена скачивания (секунды)"
+    )
+    redirect_status_code: int = Field(
+        default=307, description="HTTP статус redirect ответа (302 или 307)"
+    )
+    public_urls: Dict[str, str] = Field(
+        default_factory=dict,
+        description=(
+            "Публичные base URL Storage Element для redirect режима: storage_element_id → URL "
+            "(JSON). SE без публичного URL отдаются через proxy"
+        )
+    )
+
     @field_validator("enable_resume", mode="before")
     @classmethod
     def parse_bool_fields(cls, v):
         """Парсинг boolean полей из environment variables."""
         return parse_bool_from_env(v)
 
+    @field_validator("mode")
+    @classmethod
+    def validate_mode(cls, v: str) -> str:
+        """Валидация режима скачивания"""
+        if v not in ("proxy", "redirect"):
+            raise ValueError(f"Invalid DOWNLOAD_MODE: {v}. Valid modes: proxy, redirect")
+        return v
+
+    @field_validator("redirect_status_code")
+    @classmethod
+    def validate_redirect_status_code(cls, v: int) -> int:
+        """Валидация статуса redirect"""
+        if v not in (302, 307):
+            raise ValueError(f"Invalid DOWNLOAD_REDIRECT_STATUS_CODE: {v}. Valid: 302, 307")
+        return v
+
+    @property
+    def redirect_enabled(self) -> bool:
+        """Redirect возможен только с ключом подписи"""
+        return bool(self.signing_key)
+
+
+class StatsSettings(BaseSettings):
+    """Настройки фоновой записи статистики (download_statistics, search_history)."""
+
+    model_config = SettingsConfigDict(env_prefix="STATS_")
+
+    enabled: bool = Field(
+        default=True, description="Запись статистики скачиваний в PostgreSQL"
+    )
+    queue_size: int = Field(
+        default=10000, ge=100, le=1000000,
+        description="Ёмкость очереди записей: при заполнении новые записи отбрасываются (backpressure)"
+    )
+    # le=4000: multi-row INSERT - 8 bind параметров на строку при лимите PostgreSQL 32767
+    flush_size: int = Field(
+        default=500, ge=1, le=4000, description="Записей в одном multi-row INSERT"
+    )
+    flush_interval_ms: int = Field(
+        default=1000, ge=50, le=60000, description="Максимальная задержка записи неполного пакета (мс)"
+    )
+
+    # Search history
+    search_history_enabled: bool = Field(
+        default=True, description="Запись истории поисковых запросов"
+    )
+    search_history_sample_rate: float = Field(
+        default=1.0, ge=0.0, le=1.0, description="Доля записываемых поисковых запросов (1.0 - все)"
+    )
+    search_history_retention_days: int = Field(
+        default=30, ge=1, le=3650,
+        description="Хранение истории поиска (дни): старые дневные partitions удаляются целиком"
+    )
+    search_history_partitions_ahead: int = Field(
+        default=7, ge=2, le=90,
+        description="Дневные partitions search_history, создаваемые заранее (дни после текущего)"
+    )
+
+    @field_validator("enabled", "search_history_enabled", mode="before")
+    @classmethod
+    def parse_bool_fields(cls, v):
+        """Парсинг boolean полей из environment variables."""
+        return parse_bool_from_env(v)
+
+
+class RateLimitSettings(BaseSettings):
+    """
+    Rate limiting запросов Service Accounts (лимит из claim rate_limit JWT).
+
+    Окна в Redis общие для всех экземпляров Query Module
+    (ключи rate_limit:query:{client_id}).
+    """
+
+    model_config = SettingsConfigDict(env_prefix="RATE_LIMIT_")
+
+    enabled: bool = Field(
+        default=False, description="Проверка rate_limit Service Accounts"
+    )
+    window_seconds: int = Field(
+        default=60, ge=1, le=3600, description="Окно rate limit (секунды)"
+    )
+    local_fraction: float = Field(
+        default=0.1, ge=0.0, le=0.5,
+        description="Доля лимита, получаемая экземпляром из Redis за одно обращение (0 - каждый запрос в Redis)"
+    )
+
+    @field_validator("enabled", mode="before")
+    @classmethod
+    def parse_bool_fields(cls, v):
+        """Парсинг boolean полей из environment variables."""
+        return parse_bool_from_env(v)
+
 
 class CORSSettings(BaseSettings):
     """
@@ -471,7 +650,10 @@ class QueryModuleSettings(BaseSettings):
     storage: StorageSettings = Field(default_factory=StorageSettings)
     cache: CacheSettings = Field(default_factory=CacheSettings)
     search: SearchSettings = Field(default_factory=SearchSettings)
+    events: EventSettings = Field(default_factory=EventSettings)
     download: DownloadSettings = Field(default_factory=DownloadSettings)
+    stats: StatsSettings = Field(default_factory=StatsSettings)
+    rate_limit: RateLimitSettings = Field(default_factory=RateLimitSettings)
     cors: CORSSettings = Field(default_factory=CORSSettings)
 
     @field_validator("debug", "swagger_enabled", mode="before")
@@ -0,0 +1,59 @@
+"""
+Signed download tokens - прямое скачивание с Storage Element по redirect.
+
+Query Module подписывает короткоживущий токен, ограниченный одним file_id
+и (опционально) диапазоном байт, и отвечает клиенту redirect на Storage
+Element. SE проверяет подпись локально общим ключом DOWNLOAD_SIGNING_KEY -
+без обращения к Query/Admin Module и без проксирования содержимого.
+
+Формат: <payload>.<signature> (base64url без padding)
+- payload: JSON {"fid": file_id, "exp": unix time, "rng": [start, end|null] | null}
+- signature: HMAC-SHA256(key, payload)
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+from typing import Optional
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def sign_download_token(
+    file_id: str,
+    signing_key: str,
+    ttl_seconds: int,
+    byte_range: Optional[tuple[int, Optional[int]]] = None,
+    now: Optional[float] = None
+) -> str:
+    """
+    Подписать токен скачивания файла.
+
+    Args:
+        file_id: UUID файла
+        signing_key: Общий с Storage Element ключ подписи
+        ttl_seconds: Время жизни токена (секунды)
+        byte_range: Разрешённый диапазон (start, end) или None - весь файл
+        now: Текущее время (unix, для тестов)
+
+    Returns:
+        str: Токен для query параметра ?token=
+    """
+    expires_at = int((now if now is not None else time.time()) + ttl_seconds)
+    payload = json.dumps(
+        {
+            "fid": file_id,
+            "exp": expires_at,
+            "rng": list(byte_range) if byte_range is not None else None,
+        },
+        separators=(",", ":"),
+    ).encode()
+
+    encoded_payload = _b64encode(payload)
+    signature = hmac.new(signing_key.encode(), encoded_payload.encode(), hashlib.sha256).digest()
+
+    return f"{encoded_payload}.{_b64encode(signature)}"
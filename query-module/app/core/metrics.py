@@ -0,0 +1,172 @@
+"""
+Prometheus metrics для Query Module.
+
+Экспортируются через /metrics (prometheus_client REGISTRY).
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# ========================================
+# Local Cache (in-memory)
+# ========================================
+
+# Counter: Попадания в local cache
+local_cache_hits_total = Counter(
+    "query_local_cache_hits_total",
+    "Total local cache hits",
+    ["cache"]
+)
+
+# Counter: Промахи local cache (включая истёкшие по TTL записи)
+local_cache_misses_total = Counter(
+    "query_local_cache_misses_total",
+    "Total local cache misses",
+    ["cache"]
+)
+
+# Counter: Вытеснения из local cache
+local_cache_evictions_total = Counter(
+    "query_local_cache_evictions_total",
+    "Total local cache evictions",
+    ["cache", "reason"]  # reason: capacity, ttl
+)
+
+# Gauge: Количество записей в local cache
+local_cache_entries = Gauge(
+    "query_local_cache_entries",
+    "Current number of local cache entries",
+    ["cache"]
+)
+
+# Gauge: Оценка занятой памяти (bytes, только при заданном byte budget)
+local_cache_bytes = Gauge(
+    "query_local_cache_bytes",
+    "Estimated size of local cache entries in bytes",
+    ["cache"]
+)
+
+# ========================================
+# Search Result Cache
+# ========================================
+
+# Counter: Попадания в кеш результатов поиска
+search_cache_hits_total = Counter(
+    "query_search_cache_hits_total",
+    "Total search result cache hits",
+    ["level"]  # level: local, redis
+)
+
+# Counter: Промахи кеша результатов поиска (запрос выполнен в PostgreSQL)
+search_cache_misses_total = Counter(
+    "query_search_cache_misses_total",
+    "Total search result cache misses"
+)
+
+# Counter: Время PostgreSQL, сэкономленное попаданиями в кеш (секунды)
+search_cache_saved_db_seconds_total = Counter(
+    "query_search_cache_saved_db_seconds_total",
+    "Total PostgreSQL query time saved by search result cache hits"
+)
+
+# Counter: Инкременты generation counters по событиям file-events
+search_cache_invalidations_total = Counter(
+    "query_search_cache_invalidations_total",
+    "Total search result cache generation bumps",
+    ["event_type"]
+)
+
+# ========================================
+# File Events Consumer (Redis Streams)
+# ========================================
+
+# Histogram: Событий в пакете XREADGROUP
+event_batch_size = Histogram(
+    "query_event_batch_size",
+    "Number of file events read per consumer batch",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000)
+)
+
+# Histogram: Длительность применения пакета (PostgreSQL, инвалидация, XACK)
+event_batch_duration_seconds = Histogram(
+    "query_event_batch_duration_seconds",
+    "Time spent applying a batch of file events"
+)
+
+# Counter: События, поглощённые более поздним событием того же file_id в пакете
+event_coalesced_total = Counter(
+    "query_event_coalesced_total",
+    "Total file events superseded by a later event for the same file in a batch"
+)
+
+# Counter: Pending события, подтверждённые без применения (уже применено более новое событие файла)
+event_superseded_total = Counter(
+    "query_event_superseded_total",
+    "Total pending file events acknowledged without applying because a newer event for the same file was applied"
+)
+
+# Gauge: Отставание consumer - возраст последнего прочитанного события (секунды)
+event_consumer_lag_seconds = Gauge(
+    "query_event_consumer_lag_seconds",
+    "Age of the last file event read by the consumer"
+)
+
+# Gauge: Отставание consumer group - непрочитанные события stream (XINFO GROUPS lag)
+event_consumer_lag_events = Gauge(
+    "query_event_consumer_lag_events",
+    "File events in the stream not yet delivered to the consumer group"
+)
+
+# ========================================
+# Batch Writers (статистика в PostgreSQL)
+# ========================================
+
+# Counter: Записи, сохранённые фоновым writer
+batch_writer_written_total = Counter(
+    "query_batch_writer_written_total",
+    "Total records written by background batch writers",
+    ["writer"]
+)
+
+# Counter: Отброшенные записи
+batch_writer_dropped_total = Counter(
+    "query_batch_writer_dropped_total",
+    "Total records dropped by background batch writers",
+    ["writer", "reason"]  # reason: queue_full, write_error, shutdown
+)
+
+# Gauge: Записи в очереди
+batch_writer_queue_size = Gauge(
+    "query_batch_writer_queue_size",
+    "Records waiting in the batch writer queue",
+    ["writer"]
+)
+
+# Histogram: Длительность записи пакета
+batch_writer_flush_duration_seconds = Histogram(
+    "query_batch_writer_flush_duration_seconds",
+    "Time spent writing one batch to PostgreSQL",
+    ["writer"]
+)
+
+
+# ========================================
+# Search History Partitions
+# ========================================
+
+# Gauge: Дни подряд с текущего, покрытые дневными partitions
+search_history_partition_coverage_days = Gauge(
+    "query_search_history_partition_coverage_days",
+    "Consecutive days starting today covered by search_history day partitions"
+)
+
+# Gauge: Время последнего успешного обслуживания partitions
+search_history_maintenance_last_success_timestamp_seconds = Gauge(
+    "query_search_history_maintenance_last_success_timestamp_seconds",
+    "Unix time of the last successful search_history partition maintenance"
+)
+
+# Counter: Записи, перенесённые из search_history_default в дневные partitions
+search_history_default_rows_moved_total = Counter(
+    "query_search_history_default_rows_moved_total",
+    "Total search_history rows moved from the default partition into day partitions"
+)
@@ -146,7 +146,7 @@ class FileMetadata(Base):
     search_vector: Mapped[Optional[str]] = mapped_column(
         TSVECTOR,
         nullable=True,
-        comment="Полнотекстовый поисковый вектор (auto-generated)"
+        comment="Взвешенный поисковый вектор: имя (A), теги (B), описание (C)"
     )
 
     # Constraints
@@ -176,6 +176,26 @@ class FileMetadata(Base):
         # Composite индекс для фильтрации по размеру
         Index('idx_file_metadata_file_size', 'file_size', 'created_at'),
 
+        # Keyset (cursor) пагинация поиска: (поле сортировки, id)
+        Index('idx_file_metadata_created_id', 'created_at', 'id'),
+        Index('idx_file_metadata_updated_id', 'updated_at', 'id'),
+        Index('idx_file_metadata_size_id', 'file_size', 'id'),
+        Index('idx_file_metadata_filename_id', 'filename', 'id'),
+
+        # pg_trgm GIN индексы для substring поиска (ILIKE '%q%')
+        Index(
+            'idx_file_metadata_filename_trgm',
+            'filename',
+            postgresql_using='gin',
+            postgresql_ops={'filename': 'gin_trgm_ops'}
+        ),
+        Index(
+            'idx_file_metadata_description_trgm',
+            'description',
+            postgresql_using='gin',
+            postgresql_ops={'description': 'gin_trgm_ops'}
+        ),
+
         {'comment': 'Кеш метаданных файлов для быстрого поиска и снижения нагрузки на Storage Elements'}
     )
 
@@ -215,6 +235,11 @@ class SearchHistory(Base):
     - Автодополнения (autocomplete)
     - Оптимизации индексов на основе реальных запросов
     - Мониторинга производительности поиска
+
+    Таблица секционирована по дням (RANGE created_at, partitions
+    search_history_pYYYYMMDD, search_history_default для остальных записей):
+    SearchHistoryWriter создаёт partitions заранее и удаляет partitions
+    старше STATS_SEARCH_HISTORY_RETENTION_DAYS целиком.
     """
 
     __tablename__ = "search_history"
@@ -269,9 +294,10 @@ class SearchHistory(Base):
         comment="Пользователь выполнивший поиск"
     )
 
-    # Timestamps
+    # Timestamps (ключ секционирования - входит в Primary Key)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
         server_default=func.now(),
         index=True,
@@ -288,7 +314,10 @@ class SearchHistory(Base):
         Index('idx_search_history_username_created', 'username', 'created_at'),
         Index('idx_search_history_mode', 'search_mode', 'created_at'),
 
-        {'comment': 'История поисковых запросов для аналитики и оптимизации'}
+        {
+            'comment': 'История поисковых запросов для аналитики и оптимизации',
+            'postgresql_partition_by': 'RANGE (created_at)',
+        }
     )
 
     def __repr__(self) -> str:
@@ -395,3 +424,83 @@ class DownloadStatistics(Base):
             f"time={self.download_time_ms}ms, "
             f"resumed={self.was_resumed})>"
         )
+
+
+class DownloadStatisticsHourly(Base):
+    """
+    Почасовые агрегаты download_statistics для admin dashboard.
+
+    Обновляется DownloadStatsWriter в той же транзакции, что и INSERT
+    сырых записей (INSERT ... ON CONFLICT DO UPDATE с приращениями):
+    отчёты читают агрегаты без сканирования download_statistics.
+    """
+
+    __tablename__ = "download_statistics_hourly"
+
+    # Composite Primary Key: час + файл + Storage Element
+    hour: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        comment="Начало часа (UTC)"
+    )
+
+    file_id: Mapped[str] = mapped_column(
+        String(36),
+        primary_key=True,
+        comment="UUID файла"
+    )
+
+    storage_element_id: Mapped[str] = mapped_column(
+        String(50),
+        primary_key=True,
+        comment="ID Storage Element"
+    )
+
+    # Aggregates
+    download_count: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="Количество скачиваний за час"
+    )
+
+    resumed_count: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="Из них resumed (HTTP Range request)"
+    )
+
+    bytes_transferred: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="Передано bytes за час"
+    )
+
+    download_time_ms: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="Суммарное время скачиваний за час (мс)"
+    )
+
+    last_download_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="Последнее скачивание в пределах часа"
+    )
+
+    __table_args__ = (
+        Index('idx_download_stats_hourly_file_hour', 'file_id', 'hour'),
+
+        {'comment': 'Почасовые агрегаты статистики скачиваний для dashboard'}
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<DownloadStatisticsHourly(hour={self.hour}, "
+            f"file_id='{self.file_id}', "
+            f"downloads={self.download_count}, "
+            f"bytes={self.bytes_transferred})>"
+        )
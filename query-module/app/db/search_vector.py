@@ -0,0 +1,98 @@
+"""
+Query Module - Взвешенный tsvector для Full-Text Search.
+
+search_vector хранится в file_metadata_cache и пересчитывается CacheSyncService
+при каждом upsert (GIN индекс idx_file_metadata_search_vector). Поля помечаются
+весовыми классами PostgreSQL:
+- A - имя файла (SEARCH_RANK_TITLE_WEIGHT)
+- B - теги (SEARCH_RANK_TAGS_WEIGHT)
+- C - описание (SEARCH_RANK_CONTENT_WEIGHT)
+
+Числовые веса подставляются в ts_rank при запросе: их изменение не требует
+пересчёта сохранённых векторов.
+"""
+
+import re
+from typing import List, Optional
+
+from sqlalchemy import REAL, cast, func, literal, literal_column
+from sqlalchemy.dialects.postgresql import ARRAY, REGCONFIG, TSVECTOR, array
+
+from app.core.config import settings
+from app.db.models import FileMetadata
+
+# Вес класса D (не используется при построении вектора) - значение PostgreSQL по умолчанию
+_UNUSED_WEIGHT = 0.1
+
+# Нормализация ts_rank: rank / (rank + 1) - relevance_score в диапазоне [0, 1)
+_RANK_NORMALIZATION = 32
+
+# Разделители в именах файлов (report_2025-01.final.pdf)
+_FILENAME_SEPARATORS = re.compile(r"[._\-]+")
+
+
+def _config():
+    """Конфигурация текстового поиска (SEARCH_DEFAULT_LANGUAGE)."""
+    return cast(literal(settings.search.default_language), REGCONFIG)
+
+
+def filename_terms(filename: str) -> str:
+    """
+    Текст имени файла для индексации.
+
+    Парсер PostgreSQL распознаёт "report.pdf" как один токен типа file,
+    поэтому к имени добавляются его части без разделителей.
+    """
+    return f"{filename} {_FILENAME_SEPARATORS.sub(' ', filename)}"
+
+
+def search_vector_expression(
+    filename: str,
+    tags: Optional[List[str]],
+    description: Optional[str]
+):
+    """
+    SQL выражение взвешенного tsvector для INSERT/UPDATE file_metadata_cache.
+
+    Args:
+        filename: Оригинальное имя файла
+        tags: Теги файла
+        description: Описание файла
+
+    Returns:
+        SQL выражение типа tsvector
+    """
+    config = _config()
+
+    def weighted(text: str, label: str):
+        # Метка - константа "char": bind параметр VARCHAR не приводится неявно
+        return func.setweight(func.to_tsvector(config, text), literal_column(f"'{label}'"), type_=TSVECTOR)
+
+    return (
+        weighted(filename_terms(filename), "A")
+        .op("||")(weighted(" ".join(tags or []), "B"))
+        .op("||")(weighted(description or "", "C"))
+    )
+
+
+def search_query_expression(query: str):
+    """tsquery поискового запроса (plainto_tsquery - без синтаксиса операторов)."""
+    return func.plainto_tsquery(_config(), query)
+
+
+def rank_expression(ts_query):
+    """
+    Релевантность ts_rank по сохранённому search_vector.
+
+    Веса передаются массивом {D, C, B, A} из SearchSettings.
+    """
+    weights = cast(
+        array([
+            _UNUSED_WEIGHT,
+            settings.search.rank_content_weight,
+            settings.search.rank_tags_weight,
+            settings.search.rank_title_weight,
+        ]),
+        ARRAY(REAL)
+    )
+    return func.ts_rank(weights, FileMetadata.search_vector, ts_query, _RANK_NORMALIZATION, type_=REAL)
@@ -23,7 +23,10 @@ from app.core.redis import close_redis
 from app.db.database import init_db, close_db
 from app.services.cache_service import cache_service
 from app.services.download_service import download_service
+from app.services.download_stats import download_stats_writer
 from app.services.event_subscriber import event_subscriber
+from app.services.search_history import search_history_writer
+from app.services.suggest_index import suggest_index
 
 # Настройка логирования
 setup_logging(level=settings.log_level, log_format=settings.log_format)
@@ -53,11 +56,19 @@ async def lifespan(app: FastAPI):
         await init_db()
         logger.info("Database initialized")
 
-        # Cache уже инициализирован (singleton)
+        # Подключение Redis cache (L2 кеш метаданных и результатов поиска)
+        await cache_service.initialize()
         logger.info("Cache service initialized")
 
+        # Prefix индекс автодополнения (восстановление из PostgreSQL в фоне)
+        await suggest_index.initialize()
+
         # HTTP client для download service инициализируется lazy
 
+        # Фоновая пакетная запись статистики скачиваний и истории поиска
+        await download_stats_writer.start()
+        await search_history_writer.start()
+
         # Запуск JWT key file watcher для hot-reload
         from app.core.jwt_key_manager import get_jwt_key_manager
         jwt_key_manager = get_jwt_key_manager()
@@ -81,12 +92,16 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down Query Module")
 
     try:
+        # Запись оставшейся статистики до закрытия database
+        await download_stats_writer.close()
+        await search_history_writer.close()
+
         # Закрытие database connections
         await close_db()
         logger.info("Database closed")
 
         # Закрытие cache connections
-        cache_service.close()
+        await cache_service.close()
         logger.info("Cache service closed")
 
         # Закрытие HTTP client
@@ -97,6 +112,8 @@ async def lifespan(app: FastAPI):
         await event_subscriber.close()
         logger.info("Event subscriber closed")
 
+        await suggest_index.close()
+
         # Закрытие Redis connections
         await close_redis()
         logger.info("Redis connections closed")
@@ -8,7 +8,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional, List
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class SearchMode(str, Enum):
@@ -100,6 +100,18 @@ class SearchRequest(BaseModel):
         ge=0,
         description="!<5I5=85 4;O ?038=0F88",
     )
+    cursor: Optional[str] = Field(
+        None,
+        max_length=1024,
+        description=(
+            "Курсор следующей страницы (next_cursor предыдущего ответа); несовместим с offset. "
+            "Не поддерживается для сортировки по relevance"
+        ),
+    )
+    exact_total: bool = Field(
+        default=True,
+        description="Точный total_count (COUNT(*)); false - оценка планировщика PostgreSQL",
+    )
 
     # !>@B8@>2:0
     sort_by: SortField = Field(
@@ -131,6 +143,13 @@ class SearchRequest(BaseModel):
                     raise ValueError("Tag length must not exceed 50 characters")
         return v
 
+    @model_validator(mode="after")
+    def validate_pagination(self) -> "SearchRequest":
+        """Курсор и offset - взаимоисключающие способы пагинации."""
+        if self.cursor and self.offset:
+            raise ValueError("cursor and offset cannot be combined")
+        return self
+
     def has_search_criteria(self) -> bool:
         """
         @>25@:0 =0;8G8O E>BO 1K >4=>3> :@8B5@8O ?>8A:0.
@@ -196,6 +215,14 @@ class SearchResponse(BaseModel):
         ...,
         description="ABL ;8 5I5 @57C;LB0BK",
     )
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Курсор следующей страницы (None - страниц больше нет)",
+    )
+    total_is_estimate: bool = Field(
+        default=False,
+        description="total_count - оценка планировщика, а не точный COUNT(*)",
+    )
 
     @property
     def current_page(self) -> int:
@@ -208,3 +235,21 @@ class SearchResponse(BaseModel):
         if self.total_count == 0:
             return 0
         return (self.total_count + self.limit - 1) // self.limit
+
+
+class Suggestion(BaseModel):
+    """
+    Подсказка автодополнения.
+    """
+    value: str = Field(..., description="Значение (имя файла, тег или пользователь)")
+    count: int = Field(..., ge=1, description="Количество файлов с этим значением")
+
+
+class SuggestResponse(BaseModel):
+    """
+    Ответ автодополнения по префиксу.
+    """
+    prefix: str = Field(..., description="Запрошенный префикс")
+    filenames: List[Suggestion] = Field(default=[], description="Имена файлов")
+    tags: List[Suggestion] = Field(default=[], description="Теги")
+    usernames: List[Suggestion] = Field(default=[], description="Владельцы файлов")
@@ -0,0 +1,202 @@
+"""
+Query Module - Фоновая пакетная запись в PostgreSQL.
+
+Записи статистики не должны задерживать запросы пользователей:
+- submit() кладёт запись в ограниченную очередь в памяти и сразу возвращается
+- Фоновая задача собирает пакет до flush_size записей или flush_interval_ms
+  и сохраняет его одним multi-row INSERT
+- Очередь заполнена (PostgreSQL не успевает) - запись отбрасывается
+  и учитывается в query_batch_writer_dropped_total{reason="queue_full"}
+- Ошибка записи пакета - пакет отбрасывается (reason="write_error"),
+  запись следующих пакетов продолжается
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Generic, List, Optional, TypeVar
+
+from app.core.metrics import (
+    batch_writer_dropped_total,
+    batch_writer_flush_duration_seconds,
+    batch_writer_queue_size,
+    batch_writer_written_total,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BatchWriter(ABC, Generic[T]):
+    """
+    Ограниченная очередь записей с фоновой пакетной записью.
+
+    Подклассы реализуют write(batch).
+
+    Usage:
+        await writer.start()
+        writer.submit(record)  # не блокирует
+        await writer.close()   # запись оставшихся записей
+    """
+
+    def __init__(
+        self,
+        name: str,
+        queue_size: int,
+        flush_size: int,
+        flush_interval_ms: int,
+        enabled: bool = True,
+    ):
+        """
+        Args:
+            name: Имя writer (label метрик)
+            queue_size: Ёмкость очереди
+            flush_size: Максимум записей в пакете
+            flush_interval_ms: Максимальная задержка записи неполного пакета
+            enabled: False - submit() игнорирует записи
+        """
+        self.name = name
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.enabled = enabled
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._batch: List[T] = []
+        self._inflight: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Запуск фоновой записи (lifespan startup, после init_db())."""
+        if not self.enabled or self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            "Batch writer started",
+            extra={
+                "writer": self.name,
+                "queue_size": self._queue.maxsize,
+                "flush_size": self.flush_size,
+                "flush_interval_ms": int(self.flush_interval * 1000),
+            }
+        )
+
+    def submit(self, record: T) -> bool:
+        """
+        Постановка записи в очередь без ожидания.
+
+        Returns:
+            bool: False если запись отброшена (writer не запущен или очередь заполнена)
+        """
+        if not self.running:
+            return False
+
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            batch_writer_dropped_total.labels(writer=self.name, reason="queue_full").inc()
+            return False
+
+        batch_writer_queue_size.labels(writer=self.name).set(self._queue.qsize())
+        return True
+
+    @abstractmethod
+    async def write(self, batch: List[T]) -> None:
+        """Сохранение пакета (одна транзакция)."""
+
+    async def _fill_batch(self) -> None:
+        """Ожидание первой записи и сбор пакета до flush_size или flush_interval."""
+        self._batch.append(await self._queue.get())
+        deadline = time.monotonic() + self.flush_interval
+
+        while len(self._batch) < self.flush_size:
+            try:
+                self._batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                self._batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def _flush(self, batch: List[T]) -> None:
+        started = time.perf_counter()
+        try:
+            await self.write(batch)
+        except Exception as e:
+            batch_writer_dropped_total.labels(writer=self.name, reason="write_error").inc(len(batch))
+            logger.warning(
+                "Batch write failed, records dropped",
+                extra={"writer": self.name, "records": len(batch), "error": str(e)}
+            )
+            return
+
+        batch_writer_written_total.labels(writer=self.name).inc(len(batch))
+        batch_writer_flush_duration_seconds.labels(writer=self.name).observe(
+            time.perf_counter() - started
+        )
+
+    async def _run(self) -> None:
+        """Фоновый цикл записи пакетов."""
+        while True:
+            await self._fill_batch()
+            batch, self._batch = self._batch, []
+
+            # Остановка writer не прерывает запись пакета (close() дожидается её)
+            self._inflight = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._inflight)
+            self._inflight = None
+
+            batch_writer_queue_size.labels(writer=self.name).set(self._queue.qsize())
+
+    async def _drain(self) -> None:
+        """Запись текущего пакета и оставшихся в очереди записей."""
+        if self._inflight is not None:
+            await self._inflight
+            self._inflight = None
+
+        while self._batch or not self._queue.empty():
+            while len(self._batch) < self.flush_size and not self._queue.empty():
+                self._batch.append(self._queue.get_nowait())
+            batch, self._batch = self._batch, []
+            await self._flush(batch)
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """
+        Остановка и запись оставшихся записей (lifespan shutdown, до close_db()).
+
+        Args:
+            timeout: Максимальное ожидание записи оставшихся записей (секунды)
+        """
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        try:
+            await asyncio.wait_for(self._drain(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+        dropped = len(self._batch) + self._queue.qsize()
+        if dropped:
+            batch_writer_dropped_total.labels(writer=self.name, reason="shutdown").inc(dropped)
+            self._batch = []
+            self._queue = asyncio.Queue(maxsize=self._queue.maxsize)
+        batch_writer_queue_size.labels(writer=self.name).set(0)
+
+        logger.info("Batch writer stopped", extra={"writer": self.name, "dropped": dropped})
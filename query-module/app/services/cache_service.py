@@ -2,7 +2,7 @@
 Query Module - Cache Service.
 
 Реализует Multi-Level Caching стратегию:
-- Local Cache (in-memory): Fastest, TTL 300s
+- Local Cache (in-memory, O(1) LRU + TTL): Fastest, CACHE_LOCAL_TTL
 - Redis Cache (distributed): Fast, TTL 1800s
 - PostgreSQL: Source of truth, fallback при cache miss
 
@@ -12,8 +12,10 @@ Query Module - Cache Service.
 
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
 
 import redis.asyncio as aioredis
 from redis.asyncio import Redis
@@ -21,69 +23,167 @@ from redis.exceptions import RedisError, ConnectionError as RedisConnectionError
 
 from app.core.config import settings
 from app.core.exceptions import CacheUnavailableException, CacheCorruptedException
+from app.core.metrics import (
+    local_cache_bytes,
+    local_cache_entries,
+    local_cache_evictions_total,
+    local_cache_hits_total,
+    local_cache_misses_total,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class LocalCache:
     """
-    In-memory LRU кеш для ultra-fast доступа к метаданным.
+    In-memory LRU кеш с TTL для ultra-fast доступа к метаданным и результатам поиска.
 
-    Использует простой dict с timestamp для управления TTL.
-    Синхронный, так как работает только с локальной памятью.
+    OrderedDict в порядке использования: get/set/delete и вытеснение - O(1).
+    TTL считается по монотонным часам (не зависит от перевода системного времени).
+    Лимит - количество записей и (опционально) byte budget по оценке размера
+    значения. Синхронный, так как работает только с локальной памятью.
     """
 
-    def __init__(self, ttl_seconds: int = 300, max_size: int = 1000):
+    def __init__(
+        self,
+        ttl_seconds: int = 300,
+        max_size: int = 1000,
+        max_bytes: Optional[int] = None,
+        name: str = "default",
+        sizeof: Optional[Callable[[Any], int]] = None
+    ):
         """
         Инициализация local cache.
 
         Args:
             ttl_seconds: Time-to-live для записей (по умолчанию 5 минут)
             max_size: Максимальное количество записей в кеше
+            max_bytes: Byte budget (None - только лимит количества записей)
+            name: Имя кеша (label Prometheus метрик)
+            sizeof: Оценка размера значения в bytes (по умолчанию _estimate_size)
         """
         self.ttl_seconds = ttl_seconds
         self.max_size = max_size
-        self._cache: Dict[str, tuple[Any, datetime]] = {}
+        self.max_bytes = max_bytes
+        self.name = name
+        self._sizeof = sizeof or _estimate_size
+        # key → (value, expires_at по time.monotonic(), size)
+        self._cache: OrderedDict[str, tuple[Any, float, int]] = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._hits_metric = local_cache_hits_total.labels(cache=name)
+        self._misses_metric = local_cache_misses_total.labels(cache=name)
+        self._capacity_evictions_metric = local_cache_evictions_total.labels(cache=name, reason="capacity")
+        self._ttl_evictions_metric = local_cache_evictions_total.labels(cache=name, reason="ttl")
+        self._entries_metric = local_cache_entries.labels(cache=name)
+        self._bytes_metric = local_cache_bytes.labels(cache=name)
 
         logger.info(
             "Local cache initialized",
             extra={
+                "cache": name,
                 "ttl_seconds": ttl_seconds,
-                "max_size": max_size
+                "max_size": max_size,
+                "max_bytes": max_bytes
             }
         )
 
+    @property
+    def entries(self) -> int:
+        """Количество записей (включая ещё не удалённые истёкшие)."""
+        return len(self._cache)
+
+    @property
+    def size_bytes(self) -> int:
+        """Оценка занятой памяти (0 без byte budget)."""
+        return self._bytes
+
     def get(self, key: str) -> Optional[Any]:
         """Получение значения из local cache."""
-        if key not in self._cache:
+        entry = self._cache.get(key)
+        if entry is None:
+            self.misses += 1
+            self._misses_metric.inc()
             return None
 
-        value, timestamp = self._cache[key]
+        value, expires_at, _ = entry
 
         # Проверка TTL
-        if datetime.utcnow() - timestamp > timedelta(seconds=self.ttl_seconds):
-            del self._cache[key]
+        if time.monotonic() > expires_at:
+            self._remove(key)
+            self.misses += 1
+            self._misses_metric.inc()
+            self._ttl_evictions_metric.inc()
             return None
 
+        self._cache.move_to_end(key)
+        self.hits += 1
+        self._hits_metric.inc()
         return value
 
     def set(self, key: str, value: Any) -> None:
         """Сохранение значения в local cache."""
-        if len(self._cache) >= self.max_size:
-            # Удаляем самую старую запись
-            oldest_key = min(self._cache.items(), key=lambda x: x[1][1])[0]
-            del self._cache[oldest_key]
+        size = self._sizeof(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            # Значение больше всего budget - не кешируем
+            self.delete(key)
+            return
+
+        if key in self._cache:
+            self._remove(key)
+
+        self._cache[key] = (value, time.monotonic() + self.ttl_seconds, size)
+        self._bytes += size
 
-        self._cache[key] = (value, datetime.utcnow())
+        # Вытеснение least recently used записей
+        while len(self._cache) > self.max_size or (self.max_bytes and self._bytes > self.max_bytes):
+            _, (_, _, evicted_size) = self._cache.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+            self._capacity_evictions_metric.inc()
+
+        self._update_gauges()
 
     def delete(self, key: str) -> None:
         """Удаление записи из local cache."""
         if key in self._cache:
-            del self._cache[key]
+            self._remove(key)
+            self._update_gauges()
 
     def clear(self) -> None:
         """Очистка всего local cache."""
         self._cache.clear()
+        self._bytes = 0
+        self._update_gauges()
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._cache.pop(key)
+        self._bytes -= size
+
+    def _update_gauges(self) -> None:
+        self._entries_metric.set(len(self._cache))
+        self._bytes_metric.set(self._bytes)
+
+
+def _estimate_size(value: Any) -> int:
+    """
+    Оценка размера значения для byte budget.
+
+    str/bytes - длина, остальное - длина JSON представления
+    (метаданные и результаты поиска - JSON-совместимые dict/list).
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode())
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
 
 
 class RedisCacheService:
@@ -131,6 +231,16 @@ class RedisCacheService:
             self._is_available = False
             return False
 
+    async def get_client(self) -> Optional[Redis]:
+        """Redis клиент для структур данных вне key-value (None - Redis недоступен)."""
+        if not await self.is_available():
+            return None
+        return self._redis_client
+
+    def mark_unavailable(self) -> None:
+        """Отметка Redis недоступным после ошибки операции через get_client()."""
+        self._is_available = False
+
     async def get(self, key: str) -> Optional[str]:
         """Асинхронное получение значения из Redis."""
         if not await self.is_available():
@@ -153,12 +263,36 @@ class RedisCacheService:
             self._is_available = False
             return False
 
-    async def delete(self, key: str) -> bool:
-        """Асинхронное удаление записи из Redis."""
+    async def mget(self, keys: list[str]) -> Optional[list[Optional[str]]]:
+        """Асинхронное получение нескольких значений (None - Redis недоступен)."""
+        if not await self.is_available():
+            return None
+        try:
+            return await self._redis_client.mget(keys)
+        except (RedisError, RedisConnectionError):
+            self._is_available = False
+            return None
+
+    async def incr(self, keys: list[str]) -> bool:
+        """Асинхронный инкремент счётчиков одним pipeline."""
         if not await self.is_available():
             return False
         try:
-            result = await self._redis_client.delete(key)
+            async with self._redis_client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.incr(key)
+                await pipe.execute()
+            return True
+        except (RedisError, RedisConnectionError):
+            self._is_available = False
+            return False
+
+    async def delete(self, *keys: str) -> bool:
+        """Асинхронное удаление записей из Redis (одна команда DEL)."""
+        if not await self.is_available():
+            return False
+        try:
+            result = await self._redis_client.delete(*keys)
             return result > 0
         except (RedisError, RedisConnectionError):
             self._is_available = False
@@ -183,7 +317,12 @@ class CacheService:
 
     def __init__(self):
         """Инициализация multi-level cache."""
-        self.local_cache = LocalCache() if settings.cache.local_enabled else None
+        self.local_cache = LocalCache(
+            ttl_seconds=settings.cache.local_ttl,
+            max_size=settings.cache.local_max_size,
+            max_bytes=settings.cache.local_max_bytes or None,
+            name="file_metadata"
+        ) if settings.cache.local_enabled else None
         self.redis_cache = RedisCacheService() if settings.cache.redis_enabled else None
 
     async def initialize(self) -> None:
@@ -240,17 +379,20 @@ class CacheService:
             except (TypeError, ValueError) as e:
                 logger.warning(f"Failed to serialize metadata: {e}")
 
-    async def invalidate_file_metadata(self, file_id: str) -> None:
-        """Асинхронная инвалидация метаданных файла."""
-        cache_key = self._make_file_key(file_id)
+    async def invalidate_file_metadata(self, *file_ids: str) -> None:
+        """Асинхронная инвалидация метаданных файлов."""
+        cache_keys = [self._make_file_key(file_id) for file_id in file_ids]
+        if not cache_keys:
+            return
 
         # Local cache (синхронный)
         if self.local_cache:
-            self.local_cache.delete(cache_key)
+            for cache_key in cache_keys:
+                self.local_cache.delete(cache_key)
 
         # Redis cache (асинхронный)
         if self.redis_cache:
-            await self.redis_cache.delete(cache_key)
+            await self.redis_cache.delete(*cache_keys)
 
     async def close(self) -> None:
         """Асинхронное закрытие всех cache connections."""
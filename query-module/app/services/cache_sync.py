@@ -14,7 +14,7 @@ CacheSyncService отвечает за обновление file_metadata_cache
 
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional, Sequence, Union
 from uuid import UUID
 
 from sqlalchemy import select, delete, update
@@ -23,10 +23,48 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import get_db_session
 from app.db.models import FileMetadata
+from app.db.search_vector import search_vector_expression
 from app.schemas.events import FileMetadataEvent, FileCreatedEvent, FileUpdatedEvent, FileDeletedEvent
+from app.services.metadata_resolver import metadata_resolver
 
 logger = logging.getLogger(__name__)
 
+# Колонки, обновляемые upsert при конфликте по id (created_at сохраняется)
+_UPSERT_COLUMNS = (
+    "filename", "storage_filename", "file_size", "mime_type", "sha256_hash",
+    "username", "tags", "description", "storage_element_id", "storage_element_url",
+    "updated_at", "cache_updated_at", "search_vector",
+)
+
+
+def _file_values(event: Union[FileCreatedEvent, FileUpdatedEvent], now: datetime) -> Dict[str, Any]:
+    """Значения строки file_metadata_cache по событию с метаданными файла."""
+    metadata = event.metadata
+
+    # Получаем storage_element_url (будет добавлено в следующем спринте)
+    # TODO: Service Discovery для получения URL Storage Element
+    storage_element_url = f"http://storage-element-{event.storage_element_id}:8010"
+
+    return {
+        "id": str(event.file_id),
+        "filename": metadata.original_filename,
+        "storage_filename": metadata.storage_filename,
+        "file_size": metadata.file_size,
+        "mime_type": metadata.content_type,
+        "sha256_hash": metadata.checksum_sha256,
+        "username": metadata.uploaded_by,
+        "tags": metadata.tags,
+        "description": metadata.description,
+        "storage_element_id": str(event.storage_element_id),
+        "storage_element_url": storage_element_url,
+        "created_at": metadata.created_at,
+        "updated_at": metadata.updated_at or now,
+        "cache_updated_at": now,
+        "search_vector": search_vector_expression(
+            metadata.original_filename, metadata.tags, metadata.description
+        ),
+    }
+
 
 class CacheSyncService:
     """
@@ -64,46 +102,17 @@ class CacheSyncService:
             async for session in get_db_session():
                 metadata = event.metadata
 
-                # Получаем storage_element_url (будет добавлено в следующем спринте)
-                # TODO: Service Discovery для получения URL Storage Element
-                storage_element_url = f"http://storage-element-{event.storage_element_id}:8010"
-
                 # Используем PostgreSQL INSERT ... ON CONFLICT DO UPDATE (upsert)
-                stmt = insert(FileMetadata).values(
-                    id=str(event.file_id),
-                    filename=metadata.original_filename,
-                    storage_filename=metadata.storage_filename,
-                    file_size=metadata.file_size,
-                    mime_type=metadata.content_type,
-                    sha256_hash=metadata.checksum_sha256,
-                    username=metadata.uploaded_by,
-                    tags=metadata.tags,
-                    description=metadata.description,
-                    storage_element_id=str(event.storage_element_id),
-                    storage_element_url=storage_element_url,
-                    created_at=metadata.created_at,
-                    updated_at=metadata.updated_at or datetime.utcnow(),
-                    cache_updated_at=datetime.utcnow(),
-                ).on_conflict_do_update(
+                # search_vector - взвешенный tsvector (имя A, теги B, описание C)
+                insert_stmt = insert(FileMetadata).values(**_file_values(event, datetime.utcnow()))
+                stmt = insert_stmt.on_conflict_do_update(
                     index_elements=['id'],  # Primary key
-                    set_={
-                        'filename': metadata.original_filename,
-                        'storage_filename': metadata.storage_filename,
-                        'file_size': metadata.file_size,
-                        'mime_type': metadata.content_type,
-                        'sha256_hash': metadata.checksum_sha256,
-                        'username': metadata.uploaded_by,
-                        'tags': metadata.tags,
-                        'description': metadata.description,
-                        'storage_element_id': str(event.storage_element_id),
-                        'storage_element_url': storage_element_url,
-                        'updated_at': metadata.updated_at or datetime.utcnow(),
-                        'cache_updated_at': datetime.utcnow(),
-                    }
+                    set_={column: insert_stmt.excluded[column] for column in _UPSERT_COLUMNS}
                 )
 
                 await session.execute(stmt)
                 await session.commit()
+                await metadata_resolver.invalidate(str(event.file_id))
 
                 logger.info(
                     "Cache synced for file:created event",
@@ -165,10 +174,14 @@ class CacheSyncService:
                     storage_element_url=storage_element_url,
                     updated_at=metadata.updated_at or datetime.utcnow(),
                     cache_updated_at=datetime.utcnow(),
+                    search_vector=search_vector_expression(
+                        metadata.original_filename, metadata.tags, metadata.description
+                    ),
                 )
 
                 result = await session.execute(stmt)
                 await session.commit()
+                await metadata_resolver.invalidate(str(event.file_id))
 
                 if result.rowcount == 0:
                     logger.warning(
@@ -233,6 +246,7 @@ class CacheSyncService:
 
                 result = await session.execute(stmt)
                 await session.commit()
+                await metadata_resolver.invalidate(str(event.file_id))
 
                 if result.rowcount == 0:
                     logger.warning(
@@ -264,6 +278,72 @@ class CacheSyncService:
             )
             return False
 
+    async def apply_batch(
+        self,
+        upserts: Sequence[Union[FileCreatedEvent, FileUpdatedEvent]],
+        deleted_ids: Sequence[str],
+    ) -> bool:
+        """
+        Применение пакета событий в одной транзакции.
+
+        События должны быть предварительно слиты по file_id (последнее событие
+        файла): multi-row ON CONFLICT не допускает двух строк с одним id.
+        file:updated применяется как upsert - как и recovery сценарий
+        handle_file_updated для отсутствующего в cache файла.
+
+        Args:
+            upserts: События file:created/file:updated (один INSERT ... ON CONFLICT)
+            deleted_ids: UUID удалённых файлов (один DELETE ... WHERE id IN)
+
+        Returns:
+            bool: True если пакет применён, False при ошибке (транзакция откатывается)
+        """
+        file_ids = [str(event.file_id) for event in upserts] + list(deleted_ids)
+        if not file_ids:
+            return True
+
+        try:
+            async for session in get_db_session():
+                if upserts:
+                    now = datetime.utcnow()
+                    insert_stmt = insert(FileMetadata).values(
+                        [_file_values(event, now) for event in upserts]
+                    )
+                    stmt = insert_stmt.on_conflict_do_update(
+                        index_elements=['id'],
+                        set_={column: insert_stmt.excluded[column] for column in _UPSERT_COLUMNS}
+                    )
+                    await session.execute(stmt)
+
+                if deleted_ids:
+                    await session.execute(
+                        delete(FileMetadata).where(FileMetadata.id.in_(list(deleted_ids)))
+                    )
+
+                await session.commit()
+                await metadata_resolver.invalidate(*file_ids)
+
+                logger.info(
+                    "Cache synced for events batch",
+                    extra={
+                        "upserted": len(upserts),
+                        "deleted": len(deleted_ids),
+                    }
+                )
+
+                return True
+
+        except Exception as e:
+            logger.error(
+                "Failed to sync cache for events batch",
+                extra={
+                    "files": len(file_ids),
+                    "error": str(e),
+                },
+                exc_info=True
+            )
+            return False
+
 
 # Глобальный экземпляр CacheSyncService
 cache_sync_service = CacheSyncService()
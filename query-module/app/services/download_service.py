@@ -7,6 +7,7 @@ Query Module - Download Service.
 - Streaming downloads для больших файлов
 - SHA256 верификация целостности
 - Статистика скачиваний
+- Redirect на Storage Element по подписанному токену (без проксирования)
 """
 
 import logging
@@ -23,16 +24,16 @@ from app.schemas.download import (
     DownloadProgress,
     DownloadResponse
 )
-from app.db.models import DownloadStatistics
 from app.core.config import settings
+from app.core.download_token import sign_download_token
 from app.core.exceptions import (
     DownloadException,
     FileNotFoundException,
-    StorageElementUnavailableException,
     RangeNotSatisfiableException,
     DownloadInterruptedException
 )
-from app.services.cache_service import cache_service
+from app.services.download_stats import download_stats_writer
+from app.services.metadata_resolver import metadata_resolver
 
 logger = logging.getLogger(__name__)
 
@@ -149,7 +150,7 @@ class DownloadService:
         auth_token: Optional[str] = None
     ) -> DownloadMetadata:
         """
-        Получение метаданных файла из Storage Element.
+        Получение метаданных файла (кеш → PostgreSQL → Storage Element).
 
         Args:
             file_id: UUID файла
@@ -163,67 +164,85 @@ class DownloadService:
             FileNotFoundException: Файл не найден в Storage Element
             StorageElementUnavailableException: Storage Element недоступен
         """
-        # Проверка кеша
-        cached_metadata = cache_service.get_file_metadata(file_id)
-        if cached_metadata:
-            return DownloadMetadata(
-                id=cached_metadata["id"],
-                filename=cached_metadata["filename"],
-                file_size=cached_metadata["file_size"],
-                sha256_hash=cached_metadata["sha256_hash"],
-                storage_element_url=storage_element_url,
-                supports_range_requests=True
+        metadata = await metadata_resolver.resolve(
+            file_id,
+            storage_element_url=storage_element_url,
+            auth_token=auth_token
+        )
+        if metadata is None:
+            raise FileNotFoundException(
+                f"File not found: {file_id}",
+                details={"file_id": file_id}
             )
 
-        # Запрос к Storage Element API
-        client = await self._get_http_client()
-        url = f"{storage_element_url}/api/files/{file_id}/metadata"
+        return DownloadMetadata(
+            id=metadata["id"],
+            filename=metadata["filename"],
+            file_size=metadata["file_size"],
+            mime_type=metadata.get("mime_type"),
+            sha256_hash=metadata["sha256_hash"],
+            created_at=metadata["created_at"],
+            storage_element_id=metadata.get("storage_element_id") or "",
+            storage_element_url=metadata.get("storage_element_url") or storage_element_url,
+            download_url=self._download_url(storage_element_url, file_id),
+            supports_range_requests=True
+        )
 
-        headers = {}
-        if auth_token:
-            headers["Authorization"] = f"Bearer {auth_token}"
+    @staticmethod
+    def _download_url(storage_element_url: str, file_id: str) -> str:
+        """URL скачивания файла на Storage Element."""
+        return f"{storage_element_url.rstrip('/')}/api/v1/files/{file_id}/download"
 
-        try:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-
-            data = response.json()
-
-            metadata = DownloadMetadata(
-                id=data["id"],
-                filename=data["filename"],
-                file_size=data["file_size"],
-                sha256_hash=data["sha256_hash"],
-                storage_element_url=storage_element_url,
-                supports_range_requests=True
-            )
+    @staticmethod
+    def public_storage_element_url(storage_element_id: Optional[str]) -> Optional[str]:
+        """
+        Публичный base URL Storage Element для redirect режима.
 
-            # Кеширование метаданных
-            cache_service.set_file_metadata(file_id, data)
+        storage_element_url из Service Discovery - внутренний адрес кластера,
+        клиенту он недоступен. Redirect возможен только на SE из DOWNLOAD_PUBLIC_URLS.
 
-            logger.info(
-                "File metadata retrieved",
-                extra={"file_id": file_id, "filename": metadata.filename}
-            )
+        Args:
+            storage_element_id: ID Storage Element файла
 
-            return metadata
+        Returns:
+            Optional[str]: Публичный URL или None (скачивание через proxy)
+        """
+        if not storage_element_id:
+            return None
+        return settings.download.public_urls.get(storage_element_id)
 
-        except HTTPStatusError as e:
-            if e.response.status_code == 404:
-                raise FileNotFoundException(
-                    f"File not found: {file_id}",
-                    details={"file_id": file_id}
-                )
-            raise StorageElementUnavailableException(
-                f"Storage Element error: {e.response.status_code}",
-                details={"status_code": e.response.status_code}
-            )
+    def build_redirect_url(
+        self,
+        file_id: str,
+        public_url: str,
+        range_request: Optional[RangeRequest] = None
+    ) -> str:
+        """
+        URL прямого скачивания с Storage Element с подписанным токеном.
 
-        except RequestError as e:
-            raise StorageElementUnavailableException(
-                f"Storage Element unavailable: {str(e)}",
-                details={"error": str(e)}
-            )
+        Токен ограничен file_id и диапазоном байт range_request (если задан)
+        и действует DOWNLOAD_TOKEN_TTL_SECONDS; SE проверяет его локально.
+
+        Args:
+            file_id: UUID файла
+            public_url: Публичный base URL Storage Element (public_storage_element_url)
+            range_request: Разрешённый диапазон (None - весь файл)
+
+        Returns:
+            str: URL для redirect ответа клиенту
+        """
+        byte_range = None
+        if range_request is not None:
+            byte_range = (range_request.start, range_request.end)
+
+        token = sign_download_token(
+            file_id=file_id,
+            signing_key=settings.download.signing_key,
+            ttl_seconds=settings.download.token_ttl_seconds,
+            byte_range=byte_range
+        )
+
+        return f"{self._download_url(public_url, file_id)}?token={token}"
 
     async def download_file_stream(
         self,
@@ -231,17 +250,24 @@ class DownloadService:
         storage_element_url: str,
         auth_token: Optional[str] = None,
         range_request: Optional[RangeRequest] = None,
-        chunk_size: int = 8192
+        chunk_size: Optional[int] = None,
+        storage_element_id: Optional[str] = None,
+        username: Optional[str] = None
     ) -> AsyncGenerator[bytes, None]:
         """
-        Streaming скачивание файла из Storage Element.
+        Streaming скачивание файла из Storage Element (proxy режим).
+
+        Без auth_token при настроенном DOWNLOAD_SIGNING_KEY запрос к SE
+        аутентифицируется подписанным токеном на этот файл.
 
         Args:
             file_id: UUID файла
             storage_element_url: Base URL Storage Element
             auth_token: JWT токен для аутентификации
             range_request: HTTP Range request для resumable download
-            chunk_size: Размер chunk для streaming (по умолчанию 8KB)
+            chunk_size: Размер chunk для streaming (по умолчанию DOWNLOAD_CHUNK_SIZE)
+            storage_element_id: ID Storage Element для статистики (по умолчанию URL)
+            username: Пользователь для статистики
 
         Yields:
             bytes: Chunks файла
@@ -252,11 +278,19 @@ class DownloadService:
             DownloadInterruptedException: Скачивание прервано
         """
         client = await self._get_http_client()
-        url = f"{storage_element_url}/api/files/{file_id}/download"
+        url = self._download_url(storage_element_url, file_id)
+        chunk_size = chunk_size or settings.download.chunk_size
 
         headers = {}
+        params = {}
         if auth_token:
             headers["Authorization"] = f"Bearer {auth_token}"
+        elif settings.download.redirect_enabled:
+            params["token"] = sign_download_token(
+                file_id=file_id,
+                signing_key=settings.download.signing_key,
+                ttl_seconds=settings.download.token_ttl_seconds
+            )
 
         if range_request:
             headers["Range"] = range_request.to_header_value()
@@ -265,7 +299,7 @@ class DownloadService:
         bytes_transferred = 0
 
         try:
-            async with client.stream("GET", url, headers=headers) as response:
+            async with client.stream("GET", url, headers=headers, params=params) as response:
                 # Проверка статуса
                 if response.status_code == 404:
                     raise FileNotFoundException(
@@ -293,7 +327,8 @@ class DownloadService:
                 bytes_transferred=bytes_transferred,
                 download_time_ms=download_time_ms,
                 was_resumed=range_request is not None,
-                storage_element_id=storage_element_url  # TODO: extract SE ID
+                storage_element_id=storage_element_id or storage_element_url,
+                username=username
             )
 
             logger.info(
@@ -334,9 +369,8 @@ class DownloadService:
             DownloadProgress: Информация о прогрессе
         """
         # Получение метаданных для total_size
-        cached_metadata = cache_service.get_file_metadata(file_id)
+        cached_metadata = await metadata_resolver.resolve(file_id)
         if not cached_metadata:
-            # TODO: fetch from database or Storage Element
             raise FileNotFoundException(
                 f"File metadata not found: {file_id}",
                 details={"file_id": file_id}
@@ -363,7 +397,9 @@ class DownloadService:
         username: Optional[str] = None
     ) -> None:
         """
-        Запись статистики скачивания в базу данных.
+        Постановка статистики скачивания в очередь фоновой записи.
+
+        Не ожидает PostgreSQL: запись выполняет DownloadStatsWriter пакетами.
 
         Args:
             file_id: UUID файла
@@ -374,14 +410,22 @@ class DownloadService:
             username: Пользователь (optional)
         """
         try:
-            # TODO: implement async database write
+            queued = download_stats_writer.record(
+                file_id=file_id,
+                bytes_transferred=bytes_transferred,
+                download_time_ms=download_time_ms,
+                was_resumed=was_resumed,
+                storage_element_id=storage_element_id,
+                username=username
+            )
             logger.debug(
                 "Download stats recorded",
                 extra={
                     "file_id": file_id,
                     "bytes": bytes_transferred,
                     "time_ms": download_time_ms,
-                    "resumed": was_resumed
+                    "resumed": was_resumed,
+                    "queued": queued
                 }
             )
 
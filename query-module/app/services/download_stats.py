@@ -0,0 +1,202 @@
+"""
+Query Module - Download Statistics Writer.
+
+Статистика скачиваний пишется в PostgreSQL фоново (BatchWriter):
+- Пакет сырых записей - один multi-row INSERT в download_statistics
+- В той же транзакции - приращения почасовых агрегатов
+  download_statistics_hourly (INSERT ... ON CONFLICT DO UPDATE)
+
+Admin dashboard читает агрегаты (get_file_stats, get_hourly_stats)
+без сканирования сырых записей.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.db.database import get_db_session
+from app.db.models import DownloadStatistics, DownloadStatisticsHourly
+from app.schemas.download import DownloadStats
+from app.services.batch_writer import BatchWriter
+
+logger = logging.getLogger(__name__)
+
+# Ключ почасового агрегата: (hour, file_id, storage_element_id)
+HourKey = Tuple[datetime, str, str]
+
+
+def _hour(moment: datetime) -> datetime:
+    """Начало часа (UTC)."""
+    return moment.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def rollup(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Агрегация пакета записей по (час, файл, Storage Element).
+
+    Args:
+        records: Записи download_statistics
+
+    Returns:
+        List[Dict[str, Any]]: Строки download_statistics_hourly (приращения)
+    """
+    rows: Dict[HourKey, Dict[str, Any]] = {}
+
+    for record in records:
+        key = (_hour(record["created_at"]), record["file_id"], record["storage_element_id"])
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = {
+                "hour": key[0],
+                "file_id": key[1],
+                "storage_element_id": key[2],
+                "download_count": 0,
+                "resumed_count": 0,
+                "bytes_transferred": 0,
+                "download_time_ms": 0,
+                "last_download_at": record["created_at"],
+            }
+
+        row["download_count"] += 1
+        row["resumed_count"] += int(record["was_resumed"])
+        row["bytes_transferred"] += record["bytes_transferred"]
+        row["download_time_ms"] += record["download_time_ms"]
+        row["last_download_at"] = max(row["last_download_at"], record["created_at"])
+
+    return list(rows.values())
+
+
+class DownloadStatsWriter(BatchWriter[Dict[str, Any]]):
+    """
+    Фоновая запись статистики скачиваний.
+
+    Usage:
+        download_stats_writer.record(file_id, bytes_transferred, ...)
+        stats = await download_stats_writer.get_file_stats(file_id)
+    """
+
+    def __init__(self):
+        super().__init__(
+            name="download_stats",
+            queue_size=settings.stats.queue_size,
+            flush_size=settings.stats.flush_size,
+            flush_interval_ms=settings.stats.flush_interval_ms,
+            enabled=settings.stats.enabled,
+        )
+
+    def record(
+        self,
+        file_id: str,
+        bytes_transferred: int,
+        download_time_ms: int,
+        was_resumed: bool,
+        storage_element_id: str,
+        username: Optional[str] = None
+    ) -> bool:
+        """
+        Постановка записи о скачивании в очередь (без ожидания PostgreSQL).
+
+        Returns:
+            bool: False если запись отброшена
+        """
+        return self.submit({
+            "file_id": file_id,
+            "bytes_transferred": bytes_transferred,
+            "download_time_ms": download_time_ms,
+            "was_resumed": was_resumed,
+            "username": username,
+            # Столбец String(50): URL Storage Element может быть длиннее
+            "storage_element_id": storage_element_id[:50],
+            # Время скачивания, а не записи пакета (server_default now())
+            "created_at": datetime.now(timezone.utc),
+        })
+
+    async def write(self, batch: List[Dict[str, Any]]) -> None:
+        """Multi-row INSERT сырых записей и приращение агрегатов в одной транзакции."""
+        async for session in get_db_session():
+            await session.execute(insert(DownloadStatistics).values(batch))
+
+            insert_stmt = insert(DownloadStatisticsHourly).values(rollup(batch))
+            table = DownloadStatisticsHourly.__table__
+            stmt = insert_stmt.on_conflict_do_update(
+                index_elements=['hour', 'file_id', 'storage_element_id'],
+                set_={
+                    column: table.c[column] + insert_stmt.excluded[column]
+                    for column in ('download_count', 'resumed_count', 'bytes_transferred', 'download_time_ms')
+                } | {
+                    'last_download_at': func.greatest(
+                        table.c.last_download_at, insert_stmt.excluded.last_download_at
+                    )
+                }
+            )
+            await session.execute(stmt)
+
+        logger.debug("Download stats batch written", extra={"records": len(batch)})
+
+    async def get_file_stats(self, file_id: str) -> DownloadStats:
+        """
+        Статистика скачиваний файла по почасовым агрегатам.
+
+        Args:
+            file_id: UUID файла
+
+        Returns:
+            DownloadStats: Количество скачиваний, bytes, последнее скачивание
+        """
+        stmt = select(
+            func.coalesce(func.sum(DownloadStatisticsHourly.download_count), 0),
+            func.coalesce(func.sum(DownloadStatisticsHourly.bytes_transferred), 0),
+            func.max(DownloadStatisticsHourly.last_download_at),
+        ).where(DownloadStatisticsHourly.file_id == file_id)
+
+        async for session in get_db_session():
+            download_count, total_bytes, last_download_at = (await session.execute(stmt)).one()
+
+        return DownloadStats(
+            file_id=file_id,
+            download_count=download_count,
+            total_bytes_served=total_bytes,
+            last_download_at=last_download_at,
+        )
+
+    async def get_hourly_stats(
+        self,
+        since: datetime,
+        until: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Скачивания по часам для dashboard (все файлы, range scan по первичному ключу).
+
+        Args:
+            since: Начало периода
+            until: Конец периода (по умолчанию - сейчас)
+
+        Returns:
+            List[Dict[str, Any]]: [{hour, download_count, resumed_count, bytes_transferred,
+                download_time_ms}] по возрастанию hour
+        """
+        columns = ('download_count', 'resumed_count', 'bytes_transferred', 'download_time_ms')
+        stmt = (
+            select(
+                DownloadStatisticsHourly.hour,
+                *[func.sum(getattr(DownloadStatisticsHourly, column)).label(column) for column in columns]
+            )
+            .where(DownloadStatisticsHourly.hour >= _hour(since))
+            .group_by(DownloadStatisticsHourly.hour)
+            .order_by(DownloadStatisticsHourly.hour)
+        )
+        if until is not None:
+            stmt = stmt.where(DownloadStatisticsHourly.hour <= until)
+
+        async for session in get_db_session():
+            rows = (await session.execute(stmt)).mappings().all()
+
+        return [dict(row) for row in rows]
+
+
+# Singleton instance
+download_stats_writer = DownloadStatsWriter()
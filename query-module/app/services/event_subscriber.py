@@ -12,20 +12,45 @@ EventSubscriber отвечает за подписку на events от Admin Mo
 - Consumer Groups с ACK mechanism для guaranteed delivery
 - Pending Entry List (PEL) для retry failed events
 - EventSubscriber → CacheSyncService → PostgreSQL cache update
+- EventSubscriber → SearchResultCache generation counters (инвалидация кеша поиска)
+- EventSubscriber → SuggestIndex (счётчики автодополнения: значения до и после события)
 - Background asyncio task с graceful degradation при Redis unavailable
 
 Advantages over Pub/Sub:
 - Events persisted in stream (не теряются при reconnect)
 - Consumer Groups с ACK для tracking обработки
 - PEL для automatic retry failed events
-- Batch processing для efficiency (count=10)
+- Batch processing для efficiency (EVENT_BATCH_SIZE)
+
+Пакетный режим (EVENT_BATCH_ENABLED):
+- События пакета сливаются по file_id (применяется последнее событие файла)
+- Один INSERT ... ON CONFLICT и один DELETE на пакет в одной транзакции
+- Один XACK на все события пакета
+- Ошибка пакета - повторная обработка событий по одному (неисправное событие
+  остаётся в PEL, не блокируя остальные)
+
+Порядок событий файла при retry из PEL:
+- Pending событие, после которого уже применено более новое событие того же
+  file_id, подтверждается без применения (устаревший file:updated после
+  file:deleted не возвращает запись в кеш)
+- Последнее применённое событие файла - Redis hash {stream}:{group}:applied:{день}
+  (file_id → stream ID), пишется вместе с XACK; проверка pending событий -
+  HMGET за текущий и предыдущий день, без сканирования stream
+
+Partition streams (EVENT_STREAM_PARTITIONS > 1):
+- Admin Module публикует события файла в stream {stream}:{crc32(file_id) % N}
+- Экземпляры делят partitions через PartitionCoordinator (lease в Redis),
+  каждый partition читает один экземпляр - порядок событий файла сохраняется
+- Перераспределение при запуске/остановке экземпляров; pending события
+  захваченного partition обрабатываются до новых (XAUTOCLAIM)
 """
 
 import logging
 import asyncio
 import json
+import time
 import uuid
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 from datetime import datetime
 
 from redis.asyncio import Redis
@@ -33,11 +58,84 @@ import redis.exceptions
 
 from app.core.redis import get_redis
 from app.core.config import settings
+from app.core.metrics import (
+    event_batch_duration_seconds,
+    event_batch_size,
+    event_coalesced_total,
+    event_consumer_lag_events,
+    event_consumer_lag_seconds,
+    event_superseded_total,
+)
 from app.schemas.events import FileCreatedEvent, FileUpdatedEvent, FileDeletedEvent
 from app.services.cache_sync import cache_sync_service
+from app.services.partition_coordinator import PartitionCoordinator
+from app.services.search_cache import search_result_cache
+from app.services.suggest_index import file_terms, suggest_index
 
 logger = logging.getLogger(__name__)
 
+# Hash последних применённых событий файлов: новый каждые сутки, хранится двое
+# суток (более старые pending события применяются без проверки порядка)
+APPLIED_BUCKET_SECONDS = 86400
+APPLIED_TTL_SECONDS = 2 * APPLIED_BUCKET_SECONDS
+
+FileEvent = Union[FileCreatedEvent, FileUpdatedEvent, FileDeletedEvent]
+
+
+def _parse_event(event_data: dict) -> Optional[FileEvent]:
+    """
+    Разбор события из Redis Stream (flat dictionary) в Pydantic модель.
+
+    Returns:
+        Optional[FileEvent]: Событие или None для события без типа / неизвестного типа
+
+    Raises:
+        ValueError: Повреждённое событие (остаётся в PEL)
+    """
+    event_type = event_data.get("event_type")
+
+    if event_type in ("file:created", "file:updated"):
+        metadata_json = event_data.get("metadata")
+        if not metadata_json:
+            raise ValueError("Event missing metadata")
+
+        event_model = FileCreatedEvent if event_type == "file:created" else FileUpdatedEvent
+        return event_model(
+            event_type=event_type,
+            timestamp=datetime.fromisoformat(event_data.get("timestamp")),
+            file_id=event_data.get("file_id"),
+            storage_element_id=event_data.get("storage_element_id"),
+            metadata=json.loads(metadata_json),
+        )
+
+    if event_type == "file:deleted":
+        return FileDeletedEvent(
+            event_type=event_type,
+            timestamp=datetime.fromisoformat(event_data.get("timestamp")),
+            file_id=event_data.get("file_id"),
+            storage_element_id=event_data.get("storage_element_id"),
+            deleted_at=datetime.fromisoformat(event_data.get("deleted_at")),
+        )
+
+    return None
+
+
+def _stream_id_key(event_id: str) -> Tuple[int, int]:
+    """Ключ сравнения stream ID ("{unix ms}-{seq}")."""
+    timestamp_ms, _, seq = event_id.partition("-")
+    return int(timestamp_ms), int(seq or 0)
+
+
+def _applied_bucket() -> int:
+    """Номер суток для hash последних применённых событий."""
+    return int(time.time() // APPLIED_BUCKET_SECONDS)
+
+
+def _event_age_seconds(event_id: str) -> float:
+    """Возраст события по его stream ID ("{unix ms}-{seq}")."""
+    timestamp_ms = int(event_id.split("-", 1)[0])
+    return max(0.0, time.time() - timestamp_ms / 1000)
+
 
 class EventSubscriber:
     """
@@ -68,16 +166,22 @@ class EventSubscriber:
         self._task: Optional[asyncio.Task] = None
         self._pending_task: Optional[asyncio.Task] = None
 
-        # Redis Streams configuration (будет взято из settings после добавления в config)
+        # Redis Streams configuration (EVENT_*)
         self.enabled = True
-        self.stream_name = "file-events"
-        self.consumer_group = "query-module-consumers"
+        self.stream_name = settings.events.stream_name
+        self.consumer_group = settings.events.consumer_group
         self.consumer_name = f"query-module-{uuid.uuid4().hex[:8]}"
         self.last_id = ">"  # Read only new messages (не обработанные этой Consumer Group)
 
         # Batch processing configuration
-        self.batch_size = 10  # Количество events читаемых за раз
-        self.block_ms = 5000  # Block для XREADGROUP (5 секунд)
+        self.batch_enabled = settings.events.batch_enabled
+        self.batch_size = settings.events.batch_size  # Количество events читаемых за раз
+        self.block_ms = settings.events.block_ms  # Block для XREADGROUP
+
+        # Partition streams (1 - единый stream, все экземпляры в одной Consumer Group)
+        self.stream_partitions = settings.events.stream_partitions
+        self.partition_lease_seconds = settings.events.partition_lease_seconds
+        self._coordinator: Optional[PartitionCoordinator] = None
 
         # PEL retry configuration
         self.pending_retry_ms = 60000  # 60 секунд idle time для retry
@@ -97,29 +201,17 @@ class EventSubscriber:
         try:
             self.redis = await get_redis()
 
-            # Создаем Consumer Group если не существует
-            try:
-                await self.redis.xgroup_create(
-                    name=self.stream_name,
-                    groupname=self.consumer_group,
-                    id="0",  # Start from beginning для новой group
-                    mkstream=True,  # Создать stream если не существует
-                )
-                logger.info(
-                    "Consumer group created",
-                    extra={
-                        "stream_name": self.stream_name,
-                        "consumer_group": self.consumer_group,
-                    }
-                )
-            except redis.exceptions.ResponseError as e:
-                if "BUSYGROUP" not in str(e):
-                    raise
-                # Group already exists - OK
-                logger.info(
-                    "Consumer group already exists",
-                    extra={"consumer_group": self.consumer_group}
+            if self.stream_partitions > 1:
+                # Consumer Groups создаются при захвате partition
+                self._coordinator = PartitionCoordinator(
+                    self.redis,
+                    self.stream_name,
+                    self.stream_partitions,
+                    self.consumer_name,
+                    self.partition_lease_seconds,
                 )
+            else:
+                await self._ensure_group(self.stream_name)
 
             self._initialized = True
 
@@ -133,21 +225,96 @@ class EventSubscriber:
                     "stream_name": self.stream_name,
                     "consumer_group": self.consumer_group,
                     "consumer_name": self.consumer_name,
+                    "batch_enabled": self.batch_enabled,
                     "batch_size": self.batch_size,
                     "block_ms": self.block_ms,
+                    "stream_partitions": self.stream_partitions,
                 }
             )
         except Exception as e:
             logger.error(f"Failed to initialize EventSubscriber: {e}", exc_info=True)
             self._initialized = False
 
+    async def _ensure_group(self, stream_name: str) -> None:
+        """Создание Consumer Group для stream, если не существует."""
+        try:
+            await self.redis.xgroup_create(
+                name=stream_name,
+                groupname=self.consumer_group,
+                id="0",  # Start from beginning для новой group
+                mkstream=True,  # Создать stream если не существует
+            )
+            logger.info(
+                "Consumer group created",
+                extra={
+                    "stream_name": stream_name,
+                    "consumer_group": self.consumer_group,
+                }
+            )
+        except redis.exceptions.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+            # Group already exists - OK
+            logger.info(
+                "Consumer group already exists",
+                extra={"stream_name": stream_name, "consumer_group": self.consumer_group}
+            )
+
+    def _streams(self) -> List[str]:
+        """Streams, читаемые этим экземпляром (захваченные partitions или единый stream)."""
+        if self._coordinator is None:
+            return [self.stream_name]
+        return self._coordinator.streams()
+
+    async def _rebalance(self) -> None:
+        """
+        Перераспределение partitions между пакетами.
+
+        Для захваченного partition создаётся Consumer Group и обрабатываются
+        pending события предыдущего владельца - до новых событий partition.
+        """
+        acquired, _ = await self._coordinator.rebalance()
+
+        for partition in sorted(acquired):
+            stream_name = self._coordinator.stream(partition)
+            await self._ensure_group(stream_name)
+            await self._claim_pending(stream_name)
+
+    async def _claim_pending(self, stream_name: str) -> None:
+        """Захват и обработка всех pending событий stream (XAUTOCLAIM)."""
+        start_id = "0-0"
+        while True:
+            result = await self.redis.xautoclaim(
+                name=stream_name,
+                groupname=self.consumer_group,
+                consumername=self.consumer_name,
+                min_idle_time=0,
+                start_id=start_id,
+                count=self.batch_size,
+            )
+            start_id, claimed = result[0], result[1]
+
+            # Удалённые из stream записи (MAXLEN) приходят без данных
+            messages = [(event_id, event_data) for event_id, event_data in claimed if event_data]
+            messages = await self._skip_superseded(stream_name, messages)
+            if messages:
+                logger.info(
+                    "Processing pending events of acquired partition",
+                    extra={"stream_name": stream_name, "events": len(messages)}
+                )
+                await self._process_batch(messages, stream_name)
+
+            if start_id in ("0-0", b"0-0"):
+                break
+
     async def _consume_loop(self) -> None:
         """
         Основной loop для чтения events из Redis Stream через Consumer Groups.
 
         Работает непрерывно в background task:
         1. XREADGROUP для чтения batch events (блокирующий read с timeout)
-        2. Обработка каждого event через _handle_event
+        2. Обработка пакета через _process_batch (batch_enabled) или
+           каждого event через _handle_event
         3. XACK для подтверждения успешной обработки
         4. Graceful retry при ошибках
 
@@ -166,49 +333,49 @@ class EventSubscriber:
                     await asyncio.sleep(5)
                     continue
 
+                block_ms = self.block_ms
+                if self._coordinator is not None:
+                    # Heartbeat partitions между пакетами (lease не истекает во время XREADGROUP)
+                    if self._coordinator.rebalance_due():
+                        await self._rebalance()
+                    block_ms = min(block_ms, int(self._coordinator.heartbeat_interval * 1000))
+
+                streams = self._streams()
+                if not streams:
+                    # Все partitions заняты другими экземплярами
+                    await asyncio.sleep(block_ms / 1000)
+                    continue
+
                 # XREADGROUP BLOCK - efficient blocking read
                 # Читаем batch events, блокируемся на block_ms если нет новых
                 events = await self.redis.xreadgroup(
                     groupname=self.consumer_group,
                     consumername=self.consumer_name,
-                    streams={self.stream_name: self.last_id},
+                    streams={stream_name: self.last_id for stream_name in streams},
                     count=self.batch_size,
-                    block=self.block_ms,
+                    block=block_ms,
                 )
 
                 if not events:
-                    # Timeout, нет новых events - это нормально
+                    # Timeout, нет новых events - это нормально (отставания нет)
+                    event_consumer_lag_seconds.set(0)
+                    event_consumer_lag_events.set(0)
                     continue
 
-                # Process events batch
+                # Process events batch (XACK - в stream события)
+                lag_seconds = 0.0
                 for stream_name, messages in events:
-                    for event_id, event_data in messages:
-                        try:
-                            # Обрабатываем event
-                            await self._handle_event(event_id, event_data)
-
-                            # ACK successful processing
-                            await self.redis.xack(
-                                self.stream_name,
-                                self.consumer_group,
-                                event_id,
-                            )
-
-                            logger.debug(
-                                "Event processed and acknowledged",
-                                extra={"event_id": event_id}
-                            )
-
-                        except Exception as e:
-                            logger.error(
-                                "Failed to process event, will retry from PEL",
-                                extra={
-                                    "event_id": event_id,
-                                    "error": str(e),
-                                },
-                                exc_info=True
-                            )
-                            # Event остается в PEL, будет retry через _pending_retry_loop
+                    event_batch_size.observe(len(messages))
+                    lag_seconds = max(lag_seconds, _event_age_seconds(messages[-1][0]))
+
+                    if self.batch_enabled:
+                        await self._process_batch(messages, stream_name)
+                    else:
+                        for event_id, event_data in messages:
+                            await self._process_message(event_id, event_data, stream_name)
+
+                event_consumer_lag_seconds.set(lag_seconds)
+                await self._update_lag()
 
             except asyncio.CancelledError:
                 logger.info("Consumer loop cancelled")
@@ -225,6 +392,174 @@ class EventSubscriber:
         self._running = False
         logger.info("Consumer loop stopped")
 
+    async def _process_message(
+        self,
+        event_id: str,
+        event_data: dict,
+        stream_name: Optional[str] = None,
+    ) -> None:
+        """
+        Обработка и XACK одного event (ошибка - event остаётся в PEL).
+
+        Args:
+            event_id: ID события в stream
+            event_data: Данные события
+            stream_name: Stream события (по умолчанию - единый stream)
+        """
+        stream_name = stream_name or self.stream_name
+        try:
+            # Обрабатываем event
+            await self._handle_event(event_id, event_data)
+
+            # ACK successful processing
+            await self._record_applied(stream_name, {event_data.get("file_id"): event_id})
+            await self.redis.xack(
+                stream_name,
+                self.consumer_group,
+                event_id,
+            )
+
+            logger.debug(
+                "Event processed and acknowledged",
+                extra={"event_id": event_id}
+            )
+
+        except Exception as e:
+            logger.error(
+                "Failed to process event, will retry from PEL",
+                extra={
+                    "event_id": event_id,
+                    "error": str(e),
+                },
+                exc_info=True
+            )
+            # Event остается в PEL, будет retry через _pending_retry_loop
+
+    async def _process_batch(
+        self,
+        messages: List[Tuple[str, dict]],
+        stream_name: Optional[str] = None,
+    ) -> None:
+        """
+        Пакетная обработка events из XREADGROUP.
+
+        1. Разбор events и слияние по file_id (последнее событие файла)
+        2. CacheSyncService.apply_batch - один upsert и один DELETE в транзакции
+        3. Инвалидация кеша поиска и обновление автодополнения по пакету
+        4. Один XACK на все обработанные events
+
+        Повреждённые events не подтверждаются и остаются в PEL.
+        При ошибке применения пакета events обрабатываются по одному.
+
+        Args:
+            messages: [(event_id, event_data)] в порядке stream
+            stream_name: Stream событий (по умолчанию - единый stream)
+        """
+        started = time.perf_counter()
+        stream_name = stream_name or self.stream_name
+
+        latest: Dict[str, FileEvent] = {}
+        latest_ids: Dict[str, str] = {}
+        ack_ids: List[str] = []
+
+        for event_id, event_data in messages:
+            try:
+                event = _parse_event(event_data)
+            except Exception as e:
+                logger.error(
+                    "Failed to parse event, will retry from PEL",
+                    extra={"event_id": event_id, "error": str(e)},
+                    exc_info=True
+                )
+                continue
+
+            ack_ids.append(event_id)
+
+            if event is None:
+                logger.warning(
+                    "Unknown event type",
+                    extra={"event_type": event_data.get("event_type"), "event_id": event_id}
+                )
+                continue
+
+            file_id = str(event.file_id)
+            if latest.pop(file_id, None) is not None:
+                event_coalesced_total.inc()
+            latest[file_id] = event
+            latest_ids[file_id] = event_id
+
+        if latest:
+            terms_before = await suggest_index.get_files_terms(list(latest))
+
+            upserts = [event for event in latest.values() if not isinstance(event, FileDeletedEvent)]
+            deleted_ids = [file_id for file_id, event in latest.items() if isinstance(event, FileDeletedEvent)]
+
+            if not await cache_sync_service.apply_batch(upserts, deleted_ids):
+                logger.warning(
+                    "Events batch failed, processing events one by one",
+                    extra={"events": len(messages)}
+                )
+                for event_id, event_data in messages:
+                    await self._process_message(event_id, event_data, stream_name)
+                return
+
+            await self._invalidate_search_cache(latest.values())
+            await suggest_index.update_many(
+                (
+                    file_id,
+                    terms_before.get(file_id),
+                    None if isinstance(event, FileDeletedEvent) else file_terms(
+                        event.metadata.original_filename, event.metadata.tags, event.metadata.uploaded_by
+                    ),
+                )
+                for file_id, event in latest.items()
+            )
+
+        if latest:
+            await self._record_applied(stream_name, latest_ids)
+        if ack_ids:
+            await self.redis.xack(stream_name, self.consumer_group, *ack_ids)
+
+        event_batch_duration_seconds.observe(time.perf_counter() - started)
+        logger.debug(
+            "Events batch processed and acknowledged",
+            extra={
+                "stream_name": stream_name,
+                "events": len(messages),
+                "files": len(latest),
+                "acknowledged": len(ack_ids),
+            }
+        )
+
+    async def _invalidate_search_cache(self, events: Iterable[FileEvent]) -> None:
+        """Инвалидация кеша результатов поиска по пакету: один инкремент на тип события."""
+        created_tags: Set[str] = set()
+        event_types: Set[str] = set()
+        for event in events:
+            event_types.add(event.event_type)
+            if isinstance(event, FileCreatedEvent):
+                created_tags.update(event.metadata.tags or [])
+
+        if "file:created" in event_types:
+            await search_result_cache.invalidate("file:created", sorted(created_tags))
+        for event_type in ("file:updated", "file:deleted"):
+            if event_type in event_types:
+                await search_result_cache.invalidate(event_type)
+
+    async def _update_lag(self) -> None:
+        """Gauge отставания consumer group по читаемым streams (XINFO GROUPS lag, Redis 7+)."""
+        lag = 0
+        try:
+            for stream_name in self._streams():
+                for group in await self.redis.xinfo_groups(stream_name):
+                    if group.get("name") == self.consumer_group and group.get("lag") is not None:
+                        lag += group["lag"]
+        except redis.exceptions.RedisError as e:
+            logger.debug("Consumer lag unavailable", extra={"error": str(e)})
+            return
+
+        event_consumer_lag_events.set(lag)
+
     async def _handle_event(self, event_id: str, event_data: dict) -> None:
         """
         Обработка single event из Redis Stream.
@@ -308,6 +643,9 @@ class EventSubscriber:
                 }
             )
 
+            # Значения автодополнения до upsert (повторная доставка события)
+            terms_before = await suggest_index.get_file_terms(str(event.file_id))
+
             # Делегируем обработку в CacheSyncService
             success = await cache_sync_service.handle_file_created(event)
 
@@ -318,6 +656,12 @@ class EventSubscriber:
                 )
                 raise RuntimeError("CacheSyncService returned False")
 
+            # Инвалидация кеша результатов поиска
+            await search_result_cache.invalidate("file:created", event.metadata.tags)
+            await suggest_index.update(str(event.file_id), terms_before, file_terms(
+                event.metadata.original_filename, event.metadata.tags, event.metadata.uploaded_by
+            ))
+
         except Exception as e:
             logger.error(
                 "Error processing file:created event",
@@ -363,6 +707,8 @@ class EventSubscriber:
                 }
             )
 
+            terms_before = await suggest_index.get_file_terms(str(event.file_id))
+
             # Делегируем обработку в CacheSyncService
             success = await cache_sync_service.handle_file_updated(event)
 
@@ -373,6 +719,12 @@ class EventSubscriber:
                 )
                 raise RuntimeError("CacheSyncService returned False")
 
+            # Инвалидация кеша результатов поиска
+            await search_result_cache.invalidate("file:updated")
+            await suggest_index.update(str(event.file_id), terms_before, file_terms(
+                event.metadata.original_filename, event.metadata.tags, event.metadata.uploaded_by
+            ))
+
         except Exception as e:
             logger.error(
                 "Error processing file:updated event",
@@ -408,6 +760,8 @@ class EventSubscriber:
                 }
             )
 
+            terms_before = await suggest_index.get_file_terms(str(event.file_id))
+
             # Делегируем обработку в CacheSyncService
             success = await cache_sync_service.handle_file_deleted(event)
 
@@ -418,6 +772,10 @@ class EventSubscriber:
                 )
                 raise RuntimeError("CacheSyncService returned False")
 
+            # Инвалидация кеша результатов поиска
+            await search_result_cache.invalidate("file:deleted")
+            await suggest_index.update(str(event.file_id), terms_before, None)
+
         except Exception as e:
             logger.error(
                 "Error processing file:deleted event",
@@ -427,6 +785,93 @@ class EventSubscriber:
             # Re-raise для PEL retry
             raise
 
+    def _applied_key(self, stream_name: str, bucket: int) -> str:
+        """Hash последних применённых событий файлов stream за сутки bucket."""
+        return f"{stream_name}:{self.consumer_group}:applied:{bucket}"
+
+    async def _record_applied(self, stream_name: str, applied: Dict[Optional[str], str]) -> None:
+        """
+        Запись последних применённых событий файлов (перед XACK).
+
+        Args:
+            stream_name: Stream событий
+            applied: file_id → stream ID последнего применённого события
+        """
+        applied = {file_id: event_id for file_id, event_id in applied.items() if file_id}
+        if not applied:
+            return
+
+        key = self._applied_key(stream_name, _applied_bucket())
+        await self.redis.hset(key, mapping=applied)
+        await self.redis.expire(key, APPLIED_TTL_SECONDS)
+
+    async def _superseded_events(
+        self,
+        stream_name: str,
+        messages: List[Tuple[str, dict]],
+    ) -> Set[str]:
+        """
+        Pending события, после которых уже применено более новое событие того же file_id.
+
+        Последнее применённое событие файла берётся из hash текущих и
+        предыдущих суток (_record_applied) - два HMGET независимо от длины
+        stream и числа pending событий.
+
+        Args:
+            messages: [(event_id, event_data)] pending события stream
+
+        Returns:
+            Set[str]: ID устаревших событий
+        """
+        pending_by_file: Dict[str, List[str]] = {}
+        for event_id, event_data in messages:
+            file_id = (event_data or {}).get("file_id")
+            if file_id:
+                pending_by_file.setdefault(file_id, []).append(event_id)
+        if not pending_by_file:
+            return set()
+
+        file_ids = list(pending_by_file)
+        bucket = _applied_bucket()
+        current = await self.redis.hmget(self._applied_key(stream_name, bucket), file_ids)
+        previous = await self.redis.hmget(self._applied_key(stream_name, bucket - 1), file_ids)
+
+        superseded: Set[str] = set()
+        for file_id, *applied_ids in zip(file_ids, current, previous):
+            applied_keys = [_stream_id_key(event_id) for event_id in applied_ids if event_id]
+            if not applied_keys:
+                continue
+            applied = max(applied_keys)
+            superseded.update(
+                pending_id for pending_id in pending_by_file[file_id]
+                if _stream_id_key(pending_id) < applied
+            )
+
+        return superseded
+
+    async def _skip_superseded(
+        self,
+        stream_name: str,
+        messages: List[Tuple[str, dict]],
+    ) -> List[Tuple[str, dict]]:
+        """
+        XACK без применения устаревших pending событий.
+
+        Returns:
+            List[Tuple[str, dict]]: События для обработки (в порядке stream)
+        """
+        superseded = await self._superseded_events(stream_name, messages)
+        if not superseded:
+            return messages
+
+        await self.redis.xack(stream_name, self.consumer_group, *sorted(superseded, key=_stream_id_key))
+        event_superseded_total.inc(len(superseded))
+        logger.info(
+            "Pending events superseded by newer events of the same file, acknowledged without applying",
+            extra={"stream_name": stream_name, "event_ids": sorted(superseded, key=_stream_id_key)}
+        )
+        return [(event_id, event_data) for event_id, event_data in messages if event_id not in superseded]
+
     async def _pending_retry_loop(self) -> None:
         """
         Background task для retry failed events из Pending Entry List (PEL).
@@ -434,9 +879,9 @@ class EventSubscriber:
         Периодически проверяет PEL на events которые не были acknowledged:
         1. XPENDING_RANGE для получения списка pending events
         2. Фильтрация по idle_time (события старше pending_retry_ms)
-        3. XCLAIM для захвата ownership события
-        4. Retry обработки через _handle_event
-        5. XACK если успешно
+        3. XCLAIM для захвата ownership событий
+        4. XACK без применения событий, устаревших для своего file_id
+        5. Retry обработки через _handle_event и XACK если успешно
 
         Запускается как отдельный background task каждые pending_check_interval секунд.
         """
@@ -449,77 +894,8 @@ class EventSubscriber:
                 if not self.redis or not self._initialized:
                     continue
 
-                # Get pending events
-                pending = await self.redis.xpending_range(
-                    name=self.stream_name,
-                    groupname=self.consumer_group,
-                    min="-",
-                    max="+",
-                    count=100,
-                )
-
-                if not pending:
-                    continue
-
-                logger.debug(
-                    "Checking pending events",
-                    extra={"pending_count": len(pending)}
-                )
-
-                # Process pending events that are idle longer than retry threshold
-                for event_info in pending:
-                    event_id = event_info["message_id"]
-                    idle_time = event_info["time_since_delivered"]
-
-                    if idle_time > self.pending_retry_ms:
-                        logger.info(
-                            "Retrying pending event",
-                            extra={
-                                "event_id": event_id,
-                                "idle_time_ms": idle_time,
-                                "consumer": event_info["consumer"],
-                            }
-                        )
-
-                        try:
-                            # Claim ownership and retry
-                            # XCLAIM returns: [(event_id, data)] - direct list without stream_name
-                            # Unlike XREADGROUP which returns: [[stream_name, [(event_id, data)]]]
-                            claimed = await self.redis.xclaim(
-                                name=self.stream_name,
-                                groupname=self.consumer_group,
-                                consumername=self.consumer_name,
-                                min_idle_time=self.pending_retry_ms,
-                                message_ids=[event_id],
-                            )
-
-                            # Parse XCLAIM response directly (no stream_name wrapper)
-                            for claimed_event_id, event_data in claimed:
-                                # Retry processing
-                                await self._handle_event(claimed_event_id, event_data)
-
-                                # ACK если успешно
-                                await self.redis.xack(
-                                    self.stream_name,
-                                    self.consumer_group,
-                                    claimed_event_id,
-                                )
-
-                                logger.info(
-                                    "Pending event retried successfully",
-                                    extra={"event_id": claimed_event_id}
-                                )
-
-                        except Exception as e:
-                            logger.error(
-                                "Failed to retry pending event",
-                                extra={
-                                    "event_id": event_id,
-                                    "error": str(e),
-                                },
-                                exc_info=True
-                            )
-                            # Event остается в PEL, будет retry в следующей итерации
+                for stream_name in self._streams():
+                    await self._retry_pending(stream_name)
 
             except asyncio.CancelledError:
                 logger.info("Pending retry loop cancelled")
@@ -535,6 +911,85 @@ class EventSubscriber:
 
         logger.info("Pending retry loop stopped")
 
+    async def _retry_pending(self, stream_name: str) -> None:
+        """Retry events stream, не подтверждённых дольше pending_retry_ms."""
+        # Get pending events
+        pending = await self.redis.xpending_range(
+            name=stream_name,
+            groupname=self.consumer_group,
+            min="-",
+            max="+",
+            count=100,
+        )
+
+        if not pending:
+            return
+
+        logger.debug(
+            "Checking pending events",
+            extra={"stream_name": stream_name, "pending_count": len(pending)}
+        )
+
+        # Process pending events that are idle longer than retry threshold
+        idle_ids = []
+        for event_info in pending:
+            if event_info["time_since_delivered"] > self.pending_retry_ms:
+                logger.info(
+                    "Retrying pending event",
+                    extra={
+                        "event_id": event_info["message_id"],
+                        "idle_time_ms": event_info["time_since_delivered"],
+                        "consumer": event_info["consumer"],
+                    }
+                )
+                idle_ids.append(event_info["message_id"])
+
+        if not idle_ids:
+            return
+
+        # Claim ownership
+        # XCLAIM returns: [(event_id, data)] - direct list without stream_name
+        # Unlike XREADGROUP which returns: [[stream_name, [(event_id, data)]]]
+        claimed = await self.redis.xclaim(
+            name=stream_name,
+            groupname=self.consumer_group,
+            consumername=self.consumer_name,
+            min_idle_time=self.pending_retry_ms,
+            message_ids=idle_ids,
+        )
+
+        # Более новое событие файла уже применено - повтор нарушил бы порядок
+        claimed = await self._skip_superseded(stream_name, claimed)
+
+        for claimed_event_id, event_data in claimed:
+            try:
+                # Retry processing
+                await self._handle_event(claimed_event_id, event_data)
+
+                # ACK если успешно
+                await self._record_applied(stream_name, {event_data.get("file_id"): claimed_event_id})
+                await self.redis.xack(
+                    stream_name,
+                    self.consumer_group,
+                    claimed_event_id,
+                )
+
+                logger.info(
+                    "Pending event retried successfully",
+                    extra={"event_id": claimed_event_id}
+                )
+
+            except Exception as e:
+                logger.error(
+                    "Failed to retry pending event",
+                    extra={
+                        "event_id": claimed_event_id,
+                        "error": str(e),
+                    },
+                    exc_info=True
+                )
+                # Event остается в PEL, будет retry в следующей итерации
+
     async def close(self) -> None:
         """
         Закрытие EventSubscriber.
@@ -563,6 +1018,13 @@ class EventSubscriber:
             except asyncio.CancelledError:
                 pass
 
+        # Освобождаем partitions для других экземпляров
+        if self._coordinator is not None and self.redis:
+            try:
+                await self._coordinator.release_all()
+            except redis.exceptions.RedisError as e:
+                logger.warning("Failed to release partitions", extra={"error": str(e)})
+
         logger.info("EventSubscriber closed")
 
 
@@ -0,0 +1,262 @@
+"""
+Query Module - Metadata Resolver.
+
+Единая точка получения метаданных файла для download/search API:
+Local Cache → Redis → PostgreSQL (file_metadata_cache) → Storage Element.
+
+- Single-flight: конкурентные запросы одного file_id выполняют один lookup
+- Negative caching: отсутствующий файл кешируется на CACHE_NEGATIVE_TTL
+  (только подтверждённое отсутствие - не ошибки PostgreSQL)
+- Single-flight и negative cache различают lookup с Storage Element fallback
+  и без него: промах без SE не скрывает файл от запроса, который SE передаёт
+- Найденные метаданные заполняют верхние уровни кеша (local + Redis)
+
+PostgreSQL таблица заполняется только событиями (CacheSyncService):
+ответ Storage Element не содержит storage_element_id, поэтому в БД не пишется.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from httpx import HTTPStatusError, RequestError
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.exceptions import DatabaseConnectionException, StorageElementUnavailableException
+from app.db.database import get_session_maker
+from app.db.models import FileMetadata
+from app.services.cache_service import CacheService, LocalCache, cache_service
+
+logger = logging.getLogger(__name__)
+
+
+def file_metadata_to_dict(file_metadata: FileMetadata) -> Dict[str, Any]:
+    """
+    Метаданные файла в формате кеша (JSON-совместимый dict).
+
+    Args:
+        file_metadata: Запись file_metadata_cache
+
+    Returns:
+        Dict[str, Any]: Поля FileMetadataResponse + storage_element_url
+    """
+    return {
+        "id": file_metadata.id,
+        "filename": file_metadata.filename,
+        "storage_filename": file_metadata.storage_filename,
+        "file_size": file_metadata.file_size,
+        "mime_type": file_metadata.mime_type,
+        "sha256_hash": file_metadata.sha256_hash,
+        "username": file_metadata.username,
+        "tags": file_metadata.tags or [],
+        "description": file_metadata.description,
+        "created_at": file_metadata.created_at.isoformat(),
+        "updated_at": file_metadata.updated_at.isoformat(),
+        "storage_element_id": file_metadata.storage_element_id,
+        "storage_element_url": file_metadata.storage_element_url,
+    }
+
+
+class MetadataResolver:
+    """
+    Async resolver метаданных файла по уровням кеша.
+
+    Usage:
+        metadata = await metadata_resolver.resolve(file_id)
+        if metadata is None:
+            raise FileNotFoundException(...)
+    """
+
+    def __init__(self, cache: CacheService):
+        """
+        Args:
+            cache: Multi-level cache (local + Redis)
+        """
+        self.cache = cache
+        self._negative_cache = LocalCache(
+            ttl_seconds=settings.cache.negative_ttl,
+            max_size=settings.cache.local_max_size,
+            name="file_metadata_negative"
+        ) if settings.cache.negative_ttl > 0 else None
+        # (file_id, с SE fallback) → lookup в процессе (single-flight)
+        self._inflight: Dict[Tuple[str, bool], asyncio.Task] = {}
+
+    @staticmethod
+    def _negative_key(file_id: str, with_storage_element: bool) -> str:
+        """Ключ negative cache: промах без SE fallback не подтверждён Storage Element."""
+        return f"{file_id}:se" if with_storage_element else file_id
+
+    async def resolve(
+        self,
+        file_id: str,
+        storage_element_url: Optional[str] = None,
+        auth_token: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Получение метаданных файла.
+
+        Lookup выполняется в собственной DB сессии: его результат разделяют
+        конкурентные запросы, и он не должен зависеть от сессии одного из них.
+
+        Args:
+            file_id: UUID файла
+            storage_element_url: Storage Element для fallback запроса (None - без SE)
+            auth_token: JWT для запроса к Storage Element
+
+        Returns:
+            Optional[Dict[str, Any]]: Метаданные или None если файл не найден
+
+        Raises:
+            StorageElementUnavailableException: Storage Element недоступен при fallback
+            DatabaseConnectionException: PostgreSQL недоступен и fallback не нашёл файл
+        """
+        metadata = await self.cache.get_file_metadata(file_id)
+        if metadata is not None:
+            return metadata
+
+        key = (file_id, bool(storage_element_url))
+
+        if self._negative_cache is not None and self._negative_cache.get(self._negative_key(*key)):
+            return None
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._load(file_id, storage_element_url, auth_token)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # shield: отмена одного ожидающего запроса не отменяет общий lookup
+        return await asyncio.shield(task)
+
+    async def invalidate(self, *file_ids: str) -> None:
+        """
+        Инвалидация метаданных файлов (события file:created/updated/deleted).
+
+        Args:
+            file_ids: UUID файлов
+        """
+        if self._negative_cache is not None:
+            for file_id in file_ids:
+                self._negative_cache.delete(self._negative_key(file_id, False))
+                self._negative_cache.delete(self._negative_key(file_id, True))
+        await self.cache.invalidate_file_metadata(*file_ids)
+
+    async def _load(
+        self,
+        file_id: str,
+        storage_element_url: Optional[str],
+        auth_token: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Lookup в PostgreSQL и Storage Element с заполнением кеша."""
+        db_error = None
+        try:
+            metadata = await self._load_from_db(file_id)
+        except DatabaseConnectionException as e:
+            logger.warning(
+                "Database unavailable for metadata lookup",
+                extra={"file_id": file_id, "error": str(e)}
+            )
+            db_error = e
+            metadata = None
+        source = "database"
+
+        if metadata is None and storage_element_url:
+            metadata = await self._load_from_storage_element(file_id, storage_element_url, auth_token)
+            source = "storage_element"
+
+        if metadata is None:
+            if db_error is not None:
+                # Отсутствие не подтверждено БД - без negative caching
+                raise db_error
+            if self._negative_cache is not None:
+                self._negative_cache.set(self._negative_key(file_id, bool(storage_element_url)), True)
+            return None
+
+        await self.cache.set_file_metadata(file_id, metadata)
+
+        logger.debug(
+            "File metadata resolved",
+            extra={"file_id": file_id, "source": source}
+        )
+
+        return metadata
+
+    async def _load_from_db(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Метаданные из file_metadata_cache (None - нет записи).
+
+        Raises:
+            DatabaseConnectionException: PostgreSQL недоступен
+        """
+        query = select(FileMetadata).where(FileMetadata.id == file_id)
+
+        try:
+            async with get_session_maker()() as session:
+                file_metadata = (await session.execute(query)).scalar_one_or_none()
+
+        except (SQLAlchemyError, OSError) as e:
+            raise DatabaseConnectionException(
+                f"Metadata lookup failed: {str(e)}",
+                details={"file_id": file_id}
+            ) from e
+
+        return file_metadata_to_dict(file_metadata) if file_metadata else None
+
+    async def _load_from_storage_element(
+        self,
+        file_id: str,
+        storage_element_url: str,
+        auth_token: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Метаданные из Storage Element API (None - файл не найден)."""
+        # Общий HTTP клиент (pool + mTLS) Download Service
+        from app.services.download_service import download_service
+
+        client = await download_service._get_http_client()
+        url = f"{storage_element_url.rstrip('/')}/api/v1/files/{file_id}"
+        headers = {"Authorization": f"Bearer {auth_token}"} if auth_token else {}
+
+        try:
+            response = await client.get(url, headers=headers)
+            response.raise_for_status()
+
+        except HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return None
+            raise StorageElementUnavailableException(
+                f"Storage Element error: {e.response.status_code}",
+                details={"status_code": e.response.status_code}
+            )
+
+        except RequestError as e:
+            raise StorageElementUnavailableException(
+                f"Storage Element unavailable: {str(e)}",
+                details={"error": str(e)}
+            )
+
+        data = response.json()
+
+        return {
+            "id": str(data["file_id"]),
+            "filename": data["original_filename"],
+            "storage_filename": data["storage_filename"],
+            # Клиент получает распакованное содержимое
+            "file_size": data.get("original_size") or data["file_size"],
+            "mime_type": data.get("content_type"),
+            "sha256_hash": data["checksum"],
+            "username": data["created_by_username"],
+            "tags": [],
+            "description": data.get("description"),
+            "created_at": data["created_at"],
+            "updated_at": data["created_at"],
+            "storage_element_id": "",
+            "storage_element_url": storage_element_url,
+        }
+
+
+# Global instance
+metadata_resolver = MetadataResolver(cache_service)
@@ -0,0 +1,197 @@
+"""
+Query Module - Распределение partition streams между экземплярами.
+
+Admin Module при EVENT_STREAM_PARTITIONS > 1 публикует file-events в streams
+{stream}:{N}, N = crc32(file_id) % partitions: все события файла попадают
+в один partition.
+
+Каждый partition читает ровно один экземпляр Query Module - порядок
+событий файла сохраняется при горизонтальном масштабировании:
+- Экземпляр регистрируется в sorted set {stream}:consumers (score - время heartbeat)
+- Живые экземпляры (heartbeat моложе lease) делят partitions round-robin
+  по отсортированному списку имён - все экземпляры вычисляют одинаковое распределение
+- Владение partition - lease ключ {stream}:{N}:owner (SET NX PX), продлевается
+  каждым heartbeat; при смене распределения partition освобождается текущим
+  владельцем между пакетами и захватывается новым
+- Упавший экземпляр не продлевает lease - его partitions перераспределяются
+  после истечения lease
+"""
+
+import logging
+import time
+import zlib
+from typing import Iterable, List, Set, Tuple
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+# Продление lease только владельцем
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Освобождение lease только владельцем
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def stream_partition(file_id: UUID | str, partitions: int) -> int:
+    """
+    Номер partition stream для файла.
+
+    Та же формула, что у Admin Module EventPublisher (crc32 стабилен между процессами).
+    """
+    return zlib.crc32(str(file_id).encode()) % partitions
+
+
+def partition_stream_name(stream_name: str, partition: int, partitions: int) -> str:
+    """Имя partition stream (без суффикса при единственном partition)."""
+    if partitions <= 1:
+        return stream_name
+    return f"{stream_name}:{partition}"
+
+
+def assign_partitions(members: Iterable[str], member: str, partitions: int) -> Set[int]:
+    """
+    Partitions экземпляра при round-robin распределении.
+
+    Args:
+        members: Живые экземпляры (включая member)
+        member: Имя экземпляра
+        partitions: Количество partitions
+
+    Returns:
+        Set[int]: Номера partitions экземпляра
+    """
+    ordered = sorted(set(members) | {member})
+    index = ordered.index(member)
+    return {partition for partition in range(partitions) if partition % len(ordered) == index}
+
+
+class PartitionCoordinator:
+    """
+    Захват и перераспределение partition streams.
+
+    rebalance() вызывается consumer loop между пакетами (не реже lease / 3):
+    освобождение partition никогда не происходит во время обработки пакета.
+
+    Usage:
+        coordinator = PartitionCoordinator(redis, "file-events", 8, consumer_name, 30)
+        acquired, released = await coordinator.rebalance()
+        streams = coordinator.streams()
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        stream_name: str,
+        partitions: int,
+        consumer_name: str,
+        lease_seconds: int,
+    ):
+        self.redis = redis
+        self.stream_name = stream_name
+        self.partitions = partitions
+        self.consumer_name = consumer_name
+        self.lease_seconds = lease_seconds
+        self.owned: Set[int] = set()
+        self._last_rebalance = 0.0
+
+    @property
+    def members_key(self) -> str:
+        return f"{self.stream_name}:consumers"
+
+    @property
+    def heartbeat_interval(self) -> float:
+        """Интервал heartbeat (секунды): lease продлевается с запасом."""
+        return self.lease_seconds / 3
+
+    def owner_key(self, partition: int) -> str:
+        return f"{partition_stream_name(self.stream_name, partition, self.partitions)}:owner"
+
+    def stream(self, partition: int) -> str:
+        return partition_stream_name(self.stream_name, partition, self.partitions)
+
+    def streams(self) -> List[str]:
+        """Streams захваченных partitions."""
+        return [self.stream(partition) for partition in sorted(self.owned)]
+
+    def rebalance_due(self) -> bool:
+        return time.monotonic() - self._last_rebalance >= self.heartbeat_interval
+
+    async def rebalance(self) -> Tuple[Set[int], Set[int]]:
+        """
+        Heartbeat, продление lease и перераспределение partitions.
+
+        Returns:
+            Tuple[Set[int], Set[int]]: (захваченные, освобождённые или потерянные) partitions
+        """
+        self._last_rebalance = time.monotonic()
+        now = time.time()
+        lease_ms = self.lease_seconds * 1000
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(self.members_key, {self.consumer_name: now})
+            pipe.zremrangebyscore(self.members_key, "-inf", now - self.lease_seconds)
+            pipe.zrange(self.members_key, 0, -1)
+            members = (await pipe.execute())[-1]
+
+        desired = assign_partitions(members, self.consumer_name, self.partitions)
+        acquired: Set[int] = set()
+        released: Set[int] = set()
+
+        for partition in sorted(self.owned):
+            key = self.owner_key(partition)
+            if partition not in desired:
+                await self.redis.eval(_RELEASE_SCRIPT, 1, key, self.consumer_name)
+                released.add(partition)
+            elif not await self.redis.eval(_RENEW_SCRIPT, 1, key, self.consumer_name, lease_ms):
+                # lease истёк (долгая обработка пакета) - partition мог быть захвачен другим
+                logger.warning(
+                    "Partition lease lost",
+                    extra={"partition": partition, "consumer_name": self.consumer_name}
+                )
+                released.add(partition)
+
+        self.owned -= released
+
+        for partition in sorted(desired - self.owned):
+            if await self.redis.set(self.owner_key(partition), self.consumer_name, nx=True, px=lease_ms):
+                acquired.add(partition)
+
+        self.owned |= acquired
+
+        if acquired or released:
+            logger.info(
+                "Event stream partitions rebalanced",
+                extra={
+                    "consumer_name": self.consumer_name,
+                    "members": len(members),
+                    "acquired": sorted(acquired),
+                    "released": sorted(released),
+                    "owned": sorted(self.owned),
+                }
+            )
+
+        return acquired, released
+
+    async def release_all(self) -> None:
+        """Освобождение всех partitions и выход из группы (shutdown)."""
+        for partition in sorted(self.owned):
+            await self.redis.eval(_RELEASE_SCRIPT, 1, self.owner_key(partition), self.consumer_name)
+        await self.redis.zrem(self.members_key, self.consumer_name)
+
+        logger.info(
+            "Event stream partitions released",
+            extra={"consumer_name": self.consumer_name, "partitions": sorted(self.owned)}
+        )
+        self.owned.clear()
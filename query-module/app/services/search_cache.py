@@ -0,0 +1,179 @@
+"""
+Query Module - Search Result Cache.
+
+Кеширование результатов поиска (local cache + Redis) с инвалидацией
+через generation counters, которые увеличивает EventSubscriber по
+событиям file-events:
+
+- search:gen:all - любое событие; от него зависят запросы без фильтра тегов
+- search:gen:tag:{tag} - file:created файла с тегом
+- search:gen:tags - file:updated/file:deleted (прежние теги неизвестны)
+
+Запрос с фильтром тегов (overlap &&) зависит только от счётчиков своих
+тегов и search:gen:tags: загрузки файлов с другими тегами его не сбрасывают.
+Ключ результата содержит текущие значения счётчиков - после инкремента
+старые записи больше не читаются и истекают по TTL. get() возвращает ключ,
+прочитанный до запроса к БД, и set() сохраняет результат именно под ним:
+инкремент во время выполнения запроса не даст записать устаревший
+результат под новый ключ.
+
+Redis отключен (CACHE_REDIS_ENABLED=off) - счётчики хранятся в процессе.
+Redis недоступен - кеш не используется (счётчики нельзя проверить).
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import (
+    search_cache_hits_total,
+    search_cache_invalidations_total,
+    search_cache_misses_total,
+    search_cache_saved_db_seconds_total,
+)
+from app.services.cache_service import CacheService, LocalCache, cache_service
+
+logger = logging.getLogger(__name__)
+
+GENERATION_ALL = "search:gen:all"
+GENERATION_TAGS = "search:gen:tags"
+GENERATION_TAG_PREFIX = "search:gen:tag:"
+
+
+class SearchResultCache:
+    """
+    Кеш результатов поиска по хешу нормализованного запроса.
+
+    Usage:
+        cached, key = await search_result_cache.get(search_hash, tags)
+        ...
+        if key is not None:
+            await search_result_cache.set(key, response_dict, db_time_ms)
+    """
+
+    def __init__(self, cache: CacheService):
+        """
+        Args:
+            cache: Multi-level cache (Redis client для результатов и счётчиков)
+        """
+        self.redis_cache = cache.redis_cache
+        self.local_cache = LocalCache(
+            ttl_seconds=settings.cache.search_ttl,
+            max_size=settings.cache.local_max_size,
+            max_bytes=settings.cache.local_max_bytes or None,
+            name="search_results"
+        ) if settings.cache.local_enabled else None
+        # Счётчики без Redis (один экземпляр Query Module)
+        self._generations: Dict[str, int] = {}
+
+    @staticmethod
+    def _generation_keys(tags: Optional[List[str]]) -> List[str]:
+        """Счётчики, от которых зависит запрос."""
+        if not tags:
+            return [GENERATION_ALL]
+        return [GENERATION_TAGS] + [f"{GENERATION_TAG_PREFIX}{tag}" for tag in sorted(set(tags))]
+
+    async def _result_key(self, search_hash: str, tags: Optional[List[str]]) -> Optional[str]:
+        """Ключ результата с текущими generation (None - Redis недоступен)."""
+        keys = self._generation_keys(tags)
+
+        if self.redis_cache is None:
+            generations = [self._generations.get(key, 0) for key in keys]
+        else:
+            values = await self.redis_cache.mget(keys)
+            if values is None:
+                return None
+            generations = [int(value or 0) for value in values]
+
+        return f"search:{search_hash}:{'.'.join(map(str, generations))}"
+
+    async def get(
+        self,
+        search_hash: str,
+        tags: Optional[List[str]]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Получение результатов поиска из кеша.
+
+        Args:
+            search_hash: Хеш нормализованных параметров поиска
+            tags: Фильтр тегов запроса
+
+        Returns:
+            Tuple: (SearchResponse dict или None, ключ результата для set()
+            или None - Redis недоступен)
+        """
+        key = await self._result_key(search_hash, tags)
+        if key is None:
+            return None, None
+
+        entry = self.local_cache.get(key) if self.local_cache else None
+        level = "local"
+
+        if entry is None and self.redis_cache is not None:
+            raw = await self.redis_cache.get(key)
+            if raw:
+                try:
+                    entry = json.loads(raw)
+                except json.JSONDecodeError:
+                    await self.redis_cache.delete(key)
+                    entry = None
+                if entry is not None and self.local_cache:
+                    self.local_cache.set(key, entry)
+            level = "redis"
+
+        if entry is None:
+            search_cache_misses_total.inc()
+            return None, key
+
+        search_cache_hits_total.labels(level=level).inc()
+        search_cache_saved_db_seconds_total.inc(entry["db_time_ms"] / 1000)
+        return entry["response"], key
+
+    async def set(self, key: str, response: Dict[str, Any], db_time_ms: float) -> None:
+        """
+        Сохранение результатов поиска.
+
+        Args:
+            key: Ключ результата из get() (generation до запроса к БД)
+            response: SearchResponse dict (JSON-совместимый)
+            db_time_ms: Время выполнения запроса в PostgreSQL (для метрики экономии)
+        """
+        entry = {"response": response, "db_time_ms": db_time_ms}
+
+        if self.local_cache:
+            self.local_cache.set(key, entry)
+
+        if self.redis_cache is not None:
+            await self.redis_cache.set(key, json.dumps(entry), ttl_seconds=settings.cache.search_ttl)
+
+    async def invalidate(self, event_type: str, tags: Optional[List[str]] = None) -> None:
+        """
+        Инкремент generation counters по событию file-events.
+
+        Args:
+            event_type: file:created, file:updated или file:deleted
+            tags: Теги файла из события (file:created)
+        """
+        keys = [GENERATION_ALL]
+        if event_type == "file:created":
+            keys += [f"{GENERATION_TAG_PREFIX}{tag}" for tag in set(tags or [])]
+        else:
+            keys.append(GENERATION_TAGS)
+
+        if self.redis_cache is None:
+            for key in keys:
+                self._generations[key] = self._generations.get(key, 0) + 1
+        elif not await self.redis_cache.incr(keys):
+            logger.warning(
+                "Failed to bump search cache generations",
+                extra={"event_type": event_type}
+            )
+            return
+
+        search_cache_invalidations_total.labels(event_type=event_type).inc()
+
+
+# Global instance
+search_result_cache = SearchResultCache(cache_service)
@@ -0,0 +1,339 @@
+"""
+Query Module - Search History Writer.
+
+История поиска пишется фоново (BatchWriter) - время ответа поиска
+не включает INSERT и commit:
+- Доля записываемых запросов - STATS_SEARCH_HISTORY_SAMPLE_RATE
+- Пакет записей - один multi-row INSERT в search_history
+
+search_history секционирована по дням (search_history_pYYYYMMDD);
+записи вне дневных partitions попадают в search_history_default.
+Обслуживание (при старте и каждый час):
+- Создание partitions на STATS_SEARCH_HISTORY_PARTITIONS_AHEAD дней вперёд;
+  записи дня из default partition переносятся в созданную partition
+- Удаление partitions старше STATS_SEARCH_HISTORY_RETENTION_DAYS через
+  DROP TABLE: без DELETE, dead tuples и VACUUM по всей таблице.
+  Partition сначала отсоединяется (DETACH PARTITION) отдельной короткой
+  транзакцией с lock_timeout, затем удаляется без блокировки search_history.
+  DETACH ... CONCURRENTLY PostgreSQL не допускает при default partition,
+  поэтому ACCESS EXCLUSIVE на search_history берётся только на время DETACH,
+  а при конкурирующих запросах DETACH откладывается до следующего запуска
+- Prometheus: query_search_history_partition_coverage_days и время
+  последнего успешного обслуживания (alert при запаздывании)
+"""
+
+import asyncio
+import json
+import logging
+import random
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.metrics import (
+    search_history_default_rows_moved_total,
+    search_history_maintenance_last_success_timestamp_seconds,
+    search_history_partition_coverage_days,
+)
+from app.db.database import get_db_session
+from app.db.models import SearchHistory
+from app.schemas.search import SearchRequest
+from app.services.batch_writer import BatchWriter
+
+logger = logging.getLogger(__name__)
+
+# Интервал обслуживания partitions (секунды)
+MAINTENANCE_INTERVAL = 3600
+
+DEFAULT_PARTITION = "search_history_default"
+
+# Обслуживание partitions одним экземпляром Query Module одновременно
+_MAINTENANCE_LOCK = "SELECT pg_advisory_xact_lock(hashtext('search_history_partition_maintenance'))"
+
+# Ожидание ACCESS EXCLUSIVE на search_history для DETACH: дольше - запросы
+# поиска встают в очередь за DETACH, поэтому он откладывается
+_DETACH_LOCK_TIMEOUT = "5s"
+
+_PARTITION_NAME = re.compile(r"^search_history_p(\d{8})$")
+
+
+def partition_name(day: date) -> str:
+    """Имя дневной partition search_history."""
+    return f"search_history_p{day:%Y%m%d}"
+
+
+def partition_day(name: str) -> Optional[date]:
+    """День partition по имени (None - не дневная partition)."""
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return datetime.strptime(match.group(1), "%Y%m%d").date()
+
+
+def partition_coverage(names: List[str], today: date) -> int:
+    """
+    Число дней подряд, начиная с текущего, покрытых дневными partitions.
+
+    0 - записи текущего дня попадают в default partition.
+    """
+    days = {partition_day(name) for name in names}
+    coverage = 0
+    while today + timedelta(days=coverage) in days:
+        coverage += 1
+    return coverage
+
+
+def missing_partitions(names: List[str], today: date, partitions_ahead: int) -> List[date]:
+    """Дни от текущего до today + partitions_ahead без дневной partition."""
+    days = {partition_day(name) for name in names}
+    return [
+        day for offset in range(partitions_ahead + 1)
+        if (day := today + timedelta(days=offset)) not in days
+    ]
+
+
+def expired_partitions(names: List[str], today: date, retention_days: int) -> List[str]:
+    """
+    Partitions, все записи которых старше срока хранения.
+
+    Args:
+        names: Имена partitions search_history
+        today: Текущий день (UTC)
+        retention_days: Срок хранения (дни)
+
+    Returns:
+        List[str]: Имена partitions для удаления
+    """
+    cutoff = today - timedelta(days=retention_days)
+    return sorted(
+        name for name in names
+        if (day := partition_day(name)) is not None and day < cutoff
+    )
+
+
+class SearchHistoryWriter(BatchWriter[Dict[str, Any]]):
+    """
+    Фоновая запись истории поиска с обслуживанием дневных partitions.
+
+    Usage:
+        search_history_writer.record(search_request, results_count, response_time_ms)
+    """
+
+    def __init__(self):
+        super().__init__(
+            name="search_history",
+            queue_size=settings.stats.queue_size,
+            flush_size=settings.stats.flush_size,
+            flush_interval_ms=settings.stats.flush_interval_ms,
+            enabled=settings.stats.search_history_enabled,
+        )
+        self.sample_rate = settings.stats.search_history_sample_rate
+        self.retention_days = settings.stats.search_history_retention_days
+        self.partitions_ahead = settings.stats.search_history_partitions_ahead
+        self._maintenance_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Запуск фоновой записи и обслуживания partitions."""
+        await super().start()
+        if self.running and self._maintenance_task is None:
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Остановка обслуживания partitions и запись оставшихся записей."""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+        await super().close(timeout)
+
+    def record(
+        self,
+        search_request: SearchRequest,
+        results_count: int,
+        response_time_ms: int
+    ) -> bool:
+        """
+        Постановка поискового запроса в очередь (с учётом sampling).
+
+        Returns:
+            bool: False если запрос не записывается (sampling, очередь заполнена)
+        """
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return False
+
+        return self.submit({
+            "query_text": search_request.query,
+            "search_mode": search_request.mode.value,
+            "filters_applied": json.dumps({
+                "filename": search_request.filename,
+                "tags": search_request.tags,
+                "username": search_request.username,
+                "min_size": search_request.min_size,
+                "max_size": search_request.max_size,
+            }),
+            "results_count": results_count,
+            "response_time_ms": response_time_ms,
+            "username": search_request.username,
+            # Время поиска, а не записи пакета (определяет partition)
+            "created_at": datetime.now(timezone.utc),
+        })
+
+    async def write(self, batch: List[Dict[str, Any]]) -> None:
+        """Multi-row INSERT пакета записей."""
+        async for session in get_db_session():
+            await session.execute(insert(SearchHistory).values(batch))
+
+        logger.debug("Search history batch written", extra={"records": len(batch)})
+
+    async def maintain_partitions(self, today: Optional[date] = None) -> List[str]:
+        """
+        Создание partitions вперёд и удаление partitions старше срока хранения.
+
+        Args:
+            today: Текущий день (UTC, по умолчанию - сегодня)
+
+        Returns:
+            List[str]: Удалённые partitions
+        """
+        today = today or datetime.now(timezone.utc).date()
+
+        async for session in get_db_session():
+            await session.execute(text(_MAINTENANCE_LOCK))
+            names = await self._partition_names(session)
+
+            coverage = partition_coverage(names, today)
+            if coverage < 2:
+                # Partition следующего дня должна существовать заранее
+                logger.warning(
+                    "Search history partition maintenance is late",
+                    extra={"partition_coverage_days": coverage}
+                )
+
+            for day in missing_partitions(names, today, self.partitions_ahead):
+                moved = await self._create_partition(session, day)
+                names.append(partition_name(day))
+                if moved:
+                    search_history_default_rows_moved_total.inc(moved)
+                    logger.warning(
+                        "Search history rows moved from default partition",
+                        extra={"partition": partition_name(day), "rows": moved}
+                    )
+
+            # Записи вне дневных partitions - по сроку хранения
+            cutoff = datetime.combine(today - timedelta(days=self.retention_days), time.min, tzinfo=timezone.utc)
+            await session.execute(
+                text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < :cutoff"),
+                {"cutoff": cutoff}
+            )
+
+        search_history_partition_coverage_days.set(partition_coverage(names, today))
+
+        # Каждая partition - своя транзакция DETACH (блокировка search_history
+        # не удерживается вместе с ATTACH и DELETE из default partition)
+        for name in expired_partitions(names, today, self.retention_days):
+            try:
+                async for session in get_db_session():
+                    await session.execute(text(_MAINTENANCE_LOCK))
+                    await session.execute(text(f"SET LOCAL lock_timeout = '{_DETACH_LOCK_TIMEOUT}'"))
+                    await session.execute(text(f"ALTER TABLE search_history DETACH PARTITION {name}"))
+            except SQLAlchemyError as e:
+                logger.warning(
+                    "Search history partition detach postponed",
+                    extra={"partition": name, "error": str(e)}
+                )
+
+        # Отсоединённые partitions удаляются без блокировки search_history
+        # (включая отсоединённые прошлым запуском, но не удалённые)
+        async for session in get_db_session():
+            await session.execute(text(_MAINTENANCE_LOCK))
+            expired = expired_partitions(await self._detached_partitions(session), today, self.retention_days)
+            for name in expired:
+                await session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+
+        search_history_maintenance_last_success_timestamp_seconds.set_to_current_time()
+
+        if expired:
+            logger.info(
+                "Expired search history partitions dropped",
+                extra={"partitions": expired, "retention_days": self.retention_days}
+            )
+        return expired
+
+    @staticmethod
+    async def _detached_partitions(session) -> List[str]:
+        """Дневные таблицы search_history_pYYYYMMDD, не присоединённые к search_history."""
+        result = await session.execute(text(
+            "SELECT relname FROM pg_class "
+            "WHERE relkind = 'r' AND NOT relispartition AND relname LIKE 'search\\_history\\_p%'"
+        ))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def _partition_names(session) -> List[str]:
+        result = await session.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = 'search_history'"
+        ))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def _create_partition(session, day: date) -> int:
+        """
+        Создание дневной partition с переносом записей дня из default partition.
+
+        CREATE TABLE ... PARTITION OF не выполняется, если в default partition
+        есть записи этого дня: они переносятся в новую таблицу до ATTACH.
+
+        Returns:
+            int: Количество перенесённых записей
+        """
+        name = partition_name(day)
+        lower = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        upper = lower + timedelta(days=1)
+
+        await session.execute(text(
+            f"CREATE TABLE {name} (LIKE search_history INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        result = await session.execute(
+            text(
+                f"WITH moved AS ("
+                f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :lower AND created_at < :upper "
+                f"RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            ),
+            {"lower": lower, "upper": upper}
+        )
+        await session.execute(text(
+            f"ALTER TABLE search_history ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        ))
+        return result.rowcount
+
+    async def _maintenance_loop(self) -> None:
+        """Обслуживание partitions при старте и каждые MAINTENANCE_INTERVAL секунд."""
+        while True:
+            try:
+                await self.maintain_partitions()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    "Search history partition maintenance failed",
+                    extra={"error": str(e)},
+                    exc_info=True
+                )
+            await asyncio.sleep(MAINTENANCE_INTERVAL)
+
+
+# Singleton instance
+search_history_writer = SearchHistoryWriter()
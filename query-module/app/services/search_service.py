@@ -2,7 +2,8 @@
 Query Module - Search Service.
 
 Реализует поиск файлов с использованием:
-- PostgreSQL Full-Text Search (GIN индексы)
+- PostgreSQL Full-Text Search (взвешенный search_vector, GIN индекс, ts_rank)
+- Substring поиск через pg_trgm GIN индексы (ILIKE '%q%')
 - Multi-level caching (Local → Redis → PostgreSQL)
 - Различные режимы поиска (exact, partial, fulltext)
 - Ранжирование результатов по релевантности
@@ -11,12 +12,14 @@ Query Module - Search Service.
 import logging
 import hashlib
 import json
+import time
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Optional
 from sqlalchemy import select, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import FileMetadata, SearchHistory
+from app.db.models import FileMetadata
+from app.db.search_vector import rank_expression, search_query_expression
 from app.schemas.search import (
     SearchRequest,
     SearchResponse,
@@ -25,11 +28,22 @@ from app.schemas.search import (
     SortField,
     SortOrder
 )
-from app.services.cache_service import cache_service
+from app.services.search_cache import search_result_cache
+from app.services.search_history import search_history_writer
 from app.core.config import settings
+from app.core.exceptions import InvalidSearchQueryException
+from app.utils.pagination import decode_cursor, encode_cursor, estimate_count, keyset_condition
 
 logger = logging.getLogger(__name__)
 
+# Сортировка по ts_rank (вместо атрибута FileMetadata)
+RELEVANCE = "relevance"
+
+# Поля сортировки с составным индексом (поле, id) - только для них курсор
+# выполняется range scan по индексу. ts_rank вычисляется по каждой найденной
+# записи и индекса не имеет - для релевантности остаётся OFFSET.
+KEYSET_SORT_ATTRS = frozenset({"created_at", "updated_at", "file_size", "filename"})
+
 
 class SearchService:
     """
@@ -37,8 +51,8 @@ class SearchService:
 
     Поддерживает:
     - Exact match (точное совпадение)
-    - Partial match (частичное совпадение через LIKE)
-    - Full-text search (PostgreSQL ts_rank через GIN индексы)
+    - Partial match (частичное совпадение через ILIKE, pg_trgm индексы)
+    - Full-text search (сохранённый search_vector, ранжирование ts_rank)
     - Multi-level caching результатов
     - Фильтрация по различным атрибутам
     """
@@ -52,9 +66,30 @@ class SearchService:
         """
         self.db = db
 
+    @staticmethod
+    def _search_text(search_request: SearchRequest) -> Optional[str]:
+        """
+        Текст запроса в том виде, в котором он выполняется и входит в ключ кеша.
+
+        FULLTEXT: plainto_tsquery не различает регистр и число пробелов.
+        PARTIAL: ILIKE не различает регистр. EXACT: без изменений.
+        """
+        query = search_request.query
+        if not query:
+            return None
+        if search_request.mode == SearchMode.FULLTEXT:
+            return " ".join(query.split()).lower() or None
+        if search_request.mode == SearchMode.PARTIAL:
+            return query.lower()
+        return query
+
     def _compute_search_hash(self, search_request: SearchRequest) -> str:
         """
-        Вычисление хеша параметров поиска для кеширования.
+        Вычисление хеша нормализованных параметров поиска для кеширования.
+
+        Эквивалентные запросы дают один хеш. Нормализуются только значения,
+        которые в том же виде передаются в условия поиска (_search_text,
+        filename/file_extension для ILIKE); теги сортируются без повторов.
 
         Args:
             search_request: Параметры поиска
@@ -64,10 +99,10 @@ class SearchService:
         """
         # Сериализация параметров в JSON (сортированный для консистентности)
         params = {
-            "query": search_request.query,
-            "filename": search_request.filename,
-            "file_extension": search_request.file_extension,
-            "tags": sorted(search_request.tags) if search_request.tags else None,
+            "query": self._search_text(search_request),
+            "filename": search_request.filename.lower() if search_request.filename else None,
+            "file_extension": search_request.file_extension.lower() if search_request.file_extension else None,
+            "tags": sorted(set(search_request.tags)) if search_request.tags else None,
             "username": search_request.username,
             "min_size": search_request.min_size,
             "max_size": search_request.max_size,
@@ -76,6 +111,8 @@ class SearchService:
             "mode": search_request.mode.value,
             "limit": search_request.limit,
             "offset": search_request.offset,
+            "cursor": search_request.cursor,
+            "exact_total": search_request.exact_total,
             "sort_by": search_request.sort_by.value,
             "sort_order": search_request.sort_order.value,
         }
@@ -97,26 +134,58 @@ class SearchService:
 
         # Проверка кеша (если включено)
         search_hash = self._compute_search_hash(search_request)
+        cache_key = None
         if settings.cache.cache_search_results:
-            cached_results = self._get_cached_search(search_hash)
+            cached_results, cache_key = await search_result_cache.get(search_hash, search_request.tags)
             if cached_results:
+                response = SearchResponse(**cached_results)
+                response_time_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+                await self._record_search_history(search_request, len(response.results), response_time_ms)
                 logger.info(
                     "Search cache hit",
                     extra={"search_hash": search_hash}
                 )
-                return SearchResponse(**cached_results)
+                return response
 
-        # Построение query
+        # Построение query (LIMIT + 1 - признак следующей страницы)
         query = self._build_search_query(search_request)
 
         # Выполнение поиска
+        db_start = time.perf_counter()
         result = await self.db.execute(query)
-        files = result.scalars().all()
+        if self._rank_expression(search_request) is not None:
+            rows = [(file, relevance) for file, relevance in result.all()]
+        else:
+            rows = [(file, None) for file in result.scalars().all()]
+        has_next_page = len(rows) > search_request.limit
+        rows = rows[:search_request.limit]
+        files = [file for file, _ in rows]
+
+        # Total count: оценка планировщика или точный COUNT(*) (без LIMIT/OFFSET)
+        total_count = None
+        if not search_request.exact_total:
+            total_count = await estimate_count(
+                self.db,
+                select(FileMetadata.id).where(*self._build_conditions(search_request))
+            )
+        total_is_estimate = total_count is not None
+        if total_count is None:
+            count_query = self._build_count_query(search_request)
+            count_result = await self.db.execute(count_query)
+            total_count = count_result.scalar() or 0
+        else:
+            total_count = max(total_count, len(files))
+        db_time_ms = (time.perf_counter() - db_start) * 1000
+
+        if not total_is_estimate and not search_request.cursor:
+            has_next_page = has_next_page or (search_request.offset + len(files)) < total_count
 
-        # Подсчет total count (без LIMIT/OFFSET)
-        count_query = self._build_count_query(search_request)
-        count_result = await self.db.execute(count_query)
-        total_count = count_result.scalar() or 0
+        next_cursor = None
+        sort_key, sort_attr = self._sort_key(search_request)
+        if has_next_page and rows and sort_attr in KEYSET_SORT_ATTRS:
+            last_file, last_relevance = rows[-1]
+            sort_value = last_relevance if sort_attr == RELEVANCE else getattr(last_file, sort_attr)
+            next_cursor = encode_cursor(sort_key, sort_value, last_file.id)
 
         # Конвертация в response schema
         file_responses = [
@@ -133,9 +202,9 @@ class SearchService:
                 created_at=file.created_at,
                 updated_at=file.updated_at,
                 storage_element_id=file.storage_element_id,
-                relevance_score=None  # TODO: implement relevance scoring для FTS
+                relevance_score=relevance
             )
-            for file in files
+            for file, relevance in rows
         ]
 
         response = SearchResponse(
@@ -143,12 +212,14 @@ class SearchService:
             total_count=total_count,
             limit=search_request.limit,
             offset=search_request.offset,
-            has_more=(search_request.offset + len(file_responses)) < total_count
+            has_more=has_next_page,
+            next_cursor=next_cursor,
+            total_is_estimate=total_is_estimate
         )
 
-        # Сохранение в кеш
-        if settings.cache.cache_search_results:
-            self._cache_search_results(search_hash, response.dict())
+        # Сохранение в кеш под ключом, прочитанным до запроса к БД
+        if cache_key is not None:
+            await search_result_cache.set(cache_key, response.model_dump(mode="json"), db_time_ms)
 
         # Запись в search history
         response_time_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
@@ -166,49 +237,47 @@ class SearchService:
 
         return response
 
-    def _build_search_query(self, search_request: SearchRequest):
-        """Построение SQLAlchemy query для поиска."""
-        query = select(FileMetadata)
-
-        # Применение фильтров
+    def _build_conditions(self, search_request: SearchRequest) -> list:
+        """Условия WHERE по фильтрам поиска (общие для выборки и подсчёта)."""
         conditions = []
+        search_text = self._search_text(search_request)
 
         # Full-text search (если mode == FULLTEXT и есть query)
-        if search_request.mode == SearchMode.FULLTEXT and search_request.query:
-            # PostgreSQL ts_query для full-text search
-            ts_query = func.plainto_tsquery('russian', search_request.query)
+        if search_request.mode == SearchMode.FULLTEXT and search_text:
+            # Сохранённый взвешенный search_vector (GIN индекс)
+            ts_query = search_query_expression(search_text)
             conditions.append(
                 FileMetadata.search_vector.op('@@')(ts_query)
             )
 
         # Partial search (через LIKE)
-        elif search_request.mode == SearchMode.PARTIAL and search_request.query:
+        elif search_request.mode == SearchMode.PARTIAL and search_text:
             conditions.append(
                 or_(
-                    FileMetadata.filename.ilike(f"%{search_request.query}%"),
-                    FileMetadata.description.ilike(f"%{search_request.query}%")
+                    FileMetadata.filename.ilike(f"%{search_text}%"),
+                    FileMetadata.description.ilike(f"%{search_text}%")
                 )
             )
 
         # Exact match
-        elif search_request.mode == SearchMode.EXACT and search_request.query:
+        elif search_request.mode == SearchMode.EXACT and search_text:
             conditions.append(
                 or_(
-                    FileMetadata.filename == search_request.query,
-                    FileMetadata.description == search_request.query
+                    FileMetadata.filename == search_text,
+                    FileMetadata.description == search_text
                 )
             )
 
         # Фильтр по filename
         if search_request.filename:
             conditions.append(
-                FileMetadata.filename.ilike(f"%{search_request.filename}%")
+                FileMetadata.filename.ilike(f"%{search_request.filename.lower()}%")
             )
 
         # Фильтр по file_extension
         if search_request.file_extension:
             conditions.append(
-                FileMetadata.filename.ilike(f"%{search_request.file_extension}")
+                FileMetadata.filename.ilike(f"%{search_request.file_extension.lower()}")
             )
 
         # Фильтр по тегам (PostgreSQL ARRAY overlap operator)
@@ -245,124 +314,96 @@ class SearchService:
                 FileMetadata.created_at <= search_request.created_before
             )
 
-        # Применение всех условий
-        if conditions:
-            query = query.where(and_(*conditions))
-
-        # Сортировка
-        if search_request.sort_by == SortField.CREATED_AT:
-            sort_column = FileMetadata.created_at
-        elif search_request.sort_by == SortField.UPDATED_AT:
-            sort_column = FileMetadata.updated_at
-        elif search_request.sort_by == SortField.FILE_SIZE:
-            sort_column = FileMetadata.file_size
-        elif search_request.sort_by == SortField.FILENAME:
-            sort_column = FileMetadata.filename
-        else:  # RELEVANCE для FTS
-            # TODO: implement ts_rank sorting для full-text search
-            sort_column = FileMetadata.created_at
-
-        if search_request.sort_order == SortOrder.DESC:
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        # LIMIT and OFFSET
-        query = query.limit(search_request.limit).offset(search_request.offset)
-
-        return query
+        return conditions
 
-    def _build_count_query(self, search_request: SearchRequest):
-        """Построение count query (без LIMIT/OFFSET)."""
-        query = select(func.count(FileMetadata.id))
+    @staticmethod
+    def _rank_expression(search_request: SearchRequest):
+        """ts_rank по search_vector (только FULLTEXT с текстом запроса)."""
+        search_text = SearchService._search_text(search_request)
+        if search_request.mode == SearchMode.FULLTEXT and search_text:
+            return rank_expression(search_query_expression(search_text))
+        return None
 
-        # Применение тех же фильтров (код идентичен _build_search_query)
-        conditions = []
+    def _sort_key(self, search_request: SearchRequest) -> tuple:
+        """Поле сортировки: (ключ курсора, атрибут FileMetadata или RELEVANCE)."""
+        if search_request.sort_by == SortField.UPDATED_AT:
+            return search_request.sort_by.value, "updated_at"
+        if search_request.sort_by == SortField.FILE_SIZE:
+            return search_request.sort_by.value, "file_size"
+        if search_request.sort_by == SortField.FILENAME:
+            return search_request.sort_by.value, "filename"
+        if search_request.sort_by == SortField.RELEVANCE and self._rank_expression(search_request) is not None:
+            return search_request.sort_by.value, RELEVANCE
+        # CREATED_AT и RELEVANCE без full-text запроса
+        return search_request.sort_by.value, "created_at"
 
-        if search_request.mode == SearchMode.FULLTEXT and search_request.query:
-            ts_query = func.plainto_tsquery('russian', search_request.query)
-            conditions.append(FileMetadata.search_vector.op('@@')(ts_query))
+    def _build_search_query(self, search_request: SearchRequest):
+        """Построение SQLAlchemy query для поиска."""
+        # FULLTEXT: релевантность вычисляется вместе с выборкой
+        relevance = self._rank_expression(search_request)
+        if relevance is not None:
+            query = select(FileMetadata, relevance.label(RELEVANCE))
+        else:
+            query = select(FileMetadata)
 
-        elif search_request.mode == SearchMode.PARTIAL and search_request.query:
-            conditions.append(
-                or_(
-                    FileMetadata.filename.ilike(f"%{search_request.query}%"),
-                    FileMetadata.description.ilike(f"%{search_request.query}%")
+        # Применение фильтров
+        conditions = self._build_conditions(search_request)
+
+        # Сортировка (id - tie-breaker для стабильного порядка и keyset пагинации)
+        sort_key, sort_attr = self._sort_key(search_request)
+        sort_column = relevance if sort_attr == RELEVANCE else getattr(FileMetadata, sort_attr)
+        descending = search_request.sort_order == SortOrder.DESC
+
+        # Keyset пагинация: записи после курсора вместо OFFSET
+        if search_request.cursor:
+            if sort_attr not in KEYSET_SORT_ATTRS:
+                raise InvalidSearchQueryException(
+                    f"Cursor pagination is not supported for sort by '{sort_key}', use offset",
+                    details={"sort_by": sort_key}
                 )
-            )
-
-        elif search_request.mode == SearchMode.EXACT and search_request.query:
+            try:
+                sort_value, item_id = decode_cursor(search_request.cursor, sort_key)
+            except ValueError as e:
+                raise InvalidSearchQueryException(str(e), details={"cursor": search_request.cursor})
             conditions.append(
-                or_(
-                    FileMetadata.filename == search_request.query,
-                    FileMetadata.description == search_request.query
-                )
+                keyset_condition(sort_column, FileMetadata.id, sort_value, item_id, descending)
             )
 
-        if search_request.filename:
-            conditions.append(FileMetadata.filename.ilike(f"%{search_request.filename}%"))
-
-        if search_request.file_extension:
-            conditions.append(FileMetadata.filename.ilike(f"%{search_request.file_extension}"))
-
-        if search_request.tags:
-            conditions.append(FileMetadata.tags.op('&&')(search_request.tags))
-
-        if search_request.username:
-            conditions.append(FileMetadata.username == search_request.username)
+        # Применение всех условий
+        if conditions:
+            query = query.where(and_(*conditions))
 
-        if search_request.min_size is not None:
-            conditions.append(FileMetadata.file_size >= search_request.min_size)
+        if descending:
+            query = query.order_by(sort_column.desc(), FileMetadata.id.desc())
+        else:
+            query = query.order_by(sort_column.asc(), FileMetadata.id.asc())
 
-        if search_request.max_size is not None:
-            conditions.append(FileMetadata.file_size <= search_request.max_size)
+        # LIMIT + 1 (признак следующей страницы) and OFFSET
+        query = query.limit(search_request.limit + 1)
+        if not search_request.cursor:
+            query = query.offset(search_request.offset)
 
-        if search_request.created_after:
-            conditions.append(FileMetadata.created_at >= search_request.created_after)
+        return query
 
-        if search_request.created_before:
-            conditions.append(FileMetadata.created_at <= search_request.created_before)
+    def _build_count_query(self, search_request: SearchRequest):
+        """Построение count query (без LIMIT/OFFSET)."""
+        query = select(func.count(FileMetadata.id))
 
+        conditions = self._build_conditions(search_request)
         if conditions:
             query = query.where(and_(*conditions))
 
         return query
 
-    def _get_cached_search(self, search_hash: str) -> Optional[Dict[str, Any]]:
-        """Получение результатов поиска из кеша."""
-        # TODO: implement caching через cache_service
-        return None
-
-    def _cache_search_results(self, search_hash: str, results: Dict[str, Any]) -> None:
-        """Сохранение результатов поиска в кеш."""
-        # TODO: implement caching через cache_service
-        pass
-
     async def _record_search_history(
         self,
         search_request: SearchRequest,
         results_count: int,
         response_time_ms: int
     ) -> None:
-        """Запись поискового запроса в историю."""
+        """Постановка поискового запроса в очередь фоновой записи истории (без commit)."""
         try:
-            history = SearchHistory(
-                query_text=search_request.query,
-                search_mode=search_request.mode.value,
-                filters_applied=json.dumps({
-                    "filename": search_request.filename,
-                    "tags": search_request.tags,
-                    "username": search_request.username,
-                    "min_size": search_request.min_size,
-                    "max_size": search_request.max_size,
-                }),
-                results_count=results_count,
-                response_time_ms=response_time_ms,
-                username=search_request.username
-            )
-
-            self.db.add(history)
-            await self.db.commit()
+            search_history_writer.record(search_request, results_count, response_time_ms)
 
         except Exception as e:
             logger.warning(
@@ -370,7 +411,6 @@ class SearchService:
                 extra={"error": str(e)}
             )
             # Не прерываем поиск из-за ошибки логирования
-            await self.db.rollback()
 
     async def get_file_by_id(self, file_id: str) -> Optional[FileMetadata]:
         """Получение метаданных файла по ID.
@@ -0,0 +1,660 @@
+"""
+Query Module - Prefix индекс автодополнения.
+
+Подсказки для GET /api/search/suggest: имена файлов, теги и пользователи,
+начинающиеся с введённого префикса, в порядке частоты.
+
+Структура (на каждый тип подсказки):
+- lex sorted set (все score = 0): member "{нормализованное значение}\\0{значение}",
+  выборка по префиксу - ZRANGEBYLEX за O(log N + M)
+- count sorted set: тот же member → количество файлов с этим значением
+
+Из suggest_scan_limit кандидатов по префиксу возвращаются самые частые.
+Счётчики обновляются инкрементально EventSubscriber по file-events
+(разница значений файла до и после события) и при старте восстанавливаются
+из file_metadata_cache, если индекс ещё не построен.
+
+Изменения во время восстановления не теряются: пока держится rebuild lock,
+каждое изменение (file_id, до, после) атомарно с применением к рабочему
+индексу записывается в журнал. Восстановление читает PostgreSQL одним
+снимком (REPEATABLE READ), затем применяет журнал к новому индексу, пропуская
+изменения файла, уже вошедшие в снимок, и заменяет рабочий индекс только
+при пустом остатке журнала.
+
+Redis включен - индекс общий для всех экземпляров Query Module (Consumer Group
+доставляет событие только одному из них). Redis отключен
+(CACHE_REDIS_ENABLED=off) - индекс в памяти процесса.
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import uuid
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from redis.exceptions import ConnectionError as RedisConnectionError, RedisError, WatchError
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.db.database import get_session_maker
+from app.db.models import FileMetadata
+from app.services.cache_service import CacheService, cache_service
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("filename", "tag", "username")
+
+# Hash tag {suggest}: все ключи в одном слоте Redis Cluster (Lua скрипты)
+KEY_PREFIX = "{suggest}"
+BUILT_KEY = f"{KEY_PREFIX}:built"
+REBUILD_LOCK_KEY = f"{KEY_PREFIX}:rebuild:lock"
+REBUILD_JOURNAL_KEY = f"{KEY_PREFIX}:rebuild:journal"
+REBUILD_LOCK_TTL = 600
+REBUILD_BATCH_SIZE = 1000
+
+_SEPARATOR = "\x00"
+_LEX_MAX = "\U0010ffff"
+
+# Применение изменений счётчиков: ARGV - пары (member, delta)
+_APPLY_SCRIPT = """
+for i = 1, #ARGV, 2 do
+    local member = ARGV[i]
+    local count = tonumber(redis.call('ZINCRBY', KEYS[2], ARGV[i + 1], member))
+    if count <= 0 then
+        redis.call('ZREM', KEYS[2], member)
+        redis.call('ZREM', KEYS[1], member)
+    else
+        redis.call('ZADD', KEYS[1], 0, member)
+    end
+end
+return 1
+"""
+
+# Обновление рабочего индекса по пакету событий (все типы одним скриптом):
+# KEYS[1] - rebuild lock, KEYS[2] - журнал, далее пары (lex, count) по KINDS;
+# ARGV[1] - запись журнала, далее по каждому типу: число пар и пары (member, delta).
+# Пока держится rebuild lock, изменения записываются в журнал атомарно с применением
+_UPDATE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('RPUSH', KEYS[2], ARGV[1])
+end
+local i = 2
+for k = 3, #KEYS, 2 do
+    local n = tonumber(ARGV[i])
+    i = i + 1
+    for _ = 1, n do
+        local member = ARGV[i]
+        local count = tonumber(redis.call('ZINCRBY', KEYS[k + 1], ARGV[i + 1], member))
+        if count <= 0 then
+            redis.call('ZREM', KEYS[k + 1], member)
+            redis.call('ZREM', KEYS[k], member)
+        else
+            redis.call('ZADD', KEYS[k], 0, member)
+        end
+        i = i + 2
+    end
+end
+return 1
+"""
+
+# Захват rebuild lock с очисткой журнала прерванного восстановления
+_ACQUIRE_SCRIPT = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then
+    redis.call('DEL', KEYS[2])
+    return 1
+end
+return 0
+"""
+
+# Освобождение своего rebuild lock (и журнала) без замены индекса
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1], KEYS[2])
+end
+return 1
+"""
+
+# Выборка по префиксу для всех типов за один round-trip: KEYS - пары (lex, count)
+_LOOKUP_SCRIPT = """
+local result = {}
+for k = 1, #KEYS, 2 do
+    local members = redis.call('ZRANGEBYLEX', KEYS[k], ARGV[1], ARGV[2], 'LIMIT', 0, ARGV[3])
+    local entry = {}
+    for _, member in ipairs(members) do
+        table.insert(entry, member)
+        table.insert(entry, redis.call('ZSCORE', KEYS[k + 1], member))
+    end
+    table.insert(result, entry)
+end
+return result
+"""
+
+FileTerms = Dict[str, List[str]]
+# (file_id, значения до события, значения после события)
+FileChange = Tuple[str, Optional[FileTerms], Optional[FileTerms]]
+
+
+def _normalize(value: str) -> str:
+    return " ".join(value.split()).lower()
+
+
+def _member(value: str) -> str:
+    return f"{_normalize(value)}{_SEPARATOR}{value}"
+
+
+def file_terms(
+    filename: Optional[str],
+    tags: Optional[Iterable[str]],
+    username: Optional[str]
+) -> FileTerms:
+    """
+    Значения файла, попадающие в индекс.
+
+    Args:
+        filename: Оригинальное имя файла
+        tags: Теги файла
+        username: Владелец файла
+
+    Returns:
+        FileTerms: {тип подсказки: значения}
+    """
+    return {
+        "filename": [filename] if filename else [],
+        "tag": sorted({tag for tag in tags or [] if tag}),
+        "username": [username] if username else [],
+    }
+
+
+def _deltas(changes: Iterable[FileChange]) -> Dict[str, Counter]:
+    """Суммарное изменение счётчиков по типам: +1 новым значениям, -1 исчезнувшим."""
+    totals: Dict[str, Counter] = {kind: Counter() for kind in KINDS}
+    for _, before, after in changes:
+        for kind in KINDS:
+            totals[kind].update(_member(value) for value in (after or {}).get(kind, []))
+            totals[kind].subtract(_member(value) for value in (before or {}).get(kind, []))
+
+    deltas: Dict[str, Counter] = {}
+    for kind, total in totals.items():
+        delta = Counter({member: count for member, count in total.items() if count})
+        if delta:
+            deltas[kind] = delta
+    return deltas
+
+
+def _unapplied(changes: List[FileChange], snapshot: Optional[FileTerms]) -> List[FileChange]:
+    """
+    Изменения файла, не вошедшие в снимок PostgreSQL.
+
+    Состояния файла: до первого изменения и после каждого. Снимок совпадает
+    с одним из них - применяются изменения после последнего совпадения
+    (повтор состояния в цепочке даёт нулевую сумму пропущенных изменений).
+    """
+    states = [changes[0][1]] + [after for _, _, after in changes]
+    for position in range(len(states) - 1, -1, -1):
+        if states[position] == snapshot:
+            return changes[position:]
+
+    logger.warning(
+        "Suggest index journal does not match rebuild snapshot, applying all changes",
+        extra={"file_id": changes[0][0], "changes": len(changes)}
+    )
+    return changes
+
+
+class _MemoryPrefixIndex:
+    """Prefix индекс в памяти процесса (отсортированный список + счётчики)."""
+
+    def __init__(self):
+        self._members: Dict[str, List[str]] = {kind: [] for kind in KINDS}
+        self._counts: Dict[str, Dict[str, int]] = {kind: {} for kind in KINDS}
+        self.built = False
+
+    def apply(self, kind: str, delta: Counter) -> None:
+        members = self._members[kind]
+        counts = self._counts[kind]
+        for member, change in delta.items():
+            count = counts.get(member, 0) + change
+            if count > 0:
+                if member not in counts:
+                    bisect.insort(members, member)
+                counts[member] = count
+            elif member in counts:
+                del counts[member]
+                del members[bisect.bisect_left(members, member)]
+
+    def lookup(self, prefix: str, scan_limit: int) -> List[List[Tuple[str, int]]]:
+        result = []
+        for kind in KINDS:
+            members = self._members[kind]
+            start = bisect.bisect_left(members, prefix)
+            end = bisect.bisect_left(members, prefix + _LEX_MAX, lo=start)
+            candidates = members[start:min(end, start + scan_limit)]
+            result.append([(member, self._counts[kind][member]) for member in candidates])
+        return result
+
+    def clear(self) -> None:
+        for kind in KINDS:
+            self._members[kind].clear()
+            self._counts[kind].clear()
+
+
+class SuggestIndex:
+    """
+    Prefix индекс подсказок с инкрементальным обновлением по file-events.
+
+    Usage:
+        before = await suggest_index.get_file_terms(file_id)
+        ... CacheSyncService ...
+        await suggest_index.update(file_id, before, file_terms(filename, tags, username))
+
+        suggestions = await suggest_index.suggest("ann", limit=10)
+    """
+
+    def __init__(self, cache: CacheService):
+        """
+        Args:
+            cache: Multi-level cache (Redis client для sorted sets)
+        """
+        self.redis_cache = cache.redis_cache
+        self._memory = _MemoryPrefixIndex()
+        self._rebuild_task: Optional[asyncio.Task] = None
+        # Журнал изменений во время восстановления in-memory индекса
+        self._journal: Optional[List[FileChange]] = None
+
+    @staticmethod
+    def _keys(kind: str, rebuild: bool = False) -> Tuple[str, str]:
+        suffix = ":rebuild" if rebuild else ""
+        return f"{KEY_PREFIX}:{kind}{suffix}", f"{KEY_PREFIX}:{kind}:count{suffix}"
+
+    async def initialize(self) -> None:
+        """
+        Запуск восстановления индекса из PostgreSQL в фоне, если индекс не построен.
+
+        Вызывается при старте приложения после init_db() и cache_service.initialize().
+        """
+        if not settings.search.suggest_enabled:
+            return
+
+        if self.redis_cache is None:
+            built = self._memory.built
+        else:
+            client = await self.redis_cache.get_client()
+            if client is None:
+                logger.warning("Suggest index rebuild skipped: Redis unavailable")
+                return
+            try:
+                built = bool(await client.exists(BUILT_KEY))
+            except (RedisError, RedisConnectionError) as e:
+                self.redis_cache.mark_unavailable()
+                logger.warning("Suggest index rebuild skipped", extra={"error": str(e)})
+                return
+
+        if not built:
+            self._rebuild_task = asyncio.create_task(self.rebuild())
+
+    async def close(self) -> None:
+        """Остановка фонового восстановления индекса."""
+        if self._rebuild_task and not self._rebuild_task.done():
+            self._rebuild_task.cancel()
+            try:
+                await self._rebuild_task
+            except asyncio.CancelledError:
+                pass
+        self._rebuild_task = None
+
+    async def rebuild(self) -> bool:
+        """
+        Полное восстановление индекса из file_metadata_cache.
+
+        Значения агрегируются в PostgreSQL (GROUP BY) и загружаются пачками
+        из одного снимка (REPEATABLE READ). Изменения, пришедшие во время
+        восстановления, берутся из журнала и применяются к новому индексу.
+        В Redis индекс строится во временных ключах и заменяет рабочий через
+        RENAME; одновременно строит только один экземпляр (SET NX lock).
+
+        Returns:
+            bool: True если индекс построен
+        """
+        client = None
+        token = uuid.uuid4().hex
+        if self.redis_cache is not None:
+            client = await self.redis_cache.get_client()
+            if client is None:
+                return False
+            try:
+                acquired = await client.eval(
+                    _ACQUIRE_SCRIPT, 2, REBUILD_LOCK_KEY, REBUILD_JOURNAL_KEY, token, REBUILD_LOCK_TTL
+                )
+            except (RedisError, RedisConnectionError) as e:
+                self.redis_cache.mark_unavailable()
+                logger.warning("Suggest index rebuild failed", extra={"error": str(e)})
+                return False
+            if not acquired:
+                logger.info("Suggest index rebuild already running on another instance")
+                return False
+        elif self._journal is not None:
+            return False
+        else:
+            self._journal = []
+
+        try:
+            async with get_session_maker()() as session:
+                # Один снимок для всех типов и сверки журнала
+                await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+                if client is None:
+                    memory = _MemoryPrefixIndex()
+                    totals = await self._load_snapshot(session, memory=memory)
+                    seen: Set[str] = set()
+                    while self._journal:
+                        changes, self._journal = self._journal, []
+                        for kind, delta in _deltas(await self._reconcile(session, seen, changes)).items():
+                            memory.apply(kind, delta)
+                    # Без await между проверкой журнала и заменой индекса
+                    memory.built = True
+                    self._memory = memory
+                    self._journal = None
+                else:
+                    totals = await self._load_snapshot(session, client=client)
+                    if not await self._replay_and_swap(session, client, token):
+                        logger.warning("Suggest index rebuild aborted: rebuild lock lost")
+                        return False
+
+            logger.info("Suggest index rebuilt", extra={"entries": dict(totals)})
+            return True
+
+        except (RedisError, RedisConnectionError) as e:
+            self.redis_cache.mark_unavailable()
+            logger.warning("Suggest index rebuild failed", extra={"error": str(e)})
+            return False
+        finally:
+            if client is None:
+                self._journal = None
+            else:
+                try:
+                    await client.eval(_RELEASE_SCRIPT, 2, REBUILD_LOCK_KEY, REBUILD_JOURNAL_KEY, token)
+                except (RedisError, RedisConnectionError):
+                    pass
+
+    async def _load_snapshot(self, session, client=None, memory: Optional[_MemoryPrefixIndex] = None) -> Counter:
+        """
+        Загрузка значений из снимка PostgreSQL во временные ключи Redis или in-memory индекс.
+
+        Returns:
+            Counter: Количество значений по типам
+        """
+        queries = {
+            "filename": select(FileMetadata.filename, func.count()).group_by(FileMetadata.filename),
+            "tag": (
+                select(func.unnest(FileMetadata.tags).label("tag"), func.count())
+                .group_by("tag")
+            ),
+            "username": select(FileMetadata.username, func.count()).group_by(FileMetadata.username),
+        }
+        totals: Counter = Counter()
+
+        for kind, query in queries.items():
+            tmp_lex_key, tmp_count_key = self._keys(kind, rebuild=True)
+            if client is not None:
+                await client.delete(tmp_lex_key, tmp_count_key)
+
+            rows = await session.stream(query.execution_options(yield_per=REBUILD_BATCH_SIZE))
+            async for batch in rows.partitions(REBUILD_BATCH_SIZE):
+                delta = Counter({_member(value): count for value, count in batch if value})
+                totals[kind] += len(delta)
+                if memory is not None:
+                    memory.apply(kind, delta)
+                    continue
+                async with client.pipeline(transaction=False) as pipe:
+                    pipe.zadd(tmp_lex_key, {member: 0 for member in delta})
+                    pipe.zadd(tmp_count_key, dict(delta))
+                    pipe.expire(REBUILD_LOCK_KEY, REBUILD_LOCK_TTL)
+                    await pipe.execute()
+
+        return totals
+
+    async def _reconcile(self, session, seen: Set[str], changes: List[FileChange]) -> List[FileChange]:
+        """
+        Изменения журнала, которые нужно применить к индексу из снимка.
+
+        Для файла, впервые встреченного в журнале, пропускаются изменения,
+        уже вошедшие в снимок (сверка со значениями файла в том же снимке).
+
+        Args:
+            session: Сессия с транзакцией снимка
+            seen: Файлы, уже сверенные со снимком (обновляется)
+            changes: Изменения журнала в порядке применения
+
+        Returns:
+            List[FileChange]: Изменения для применения
+        """
+        by_file: Dict[str, List[FileChange]] = {}
+        for change in changes:
+            by_file.setdefault(change[0], []).append(change)
+
+        new_ids = [file_id for file_id in by_file if file_id not in seen]
+        snapshot: Dict[str, FileTerms] = {}
+        if new_ids:
+            query = select(
+                FileMetadata.id, FileMetadata.filename, FileMetadata.tags, FileMetadata.username
+            ).where(FileMetadata.id.in_(new_ids))
+            for file_id, filename, tags, username in (await session.execute(query)).all():
+                snapshot[str(file_id)] = file_terms(filename, tags, username)
+
+        result: List[FileChange] = []
+        for file_id, file_changes in by_file.items():
+            if file_id in seen:
+                result.extend(file_changes)
+            else:
+                result.extend(_unapplied(file_changes, snapshot.get(file_id)))
+                seen.add(file_id)
+        return result
+
+    async def _replay_and_swap(self, session, client, token: str) -> bool:
+        """
+        Применение журнала к временным ключам и замена рабочего индекса.
+
+        Замена выполняется в MULTI под WATCH журнала и lock: изменение,
+        записанное после последнего чтения журнала, отменяет замену
+        и применяется следующим проходом.
+
+        Returns:
+            bool: False если rebuild lock потерян (истёк или захвачен другим экземпляром)
+        """
+        processed = 0
+        seen: Set[str] = set()
+
+        while True:
+            entries = await client.lrange(REBUILD_JOURNAL_KEY, processed, -1)
+            if entries:
+                processed += len(entries)
+                changes = [tuple(change) for entry in entries for change in json.loads(entry)]
+                deltas = _deltas(await self._reconcile(session, seen, changes))
+                async with client.pipeline(transaction=False) as pipe:
+                    for kind, delta in deltas.items():
+                        args = [value for member, change in delta.items() for value in (member, change)]
+                        pipe.eval(_APPLY_SCRIPT, 2, *self._keys(kind, rebuild=True), *args)
+                    pipe.expire(REBUILD_LOCK_KEY, REBUILD_LOCK_TTL)
+                    await pipe.execute()
+                continue
+
+            async with client.pipeline(transaction=True) as pipe:
+                await pipe.watch(REBUILD_JOURNAL_KEY, REBUILD_LOCK_KEY)
+                if await pipe.get(REBUILD_LOCK_KEY) != token:
+                    return False
+                if await pipe.llen(REBUILD_JOURNAL_KEY) != processed:
+                    continue
+
+                renames = []
+                for kind in KINDS:
+                    for key, tmp_key in zip(self._keys(kind), self._keys(kind, rebuild=True)):
+                        if await pipe.exists(tmp_key):
+                            renames.append((tmp_key, key))
+
+                pipe.multi()
+                for kind in KINDS:
+                    pipe.delete(*self._keys(kind))
+                for tmp_key, key in renames:
+                    pipe.rename(tmp_key, key)
+                pipe.set(BUILT_KEY, "1")
+                pipe.delete(REBUILD_JOURNAL_KEY, REBUILD_LOCK_KEY)
+                try:
+                    await pipe.execute()
+                except WatchError:
+                    continue
+                return True
+
+    async def get_file_terms(self, file_id: str) -> Optional[FileTerms]:
+        """
+        Текущие значения файла в file_metadata_cache (до применения события).
+
+        Args:
+            file_id: UUID файла
+
+        Returns:
+            Optional[FileTerms]: Значения или None, если файла нет в кеше
+        """
+        if not settings.search.suggest_enabled:
+            return None
+
+        query = select(FileMetadata.filename, FileMetadata.tags, FileMetadata.username).where(
+            FileMetadata.id == file_id
+        )
+        async with get_session_maker()() as session:
+            row = (await session.execute(query)).one_or_none()
+
+        return file_terms(*row) if row else None
+
+    async def get_files_terms(self, file_ids: List[str]) -> Dict[str, FileTerms]:
+        """
+        Текущие значения пакета файлов одним запросом (пакетная обработка событий).
+
+        Args:
+            file_ids: UUID файлов
+
+        Returns:
+            Dict[str, FileTerms]: {file_id: значения} для файлов, найденных в кеше
+        """
+        if not settings.search.suggest_enabled or not file_ids:
+            return {}
+
+        query = select(
+            FileMetadata.id, FileMetadata.filename, FileMetadata.tags, FileMetadata.username
+        ).where(FileMetadata.id.in_(file_ids))
+        async with get_session_maker()() as session:
+            rows = (await session.execute(query)).all()
+
+        return {str(file_id): file_terms(filename, tags, username) for file_id, filename, tags, username in rows}
+
+    async def update(
+        self,
+        file_id: str,
+        before: Optional[FileTerms],
+        after: Optional[FileTerms]
+    ) -> None:
+        """
+        Инкрементальное обновление индекса по событию файла.
+
+        Args:
+            file_id: UUID файла
+            before: Значения файла до события (None - файла не было)
+            after: Значения файла после события (None - файл удалён)
+        """
+        await self.update_many([(file_id, before, after)])
+
+    async def update_many(self, changes: Iterable[FileChange]) -> None:
+        """
+        Обновление индекса по пакету событий: изменения счётчиков суммируются
+        и применяются одним скриптом (во время восстановления - с записью в журнал).
+
+        Args:
+            changes: (file_id, значения до события, значения после события)
+        """
+        if not settings.search.suggest_enabled:
+            return
+
+        changes = list(changes)
+        deltas = _deltas(changes)
+        if not deltas:
+            return
+
+        if self.redis_cache is None:
+            if self._journal is not None:
+                self._journal.extend(changes)
+            for kind, delta in deltas.items():
+                self._memory.apply(kind, delta)
+            return
+
+        client = await self.redis_cache.get_client()
+        if client is None:
+            logger.warning("Suggest index update skipped: Redis unavailable")
+            return
+
+        keys = [REBUILD_LOCK_KEY, REBUILD_JOURNAL_KEY]
+        args = [json.dumps(changes)]
+        for kind in KINDS:
+            keys.extend(self._keys(kind))
+            delta = deltas.get(kind, Counter())
+            args.append(len(delta))
+            args.extend(value for member, change in delta.items() for value in (member, change))
+
+        try:
+            await client.eval(_UPDATE_SCRIPT, len(keys), *keys, *args)
+        except (RedisError, RedisConnectionError) as e:
+            self.redis_cache.mark_unavailable()
+            logger.warning("Suggest index update failed", extra={"error": str(e)})
+
+    async def suggest(self, prefix: str, limit: int) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        Подсказки по префиксу.
+
+        Args:
+            prefix: Введённый пользователем префикс
+            limit: Количество подсказок каждого типа
+
+        Returns:
+            Dict[str, List[Tuple[str, int]]]: {тип: [(значение, количество файлов)]}
+                в порядке убывания частоты
+        """
+        normalized = _normalize(prefix)
+        scan_limit = max(limit, settings.search.suggest_scan_limit)
+
+        if self.redis_cache is None:
+            candidates = self._memory.lookup(normalized, scan_limit)
+        else:
+            candidates = await self._redis_lookup(normalized, scan_limit)
+
+        suggestions = {}
+        for kind, entries in zip(KINDS, candidates):
+            ranked = sorted(entries, key=lambda entry: (-entry[1], entry[0]))[:limit]
+            suggestions[kind] = [(member.split(_SEPARATOR, 1)[1], count) for member, count in ranked]
+        return suggestions
+
+    async def _redis_lookup(self, prefix: str, scan_limit: int) -> List[List[Tuple[str, int]]]:
+        """Кандидаты из Redis одним Lua скриптом (пустой результат - Redis недоступен)."""
+        empty = [[] for _ in KINDS]
+
+        client = await self.redis_cache.get_client()
+        if client is None:
+            return empty
+
+        keys = [key for kind in KINDS for key in self._keys(kind)]
+        try:
+            result = await client.eval(
+                _LOOKUP_SCRIPT, len(keys), *keys, f"[{prefix}", f"[{prefix}{_LEX_MAX}", scan_limit
+            )
+        except (RedisError, RedisConnectionError) as e:
+            self.redis_cache.mark_unavailable()
+            logger.warning("Suggest lookup failed", extra={"error": str(e)})
+            return empty
+
+        return [
+            [(entry[i], int(float(entry[i + 1] or 0))) for i in range(0, len(entry), 2)]
+            for entry in result
+        ]
+
+
+# Global instance
+suggest_index = SuggestIndex(cache_service)
@@ -0,0 +1,61 @@
+"""
+Microbenchmark LocalCache на 100k+ записей.
+
+Измеряет ops/sec set (с вытеснением при заполненном кеше) и get
+(попадания и промахи). Вытеснение O(1): стоимость set не растёт
+с размером кеша.
+
+Run:
+    pytest tests/performance/test_local_cache_benchmark.py -m slow -s
+"""
+
+import time
+
+import pytest
+
+from app.services.cache_service import LocalCache
+
+ENTRIES = 200_000
+MAX_SIZE = 100_000
+
+
+def _metadata(i: int) -> dict:
+    return {
+        "file_id": f"file-{i}",
+        "filename": f"document-{i}.pdf",
+        "file_size": i * 1024,
+        "storage_element_url": "http://storage:8010",
+    }
+
+
+def _ops_per_sec(count: int, elapsed: float) -> float:
+    return count / elapsed if elapsed else float("inf")
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("max_bytes", [None, MAX_SIZE * 128], ids=["entries", "byte_budget"])
+def test_local_cache_throughput(max_bytes):
+    """ops/sec set/get при ENTRIES вставках в кеш на MAX_SIZE записей."""
+    cache = LocalCache(ttl_seconds=300, max_size=MAX_SIZE, max_bytes=max_bytes, name="benchmark")
+    values = [_metadata(i) for i in range(ENTRIES)]
+
+    started = time.perf_counter()
+    for i, value in enumerate(values):
+        cache.set(f"file:{i}", value)
+    set_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(ENTRIES):
+        cache.get(f"file:{i}")
+    get_elapsed = time.perf_counter() - started
+
+    print(
+        f"\nLocalCache ({ENTRIES} sets, max_size {MAX_SIZE}, max_bytes {max_bytes}):\n"
+        f"  set: {_ops_per_sec(ENTRIES, set_elapsed):12.0f} ops/sec\n"
+        f"  get: {_ops_per_sec(ENTRIES, get_elapsed):12.0f} ops/sec "
+        f"(hits {cache.hits}, misses {cache.misses}, evictions {cache.evictions})"
+    )
+
+    assert cache.entries <= MAX_SIZE
+    assert cache.evictions >= ENTRIES - MAX_SIZE
+    assert cache.hits + cache.misses == ENTRIES
@@ -0,0 +1,175 @@
+"""
+Load test partition streams на локальном Redis.
+
+Публикует синтетические file-events в {stream}:{crc32(file_id) % N}
+(формула Admin Module EventPublisher) и читает их несколькими
+consumers с PartitionCoordinator. Посередине прогона добавляется
+экземпляр (rebalance on join), в конце один останавливается
+(rebalance on leave).
+
+Проверяет:
+- Каждое событие подтверждено ровно один раз
+- Порядок событий каждого файла сохранён
+- Throughput публикации и потребления (events/sec)
+
+Run (нужен Redis на REDIS_HOST:REDIS_PORT, по умолчанию localhost:6379):
+    pytest tests/performance/test_partitioned_events_load.py -m slow -s
+"""
+
+import asyncio
+import os
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+from uuid import uuid4
+
+import pytest
+
+redis_asyncio = pytest.importorskip("redis.asyncio")
+
+from app.services.partition_coordinator import (  # noqa: E402
+    PartitionCoordinator,
+    partition_stream_name,
+    stream_partition,
+)
+
+PARTITIONS = 8
+FILES = 500
+EVENTS_PER_FILE = 20
+LEASE = 5
+GROUP = "query-module-load"
+EVENT_TYPES = ["file:created", "file:updated", "file:updated", "file:deleted"]
+
+
+@pytest.fixture
+async def redis_client():
+    client = redis_asyncio.Redis(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", "6379")),
+        decode_responses=True,
+    )
+    try:
+        await client.ping()
+    except Exception as e:
+        await client.aclose()
+        pytest.skip(f"Local Redis unavailable: {e}")
+
+    stream_name = f"file-events-load-{uuid4().hex[:8]}"
+    yield client, stream_name
+
+    keys = [key async for key in client.scan_iter(match=f"{stream_name}*")]
+    if keys:
+        await client.delete(*keys)
+    await client.aclose()
+
+
+async def _publish(client, stream_name: str, file_ids: List[str]) -> float:
+    """XADD событий всех файлов в partition streams (pipeline по 1000)."""
+    started = time.perf_counter()
+    async with client.pipeline(transaction=False) as pipe:
+        for seq in range(EVENTS_PER_FILE):
+            for file_id in file_ids:
+                stream = partition_stream_name(
+                    stream_name, stream_partition(file_id, PARTITIONS), PARTITIONS
+                )
+                pipe.xadd(stream, {
+                    "event_type": EVENT_TYPES[seq % len(EVENT_TYPES)],
+                    "file_id": file_id,
+                    "seq": seq,
+                })
+                if len(pipe) >= 1000:
+                    await pipe.execute()
+        await pipe.execute()
+    return time.perf_counter() - started
+
+
+async def _consume(
+    client,
+    stream_name: str,
+    name: str,
+    seen: Dict[str, List[Tuple[int, str]]],
+    stop: asyncio.Event,
+) -> None:
+    """Consumer: rebalance между пакетами, XREADGROUP захваченных partitions, XACK."""
+    coordinator = PartitionCoordinator(client, stream_name, PARTITIONS, name, LEASE)
+    try:
+        while not stop.is_set():
+            if coordinator.rebalance_due():
+                acquired, _ = await coordinator.rebalance()
+                for partition in acquired:
+                    try:
+                        await client.xgroup_create(
+                            coordinator.stream(partition), GROUP, id="0", mkstream=True
+                        )
+                    except redis_asyncio.ResponseError as e:
+                        if "BUSYGROUP" not in str(e):
+                            raise
+
+            streams = coordinator.streams()
+            if not streams:
+                await asyncio.sleep(0.05)
+                continue
+
+            events = await client.xreadgroup(
+                GROUP, name, {stream: ">" for stream in streams}, count=100, block=100
+            )
+            for stream, messages in events or []:
+                for event_id, data in messages:
+                    seen[data["file_id"]].append((int(data["seq"]), name))
+                await client.xack(stream, GROUP, *[event_id for event_id, _ in messages])
+    finally:
+        await coordinator.release_all()
+
+
+@pytest.mark.slow
+async def test_partitioned_consumers_preserve_per_file_order(redis_client):
+    """Throughput и порядок событий файла при join/leave экземпляров."""
+    client, stream_name = redis_client
+    file_ids = [str(uuid4()) for _ in range(FILES)]
+    total = FILES * EVENTS_PER_FILE
+    seen: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+
+    stops = {name: asyncio.Event() for name in ("query-a", "query-b", "query-c")}
+    consumers = {
+        name: asyncio.create_task(_consume(client, stream_name, name, seen, stops[name]))
+        for name in ("query-a", "query-b")
+    }
+    await asyncio.sleep(0.5)
+
+    started = time.perf_counter()
+    publish_elapsed = await _publish(client, stream_name, file_ids)
+
+    # Join: третий экземпляр забирает часть partitions
+    consumers["query-c"] = asyncio.create_task(
+        _consume(client, stream_name, "query-c", seen, stops["query-c"])
+    )
+
+    while sum(len(events) for events in seen.values()) < total / 2:
+        await asyncio.sleep(0.05)
+
+    # Leave: partitions query-b возвращаются оставшимся экземплярам
+    stops["query-b"].set()
+    await consumers.pop("query-b")
+
+    deadline = time.perf_counter() + 60
+    while sum(len(events) for events in seen.values()) < total:
+        assert time.perf_counter() < deadline, "Events were not consumed in time"
+        await asyncio.sleep(0.05)
+    consume_elapsed = time.perf_counter() - started
+
+    for name, task in consumers.items():
+        stops[name].set()
+        await task
+
+    consumers_per_file = [len({name for _, name in events}) for events in seen.values()]
+    print(
+        f"\nPartitioned events ({total} events, {FILES} files, {PARTITIONS} partitions):\n"
+        f"  publish: {total / publish_elapsed:12.0f} events/sec\n"
+        f"  consume: {total / consume_elapsed:12.0f} events/sec\n"
+        f"  files handed over between consumers: "
+        f"{sum(1 for count in consumers_per_file if count > 1)}"
+    )
+
+    assert sum(len(events) for events in seen.values()) == total
+    for file_id in file_ids:
+        assert [seq for seq, _ in seen[file_id]] == list(range(EVENTS_PER_FILE))
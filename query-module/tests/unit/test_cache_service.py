@@ -83,6 +83,78 @@ class TestLocalCache:
         assert cache.get("key1") is None
         assert cache.get("key2") is None
 
+    def test_get_refreshes_lru_order(self):
+        """Тест LRU: прочитанная запись не вытесняется первой."""
+        cache = LocalCache(ttl_seconds=300, max_size=2)
+
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+        cache.get("key1")
+        cache.set("key3", "value3")  # Вытесняет key2 (least recently used)
+
+        assert cache.get("key1") == "value1"
+        assert cache.get("key2") is None
+        assert cache.evictions == 1
+
+    def test_byte_budget_eviction(self):
+        """Тест вытеснения по byte budget вместо количества записей."""
+        cache = LocalCache(ttl_seconds=300, max_size=1000, max_bytes=10)
+
+        cache.set("key1", "aaaa")
+        cache.set("key2", "bbbb")
+        cache.set("key3", "cccc")  # 12 bytes > 10 - вытесняет key1
+
+        assert cache.get("key1") is None
+        assert cache.get("key3") == "cccc"
+        assert cache.size_bytes == 8
+
+        # Значение больше budget не кешируется
+        cache.set("big", "x" * 11)
+        assert cache.get("big") is None
+        assert cache.entries == 2
+
+    def test_ttl_uses_monotonic_clock(self):
+        """Тест TTL по монотонным часам."""
+        cache = LocalCache(ttl_seconds=60)
+
+        with patch("app.services.cache_service.time.monotonic", return_value=1000.0):
+            cache.set("key1", "value1")
+        with patch("app.services.cache_service.time.monotonic", return_value=1059.0):
+            assert cache.get("key1") == "value1"
+        with patch("app.services.cache_service.time.monotonic", return_value=1061.0):
+            assert cache.get("key1") is None
+
+    def test_hit_miss_counters(self):
+        """Тест счётчиков попаданий и промахов (Prometheus)."""
+        from app.core.metrics import local_cache_hits_total, local_cache_misses_total
+
+        cache = LocalCache(name="test_counters")
+        hits_before = local_cache_hits_total.labels(cache="test_counters")._value.get()
+        misses_before = local_cache_misses_total.labels(cache="test_counters")._value.get()
+
+        cache.set("key1", "value1")
+        cache.get("key1")
+        cache.get("missing")
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert local_cache_hits_total.labels(cache="test_counters")._value.get() == hits_before + 1
+        assert local_cache_misses_total.labels(cache="test_counters")._value.get() == misses_before + 1
+
+    def test_cache_service_uses_settings(self):
+        """Тест конфигурации local cache из settings.cache."""
+        with patch("app.services.cache_service.settings") as mock_settings:
+            mock_settings.cache.local_enabled = True
+            mock_settings.cache.redis_enabled = False
+            mock_settings.cache.local_ttl = 42
+            mock_settings.cache.local_max_size = 5000
+            mock_settings.cache.local_max_bytes = 0
+
+            service = CacheService()
+
+        assert service.local_cache.ttl_seconds == 42
+        assert service.local_cache.max_size == 5000
+        assert service.local_cache.max_bytes is None
+
 
 # ========================================
 # RedisCacheService Tests (async)
@@ -197,6 +269,15 @@ class TestRedisCacheService:
 # CacheService Tests (async multi-level)
 # ========================================
 
+def _mock_settings() -> MagicMock:
+    """Mock settings с числовыми параметрами local cache (LocalCache их сравнивает)."""
+    mock_settings = MagicMock()
+    mock_settings.cache.local_ttl = 300
+    mock_settings.cache.local_max_size = 1000
+    mock_settings.cache.local_max_bytes = 0
+    return mock_settings
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 class TestCacheService:
@@ -212,7 +293,7 @@ class TestCacheService:
 
     async def test_get_from_local_cache(self):
         """Тест получения из local cache (быстрый путь, sync)."""
-        mock_settings = MagicMock()
+        mock_settings = _mock_settings()
         mock_settings.cache.local_enabled = True
         mock_settings.cache.redis_enabled = False
 
@@ -236,7 +317,7 @@ class TestCacheService:
         mock_redis.get = AsyncMock(return_value=metadata_json)
         mock_redis.ping = AsyncMock(return_value=True)
 
-        mock_settings = MagicMock()
+        mock_settings = _mock_settings()
         mock_settings.cache.local_enabled = True
         mock_settings.cache.redis_enabled = True
         mock_settings.redis.url = "redis://localhost:6379"
@@ -264,7 +345,7 @@ class TestCacheService:
         mock_redis.get = AsyncMock(return_value=None)
         mock_redis.ping = AsyncMock(return_value=True)
 
-        mock_settings = MagicMock()
+        mock_settings = _mock_settings()
         mock_settings.cache.local_enabled = True
         mock_settings.cache.redis_enabled = True
         mock_settings.redis.url = "redis://localhost:6379"
@@ -287,7 +368,7 @@ class TestCacheService:
         mock_redis.setex = AsyncMock()
         mock_redis.ping = AsyncMock(return_value=True)
 
-        mock_settings = MagicMock()
+        mock_settings = _mock_settings()
         mock_settings.cache.local_enabled = True
         mock_settings.cache.redis_enabled = True
         mock_settings.cache.redis_ttl = 1800
@@ -319,7 +400,7 @@ class TestCacheService:
         mock_redis.ping = AsyncMock(return_value=True)
         mock_redis.setex = AsyncMock()
 
-        mock_settings = MagicMock()
+        mock_settings = _mock_settings()
         mock_settings.cache.local_enabled = True
         mock_settings.cache.redis_enabled = True
         mock_settings.cache.redis_ttl = 1800
@@ -355,7 +436,7 @@ class TestCacheService:
         mock_redis.delete = AsyncMock(return_value=1)
         mock_redis.ping = AsyncMock(return_value=True)
 
-        mock_settings = MagicMock()
+        mock_settings = _mock_settings()
         mock_settings.cache.local_enabled = True
         mock_settings.cache.redis_enabled = True
         mock_settings.redis.url = "redis://localhost:6379"
@@ -380,7 +461,7 @@ class TestCacheService:
         mock_redis.close = AsyncMock()
         mock_redis.ping = AsyncMock(return_value=True)
 
-        mock_settings = MagicMock()
+        mock_settings = _mock_settings()
         mock_settings.cache.local_enabled = True
         mock_settings.cache.redis_enabled = True
         mock_settings.redis.url = "redis://localhost:6379"
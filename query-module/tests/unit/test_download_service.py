@@ -242,3 +242,39 @@ class TestDownloadService:
                     file_id="test-id",
                     storage_element_url="http://storage:8010"
                 )
+
+    def test_public_storage_element_url(self, download_service, monkeypatch):
+        """Тест публичного URL SE: только из DOWNLOAD_PUBLIC_URLS, иначе proxy."""
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings.download, "public_urls", {"se-01": "https://se-01.example.com"})
+
+        assert download_service.public_storage_element_url("se-01") == "https://se-01.example.com"
+        assert download_service.public_storage_element_url("se-02") is None
+        assert download_service.public_storage_element_url(None) is None
+
+    def test_build_redirect_url_signs_file_and_range(self, download_service, monkeypatch):
+        """Тест redirect URL: путь SE API и токен, ограниченный файлом и диапазоном."""
+        import base64
+        import json
+        from urllib.parse import parse_qs, urlparse
+
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings.download, "signing_key", "test-signing-key")
+
+        url = download_service.build_redirect_url(
+            file_id="test-id",
+            public_url="https://se-01.example.com/",
+            range_request=RangeRequest(start=100, end=199)
+        )
+
+        parsed = urlparse(url)
+        assert parsed.netloc == "se-01.example.com"
+        assert parsed.path == "/api/v1/files/test-id/download"
+
+        token = parse_qs(parsed.query)["token"][0]
+        encoded_payload = token.split(".")[0]
+        payload = json.loads(base64.urlsafe_b64decode(encoded_payload + "=" * (-len(encoded_payload) % 4)))
+        assert payload["fid"] == "test-id"
+        assert payload["rng"] == [100, 199]
@@ -0,0 +1,142 @@
+"""
+Unit tests для фоновой записи статистики скачиваний.
+
+Тестирует:
+- Запись пакета при достижении flush_size и по flush_interval
+- Отбрасывание записей при заполненной очереди (backpressure)
+- Отбрасывание пакета при ошибке записи
+- Запись оставшихся записей при остановке
+- Почасовые агрегаты пакета
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+
+from app.core.metrics import batch_writer_dropped_total, batch_writer_written_total
+from app.services.batch_writer import BatchWriter
+from app.services.download_stats import rollup
+
+
+class _RecordingWriter(BatchWriter[int]):
+    def __init__(self, **kwargs):
+        params = {"queue_size": 100, "flush_size": 3, "flush_interval_ms": 50}
+        params.update(kwargs)
+        super().__init__(name="test", **params)
+        self.batches: List[List[int]] = []
+        self.fail = False
+
+    async def write(self, batch: List[int]) -> None:
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        self.batches.append(list(batch))
+
+
+def _dropped(reason: str) -> float:
+    return batch_writer_dropped_total.labels(writer="test", reason=reason)._value.get()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestBatchWriter:
+    """Tests для BatchWriter."""
+
+    async def test_flush_by_size_and_interval(self):
+        writer = _RecordingWriter()
+        await writer.start()
+
+        for record in range(4):
+            assert writer.submit(record)
+        await asyncio.sleep(0.15)
+
+        assert writer.batches == [[0, 1, 2], [3]]
+        await writer.close()
+
+    async def test_not_started_writer_ignores_records(self):
+        writer = _RecordingWriter()
+
+        assert writer.submit(1) is False
+
+        await writer.close()
+        assert writer.batches == []
+
+    async def test_full_queue_drops_records(self):
+        writer = _RecordingWriter(queue_size=2)
+        await writer.start()
+        dropped_before = _dropped("queue_full")
+
+        # Фоновая задача не получает управление между submit()
+        results = [writer.submit(record) for record in range(5)]
+
+        assert results == [True, True, False, False, False]
+        assert _dropped("queue_full") == dropped_before + 3
+        await writer.close()
+        assert writer.batches == [[0, 1]]
+
+    async def test_write_error_drops_batch_and_continues(self):
+        writer = _RecordingWriter(flush_size=2)
+        await writer.start()
+        dropped_before = _dropped("write_error")
+
+        writer.fail = True
+        writer.submit(1)
+        writer.submit(2)
+        await asyncio.sleep(0.01)
+
+        writer.fail = False
+        writer.submit(3)
+        await writer.close()
+
+        assert _dropped("write_error") == dropped_before + 2
+        assert writer.batches == [[3]]
+
+    async def test_close_flushes_queue(self):
+        writer = _RecordingWriter(flush_size=10, flush_interval_ms=10000)
+        await writer.start()
+        written_before = batch_writer_written_total.labels(writer="test")._value.get()
+
+        for record in range(5):
+            writer.submit(record)
+        await writer.close()
+
+        assert writer.batches == [[0, 1, 2, 3, 4]]
+        assert batch_writer_written_total.labels(writer="test")._value.get() == written_before + 5
+        assert not writer.running
+
+
+@pytest.mark.unit
+class TestDownloadStatsRollup:
+    """Tests для почасовой агрегации пакета."""
+
+    @staticmethod
+    def _record(file_id: str, minute: int, hour: int = 10, resumed: bool = False) -> dict:
+        return {
+            "file_id": file_id,
+            "bytes_transferred": 100,
+            "download_time_ms": 20,
+            "was_resumed": resumed,
+            "username": "anna",
+            "storage_element_id": "se-01",
+            "created_at": datetime(2026, 10, 16, hour, minute, tzinfo=timezone.utc),
+        }
+
+    def test_rollup_groups_by_hour_file_and_storage(self):
+        rows = rollup([
+            self._record("a", 5),
+            self._record("a", 40, resumed=True),
+            self._record("b", 10),
+            self._record("a", 2, hour=11),
+        ])
+
+        by_key = {(row["hour"].hour, row["file_id"]): row for row in rows}
+        assert set(by_key) == {(10, "a"), (10, "b"), (11, "a")}
+
+        row = by_key[(10, "a")]
+        assert row["hour"] == datetime(2026, 10, 16, 10, tzinfo=timezone.utc)
+        assert row["download_count"] == 2
+        assert row["resumed_count"] == 1
+        assert row["bytes_transferred"] == 200
+        assert row["download_time_ms"] == 40
+        assert row["last_download_at"].minute == 40
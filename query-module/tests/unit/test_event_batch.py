@@ -0,0 +1,320 @@
+"""
+Unit tests для пакетной обработки file-events.
+
+Тестирует:
+- Слияние событий одного file_id (применяется последнее)
+- Один multi-row upsert и один DELETE на пакет в одной транзакции
+- Один XACK на пакет, повреждённые события остаются в PEL
+- Обработку по одному при ошибке пакета
+- Retry из PEL: устаревшие события файла подтверждаются без применения
+  (по hash последних применённых событий, без сканирования stream)
+- Метрики размера пакета и отставания consumer
+"""
+
+import json
+import time
+from contextlib import ExitStack
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.core.metrics import (
+    event_coalesced_total,
+    event_consumer_lag_events,
+    event_consumer_lag_seconds,
+    event_superseded_total,
+)
+from app.schemas.events import FileCreatedEvent, FileUpdatedEvent
+from app.services.cache_sync import CacheSyncService
+from app.services.event_subscriber import EventSubscriber, _event_age_seconds
+
+
+def _metadata(file_id: str, filename: str, tags=None) -> str:
+    return json.dumps({
+        "file_id": file_id,
+        "original_filename": filename,
+        "storage_filename": f"{file_id}.bin",
+        "file_size": 1024,
+        "checksum_sha256": "a" * 64,
+        "content_type": "application/pdf",
+        "storage_element_id": "se-01",
+        "storage_path": "/data",
+        "uploaded_by": "anna",
+        "created_at": datetime(2026, 1, 1).isoformat(),
+        "retention_policy": "standard",
+        "tags": tags or [],
+    })
+
+
+def _event(event_type: str, file_id: str, filename: str = "report.pdf", tags=None) -> dict:
+    data = {
+        "event_type": event_type,
+        "timestamp": datetime(2026, 1, 1).isoformat(),
+        "file_id": file_id,
+        "storage_element_id": "se-01",
+    }
+    if event_type == "file:deleted":
+        data["deleted_at"] = datetime(2026, 1, 2).isoformat()
+    else:
+        data["metadata"] = _metadata(file_id, filename, tags)
+    return data
+
+
+@pytest.fixture
+def subscriber():
+    """EventSubscriber с mock Redis и зависимостями пакетной обработки."""
+    subscriber = EventSubscriber()
+    subscriber.redis = AsyncMock()
+
+    with ExitStack() as stack:
+        cache_sync = stack.enter_context(patch("app.services.event_subscriber.cache_sync_service"))
+        cache_sync.apply_batch = AsyncMock(return_value=True)
+        search_cache = stack.enter_context(patch("app.services.event_subscriber.search_result_cache"))
+        search_cache.invalidate = AsyncMock()
+        suggest = stack.enter_context(patch("app.services.event_subscriber.suggest_index"))
+        suggest.get_files_terms = AsyncMock(return_value={})
+        suggest.update_many = AsyncMock()
+        subscriber.mocks = MagicMock(cache_sync=cache_sync, search_cache=search_cache, suggest=suggest)
+        yield subscriber
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestEventBatch:
+    """Tests для EventSubscriber._process_batch."""
+
+    async def test_events_coalesced_by_file(self, subscriber):
+        first, second = str(uuid4()), str(uuid4())
+        coalesced_before = event_coalesced_total._value.get()
+
+        await subscriber._process_batch([
+            ("1-0", _event("file:created", first, "draft.pdf", ["draft"])),
+            ("2-0", _event("file:created", second)),
+            ("3-0", _event("file:updated", first, "final.pdf")),
+            ("4-0", _event("file:deleted", second)),
+        ])
+
+        upserts, deleted_ids = subscriber.mocks.cache_sync.apply_batch.await_args.args
+        assert [(str(event.file_id), event.metadata.original_filename) for event in upserts] == [
+            (first, "final.pdf")
+        ]
+        assert isinstance(upserts[0], FileUpdatedEvent)
+        assert deleted_ids == [second]
+        assert event_coalesced_total._value.get() == coalesced_before + 2
+
+    async def test_single_ack_for_batch(self, subscriber):
+        file_id = str(uuid4())
+
+        await subscriber._process_batch([
+            ("1-0", _event("file:created", file_id)),
+            ("2-0", {"event_type": "file:unknown"}),
+            ("3-0", _event("file:updated", file_id)),
+        ])
+
+        subscriber.redis.xack.assert_awaited_once_with(
+            subscriber.stream_name, subscriber.consumer_group, "1-0", "2-0", "3-0"
+        )
+        # Последнее применённое событие файла - для проверки порядка при retry из PEL
+        key, = subscriber.redis.hset.await_args.args
+        assert key.startswith(f"{subscriber.stream_name}:{subscriber.consumer_group}:applied:")
+        assert subscriber.redis.hset.await_args.kwargs["mapping"] == {file_id: "3-0"}
+
+    async def test_malformed_event_stays_pending(self, subscriber):
+        file_id = str(uuid4())
+        malformed = _event("file:created", file_id)
+        del malformed["metadata"]
+
+        await subscriber._process_batch([
+            ("1-0", malformed),
+            ("2-0", _event("file:created", str(uuid4()))),
+        ])
+
+        subscriber.redis.xack.assert_awaited_once_with(
+            subscriber.stream_name, subscriber.consumer_group, "2-0"
+        )
+
+    async def test_batch_invalidation_and_suggest_update(self, subscriber):
+        created, deleted = str(uuid4()), str(uuid4())
+        before = {"filename": ["old.pdf"], "tag": [], "username": ["anna"]}
+        subscriber.mocks.suggest.get_files_terms.return_value = {deleted: before}
+
+        await subscriber._process_batch([
+            ("1-0", _event("file:created", created, "new.pdf", ["b", "a"])),
+            ("2-0", _event("file:deleted", deleted)),
+        ])
+
+        invalidations = [call.args for call in subscriber.mocks.search_cache.invalidate.await_args_list]
+        assert invalidations == [("file:created", ["a", "b"]), ("file:deleted",)]
+
+        changes = list(subscriber.mocks.suggest.update_many.await_args.args[0])
+        assert changes == [
+            (created, None, {"filename": ["new.pdf"], "tag": ["a", "b"], "username": ["anna"]}),
+            (deleted, before, None),
+        ]
+
+    async def test_failed_batch_falls_back_to_single_events(self, subscriber):
+        subscriber.mocks.cache_sync.apply_batch.return_value = False
+        messages = [
+            ("1-0", _event("file:created", str(uuid4()))),
+            ("2-0", _event("file:created", str(uuid4()))),
+        ]
+
+        with patch.object(subscriber, "_process_message", AsyncMock()) as process_message:
+            await subscriber._process_batch(messages)
+
+        assert [call.args for call in process_message.await_args_list] == [
+            (event_id, event_data, subscriber.stream_name) for event_id, event_data in messages
+        ]
+        subscriber.redis.xack.assert_not_awaited()
+
+    async def test_consume_loop_records_lag(self, subscriber):
+        event_id = f"{int(time.time() * 1000) - 30000}-0"
+
+        async def xreadgroup(**kwargs):
+            subscriber._running = False
+            return [[subscriber.stream_name, [(event_id, _event("file:created", str(uuid4())))]]]
+
+        subscriber.redis.xreadgroup = xreadgroup
+        subscriber.redis.xinfo_groups.return_value = [{"name": subscriber.consumer_group, "lag": 7}]
+
+        await subscriber._consume_loop()
+
+        assert event_consumer_lag_seconds._value.get() == pytest.approx(30, abs=5)
+        assert event_consumer_lag_events._value.get() == 7
+        subscriber.redis.xack.assert_awaited_once()
+
+
+def _pending_redis(subscriber, pending_ids, stream, applied=None, previous_day=None):
+    """Mock Redis для _retry_pending: stream, PEL и hash последних применённых событий."""
+    events = dict(stream)
+    buckets = [applied or {}, previous_day or {}]
+
+    async def xpending_range(name, groupname, min, max, count):
+        return [
+            {"message_id": event_id, "time_since_delivered": 120000, "consumer": "query-old"}
+            for event_id in pending_ids
+        ]
+
+    async def xclaim(name, groupname, consumername, min_idle_time, message_ids):
+        return [(event_id, events[event_id]) for event_id in message_ids]
+
+    async def hmget(key, file_ids):
+        bucket = buckets.pop(0)
+        return [bucket.get(file_id) for file_id in file_ids]
+
+    subscriber.redis.xpending_range = xpending_range
+    subscriber.redis.xclaim = xclaim
+    subscriber.redis.hmget = hmget
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestPendingRetry:
+    """Tests для порядка событий файла при retry из PEL."""
+
+    async def test_stale_event_acknowledged_without_applying(self, subscriber):
+        file_id, other = str(uuid4()), str(uuid4())
+        _pending_redis(subscriber, ["1-0"], [
+            ("1-0", _event("file:updated", file_id)),
+            ("2-0", _event("file:created", other)),
+            ("3-0", _event("file:deleted", file_id)),
+        ], applied={file_id: "3-0", other: "2-0"})
+        superseded_before = event_superseded_total._value.get()
+
+        with patch.object(subscriber, "_handle_event", AsyncMock()) as handle_event:
+            await subscriber._retry_pending(subscriber.stream_name)
+
+        handle_event.assert_not_awaited()
+        subscriber.redis.xack.assert_awaited_once_with(subscriber.stream_name, subscriber.consumer_group, "1-0")
+        assert event_superseded_total._value.get() == superseded_before + 1
+
+    async def test_unparseable_event_superseded(self, subscriber):
+        file_id = str(uuid4())
+        malformed = _event("file:created", file_id)
+        del malformed["metadata"]
+        _pending_redis(subscriber, ["1-0"], [
+            ("1-0", malformed),
+            ("2-0", _event("file:updated", file_id)),
+        ], previous_day={file_id: "2-0"})
+
+        with patch.object(subscriber, "_handle_event", AsyncMock()) as handle_event:
+            await subscriber._retry_pending(subscriber.stream_name)
+
+        handle_event.assert_not_awaited()
+        subscriber.redis.xack.assert_awaited_once_with(subscriber.stream_name, subscriber.consumer_group, "1-0")
+
+    async def test_event_retried_when_newer_event_not_applied(self, subscriber):
+        file_id = str(uuid4())
+        # 2-0 доставлено, но не применено (в PEL) - в hash только более раннее событие
+        _pending_redis(subscriber, ["1-0"], [
+            ("0-5", _event("file:created", file_id)),
+            ("1-0", _event("file:updated", file_id)),
+            ("2-0", _event("file:deleted", file_id)),
+        ], applied={file_id: "0-5"})
+
+        with patch.object(subscriber, "_handle_event", AsyncMock()) as handle_event:
+            await subscriber._retry_pending(subscriber.stream_name)
+
+        assert [call.args[0] for call in handle_event.await_args_list] == ["1-0"]
+        subscriber.redis.xack.assert_awaited_once_with(subscriber.stream_name, subscriber.consumer_group, "1-0")
+        subscriber.redis.hset.assert_awaited_once()
+        assert subscriber.redis.hset.await_args.kwargs["mapping"] == {file_id: "1-0"}
+
+
+@pytest.mark.unit
+class TestEventAge:
+    """Tests для возраста события по stream ID."""
+
+    def test_age_from_stream_id(self):
+        event_id = f"{int(time.time() * 1000) - 5000}-3"
+
+        assert _event_age_seconds(event_id) == pytest.approx(5, abs=1)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestCacheSyncBatch:
+    """Tests для CacheSyncService.apply_batch."""
+
+    async def test_one_upsert_and_one_delete_in_transaction(self):
+        file_id = str(uuid4())
+        event = FileCreatedEvent(
+            file_id=file_id,
+            storage_element_id="se-01",
+            metadata=json.loads(_metadata(file_id, "report.pdf")),
+        )
+        session = AsyncMock()
+
+        async def db_session():
+            yield session
+
+        with patch("app.services.cache_sync.get_db_session", db_session), \
+                patch("app.services.cache_sync.metadata_resolver") as resolver:
+            resolver.invalidate = AsyncMock()
+            result = await CacheSyncService().apply_batch(
+                [event, event.model_copy(update={"file_id": uuid4()})], ["gone"]
+            )
+
+        assert result is True
+        assert session.execute.await_count == 2
+        session.commit.assert_awaited_once()
+
+        upsert_sql = str(session.execute.await_args_list[0].args[0])
+        assert upsert_sql.count("setweight(") == 6
+        assert "ON CONFLICT (id) DO UPDATE" in upsert_sql
+        assert "DELETE FROM file_metadata_cache" in str(session.execute.await_args_list[1].args[0])
+        assert resolver.invalidate.await_args.args[-1] == "gone"
+
+    async def test_error_returns_false(self):
+        session = AsyncMock()
+        session.execute.side_effect = RuntimeError("connection lost")
+
+        async def db_session():
+            yield session
+
+        with patch("app.services.cache_sync.get_db_session", db_session):
+            result = await CacheSyncService().apply_batch([], ["gone"])
+
+        assert result is False
@@ -0,0 +1,155 @@
+"""
+Unit tests для keyset (cursor) пагинации поиска.
+
+Тестирует:
+- Курсор: round-trip, привязка к полю сортировки, повреждённые токены
+- SearchService: LIMIT + 1, next_cursor, keyset условие вместо OFFSET
+- Оценку total_count планировщиком (exact_total=false)
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+
+from app.core.exceptions import InvalidSearchQueryException
+from app.db.models import FileMetadata
+from app.schemas.search import SearchRequest, SortField
+from app.services.search_service import SearchService
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def _file(sample_file_metadata: dict, index: int) -> FileMetadata:
+    data = dict(sample_file_metadata)
+    data["id"] = f"file-{index:03d}"
+    data["created_at"] = datetime(2026, 1, 1, tzinfo=timezone.utc) - timedelta(minutes=index)
+    return FileMetadata(**data)
+
+
+def _rows_result(files: list) -> MagicMock:
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = files
+    return result
+
+
+@pytest.fixture
+def mock_db_session():
+    """AsyncSession mock с SAVEPOINT для EXPLAIN."""
+    session = AsyncMock()
+
+    @asynccontextmanager
+    async def begin_nested():
+        yield
+
+    session.begin_nested = begin_nested
+    return session
+
+
+@pytest.fixture(autouse=True)
+def no_search_cache():
+    """Поиск без кеша результатов и записи search history."""
+    with patch("app.services.search_service.search_result_cache") as cache, \
+            patch.object(SearchService, "_record_search_history", AsyncMock()):
+        cache.get = AsyncMock(return_value=(None, None))
+        cache.set = AsyncMock()
+        yield cache
+
+
+@pytest.mark.unit
+class TestCursor:
+    """Tests для курсора продолжения."""
+
+    def test_round_trip(self):
+        created_at = datetime(2026, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+
+        cursor = encode_cursor("created_at", created_at, "file-001")
+
+        assert decode_cursor(cursor, "created_at") == (created_at, "file-001")
+
+    def test_scalar_sort_value(self):
+        cursor = encode_cursor("file_size", 1024, "file-001")
+
+        assert decode_cursor(cursor, "file_size") == (1024, "file-001")
+
+    def test_cursor_bound_to_sort_field(self):
+        cursor = encode_cursor("file_size", 1024, "file-001")
+
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, "created_at")
+
+    def test_garbage_cursor(self):
+        with pytest.raises(ValueError):
+            decode_cursor("%%%", "created_at")
+
+    def test_cursor_and_offset_are_exclusive(self):
+        with pytest.raises(ValidationError):
+            SearchRequest(cursor="abc", offset=10)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestKeysetSearch:
+    """Tests для keyset пагинации в SearchService."""
+
+    async def test_first_page_returns_next_cursor(self, mock_db_session, sample_file_metadata):
+        files = [_file(sample_file_metadata, i) for i in range(4)]
+        count_result = MagicMock()
+        count_result.scalar.return_value = 40
+        mock_db_session.execute.side_effect = [_rows_result(files), count_result]
+
+        response = await SearchService(mock_db_session).search_files(SearchRequest(limit=3))
+
+        assert len(response.results) == 3
+        assert response.has_more is True
+        assert decode_cursor(response.next_cursor, "created_at") == (files[2].created_at, "file-002")
+
+        query = mock_db_session.execute.await_args_list[0].args[0]
+        assert query._limit_clause.value == 4
+
+    async def test_last_page_has_no_cursor(self, mock_db_session, sample_file_metadata):
+        files = [_file(sample_file_metadata, i) for i in range(2)]
+        count_result = MagicMock()
+        count_result.scalar.return_value = 2
+        mock_db_session.execute.side_effect = [_rows_result(files), count_result]
+
+        response = await SearchService(mock_db_session).search_files(SearchRequest(limit=3))
+
+        assert response.has_more is False
+        assert response.next_cursor is None
+
+    async def test_cursor_replaces_offset(self, mock_db_session):
+        cursor = encode_cursor("created_at", datetime(2026, 1, 1, tzinfo=timezone.utc), "file-002")
+        request = SearchRequest(cursor=cursor, limit=3)
+
+        query = SearchService(mock_db_session)._build_search_query(request)
+        sql = str(query.compile(dialect=postgresql.dialect()))
+
+        assert "OFFSET" not in sql
+        assert "(file_metadata_cache.created_at, file_metadata_cache.id) <" in sql
+        assert "ORDER BY file_metadata_cache.created_at DESC, file_metadata_cache.id DESC" in sql
+
+    async def test_invalid_cursor(self, mock_db_session):
+        cursor = encode_cursor("file_size", 1024, "file-002")
+        request = SearchRequest(cursor=cursor, sort_by=SortField.CREATED_AT)
+
+        with pytest.raises(InvalidSearchQueryException):
+            await SearchService(mock_db_session).search_files(request)
+
+    async def test_estimated_total(self, mock_db_session, sample_file_metadata):
+        files = [_file(sample_file_metadata, i) for i in range(4)]
+        explain_result = MagicMock()
+        explain_result.scalar.return_value = [{"Plan": {"Plan Rows": 5000}}]
+        mock_db_session.execute.side_effect = [_rows_result(files), explain_result]
+
+        response = await SearchService(mock_db_session).search_files(
+            SearchRequest(limit=3, exact_total=False, tags=["reports"])
+        )
+
+        assert response.total_count == 5000
+        assert response.total_is_estimate is True
+        assert response.has_more is True
+        assert mock_db_session.execute.await_count == 2
+        assert str(mock_db_session.execute.await_args_list[1].args[0]).startswith("EXPLAIN (FORMAT JSON)")
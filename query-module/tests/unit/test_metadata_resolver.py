@@ -0,0 +1,184 @@
+"""
+Unit tests для Metadata Resolver.
+
+Тестирует:
+- Порядок уровней: local cache → PostgreSQL → Storage Element
+- Single-flight для конкурентных запросов одного file_id
+- Negative caching отсутствующих файлов (не ошибок PostgreSQL)
+- Промах без Storage Element fallback не скрывает файл от запроса с SE
+- Заполнение кеша найденными метаданными
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient, Request, Response
+
+from app.core.exceptions import DatabaseConnectionException
+from app.services.cache_service import CacheService
+from app.services.metadata_resolver import MetadataResolver
+
+
+METADATA = {
+    "id": "test-id",
+    "filename": "test.pdf",
+    "file_size": 1024,
+    "sha256_hash": "a" * 64,
+    "storage_element_url": "http://storage:8010",
+}
+
+
+@pytest.fixture
+def resolver():
+    """MetadataResolver с local cache без Redis."""
+    mock_settings = MagicMock()
+    mock_settings.cache.local_enabled = True
+    mock_settings.cache.redis_enabled = False
+    mock_settings.cache.local_ttl = 300
+    mock_settings.cache.local_max_size = 1000
+    mock_settings.cache.local_max_bytes = 0
+    mock_settings.cache.negative_ttl = 5
+
+    with patch("app.services.cache_service.settings", mock_settings), \
+            patch("app.services.metadata_resolver.settings", mock_settings):
+        yield MetadataResolver(CacheService())
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestMetadataResolver:
+    """Tests для MetadataResolver."""
+
+    async def test_database_hit_populates_cache(self, resolver):
+        """Тест: запись из PostgreSQL попадает в local cache."""
+        load_from_db = AsyncMock(return_value=METADATA)
+
+        with patch.object(resolver, "_load_from_db", load_from_db):
+            assert await resolver.resolve("test-id") == METADATA
+            assert await resolver.resolve("test-id") == METADATA
+
+        load_from_db.assert_awaited_once_with("test-id")
+
+    async def test_concurrent_lookups_are_collapsed(self, resolver):
+        """Тест single-flight: один lookup на конкурентные запросы."""
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_load(file_id):
+            started.set()
+            await release.wait()
+            return METADATA
+
+        load_from_db = AsyncMock(side_effect=slow_load)
+
+        with patch.object(resolver, "_load_from_db", load_from_db):
+            lookups = [asyncio.create_task(resolver.resolve("test-id")) for _ in range(20)]
+            await started.wait()
+            release.set()
+            results = await asyncio.gather(*lookups)
+
+        assert all(result == METADATA for result in results)
+        load_from_db.assert_awaited_once()
+        assert resolver._inflight == {}
+
+    async def test_missing_file_is_negatively_cached(self, resolver):
+        """Тест negative caching: повторный запрос не идёт в БД."""
+        load_from_db = AsyncMock(return_value=None)
+
+        with patch.object(resolver, "_load_from_db", load_from_db):
+            assert await resolver.resolve("missing-id") is None
+            assert await resolver.resolve("missing-id") is None
+
+            await resolver.invalidate("missing-id")
+            assert await resolver.resolve("missing-id") is None
+
+        assert load_from_db.await_count == 2
+
+    async def test_miss_without_storage_element_does_not_hide_fallback(self, resolver):
+        """Тест: negative cache и single-flight раздельны для lookup с SE и без."""
+        load_from_db = AsyncMock(return_value=None)
+        se_loaded = asyncio.Event()
+
+        async def load_from_storage_element(file_id, storage_element_url, auth_token):
+            await se_loaded.wait()
+            return METADATA
+
+        with patch.object(resolver, "_load_from_db", load_from_db), \
+                patch.object(resolver, "_load_from_storage_element", side_effect=load_from_storage_element):
+            with_se = asyncio.create_task(
+                resolver.resolve("test-id", storage_element_url="http://storage:8010")
+            )
+            await asyncio.sleep(0)
+            # Lookup без SE не присоединяется к lookup с SE (и наоборот)
+            assert await resolver.resolve("test-id") is None
+            se_loaded.set()
+            assert await with_se == METADATA
+
+            await resolver.invalidate("test-id")
+            assert await resolver.resolve("test-id") is None
+            # Кешированный промах без SE не скрывает файл от запроса с SE
+            assert await resolver.resolve("test-id", storage_element_url="http://storage:8010") == METADATA
+
+    async def test_database_outage_is_not_negatively_cached(self, resolver):
+        """Тест: недоступная БД - ошибка, а не кешированный "файл не найден"."""
+        load_from_db = AsyncMock(side_effect=[DatabaseConnectionException("connection refused"), METADATA])
+
+        with patch.object(resolver, "_load_from_db", load_from_db):
+            with pytest.raises(DatabaseConnectionException):
+                await resolver.resolve("test-id")
+            assert await resolver.resolve("test-id") == METADATA
+
+        assert load_from_db.await_count == 2
+
+    async def test_database_outage_falls_back_to_storage_element(self, resolver):
+        """Тест: при недоступной БД метаданные берутся из Storage Element."""
+        load_from_storage_element = AsyncMock(return_value=METADATA)
+
+        with patch.object(resolver, "_load_from_db", AsyncMock(side_effect=DatabaseConnectionException("down"))), \
+                patch.object(resolver, "_load_from_storage_element", load_from_storage_element):
+            metadata = await resolver.resolve("test-id", storage_element_url="http://storage:8010")
+
+        assert metadata == METADATA
+        load_from_storage_element.assert_awaited_once()
+
+    async def test_storage_element_fallback(self, resolver):
+        """Тест fallback на Storage Element при отсутствии записи в БД."""
+        se_response = {
+            "file_id": "test-id",
+            "original_filename": "test.pdf",
+            "storage_filename": "test_admin_20250101T000000_test-id.pdf",
+            "file_size": 512,
+            "original_size": 1024,
+            "content_type": "application/pdf",
+            "checksum": "a" * 64,
+            "created_by_username": "admin",
+            "created_at": "2025-01-01T00:00:00+00:00",
+        }
+        mock_client = AsyncMock(spec=AsyncClient)
+        mock_client.get = AsyncMock(return_value=Response(
+            200, json=se_response, request=Request("GET", "http://storage:8010")
+        ))
+
+        with patch.object(resolver, "_load_from_db", AsyncMock(return_value=None)), \
+                patch("app.services.download_service.download_service._get_http_client",
+                      AsyncMock(return_value=mock_client)):
+            metadata = await resolver.resolve("test-id", storage_element_url="http://storage:8010")
+
+        assert metadata["filename"] == "test.pdf"
+        assert metadata["file_size"] == 1024
+        assert metadata["storage_element_url"] == "http://storage:8010"
+        assert mock_client.get.await_args.args[0] == "http://storage:8010/api/v1/files/test-id"
+        assert await resolver.cache.get_file_metadata("test-id") == metadata
+
+    async def test_storage_element_not_found(self, resolver):
+        """Тест: 404 Storage Element - файл не найден."""
+        mock_client = AsyncMock(spec=AsyncClient)
+        mock_client.get = AsyncMock(return_value=Response(
+            404, request=Request("GET", "http://storage:8010")
+        ))
+
+        with patch.object(resolver, "_load_from_db", AsyncMock(return_value=None)), \
+                patch("app.services.download_service.download_service._get_http_client",
+                      AsyncMock(return_value=mock_client)):
+            assert await resolver.resolve("missing-id", storage_element_url="http://storage:8010") is None
@@ -0,0 +1,234 @@
+"""
+Unit tests для распределения partition streams.
+
+Тестирует:
+- Номер partition и имя stream (совместимость с Admin Module)
+- Round-robin распределение partitions между экземплярами
+- Перераспределение при подключении и остановке экземпляра
+- Освобождение partitions упавшего экземпляра по истечении lease
+- Захват pending событий partition новым владельцем
+"""
+
+import zlib
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services.event_subscriber import EventSubscriber
+from app.services.partition_coordinator import (
+    _RELEASE_SCRIPT,
+    _RENEW_SCRIPT,
+    PartitionCoordinator,
+    assign_partitions,
+    partition_stream_name,
+    stream_partition,
+)
+
+PARTITIONS = 4
+LEASE = 30
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _LeaseRedis:
+    """Минимальная in-memory модель команд Redis, используемых PartitionCoordinator."""
+
+    def __init__(self, clock: _Clock):
+        self.clock = clock
+        self.values = {}
+        self.expires = {}
+        self.members = {}
+
+    def _get(self, key):
+        if key in self.expires and self.expires[key] <= self.clock():
+            self.values.pop(key, None)
+            self.expires.pop(key)
+        return self.values.get(key)
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and self._get(key) is not None:
+            return None
+        self.values[key] = value
+        self.expires[key] = self.clock() + px / 1000
+        return True
+
+    async def eval(self, script, numkeys, key, owner, *args):
+        if self._get(key) != owner:
+            return 0
+        if script == _RENEW_SCRIPT:
+            self.expires[key] = self.clock() + int(args[0]) / 1000
+        elif script == _RELEASE_SCRIPT:
+            self.values.pop(key)
+            self.expires.pop(key)
+        return 1
+
+    async def zrem(self, key, member):
+        self.members.pop(member, None)
+
+    def pipeline(self, transaction=False):
+        return _LeasePipeline(self)
+
+
+class _LeasePipeline:
+    def __init__(self, redis: _LeaseRedis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def zadd(self, key, mapping):
+        self.commands.append(lambda: self.redis.members.update(mapping))
+
+    def zremrangebyscore(self, key, low, high):
+        def remove():
+            for member, score in list(self.redis.members.items()):
+                if score <= high:
+                    del self.redis.members[member]
+        self.commands.append(remove)
+
+    def zrange(self, key, start, end):
+        self.commands.append(lambda: sorted(self.redis.members, key=self.redis.members.get))
+
+    async def execute(self):
+        return [command() for command in self.commands]
+
+
+@pytest.fixture
+def clock():
+    clock = _Clock()
+    with patch("app.services.partition_coordinator.time.time", clock):
+        yield clock
+
+
+@pytest.fixture
+def redis_client(clock):
+    return _LeaseRedis(clock)
+
+
+def _coordinator(redis_client, name: str) -> PartitionCoordinator:
+    return PartitionCoordinator(redis_client, "file-events", PARTITIONS, name, LEASE)
+
+
+@pytest.mark.unit
+class TestPartitionAssignment:
+    """Tests для stream_partition / assign_partitions."""
+
+    def test_partition_matches_admin_formula(self):
+        file_id = uuid4()
+
+        assert stream_partition(file_id, PARTITIONS) == zlib.crc32(str(file_id).encode()) % PARTITIONS
+        assert partition_stream_name("file-events", 2, PARTITIONS) == "file-events:2"
+        assert partition_stream_name("file-events", 0, 1) == "file-events"
+
+    def test_members_share_all_partitions_disjointly(self):
+        members = ["query-c", "query-a", "query-b"]
+
+        assigned = [assign_partitions(members, member, 8) for member in members]
+
+        assert set().union(*assigned) == set(range(8))
+        assert sum(len(partitions) for partitions in assigned) == 8
+
+    def test_single_member_gets_all(self):
+        assert assign_partitions([], "query-a", PARTITIONS) == set(range(PARTITIONS))
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestPartitionCoordinator:
+    """Tests для PartitionCoordinator."""
+
+    async def test_rebalance_on_join_keeps_partitions_exclusive(self, redis_client):
+        first = _coordinator(redis_client, "query-a")
+        second = _coordinator(redis_client, "query-b")
+
+        assert (await first.rebalance())[0] == set(range(PARTITIONS))
+
+        # Partitions второго экземпляра ещё не освобождены первым
+        assert (await second.rebalance())[0] == set()
+
+        acquired, released = await first.rebalance()
+        assert released == {1, 3}
+        assert (await second.rebalance())[0] == {1, 3}
+
+        assert first.owned == {0, 2}
+        assert first.owned.isdisjoint(second.owned)
+        assert second.streams() == ["file-events:1", "file-events:3"]
+
+    async def test_partitions_return_on_leave(self, redis_client):
+        first = _coordinator(redis_client, "query-a")
+        second = _coordinator(redis_client, "query-b")
+        await second.rebalance()
+        await first.rebalance()
+
+        await second.release_all()
+
+        assert (await first.rebalance())[0] == set(range(PARTITIONS))
+
+    async def test_crashed_member_partitions_reassigned_after_lease(self, redis_client, clock):
+        first = _coordinator(redis_client, "query-a")
+        second = _coordinator(redis_client, "query-b")
+        await second.rebalance()
+        await first.rebalance()
+        await second.rebalance()
+        await first.rebalance()
+        assert first.owned == {0, 2}
+
+        # Второй экземпляр перестал продлевать lease
+        clock.now += LEASE / 2
+        await first.rebalance()
+        assert first.owned == {0, 2}
+
+        clock.now += LEASE
+        await first.rebalance()
+        assert first.owned == set(range(PARTITIONS))
+
+    async def test_expired_lease_is_dropped(self, redis_client, clock):
+        first = _coordinator(redis_client, "query-a")
+        await first.rebalance()
+
+        clock.now += LEASE + 1
+        await redis_client.set(first.owner_key(0), "query-b", px=LEASE * 1000)
+
+        acquired, released = await first.rebalance()
+
+        assert 0 in released
+        assert 0 not in first.owned
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestPartitionedSubscriber:
+    """Tests для EventSubscriber с partition streams."""
+
+    async def test_acquired_partition_processes_pending_first(self):
+        subscriber = EventSubscriber()
+        subscriber.redis = AsyncMock()
+        subscriber.redis.xautoclaim.side_effect = [
+            ["5-0", [("1-0", {"event_type": "file:deleted"}), ("2-0", None)], []],
+            ["0-0", [("6-0", {"event_type": "file:deleted"})], []],
+        ]
+        subscriber._coordinator = AsyncMock()
+        subscriber._coordinator.rebalance.return_value = ({3}, set())
+        subscriber._coordinator.stream = lambda partition: f"file-events:{partition}"
+
+        with patch.object(subscriber, "_process_batch", AsyncMock()) as process_batch:
+            await subscriber._rebalance()
+
+        subscriber.redis.xgroup_create.assert_awaited_once()
+        assert subscriber.redis.xgroup_create.await_args.kwargs["name"] == "file-events:3"
+        assert [call.args for call in process_batch.await_args_list] == [
+            ([("1-0", {"event_type": "file:deleted"})], "file-events:3"),
+            ([("6-0", {"event_type": "file:deleted"})], "file-events:3"),
+        ]
+        assert subscriber.redis.xautoclaim.await_args_list[1].kwargs["start_id"] == "5-0"
@@ -0,0 +1,129 @@
+"""
+Unit tests для ранжированного Full-Text Search.
+
+Тестирует:
+- Взвешенный search_vector (имя A, теги B, описание C) для upsert
+- Веса ts_rank из SearchSettings
+- FULLTEXT: поиск по сохранённому вектору, relevance_score и сортировку
+- Сортировка по релевантности без курсора (только offset)
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.core.exceptions import InvalidSearchQueryException
+from app.db.models import FileMetadata
+from app.db.search_vector import filename_terms, rank_expression, search_query_expression, search_vector_expression
+from app.schemas.search import SearchMode, SearchRequest, SortField
+from app.services.search_service import SearchService
+from app.utils.pagination import encode_cursor
+
+
+def _sql(expression) -> str:
+    return str(expression.compile(dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+@pytest.fixture(autouse=True)
+def no_search_cache():
+    """Поиск без кеша результатов и записи search history."""
+    with patch("app.services.search_service.search_result_cache") as cache, \
+            patch.object(SearchService, "_record_search_history", AsyncMock()):
+        cache.get = AsyncMock(return_value=(None, None))
+        cache.set = AsyncMock()
+        yield cache
+
+
+@pytest.mark.unit
+class TestSearchVector:
+    """Tests для выражений search_vector."""
+
+    def test_filename_terms_split_separators(self):
+        assert filename_terms("annual_report-2025.final.pdf") == \
+            "annual_report-2025.final.pdf annual report 2025 final pdf"
+
+    def test_weighted_vector(self):
+        sql = _sql(search_vector_expression("report.pdf", ["finance", "q3"], None))
+
+        assert "setweight(to_tsvector(CAST('russian' AS REGCONFIG), 'report.pdf report pdf'), 'A')" in sql
+        assert "'finance q3'), 'B')" in sql
+        assert "''), 'C')" in sql
+
+    def test_rank_weights_from_settings(self):
+        with patch("app.db.search_vector.settings") as mock_settings:
+            mock_settings.search.default_language = "english"
+            mock_settings.search.rank_title_weight = 1.0
+            mock_settings.search.rank_tags_weight = 0.7
+            mock_settings.search.rank_content_weight = 0.3
+
+            sql = _sql(rank_expression(search_query_expression("quarterly report")))
+
+        # Порядок весов ts_rank: {D, C, B, A}
+        assert "ARRAY[0.1, 0.3, 0.7, 1.0]" in sql
+        assert "plainto_tsquery(CAST('english' AS REGCONFIG), 'quarterly report')" in sql
+        assert sql.endswith(", 32)")
+
+
+@pytest.mark.unit
+class TestRankedSearchQuery:
+    """Tests для построения FULLTEXT запроса с ts_rank."""
+
+    def test_fulltext_uses_stored_vector_and_rank_order(self):
+        request = SearchRequest(query="report", mode=SearchMode.FULLTEXT, sort_by=SortField.RELEVANCE)
+
+        sql = _sql(SearchService(db=AsyncMock())._build_search_query(request))
+
+        assert "file_metadata_cache.search_vector @@ plainto_tsquery" in sql
+        assert "to_tsvector" not in sql
+        assert "ILIKE" not in sql
+        assert " AS relevance" in sql
+        assert sql.index("ORDER BY ts_rank(") > sql.index("WHERE")
+        assert "DESC, file_metadata_cache.id DESC" in sql
+
+    def test_relevance_without_query_sorts_by_created_at(self):
+        request = SearchRequest(mode=SearchMode.FULLTEXT, sort_by=SortField.RELEVANCE)
+
+        sql = _sql(SearchService(db=AsyncMock())._build_search_query(request))
+
+        assert "ts_rank" not in sql
+        assert "ORDER BY file_metadata_cache.created_at DESC" in sql
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestRankedSearch:
+    """Tests для FULLTEXT поиска с ts_rank."""
+
+    async def test_relevance_scores_without_cursor(self, sample_file_metadata):
+        files = []
+        for index in range(3):
+            data = dict(sample_file_metadata, id=f"file-{index}")
+            data["created_at"] = datetime(2026, 1, 1, tzinfo=timezone.utc)
+            files.append(FileMetadata(**data))
+
+        result = MagicMock()
+        result.all.return_value = [(files[0], 0.75), (files[1], 0.5), (files[2], 0.25)]
+        count_result = MagicMock()
+        count_result.scalar.return_value = 10
+        db = AsyncMock()
+        db.execute.side_effect = [result, count_result]
+
+        response = await SearchService(db).search_files(SearchRequest(
+            query="report", mode=SearchMode.FULLTEXT, sort_by=SortField.RELEVANCE, limit=2
+        ))
+
+        assert [r.relevance_score for r in response.results] == [0.75, 0.5]
+        assert response.has_more is True
+        # ts_rank без индекса: следующая страница только через offset
+        assert response.next_cursor is None
+
+    async def test_relevance_cursor_rejected(self):
+        cursor = encode_cursor("relevance", 0.5, "file-1")
+        request = SearchRequest(
+            query="report", mode=SearchMode.FULLTEXT, sort_by=SortField.RELEVANCE, cursor=cursor
+        )
+
+        with pytest.raises(InvalidSearchQueryException):
+            await SearchService(AsyncMock()).search_files(request)
@@ -0,0 +1,172 @@
+"""
+Unit tests для Search Result Cache.
+
+Тестирует:
+- Хеш нормализованного запроса (эквивалентные запросы - один ключ)
+- Попадание в кеш и метрику сэкономленного времени БД
+- Инвалидацию через generation counters (по тегам и глобально)
+- Инкремент generation между get и set (устаревший результат не сохраняется)
+- Обход кеша при недоступном Redis
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.metrics import search_cache_saved_db_seconds_total
+from app.schemas.search import SearchMode, SearchRequest
+from app.services.cache_service import CacheService, RedisCacheService
+from app.services.search_cache import SearchResultCache
+from app.services.search_service import SearchService
+
+
+RESPONSE = {"results": [], "total_count": 0, "limit": 100, "offset": 0, "has_more": False}
+
+
+def _mock_settings(redis_enabled: bool = False) -> MagicMock:
+    mock_settings = MagicMock()
+    mock_settings.cache.local_enabled = True
+    mock_settings.cache.redis_enabled = redis_enabled
+    mock_settings.cache.local_ttl = 300
+    mock_settings.cache.local_max_size = 1000
+    mock_settings.cache.local_max_bytes = 0
+    mock_settings.cache.search_ttl = 60
+    return mock_settings
+
+
+@pytest.fixture
+def search_cache():
+    """SearchResultCache без Redis (счётчики в процессе)."""
+    mock_settings = _mock_settings()
+    with patch("app.services.cache_service.settings", mock_settings), \
+            patch("app.services.search_cache.settings", mock_settings):
+        yield SearchResultCache(CacheService())
+
+
+@pytest.mark.unit
+class TestSearchHashNormalization:
+    """Tests для хеша нормализованного запроса."""
+
+    def test_equivalent_requests_share_hash(self):
+        service = SearchService(db=AsyncMock())
+
+        first = SearchRequest(query="  Annual   Report ", tags=["b", "a"], mode=SearchMode.FULLTEXT)
+        second = SearchRequest(query="annual report", tags=["a", "b", "a"], mode=SearchMode.FULLTEXT)
+
+        assert service._compute_search_hash(first) == service._compute_search_hash(second)
+
+    def test_exact_mode_is_case_sensitive(self):
+        service = SearchService(db=AsyncMock())
+
+        first = SearchRequest(query="Report.pdf", mode=SearchMode.EXACT)
+        second = SearchRequest(query="report.pdf", mode=SearchMode.EXACT)
+
+        assert service._compute_search_hash(first) != service._compute_search_hash(second)
+
+    def test_partial_mode_keeps_whitespace(self):
+        service = SearchService(db=AsyncMock())
+
+        first = SearchRequest(query="annual  report", mode=SearchMode.PARTIAL)
+        second = SearchRequest(query="Annual report", mode=SearchMode.PARTIAL)
+
+        assert service._compute_search_hash(first) != service._compute_search_hash(second)
+
+    def test_executed_conditions_match_hash(self):
+        service = SearchService(db=AsyncMock())
+
+        first = SearchRequest(query="Annual  Report", mode=SearchMode.PARTIAL, filename=" Q1 ")
+        second = SearchRequest(query="annual  report", mode=SearchMode.PARTIAL, filename=" q1 ")
+
+        def compiled(request):
+            conditions = service._build_conditions(request)
+            return [condition.compile().params for condition in conditions]
+
+        assert service._compute_search_hash(first) == service._compute_search_hash(second)
+        assert compiled(first) == compiled(second)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestSearchCacheHit:
+    """Tests для ответа из кеша в SearchService.search_files."""
+
+    async def test_cache_hit_records_search_history(self):
+        db = AsyncMock()
+        request = SearchRequest(query="report", mode=SearchMode.FULLTEXT)
+        cached = {**RESPONSE, "results": [], "total_count": 0}
+
+        with patch("app.services.search_service.search_result_cache") as cache, \
+                patch("app.services.search_service.search_history_writer") as writer:
+            cache.get = AsyncMock(return_value=(cached, "search:hash:0"))
+            response = await SearchService(db).search_files(request)
+
+        assert response.total_count == 0
+        db.execute.assert_not_awaited()
+        writer.record.assert_called_once()
+        assert writer.record.call_args.args[:2] == (request, 0)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestSearchResultCache:
+    """Tests для SearchResultCache."""
+
+    async def test_hit_returns_response_and_counts_saved_time(self, search_cache):
+        saved_before = search_cache_saved_db_seconds_total._value.get()
+
+        cached, key = await search_cache.get("hash", None)
+        assert cached is None
+        await search_cache.set(key, RESPONSE, db_time_ms=250)
+
+        assert await search_cache.get("hash", None) == (RESPONSE, key)
+        assert search_cache_saved_db_seconds_total._value.get() == pytest.approx(saved_before + 0.25)
+
+    async def test_any_event_invalidates_untagged_query(self, search_cache):
+        _, key = await search_cache.get("hash", None)
+        await search_cache.set(key, RESPONSE, db_time_ms=1)
+
+        await search_cache.invalidate("file:created", ["other"])
+
+        assert (await search_cache.get("hash", None))[0] is None
+
+    async def test_created_file_invalidates_only_its_tags(self, search_cache):
+        _, reports_key = await search_cache.get("reports", ["reports"])
+        await search_cache.set(reports_key, RESPONSE, db_time_ms=1)
+        _, photos_key = await search_cache.get("photos", ["photos"])
+        await search_cache.set(photos_key, RESPONSE, db_time_ms=1)
+
+        await search_cache.invalidate("file:created", ["photos"])
+
+        assert (await search_cache.get("reports", ["reports"]))[0] == RESPONSE
+        assert (await search_cache.get("photos", ["photos"]))[0] is None
+
+    async def test_deleted_file_invalidates_tagged_queries(self, search_cache):
+        _, key = await search_cache.get("reports", ["reports"])
+        await search_cache.set(key, RESPONSE, db_time_ms=1)
+
+        await search_cache.invalidate("file:deleted")
+
+        assert (await search_cache.get("reports", ["reports"]))[0] is None
+
+    async def test_invalidation_between_get_and_set_is_not_lost(self, search_cache):
+        """Событие во время запроса к БД: результат остаётся под старым generation."""
+        cached, key = await search_cache.get("hash", ["reports"])
+        assert cached is None
+
+        await search_cache.invalidate("file:created", ["reports"])
+        await search_cache.set(key, RESPONSE, db_time_ms=1)
+
+        cached, new_key = await search_cache.get("hash", ["reports"])
+        assert cached is None
+        assert new_key != key
+
+    async def test_unavailable_redis_bypasses_cache(self):
+        mock_settings = _mock_settings(redis_enabled=True)
+        with patch("app.services.cache_service.settings", mock_settings), \
+                patch("app.services.search_cache.settings", mock_settings):
+            search_cache = SearchResultCache(CacheService())
+
+        assert isinstance(search_cache.redis_cache, RedisCacheService)
+
+        assert await search_cache.get("hash", None) == (None, None)
+        assert search_cache.local_cache.entries == 0
@@ -0,0 +1,169 @@
+"""
+Unit tests для фоновой записи истории поиска.
+
+Тестирует:
+- Запись поискового запроса в очередь (без обращения к PostgreSQL)
+- Sampling записываемых запросов
+- Выбор дневных partitions старше срока хранения
+- Создание partitions вперёд с переносом записей из default partition
+- Удаление partitions: DETACH отдельной транзакцией, затем DROP
+"""
+
+import json
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.schemas.search import SearchMode, SearchRequest
+from app.core.metrics import search_history_partition_coverage_days
+from app.services.search_history import (
+    SearchHistoryWriter,
+    expired_partitions,
+    missing_partitions,
+    partition_coverage,
+    partition_day,
+    partition_name,
+)
+
+
+@pytest.fixture
+def writer():
+    writer = SearchHistoryWriter()
+    writer.sample_rate = 1.0
+    return writer
+
+
+@pytest.mark.unit
+class TestSearchHistoryWriter:
+    """Tests для SearchHistoryWriter.record."""
+
+    def test_record_enqueues_row(self, writer):
+        request = SearchRequest(query="report", mode=SearchMode.FULLTEXT, tags=["q3"])
+
+        with patch.object(writer, "submit", return_value=True) as submit:
+            assert writer.record(request, results_count=7, response_time_ms=15)
+
+        row = submit.call_args.args[0]
+        assert row["query_text"] == "report"
+        assert row["search_mode"] == "fulltext"
+        assert row["results_count"] == 7
+        assert row["response_time_ms"] == 15
+        assert json.loads(row["filters_applied"])["tags"] == ["q3"]
+        assert row["created_at"].tzinfo is not None
+
+    def test_sampling_skips_records(self, writer):
+        writer.sample_rate = 0.25
+        request = SearchRequest(query="report")
+
+        with patch.object(writer, "submit", return_value=True) as submit, \
+                patch("app.services.search_history.random.random", side_effect=[0.1, 0.5, 0.9, 0.2]):
+            results = [writer.record(request, 1, 1) for _ in range(4)]
+
+        assert results == [True, False, False, True]
+        assert submit.call_count == 2
+
+
+@pytest.mark.unit
+class TestSearchHistoryPartitions:
+    """Tests для выбора partitions по сроку хранения."""
+
+    def test_partition_name_roundtrip(self):
+        assert partition_name(date(2026, 10, 16)) == "search_history_p20261016"
+        assert partition_day("search_history_p20261016") == date(2026, 10, 16)
+        assert partition_day("search_history_old") is None
+
+    def test_expired_partitions(self):
+        names = [partition_name(date(2026, 10, day)) for day in (1, 5, 6, 7, 16, 19)]
+        names.append("search_history_default")
+
+        expired = expired_partitions(names, today=date(2026, 10, 16), retention_days=10)
+
+        assert expired == ["search_history_p20261001", "search_history_p20261005"]
+
+    def test_partition_coverage(self):
+        names = [partition_name(date(2026, 10, day)) for day in (15, 16, 17, 19)]
+
+        assert partition_coverage(names, date(2026, 10, 16)) == 2
+        assert partition_coverage(names, date(2026, 10, 18)) == 0
+
+    def test_missing_partitions(self):
+        names = [partition_name(date(2026, 10, day)) for day in (16, 17, 19)]
+
+        missing = missing_partitions(names, today=date(2026, 10, 16), partitions_ahead=4)
+
+        assert missing == [date(2026, 10, 18), date(2026, 10, 20)]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestSearchHistoryMaintenance:
+    """Tests для SearchHistoryWriter.maintain_partitions."""
+
+    async def test_creates_missing_partitions_and_drops_expired(self, writer):
+        writer.partitions_ahead = 2
+        writer.retention_days = 10
+        existing = ["search_history_default", partition_name(date(2026, 10, 1)), partition_name(date(2026, 10, 16))]
+
+        session = AsyncMock()
+        statements = []
+
+        async def execute(statement, params=None):
+            sql = str(statement)
+            statements.append(sql)
+            result = MagicMock()
+            detached = ["search_history_p20261001"] if any("DETACH" in sql for sql in statements) else []
+            result.scalars.return_value.all.return_value = detached if "relispartition" in sql else existing
+            result.rowcount = 3 if "search_history_p20261017" in sql else 0
+            return result
+
+        session.execute = AsyncMock(side_effect=execute)
+
+        async def get_db_session():
+            yield session
+
+        with patch("app.services.search_history.get_db_session", get_db_session):
+            expired = await writer.maintain_partitions(today=date(2026, 10, 16))
+
+        assert expired == ["search_history_p20261001"]
+        assert statements[0].startswith("SELECT pg_advisory_xact_lock")
+        created = [sql for sql in statements if sql.startswith("ALTER TABLE search_history ATTACH")]
+        assert [sql.split()[5] for sql in created] == ["search_history_p20261017", "search_history_p20261018"]
+        # Записи дня переносятся из default partition до ATTACH
+        assert any("DELETE FROM search_history_default" in sql and "search_history_p20261017" in sql
+                   for sql in statements)
+        # DETACH отдельной транзакцией с lock_timeout, затем DROP отсоединённой таблицы
+        detach = statements.index("ALTER TABLE search_history DETACH PARTITION search_history_p20261001")
+        assert statements[detach - 1].startswith("SET LOCAL lock_timeout")
+        assert statements.index("DROP TABLE IF EXISTS search_history_p20261001") > detach
+        assert not any("DROP TABLE" in sql for sql in statements[:detach])
+        assert search_history_partition_coverage_days._value.get() == 3
+
+    async def test_detach_lock_timeout_postpones_drop(self, writer):
+        writer.partitions_ahead = 0
+        writer.retention_days = 10
+        existing = ["search_history_default", partition_name(date(2026, 10, 1)), partition_name(date(2026, 10, 16))]
+
+        session = AsyncMock()
+        statements = []
+
+        async def execute(statement, params=None):
+            sql = str(statement)
+            statements.append(sql)
+            if "DETACH" in sql:
+                raise OperationalError(sql, {}, Exception("canceling statement due to lock timeout"))
+            result = MagicMock()
+            result.scalars.return_value.all.return_value = [] if "relispartition" in sql else existing
+            return result
+
+        session.execute = AsyncMock(side_effect=execute)
+
+        async def get_db_session():
+            yield session
+
+        with patch("app.services.search_history.get_db_session", get_db_session):
+            expired = await writer.maintain_partitions(today=date(2026, 10, 16))
+
+        assert expired == []
+        assert not any("DROP TABLE" in sql for sql in statements)
@@ -283,21 +283,19 @@ class TestSearchService:
 
     @pytest.mark.asyncio
     async def test_record_search_history(self, search_service, mock_db_session):
-        """Тест записи истории поиска."""
-        mock_db_session.add = MagicMock()
+        """Тест записи истории поиска (очередь фоновой записи, без commit)."""
         mock_db_session.commit = AsyncMock()
+        request = SearchRequest(query="test document", mode=SearchMode.FULLTEXT)
 
-        await search_service._record_search_history(
-            search_request=SearchRequest(query="test document", mode=SearchMode.FULLTEXT),
-            results_count=42,
-            response_time_ms=123
-        )
-
-        # Проверяем, что add был вызван с SearchHistory
-        mock_db_session.add.assert_called_once()
+        with patch("app.services.search_service.search_history_writer") as writer:
+            await search_service._record_search_history(
+                search_request=request,
+                results_count=42,
+                response_time_ms=123
+            )
 
-        # Проверяем, что commit был вызван
-        mock_db_session.commit.assert_called_once()
+        writer.record.assert_called_once_with(request, 42, 123)
+        mock_db_session.commit.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_get_file_by_id_success(self, search_service, mock_db_session, sample_file_metadata):
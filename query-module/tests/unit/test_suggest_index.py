@@ -0,0 +1,224 @@
+"""
+Unit tests для prefix индекса автодополнения.
+
+Тестирует:
+- Выборку по префиксу без учёта регистра, порядок по частоте
+- Инкрементальное обновление по разнице значений до/после события
+- Удаление значений при обнулении счётчика
+- Восстановление индекса из PostgreSQL
+- Изменения во время восстановления: журнал и сверка со снимком
+- Обновление Redis индекса Lua скриптом
+"""
+
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.cache_service import CacheService
+from app.services.suggest_index import SuggestIndex, _unapplied, file_terms
+
+
+def _mock_settings(redis_enabled: bool = False) -> MagicMock:
+    mock_settings = MagicMock()
+    mock_settings.cache.local_enabled = True
+    mock_settings.cache.redis_enabled = redis_enabled
+    mock_settings.cache.local_ttl = 300
+    mock_settings.cache.local_max_size = 1000
+    mock_settings.cache.local_max_bytes = 0
+    mock_settings.search.suggest_enabled = True
+    mock_settings.search.suggest_scan_limit = 200
+    return mock_settings
+
+
+def _session_factory(rows, snapshot_rows=(), on_stream=None):
+    """Фабрика сессий: GROUP BY выборки по типам и значения файлов в снимке."""
+    batches = iter(rows.values())
+    first = next(iter(rows.values()))
+
+    async def stream(query):
+        kind_batches = next(batches)
+        if on_stream is not None and kind_batches is first:
+            await on_stream()
+
+        async def partitions(size):
+            for batch in kind_batches:
+                yield batch
+
+        return MagicMock(partitions=partitions)
+
+    session = MagicMock()
+    session.connection = AsyncMock()
+    session.stream = stream
+    session.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=list(snapshot_rows))))
+
+    @asynccontextmanager
+    async def factory():
+        yield session
+
+    return factory
+
+
+@pytest.fixture
+def index():
+    """SuggestIndex без Redis (индекс в памяти процесса)."""
+    mock_settings = _mock_settings()
+    with patch("app.services.cache_service.settings", mock_settings), \
+            patch("app.services.suggest_index.settings", mock_settings):
+        yield SuggestIndex(CacheService())
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestSuggestIndex:
+    """Tests для SuggestIndex (in-memory)."""
+
+    async def test_prefix_lookup_ranked_by_frequency(self, index):
+        await index.update("f1", None, file_terms("Annual Report.pdf", ["annual", "finance"], "anna"))
+        await index.update("f2", None, file_terms("annotations.txt", ["annual"], "ivan"))
+        await index.update("f3", None, file_terms("budget.xlsx", ["finance"], "anna"))
+
+        suggestions = await index.suggest("AN", limit=10)
+
+        # Равная частота - лексикографический порядок
+        assert suggestions["filename"] == [("annotations.txt", 1), ("Annual Report.pdf", 1)]
+        assert suggestions["tag"] == [("annual", 2)]
+        assert suggestions["username"] == [("anna", 2)]
+
+    async def test_limit(self, index):
+        for i in range(5):
+            await index.update(f"f{i}", None, file_terms(f"report-{i}.pdf", None, "user"))
+
+        suggestions = await index.suggest("report", limit=3)
+
+        assert [value for value, _ in suggestions["filename"]] == ["report-0.pdf", "report-1.pdf", "report-2.pdf"]
+
+    async def test_update_applies_difference(self, index):
+        before = file_terms("draft.docx", ["draft", "q3"], "anna")
+        await index.update("f1", None, before)
+
+        await index.update("f1", before, file_terms("final.docx", ["q3"], "anna"))
+
+        assert (await index.suggest("dra", limit=10))["filename"] == []
+        assert (await index.suggest("dra", limit=10))["tag"] == []
+        assert (await index.suggest("fin", limit=10))["filename"] == [("final.docx", 1)]
+        assert (await index.suggest("q", limit=10))["tag"] == [("q3", 1)]
+        assert (await index.suggest("an", limit=10))["username"] == [("anna", 1)]
+
+    async def test_redelivered_event_is_idempotent(self, index):
+        terms = file_terms("report.pdf", ["finance"], "anna")
+        await index.update("f1", None, terms)
+
+        # Повторная доставка file:created: значения до события уже в кеше
+        await index.update("f1", terms, terms)
+
+        assert (await index.suggest("fin", limit=10))["tag"] == [("finance", 1)]
+
+    async def test_delete_removes_values(self, index):
+        terms = file_terms("report.pdf", ["finance"], "anna")
+        await index.update("f1", None, terms)
+        await index.update("f2", None, file_terms("report.pdf", [], "ivan"))
+
+        await index.update("f1", terms, None)
+
+        suggestions = await index.suggest("r", limit=10)
+        assert suggestions["filename"] == [("report.pdf", 1)]
+        assert (await index.suggest("fin", limit=10))["tag"] == []
+        assert (await index.suggest("an", limit=10))["username"] == []
+
+    async def test_rebuild_from_database(self, index):
+        rows = {
+            "filename": [[("report.pdf", 3), ("readme.md", 1)]],
+            "tag": [[("reports", 2), (None, 1)]],
+            "username": [[("root", 5)]],
+        }
+
+        with patch("app.services.suggest_index.get_session_maker", return_value=_session_factory(rows)):
+            assert await index.rebuild() is True
+
+        suggestions = await index.suggest("re", limit=10)
+        assert suggestions["filename"] == [("report.pdf", 3), ("readme.md", 1)]
+        assert suggestions["tag"] == [("reports", 2)]
+        assert (await index.suggest("ro", limit=10))["username"] == [("root", 5)]
+
+    async def test_rebuild_replays_concurrent_updates(self, index):
+        rows = {
+            "filename": [[("report.pdf", 1)]],
+            "tag": [[]],
+            "username": [[("root", 1)]],
+        }
+
+        async def concurrent_updates():
+            # f1 уже в снимке, f2 записан после снимка
+            await index.update("f1", None, file_terms("report.pdf", [], "root"))
+            await index.update("f2", None, file_terms("racing.pdf", [], "root"))
+
+        session_factory = _session_factory(
+            rows, snapshot_rows=[("f1", "report.pdf", [], "root")], on_stream=concurrent_updates
+        )
+        with patch("app.services.suggest_index.get_session_maker", return_value=session_factory):
+            assert await index.rebuild() is True
+
+        assert (await index.suggest("r", limit=10))["filename"] == [("racing.pdf", 1), ("report.pdf", 1)]
+        assert (await index.suggest("ro", limit=10))["username"] == [("root", 2)]
+
+    async def test_update_after_rebuild_not_journaled(self, index):
+        with patch("app.services.suggest_index.get_session_maker", return_value=_session_factory({
+            "filename": [[]], "tag": [[]], "username": [[]],
+        })):
+            await index.rebuild()
+
+        await index.update("f1", None, file_terms("report.pdf", [], "root"))
+
+        assert index._journal is None
+        assert (await index.suggest("rep", limit=10))["filename"] == [("report.pdf", 1)]
+
+    async def test_redis_update_runs_script_per_kind(self):
+        mock_settings = _mock_settings(redis_enabled=True)
+        with patch("app.services.cache_service.settings", mock_settings):
+            index = SuggestIndex(CacheService())
+
+        client = MagicMock()
+        client.eval = AsyncMock(return_value=1)
+
+        with patch("app.services.suggest_index.settings", mock_settings), \
+                patch.object(index.redis_cache, "get_client", AsyncMock(return_value=client)):
+            await index.update(
+                "f1",
+                file_terms("old.pdf", ["keep"], "anna"),
+                file_terms("new.pdf", ["keep"], "anna")
+            )
+
+        client.eval.assert_awaited_once()
+        args = client.eval.await_args.args
+        assert args[1:10] == (
+            8,
+            "{suggest}:rebuild:lock", "{suggest}:rebuild:journal",
+            "{suggest}:filename", "{suggest}:filename:count",
+            "{suggest}:tag", "{suggest}:tag:count",
+            "{suggest}:username", "{suggest}:username:count",
+        )
+        assert json.loads(args[10])[0][0] == "f1"
+        # filename: 2 пары, tag и username без изменений
+        assert args[11] == 2
+        assert dict(zip(args[12:16:2], args[13:16:2])) == {"new.pdf\x00new.pdf": 1, "old.pdf\x00old.pdf": -1}
+        assert args[16:] == (0, 0)
+
+
+@pytest.mark.unit
+class TestJournalReconcile:
+    """Tests для сверки журнала изменений со снимком PostgreSQL."""
+
+    def test_changes_after_snapshot_state_applied(self):
+        draft, final = file_terms("draft.pdf", [], "anna"), file_terms("final.pdf", [], "anna")
+        changes = [("f1", None, draft), ("f1", draft, final)]
+
+        assert _unapplied(changes, None) == changes
+        assert _unapplied(changes, draft) == changes[1:]
+        assert _unapplied(changes, final) == []
+
+    def test_unmatched_snapshot_applies_all(self):
+        changes = [("f1", None, file_terms("draft.pdf", [], "anna"))]
+
+        assert _unapplied(changes, file_terms("other.pdf", [], "anna")) == changes
@@ -0,0 +1,74 @@
+"""add_compression_fields
+
+Revision ID: b7c8d9e0f1a2
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c8d9e0f1a2'
+down_revision = 'a1b2c3d4e5f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Добавление полей сжатия в FileMetadata таблицу.
+
+    Поля:
+    - compressed: Файл хранится в сжатом виде (gzip/brotli от Ingester)
+    - compression_algorithm: Алгоритм сжатия
+    - original_size: Размер файла до сжатия
+    """
+    import os
+    table_prefix = os.getenv("DB_TABLE_PREFIX", "storage_elem_01")
+    table_name = f'{table_prefix}_files'
+
+    op.add_column(
+        table_name,
+        sa.Column(
+            'compressed',
+            sa.Boolean(),
+            nullable=False,
+            server_default=sa.text('false'),
+            comment='Флаг сжатия файла'
+        )
+    )
+
+    op.add_column(
+        table_name,
+        sa.Column(
+            'compression_algorithm',
+            sa.String(length=20),
+            nullable=True,
+            comment='Алгоритм сжатия: gzip, brotli'
+        )
+    )
+
+    op.add_column(
+        table_name,
+        sa.Column(
+            'original_size',
+            sa.BigInteger(),
+            nullable=True,
+            comment='Размер файла до сжатия в байтах'
+        )
+    )
+
+
+def downgrade() -> None:
+    """
+    Откат миграции - удаление полей сжатия.
+    """
+    import os
+    table_prefix = os.getenv("DB_TABLE_PREFIX", "storage_elem_01")
+    table_name = f'{table_prefix}_files'
+
+    op.drop_column(table_name, 'original_size')
+    op.drop_column(table_name, 'compression_algorithm')
+    op.drop_column(table_name, 'compressed')
@@ -0,0 +1,59 @@
+"""add_content_addressed_blobs
+
+Revision ID: c8d9e0f1a2b3
+Revises: b7c8d9e0f1a2
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8d9e0f1a2b3'
+down_revision = 'b7c8d9e0f1a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Content-addressed дедупликация.
+
+    - Таблица {prefix}_blobs: содержимое по SHA-256 со счётчиком ссылок
+    - FileMetadata.blob_path: путь к общему blob (NULL - файл данных рядом с attr.json)
+    """
+    import os
+    table_prefix = os.getenv("DB_TABLE_PREFIX", "storage_elem_01")
+
+    op.create_table(
+        f'{table_prefix}_blobs',
+        sa.Column('checksum', sa.String(length=64), nullable=False, comment='SHA256 checksum содержимого'),
+        sa.Column('blob_path', sa.String(length=1000), nullable=False, comment='Относительный путь blob в хранилище'),
+        sa.Column('file_size', sa.BigInteger(), nullable=False, comment='Размер содержимого в байтах'),
+        sa.Column('ref_count', sa.Integer(), nullable=False, comment='Количество файлов, ссылающихся на blob'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Время создания blob'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Время последнего изменения счётчика ссылок'),
+        sa.PrimaryKeyConstraint('checksum')
+    )
+
+    op.add_column(
+        f'{table_prefix}_files',
+        sa.Column(
+            'blob_path',
+            sa.String(length=1000),
+            nullable=True,
+            comment='Относительный путь общего blob (dedup)'
+        )
+    )
+
+
+def downgrade() -> None:
+    """
+    Откат миграции - удаление таблицы blobs и поля blob_path.
+    """
+    import os
+    table_prefix = os.getenv("DB_TABLE_PREFIX", "storage_elem_01")
+
+    op.drop_column(f'{table_prefix}_files', 'blob_path')
+    op.drop_table(f'{table_prefix}_blobs')
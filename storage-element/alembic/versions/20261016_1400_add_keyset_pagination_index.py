@@ -0,0 +1,39 @@
+"""add_keyset_pagination_index
+
+Revision ID: d9e0f1a2b3c4
+Revises: c8d9e0f1a2b3
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9e0f1a2b3c4'
+down_revision = 'c8d9e0f1a2b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Составной индекс (created_at, file_id) для keyset (cursor) пагинации
+    GET /api/v1/files.
+    """
+    import os
+    table_prefix = os.getenv("DB_TABLE_PREFIX", "storage_elem_01")
+
+    op.create_index(
+        f'idx_{table_prefix}_created_file_id',
+        f'{table_prefix}_files',
+        ['created_at', 'file_id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Удаление индекса keyset пагинации."""
+    import os
+    table_prefix = os.getenv("DB_TABLE_PREFIX", "storage_elem_01")
+
+    op.drop_index(f'idx_{table_prefix}_created_file_id', table_name=f'{table_prefix}_files')
@@ -7,9 +7,11 @@ API Dependencies.
 from app.api.deps.auth import (
     AdminUser,
     CurrentUser,
+    DownloadAccess,
     OperatorUser,
     ServiceAccount,
     get_current_user,
+    get_download_access,
     require_admin,
     require_operator_or_admin,
     require_service_account,
@@ -18,6 +20,7 @@ from app.api.deps.database import get_db
 
 __all__ = [
     "get_current_user",
+    "get_download_access",
     "require_admin",
     "require_operator_or_admin",
     "require_service_account",
@@ -26,4 +29,5 @@ __all__ = [
     "AdminUser",
     "OperatorUser",
     "ServiceAccount",
+    "DownloadAccess",
 ]
@@ -6,11 +6,16 @@ RBAC проверки для различных операций.
 """
 
 import logging
-from typing import Annotated
+from dataclasses import dataclass
+from typing import Annotated, Optional
+from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from app.core.config import settings
+from app.core.download_token import DownloadGrant, verify_download_token
+from app.core.exceptions import StorageException
 from app.core.security import UserContext, UserRole, jwt_validator
 
 logger = logging.getLogger(__name__)
@@ -21,6 +26,13 @@ security = HTTPBearer(
     description="JWT токен из Admin Module (Bearer <token>)"
 )
 
+# Скачивание: Bearer опционален, если передан подписанный токен ?token=
+optional_security = HTTPBearer(
+    scheme_name="Bearer Token",
+    description="JWT токен из Admin Module (Bearer <token>)",
+    auto_error=False
+)
+
 
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]
@@ -202,6 +214,78 @@ async def require_service_account(
     return user
 
 
+@dataclass
+class DownloadAccess:
+    """
+    Основание доступа к скачиванию файла.
+
+    Attributes:
+        user: Пользователь из JWT (None при доступе по токену скачивания)
+        grant: Проверенный токен скачивания из Query Module (redirect режим)
+    """
+    user: Optional[UserContext] = None
+    grant: Optional[DownloadGrant] = None
+
+    @property
+    def subject(self) -> str:
+        """Идентификатор для логов"""
+        return self.user.sub if self.user else "download_token"
+
+
+async def get_download_access(
+    file_id: UUID,
+    credentials: Annotated[Optional[HTTPAuthorizationCredentials], Depends(optional_security)],
+    token: Annotated[
+        Optional[str],
+        Query(description="Подписанный токен скачивания (redirect из Query Module)")
+    ] = None
+) -> DownloadAccess:
+    """
+    Доступ к скачиванию: JWT Bearer или подписанный токен скачивания.
+
+    Токен проверяется локально (HMAC, DOWNLOAD_SIGNING_KEY) и действует
+    только для своего file_id и диапазона байт.
+
+    Args:
+        file_id: UUID запрашиваемого файла
+        credentials: Bearer token из Authorization header (опционально)
+        token: Подписанный токен скачивания (опционально)
+
+    Returns:
+        DownloadAccess: Пользователь или разрешение токена
+
+    Raises:
+        HTTPException: 401 если нет валидного JWT или токена скачивания
+    """
+    if token is not None:
+        signing_key = settings.jwt.download_signing_key
+        try:
+            if not signing_key:
+                raise StorageException(
+                    message="Download tokens are not configured",
+                    error_code="INVALID_DOWNLOAD_TOKEN"
+                )
+            return DownloadAccess(grant=verify_download_token(token, str(file_id), signing_key))
+        except StorageException as e:
+            logger.warning(
+                f"Download token rejected: {e.message}",
+                extra={"file_id": str(file_id), "details": e.details}
+            )
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired download token"
+            )
+
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    return DownloadAccess(user=await get_current_user(credentials))
+
+
 # Type aliases для удобства использования
 CurrentUser = Annotated[UserContext, Depends(get_current_user)]
 AdminUser = Annotated[UserContext, Depends(require_admin)]
@@ -0,0 +1,207 @@
+"""
+Blobs API Endpoints - content-addressed дедупликация.
+
+Используется Ingester Module, чтобы не передавать содержимое,
+которое уже хранится на этом Storage Element:
+1. GET  /blobs/{checksum}        - pre-check: есть ли blob с таким SHA-256
+2. POST /blobs/{checksum}/files  - создание файла со ссылкой на существующий blob
+
+Новый файл получает собственный file_id и attr.json; содержимое общее,
+счётчик ссылок blob увеличивается (Consistency Protocol без записи данных).
+"""
+
+import logging
+import re
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db, get_current_user
+from app.api.v1.endpoints.files import FileUploadResponse
+from app.core.config import settings, StorageMode
+from app.core.exceptions import StorageException
+from app.core.security import UserContext
+from app.services.blob_service import BlobService
+from app.services.file_service import FileService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+_CHECKSUM_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# Коды ошибок → HTTP статус
+_ERROR_STATUS = {
+    "BLOB_NOT_FOUND": status.HTTP_404_NOT_FOUND,
+    "SIZE_MISMATCH": status.HTTP_409_CONFLICT,
+    "FILE_ID_DUPLICATE": status.HTTP_409_CONFLICT,
+    "UNSUPPORTED_COMPRESSION": status.HTTP_400_BAD_REQUEST,
+    "INVALID_COMPRESSION_METADATA": status.HTTP_400_BAD_REQUEST,
+}
+
+
+class BlobInfoResponse(BaseModel):
+    """Информация о blob"""
+    checksum: str
+    file_size: int
+    ref_count: int
+
+
+class BlobLinkRequest(BaseModel):
+    """Метаданные файла, ссылающегося на существующий blob"""
+    file_size: int = Field(..., gt=0, description="Размер содержимого в байтах (проверяется)")
+    original_filename: str = Field(..., description="Оригинальное имя файла")
+    content_type: Optional[str] = Field(None, description="MIME type файла")
+    description: Optional[str] = Field(None, description="Описание содержимого")
+    version: Optional[str] = Field(None, description="Версия документа")
+    file_id: Optional[UUID] = Field(None, description="UUID файла (опционально)")
+    compression_algorithm: Optional[str] = Field(None, description="Алгоритм сжатия gzip/brotli (если сжат)")
+    original_size: Optional[int] = Field(None, description="Размер до сжатия (если сжат)")
+    metadata: Optional[dict] = Field(None, description="Дополнительные метаданные")
+
+
+def _validate_checksum(checksum: str) -> str:
+    """SHA-256 в нижнем регистре (64 hex символа)."""
+    checksum = checksum.lower()
+    if not _CHECKSUM_RE.match(checksum):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Checksum must be 64 hexadecimal characters (SHA256)"
+        )
+    return checksum
+
+
+@router.get(
+    "/{checksum}",
+    response_model=BlobInfoResponse,
+    summary="Проверить наличие blob",
+    description="Pre-check перед загрузкой: хранится ли содержимое с таким SHA-256"
+)
+async def get_blob(
+    checksum: str,
+    db: AsyncSession = Depends(get_db),
+    user: UserContext = Depends(get_current_user)
+):
+    """
+    Проверить наличие blob по SHA-256.
+
+    Args:
+        checksum: SHA-256 содержимого
+        db: Database session
+        user: Текущий пользователь из JWT
+
+    Returns:
+        BlobInfoResponse: Размер и число ссылок
+
+    Raises:
+        HTTPException 404: Blob не найден (или дедупликация выключена)
+    """
+    checksum = _validate_checksum(checksum)
+
+    blob = None
+    if settings.storage.dedup_enabled:
+        blob = await BlobService(db).get_blob(checksum)
+
+    if blob is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Blob {checksum} not found"
+        )
+
+    return BlobInfoResponse(
+        checksum=blob.checksum,
+        file_size=blob.file_size,
+        ref_count=blob.ref_count
+    )
+
+
+@router.post(
+    "/{checksum}/files",
+    response_model=FileUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Создать файл из существующего blob",
+    description="Загрузка без передачи содержимого: файл ссылается на хранящийся blob"
+)
+async def create_file_from_blob(
+    checksum: str,
+    request: BlobLinkRequest,
+    db: AsyncSession = Depends(get_db),
+    user: UserContext = Depends(get_current_user)
+):
+    """
+    Создать файл, ссылающийся на существующий blob.
+
+    Args:
+        checksum: SHA-256 содержимого
+        request: Метаданные файла
+        db: Database session
+        user: Текущий пользователь из JWT
+
+    Returns:
+        FileUploadResponse: Метаданные созданного файла
+
+    Raises:
+        HTTPException 400: Режим хранилища не разрешает загрузку
+        HTTPException 404: Blob не найден - содержимое нужно передать обычной загрузкой
+        HTTPException 409: Размер не совпадает с blob
+    """
+    if settings.app.mode not in [StorageMode.EDIT, StorageMode.RW]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File upload not allowed in {settings.app.mode.value} mode"
+        )
+
+    checksum = _validate_checksum(checksum)
+    if not settings.storage.dedup_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Blob {checksum} not found"
+        )
+
+    try:
+        file_service = FileService(db)
+        created_file_id = await file_service.create_file(
+            file_data=None,
+            blob_checksum=checksum,
+            blob_size=request.file_size,
+            original_filename=request.original_filename,
+            content_type=request.content_type or "application/octet-stream",
+            user_id=user.sub,
+            username=user.username,
+            description=request.description,
+            version=request.version,
+            metadata=request.metadata,
+            file_id=request.file_id,
+            compression_algorithm=request.compression_algorithm,
+            original_size=request.original_size
+        )
+    except StorageException as e:
+        logger.warning(
+            f"File creation from blob failed: {e.message}",
+            extra={"checksum": checksum, "error_code": e.error_code, "details": e.details}
+        )
+        raise HTTPException(
+            status_code=_ERROR_STATUS.get(e.error_code, status.HTTP_500_INTERNAL_SERVER_ERROR),
+            detail=e.message
+        )
+
+    logger.info(
+        "File created from existing blob",
+        extra={
+            "file_id": str(created_file_id),
+            "checksum": checksum,
+            "file_size": request.file_size,
+            "user_id": user.sub
+        }
+    )
+
+    return FileUploadResponse(
+        file_id=created_file_id,
+        original_filename=request.original_filename,
+        file_size=request.file_size,
+        checksum=checksum,
+        message="File created from existing blob"
+    )
@@ -6,21 +6,32 @@ Endpoints для загрузки, скачивания, удаления и п
 """
 
 import logging
+from pathlib import Path
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile, status
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_current_user, require_operator_or_admin
+from app.api.deps import (
+    DownloadAccess,
+    get_db,
+    get_current_user,
+    get_download_access,
+    require_operator_or_admin,
+)
 from app.core.security import UserContext
 from app.core.config import settings, StorageMode
 from app.core.exceptions import StorageException
 from app.models.file_metadata import FileMetadata
+from app.services.file_download import FileDownloadService, RangeNotSatisfiableError
 from app.services.file_service import FileService
+from app.utils.compression_utils import CONTENT_ENCODINGS, accepts_encoding, decompress_stream
+from app.utils.pagination import decode_cursor, encode_cursor, estimate_count, keyset_condition
+from app.utils.sendfile_response import SendfileResponse
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +53,10 @@ class FileMetadataResponse(BaseModel):
     version: Optional[str] = None
     storage_path: str
     checksum: str
+    # Compression (file_size/checksum - сжатого содержимого)
+    compressed: bool = False
+    compression_algorithm: Optional[str] = None
+    original_size: Optional[int] = None
     # Cache TTL fields (PHASE 1)
     cache_updated_at: str
     cache_ttl_hours: int
@@ -64,6 +79,10 @@ class FileListResponse(BaseModel):
     """Модель ответа со списком файлов"""
     total: int
     files: list[FileMetadataResponse]
+    # Keyset пагинация: курсор следующей страницы (None - страниц больше нет)
+    next_cursor: Optional[str] = None
+    # total - оценка планировщика PostgreSQL (exact_total=false)
+    total_is_estimate: bool = False
 
 
 class FileUpdateRequest(BaseModel):
@@ -87,6 +106,9 @@ async def upload_file(
     file_id: Optional[str] = Form(None, description="UUID файла (для финализации, опционально)"),
     finalize_transaction_id: Optional[str] = Form(None, description="ID транзакции финализации (опционально)"),
     retention_policy: Optional[str] = Form(None, description="Политика хранения (temporary/permanent, опционально)"),
+    compressed: bool = Form(False, description="Файл сжат Ingester Module (опционально)"),
+    compression_algorithm: Optional[str] = Form(None, description="Алгоритм сжатия gzip/brotli (если compressed)"),
+    original_size: Optional[int] = Form(None, description="Размер до сжатия в байтах (если compressed)"),
     db: AsyncSession = Depends(get_db),
     user: UserContext = Depends(get_current_user)
 ):
@@ -103,6 +125,9 @@ async def upload_file(
     - Если передан file_id → использовать его (сохранение оригинального UUID)
     - Если file_id не передан → генерировать новый UUID (обычная загрузка)
 
+    Compression: Ingester передаёт уже сжатое содержимое (gzip/brotli)
+    вместе с compression_algorithm и original_size.
+
     Args:
         file: Загружаемый файл (multipart/form-data)
         description: Описание содержимого (опционально)
@@ -110,6 +135,9 @@ async def upload_file(
         file_id: UUID файла для сохранения (опционально, для финализации)
         finalize_transaction_id: ID транзакции финализации (опционально)
         retention_policy: Политика хранения - temporary/permanent (опционально)
+        compressed: Файл сжат (опционально)
+        compression_algorithm: Алгоритм сжатия (опционально)
+        original_size: Размер до сжатия (опционально)
         user: Текущий пользователь из JWT
         db: Database session
 
@@ -117,7 +145,8 @@ async def upload_file(
         FileUploadResponse: Метаданные загруженного файла
 
     Raises:
-        HTTPException 400: Режим хранилища не разрешает загрузку или invalid file_id
+        HTTPException 400: Режим хранилища не разрешает загрузку, invalid file_id
+            или некорректные параметры сжатия
         HTTPException 500: Ошибка загрузки файла
     """
     # Проверка режима хранилища
@@ -127,6 +156,13 @@ async def upload_file(
             detail=f"File upload not allowed in {settings.app.mode.value} mode"
         )
 
+    # Алгоритм сжатия обязателен: по умолчанию нельзя угадать gzip/brotli
+    if compressed and not compression_algorithm:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="compression_algorithm is required for compressed files"
+        )
+
     # Sprint 15: Обработка file_id для finalization
     provided_file_id: Optional[UUID] = None
     if file_id:
@@ -160,7 +196,9 @@ async def upload_file(
             description=description,
             version=version,
             file_id=provided_file_id,
-            finalize_transaction_id=UUID(finalize_transaction_id) if finalize_transaction_id else None
+            finalize_transaction_id=UUID(finalize_transaction_id) if finalize_transaction_id else None,
+            compression_algorithm=compression_algorithm if compressed else None,
+            original_size=original_size if compressed else None
         )
 
         # Получение метаданных созданного файла
@@ -188,6 +226,11 @@ async def upload_file(
             f"File upload failed: {e.message}",
             extra={"error_code": e.error_code, "details": e.details}
         )
+        if e.error_code in ("UNSUPPORTED_COMPRESSION", "INVALID_COMPRESSION_METADATA"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=e.message
+            )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=e.message
@@ -248,6 +291,9 @@ async def get_file_metadata(
             version=metadata.version,
             storage_path=metadata.storage_path,
             checksum=metadata.checksum,
+            compressed=metadata.compressed,
+            compression_algorithm=metadata.compression_algorithm,
+            original_size=metadata.original_size,
             # Cache TTL fields (PHASE 1)
             cache_updated_at=metadata.cache_updated_at.isoformat(),
             cache_ttl_hours=metadata.cache_ttl_hours,
@@ -267,24 +313,40 @@ async def get_file_metadata(
 @router.get(
     "/{file_id}/download",
     summary="Скачать файл",
-    description="Скачать файл по ID (streaming)",
+    description="Скачать файл по ID (streaming, HTTP Range)",
     response_class=StreamingResponse
 )
 async def download_file(
     file_id: UUID,
-    user: UserContext = Depends(get_current_user),
+    request: Request,
+    access: DownloadAccess = Depends(get_download_access),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Скачать файл (streaming).
 
+    Сжатые файлы (gzip/brotli):
+    - Accept-Encoding клиента содержит алгоритм → сжатые байты отдаются как есть
+      с Content-Encoding (Content-Length = размер сжатого файла)
+    - Иначе → потоковая распаковка (Content-Length = original_size)
+
+    Локальное хранилище (без распаковки на лету):
+    - полный файл и одиночный Range → SendfileResponse (zero-copy os.sendfile)
+    - несколько диапазонов → multipart/byteranges генератор
+    S3 и распаковка на лету - StreamingResponse генератор, Range игнорируется.
+
+    Доступ: JWT Bearer или подписанный токен ?token= (redirect из Query Module).
+    Токен с диапазоном байт отдаёт только этот диапазон (206), независимо
+    от Range заголовка клиента.
+
     Args:
         file_id: UUID файла
-        user: Текущий пользователь из JWT
+        request: HTTP запрос (заголовки Accept-Encoding, Range)
+        access: JWT пользователь или проверенный токен скачивания
         db: Database session
 
     Returns:
-        StreamingResponse: Streaming download файла
+        Response: SendfileResponse или StreamingResponse
 
     Raises:
         HTTPException 404: Файл не найден
@@ -301,27 +363,81 @@ async def download_file(
                 detail=f"File {file_id} not found"
             )
 
-        # Streaming generator
-        async def file_stream():
-            async for chunk in file_service.get_file(file_id):
-                yield chunk
+        headers = {
+            "Content-Disposition": f'attachment; filename="{metadata.original_filename}"',
+            "Content-Length": str(metadata.file_size)
+        }
+
+        content_encoding = None
+        decompress = False
+
+        if metadata.compressed:
+            headers["Vary"] = "Accept-Encoding"
+            if accepts_encoding(request.headers.get("accept-encoding"), metadata.compression_algorithm):
+                # Pass-through: клиент сам распакует содержимое
+                content_encoding = CONTENT_ENCODINGS[metadata.compression_algorithm]
+                headers["Content-Encoding"] = content_encoding
+            else:
+                decompress = True
 
         logger.info(
             "File download started",
             extra={
                 "file_id": str(file_id),
                 "original_filename": metadata.original_filename,
-                "user_id": user.sub
+                "user_id": access.subject,
+                "download_token": access.grant is not None,
+                "compressed": metadata.compressed,
+                "content_encoding": content_encoding
             }
         )
 
+        # Токен скачивания ограничивает диапазон байт
+        range_header = request.headers.get("range")
+        grant_range = access.grant.byte_range if access.grant is not None else None
+        if grant_range is not None:
+            range_header = access.grant.range_header()
+
+        # Zero-copy путь: байты на диске совпадают с телом ответа
+        local_path = None
+        if not decompress:
+            local_path = file_service.storage.get_local_path(metadata.data_path)
+
+        if local_path is not None:
+            return _local_file_response(local_path, metadata, headers, range_header)
+
+        # Streaming generator
+        async def file_stream():
+            async for chunk in file_service.get_file(file_id):
+                yield chunk
+
+        stream = file_stream()
+        status_code = status.HTTP_200_OK
+
+        if decompress:
+            # Прозрачная распаковка на лету
+            stream = decompress_stream(stream, metadata.compression_algorithm)
+            headers["Content-Length"] = str(metadata.original_size)
+
+        if grant_range is not None:
+            total_size = int(headers["Content-Length"])
+            start, end = grant_range
+            end = total_size - 1 if end is None else min(end, total_size - 1)
+            if start > end:
+                return Response(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                    headers={"Content-Range": f"bytes */{total_size}"}
+                )
+            stream = _slice_stream(stream, start, end - start + 1)
+            headers["Content-Range"] = f"bytes {start}-{end}/{total_size}"
+            headers["Content-Length"] = str(end - start + 1)
+            status_code = status.HTTP_206_PARTIAL_CONTENT
+
         return StreamingResponse(
-            file_stream(),
+            stream,
+            status_code=status_code,
             media_type=metadata.content_type,
-            headers={
-                "Content-Disposition": f'attachment; filename="{metadata.original_filename}"',
-                "Content-Length": str(metadata.file_size)
-            }
+            headers=headers
         )
 
     except HTTPException:
@@ -344,6 +460,100 @@ async def download_file(
         )
 
 
+async def _slice_stream(stream, offset: int, length: int):
+    """
+    Диапазон байт потока (S3 и распаковка на лету не поддерживают seek).
+
+    Args:
+        stream: Async генератор chunks
+        offset: Первый байт диапазона
+        length: Длина диапазона
+
+    Yields:
+        bytes: Chunks диапазона
+    """
+    position = 0
+    remaining = length
+    async for chunk in stream:
+        chunk_end = position + len(chunk)
+        if chunk_end > offset and remaining > 0:
+            piece = chunk[max(offset - position, 0):]
+            piece = piece[:remaining]
+            remaining -= len(piece)
+            yield piece
+        position = chunk_end
+        if remaining <= 0:
+            break
+
+
+def _local_file_response(
+    file_path: Path,
+    metadata: FileMetadata,
+    headers: dict,
+    range_header: Optional[str]
+) -> Response:
+    """
+    Ответ для файла локального хранилища с поддержкой HTTP Range (RFC 7233).
+
+    Args:
+        file_path: Абсолютный путь к файлу
+        metadata: Метаданные файла (file_size - размер на диске)
+        headers: Базовые заголовки ответа
+        range_header: Значение заголовка Range или None
+
+    Returns:
+        Response: 200/206 SendfileResponse, 206 multipart или 416
+    """
+    file_size = metadata.file_size
+    headers["Accept-Ranges"] = "bytes"
+    headers.pop("Content-Length", None)
+
+    if not range_header:
+        return SendfileResponse(
+            file_path,
+            length=file_size,
+            headers=headers,
+            media_type=metadata.content_type
+        )
+
+    download_service = FileDownloadService()
+    try:
+        ranges = download_service.parse_range_header(range_header, file_size)
+    except RangeNotSatisfiableError as e:
+        logger.warning(
+            "Range not satisfiable",
+            extra={"file_id": str(metadata.file_id), "range_header": range_header, "error": str(e)}
+        )
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{file_size}"}
+        )
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+        return SendfileResponse(
+            file_path,
+            offset=start,
+            length=end - start + 1,
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            headers=headers,
+            media_type=metadata.content_type
+        )
+
+    # Несколько диапазонов - multipart/byteranges генератор
+    return StreamingResponse(
+        download_service.astream_multipart_ranges(
+            file_path=file_path,
+            ranges=ranges,
+            content_type=metadata.content_type
+        ),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type="multipart/byteranges; boundary=RANGE_SEPARATOR",
+        headers=headers
+    )
+
+
 @router.delete(
     "/{file_id}",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -485,6 +695,9 @@ async def update_file_metadata(
             version=metadata.version,
             storage_path=metadata.storage_path,
             checksum=metadata.checksum,
+            compressed=metadata.compressed,
+            compression_algorithm=metadata.compression_algorithm,
+            original_size=metadata.original_size,
             # Cache TTL fields (PHASE 1)
             cache_updated_at=metadata.cache_updated_at.isoformat(),
             cache_ttl_hours=metadata.cache_ttl_hours,
@@ -525,41 +738,80 @@ async def update_file_metadata(
 async def list_files(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    exact_total: bool = True,
     user: UserContext = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Получить список файлов с пагинацией.
 
+    Поддерживает offset (skip) и keyset (cursor) пагинацию. Курсор
+    следующей страницы возвращается в next_cursor; запрос с cursor
+    выполняется range scan по индексу (created_at, file_id) без OFFSET.
+
     Args:
         skip: Количество файлов для пропуска (pagination offset)
         limit: Максимальное количество файлов (max 100)
+        cursor: Курсор следующей страницы (несовместим со skip)
+        exact_total: Точный total (COUNT(*)); False - оценка планировщика
         user: Текущий пользователь из JWT
         db: Database session
 
     Returns:
         FileListResponse: Список файлов с общим количеством
     """
+    keyset = None
+    if cursor:
+        if skip:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="cursor and skip cannot be combined"
+            )
+        try:
+            keyset = decode_cursor(cursor, "created_at", UUID)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
     try:
         # Ограничение limit
         if limit > 100:
             limit = 100
 
-        # Получение общего количества
-        count_result = await db.execute(
-            select(func.count()).select_from(FileMetadata)
-        )
-        total = count_result.scalar()
+        # Получение общего количества (оценка планировщика или точный COUNT(*))
+        total = None
+        if not exact_total:
+            total = await estimate_count(db, select(FileMetadata.file_id))
+        total_is_estimate = total is not None
+        if total is None:
+            count_result = await db.execute(
+                select(func.count()).select_from(FileMetadata)
+            )
+            total = count_result.scalar()
 
-        # Получение файлов с пагинацией
-        result = await db.execute(
-            select(FileMetadata)
-            .order_by(FileMetadata.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+        # Получение файлов с пагинацией (LIMIT + 1 - признак следующей страницы)
+        query = select(FileMetadata).order_by(
+            FileMetadata.created_at.desc(),
+            FileMetadata.file_id.desc()
         )
+        if keyset:
+            query = query.where(
+                keyset_condition(FileMetadata.created_at, FileMetadata.file_id, *keyset)
+            )
+        else:
+            query = query.offset(skip)
+
+        result = await db.execute(query.limit(limit + 1))
         files = result.scalars().all()
 
+        next_cursor = None
+        if len(files) > limit:
+            files = files[:limit]
+            next_cursor = encode_cursor("created_at", files[-1].created_at, files[-1].file_id)
+
         # Преобразование в response models
         file_responses = [
             FileMetadataResponse(
@@ -575,6 +827,9 @@ async def list_files(
                 version=f.version,
                 storage_path=f.storage_path,
                 checksum=f.checksum,
+                compressed=f.compressed,
+                compression_algorithm=f.compression_algorithm,
+                original_size=f.original_size,
                 # Cache TTL fields (PHASE 1)
                 cache_updated_at=f.cache_updated_at.isoformat(),
                 cache_ttl_hours=f.cache_ttl_hours,
@@ -584,8 +839,10 @@ async def list_files(
         ]
 
         return FileListResponse(
-            total=total,
-            files=file_responses
+            total=max(total, len(file_responses)) if total_is_estimate else total,
+            files=file_responses,
+            next_cursor=next_cursor,
+            total_is_estimate=total_is_estimate
         )
 
     except Exception as e:
@@ -0,0 +1,328 @@
+"""
+Multipart Uploads API Endpoints - resumable загрузка больших файлов частями.
+
+Используется Ingester Module для upload sessions:
+1. POST   /uploads                          - создание staging области
+2. PUT    /uploads/{upload_id}/parts/{n}    - запись части (raw body, параллельно)
+3. GET    /uploads/{upload_id}/parts        - список записанных частей
+4. POST   /uploads/{upload_id}/complete     - создание файла (Consistency Protocol)
+5. DELETE /uploads/{upload_id}              - abort, очистка staging
+
+Части пишутся сразу в staging area этого Storage Element по своим offset,
+на complete файл импортируется в хранилище без склейки и повторного чтения.
+Загрузка доступна только создавшему её principal (JWT sub).
+"""
+
+import logging
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db, get_current_user
+from app.api.v1.endpoints.files import FileUploadResponse
+from app.core.config import settings, StorageMode
+from app.core.exceptions import StorageException
+from app.core.security import UserContext
+from app.services.file_service import FileService
+from app.services.upload_staging_service import UploadStagingService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Коды ошибок staging → HTTP статус
+_ERROR_STATUS = {
+    "UPLOAD_NOT_FOUND": status.HTTP_404_NOT_FOUND,
+    "UPLOAD_CONFLICT": status.HTTP_409_CONFLICT,
+    "UPLOAD_FORBIDDEN": status.HTTP_403_FORBIDDEN,
+    "UPLOAD_INCOMPLETE": status.HTTP_409_CONFLICT,
+    "INVALID_UPLOAD_ID": status.HTTP_400_BAD_REQUEST,
+    "INVALID_UPLOAD_PARAMETERS": status.HTTP_400_BAD_REQUEST,
+    "INVALID_PART_NUMBER": status.HTTP_400_BAD_REQUEST,
+    "PART_SIZE_MISMATCH": status.HTTP_400_BAD_REQUEST,
+    "UNSUPPORTED_COMPRESSION": status.HTTP_400_BAD_REQUEST,
+    "INVALID_COMPRESSION_METADATA": status.HTTP_400_BAD_REQUEST,
+}
+
+
+class UploadInitiateRequest(BaseModel):
+    """Запрос на создание multipart upload"""
+    upload_id: str = Field(..., description="ID загрузки (upload session Ingester Module)")
+    file_size: int = Field(..., gt=0, description="Итоговый размер файла в байтах")
+    part_size: int = Field(..., gt=0, description="Размер части в байтах")
+
+
+class UploadInitiateResponse(BaseModel):
+    """Ответ на создание multipart upload"""
+    upload_id: str
+    file_size: int
+    part_size: int
+    total_parts: int
+
+
+class UploadPartResponse(BaseModel):
+    """Записанная часть"""
+    part_number: int
+    size: int
+    checksum: str
+    offset: int
+
+
+class UploadPartsResponse(BaseModel):
+    """Список записанных частей"""
+    upload_id: str
+    parts: list[UploadPartResponse]
+
+
+class UploadCompleteRequest(BaseModel):
+    """Метаданные файла для завершения multipart upload"""
+    original_filename: str = Field(..., description="Оригинальное имя файла")
+    content_type: Optional[str] = Field(None, description="MIME type файла")
+    description: Optional[str] = Field(None, description="Описание содержимого")
+    version: Optional[str] = Field(None, description="Версия документа")
+    file_id: Optional[UUID] = Field(None, description="UUID файла (опционально)")
+    metadata: Optional[dict] = Field(None, description="Дополнительные метаданные")
+
+
+def _check_upload_mode() -> None:
+    """Загрузка разрешена только в edit/rw режимах."""
+    if settings.app.mode not in [StorageMode.EDIT, StorageMode.RW]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File upload not allowed in {settings.app.mode.value} mode"
+        )
+
+
+def _to_http_exception(e: StorageException) -> HTTPException:
+    """Преобразование StorageException в HTTPException."""
+    return HTTPException(
+        status_code=_ERROR_STATUS.get(e.error_code, status.HTTP_500_INTERNAL_SERVER_ERROR),
+        detail=e.message
+    )
+
+
+@router.post(
+    "",
+    response_model=UploadInitiateResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Создать multipart upload",
+    description="Создать staging область для загрузки файла частями (идемпотентно)"
+)
+async def initiate_upload(
+    request: UploadInitiateRequest,
+    user: UserContext = Depends(get_current_user)
+):
+    """
+    Создать staging область для multipart upload.
+
+    Args:
+        request: upload_id, file_size, part_size
+        user: Текущий пользователь из JWT
+
+    Returns:
+        UploadInitiateResponse: Параметры загрузки
+    """
+    _check_upload_mode()
+
+    try:
+        manifest = await UploadStagingService().initiate(
+            upload_id=request.upload_id,
+            file_size=request.file_size,
+            part_size=request.part_size,
+            user_id=user.sub
+        )
+    except StorageException as e:
+        raise _to_http_exception(e)
+
+    return UploadInitiateResponse(
+        upload_id=manifest["upload_id"],
+        file_size=manifest["file_size"],
+        part_size=manifest["part_size"],
+        total_parts=manifest["total_parts"]
+    )
+
+
+@router.put(
+    "/{upload_id}/parts/{part_number}",
+    response_model=UploadPartResponse,
+    summary="Записать часть",
+    description="Записать часть файла (тело запроса - содержимое части)"
+)
+async def upload_part(
+    upload_id: str,
+    part_number: int,
+    request: Request,
+    user: UserContext = Depends(get_current_user)
+):
+    """
+    Записать часть multipart upload (streaming).
+
+    Args:
+        upload_id: ID загрузки
+        part_number: Номер части (1..total_parts)
+        request: HTTP запрос с содержимым части в теле
+        user: Текущий пользователь из JWT
+
+    Returns:
+        UploadPartResponse: Размер и SHA-256 записанной части
+    """
+    _check_upload_mode()
+
+    try:
+        marker = await UploadStagingService().write_part(
+            upload_id=upload_id,
+            part_number=part_number,
+            stream=request.stream(),
+            user_id=user.sub
+        )
+    except StorageException as e:
+        logger.warning(
+            f"Multipart upload part failed: {e.message}",
+            extra={"upload_id": upload_id, "part_number": part_number, "error_code": e.error_code}
+        )
+        raise _to_http_exception(e)
+
+    return UploadPartResponse(**marker)
+
+
+@router.get(
+    "/{upload_id}/parts",
+    response_model=UploadPartsResponse,
+    summary="Список частей",
+    description="Получить список записанных частей multipart upload"
+)
+async def list_parts(
+    upload_id: str,
+    user: UserContext = Depends(get_current_user)
+):
+    """
+    Список записанных частей.
+
+    Args:
+        upload_id: ID загрузки
+        user: Текущий пользователь из JWT
+
+    Returns:
+        UploadPartsResponse: Записанные части
+    """
+    try:
+        parts = await UploadStagingService().list_parts(upload_id, user_id=user.sub)
+    except StorageException as e:
+        raise _to_http_exception(e)
+
+    return UploadPartsResponse(
+        upload_id=upload_id,
+        parts=[UploadPartResponse(**part) for part in parts]
+    )
+
+
+@router.post(
+    "/{upload_id}/complete",
+    response_model=FileUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Завершить multipart upload",
+    description="Создать файл из загруженных частей"
+)
+async def complete_upload(
+    upload_id: str,
+    request: UploadCompleteRequest,
+    db: AsyncSession = Depends(get_db),
+    user: UserContext = Depends(get_current_user)
+):
+    """
+    Завершить multipart upload.
+
+    Процесс:
+    - Проверка наличия всех частей
+    - Итоговый SHA-256 из running hash (без повторного чтения файла)
+    - Создание файла через Consistency Protocol (WAL → Storage → Attr → DB → Commit)
+    - Очистка staging области
+
+    Args:
+        upload_id: ID загрузки
+        request: Метаданные файла
+        db: Database session
+        user: Текущий пользователь из JWT
+
+    Returns:
+        FileUploadResponse: Метаданные созданного файла
+    """
+    _check_upload_mode()
+
+    staging = UploadStagingService()
+
+    try:
+        staged_file = await staging.complete(upload_id, user_id=user.sub)
+
+        file_service = FileService(db)
+        created_file_id = await file_service.create_file(
+            file_data=None,
+            staged_file=staged_file,
+            original_filename=request.original_filename,
+            content_type=request.content_type or "application/octet-stream",
+            user_id=user.sub,
+            username=user.username,
+            description=request.description,
+            version=request.version,
+            metadata=request.metadata,
+            file_id=request.file_id
+        )
+    except StorageException as e:
+        logger.error(
+            f"Multipart upload completion failed: {e.message}",
+            extra={"upload_id": upload_id, "error_code": e.error_code, "details": e.details}
+        )
+        raise _to_http_exception(e)
+
+    await staging.abort(upload_id)
+
+    logger.info(
+        "Multipart upload completed",
+        extra={
+            "upload_id": upload_id,
+            "file_id": str(created_file_id),
+            "file_size": staged_file.file_size,
+            "user_id": user.sub
+        }
+    )
+
+    return FileUploadResponse(
+        file_id=created_file_id,
+        original_filename=request.original_filename,
+        file_size=staged_file.file_size,
+        checksum=staged_file.checksum,
+        message="File uploaded successfully"
+    )
+
+
+@router.delete(
+    "/{upload_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Отменить multipart upload",
+    description="Удалить staging область и все загруженные части (идемпотентно)"
+)
+async def abort_upload(
+    upload_id: str,
+    user: UserContext = Depends(get_current_user)
+):
+    """
+    Отменить multipart upload.
+
+    Args:
+        upload_id: ID загрузки
+        user: Текущий пользователь из JWT
+    """
+    try:
+        await UploadStagingService().abort(upload_id, user_id=user.sub)
+    except StorageException as e:
+        raise _to_http_exception(e)
+
+    logger.info(
+        "Multipart upload aborted",
+        extra={"upload_id": upload_id, "user_id": user.sub}
+    )
+
+    return None
@@ -16,6 +16,7 @@ from app.core.logging import get_logger
 from app.api.deps.database import get_db
 from app.services.file_upload import FileUploadService
 from app.models import FileMetadata
+from app.utils.sendfile_response import SendfileResponse
 
 # Router configuration
 router = APIRouter()
@@ -396,8 +397,10 @@ async def download_file(
                     content_length=content_length
                 )
 
-                return StreamingResponse(
-                    download_service.stream_file(file_path, start, end),
+                return SendfileResponse(
+                    file_path,
+                    offset=start,
+                    length=content_length,
                     status_code=status.HTTP_206_PARTIAL_CONTENT,
                     headers=headers
                 )
@@ -414,7 +417,7 @@ async def download_file(
                 )
 
                 return StreamingResponse(
-                    download_service.stream_multipart_ranges(
+                    download_service.astream_multipart_ranges(
                         file_path=file_path,
                         ranges=ranges,
                         content_type=file_meta.mime_type or "application/octet-stream"
@@ -447,8 +450,9 @@ async def download_file(
         file_size=file_size
     )
 
-    return StreamingResponse(
-        download_service.stream_file(file_path),
+    return SendfileResponse(
+        file_path,
+        length=file_size,
         status_code=status.HTTP_200_OK,
         headers=headers
     )
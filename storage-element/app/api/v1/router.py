@@ -4,6 +4,8 @@ API v1 Router - объединение всех endpoints.
 Структура:
 - /info - информация о storage element для auto-discovery
 - /files - файловые операции (upload, download, search, delete)
+- /uploads - resumable multipart uploads (staging частей для Ingester Module)
+- /blobs - content-addressed дедупликация (pre-check по SHA-256 для Ingester Module)
 - /gc - системные операции для Garbage Collector (только service accounts)
 - /admin - административные операции (в будущем)
 - /health - health checks (в main.py)
@@ -11,7 +13,7 @@ API v1 Router - объединение всех endpoints.
 
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import files, info, gc, capacity, cache
+from app.api.v1.endpoints import files, info, gc, capacity, cache, uploads, blobs
 
 # Создание главного router для API v1
 router = APIRouter()
@@ -30,6 +32,20 @@ router.include_router(
     tags=["files"]
 )
 
+# Подключение multipart upload endpoints (resumable upload sessions Ingester Module)
+router.include_router(
+    uploads.router,
+    prefix="/uploads",
+    tags=["uploads"]
+)
+
+# Подключение dedup endpoints (pre-check и создание файла из существующего blob)
+router.include_router(
+    blobs.router,
+    prefix="/blobs",
+    tags=["blobs"]
+)
+
 # Подключение GC endpoints для Garbage Collector (Sprint 16)
 # Доступны только для Service Accounts
 router.include_router(
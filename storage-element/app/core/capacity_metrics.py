@@ -407,6 +407,79 @@ Buckets optimized для Redis operations:
 - 0.5s-1.0s: Degraded (Redis overloaded)
 """
 
+# ================================================================================
+# Disk I/O Executor Metrics
+# ================================================================================
+
+storage_io_executor_queue_depth = Gauge(
+    'storage_io_executor_queue_depth',
+    'Disk I/O operations waiting for an executor worker',
+    ['storage_element_id']
+)
+"""
+Очередь disk I/O executor (операции, ожидающие свободного worker).
+
+Устойчиво высокое значение - диск не успевает за нагрузкой
+(увеличить STORAGE_IO_WORKERS или проверить latency диска).
+
+PromQL queries:
+    max_over_time(storage_io_executor_queue_depth[5m])
+"""
+
+storage_io_executor_active = Gauge(
+    'storage_io_executor_active',
+    'Disk I/O operations currently executing',
+    ['storage_element_id']
+)
+"""
+Количество выполняющихся disk I/O операций (<= STORAGE_IO_WORKERS).
+"""
+
+storage_io_executor_wait_seconds = Histogram(
+    'storage_io_executor_wait_seconds',
+    'Time disk I/O operations wait in the executor queue',
+    ['storage_element_id'],
+    buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0]
+)
+"""
+Время ожидания disk I/O операции в очереди executor.
+
+PromQL queries:
+    # p99 queue wait
+    histogram_quantile(0.99, rate(storage_io_executor_wait_seconds_bucket[5m]))
+"""
+
+# ================================================================================
+# S3 Client Metrics
+# ================================================================================
+
+storage_s3_operation_duration_seconds = Histogram(
+    'storage_s3_operation_duration_seconds',
+    'S3 API operation latency in seconds',
+    ['storage_element_id', 'operation', 'status'],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+)
+"""
+S3 API operation latency histogram (shared S3 client).
+
+Измеряется на уровне botocore событий для каждого вызова API
+(PutObject, GetObject, HeadObject, UploadPart, ...), включая
+установку соединения, если пул не смог переиспользовать существующее.
+
+Labels:
+    storage_element_id: Unique SE identifier
+    operation: Имя S3 операции (PutObject, HeadObject, ...)
+    status: "success" | "error"
+
+PromQL queries:
+    # p95 latency by operation
+    histogram_quantile(0.95,
+        sum(rate(storage_s3_operation_duration_seconds_bucket[5m])) by (le, operation))
+
+    # Small-file throughput (PutObject/sec)
+    rate(storage_s3_operation_duration_seconds_count{operation="PutObject"}[5m])
+"""
+
 # ================================================================================
 # Storage Element Info
 # ================================================================================
@@ -107,8 +107,15 @@ class ServerSettings(BaseSettings):
     port: int = 8000
     workers: int = 1
     reload: bool = False  # Hot reload для development
+    zero_copy: bool = Field(
+        default=False,
+        description=(
+            "Отдача файлов локального хранилища через os.sendfile "
+            "(uvicorn httptools, только проверенные версии uvicorn)"
+        )
+    )
 
-    @field_validator("reload", mode="before")
+    @field_validator("reload", "zero_copy", mode="before")
     @classmethod
     def parse_bool_fields(cls, v):
         """Парсинг boolean полей из environment variables."""
@@ -137,6 +144,13 @@ class DatabaseSettings(BaseSettings):
     # Префикс таблиц для уникальности
     table_prefix: str = "storage_elem_01"
 
+    # Загрузка одним commit: намерение в локальном журнале (WAL_DIR) вместо
+    # отдельных commit PENDING/COMMITTED записей WAL
+    wal_single_commit: bool = Field(
+        default=False,
+        description="Фиксировать метаданные загрузки и WAL одним commit (durable намерение в локальном журнале)"
+    )
+
     # SSL Configuration
     ssl_enabled: bool = Field(
         default=False,
@@ -164,7 +178,7 @@ class DatabaseSettings(BaseSettings):
         description="Path to client private key file for SSL"
     )
 
-    @field_validator("ssl_enabled", mode="before")
+    @field_validator("ssl_enabled", "wal_single_commit", mode="before")
     @classmethod
     def parse_bool_fields(cls, v):
         """Парсинг boolean полей из environment variables."""
@@ -274,6 +288,48 @@ class S3StorageSettings(BaseSettings):
     region: str = "us-east-1"
     app_folder: str = "storage_element_01"
 
+    # Shared S3 клиент (один на процесс, создаётся в lifespan)
+    max_pool_connections: int = Field(
+        default=50,
+        ge=1,
+        description="Размер пула HTTP соединений shared S3 клиента"
+    )
+    connect_timeout: float = Field(
+        default=10.0,
+        gt=0,
+        description="Таймаут установки соединения с S3 (секунды)"
+    )
+    read_timeout: float = Field(
+        default=60.0,
+        gt=0,
+        description="Таймаут чтения ответа S3 (секунды)"
+    )
+    max_retry_attempts: int = Field(
+        default=3,
+        ge=0,
+        description="Количество повторных попыток botocore при ошибках S3"
+    )
+
+    # Multipart upload: файлы больше порога пишутся частями по мере чтения,
+    # с ограниченным числом одновременно загружаемых частей (память ~ part_size * concurrency)
+    multipart_threshold: int = Field(
+        default=16 * 1024 * 1024,
+        ge=5 * 1024 * 1024,
+        description="Размер файла, начиная с которого используется multipart upload (байты)"
+    )
+    multipart_part_size: int = Field(
+        default=16 * 1024 * 1024,
+        ge=5 * 1024 * 1024,
+        le=5 * 1024 * 1024 * 1024,
+        description="Размер части multipart upload (байты, S3 минимум 5MB)"
+    )
+    multipart_concurrency: int = Field(
+        default=4,
+        ge=1,
+        le=64,
+        description="Максимальное число одновременно загружаемых частей"
+    )
+
     # DEPRECATED: soft_capacity_limit удалён в v1.1.0
     # Используйте STORAGE_MAX_SIZE в StorageSettings для всех типов хранилищ
     # Оставлен для backward compatibility при чтении из env (будет проигнорирован)
@@ -319,10 +375,62 @@ class StorageSettings(BaseSettings):
         description="DEPRECATED: Используйте STORAGE_MAX_SIZE (в байтах) вместо этого параметра"
     )
 
+    # Disk I/O executor: блокирующие операции локальной FS (read/write/fsync)
+    # выполняются в выделенном пуле потоков, а не в event loop
+    io_workers: int = Field(
+        default=16,
+        ge=1,
+        le=256,
+        description="Количество потоков disk I/O executor"
+    )
+    io_queue_size: int = Field(
+        default=256,
+        ge=0,
+        description="Максимальная очередь disk I/O операций (сверх неё - ожидание в event loop)"
+    )
+
+    # Staging area для resumable multipart uploads (части файла до complete)
+    # None: local → {STORAGE_LOCAL_BASE_PATH}/.staging (тот же filesystem, complete = rename)
+    #       s3    → ./.data/staging
+    staging_path: Optional[Path] = Field(
+        default=None,
+        description="Директория staging для multipart uploads"
+    )
+    staging_max_part_size: int = Field(
+        default=512 * 1024 * 1024,
+        gt=0,
+        description="Максимальный размер одной части multipart upload в байтах"
+    )
+    # Брошенные multipart uploads (сессия Ingester истекла без abort):
+    # не меньше UPLOAD_SESSION_TTL_SECONDS Ingester Module
+    staging_ttl_seconds: int = Field(
+        default=24 * 3600,
+        ge=300,
+        description="Время жизни staging области без записи частей (секунды)"
+    )
+    staging_sweep_interval_seconds: int = Field(
+        default=3600,
+        ge=10,
+        description="Интервал фоновой очистки брошенных staging областей (секунды)"
+    )
+
+    # Content-addressed дедупликация: одинаковое содержимое (SHA-256) хранится
+    # одним blob ({.blobs}/ab/cd/<sha256>) со счётчиком ссылок в БД
+    dedup_enabled: bool = Field(
+        default=False,
+        description="Хранить одинаковое содержимое одним blob (content-addressed)"
+    )
+
     # Sub-settings
     local: LocalStorageSettings = Field(default_factory=LocalStorageSettings)
     s3: S3StorageSettings = Field(default_factory=S3StorageSettings)
 
+    @field_validator("dedup_enabled", mode="before")
+    @classmethod
+    def parse_dedup_enabled(cls, v):
+        """Парсинг boolean из environment variables."""
+        return parse_bool_from_env(v)
+
     @model_validator(mode='after')
     def migrate_legacy_size_params(self) -> 'StorageSettings':
         """
@@ -514,6 +622,13 @@ class JWTSettings(BaseSettings):
     public_key_path: Optional[str] = None
     algorithm: str = "RS256"
 
+    # Общий с Query Module ключ подписи токенов скачивания (redirect режим)
+    download_signing_key: Optional[str] = Field(
+        default=None,
+        alias="DOWNLOAD_SIGNING_KEY",
+        description="HMAC ключ проверки токенов прямого скачивания (без ключа - только JWT)"
+    )
+
     @field_validator("public_key_path")
     @classmethod
     def validate_public_key_path(cls, v):
@@ -0,0 +1,107 @@
+"""
+Signed download tokens - прямое скачивание по redirect из Query Module.
+
+Query Module подписывает короткоживущий токен, ограниченный одним file_id
+и (опционально) диапазоном байт, и отвечает клиенту redirect на Storage
+Element. SE проверяет подпись локально общим ключом DOWNLOAD_SIGNING_KEY -
+без round-trip к Query/Admin Module.
+
+Формат: <payload>.<signature> (base64url без padding)
+- payload: JSON {"fid": file_id, "exp": unix time, "rng": [start, end|null] | null}
+- signature: HMAC-SHA256(key, payload)
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.exceptions import StorageException
+
+
+@dataclass(frozen=True)
+class DownloadGrant:
+    """
+    Проверенный токен скачивания.
+
+    Attributes:
+        file_id: UUID файла, на который выдан токен
+        expires_at: Время истечения (unix)
+        byte_range: Разрешённый диапазон (start, end) или None - весь файл
+    """
+    file_id: str
+    expires_at: int
+    byte_range: Optional[tuple[int, Optional[int]]] = None
+
+    def range_header(self) -> Optional[str]:
+        """Range заголовок разрешённого диапазона (None - весь файл)."""
+        if self.byte_range is None:
+            return None
+        start, end = self.byte_range
+        return f"bytes={start}-{end if end is not None else ''}"
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def _invalid(reason: str) -> StorageException:
+    return StorageException(
+        message=f"Invalid download token: {reason}",
+        error_code="INVALID_DOWNLOAD_TOKEN",
+        details={"reason": reason}
+    )
+
+
+def verify_download_token(
+    token: str,
+    file_id: str,
+    signing_key: str,
+    now: Optional[float] = None
+) -> DownloadGrant:
+    """
+    Проверить подпись, срок и file_id токена скачивания.
+
+    Args:
+        token: Значение query параметра ?token=
+        file_id: UUID запрашиваемого файла
+        signing_key: Общий с Query Module ключ подписи
+        now: Текущее время (unix, для тестов)
+
+    Returns:
+        DownloadGrant: Разрешение на скачивание
+
+    Raises:
+        StorageException: INVALID_DOWNLOAD_TOKEN - подпись, срок или file_id не совпадают
+    """
+    try:
+        encoded_payload, encoded_signature = token.split(".")
+        signature = _b64decode(encoded_signature)
+    except (ValueError, binascii.Error):
+        raise _invalid("malformed")
+
+    expected = hmac.new(signing_key.encode(), encoded_payload.encode(), hashlib.sha256).digest()
+    if not hmac.compare_digest(signature, expected):
+        raise _invalid("signature")
+
+    try:
+        payload = json.loads(_b64decode(encoded_payload))
+        grant = DownloadGrant(
+            file_id=str(payload["fid"]),
+            expires_at=int(payload["exp"]),
+            byte_range=tuple(payload["rng"]) if payload.get("rng") is not None else None
+        )
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise _invalid("malformed")
+
+    if grant.expires_at < (now if now is not None else time.time()):
+        raise _invalid("expired")
+
+    if grant.file_id != file_id:
+        raise _invalid("file_id")
+
+    return grant
@@ -0,0 +1,191 @@
+"""
+Disk I/O Executor - выделенный ограниченный пул потоков для локальной FS.
+
+Блокирующие вызовы (open, read, write, fsync, rename) внутри async def
+останавливают весь event loop: один медленный fsync на загруженном диске
+задерживает все запросы worker'а. Executor выносит их в отдельные потоки:
+
+- STORAGE_IO_WORKERS потоков, не разделяемых с default executor asyncio
+- очередь ограничена STORAGE_IO_QUEUE_SIZE: при переполнении вызывающая
+  корутина ждёт (backpressure) вместо неограниченного роста очереди
+- глубина очереди, число активных операций и время ожидания - в Prometheus
+
+io_uring backend не используется: в Python нет стабильной поддержки,
+пул потоков - переносимый эквивалент для блокирующих syscalls.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Optional, TypeVar
+
+from app.core.capacity_metrics import (
+    storage_io_executor_active,
+    storage_io_executor_queue_depth,
+    storage_io_executor_wait_seconds,
+)
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class DiskIOExecutor:
+    """
+    Ограниченный executor для блокирующих операций локальной FS.
+
+    Usage:
+        >>> executor = get_io_executor()
+        >>> data = await executor.run(f.read, CHUNK_SIZE)
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int):
+        """
+        Args:
+            max_workers: Количество потоков
+            max_queue_size: Максимум операций, ожидающих свободного потока
+        """
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="disk-io"
+        )
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queued = 0
+        self._active = 0
+
+        element_id = settings.storage.element_id
+        self._queue_depth_gauge = storage_io_executor_queue_depth.labels(storage_element_id=element_id)
+        self._active_gauge = storage_io_executor_active.labels(storage_element_id=element_id)
+        self._wait_histogram = storage_io_executor_wait_seconds.labels(storage_element_id=element_id)
+
+    @property
+    def queue_depth(self) -> int:
+        """Операции, ожидающие свободного потока."""
+        return self._queued
+
+    @property
+    def active(self) -> int:
+        """Выполняющиеся операции."""
+        return self._active
+
+    def _track(self, queued_delta: int, active_delta: int) -> None:
+        self._queued += queued_delta
+        self._active += active_delta
+        self._queue_depth_gauge.set(self._queued)
+        self._active_gauge.set(self._active)
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Выполнить блокирующую функцию в disk I/O потоке.
+
+        Args:
+            func: Блокирующая функция
+            *args, **kwargs: Аргументы функции
+
+        Returns:
+            Результат func
+        """
+        loop = asyncio.get_running_loop()
+        if self._slots_loop is not loop:
+            # Semaphore привязан к event loop (новый loop - например, в тестах)
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queue_size)
+            self._slots_loop = loop
+
+        slots = self._slots
+        submitted_at = time.perf_counter()
+
+        await slots.acquire()
+        self._track(1, 0)
+        started = False
+
+        def on_started() -> None:
+            nonlocal started
+            started = True
+            self._track(-1, 1)
+            self._wait_histogram.observe(time.perf_counter() - submitted_at)
+
+        def call() -> T:
+            # Выполняется в потоке executor
+            loop.call_soon_threadsafe(on_started)
+            return func(*args, **kwargs)
+
+        def on_done(_) -> None:
+            # Слот занят до завершения операции в потоке, а не вызывающей корутины
+            if started:
+                self._track(0, -1)
+            else:
+                self._track(-1, 0)
+            slots.release()
+
+        try:
+            concurrent_future = self._executor.submit(call)
+        except BaseException:
+            self._track(-1, 0)
+            slots.release()
+            raise
+
+        future = asyncio.wrap_future(concurrent_future, loop=loop)
+        future.add_done_callback(on_done)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # Ещё не начатая операция снимается с очереди, начатая - дорабатывает
+            concurrent_future.cancel()
+            raise
+
+    def shutdown(self) -> None:
+        """Остановить потоки executor (ожидая выполняющиеся операции)."""
+        self._executor.shutdown(wait=True)
+
+
+_io_executor: Optional[DiskIOExecutor] = None
+
+
+def get_io_executor() -> DiskIOExecutor:
+    """
+    Получить disk I/O executor singleton.
+
+    Returns:
+        DiskIOExecutor: Executor с параметрами из settings.storage
+    """
+    global _io_executor
+
+    if _io_executor is None:
+        _io_executor = DiskIOExecutor(
+            max_workers=settings.storage.io_workers,
+            max_queue_size=settings.storage.io_queue_size
+        )
+        logger.info(
+            "Disk I/O executor initialized",
+            extra={
+                "io_workers": settings.storage.io_workers,
+                "io_queue_size": settings.storage.io_queue_size,
+            }
+        )
+
+    return _io_executor
+
+
+async def run_io(func: Callable[..., T], *args, **kwargs) -> T:
+    """Выполнить блокирующую FS операцию в disk I/O executor."""
+    return await get_io_executor().run(partial(func, *args, **kwargs))
+
+
+def shutdown_io_executor() -> None:
+    """
+    Остановить disk I/O executor при shutdown приложения.
+
+    Должен вызываться в lifespan событии FastAPI.
+    """
+    global _io_executor
+
+    if _io_executor is not None:
+        _io_executor.shutdown()
+        _io_executor = None
+        logger.info("Disk I/O executor shut down")
@@ -0,0 +1,145 @@
+"""
+Shared асинхронный S3 клиент для Storage Element.
+
+Один aioboto3 клиент на процесс вместо Session + client на каждую операцию:
+- переиспользование пула HTTP соединений (без TCP/TLS handshake на запрос)
+- однократное разрешение credentials и endpoint
+- размер пула и таймауты настраиваются через STORAGE_S3_*
+
+Создаётся при первом обращении (или в lifespan), закрывается в lifespan.
+Латентность каждой S3 операции пишется в storage_s3_operation_duration_seconds.
+"""
+
+import asyncio
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import aioboto3
+from aiobotocore.config import AioConfig
+
+from app.core.capacity_metrics import storage_s3_operation_duration_seconds
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Глобальный singleton клиент
+_s3_client = None
+_exit_stack: Optional[AsyncExitStack] = None
+_init_lock = asyncio.Lock()
+
+# Ключ времени начала операции в botocore request context
+_START_TIME_KEY = "artstore_start_time"
+
+
+def _on_before_call(context, **kwargs) -> None:
+    context[_START_TIME_KEY] = time.perf_counter()
+
+
+def _observe(context, operation: str, status: str) -> None:
+    start_time = context.get(_START_TIME_KEY)
+    if start_time is None:
+        return
+    storage_s3_operation_duration_seconds.labels(
+        storage_element_id=settings.storage.element_id,
+        operation=operation,
+        status=status,
+    ).observe(time.perf_counter() - start_time)
+
+
+def _on_after_call(http_response, model, context, **kwargs) -> None:
+    status = "success" if http_response.status_code < 300 else "error"
+    _observe(context, model.name, status)
+
+
+def _on_after_call_error(context, event_name: str, **kwargs) -> None:
+    # event_name: after-call-error.s3.{OperationName}
+    _observe(context, event_name.rsplit(".", 1)[-1], "error")
+
+
+def register_s3_metrics(s3_client) -> None:
+    """Подключить метрики латентности к событиям botocore клиента."""
+    events = s3_client.meta.events
+    events.register("before-call.s3", _on_before_call)
+    events.register("after-call.s3", _on_after_call)
+    events.register("after-call-error.s3", _on_after_call_error)
+
+
+async def get_s3_client():
+    """
+    Получить shared S3 client singleton.
+
+    Создаёт клиент при первом вызове, повторно использует при последующих.
+
+    Returns:
+        aiobotocore S3 client с пулом соединений
+    """
+    global _s3_client, _exit_stack
+
+    if _s3_client is None:
+        async with _init_lock:
+            if _s3_client is None:
+                s3_settings = settings.storage.s3
+                exit_stack = AsyncExitStack()
+                session = aioboto3.Session()
+
+                client = await exit_stack.enter_async_context(
+                    session.client(
+                        's3',
+                        endpoint_url=s3_settings.endpoint_url,
+                        aws_access_key_id=s3_settings.access_key_id,
+                        aws_secret_access_key=s3_settings.secret_access_key,
+                        region_name=s3_settings.region,
+                        config=AioConfig(
+                            max_pool_connections=s3_settings.max_pool_connections,
+                            connect_timeout=s3_settings.connect_timeout,
+                            read_timeout=s3_settings.read_timeout,
+                            retries={"max_attempts": s3_settings.max_retry_attempts},
+                        ),
+                    )
+                )
+                register_s3_metrics(client)
+
+                _s3_client, _exit_stack = client, exit_stack
+
+                logger.info(
+                    "Shared S3 client initialized",
+                    extra={
+                        "endpoint_url": s3_settings.endpoint_url,
+                        "bucket_name": s3_settings.bucket_name,
+                        "max_pool_connections": s3_settings.max_pool_connections,
+                    }
+                )
+
+    return _s3_client
+
+
+@asynccontextmanager
+async def shared_s3_client() -> AsyncIterator:
+    """
+    Async context manager над shared клиентом.
+
+    Drop-in замена `async with session.client('s3', ...) as s3_client`:
+    клиент при выходе из блока НЕ закрывается.
+    """
+    yield await get_s3_client()
+
+
+async def close_s3_client() -> None:
+    """
+    Закрыть shared S3 клиент при shutdown приложения.
+
+    Должен вызываться в lifespan событии FastAPI.
+    """
+    global _s3_client, _exit_stack
+
+    if _exit_stack is not None:
+        try:
+            await _exit_stack.aclose()
+            logger.info("Shared S3 client closed")
+        except Exception as e:
+            logger.error(f"Error closing S3 client: {e}")
+        finally:
+            _s3_client = None
+            _exit_stack = None
@@ -0,0 +1,264 @@
+"""
+Zero-copy HTTP протокол uvicorn для отдачи файлов через sendfile.
+
+Uvicorn не реализует ASGI расширение "http.response.zerocopysend":
+тело ответа всегда проходит через user space (read → bytes → transport.write).
+Для скачивания файлов с локального хранилища это лишнее копирование
+и лишняя нагрузка на event loop.
+
+ZeroCopyHttpToolsProtocol - HttpToolsProtocol, который объявляет расширение
+в scope["extensions"] и обрабатывает сообщение:
+
+    {
+        "type": "http.response.zerocopysend",
+        "file": <файловый объект, открытый в режиме "rb">,
+        "offset": <смещение или None - текущая позиция>,
+        "count": <число байт или None - до конца файла>,
+        "more_body": False
+    }
+
+Данные передаются os.sendfile() в сокет соединения: ядро копирует страницы
+page cache напрямую в сокет. loop.sendfile() не используется - uvloop
+(uvicorn[standard]) его не реализует. Требуется Content-Length (chunked
+encoding не поддерживается).
+
+Расширение объявляется только для открытого TCP соединения без TLS на
+платформе с os.sendfile; иначе SendfileResponse отдаёт файл блоками.
+
+Протокол опирается на внутреннее состояние RequestResponseCycle uvicorn
+(flow.write_paused, chunked_encoding, expected_content_length), которое не
+является публичным API. Поэтому расширение объявляется только для
+проверенных версий uvicorn (SUPPORTED_UVICORN_VERSIONS) и cycle с ожидаемыми
+атрибутами. Если после ожидания буфер транспорта не пуст, тело отдаётся
+штатными http.response.body: os.sendfile пишет в сокет мимо буфера.
+
+Подключение (SERVER_ZERO_COPY=on): uvicorn.run(..., http=ZeroCopyHttpToolsProtocol).
+"""
+
+import asyncio
+import logging
+import os
+
+import uvicorn
+from uvicorn.protocols.http.httptools_impl import HttpToolsProtocol, RequestResponseCycle
+
+from app.core.io_executor import run_io
+
+logger = logging.getLogger(__name__)
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+# Версии uvicorn (major.minor), с внутренним устройством которых проверен протокол
+SUPPORTED_UVICORN_VERSIONS = {(0, 32)}
+
+# Внутреннее состояние RequestResponseCycle, используемое протоколом
+_CYCLE_ATTRIBUTES = (
+    "transport", "flow", "scope", "disconnected", "response_started",
+    "response_complete", "chunked_encoding", "expected_content_length",
+)
+
+# Размер блока fallback отдачи (непустой буфер транспорта)
+_FALLBACK_CHUNK_SIZE = 1024 * 1024
+
+
+def uvicorn_supported(version: str = uvicorn.__version__) -> bool:
+    """
+    Версия uvicorn входит в проверенные для zero-copy протокола.
+
+    Args:
+        version: Версия uvicorn (default: установленная)
+
+    Returns:
+        bool: True если major.minor в SUPPORTED_UVICORN_VERSIONS
+    """
+    try:
+        major, minor = (int(part) for part in version.split(".")[:2])
+    except ValueError:
+        return False
+    return (major, minor) in SUPPORTED_UVICORN_VERSIONS
+
+
+def _cycle_compatible(cycle: RequestResponseCycle) -> bool:
+    """Cycle содержит внутреннее состояние, на которое опирается протокол."""
+    return (
+        all(hasattr(cycle, name) for name in _CYCLE_ATTRIBUTES)
+        and hasattr(cycle.flow, "write_paused")
+        and hasattr(cycle.flow, "drain")
+    )
+
+
+def _supports_sendfile(transport: asyncio.Transport) -> bool:
+    """Тело ответа можно передать os.sendfile в сокет транспорта."""
+    return (
+        hasattr(os, "sendfile")
+        and not transport.is_closing()
+        and transport.get_extra_info("socket") is not None
+        and transport.get_extra_info("sslcontext") is None
+    )
+
+
+async def _flush_transport(cycle: RequestResponseCycle) -> None:
+    """
+    Ожидание отправки буфера транспорта (заголовки ответа).
+
+    os.sendfile пишет в сокет мимо транспорта: данные в его буфере
+    должны уйти раньше тела.
+    """
+    transport = cycle.transport
+    if not transport.get_write_buffer_size():
+        return
+
+    low, high = transport.get_write_buffer_limits()
+    # high=0: любой непустой буфер приостанавливает запись (pause_writing),
+    # resume_writing - когда буфер пуст
+    transport.set_write_buffer_limits(high=0)
+    try:
+        while transport.get_write_buffer_size() and not cycle.disconnected:
+            if cycle.flow.write_paused:
+                await cycle.flow.drain()
+            else:
+                await asyncio.sleep(0)
+    finally:
+        transport.set_write_buffer_limits(high=high, low=low)
+
+
+async def _wait_writable(loop: asyncio.AbstractEventLoop, fd: int) -> None:
+    waiter = loop.create_future()
+    loop.add_writer(fd, lambda: waiter.done() or waiter.set_result(None))
+    try:
+        await waiter
+    finally:
+        loop.remove_writer(fd)
+
+
+async def _sendfile(cycle: RequestResponseCycle, in_fd: int, offset: int, count: int) -> None:
+    """
+    os.sendfile в неблокирующий сокет соединения.
+
+    Ожидание готовности к записи - на дубликате дескриптора сокета:
+    сам дескриптор зарегистрирован транспортом в event loop.
+    """
+    loop = asyncio.get_running_loop()
+    out_fd = os.dup(cycle.transport.get_extra_info("socket").fileno())
+    try:
+        while count > 0:
+            try:
+                sent = os.sendfile(out_fd, in_fd, offset, count)
+            except (BlockingIOError, InterruptedError):
+                await _wait_writable(loop, out_fd)
+                continue
+            if sent == 0:
+                # Файл укоротился после расчёта Content-Length
+                raise RuntimeError("Unexpected end of file during sendfile")
+            offset += sent
+            count -= sent
+    finally:
+        os.close(out_fd)
+
+
+async def _send_body(cycle: RequestResponseCycle, in_fd: int, offset: int, count: int) -> None:
+    """Fallback: тело штатными http.response.body (pread блоками в disk I/O executor)."""
+    logger.warning("Transport buffer not empty, sending file body without sendfile")
+    while count > 0:
+        chunk = await run_io(os.pread, in_fd, min(_FALLBACK_CHUNK_SIZE, count), offset)
+        if not chunk:
+            raise RuntimeError("Unexpected end of file during sendfile fallback")
+        offset += len(chunk)
+        count -= len(chunk)
+        await cycle.send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+
+async def _zerocopy_send(cycle: RequestResponseCycle, message) -> None:
+    """Обработка http.response.zerocopysend для cycle uvicorn."""
+    if not cycle.response_started or cycle.response_complete:
+        raise RuntimeError(f"Unexpected ASGI message '{ZEROCOPY_EXTENSION}'.")
+
+    if cycle.flow.write_paused and not cycle.disconnected:
+        await cycle.flow.drain()
+
+    if cycle.disconnected:
+        return
+
+    if cycle.scope["method"] != "HEAD":
+        if cycle.chunked_encoding:
+            raise RuntimeError(f"'{ZEROCOPY_EXTENSION}' requires Content-Length response header.")
+
+        file = message["file"]
+        offset = message.get("offset")
+        if offset is None:
+            offset = file.tell()
+        count = message.get("count")
+        if count is None:
+            count = os.fstat(file.fileno()).st_size - offset
+
+        if count > cycle.expected_content_length:
+            raise RuntimeError("Response content longer than Content-Length")
+
+        if count > 0:
+            await _flush_transport(cycle)
+            if cycle.disconnected:
+                return
+            if cycle.transport.get_write_buffer_size():
+                # Данные в буфере транспорта ушли бы после тела
+                await _send_body(cycle, file.fileno(), offset, count)
+            else:
+                try:
+                    await _sendfile(cycle, file.fileno(), offset, count)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Клиент закрыл соединение - ответ не завершается
+                    cycle.transport.close()
+                    cycle.disconnected = True
+                    return
+                cycle.expected_content_length -= count
+
+    # Завершение ответа (проверка Content-Length, keep-alive) - штатной логикой
+    await cycle.send({
+        "type": "http.response.body",
+        "body": b"",
+        "more_body": message.get("more_body", False),
+    })
+
+
+class _ZeroCopyApp:
+    """
+    ASGI обёртка: объявляет расширение и перехватывает его сообщения.
+
+    send, переданный uvicorn, - метод RequestResponseCycle запроса;
+    состояние ответа (Content-Length, keep-alive) ведёт он же.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        cycle = getattr(send, "__self__", None)
+        if (
+            scope["type"] != "http"
+            or not isinstance(cycle, RequestResponseCycle)
+            or not _cycle_compatible(cycle)
+            or not _supports_sendfile(cycle.transport)
+        ):
+            return await self.app(scope, receive, send)
+
+        scope.setdefault("extensions", {})[ZEROCOPY_EXTENSION] = {}
+
+        async def zerocopy_send(message) -> None:
+            if message["type"] == ZEROCOPY_EXTENSION:
+                await _zerocopy_send(cycle, message)
+            else:
+                await send(message)
+
+        return await self.app(scope, receive, zerocopy_send)
+
+
+class ZeroCopyHttpToolsProtocol(HttpToolsProtocol):
+    """
+    HttpToolsProtocol, объявляющий ASGI расширение http.response.zerocopysend.
+
+    С непроверенной версией uvicorn работает как обычный HttpToolsProtocol.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        if uvicorn_supported():
+            self.app = _ZeroCopyApp(self.app)
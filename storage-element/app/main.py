@@ -34,11 +34,18 @@ async def lifespan(app: FastAPI):
     Startup:
     - Инициализация базы данных
     - Инициализация Redis клиента (для кеширования)
+    - Инициализация shared S3 клиента (для STORAGE_TYPE=s3)
     - Проверка конфигурации
+    - Recovery незавершённых загрузок из журнала намерений
+    - Фоновая очистка брошенных multipart uploads
     - Загрузка текущего режима из БД
 
     Shutdown:
+    - Остановка очистки multipart uploads
     - Закрытие Redis соединений
+    - Закрытие shared S3 клиента
+    - Закрытие журнала намерений
+    - Остановка disk I/O executor
     - Закрытие соединений с БД
     - Cleanup resources
 
@@ -64,9 +71,20 @@ async def lifespan(app: FastAPI):
     # Инициализация Redis (Sprint 19: только для кеширования, без HealthReporter)
     await _init_redis()
 
+    # Shared S3 клиент (пул соединений на весь процесс)
+    if settings.storage.type == StorageType.S3:
+        await _init_s3_client()
+
     # Проверка доступности хранилища при старте (graceful degradation)
     await _check_storage_on_startup()
 
+    # Незавершённые загрузки процессов, завершившихся со сбоем (DB_WAL_SINGLE_COMMIT)
+    await _recover_upload_intents()
+
+    # Брошенные multipart uploads (сессия Ingester истекла без abort)
+    from app.services.upload_staging_service import start_staging_sweeper
+    start_staging_sweeper()
+
     # TODO: Проверка storage mode из БД vs config
     # TODO: Инициализация master election если edit/rw режим
 
@@ -75,9 +93,21 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down Storage Element")
 
+    from app.services.upload_staging_service import stop_staging_sweeper
+    await stop_staging_sweeper()
+
     # Закрытие Redis (Sprint 19: без HealthReporter)
     await _shutdown_redis()
 
+    from app.core.s3_client import close_s3_client
+    await close_s3_client()
+
+    from app.services.intent_journal import close_intent_journal
+    close_intent_journal()
+
+    from app.core.io_executor import shutdown_io_executor
+    shutdown_io_executor()
+
     await close_db()
     logger.info("Database connections closed")
 
@@ -136,6 +166,41 @@ async def _shutdown_redis():
         )
 
 
+async def _init_s3_client():
+    """
+    Инициализация shared S3 клиента.
+
+    Graceful degradation - при ошибке клиент будет создан при первой операции.
+    """
+    from app.core.s3_client import get_s3_client
+
+    try:
+        await get_s3_client()
+    except Exception as e:
+        logger.warning(
+            "Failed to initialize shared S3 client",
+            extra={"error": str(e), "endpoint_url": settings.storage.s3.endpoint_url}
+        )
+
+
+async def _recover_upload_intents():
+    """
+    Удаление файлов данных незавершённых загрузок по журналам намерений.
+
+    Ошибка recovery не блокирует старт: журнал остаётся до следующего запуска.
+    """
+    from app.services.intent_journal import recover_intents
+    from app.services.storage_service import get_storage_service
+
+    try:
+        await recover_intents(settings.wal_dir, get_storage_service())
+    except Exception as e:
+        logger.error(
+            "Upload intent recovery failed",
+            extra={"error": str(e), "wal_dir": str(settings.wal_dir)}
+        )
+
+
 async def _check_storage_on_startup():
     """
     Проверка доступности хранилища при старте приложения.
@@ -484,11 +549,23 @@ app.include_router(api_v1_router, prefix="/api/v1")
 if __name__ == "__main__":
     import uvicorn
 
+    from app.core.zerocopy_http import ZeroCopyHttpToolsProtocol, uvicorn_supported
+
+    zero_copy = settings.server.zero_copy
+    if zero_copy and not uvicorn_supported():
+        logger.warning(
+            "SERVER_ZERO_COPY ignored: uvicorn version is not supported by zero-copy protocol",
+            extra={"uvicorn_version": uvicorn.__version__}
+        )
+        zero_copy = False
+
     uvicorn.run(
         "app.main:app",
         host=settings.server.host,
         port=settings.server.port,
         reload=settings.server.reload,
         workers=settings.server.workers,
+        # http.response.zerocopysend: скачивание через os.sendfile
+        http=ZeroCopyHttpToolsProtocol if zero_copy else "auto",
         log_config=None  # Используем нашу систему логирования
     )
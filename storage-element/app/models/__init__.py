@@ -5,6 +5,7 @@ Database models 4;O Storage Element.
 """
 
 from app.models.file_metadata import FileMetadata
+from app.models.storage_blob import StorageBlob
 from app.models.storage_config import StorageConfig
 from app.models.wal import (
     WALTransaction,
@@ -14,6 +15,7 @@ from app.models.wal import (
 
 __all__ = [
     "FileMetadata",
+    "StorageBlob",
     "StorageConfig",
     "WALTransaction",
     "WALOperationType",
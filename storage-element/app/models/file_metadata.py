@@ -8,7 +8,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import String, Integer, BigInteger, DateTime, Index, Text
+from sqlalchemy import String, Integer, BigInteger, Boolean, DateTime, Index, Text
 from sqlalchemy.dialects.postgresql import UUID as PGUUID, JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, declared_attr
 from sqlalchemy import func
@@ -37,6 +37,10 @@ class FileMetadata(Base):
     - version: Версия документа
     - storage_path: Относительный путь в хранилище
     - checksum: SHA256 checksum файла
+    - compressed: Файл хранится в сжатом виде (gzip/brotli)
+    - compression_algorithm: Алгоритм сжатия
+    - original_size: Размер до сжатия
+    - blob_path: Путь к общему blob (dedup), None - содержимое по storage_path
     - search_vector: PostgreSQL full-text search vector
     - metadata_json: Дополнительные метаданные (JSONB)
     """
@@ -162,6 +166,34 @@ class FileMetadata(Base):
         comment="SHA256 checksum файла"
     )
 
+    # Compression (файл сжат Ingester Module)
+    compressed: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=False,
+        server_default="false",
+        comment="Флаг сжатия файла"
+    )
+
+    compression_algorithm: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="Алгоритм сжатия: gzip, brotli"
+    )
+
+    original_size: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        nullable=True,
+        comment="Размер файла до сжатия в байтах"
+    )
+
+    # Content-addressed dedup: содержимое в общем blob (StorageBlob)
+    blob_path: Mapped[Optional[str]] = mapped_column(
+        String(1000),
+        nullable=True,
+        comment="Относительный путь общего blob (dedup)"
+    )
+
     # Full-text search vector (PostgreSQL)
     search_vector: Mapped[Optional[str]] = mapped_column(
         TSVECTOR,
@@ -194,6 +226,12 @@ class FileMetadata(Base):
                 "created_by_id",
                 "created_at"
             ),
+            # Composite index для keyset (cursor) пагинации списка файлов
+            Index(
+                f"idx_{prefix}_created_file_id",
+                "created_at",
+                "file_id"
+            ),
             # Index для поиска по оригинальному имени
             Index(
                 f"idx_{prefix}_filename",
@@ -221,6 +259,16 @@ class FileMetadata(Base):
         expiration = self.cache_updated_at + timedelta(hours=self.cache_ttl_hours)
         return datetime.now(timezone.utc) > expiration
 
+    @property
+    def data_path(self) -> str:
+        """
+        Относительный путь к содержимому файла в хранилище.
+
+        Returns:
+            str: blob_path для дедуплицированных файлов, иначе storage_path + storage_filename
+        """
+        return self.blob_path or f"{self.storage_path}{self.storage_filename}"
+
     def __repr__(self) -> str:
         return (
             f"<FileMetadata("
@@ -0,0 +1,82 @@
+"""
+Storage Blob model - content-addressed хранение с подсчётом ссылок.
+
+При STORAGE_DEDUP_ENABLED одинаковое содержимое (SHA-256) хранится
+одним физическим blob, файлы (FileMetadata) ссылаются на него через blob_path.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column, declared_attr
+
+from app.db.base import Base
+
+
+class StorageBlob(Base):
+    """
+    Модель blob (содержимое файла по SHA-256).
+
+    Поля:
+    - checksum: SHA256 содержимого (primary key)
+    - blob_path: Относительный путь blob в хранилище
+    - file_size: Размер содержимого в байтах
+    - ref_count: Количество файлов, ссылающихся на blob
+    - created_at: Время создания blob
+    - updated_at: Время последнего изменения счётчика
+    """
+
+    @declared_attr
+    def __tablename__(cls) -> str:
+        """Dynamic table name based on configuration."""
+        from app.core.config import settings
+        return f"{settings.database.table_prefix}_blobs"
+
+    checksum: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        comment="SHA256 checksum содержимого"
+    )
+
+    blob_path: Mapped[str] = mapped_column(
+        String(1000),
+        nullable=False,
+        comment="Относительный путь blob в хранилище"
+    )
+
+    file_size: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        comment="Размер содержимого в байтах"
+    )
+
+    ref_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=1,
+        comment="Количество файлов, ссылающихся на blob"
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        comment="Время создания blob"
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+        comment="Время последнего изменения счётчика ссылок"
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<StorageBlob("
+            f"checksum={self.checksum}, "
+            f"size={self.file_size}, "
+            f"ref_count={self.ref_count}"
+            f")>"
+        )
@@ -0,0 +1,286 @@
+"""
+Blob Service - content-addressed хранение содержимого со счётчиком ссылок.
+
+При STORAGE_DEDUP_ENABLED содержимое файла хранится один раз:
+- blob лежит по пути .blobs/ab/cd/<sha256>
+- строка {prefix}_blobs хранит ref_count - число файлов, ссылающихся на blob
+- FileMetadata.blob_path и attr.json каждого файла указывают на общий blob
+
+Конкурентность: acquire и purge берут transaction-level advisory lock
+по checksum, операции со счётчиком блокируют строку blob до commit
+транзакции вызывающего FileService. Данные blob удаляются только после
+commit удаления последней ссылки (purge), поэтому откат транзакции
+не оставляет строку blob без данных, а конкурентная загрузка того же
+содержимого не теряет данные.
+
+После потери или восстановления БД счётчики пересчитываются по метаданным
+файлов (rebuild_ref_counts при пересборке кеша из attr.json).
+"""
+
+import logging
+from typing import Optional
+
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import StorageException
+from app.models.file_metadata import FileMetadata
+from app.models.storage_blob import StorageBlob
+from app.services.storage_service import StorageService
+
+logger = logging.getLogger(__name__)
+
+# Директория blobs в хранилище (рядом с .staging)
+BLOBS_DIR = ".blobs"
+
+
+def blob_relative_path(checksum: str) -> str:
+    """
+    Относительный путь blob по SHA-256.
+
+    Двухуровневый fan-out (ab/cd/) ограничивает число файлов в директории.
+
+    Args:
+        checksum: SHA256 содержимого (hex)
+
+    Returns:
+        str: Путь вида .blobs/ab/cd/<sha256>
+    """
+    return f"{BLOBS_DIR}/{checksum[:2]}/{checksum[2:4]}/{checksum}"
+
+
+class BlobService:
+    """
+    Сервис счётчиков ссылок content-addressed blobs.
+
+    Не выполняет commit: изменения счётчиков фиксируются вместе
+    с метаданными файла в транзакции FileService.
+    """
+
+    def __init__(self, db: AsyncSession, storage: Optional[StorageService] = None):
+        """
+        Args:
+            db: Async сессия базы данных
+            storage: Storage сервис (удаление данных blob, нужен для release)
+        """
+        self.db = db
+        self.storage = storage
+
+    async def _lock(self, checksum: str) -> None:
+        """
+        Advisory lock по checksum до конца текущей транзакции.
+
+        Сериализует создание blob (acquire) и удаление его данных (purge):
+        строки blob, которую можно заблокировать, в этот момент может не быть.
+        """
+        await self.db.execute(select(func.pg_advisory_xact_lock(func.hashtext(checksum))))
+
+    async def get_blob(self, checksum: str) -> Optional[StorageBlob]:
+        """
+        Найти blob по checksum (pre-check перед передачей содержимого).
+
+        Args:
+            checksum: SHA256 содержимого
+
+        Returns:
+            StorageBlob или None
+        """
+        result = await self.db.execute(
+            select(StorageBlob).where(StorageBlob.checksum == checksum)
+        )
+        return result.scalar_one_or_none()
+
+    async def acquire(self, checksum: str, file_size: int) -> tuple[str, int]:
+        """
+        Добавить ссылку на blob (создать запись, если blob новый).
+
+        INSERT ... ON CONFLICT DO UPDATE блокирует строку до commit:
+        конкурентная загрузка того же содержимого ждёт, пока вызывающий
+        разместит данные blob. Advisory lock не даёт purge удалить данные
+        blob между проверкой их наличия и commit вызывающего.
+
+        Args:
+            checksum: SHA256 содержимого
+            file_size: Размер содержимого
+
+        Returns:
+            tuple[str, int]: (blob_path, ref_count после увеличения)
+        """
+        await self._lock(checksum)
+
+        table = StorageBlob.__table__
+        stmt = (
+            pg_insert(table)
+            .values(
+                checksum=checksum,
+                blob_path=blob_relative_path(checksum),
+                file_size=file_size,
+                ref_count=1
+            )
+            .on_conflict_do_update(
+                index_elements=[table.c.checksum],
+                set_={"ref_count": table.c.ref_count + 1, "updated_at": func.now()}
+            )
+            .returning(table.c.blob_path, table.c.ref_count)
+        )
+        blob_path, ref_count = (await self.db.execute(stmt)).one()
+
+        logger.debug(
+            "Blob reference acquired",
+            extra={"checksum": checksum, "ref_count": ref_count}
+        )
+
+        return blob_path, ref_count
+
+    async def link(self, checksum: str, file_size: int) -> str:
+        """
+        Добавить ссылку на существующий blob (загрузка без передачи содержимого).
+
+        Args:
+            checksum: SHA256 содержимого
+            file_size: Ожидаемый размер содержимого
+
+        Returns:
+            str: blob_path
+
+        Raises:
+            StorageException: BLOB_NOT_FOUND - blob отсутствует (или удалён конкурентно),
+                SIZE_MISMATCH - размер не совпадает
+        """
+        table = StorageBlob.__table__
+        result = await self.db.execute(
+            update(table)
+            .where(table.c.checksum == checksum)
+            .values(ref_count=table.c.ref_count + 1, updated_at=func.now())
+            .returning(table.c.blob_path, table.c.file_size)
+        )
+        row = result.one_or_none()
+
+        if row is None:
+            raise StorageException(
+                message=f"Blob not found: {checksum}",
+                error_code="BLOB_NOT_FOUND",
+                details={"checksum": checksum}
+            )
+
+        blob_path, blob_size = row
+        if blob_size != file_size:
+            raise StorageException(
+                message=f"File size mismatch: expected {file_size}, got {blob_size}",
+                error_code="SIZE_MISMATCH",
+                details={"checksum": checksum, "expected_size": file_size, "actual_size": blob_size}
+            )
+
+        return blob_path
+
+    async def release(self, checksum: str) -> bool:
+        """
+        Убрать ссылку на blob; при последней ссылке удалить строку blob.
+
+        Данные blob не удаляются: после commit вызывающий удаляет их
+        через purge. Если commit не состоится, строка blob и данные
+        остаются согласованными.
+
+        Args:
+            checksum: SHA256 содержимого
+
+        Returns:
+            bool: True если строка blob удалена (ссылок не осталось) -
+                после commit нужен purge
+        """
+        result = await self.db.execute(
+            select(StorageBlob)
+            .where(StorageBlob.checksum == checksum)
+            .with_for_update()
+        )
+        blob = result.scalar_one_or_none()
+
+        if blob is None:
+            logger.warning("Blob not found on release", extra={"checksum": checksum})
+            return False
+
+        blob.ref_count -= 1
+        if blob.ref_count > 0:
+            return False
+
+        await self.db.delete(blob)
+        await self.db.flush()
+
+        return True
+
+    async def purge(self, checksum: str, blob_path: str) -> bool:
+        """
+        Удалить данные blob, на который не осталось ссылок (после commit release).
+
+        Выполняется в собственной транзакции под advisory lock: если
+        конкурентная загрузка уже создала blob заново, данные сохраняются.
+
+        Args:
+            checksum: SHA256 содержимого
+            blob_path: Относительный путь blob в хранилище
+
+        Returns:
+            bool: True если данные удалены
+        """
+        try:
+            await self._lock(checksum)
+            if await self.get_blob(checksum) is not None:
+                logger.info(
+                    "Blob re-created concurrently, data kept",
+                    extra={"checksum": checksum, "blob_path": blob_path}
+                )
+                return False
+
+            try:
+                await self.storage.delete_file(blob_path)
+            except StorageException as e:
+                if e.error_code != "FILE_NOT_FOUND":
+                    raise
+        finally:
+            # Завершение транзакции снимает advisory lock
+            await self.db.rollback()
+
+        logger.info(
+            "Blob deleted (last reference released)",
+            extra={"checksum": checksum, "blob_path": blob_path}
+        )
+
+        return True
+
+    async def rebuild_ref_counts(self) -> int:
+        """
+        Пересчитать ref_count blobs по ссылкам файлов (blob_path).
+
+        Используется после пересборки кеша из attr.json: строки blobs
+        создаются или получают счётчик, равный числу файлов, ссылающихся
+        на blob. Не выполняет commit.
+
+        Returns:
+            int: Количество blobs с пересчитанным счётчиком
+        """
+        files = FileMetadata.__table__
+        table = StorageBlob.__table__
+        counts = (
+            select(
+                files.c.checksum,
+                func.min(files.c.blob_path),
+                func.max(files.c.file_size),
+                func.count()
+            )
+            .where(files.c.blob_path.is_not(None))
+            .group_by(files.c.checksum)
+        )
+        stmt = pg_insert(table).from_select(
+            ["checksum", "blob_path", "file_size", "ref_count"],
+            counts
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.checksum],
+            set_={"ref_count": stmt.excluded.ref_count, "updated_at": func.now()}
+        )
+        result = await self.db.execute(stmt)
+
+        logger.info("Blob reference counts rebuilt", extra={"blobs": result.rowcount})
+
+        return result.rowcount
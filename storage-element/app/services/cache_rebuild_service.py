@@ -5,6 +5,7 @@ Cache Rebuild Service для синхронизации PostgreSQL кеша с a
 - Полную пересборку кеша (truncate + rebuild)
 - Инкрементальную пересборку (только новые файлы)
 - Dry-run проверку консистентности
+- Пересчёт счётчиков ссылок dedup blobs по blob_path из attr.json
 - Priority-based locking через CacheLockManager
 """
 
@@ -19,6 +20,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.models.file_metadata import FileMetadata
+from app.services.blob_service import BlobService
 from app.services.storage_backends import get_storage_backend, AttrFileInfo
 from app.services.cache_lock_manager import (
     CacheLockManager,
@@ -253,7 +255,8 @@ class CacheRebuildService:
         2. TRUNCATE таблицу cache
         3. Scan всех attr.json файлов
         4. INSERT метаданных в cache
-        5. Release lock
+        5. Пересчёт ref_count dedup blobs
+        6. Release lock
 
         Returns:
             RebuildResult: Результат пересборки
@@ -331,6 +334,10 @@ class CacheRebuildService:
             # Final commit
             await self.db.commit()
 
+            # Счётчики ссылок blobs по восстановленным blob_path
+            await BlobService(self.db).rebuild_ref_counts()
+            await self.db.commit()
+
             # 4. Подсчёт cache entries после rebuild
             count_result = await self.db.execute(select(func.count(FileMetadata.file_id)))
             result.cache_entries_after = count_result.scalar()
@@ -360,7 +367,8 @@ class CacheRebuildService:
         """
         Инкрементальная пересборка кеша.
 
-        Добавляет только отсутствующие в cache записи из attr.json.
+        Добавляет только отсутствующие в cache записи из attr.json
+        и пересчитывает ref_count dedup blobs.
         НЕ удаляет orphan cache entries.
 
         Returns:
@@ -434,6 +442,10 @@ class CacheRebuildService:
             # Final commit
             await self.db.commit()
 
+            # Счётчики ссылок blobs по восстановленным blob_path
+            await BlobService(self.db).rebuild_ref_counts()
+            await self.db.commit()
+
             # 4. Final statistics
             count_result = await self.db.execute(select(func.count(FileMetadata.file_id)))
             result.cache_entries_after = count_result.scalar()
@@ -563,6 +575,10 @@ class CacheRebuildService:
             version=str(attributes.get('version', 1)),
             storage_path=attributes['storage_path'],
             checksum=attributes.get('sha256', ''),
+            compressed=attributes.get('compressed', False),
+            compression_algorithm=attributes.get('compression_algorithm'),
+            original_size=attributes.get('original_size'),
+            blob_path=attributes.get('blob_path'),
             metadata_json=attributes,
             cache_updated_at=datetime.now(timezone.utc),
             cache_ttl_hours=cache_ttl_hours
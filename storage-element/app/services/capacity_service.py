@@ -10,11 +10,11 @@ import logging
 import os
 from typing import Dict
 
-import aioboto3
 from botocore.exceptions import ClientError
 
 from app.core.config import settings, StorageType
 from app.core.exceptions import StorageException
+from app.core.s3_client import shared_s3_client
 
 logger = logging.getLogger(__name__)
 
@@ -168,15 +168,9 @@ class CapacityService:
             Для больших buckets (> 100K объектов) может быть медленным.
             Рекомендуется кеширование результата или использование CloudWatch metrics.
         """
-        session = aioboto3.Session()
         total_size = 0
 
-        async with session.client(
-            "s3",
-            endpoint_url=settings.storage.s3.endpoint_url,
-            aws_access_key_id=settings.storage.s3.access_key_id,
-            aws_secret_access_key=settings.storage.s3.secret_access_key,
-        ) as s3_client:
+        async with shared_s3_client() as s3_client:
             # Pagination для больших buckets
             paginator = s3_client.get_paginator("list_objects_v2")
 
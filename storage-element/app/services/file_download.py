@@ -11,6 +11,7 @@ import hashlib
 import re
 
 from app.core.config import get_config
+from app.core.io_executor import run_io
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -38,7 +39,7 @@ class FileDownloadService:
         """Initialize download service."""
         self.config = config
         self.logger = logger
-        self.storage_base = Path(config.storage.local_base_path)
+        self.storage_base = Path(config.storage.local.base_path)
 
     def get_file_path(
         self,
@@ -256,6 +257,88 @@ class FileDownloadService:
             bytes_read=bytes_read
         )
 
+    async def astream_file(
+        self,
+        file_path: Path,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = 64 * 1024
+    ):
+        """
+        Async вариант stream_file: open/seek/read выполняются в disk I/O
+        executor, event loop не блокируется медленным диском.
+
+        Args:
+            file_path: Path to file
+            start: Start byte position (inclusive)
+            end: End byte position (inclusive), None for entire file
+            chunk_size: Chunk size for streaming (default 64KB)
+
+        Yields:
+            bytes: File chunks
+        """
+        file_size = (await run_io(file_path.stat)).st_size
+
+        if end is None:
+            end = file_size - 1
+
+        if start < 0 or start >= file_size:
+            raise ValueError(f"Invalid start position: {start}")
+
+        if end < start or end >= file_size:
+            raise ValueError(f"Invalid end position: {end}")
+
+        bytes_to_read = end - start + 1
+        bytes_read = 0
+
+        f = await run_io(open, file_path, "rb")
+        try:
+            await run_io(f.seek, start)
+
+            while bytes_read < bytes_to_read:
+                chunk = await run_io(f.read, min(chunk_size, bytes_to_read - bytes_read))
+                if not chunk:
+                    break
+
+                bytes_read += len(chunk)
+                yield chunk
+        finally:
+            await run_io(f.close)
+
+        self.logger.debug(
+            "File streaming completed",
+            extra={"file_path": str(file_path), "bytes_read": bytes_read}
+        )
+
+    async def astream_multipart_ranges(
+        self,
+        file_path: Path,
+        ranges: List[Tuple[int, int]],
+        content_type: str,
+        chunk_size: int = 64 * 1024
+    ):
+        """
+        Async вариант stream_multipart_ranges (чтение через disk I/O executor).
+
+        Yields:
+            bytes: Multipart response chunks
+        """
+        file_size = (await run_io(file_path.stat)).st_size
+        boundary = "RANGE_SEPARATOR"
+
+        for start, end in ranges:
+            yield (
+                f"\r\n--{boundary}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Range: bytes {start}-{end}/{file_size}\r\n"
+                f"\r\n"
+            ).encode()
+
+            async for chunk in self.astream_file(file_path, start, end, chunk_size):
+                yield chunk
+
+        yield f"\r\n--{boundary}--\r\n".encode()
+
     def stream_multipart_ranges(
         self,
         file_path: Path,
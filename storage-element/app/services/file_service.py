@@ -28,8 +28,11 @@ from app.core.config import settings
 from app.core.exceptions import StorageException, WALException
 from app.models.file_metadata import FileMetadata
 from app.models.wal import WALOperationType
+from app.services.blob_service import BlobService
+from app.services.intent_journal import get_intent_journal
 from app.services.storage_service import StorageService, get_storage_service
 from app.services.wal_service import WALService
+from app.services.upload_staging_service import StagedFile
 from app.utils.attr_utils import (
     FileAttributes,
     delete_attr_file,
@@ -38,6 +41,7 @@ from app.utils.attr_utils import (
     write_attr_file,
 )
 from app.utils.file_naming import generate_storage_filename, generate_storage_path
+from app.utils.compression_utils import validate_compression_algorithm
 from app.services.cache_lock_manager import (
     CacheLockManager,
     LockType,
@@ -91,7 +95,7 @@ class FileService:
 
     async def create_file(
         self,
-        file_data: BinaryIO,
+        file_data: Optional[BinaryIO],
         original_filename: str,
         content_type: str,
         user_id: str,
@@ -101,7 +105,12 @@ class FileService:
         version: Optional[str] = None,
         metadata: Optional[dict] = None,
         file_id: Optional[UUID] = None,
-        finalize_transaction_id: Optional[UUID] = None
+        finalize_transaction_id: Optional[UUID] = None,
+        compression_algorithm: Optional[str] = None,
+        original_size: Optional[int] = None,
+        staged_file: Optional[StagedFile] = None,
+        blob_checksum: Optional[str] = None,
+        blob_size: Optional[int] = None
     ) -> UUID:
         """
         Создать новый файл в хранилище.
@@ -123,8 +132,27 @@ class FileService:
         - Если file_id не передан → генерировать новый UUID (обычная загрузка)
         - finalize_transaction_id используется для связи с Ingester Module
 
+        Compression: файл может быть сжат Ingester Module (gzip/brotli).
+        - file_data содержит сжатые байты; file_size/checksum относятся к ним
+        - compression_algorithm и original_size сохраняются в attr.json и DB cache
+        - При скачивании файл распаковывается или отдаётся с Content-Encoding
+
+        Multipart upload: вместо file_data передаётся staged_file - файл,
+        собранный из частей в staging area. Содержимое импортируется в хранилище
+        без повторного чтения (local: rename), checksum уже вычислен.
+
+        Single commit (DB_WAL_SINGLE_COMMIT): вместо commit PENDING записи WAL
+        намерение фиксируется в локальном IntentJournal (group fsync), метаданные
+        и WAL запись сохраняются одним commit - один round-trip к PostgreSQL
+        вместо трёх на загрузку.
+
+        Content-addressed dedup (STORAGE_DEDUP_ENABLED): содержимое хранится
+        одним blob по SHA-256, файл получает свой file_id и attr.json со ссылкой
+        на blob (blob_path). blob_checksum - загрузка без передачи содержимого:
+        файл ссылается на уже существующий на элементе blob.
+
         Args:
-            file_data: Бинарные данные файла
+            file_data: Бинарные данные файла (None если передан staged_file)
             original_filename: Оригинальное имя файла
             content_type: MIME type
             user_id: User ID создателя
@@ -135,6 +163,11 @@ class FileService:
             metadata: Дополнительные метаданные (опционально)
             file_id: UUID для сохранения (опционально, для финализации)
             finalize_transaction_id: ID транзакции финализации (опционально)
+            compression_algorithm: Алгоритм сжатия содержимого (gzip/brotli, опционально)
+            original_size: Размер до сжатия (обязателен вместе с compression_algorithm)
+            staged_file: Собранный multipart upload (опционально, вместо file_data)
+            blob_checksum: SHA-256 существующего blob (опционально, вместо file_data)
+            blob_size: Размер содержимого blob (обязателен вместе с blob_checksum)
 
         Returns:
             UUID: file_id созданного файла
@@ -166,6 +199,15 @@ class FileService:
             ...         finalize_transaction_id=UUID("...")
             ...     )
         """
+        compression_algorithm = validate_compression_algorithm(compression_algorithm)
+        if compression_algorithm and (original_size is None or original_size <= 0):
+            raise StorageException(
+                message="original_size is required for compressed files",
+                error_code="INVALID_COMPRESSION_METADATA",
+                details={"compression_algorithm": compression_algorithm}
+            )
+        compressed = compression_algorithm is not None
+
         # Sprint 15: Условная логика для file_id
         # Если file_id передан (finalization) → использовать его
         # Иначе (обычная загрузка) → генерировать новый
@@ -194,6 +236,10 @@ class FileService:
 
         timestamp = datetime.now(timezone.utc)
         transaction_id = None
+        blob_path: Optional[str] = None
+        blob_created = False
+        single_commit = settings.database.wal_single_commit
+        journal = get_intent_journal() if single_commit else None
 
         # Генерация имен и путей
         storage_filename = generate_storage_filename(
@@ -217,14 +263,34 @@ class FileService:
                     "relative_path": relative_path,
                     "content_type": content_type
                 },
-                user_id=user_id
+                user_id=user_id,
+                deferred=single_commit
             )
+            if journal is not None:
+                # Durable намерение до записи данных (вместо commit PENDING записи)
+                await journal.begin(transaction_id, relative_path)
 
             # ШАГ 2: Запись файла в storage с вычислением checksum
-            file_size, checksum = await self.storage.write_file(
-                relative_path=relative_path,
-                file_data=file_data
-            )
+            if settings.storage.dedup_enabled or blob_checksum is not None:
+                file_size, checksum, blob_path, blob_created = await self._store_blob(
+                    relative_path=relative_path,
+                    file_data=file_data,
+                    staged_file=staged_file,
+                    blob_checksum=blob_checksum,
+                    blob_size=blob_size
+                )
+            elif staged_file is not None:
+                file_size, checksum = await self.storage.import_file(
+                    relative_path=relative_path,
+                    source_path=staged_file.path,
+                    expected_size=staged_file.file_size,
+                    checksum=staged_file.checksum
+                )
+            else:
+                file_size, checksum = await self.storage.write_file(
+                    relative_path=relative_path,
+                    file_data=file_data
+                )
 
             # ШАГ 3: Создание и запись attr.json файла (источник истины)
             attributes = FileAttributes(
@@ -242,6 +308,11 @@ class FileService:
                 version=version,
                 storage_path=storage_path,
                 checksum=checksum,
+                compressed=compressed,
+                compression_algorithm=compression_algorithm,
+                original_size=original_size if compressed else None,
+                compression_ratio=round(original_size / file_size, 3) if compressed else None,
+                blob_path=blob_path,
                 metadata=metadata or {}
             )
 
@@ -273,13 +344,19 @@ class FileService:
                 version=version,
                 storage_path=storage_path,
                 checksum=checksum,
+                compressed=compressed,
+                compression_algorithm=compression_algorithm,
+                original_size=original_size if compressed else None,
+                blob_path=blob_path,
                 metadata_json=metadata
             )
 
             self.db.add(db_metadata)
-            await self.db.commit()
+            if not single_commit:
+                await self.db.commit()
 
             # ШАГ 5: Коммит WAL транзакции
+            # (single commit: метаданные фиксируются этим же commit)
             await self.wal.commit(
                 transaction_id,
                 result_data={
@@ -288,6 +365,8 @@ class FileService:
                     "file_size": file_size
                 }
             )
+            if journal is not None:
+                await journal.end(transaction_id)
 
             logger.info(
                 "File created successfully",
@@ -296,6 +375,7 @@ class FileService:
                     "original_filename": original_filename,
                     "file_size": file_size,
                     "checksum": checksum,
+                    "deduplicated": blob_path is not None and not blob_created,
                     "user_id": user_id
                 }
             )
@@ -313,6 +393,20 @@ class FileService:
                 }
             )
 
+            # Dedup: созданный blob удаляется до отката DB, пока строка blob заблокирована
+            if blob_created:
+                try:
+                    await self.storage.delete_file(blob_path)
+                except Exception as storage_error:
+                    logger.error(f"Failed to cleanup blob: {storage_error}")
+
+            # Откат DB (включая счётчик ссылок blob) до WAL rollback,
+            # который фиксирует статус транзакции отдельным commit
+            try:
+                await self.db.rollback()
+            except Exception as db_error:
+                logger.error(f"Failed to rollback database: {db_error}")
+
             # WAL Rollback
             if transaction_id:
                 try:
@@ -321,9 +415,11 @@ class FileService:
                     logger.error(f"WAL rollback failed: {wal_error}")
 
             # Удаление файла из storage
+            data_removed = False
             try:
                 if await self.storage.file_exists(relative_path):
                     await self.storage.delete_file(relative_path)
+                data_removed = True
             except Exception as storage_error:
                 logger.error(f"Failed to cleanup storage file: {storage_error}")
 
@@ -342,11 +438,16 @@ class FileService:
             except Exception as attr_error:
                 logger.error(f"Failed to cleanup attr file: {attr_error}")
 
-            # Удаление из DB cache
-            try:
-                await self.db.rollback()
-            except Exception as db_error:
-                logger.error(f"Failed to rollback database: {db_error}")
+            # Незавершённое намерение остаётся в журнале: файл удалит recovery
+            if journal is not None and transaction_id and data_removed:
+                try:
+                    await journal.end(transaction_id)
+                except Exception as journal_error:
+                    logger.error(f"Failed to close upload intent: {journal_error}")
+
+            if blob_checksum is not None and isinstance(e, StorageException):
+                # BLOB_NOT_FOUND / SIZE_MISMATCH: клиент передаст содержимое обычной загрузкой
+                raise
 
             raise StorageException(
                 message="Failed to create file",
@@ -358,6 +459,66 @@ class FileService:
                 }
             )
 
+    async def _store_blob(
+        self,
+        relative_path: str,
+        file_data: Optional[BinaryIO],
+        staged_file: Optional[StagedFile],
+        blob_checksum: Optional[str],
+        blob_size: Optional[int]
+    ) -> tuple[int, str, str, bool]:
+        """
+        Content-addressed запись содержимого: один blob на SHA-256.
+
+        - blob_checksum: только ссылка на существующий blob
+        - staged_file: checksum известен заранее, import только для нового blob
+        - file_data: запись по relative_path (checksum считается при записи),
+          затем перенос в blob или удаление дубликата
+
+        Счётчик ссылок увеличивается до размещения данных: строка blob
+        заблокирована до commit, конкурентное удаление последней ссылки ждёт.
+
+        Args:
+            relative_path: Путь файла (временное размещение содержимого)
+            file_data: Бинарные данные файла
+            staged_file: Собранный multipart upload
+            blob_checksum: SHA-256 существующего blob
+            blob_size: Размер содержимого blob
+
+        Returns:
+            tuple[int, str, str, bool]: (размер, checksum, blob_path, blob создан этой загрузкой)
+        """
+        blobs = BlobService(self.db, self.storage)
+
+        if blob_checksum is not None:
+            blob_path = await blobs.link(blob_checksum, blob_size)
+            return blob_size, blob_checksum, blob_path, False
+
+        if staged_file is not None:
+            file_size, checksum = staged_file.file_size, staged_file.checksum
+            blob_path, _ = await blobs.acquire(checksum, file_size)
+            if await self.storage.file_exists(blob_path):
+                return file_size, checksum, blob_path, False
+            await self.storage.import_file(
+                relative_path=blob_path,
+                source_path=staged_file.path,
+                expected_size=file_size,
+                checksum=checksum
+            )
+            return file_size, checksum, blob_path, True
+
+        file_size, checksum = await self.storage.write_file(
+            relative_path=relative_path,
+            file_data=file_data
+        )
+        blob_path, _ = await blobs.acquire(checksum, file_size)
+        if await self.storage.file_exists(blob_path):
+            # Дубликат: содержимое уже хранится
+            await self.storage.delete_file(relative_path)
+            return file_size, checksum, blob_path, False
+        await self.storage.move_file(relative_path, blob_path)
+        return file_size, checksum, blob_path, True
+
     async def get_file(
         self,
         file_id: UUID
@@ -388,11 +549,8 @@ class FileService:
                     details={"file_id": str(file_id)}
                 )
 
-            # Формирование относительного пути
-            relative_path = f"{metadata.storage_path}{metadata.storage_filename}"
-
-            # Streaming read из storage
-            async for chunk in self.storage.read_file(relative_path):
+            # Streaming read из storage (общий blob для дедуплицированных файлов)
+            async for chunk in self.storage.read_file(metadata.data_path):
                 yield chunk
 
             logger.info(
@@ -429,7 +587,7 @@ class FileService:
 
         Процесс:
         1. WAL: Начало транзакции (PENDING)
-        2. Storage: Удаление файла
+        2. Storage: Удаление файла (blob: снятие ссылки, данные - после шага 4)
         3. Attr File: Удаление *.attr.json
         4. DB Cache: Удаление метаданных
         5. WAL: Коммит транзакции (COMMITTED)
@@ -466,13 +624,19 @@ class FileService:
                 operation_data={
                     "original_filename": metadata.original_filename,
                     "storage_filename": metadata.storage_filename,
-                    "relative_path": relative_path
+                    "relative_path": relative_path,
+                    "blob_path": metadata.blob_path
                 },
                 user_id=user_id
             )
 
             # ШАГ 2: Удаление файла из storage
-            await self.storage.delete_file(relative_path)
+            blob_released = False
+            if metadata.blob_path:
+                # Dedup: данные blob удаляются только с последней ссылкой, после commit
+                blob_released = await BlobService(self.db, self.storage).release(metadata.checksum)
+            else:
+                await self.storage.delete_file(relative_path)
 
             # ШАГ 3: Удаление attr.json
             if settings.storage.type.value == "local":
@@ -490,6 +654,16 @@ class FileService:
             await self.db.delete(metadata)
             await self.db.commit()
 
+            if blob_released:
+                # Ошибка удаления данных оставляет только неиспользуемый blob
+                try:
+                    await BlobService(self.db, self.storage).purge(metadata.checksum, metadata.blob_path)
+                except Exception as blob_error:
+                    logger.error(
+                        f"Failed to delete released blob data: {blob_error}",
+                        extra={"checksum": metadata.checksum, "blob_path": metadata.blob_path}
+                    )
+
             # ШАГ 5: Коммит WAL транзакции
             await self.wal.commit(
                 transaction_id,
@@ -505,7 +679,10 @@ class FileService:
                 }
             )
 
-        except StorageException:
+        except StorageException as e:
+            # Откат DB (счётчик ссылок blob) до WAL rollback
+            await self.db.rollback()
+
             # Rollback WAL
             if transaction_id:
                 try:
@@ -523,6 +700,11 @@ class FileService:
                 }
             )
 
+            try:
+                await self.db.rollback()
+            except Exception as db_error:
+                logger.error(f"Failed to rollback database: {db_error}")
+
             # Rollback WAL
             if transaction_id:
                 try:
@@ -868,6 +1050,10 @@ class FileService:
                 current_metadata.description = attributes.get('description', current_metadata.description)
                 current_metadata.version = str(attributes.get('version', current_metadata.version))
                 current_metadata.checksum = attributes.get('sha256', current_metadata.checksum)
+                current_metadata.compressed = attributes.get('compressed', current_metadata.compressed)
+                current_metadata.compression_algorithm = attributes.get('compression_algorithm', current_metadata.compression_algorithm)
+                current_metadata.original_size = attributes.get('original_size', current_metadata.original_size)
+                current_metadata.blob_path = attributes.get('blob_path', current_metadata.blob_path)
                 current_metadata.metadata = attributes
 
                 # Обновить timestamps
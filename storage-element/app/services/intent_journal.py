@@ -0,0 +1,291 @@
+"""
+Intent Journal - локальный durable журнал намерений загрузки.
+
+Режим DB_WAL_SINGLE_COMMIT: вместо отдельного commit PENDING записи WAL
+в PostgreSQL перед записью данных намерение фиксируется в локальном
+append-only журнале (WAL_DIR). Метаданные файла и WAL запись (COMMITTED)
+сохраняются одним commit после записи attr.json.
+
+Гарантии Consistency Protocol сохраняются:
+- begin: запись намерения + fsync ДО записи данных в storage
+- attr.json (источник истины) по-прежнему пишется до DB
+- сбой до attr.json: recovery удаляет файл данных без attr.json
+- сбой после attr.json: запись восстанавливается через cache rebuild
+
+Group commit: конкурентные загрузки разделяют fsync - один fsync
+покрывает все записи, добавленные в журнал к моменту его начала.
+
+Каждый процесс (uvicorn worker) пишет свой журнал и держит на нём flock.
+Recovery обрабатывает только журналы завершившихся процессов.
+"""
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+from uuid import UUID, uuid4
+
+from app.core.config import settings
+from app.core.exceptions import StorageException
+from app.core.io_executor import run_io
+from app.services.storage_service import StorageService
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_PREFIX = "intents-"
+JOURNAL_SUFFIX = ".log"
+
+# Журнал без открытых намерений обрезается при превышении размера
+COMPACT_THRESHOLD = 4 * 1024 * 1024
+
+
+class IntentJournal:
+    """
+    Append-only журнал намерений записи файлов одного процесса.
+
+    Формат: JSON строки {"op": "begin", "tx": ..., "path": ...} и
+    {"op": "end", "tx": ...}. Durable (fsync) только begin: потерянный
+    end безопасен - recovery проверяет наличие attr.json.
+    """
+
+    def __init__(self, journal_dir: Path):
+        """
+        Args:
+            journal_dir: Директория журналов (WAL_DIR)
+        """
+        self.journal_dir = Path(journal_dir)
+        self.path = self.journal_dir / f"{JOURNAL_PREFIX}{os.getpid()}-{uuid4().hex[:8]}{JOURNAL_SUFFIX}"
+        self._fd: Optional[int] = None
+        # Открытые намерения: transaction_id → relative_path
+        self._open: dict[str, str] = {}
+        self._write_lock = asyncio.Lock()
+        self._sync_lock = asyncio.Lock()
+        self._written = 0
+        self._synced = 0
+        self._size = 0
+        self.sync_count = 0
+
+    @property
+    def open_intents(self) -> dict[str, str]:
+        """Незавершённые намерения (transaction_id → relative_path)."""
+        return dict(self._open)
+
+    async def begin(self, transaction_id: UUID, relative_path: str) -> None:
+        """
+        Зафиксировать намерение записи файла.
+
+        После возврата запись durable: при сбое recovery найдёт файл данных.
+
+        Args:
+            transaction_id: ID транзакции WAL
+            relative_path: Относительный путь файла данных в storage
+        """
+        tx = str(transaction_id)
+        # До записи в журнал: компактизация не обрежет намерение в процессе записи
+        self._open[tx] = relative_path
+        try:
+            seq = await self._append({"op": "begin", "tx": tx, "path": relative_path})
+            await self._sync(seq)
+        except Exception:
+            self._open.pop(tx, None)
+            raise
+
+    async def end(self, transaction_id: UUID) -> None:
+        """
+        Завершить намерение (файл зафиксирован в DB или очищен при rollback).
+
+        Args:
+            transaction_id: ID транзакции WAL
+        """
+        tx = str(transaction_id)
+        if self._open.pop(tx, None) is None:
+            return
+
+        await self._append({"op": "end", "tx": tx})
+
+        if not self._open and self._size > COMPACT_THRESHOLD:
+            await self._compact()
+
+    def close(self) -> None:
+        """
+        Закрыть журнал (shutdown).
+
+        Журнал без открытых намерений удаляется; иначе остаётся для recovery.
+        """
+        if self._fd is None:
+            return
+
+        if not self._open:
+            self.path.unlink(missing_ok=True)
+        # Закрытие fd снимает flock
+        os.close(self._fd)
+        self._fd = None
+
+    async def _append(self, record: dict) -> int:
+        """Дописать запись в журнал; возвращает её порядковый номер."""
+        line = (json.dumps(record) + "\n").encode()
+
+        async with self._write_lock:
+            if self._fd is None:
+                self._fd = await run_io(self._open_journal)
+            await run_io(os.write, self._fd, line)
+            self._size += len(line)
+            self._written += 1
+            return self._written
+
+    async def _sync(self, seq: int) -> None:
+        """
+        Group commit: дождаться fsync, покрывающего запись seq.
+
+        Ожидающие за блокировкой проверяют, не покрыл ли их запись
+        предыдущий fsync, и возвращаются без собственного.
+        """
+        async with self._sync_lock:
+            if self._synced >= seq:
+                return
+            target = self._written
+            await run_io(os.fdatasync, self._fd)
+            self._synced = target
+            self.sync_count += 1
+
+    async def _compact(self) -> None:
+        """Обрезать журнал без открытых намерений."""
+        async with self._write_lock:
+            if self._open or self._fd is None:
+                return
+            await run_io(os.ftruncate, self._fd, 0)
+            self._size = 0
+
+        logger.debug("Intent journal compacted", extra={"path": str(self.path)})
+
+    def _open_journal(self) -> int:
+        """Создать файл журнала и заблокировать его за этим процессом."""
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+        # Durable запись о самом файле журнала в директории
+        dir_fd = os.open(self.journal_dir, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+        return fd
+
+
+def _read_open_intents(fd: int) -> dict[str, str]:
+    """Незавершённые намерения журнала (оборванная последняя строка пропускается)."""
+    open_intents: dict[str, str] = {}
+
+    with os.fdopen(os.dup(fd), "r", encoding="utf-8") as journal:
+        for line in journal:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("op") == "begin":
+                open_intents[record["tx"]] = record["path"]
+            elif record.get("op") == "end":
+                open_intents.pop(record.get("tx"), None)
+
+    return open_intents
+
+
+def _lock_orphan_journal(path: Path) -> Optional[int]:
+    """Захватить журнал завершившегося процесса (None - процесс жив)."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+async def recover_intents(journal_dir: Path, storage: StorageService) -> int:
+    """
+    Обработать журналы процессов, завершившихся со сбоем.
+
+    Для каждого незавершённого намерения:
+    - attr.json есть → файл зафиксирован (DB восстановит cache rebuild)
+    - attr.json нет → файл данных удаляется (загрузка не завершена)
+
+    Args:
+        journal_dir: Директория журналов (WAL_DIR)
+        storage: Storage сервис
+
+    Returns:
+        int: Количество удалённых незавершённых файлов данных
+    """
+    journal_dir = Path(journal_dir)
+    if not journal_dir.is_dir():
+        return 0
+
+    removed = 0
+    for path in sorted(journal_dir.glob(f"{JOURNAL_PREFIX}*{JOURNAL_SUFFIX}")):
+        fd = await run_io(_lock_orphan_journal, path)
+        if fd is None:
+            continue
+
+        try:
+            open_intents = await run_io(_read_open_intents, fd)
+
+            for transaction_id, relative_path in open_intents.items():
+                if await storage.file_exists(f"{relative_path}.attr.json"):
+                    continue
+
+                try:
+                    await storage.delete_file(relative_path)
+                    removed += 1
+                except StorageException as e:
+                    if e.error_code != "FILE_NOT_FOUND":
+                        raise
+
+                logger.warning(
+                    "Incomplete upload removed on recovery",
+                    extra={"transaction_id": transaction_id, "relative_path": relative_path}
+                )
+
+            path.unlink(missing_ok=True)
+        finally:
+            os.close(fd)
+
+    if removed:
+        logger.info("Intent journal recovery completed", extra={"removed_files": removed})
+
+    return removed
+
+
+_intent_journal: Optional[IntentJournal] = None
+
+
+def get_intent_journal() -> IntentJournal:
+    """
+    Получить журнал намерений процесса (singleton).
+
+    Returns:
+        IntentJournal: Журнал в settings.wal_dir
+    """
+    global _intent_journal
+
+    if _intent_journal is None:
+        _intent_journal = IntentJournal(settings.wal_dir)
+
+    return _intent_journal
+
+
+def close_intent_journal() -> None:
+    """
+    Закрыть журнал намерений при shutdown приложения.
+
+    Должен вызываться в lifespan событии FastAPI до остановки disk I/O executor.
+    """
+    global _intent_journal
+
+    if _intent_journal is not None:
+        _intent_journal.close()
+        _intent_journal = None
@@ -10,10 +10,10 @@ import re
 from pathlib import Path
 from typing import AsyncGenerator, Optional
 
-import aioboto3
 from botocore.exceptions import ClientError
 
 from app.core.config import settings
+from app.core.s3_client import shared_s3_client
 from app.services.storage_backends.base import StorageBackend, AttrFileInfo
 
 logger = logging.getLogger(__name__)
@@ -27,11 +27,7 @@ class S3Backend(StorageBackend):
         self.bucket_name = settings.storage.s3.bucket_name
         self.app_folder = settings.storage.s3.app_folder
         self.endpoint_url = settings.storage.s3.endpoint_url
-        self.access_key_id = settings.storage.s3.access_key_id
-        self.secret_access_key = settings.storage.s3.secret_access_key
-
-        # Создаём aioboto3 session (lightweight, без подключения)
-        self.session = aioboto3.Session()
+        # S3 клиент - shared клиент процесса (app.core.s3_client)
 
     async def list_attr_files(
         self,
@@ -47,12 +43,7 @@ class S3Backend(StorageBackend):
 
         try:
             # Async context manager для S3 client
-            async with self.session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key_id,
-                aws_secret_access_key=self.secret_access_key,
-            ) as s3_client:
+            async with shared_s3_client() as s3_client:
                 paginator = s3_client.get_paginator('list_objects_v2')
                 page_iterator = paginator.paginate(Bucket=self.bucket_name, Prefix=full_prefix)
 
@@ -93,12 +84,7 @@ class S3Backend(StorageBackend):
 
         try:
             # ✅ FIX: Async context manager для S3 client
-            async with self.session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key_id,
-                aws_secret_access_key=self.secret_access_key,
-            ) as s3_client:
+            async with shared_s3_client() as s3_client:
                 # ✅ FIX: Await для async операции
                 response = await s3_client.get_object(Bucket=self.bucket_name, Key=key)
 
@@ -125,12 +111,7 @@ class S3Backend(StorageBackend):
 
         try:
             # ✅ FIX: Async context manager для S3 client
-            async with self.session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key_id,
-                aws_secret_access_key=self.secret_access_key,
-            ) as s3_client:
+            async with shared_s3_client() as s3_client:
                 # ✅ FIX: Await для async операции
                 await s3_client.head_object(Bucket=self.bucket_name, Key=key)
                 return True
@@ -145,12 +126,7 @@ class S3Backend(StorageBackend):
         """Получить информацию о S3 storage (async)."""
         try:
             # ✅ FIX: Async context manager для S3 client
-            async with self.session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key_id,
-                aws_secret_access_key=self.secret_access_key,
-            ) as s3_client:
+            async with shared_s3_client() as s3_client:
                 # ✅ FIX: Await для async операции
                 await s3_client.head_bucket(Bucket=self.bucket_name)
                 return {
@@ -12,8 +12,11 @@ Storage Service - абстракция для работы с различным
 - Error handling с retry logic
 """
 
+import asyncio
+import errno
 import hashlib
 import logging
+import os
 import shutil
 from abc import ABC, abstractmethod
 from pathlib import Path
@@ -25,6 +28,8 @@ from botocore.exceptions import ClientError
 
 from app.core.config import settings, StorageType
 from app.core.exceptions import StorageException
+from app.core.io_executor import run_io
+from app.core.s3_client import shared_s3_client
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +37,56 @@ logger = logging.getLogger(__name__)
 CHUNK_SIZE = 8 * 1024 * 1024
 
 
+def _read_block(file_data: BinaryIO, size: int) -> bytes:
+    """
+    Прочитать до size байт (меньше только в конце файла).
+
+    file.read(n) у потоковых источников может вернуть меньше n байт,
+    поэтому читаем chunk'ами до заполнения блока.
+    """
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = file_data.read(min(CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+
+def _copy_chunk(source: BinaryIO, target: BinaryIO, hash_obj) -> int:
+    """Скопировать один chunk с обновлением checksum (выполняется в disk I/O executor)."""
+    chunk = source.read(CHUNK_SIZE)
+    if chunk:
+        target.write(chunk)
+        hash_obj.update(chunk)
+    return len(chunk)
+
+
+def _flush_and_fsync(f: BinaryIO) -> None:
+    """flush + fsync (выполняется в disk I/O executor)."""
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def _check_size(actual_size: int, expected_size: Optional[int], relative_path: str) -> None:
+    """
+    Raises:
+        StorageException: SIZE_MISMATCH если размер не совпадает с ожидаемым
+    """
+    if expected_size is not None and actual_size != expected_size:
+        raise StorageException(
+            message=f"File size mismatch: expected {expected_size}, got {actual_size}",
+            error_code="SIZE_MISMATCH",
+            details={
+                "expected_size": expected_size,
+                "actual_size": actual_size,
+                "relative_path": relative_path
+            }
+        )
+
+
 class StorageService(ABC):
     """
     Абстрактный базовый класс для storage сервисов.
@@ -97,6 +152,24 @@ class StorageService(ABC):
         """
         pass
 
+    @abstractmethod
+    async def move_file(
+        self,
+        source_relative_path: str,
+        target_relative_path: str
+    ) -> None:
+        """
+        Переместить файл внутри хранилища (существующий target перезаписывается).
+
+        Args:
+            source_relative_path: Текущий относительный путь
+            target_relative_path: Новый относительный путь
+
+        Raises:
+            StorageException: Ошибка перемещения файла
+        """
+        pass
+
     @abstractmethod
     async def file_exists(
         self,
@@ -132,6 +205,64 @@ class StorageService(ABC):
         """
         pass
 
+    async def import_file(
+        self,
+        relative_path: str,
+        source_path: Path,
+        expected_size: int,
+        checksum: str
+    ) -> tuple[int, str]:
+        """
+        Импортировать готовый файл (staging multipart upload) в хранилище.
+
+        Базовая реализация копирует файл через write_file().
+        Хранилища, поддерживающие перенос без копирования, переопределяют метод.
+
+        Args:
+            relative_path: Относительный путь в хранилище
+            source_path: Путь к собранному файлу в staging area
+            expected_size: Ожидаемый размер файла
+            checksum: SHA-256 файла, вычисленный при приёме частей
+
+        Returns:
+            tuple[int, str]: (размер файла, SHA256 checksum)
+
+        Raises:
+            StorageException: Ошибка записи или несовпадение размера/checksum
+        """
+        with open(source_path, "rb") as source:
+            file_size, actual_checksum = await self.write_file(
+                relative_path=relative_path,
+                file_data=source,
+                expected_size=expected_size
+            )
+
+        if actual_checksum != checksum:
+            await self.delete_file(relative_path)
+            raise StorageException(
+                message="Checksum mismatch while importing staged file",
+                error_code="CHECKSUM_MISMATCH",
+                details={
+                    "relative_path": relative_path,
+                    "expected_checksum": checksum,
+                    "actual_checksum": actual_checksum
+                }
+            )
+
+        return file_size, checksum
+
+    def get_local_path(self, relative_path: str) -> Optional[Path]:
+        """
+        Путь к файлу в локальной FS для zero-copy отдачи (sendfile).
+
+        Args:
+            relative_path: Относительный путь в хранилище
+
+        Returns:
+            Optional[Path]: Абсолютный путь или None, если хранилище не локальное
+        """
+        return None
+
 
 class LocalStorageService(StorageService):
     """
@@ -156,6 +287,10 @@ class LocalStorageService(StorageService):
         """Получить полный путь к файлу"""
         return self.base_path / relative_path
 
+    def get_local_path(self, relative_path: str) -> Optional[Path]:
+        """Локальный путь к файлу (отдача через sendfile)"""
+        return self._get_full_path(relative_path)
+
     async def write_file(
         self,
         relative_path: str,
@@ -186,33 +321,32 @@ class LocalStorageService(StorageService):
 
         try:
             # Создание директорий
-            target_path.parent.mkdir(parents=True, exist_ok=True)
+            await run_io(target_path.parent.mkdir, parents=True, exist_ok=True)
 
             # Временный файл в той же директории (для atomic rename)
             temp_path = target_path.parent / f".tmp_{target_path.name}"
 
-            # Запись во временный файл с вычислением checksum
+            # Запись во временный файл с вычислением checksum.
+            # Блокирующие read/write/fsync - в disk I/O executor, не в event loop
             hash_obj = hashlib.sha256()
             total_size = 0
 
-            with open(temp_path, 'wb') as f:
+            f = await run_io(open, temp_path, 'wb')
+            try:
                 while True:
-                    chunk = file_data.read(CHUNK_SIZE)
-                    if not chunk:
+                    written = await run_io(_copy_chunk, file_data, f, hash_obj)
+                    if not written:
                         break
-
-                    f.write(chunk)
-                    hash_obj.update(chunk)
-                    total_size += len(chunk)
+                    total_size += written
 
                 # fsync для гарантии записи на диск
-                f.flush()
-                import os
-                os.fsync(f.fileno())
+                await run_io(_flush_and_fsync, f)
+            finally:
+                await run_io(f.close)
 
             # Валидация размера если указан
             if expected_size is not None and total_size != expected_size:
-                temp_path.unlink()
+                await run_io(temp_path.unlink)
                 raise StorageException(
                     message=f"File size mismatch: expected {expected_size}, got {total_size}",
                     error_code="SIZE_MISMATCH",
@@ -226,7 +360,7 @@ class LocalStorageService(StorageService):
             checksum = hash_obj.hexdigest()
 
             # Атомарная замена (POSIX гарантирует атомарность rename)
-            temp_path.replace(target_path)
+            await run_io(temp_path.replace, target_path)
 
             logger.info(
                 "File written to local storage",
@@ -244,8 +378,7 @@ class LocalStorageService(StorageService):
         except Exception as e:
             # Очистка временного файла при ошибке
             temp_path = target_path.parent / f".tmp_{target_path.name}"
-            if temp_path.exists():
-                temp_path.unlink()
+            await run_io(temp_path.unlink, missing_ok=True)
 
             logger.error(
                 f"Failed to write file to local storage: {e}",
@@ -260,6 +393,67 @@ class LocalStorageService(StorageService):
                 details={"relative_path": relative_path, "error": str(e)}
             )
 
+    async def import_file(
+        self,
+        relative_path: str,
+        source_path: Path,
+        expected_size: int,
+        checksum: str
+    ) -> tuple[int, str]:
+        """
+        Импортировать staging файл атомарным rename (без копирования данных).
+
+        Staging по умолчанию находится на том же filesystem ({base_path}/.staging).
+        Если staging вынесен на другой filesystem - fallback на копирование.
+
+        Args:
+            relative_path: Относительный путь в хранилище
+            source_path: Путь к собранному файлу в staging area
+            expected_size: Ожидаемый размер файла
+            checksum: SHA-256 файла, вычисленный при приёме частей
+
+        Returns:
+            tuple[int, str]: (размер файла, SHA256 checksum)
+
+        Raises:
+            StorageException: Ошибка переноса или несовпадение размера
+        """
+        target_path = self._get_full_path(relative_path)
+        actual_size = (await run_io(source_path.stat)).st_size
+        if actual_size != expected_size:
+            raise StorageException(
+                message=f"File size mismatch: expected {expected_size}, got {actual_size}",
+                error_code="SIZE_MISMATCH",
+                details={
+                    "expected_size": expected_size,
+                    "actual_size": actual_size,
+                    "relative_path": relative_path
+                }
+            )
+
+        try:
+            await run_io(target_path.parent.mkdir, parents=True, exist_ok=True)
+            await run_io(os.replace, source_path, target_path)
+        except OSError as e:
+            if e.errno == errno.EXDEV:
+                return await super().import_file(relative_path, source_path, expected_size, checksum)
+            raise StorageException(
+                message="Failed to import staged file to local storage",
+                error_code="LOCAL_WRITE_FAILED",
+                details={"relative_path": relative_path, "error": str(e)}
+            )
+
+        logger.info(
+            "Staged file moved to local storage",
+            extra={
+                "relative_path": relative_path,
+                "size_bytes": actual_size,
+                "checksum": checksum
+            }
+        )
+
+        return actual_size, checksum
+
     async def read_file(
         self,
         relative_path: str
@@ -286,12 +480,15 @@ class LocalStorageService(StorageService):
             )
 
         try:
-            with open(file_path, 'rb') as f:
+            f = await run_io(open, file_path, 'rb')
+            try:
                 while True:
-                    chunk = f.read(CHUNK_SIZE)
+                    chunk = await run_io(f.read, CHUNK_SIZE)
                     if not chunk:
                         break
                     yield chunk
+            finally:
+                await run_io(f.close)
 
             logger.debug(
                 "File read from local storage",
@@ -356,6 +553,38 @@ class LocalStorageService(StorageService):
                 details={"relative_path": relative_path, "error": str(e)}
             )
 
+    async def move_file(
+        self,
+        source_relative_path: str,
+        target_relative_path: str
+    ) -> None:
+        """
+        Переместить файл атомарным rename (без копирования данных).
+
+        Args:
+            source_relative_path: Текущий относительный путь
+            target_relative_path: Новый относительный путь
+
+        Raises:
+            StorageException: Ошибка перемещения файла
+        """
+        source_path = self._get_full_path(source_relative_path)
+        target_path = self._get_full_path(target_relative_path)
+
+        try:
+            await run_io(target_path.parent.mkdir, parents=True, exist_ok=True)
+            await run_io(os.replace, source_path, target_path)
+        except OSError as e:
+            raise StorageException(
+                message="Failed to move file in local storage",
+                error_code="LOCAL_MOVE_FAILED",
+                details={
+                    "source_relative_path": source_relative_path,
+                    "target_relative_path": target_relative_path,
+                    "error": str(e)
+                }
+            )
+
     async def file_exists(
         self,
         relative_path: str
@@ -458,6 +687,158 @@ class S3StorageService(StorageService):
         clean_path = relative_path.lstrip('/')
         return f"{self.app_folder}/{clean_path}"
 
+    def _s3_client(self):
+        """
+        Async context manager S3 клиента.
+
+        С параметрами из settings используется shared клиент процесса
+        (пул соединений переиспользуется между операциями). Явно
+        переданные endpoint/credentials получают собственный клиент.
+        """
+        s3_settings = settings.storage.s3
+        if (
+            self.endpoint_url == s3_settings.endpoint_url
+            and self.access_key == s3_settings.access_key_id
+            and self.secret_key == s3_settings.secret_access_key
+        ):
+            return shared_s3_client()
+
+        session = aioboto3.Session()
+        return session.client(
+            's3',
+            endpoint_url=self.endpoint_url,
+            aws_access_key_id=self.access_key,
+            aws_secret_access_key=self.secret_key
+        )
+
+    async def _write_multipart(
+        self,
+        s3_client,
+        key: str,
+        file_data: BinaryIO,
+        first_block: bytes,
+        hash_obj,
+        relative_path: str,
+        expected_size: Optional[int]
+    ) -> int:
+        """
+        Streaming multipart upload.
+
+        Части читаются последовательно (SHA-256 считается инкрементально
+        в порядке чтения) и загружаются параллельно. Окно ограничено
+        multipart_concurrency: очередная часть читается только после
+        освобождения слота, поэтому в памяти не больше concurrency частей.
+
+        При любой ошибке multipart upload отменяется (abort), чтобы
+        незавершённые части не занимали место в bucket.
+
+        Args:
+            s3_client: S3 клиент
+            key: Полный S3 ключ
+            file_data: Источник данных (после first_block)
+            first_block: Уже прочитанное начало файла (учтено в hash_obj)
+            hash_obj: SHA-256 для продолжения вычисления
+            relative_path: Относительный путь (для ошибок и логов)
+            expected_size: Ожидаемый размер (опционально)
+
+        Returns:
+            int: Размер файла в байтах
+        """
+        s3_settings = settings.storage.s3
+        part_size = s3_settings.multipart_part_size
+        window = asyncio.Semaphore(s3_settings.multipart_concurrency)
+
+        # Checksum станет известен только после последней части (см. write_file)
+        metadata = {'original_size': str(expected_size)} if expected_size is not None else {}
+        upload = await s3_client.create_multipart_upload(
+            Bucket=self.bucket_name, Key=key, Metadata=metadata
+        )
+        upload_id = upload['UploadId']
+
+        tasks: list[asyncio.Task] = []
+        failed = asyncio.Event()
+
+        async def upload_part(part_number: int, body: bytes) -> dict:
+            try:
+                response = await s3_client.upload_part(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=body
+                )
+                return {'PartNumber': part_number, 'ETag': response['ETag']}
+            except BaseException:
+                failed.set()
+                raise
+            finally:
+                window.release()
+
+        try:
+            carry = first_block
+            total_size = len(first_block)
+            part_number = 0
+
+            while not failed.is_set():
+                await window.acquire()
+
+                if len(carry) < part_size:
+                    block = _read_block(file_data, part_size - len(carry))
+                    hash_obj.update(block)
+                    total_size += len(block)
+                    carry += block
+                    if expected_size is not None and total_size > expected_size:
+                        window.release()
+                        _check_size(total_size, expected_size, relative_path)
+
+                body, carry = carry[:part_size], carry[part_size:]
+                if not body:
+                    window.release()
+                    break
+
+                part_number += 1
+                tasks.append(asyncio.create_task(upload_part(part_number, body)))
+
+            parts = await asyncio.gather(*tasks)
+            _check_size(total_size, expected_size, relative_path)
+
+            await s3_client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': parts}
+            )
+
+            logger.debug(
+                "S3 multipart upload completed",
+                extra={
+                    "relative_path": relative_path,
+                    "parts": len(parts),
+                    "part_size": part_size,
+                    "size_bytes": total_size
+                }
+            )
+
+            return total_size
+
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            try:
+                await s3_client.abort_multipart_upload(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    UploadId=upload_id
+                )
+            except Exception as abort_error:
+                logger.error(
+                    f"Failed to abort S3 multipart upload: {abort_error}",
+                    extra={"relative_path": relative_path, "upload_id": upload_id}
+                )
+            raise
+
     async def write_file(
         self,
         relative_path: str,
@@ -467,6 +848,11 @@ class S3StorageService(StorageService):
         """
         Записать файл в S3 хранилище.
 
+        Файлы меньше STORAGE_S3_MULTIPART_THRESHOLD - одним put_object,
+        большие - streaming multipart upload (см. _write_multipart).
+        Multipart объект получает original_size в Metadata (из expected_size),
+        а checksum - тегом объекта: Metadata нельзя изменить без копирования.
+
         Args:
             relative_path: Относительный путь (S3 key)
             file_data: Бинарные данные файла
@@ -478,56 +864,50 @@ class S3StorageService(StorageService):
         Raises:
             StorageException: Ошибка записи файла
         """
+        s3_settings = settings.storage.s3
+
         try:
-            session = aioboto3.Session()
-
-            async with session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key
-            ) as s3_client:
-                # Вычисление checksum и размера
+            async with self._s3_client() as s3_client:
+                key = self._get_s3_key(relative_path)
                 hash_obj = hashlib.sha256()
-                total_size = 0
-                chunks = []
 
-                while True:
-                    chunk = file_data.read(CHUNK_SIZE)
-                    if not chunk:
-                        break
-
-                    chunks.append(chunk)
-                    hash_obj.update(chunk)
-                    total_size += len(chunk)
-
-                # Валидация размера
-                if expected_size is not None and total_size != expected_size:
-                    raise StorageException(
-                        message=f"File size mismatch: expected {expected_size}, got {total_size}",
-                        error_code="SIZE_MISMATCH",
-                        details={
-                            "expected_size": expected_size,
-                            "actual_size": total_size,
-                            "relative_path": relative_path
+                # Файлы меньше порога - одним put_object
+                first_block = _read_block(file_data, s3_settings.multipart_threshold)
+                hash_obj.update(first_block)
+
+                if len(first_block) < s3_settings.multipart_threshold:
+                    total_size = len(first_block)
+                    _check_size(total_size, expected_size, relative_path)
+                    checksum = hash_obj.hexdigest()
+
+                    await s3_client.put_object(
+                        Bucket=self.bucket_name,
+                        Key=key,
+                        Body=first_block,
+                        Metadata={
+                            'checksum': checksum,
+                            'original_size': str(total_size)
                         }
                     )
-
-                checksum = hash_obj.hexdigest()
-
-                # Собрать chunks обратно в bytes
-                file_bytes = b''.join(chunks)
-
-                # Upload в S3
-                await s3_client.put_object(
-                    Bucket=self.bucket_name,
-                    Key=self._get_s3_key(relative_path),
-                    Body=file_bytes,
-                    Metadata={
-                        'checksum': checksum,
-                        'original_size': str(total_size)
-                    }
-                )
+                else:
+                    total_size = await self._write_multipart(
+                        s3_client, key, file_data, first_block, hash_obj,
+                        relative_path, expected_size
+                    )
+                    checksum = hash_obj.hexdigest()
+
+                    try:
+                        await s3_client.put_object_tagging(
+                            Bucket=self.bucket_name,
+                            Key=key,
+                            Tagging={'TagSet': [{'Key': 'checksum', 'Value': checksum}]}
+                        )
+                    except Exception as tagging_error:
+                        # Checksum хранится в attr.json и БД, тег - справочный
+                        logger.warning(
+                            f"Failed to tag S3 object with checksum: {tagging_error}",
+                            extra={"relative_path": relative_path}
+                        )
 
                 logger.info(
                     "File written to S3 storage",
@@ -535,7 +915,8 @@ class S3StorageService(StorageService):
                         "relative_path": relative_path,
                         "size_bytes": total_size,
                         "checksum": checksum,
-                        "bucket": self.bucket_name
+                        "bucket": self.bucket_name,
+                        "multipart": total_size >= s3_settings.multipart_threshold
                     }
                 )
 
@@ -587,14 +968,7 @@ class S3StorageService(StorageService):
             StorageException: Файл не найден или ошибка чтения
         """
         try:
-            session = aioboto3.Session()
-
-            async with session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key
-            ) as s3_client:
+            async with self._s3_client() as s3_client:
                 response = await s3_client.get_object(
                     Bucket=self.bucket_name,
                     Key=self._get_s3_key(relative_path)
@@ -658,14 +1032,7 @@ class S3StorageService(StorageService):
             StorageException: Ошибка удаления файла
         """
         try:
-            session = aioboto3.Session()
-
-            async with session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key
-            ) as s3_client:
+            async with self._s3_client() as s3_client:
                 await s3_client.delete_object(
                     Bucket=self.bucket_name,
                     Key=self._get_s3_key(relative_path)
@@ -706,6 +1073,54 @@ class S3StorageService(StorageService):
                 details={"relative_path": relative_path, "error": str(e)}
             )
 
+    async def move_file(
+        self,
+        source_relative_path: str,
+        target_relative_path: str
+    ) -> None:
+        """
+        Переместить объект: server-side copy + delete исходного ключа.
+
+        Managed copy aioboto3 использует multipart copy для объектов больше 5GB,
+        данные не передаются через Storage Element.
+
+        Args:
+            source_relative_path: Текущий относительный путь (S3 key)
+            target_relative_path: Новый относительный путь (S3 key)
+
+        Raises:
+            StorageException: Ошибка перемещения объекта
+        """
+        source_key = self._get_s3_key(source_relative_path)
+
+        try:
+            async with self._s3_client() as s3_client:
+                await s3_client.copy(
+                    {"Bucket": self.bucket_name, "Key": source_key},
+                    self.bucket_name,
+                    self._get_s3_key(target_relative_path)
+                )
+                await s3_client.delete_object(Bucket=self.bucket_name, Key=source_key)
+
+        except Exception as e:
+            logger.error(
+                f"Failed to move object in S3 storage: {e}",
+                extra={
+                    "source_relative_path": source_relative_path,
+                    "target_relative_path": target_relative_path,
+                    "error": str(e)
+                }
+            )
+            raise StorageException(
+                message="Failed to move object in S3 storage",
+                error_code="S3_MOVE_FAILED",
+                details={
+                    "source_relative_path": source_relative_path,
+                    "target_relative_path": target_relative_path,
+                    "error": str(e)
+                }
+            )
+
     async def file_exists(
         self,
         relative_path: str
@@ -720,14 +1135,7 @@ class S3StorageService(StorageService):
             bool: True если файл существует
         """
         try:
-            session = aioboto3.Session()
-
-            async with session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key
-            ) as s3_client:
+            async with self._s3_client() as s3_client:
                 await s3_client.head_object(
                     Bucket=self.bucket_name,
                     Key=self._get_s3_key(relative_path)
@@ -764,14 +1172,7 @@ class S3StorageService(StorageService):
             StorageException: Файл не найден
         """
         try:
-            session = aioboto3.Session()
-
-            async with session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key
-            ) as s3_client:
+            async with self._s3_client() as s3_client:
                 response = await s3_client.head_object(
                     Bucket=self.bucket_name,
                     Key=self._get_s3_key(relative_path)
@@ -819,14 +1220,7 @@ class S3StorageService(StorageService):
         try:
             import json as json_module
 
-            session = aioboto3.Session()
-
-            async with session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key
-            ) as s3_client:
+            async with self._s3_client() as s3_client:
                 # Сериализация атрибутов в JSON с pretty print
                 json_data = json_module.dumps(
                     attributes,
@@ -897,14 +1291,7 @@ class S3StorageService(StorageService):
         try:
             import json as json_module
 
-            session = aioboto3.Session()
-
-            async with session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key
-            ) as s3_client:
+            async with self._s3_client() as s3_client:
                 response = await s3_client.get_object(
                     Bucket=self.bucket_name,
                     Key=self._get_s3_key(relative_path)
@@ -965,14 +1352,7 @@ class S3StorageService(StorageService):
             StorageException: Ошибка удаления attr.json
         """
         try:
-            session = aioboto3.Session()
-
-            async with session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key
-            ) as s3_client:
+            async with self._s3_client() as s3_client:
                 await s3_client.delete_object(
                     Bucket=self.bucket_name,
                     Key=self._get_s3_key(relative_path)
@@ -1032,14 +1412,7 @@ class S3StorageService(StorageService):
             Это позволяет использовать его в health checks без прерывания.
         """
         try:
-            session = aioboto3.Session()
-
-            async with session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key
-            ) as s3_client:
+            async with self._s3_client() as s3_client:
                 await s3_client.head_bucket(Bucket=self.bucket_name)
 
                 logger.debug(
@@ -1113,14 +1486,7 @@ class S3StorageService(StorageService):
         app_folder = settings.storage.s3.app_folder
 
         try:
-            session = aioboto3.Session()
-
-            async with session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key
-            ) as s3_client:
+            async with self._s3_client() as s3_client:
                 # Проверяем наличие объектов с prefix app_folder/
                 prefix = f"{app_folder}/"
                 response = await s3_client.list_objects_v2(
@@ -0,0 +1,638 @@
+"""
+Upload Staging Service - staging area для resumable multipart uploads.
+
+Ingester Module загружает большой файл частями (parts), части могут приходить
+параллельно и повторно (retry после обрыва связи). Каждая часть записывается
+сразу на своё место (offset) в staging файл фиксированного размера, поэтому на
+complete не требуется склейка частей:
+- local storage: staging файл переносится в хранилище атомарным rename
+- s3 storage: staging файл загружается в bucket
+
+Структура staging директории:
+    {staging_path}/{upload_id}/
+        manifest.json       - параметры загрузки (размер файла, размер части)
+        data.bin            - содержимое файла (sparse, части пишутся по offset)
+        parts/000001.json   - маркер записанной части (size, sha256)
+
+SHA-256 всего файла считается инкрементально по мере появления непрерывного
+префикса частей (running hash), пока данные ещё в page cache. На complete
+досчитываются только оставшиеся части, а не весь файл целиком.
+
+Running hash - кеш в памяти процесса: части одной загрузки могут приходить
+в разные workers (SERVER_WORKERS > 1) и перезаписываться после учёта в hash.
+Поэтому running hash запоминает маркер каждой учтённой части (checksum и время
+записи), и на complete они сверяются с маркерами частей на диске. При расхождении или отсутствии running hash
+(перезапуск процесса) checksum пересчитывается с первой части.
+
+Staging область привязана к создавшему её principal (manifest.created_by):
+операции с загрузкой другого principal отклоняются (UPLOAD_FORBIDDEN).
+
+Брошенные загрузки (сессия Ingester истекла без abort) удаляет фоновый
+sweep: staging область без активности дольше STORAGE_STAGING_TTL_SECONDS
+удаляется вместе с записью running hash.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from app.core.config import settings, StorageType
+from app.core.exceptions import StorageException
+from app.core.io_executor import run_io
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+DATA_FILENAME = "data.bin"
+PARTS_DIRNAME = "parts"
+
+# Маркеры частей ({part_number:06d}.json); temp файлы _write_json_atomic (.tmp_*) не совпадают
+PART_MARKER_GLOB = "[0-9]*.json"
+TEMP_FILE_PREFIX = ".tmp_"
+
+# Размер блока записи/чтения staging файла
+STAGING_IO_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Допустимый формат upload_id (генерируется Ingester Module)
+_UPLOAD_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+
+
+def get_staging_path() -> Path:
+    """
+    Получить корневую директорию staging.
+
+    Returns:
+        Path: STORAGE_STAGING_PATH или default в зависимости от типа хранилища
+    """
+    if settings.storage.staging_path is not None:
+        return Path(settings.storage.staging_path)
+    if settings.storage.type == StorageType.LOCAL:
+        # Тот же filesystem что и хранилище → complete через atomic rename
+        return Path(settings.storage.local.base_path) / ".staging"
+    return Path("./.data/staging")
+
+
+@dataclass
+class StagedFile:
+    """
+    Собранный файл в staging area, готовый к импорту в хранилище.
+
+    Attributes:
+        upload_id: ID multipart загрузки
+        path: Путь к staging файлу
+        file_size: Размер файла в байтах
+        checksum: SHA-256 всего файла
+    """
+    upload_id: str
+    path: Path
+    file_size: int
+    checksum: str
+
+
+class _RunningHash:
+    """Инкрементальный SHA-256 по непрерывному префиксу частей."""
+
+    def __init__(self):
+        self.hasher = hashlib.sha256()
+        self.next_part = 1
+        # Маркеры учтённых частей (checksum, uploaded_at) - сверка на complete
+        self.part_markers: list[tuple[str, str]] = []
+        self.lock = asyncio.Lock()
+
+
+class UploadStagingService:
+    """
+    Управление staging area для multipart uploads.
+
+    Running hash хранится в памяти процесса (class-level), так как сервис
+    создаётся на каждый запрос. Это только кеш: complete сверяет его
+    с маркерами частей на диске.
+    """
+
+    _running_hashes: dict[str, _RunningHash] = {}
+
+    def __init__(self, staging_path: Optional[Path] = None):
+        """
+        Args:
+            staging_path: Корневая директория staging (default: get_staging_path())
+        """
+        self.staging_path = staging_path or get_staging_path()
+
+    # ------------------------------------------------------------------
+    # Paths & manifest
+    # ------------------------------------------------------------------
+
+    def _upload_dir(self, upload_id: str) -> Path:
+        if not _UPLOAD_ID_PATTERN.match(upload_id):
+            raise StorageException(
+                message=f"Invalid upload_id: {upload_id}",
+                error_code="INVALID_UPLOAD_ID",
+                details={"upload_id": upload_id}
+            )
+        return self.staging_path / upload_id
+
+    def _part_marker_path(self, upload_id: str, part_number: int) -> Path:
+        return self._upload_dir(upload_id) / PARTS_DIRNAME / f"{part_number:06d}.json"
+
+    @staticmethod
+    def _write_json_atomic(path: Path, data: dict) -> None:
+        """Атомарная запись JSON (temp → fsync → rename)."""
+        temp_path = path.parent / f"{TEMP_FILE_PREFIX}{path.name}"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        temp_path.replace(path)
+
+    async def _load_manifest(self, upload_id: str, user_id: Optional[str] = None) -> dict:
+        """
+        Прочитать manifest загрузки.
+
+        Args:
+            upload_id: ID загрузки
+            user_id: Principal запроса (None - без проверки владельца)
+
+        Raises:
+            StorageException: UPLOAD_NOT_FOUND, UPLOAD_FORBIDDEN - загрузка создана другим principal
+        """
+        manifest_path = self._upload_dir(upload_id) / MANIFEST_FILENAME
+        try:
+            content = await run_io(manifest_path.read_text, encoding="utf-8")
+        except FileNotFoundError:
+            raise StorageException(
+                message=f"Upload not found: {upload_id}",
+                error_code="UPLOAD_NOT_FOUND",
+                details={"upload_id": upload_id}
+            )
+        manifest = json.loads(content)
+        if user_id is not None and manifest.get("created_by") != user_id:
+            raise StorageException(
+                message=f"Upload {upload_id} belongs to another principal",
+                error_code="UPLOAD_FORBIDDEN",
+                details={"upload_id": upload_id}
+            )
+        return manifest
+
+    @staticmethod
+    def _part_range(manifest: dict, part_number: int) -> tuple[int, int]:
+        """
+        Offset и ожидаемый размер части.
+
+        Raises:
+            StorageException: Номер части вне диапазона
+        """
+        total_parts = manifest["total_parts"]
+        if part_number < 1 or part_number > total_parts:
+            raise StorageException(
+                message=f"Part number {part_number} out of range 1..{total_parts}",
+                error_code="INVALID_PART_NUMBER",
+                details={"part_number": part_number, "total_parts": total_parts}
+            )
+        offset = (part_number - 1) * manifest["part_size"]
+        size = min(manifest["part_size"], manifest["file_size"] - offset)
+        return offset, size
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def initiate(
+        self,
+        upload_id: str,
+        file_size: int,
+        part_size: int,
+        user_id: str
+    ) -> dict:
+        """
+        Создание staging области для multipart upload.
+
+        Идемпотентно: повторный вызов с теми же параметрами возвращает
+        существующий manifest (retry после обрыва связи).
+
+        Args:
+            upload_id: ID загрузки (генерируется Ingester Module)
+            file_size: Итоговый размер файла в байтах
+            part_size: Размер части в байтах (последняя часть может быть меньше)
+            user_id: Инициатор загрузки
+
+        Returns:
+            dict: Manifest загрузки
+
+        Raises:
+            StorageException: Некорректные параметры, конфликт с существующей загрузкой
+                или загрузка с тем же upload_id создана другим principal
+        """
+        if file_size <= 0 or part_size <= 0:
+            raise StorageException(
+                message="file_size and part_size must be positive",
+                error_code="INVALID_UPLOAD_PARAMETERS",
+                details={"file_size": file_size, "part_size": part_size}
+            )
+        if part_size > settings.storage.staging_max_part_size:
+            raise StorageException(
+                message=f"part_size exceeds maximum {settings.storage.staging_max_part_size}",
+                error_code="INVALID_UPLOAD_PARAMETERS",
+                details={"part_size": part_size, "max_part_size": settings.storage.staging_max_part_size}
+            )
+
+        upload_dir = self._upload_dir(upload_id)
+        manifest = {
+            "upload_id": upload_id,
+            "file_size": file_size,
+            "part_size": part_size,
+            "total_parts": -(-file_size // part_size),
+            "created_by": user_id,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        if (upload_dir / MANIFEST_FILENAME).exists():
+            existing = await self._load_manifest(upload_id, user_id)
+            if existing["file_size"] != file_size or existing["part_size"] != part_size:
+                raise StorageException(
+                    message=f"Upload {upload_id} already exists with different parameters",
+                    error_code="UPLOAD_CONFLICT",
+                    details={"upload_id": upload_id}
+                )
+            return existing
+
+        def _create() -> None:
+            (upload_dir / PARTS_DIRNAME).mkdir(parents=True, exist_ok=True)
+            # Sparse файл итогового размера: части пишутся сразу по своим offset
+            with open(upload_dir / DATA_FILENAME, "wb") as f:
+                f.truncate(file_size)
+            self._write_json_atomic(upload_dir / MANIFEST_FILENAME, manifest)
+
+        await run_io(_create)
+
+        logger.info(
+            "Multipart upload staging created",
+            extra={
+                "upload_id": upload_id,
+                "file_size": file_size,
+                "part_size": part_size,
+                "total_parts": manifest["total_parts"],
+                "user_id": user_id
+            }
+        )
+
+        return manifest
+
+    async def write_part(
+        self,
+        upload_id: str,
+        part_number: int,
+        stream: AsyncIterator[bytes],
+        user_id: Optional[str] = None
+    ) -> dict:
+        """
+        Потоковая запись части в staging файл по её offset.
+
+        Части независимы и могут записываться параллельно.
+        Повторная запись части (retry) перезаписывает её содержимое: маркер
+        части удаляется до записи, поэтому оборванный retry оставляет часть
+        незагруженной, а не учтённой с прежним checksum.
+
+        Args:
+            upload_id: ID загрузки
+            part_number: Номер части (1..total_parts)
+            stream: Поток байтов части
+            user_id: Principal запроса (None - без проверки владельца)
+
+        Returns:
+            dict: Маркер части (part_number, size, checksum, offset)
+
+        Raises:
+            StorageException: Загрузка не найдена или чужая, номер/размер части некорректен
+        """
+        manifest = await self._load_manifest(upload_id, user_id)
+        offset, expected_size = self._part_range(manifest, part_number)
+        upload_dir = self._upload_dir(upload_id)
+        marker_path = self._part_marker_path(upload_id, part_number)
+
+        if await run_io(marker_path.exists):
+            # Retry учтённой части: до перезаписи данных часть снова не загружена
+            await run_io(marker_path.unlink, missing_ok=True)
+            self._running_hashes.pop(upload_id, None)
+
+        part_hash = hashlib.sha256()
+        written = 0
+        buffer = bytearray()
+
+        fd = await run_io(os.open, upload_dir / DATA_FILENAME, os.O_WRONLY)
+        try:
+            async for chunk in stream:
+                if not chunk:
+                    continue
+                if written + len(buffer) + len(chunk) > expected_size:
+                    raise StorageException(
+                        message=f"Part {part_number} exceeds expected size {expected_size}",
+                        error_code="PART_SIZE_MISMATCH",
+                        details={"part_number": part_number, "expected_size": expected_size}
+                    )
+                buffer += chunk
+                if len(buffer) >= STAGING_IO_CHUNK_SIZE:
+                    data = bytes(buffer)
+                    buffer.clear()
+                    await run_io(os.pwrite, fd, data, offset + written)
+                    part_hash.update(data)
+                    written += len(data)
+
+            if buffer:
+                data = bytes(buffer)
+                await run_io(os.pwrite, fd, data, offset + written)
+                part_hash.update(data)
+                written += len(data)
+
+            if written != expected_size:
+                raise StorageException(
+                    message=f"Part {part_number} size mismatch: expected {expected_size}, got {written}",
+                    error_code="PART_SIZE_MISMATCH",
+                    details={
+                        "part_number": part_number,
+                        "expected_size": expected_size,
+                        "actual_size": written
+                    }
+                )
+
+            await run_io(os.fsync, fd)
+        finally:
+            await run_io(os.close, fd)
+
+        marker = {
+            "part_number": part_number,
+            "size": written,
+            "checksum": part_hash.hexdigest(),
+            "offset": offset,
+            "uploaded_at": datetime.now(timezone.utc).isoformat(),
+        }
+        await run_io(self._write_json_atomic, marker_path, marker)
+
+        logger.debug(
+            "Multipart upload part written",
+            extra={
+                "upload_id": upload_id,
+                "part_number": part_number,
+                "size": written
+            }
+        )
+
+        await self._advance_running_hash(upload_id, manifest)
+
+        return marker
+
+    async def list_parts(self, upload_id: str, user_id: Optional[str] = None) -> list[dict]:
+        """
+        Список записанных частей.
+
+        Args:
+            upload_id: ID загрузки
+            user_id: Principal запроса (None - без проверки владельца)
+
+        Returns:
+            list[dict]: Маркеры частей, отсортированные по номеру
+        """
+        await self._load_manifest(upload_id, user_id)
+        parts_dir = self._upload_dir(upload_id) / PARTS_DIRNAME
+
+        def _read_all() -> list[dict]:
+            parts = []
+            for marker_path in sorted(parts_dir.glob(PART_MARKER_GLOB)):
+                parts.append(json.loads(marker_path.read_text(encoding="utf-8")))
+            return parts
+
+        return await run_io(_read_all)
+
+    async def complete(self, upload_id: str, user_id: Optional[str] = None) -> StagedFile:
+        """
+        Проверка полноты загрузки и вычисление итогового SHA-256.
+
+        Args:
+            upload_id: ID загрузки
+            user_id: Principal запроса (None - без проверки владельца)
+
+        Returns:
+            StagedFile: Собранный файл для импорта в хранилище
+
+        Raises:
+            StorageException: Не все части загружены
+        """
+        manifest = await self._load_manifest(upload_id, user_id)
+        parts = await self.list_parts(upload_id)
+        uploaded = {part["part_number"] for part in parts}
+        missing = [n for n in range(1, manifest["total_parts"] + 1) if n not in uploaded]
+        if missing:
+            raise StorageException(
+                message=f"Upload {upload_id} is incomplete: {len(missing)} parts missing",
+                error_code="UPLOAD_INCOMPLETE",
+                details={"upload_id": upload_id, "missing_parts": missing[:100]}
+            )
+
+        state = await self._advance_running_hash(upload_id, manifest)
+        if state.part_markers != [(part["checksum"], part["uploaded_at"]) for part in parts]:
+            # Часть перезаписана после учёта в running hash (в т.ч. другим worker)
+            logger.warning(
+                "Running hash does not match part markers, rehashing staging file",
+                extra={"upload_id": upload_id}
+            )
+            self._running_hashes.pop(upload_id, None)
+            state = await self._advance_running_hash(upload_id, manifest)
+        checksum = state.hasher.hexdigest()
+
+        logger.info(
+            "Multipart upload assembled",
+            extra={
+                "upload_id": upload_id,
+                "file_size": manifest["file_size"],
+                "total_parts": manifest["total_parts"],
+                "checksum": checksum
+            }
+        )
+
+        return StagedFile(
+            upload_id=upload_id,
+            path=self._upload_dir(upload_id) / DATA_FILENAME,
+            file_size=manifest["file_size"],
+            checksum=checksum,
+        )
+
+    async def abort(self, upload_id: str, user_id: Optional[str] = None) -> None:
+        """
+        Удаление staging области (abort или очистка после complete).
+
+        Идемпотентно: отсутствующая загрузка не является ошибкой.
+
+        Args:
+            upload_id: ID загрузки
+            user_id: Principal запроса (None - без проверки владельца)
+
+        Raises:
+            StorageException: UPLOAD_FORBIDDEN - загрузка создана другим principal
+        """
+        upload_dir = self._upload_dir(upload_id)
+        if user_id is not None:
+            try:
+                await self._load_manifest(upload_id, user_id)
+            except StorageException as e:
+                if e.error_code != "UPLOAD_NOT_FOUND":
+                    raise
+        self._running_hashes.pop(upload_id, None)
+        await run_io(shutil.rmtree, upload_dir, True)
+        logger.info("Multipart upload staging removed", extra={"upload_id": upload_id})
+
+    async def sweep_expired(self, ttl_seconds: int) -> int:
+        """
+        Удаление брошенных загрузок (без активности дольше ttl_seconds).
+
+        Последняя активность - время создания manifest или последней записи
+        части (mtime data.bin). Записи running hash удалённых загрузок
+        (в т.ч. удалённых другим worker) убираются из памяти процесса.
+        В активных загрузках удаляются temp файлы _write_json_atomic старше
+        ttl_seconds (остались после сбоя процесса).
+
+        Args:
+            ttl_seconds: Время жизни неактивной staging области
+
+        Returns:
+            int: Количество удалённых staging областей
+        """
+        deadline = time.time() - ttl_seconds
+
+        def _expired() -> list[str]:
+            if not self.staging_path.is_dir():
+                return []
+            expired = []
+            for upload_dir in self.staging_path.iterdir():
+                if not upload_dir.is_dir() or not _UPLOAD_ID_PATTERN.match(upload_dir.name):
+                    continue
+                last_activity = upload_dir.stat().st_mtime
+                try:
+                    manifest = json.loads((upload_dir / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+                    last_activity = datetime.fromisoformat(manifest["created_at"]).timestamp()
+                    last_activity = max(last_activity, (upload_dir / DATA_FILENAME).stat().st_mtime)
+                except (OSError, ValueError, KeyError):
+                    # Неполная staging область (сбой initiate): по mtime директории
+                    pass
+                if last_activity < deadline:
+                    expired.append(upload_dir.name)
+                    continue
+                for directory in (upload_dir, upload_dir / PARTS_DIRNAME):
+                    for temp_path in directory.glob(f"{TEMP_FILE_PREFIX}*"):
+                        try:
+                            if temp_path.stat().st_mtime < deadline:
+                                temp_path.unlink()
+                        except FileNotFoundError:
+                            pass
+            return expired
+
+        removed = 0
+        for upload_id in await run_io(_expired):
+            await self.abort(upload_id)
+            removed += 1
+
+        for upload_id in list(self._running_hashes):
+            if not await run_io((self.staging_path / upload_id).exists):
+                self._running_hashes.pop(upload_id, None)
+
+        if removed:
+            logger.info(
+                "Expired multipart upload staging removed",
+                extra={"removed": removed, "ttl_seconds": ttl_seconds}
+            )
+
+        return removed
+
+    # ------------------------------------------------------------------
+    # Running hash
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    async def _read_marker(marker_path: Path) -> Optional[dict]:
+        try:
+            content = await run_io(marker_path.read_text, encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        return json.loads(content)
+
+    async def _advance_running_hash(self, upload_id: str, manifest: dict) -> _RunningHash:
+        """
+        Продвижение running hash по непрерывному префиксу записанных частей.
+
+        Returns:
+            _RunningHash: Текущее состояние (next_part > total_parts → hash готов)
+        """
+        state = self._running_hashes.setdefault(upload_id, _RunningHash())
+        data_path = self._upload_dir(upload_id) / DATA_FILENAME
+
+        def _hash_range(offset: int, size: int) -> None:
+            with open(data_path, "rb") as f:
+                f.seek(offset)
+                remaining = size
+                while remaining > 0:
+                    chunk = f.read(min(STAGING_IO_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise StorageException(
+                            message="Staging file is truncated",
+                            error_code="STAGING_CORRUPTED",
+                            details={"upload_id": upload_id}
+                        )
+                    state.hasher.update(chunk)
+                    remaining -= len(chunk)
+
+        async with state.lock:
+            while state.next_part <= manifest["total_parts"]:
+                marker = await self._read_marker(self._part_marker_path(upload_id, state.next_part))
+                if marker is None:
+                    break
+                offset, size = self._part_range(manifest, state.next_part)
+                await run_io(_hash_range, offset, size)
+                state.part_markers.append((marker["checksum"], marker["uploaded_at"]))
+                state.next_part += 1
+
+        return state
+
+
+# ----------------------------------------------------------------------
+# Фоновая очистка брошенных загрузок
+# ----------------------------------------------------------------------
+
+_sweeper_task: Optional[asyncio.Task] = None
+
+
+async def _sweep_loop() -> None:
+    """Периодический sweep staging области (STORAGE_STAGING_SWEEP_INTERVAL_SECONDS)."""
+    while True:
+        await asyncio.sleep(settings.storage.staging_sweep_interval_seconds)
+        try:
+            await UploadStagingService().sweep_expired(settings.storage.staging_ttl_seconds)
+        except Exception as e:
+            logger.error(f"Staging sweep failed: {e}", exc_info=True)
+
+
+def start_staging_sweeper() -> None:
+    """Запуск фоновой очистки брошенных загрузок (lifespan startup)."""
+    global _sweeper_task
+
+    if _sweeper_task is None:
+        _sweeper_task = asyncio.create_task(_sweep_loop())
+
+
+async def stop_staging_sweeper() -> None:
+    """Остановка фоновой очистки (lifespan shutdown)."""
+    global _sweeper_task
+
+    if _sweeper_task is not None:
+        _sweeper_task.cancel()
+        try:
+            await _sweeper_task
+        except asyncio.CancelledError:
+            pass
+        _sweeper_task = None
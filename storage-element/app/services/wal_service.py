@@ -54,13 +54,16 @@ class WALService:
             db: Async сессия базы данных
         """
         self.db = db
+        # Отложенные транзакции: фиксируются одним commit с данными вызывающего
+        self._deferred: Dict[UUID, WALTransaction] = {}
 
     async def start_transaction(
         self,
         operation_type: WALOperationType,
         operation_data: Dict[str, Any],
         file_id: Optional[UUID] = None,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        deferred: bool = False
     ) -> UUID:
         """
         Начать новую транзакцию WAL.
@@ -68,11 +71,16 @@ class WALService:
         Создает запись PENDING в БД перед началом операции.
         Это обеспечивает возможность отката при сбое.
 
+        deferred=True (DB_WAL_SINGLE_COMMIT): запись только добавляется в сессию
+        и фиксируется в commit() одним commit вместе с данными вызывающего.
+        Durable намерение до commit обеспечивает вызывающий (IntentJournal).
+
         Args:
             operation_type: Тип операции (create, update, delete, etc.)
             operation_data: Данные операции (путь, метаданные, и т.д.)
             file_id: UUID файла (опционально, для файловых операций)
             user_id: User ID инициатора операции (опционально)
+            deferred: Не выполнять отдельный commit PENDING записи
 
         Returns:
             UUID: transaction_id для последующего commit/rollback
@@ -106,8 +114,11 @@ class WALService:
             )
 
             self.db.add(transaction)
-            await self.db.commit()
-            await self.db.refresh(transaction)
+            if deferred:
+                self._deferred[transaction.transaction_id] = transaction
+            else:
+                await self.db.commit()
+                await self.db.refresh(transaction)
 
             logger.info(
                 "WAL transaction started",
@@ -115,7 +126,8 @@ class WALService:
                     "transaction_id": str(transaction.transaction_id),
                     "operation_type": operation_type.value,
                     "file_id": str(file_id) if file_id else None,
-                    "user_id": user_id
+                    "user_id": user_id,
+                    "deferred": deferred
                 }
             )
 
@@ -146,6 +158,9 @@ class WALService:
         Обновляет статус транзакции на COMMITTED и вычисляет длительность.
         Дополнительно может сохранить результаты операции.
 
+        Для отложенной транзакции это единственный commit: PENDING запись
+        сохраняется сразу со статусом COMMITTED вместе с данными вызывающего.
+
         Args:
             transaction_id: UUID транзакции из start_transaction()
             result_data: Дополнительные данные результата (опционально)
@@ -160,30 +175,7 @@ class WALService:
             ... )
         """
         try:
-            # Получение транзакции
-            result = await self.db.execute(
-                select(WALTransaction).where(
-                    WALTransaction.transaction_id == transaction_id
-                )
-            )
-            transaction = result.scalar_one_or_none()
-
-            if not transaction:
-                raise WALException(
-                    message=f"Transaction {transaction_id} not found",
-                    error_code="WAL_TX_NOT_FOUND",
-                    details={"transaction_id": str(transaction_id)}
-                )
-
-            if transaction.status != WALStatus.PENDING.value:
-                raise WALException(
-                    message=f"Transaction {transaction_id} already completed with status {transaction.status}",
-                    error_code="WAL_TX_ALREADY_COMPLETED",
-                    details={
-                        "transaction_id": str(transaction_id),
-                        "current_status": transaction.status
-                    }
-                )
+            transaction = await self._get_pending(transaction_id)
 
             # Обновление статуса
             completed_at = datetime.now(timezone.utc)
@@ -201,6 +193,7 @@ class WALService:
                 }
 
             await self.db.commit()
+            self._deferred.pop(transaction_id, None)
 
             logger.info(
                 "WAL transaction committed",
@@ -215,6 +208,11 @@ class WALService:
         except WALException:
             raise
         except Exception as e:
+            deferred_transaction = self._deferred.get(transaction_id)
+            if deferred_transaction is not None:
+                # Commit не выполнен - транзакция остаётся PENDING для rollback()
+                deferred_transaction.status = WALStatus.PENDING.value
+
             logger.error(
                 f"Failed to commit WAL transaction: {e}",
                 extra={
@@ -239,6 +237,9 @@ class WALService:
         Обновляет статус транзакции на ROLLED_BACK и сохраняет
         информацию об ошибке для анализа.
 
+        Для отложенной транзакции незафиксированные изменения сессии
+        отменяются, запись сохраняется сразу со статусом ROLLED_BACK.
+
         Args:
             transaction_id: UUID транзакции из start_transaction()
             error_message: Описание ошибки, вызвавшей откат
@@ -254,30 +255,13 @@ class WALService:
             ...     await wal.rollback(tx_id, str(e))
         """
         try:
-            # Получение транзакции
-            result = await self.db.execute(
-                select(WALTransaction).where(
-                    WALTransaction.transaction_id == transaction_id
-                )
-            )
-            transaction = result.scalar_one_or_none()
-
-            if not transaction:
-                raise WALException(
-                    message=f"Transaction {transaction_id} not found",
-                    error_code="WAL_TX_NOT_FOUND",
-                    details={"transaction_id": str(transaction_id)}
-                )
+            transaction = await self._get_pending(transaction_id)
 
-            if transaction.status != WALStatus.PENDING.value:
-                raise WALException(
-                    message=f"Transaction {transaction_id} already completed with status {transaction.status}",
-                    error_code="WAL_TX_ALREADY_COMPLETED",
-                    details={
-                        "transaction_id": str(transaction_id),
-                        "current_status": transaction.status
-                    }
-                )
+            if transaction_id in self._deferred:
+                # PENDING запись не была зафиксирована - отменяется вместе с
+                # изменениями вызывающего и сохраняется заново как ROLLED_BACK
+                await self.db.rollback()
+                self.db.add(transaction)
 
             # Обновление статуса
             completed_at = datetime.now(timezone.utc)
@@ -289,6 +273,7 @@ class WALService:
             transaction.error_message = error_message
 
             await self.db.commit()
+            self._deferred.pop(transaction_id, None)
 
             logger.warning(
                 "WAL transaction rolled back",
@@ -317,6 +302,44 @@ class WALService:
                 details={"transaction_id": str(transaction_id), "error": str(e)}
             )
 
+    async def _get_pending(self, transaction_id: UUID) -> WALTransaction:
+        """
+        Получить незавершённую транзакцию для commit/rollback.
+
+        Отложенная транзакция берётся из сессии без запроса к БД.
+
+        Raises:
+            WALException: Транзакция не найдена или уже завершена
+        """
+        transaction = self._deferred.get(transaction_id)
+
+        if transaction is None:
+            result = await self.db.execute(
+                select(WALTransaction).where(
+                    WALTransaction.transaction_id == transaction_id
+                )
+            )
+            transaction = result.scalar_one_or_none()
+
+        if not transaction:
+            raise WALException(
+                message=f"Transaction {transaction_id} not found",
+                error_code="WAL_TX_NOT_FOUND",
+                details={"transaction_id": str(transaction_id)}
+            )
+
+        if transaction.status != WALStatus.PENDING.value:
+            raise WALException(
+                message=f"Transaction {transaction_id} already completed with status {transaction.status}",
+                error_code="WAL_TX_ALREADY_COMPLETED",
+                details={
+                    "transaction_id": str(transaction_id),
+                    "current_status": transaction.status
+                }
+            )
+
+        return transaction
+
     async def mark_failed(
         self,
         transaction_id: UUID,
@@ -25,6 +25,7 @@ from uuid import UUID
 from pydantic import BaseModel, Field, field_validator
 
 from app.core.exceptions import InvalidAttributeFileException
+from app.core.io_executor import run_io
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +65,15 @@ class FileAttributes(BaseModel):
     storage_path: str = Field(..., description="Относительный путь в хранилище")
     checksum: str = Field(..., description="SHA256 checksum файла")
 
+    # Compression (файл сжат Ingester Module; file_size/checksum - сжатого содержимого)
+    compressed: bool = Field(False, description="Файл хранится в сжатом виде")
+    compression_algorithm: Optional[str] = Field(None, description="Алгоритм сжатия: gzip, brotli")
+    original_size: Optional[int] = Field(None, gt=0, description="Размер до сжатия в байтах")
+    compression_ratio: Optional[float] = Field(None, description="Коэффициент сжатия (original_size / file_size)")
+
+    # Content-addressed dedup: содержимое хранится в общем blob
+    blob_path: Optional[str] = Field(None, description="Путь к общему blob (None - файл данных рядом с attr.json)")
+
     # Extended metadata (JSONB in DB)
     metadata: Optional[Dict[str, Any]] = Field(
         default_factory=dict,
@@ -98,6 +108,55 @@ class FileAttributes(BaseModel):
         }
 
 
+def _write_attr_bytes_atomic(file_path: Path, json_bytes: bytes) -> None:
+    """
+    Атомарная запись байтов: temp file → fsync → rename (блокирующая).
+
+    Raises:
+        OSError: Ошибка записи на диск (временный файл удаляется)
+    """
+    # Создание директории если не существует
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Запись через временный файл для атомарности
+    # Временный файл в той же директории что и целевой (для atomic rename)
+    temp_fd, temp_path = tempfile.mkstemp(
+        dir=file_path.parent,
+        prefix=".tmp_attr_",
+        suffix=".json"
+    )
+
+    closed = False
+    try:
+        # Запись данных во временный файл
+        os.write(temp_fd, json_bytes)
+
+        # fsync для гарантии записи на диск
+        os.fsync(temp_fd)
+
+        # Закрытие файла
+        os.close(temp_fd)
+        closed = True
+
+        # Atomic rename (POSIX гарантирует атомарность)
+        os.replace(temp_path, file_path)
+
+    except Exception:
+        # Очистка временного файла при ошибке.
+        # Закрытый descriptor не закрывается повторно: номер мог быть
+        # выдан другому потоку DiskIOExecutor
+        if not closed:
+            try:
+                os.close(temp_fd)
+            except OSError:
+                pass
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
 async def write_attr_file(
     file_path: Path,
     attributes: FileAttributes
@@ -139,29 +198,9 @@ async def write_attr_file(
             reason=f"Attribute file size ({len(json_bytes)} bytes) exceeds maximum ({MAX_ATTR_FILE_SIZE} bytes)"
         )
 
-    # Создание директории если не существует
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Запись через временный файл для атомарности
-    # Временный файл в той же директории что и целевой (для atomic rename)
-    temp_fd, temp_path = tempfile.mkstemp(
-        dir=file_path.parent,
-        prefix=".tmp_attr_",
-        suffix=".json"
-    )
-
     try:
-        # Запись данных во временный файл
-        os.write(temp_fd, json_bytes)
-
-        # fsync для гарантии записи на диск
-        os.fsync(temp_fd)
-
-        # Закрытие файла
-        os.close(temp_fd)
-
-        # Atomic rename (POSIX гарантирует атомарность)
-        os.replace(temp_path, file_path)
+        # Блокирующие mkstemp/write/fsync/rename - в disk I/O executor
+        await run_io(_write_attr_bytes_atomic, file_path, json_bytes)
 
         logger.debug(
             "Attribute file written atomically",
@@ -173,16 +212,6 @@ async def write_attr_file(
         )
 
     except Exception as e:
-        # Очистка временного файла при ошибке
-        try:
-            os.close(temp_fd)
-        except OSError:
-            pass
-        try:
-            os.unlink(temp_path)
-        except OSError:
-            pass
-
         logger.error(
             f"Failed to write attribute file: {e}",
             extra={
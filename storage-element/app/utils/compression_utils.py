@@ -0,0 +1,169 @@
+"""
+Утилиты для отдачи файлов, сжатых Ingester Module (gzip/brotli).
+
+Файл хранится в сжатом виде. При скачивании:
+- Клиент принимает алгоритм (Accept-Encoding) → байты отдаются как есть
+  с заголовком Content-Encoding (без распаковки, экономия CPU и сети)
+- Иначе → потоковая распаковка на лету
+
+Распаковка каждого блока выполняется в рабочем потоке (asyncio.to_thread),
+чтобы не блокировать event loop.
+"""
+
+import asyncio
+import zlib
+from typing import AsyncIterator, Optional
+
+import brotli
+
+from app.core.exceptions import StorageException
+
+# Поддерживаемые алгоритмы сжатия → значение HTTP Content-Encoding
+CONTENT_ENCODINGS = {
+    "gzip": "gzip",
+    "brotli": "br",
+}
+
+# Максимальный размер распакованного блока (ограничивает память при высокой степени сжатия)
+DECOMPRESS_OUTPUT_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+def validate_compression_algorithm(algorithm: Optional[str]) -> Optional[str]:
+    """
+    Проверка алгоритма сжатия.
+
+    Args:
+        algorithm: Название алгоритма (gzip/brotli) или None
+
+    Returns:
+        Optional[str]: Нормализованное название алгоритма
+
+    Raises:
+        StorageException: Неподдерживаемый алгоритм
+    """
+    if algorithm is None:
+        return None
+
+    normalized = algorithm.strip().lower()
+    if normalized not in CONTENT_ENCODINGS:
+        raise StorageException(
+            message=f"Unsupported compression algorithm: {algorithm}",
+            error_code="UNSUPPORTED_COMPRESSION",
+            details={"algorithm": algorithm, "supported": list(CONTENT_ENCODINGS)}
+        )
+    return normalized
+
+
+def accepts_encoding(accept_encoding: Optional[str], algorithm: str) -> bool:
+    """
+    Проверка, принимает ли клиент данные в указанном сжатии.
+
+    Разбирает заголовок Accept-Encoding с учётом q-values (q=0 - запрет)
+    и wildcard "*".
+
+    Args:
+        accept_encoding: Значение заголовка Accept-Encoding
+        algorithm: Алгоритм сжатия файла (gzip/brotli)
+
+    Returns:
+        bool: True если сжатые байты можно отдать как есть
+
+    Примеры:
+        >>> accepts_encoding("gzip, deflate, br", "brotli")
+        True
+        >>> accepts_encoding("gzip;q=0, *", "gzip")
+        False
+    """
+    encoding = CONTENT_ENCODINGS.get(algorithm)
+    if not accept_encoding or not encoding:
+        return False
+
+    wildcard_q: Optional[float] = None
+    for item in accept_encoding.split(","):
+        parts = [p.strip() for p in item.split(";")]
+        coding = parts[0].lower()
+        if not coding:
+            continue
+
+        q = 1.0
+        for param in parts[1:]:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+
+        if coding == encoding:
+            return q > 0
+        if coding == "*":
+            wildcard_q = q
+
+    return wildcard_q is not None and wildcard_q > 0
+
+
+async def decompress_stream(
+    chunks: AsyncIterator[bytes],
+    algorithm: str,
+    output_chunk_size: int = DECOMPRESS_OUTPUT_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    Потоковая распаковка сжатого файла.
+
+    Args:
+        chunks: Поток сжатых блоков из storage
+        algorithm: Алгоритм сжатия (gzip/brotli)
+        output_chunk_size: Максимальный размер распакованного блока (gzip)
+
+    Yields:
+        bytes: Распакованные блоки
+
+    Raises:
+        StorageException: Повреждённые или неполные сжатые данные
+    """
+    try:
+        if algorithm == "gzip":
+            decompressor = zlib.decompressobj(wbits=31)
+            async for chunk in chunks:
+                data = chunk
+                while data:
+                    output = await asyncio.to_thread(
+                        decompressor.decompress, data, output_chunk_size
+                    )
+                    data = decompressor.unconsumed_tail
+                    if output:
+                        yield output
+
+            tail = decompressor.flush()
+            if tail:
+                yield tail
+            finished = decompressor.eof
+
+        elif algorithm == "brotli":
+            decompressor = brotli.Decompressor()
+            async for chunk in chunks:
+                output = await asyncio.to_thread(decompressor.process, chunk)
+                if output:
+                    yield output
+            finished = decompressor.is_finished()
+
+        else:
+            raise StorageException(
+                message=f"Unsupported compression algorithm: {algorithm}",
+                error_code="UNSUPPORTED_COMPRESSION",
+                details={"algorithm": algorithm}
+            )
+
+    except (zlib.error, brotli.error) as e:
+        raise StorageException(
+            message=f"Failed to decompress file: {e}",
+            error_code="DECOMPRESSION_FAILED",
+            details={"algorithm": algorithm}
+        )
+
+    if not finished:
+        raise StorageException(
+            message="Compressed data is truncated",
+            error_code="DECOMPRESSION_FAILED",
+            details={"algorithm": algorithm}
+        )
@@ -0,0 +1,113 @@
+"""
+SendfileResponse - отдача файла (или диапазона) локального хранилища без копирования.
+
+Если ASGI сервер объявляет расширение http.response.zerocopysend
+(app.core.zerocopy_http), данные передаются ядром через os.sendfile.
+Иначе (другой сервер, TestClient) - fallback на чтение os.pread блоками
+в disk I/O executor.
+
+Используется для полного файла и одиночного Range; multipart/byteranges
+и S3 остаются на генераторах StreamingResponse.
+"""
+
+import os
+from pathlib import Path
+from typing import Mapping, Optional
+
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.io_executor import run_io
+from app.core.zerocopy_http import ZEROCOPY_EXTENSION
+
+
+class SendfileResponse(Response):
+    """
+    Ответ с содержимым файла [offset, offset + length).
+
+    Content-Length выставляется автоматически; Content-Range для 206
+    передаётся вызывающей стороной в headers.
+    """
+
+    chunk_size = 1024 * 1024
+
+    def __init__(
+        self,
+        path: Path,
+        offset: int = 0,
+        length: Optional[int] = None,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+    ):
+        """
+        Args:
+            path: Абсолютный путь к файлу
+            offset: Смещение первого байта
+            length: Количество байт (None - до конца файла)
+            status_code: 200 для полного файла, 206 для диапазона
+            headers: Дополнительные заголовки
+            media_type: Content-Type
+            background: Background task после отправки
+        """
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = background
+        self.init_headers(headers)
+        if length is not None:
+            self.headers["content-length"] = str(length)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Открытие до http.response.start: ошибка FS ещё может стать 404/500
+        file = await run_io(open, self.path, "rb")
+        try:
+            if self.length is None:
+                self.length = (await run_io(os.fstat, file.fileno())).st_size - self.offset
+                self.headers["content-length"] = str(self.length)
+
+            await send({
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            })
+
+            if scope.get("method") == "HEAD":
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+            elif ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+                await send({
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": file,
+                    "offset": self.offset,
+                    "count": self.length,
+                    "more_body": False,
+                })
+            else:
+                await self._send_chunks(file, send)
+        finally:
+            await run_io(file.close)
+
+        if self.background is not None:
+            await self.background()
+
+    async def _send_chunks(self, file, send: Send) -> None:
+        """Fallback без sendfile: pread блоками в disk I/O executor."""
+        position = self.offset
+        remaining = self.length
+        fd = file.fileno()
+
+        while remaining > 0:
+            chunk = await run_io(os.pread, fd, min(self.chunk_size, remaining), position)
+            if not chunk:
+                # Файл укоротился после расчёта Content-Length
+                raise RuntimeError(f"Unexpected end of file: {self.path}")
+            position += len(chunk)
+            remaining -= len(chunk)
+            await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+
+        if self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
@@ -0,0 +1,98 @@
+"""
+Benchmark загрузки мелких файлов (1-64 KB): files/sec до и после single commit.
+
+Сравнивает FileService.create_file в двух режимах WAL:
+- separate: PENDING запись WAL, метаданные и COMMITTED - три commit на файл
+- single (DB_WAL_SINGLE_COMMIT): намерение в локальном журнале с group fsync,
+  метаданные и WAL одним commit
+
+Нагрузка: FILES_PER_RUN файлов случайного размера 1-64 KB, CONCURRENCY
+параллельных загрузок, каждая со своей сессией (как запросы API).
+
+Требования:
+- PostgreSQL с применёнными миграциями (tests/integration/conftest.py)
+
+Run:
+    pytest tests/integration/test_small_file_upload_benchmark.py -m slow -s
+"""
+
+import asyncio
+import io
+import os
+import random
+import time
+
+import pytest
+from sqlalchemy import delete
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.file_metadata import FileMetadata
+from app.models.wal import WALTransaction
+from app.services.file_service import FileService
+from app.services.intent_journal import close_intent_journal
+from app.services.storage_service import LocalStorageService
+
+KB = 1024
+FILES_PER_RUN = 500
+CONCURRENCY = 16
+
+
+async def _upload_batch(storage: LocalStorageService, sizes: list[int]) -> tuple[list, float]:
+    """Загрузить файлы заданных размеров; возвращает (file_ids, секунды)."""
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def upload(size: int):
+        async with semaphore:
+            async with AsyncSessionLocal() as db:
+                return await FileService(db=db, storage=storage).create_file(
+                    file_data=io.BytesIO(os.urandom(size)),
+                    original_filename="benchmark.bin",
+                    content_type="application/octet-stream",
+                    user_id="benchmark",
+                    username="benchmark",
+                )
+
+    started = time.perf_counter()
+    file_ids = await asyncio.gather(*(upload(size) for size in sizes))
+    return file_ids, time.perf_counter() - started
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_small_file_upload_throughput(tmp_path, monkeypatch):
+    """files/sec для separate и single commit режимов на одинаковой нагрузке."""
+    storage_path = tmp_path / "storage"
+    storage_path.mkdir()
+    monkeypatch.setattr(settings.storage.local, "base_path", storage_path)
+    monkeypatch.setattr(settings.storage, "dedup_enabled", False)
+    monkeypatch.setattr(settings, "wal_dir", tmp_path / "wal")
+    storage = LocalStorageService(base_path=storage_path)
+
+    rng = random.Random(42)
+    sizes = [rng.randint(1 * KB, 64 * KB) for _ in range(FILES_PER_RUN)]
+
+    results = {}
+    created = []
+    try:
+        for mode, single_commit in (("separate", False), ("single", True)):
+            monkeypatch.setattr(settings.database, "wal_single_commit", single_commit)
+            file_ids, elapsed = await _upload_batch(storage, sizes)
+            created.extend(file_ids)
+            results[mode] = FILES_PER_RUN / elapsed
+    finally:
+        close_intent_journal()
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(FileMetadata).where(FileMetadata.file_id.in_(created)))
+            await db.execute(delete(WALTransaction).where(WALTransaction.file_id.in_(created)))
+            await db.commit()
+
+    print(
+        f"\nSmall-file uploads ({FILES_PER_RUN} files, 1-64 KB, concurrency {CONCURRENCY}):\n"
+        f"  separate commits: {results['separate']:8.1f} files/sec\n"
+        f"  single commit:    {results['single']:8.1f} files/sec\n"
+        f"  speedup:          {results['single'] / results['separate']:8.2f}x"
+    )
+
+    assert len(created) == 2 * FILES_PER_RUN
@@ -11,9 +11,11 @@ Unit tests для app/utils/attr_utils.py
 """
 
 import json
+import os
 import pytest
 from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 from uuid import UUID, uuid4
 
 from app.utils.attr_utils import (
@@ -312,6 +314,33 @@ class TestWriteAttrFile:
         # Файл не должен быть создан
         assert not attr_path.exists()
 
+    @pytest.mark.asyncio
+    async def test_write_rename_failure_closes_fd_once(self, temp_storage_dir):
+        """Ошибка rename: временный файл удаляется, descriptor закрывается один раз"""
+        attr_path = temp_storage_dir / "test.pdf.attr.json"
+        attrs = FileAttributes(
+            file_id=uuid4(),
+            original_filename="test.pdf",
+            storage_filename="test_user_20250111T120000_abc123.pdf",
+            file_size=1024,
+            content_type="application/pdf",
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
+            created_by_id="user123",
+            created_by_username="testuser",
+            storage_path="2025/01/11/12/test.pdf",
+            checksum="a" * 64
+        )
+
+        with patch("app.utils.attr_utils.os.replace", side_effect=OSError("rename failed")), \
+                patch("app.utils.attr_utils.os.close", wraps=os.close) as close:
+            with pytest.raises(OSError, match="rename failed"):
+                await write_attr_file(attr_path, attrs)
+
+        close.assert_called_once()
+        assert not attr_path.exists()
+        assert list(temp_storage_dir.glob(".tmp_attr_*")) == []
+
 
 # ==========================================
 # Test read_attr_file
@@ -0,0 +1,182 @@
+"""
+Unit tests для content-addressed дедупликации
+
+Тестируемые компоненты:
+- blob_relative_path(): путь blob по SHA-256
+- LocalStorageService.move_file(): перенос без копирования
+- FileService._store_blob(): новый blob, дубликат, staged import, ссылка на blob
+- BlobService.release(): удаление строки blob только с последней ссылкой
+- BlobService.purge(): удаление данных blob после commit
+
+Счётчики ссылок (PostgreSQL upsert) заменены in-memory stand-in.
+"""
+
+import hashlib
+import io
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.exceptions import StorageException
+from app.models.storage_blob import StorageBlob
+from app.services import file_service as file_service_module
+from app.services.blob_service import BlobService, blob_relative_path
+from app.services.file_service import FileService
+from app.services.storage_service import LocalStorageService
+from app.services.upload_staging_service import StagedFile
+
+CONTENT = b"template scan " * 1000
+CHECKSUM = hashlib.sha256(CONTENT).hexdigest()
+
+
+class FakeBlobService:
+    """In-memory счётчики ссылок с API BlobService."""
+
+    refs: dict[str, list] = {}
+
+    def __init__(self, db, storage=None):
+        pass
+
+    async def acquire(self, checksum, file_size):
+        entry = self.refs.setdefault(checksum, [blob_relative_path(checksum), file_size, 0])
+        entry[2] += 1
+        return entry[0], entry[2]
+
+    async def link(self, checksum, file_size):
+        if checksum not in self.refs:
+            raise StorageException("Blob not found", error_code="BLOB_NOT_FOUND")
+        self.refs[checksum][2] += 1
+        return self.refs[checksum][0]
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorageService(base_path=tmp_path)
+
+
+@pytest.fixture
+def file_service(storage, monkeypatch):
+    FakeBlobService.refs = {}
+    monkeypatch.setattr(file_service_module, "BlobService", FakeBlobService)
+    return FileService(db=MagicMock(), storage=storage)
+
+
+def test_blob_relative_path():
+    assert blob_relative_path(CHECKSUM) == f".blobs/{CHECKSUM[:2]}/{CHECKSUM[2:4]}/{CHECKSUM}"
+
+
+@pytest.mark.asyncio
+class TestStoreBlob:
+    """Тесты content-addressed записи содержимого"""
+
+    async def test_move_file(self, storage):
+        await storage.write_file("2026/a.bin", io.BytesIO(CONTENT))
+
+        await storage.move_file("2026/a.bin", "x/y/b.bin")
+
+        assert not await storage.file_exists("2026/a.bin")
+        assert (storage.base_path / "x/y/b.bin").read_bytes() == CONTENT
+
+    async def test_duplicate_upload_shares_blob(self, file_service, storage):
+        first = await file_service._store_blob("2026/01/first.bin", io.BytesIO(CONTENT), None, None, None)
+        second = await file_service._store_blob("2026/01/second.bin", io.BytesIO(CONTENT), None, None, None)
+
+        blob_path = blob_relative_path(CHECKSUM)
+        assert first == (len(CONTENT), CHECKSUM, blob_path, True)
+        assert second == (len(CONTENT), CHECKSUM, blob_path, False)
+        # Одна физическая копия, временные размещения убраны
+        assert (storage.base_path / blob_path).read_bytes() == CONTENT
+        assert not await storage.file_exists("2026/01/first.bin")
+        assert not await storage.file_exists("2026/01/second.bin")
+        assert FakeBlobService.refs[CHECKSUM][2] == 2
+
+    async def test_staged_file_skips_import_of_existing_blob(self, file_service, storage, tmp_path):
+        await file_service._store_blob("a.bin", io.BytesIO(CONTENT), None, None, None)
+        staged_path = tmp_path / "staged.bin"
+        staged_path.write_bytes(CONTENT)
+
+        result = await file_service._store_blob(
+            "b.bin", None, StagedFile(upload_id="u1", path=staged_path, file_size=len(CONTENT), checksum=CHECKSUM), None, None
+        )
+
+        assert result[2:] == (blob_relative_path(CHECKSUM), False)
+        # Staging файл не тронут: его удалит очистка staging области
+        assert staged_path.exists()
+
+    async def test_link_existing_blob(self, file_service, storage):
+        await file_service._store_blob("a.bin", io.BytesIO(CONTENT), None, None, None)
+
+        result = await file_service._store_blob("b.bin", None, None, CHECKSUM, len(CONTENT))
+
+        assert result == (len(CONTENT), CHECKSUM, blob_relative_path(CHECKSUM), False)
+        assert FakeBlobService.refs[CHECKSUM][2] == 2
+
+    async def test_link_missing_blob(self, file_service):
+        with pytest.raises(StorageException) as exc_info:
+            await file_service._store_blob("b.bin", None, None, CHECKSUM, len(CONTENT))
+
+        assert exc_info.value.error_code == "BLOB_NOT_FOUND"
+
+
+def _locked_blob_db(blob: StorageBlob) -> MagicMock:
+    """Session stand-in: SELECT ... FOR UPDATE возвращает blob."""
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = blob
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=result)
+    db.delete = AsyncMock()
+    db.flush = AsyncMock()
+    return db
+
+
+@pytest.mark.asyncio
+class TestBlobRelease:
+    """Тесты уменьшения счётчика ссылок"""
+
+    async def test_release_keeps_shared_blob(self, storage):
+        await storage.write_file(blob_relative_path(CHECKSUM), io.BytesIO(CONTENT))
+        blob = StorageBlob(checksum=CHECKSUM, blob_path=blob_relative_path(CHECKSUM), file_size=len(CONTENT), ref_count=2)
+        db = _locked_blob_db(blob)
+
+        deleted = await BlobService(db, storage).release(CHECKSUM)
+
+        assert deleted is False
+        assert blob.ref_count == 1
+        db.delete.assert_not_called()
+        assert await storage.file_exists(blob.blob_path)
+
+    async def test_release_last_reference_keeps_data_until_purge(self, storage):
+        await storage.write_file(blob_relative_path(CHECKSUM), io.BytesIO(CONTENT))
+        blob = StorageBlob(checksum=CHECKSUM, blob_path=blob_relative_path(CHECKSUM), file_size=len(CONTENT), ref_count=1)
+        db = _locked_blob_db(blob)
+
+        deleted = await BlobService(db, storage).release(CHECKSUM)
+
+        assert deleted is True
+        db.delete.assert_awaited_once_with(blob)
+        db.flush.assert_awaited_once()
+        # Данные удаляются только после commit вызывающего (purge)
+        assert await storage.file_exists(blob.blob_path)
+
+    async def test_purge_deletes_data(self, storage):
+        await storage.write_file(blob_relative_path(CHECKSUM), io.BytesIO(CONTENT))
+        db = _locked_blob_db(None)
+        db.rollback = AsyncMock()
+
+        purged = await BlobService(db, storage).purge(CHECKSUM, blob_relative_path(CHECKSUM))
+
+        assert purged is True
+        assert not await storage.file_exists(blob_relative_path(CHECKSUM))
+        db.rollback.assert_awaited_once()
+
+    async def test_purge_keeps_recreated_blob(self, storage):
+        await storage.write_file(blob_relative_path(CHECKSUM), io.BytesIO(CONTENT))
+        blob = StorageBlob(checksum=CHECKSUM, blob_path=blob_relative_path(CHECKSUM), file_size=len(CONTENT), ref_count=1)
+        db = _locked_blob_db(blob)
+        db.rollback = AsyncMock()
+
+        purged = await BlobService(db, storage).purge(CHECKSUM, blob.blob_path)
+
+        assert purged is False
+        assert await storage.file_exists(blob.blob_path)
+        db.rollback.assert_awaited_once()
@@ -0,0 +1,204 @@
+"""
+Unit tests для app/utils/compression_utils.py
+
+Тестируемые компоненты:
+- validate_compression_algorithm(): проверка алгоритма сжатия
+- accepts_encoding(): разбор Accept-Encoding с q-values
+- decompress_stream(): потоковая распаковка gzip/brotli
+- FileAttributes: поля сжатия в attr.json
+- upload_file(): compressed без compression_algorithm отклоняется
+"""
+
+import gzip
+import os
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import brotli
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints.files import upload_file
+from app.core.config import StorageMode
+from app.core.exceptions import StorageException
+from app.utils.attr_utils import FileAttributes
+from app.utils.compression_utils import (
+    accepts_encoding,
+    decompress_stream,
+    validate_compression_algorithm,
+)
+
+CONTENT = b"Storage Element compressed archive line\n" * 5000
+
+
+async def _chunks(data: bytes, size: int):
+    """Поток блоков как из storage.read_file()."""
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+async def _collect(stream) -> list[bytes]:
+    return [chunk async for chunk in stream]
+
+
+# ==========================================
+# Test validate_compression_algorithm
+# ==========================================
+
+class TestValidateCompressionAlgorithm:
+    """Тесты для validate_compression_algorithm()"""
+
+    def test_supported(self):
+        assert validate_compression_algorithm("gzip") == "gzip"
+        assert validate_compression_algorithm(" Brotli ") == "brotli"
+
+    def test_none(self):
+        assert validate_compression_algorithm(None) is None
+
+    def test_unsupported(self):
+        with pytest.raises(StorageException) as exc_info:
+            validate_compression_algorithm("lzma")
+        assert exc_info.value.error_code == "UNSUPPORTED_COMPRESSION"
+
+
+# ==========================================
+# Test accepts_encoding
+# ==========================================
+
+class TestAcceptsEncoding:
+    """Тесты для accepts_encoding()"""
+
+    @pytest.mark.parametrize("header,algorithm,expected", [
+        ("gzip, deflate", "gzip", True),
+        ("gzip, deflate, br", "brotli", True),
+        ("gzip, deflate", "brotli", False),
+        ("GZIP;q=0.5", "gzip", True),
+        ("gzip;q=0", "gzip", False),
+        ("*", "brotli", True),
+        ("gzip;q=0, *", "gzip", False),
+        ("br;q=0, *;q=0.1", "gzip", True),
+        ("identity", "gzip", False),
+        ("", "gzip", False),
+        (None, "gzip", False),
+    ])
+    def test_accepts_encoding(self, header, algorithm, expected):
+        assert accepts_encoding(header, algorithm) is expected
+
+    def test_unknown_algorithm(self):
+        assert accepts_encoding("*", "zstd") is False
+
+
+# ==========================================
+# Test decompress_stream
+# ==========================================
+
+@pytest.mark.asyncio
+class TestDecompressStream:
+    """Тесты для decompress_stream()"""
+
+    async def test_gzip(self):
+        compressed = gzip.compress(CONTENT)
+        chunks = await _collect(decompress_stream(_chunks(compressed, 1000), "gzip"))
+        assert b"".join(chunks) == CONTENT
+
+    async def test_gzip_output_chunk_bounded(self):
+        """Распакованные блоки не превышают output_chunk_size."""
+        compressed = gzip.compress(CONTENT)
+        chunks = await _collect(
+            decompress_stream(_chunks(compressed, len(compressed)), "gzip", output_chunk_size=4096)
+        )
+        assert all(len(chunk) <= 4096 for chunk in chunks)
+        assert b"".join(chunks) == CONTENT
+
+    async def test_brotli(self):
+        compressed = brotli.compress(CONTENT)
+        chunks = await _collect(decompress_stream(_chunks(compressed, 777), "brotli"))
+        assert b"".join(chunks) == CONTENT
+
+    async def test_truncated_data(self):
+        compressed = gzip.compress(CONTENT)
+        with pytest.raises(StorageException) as exc_info:
+            await _collect(decompress_stream(_chunks(compressed[:-20], 1000), "gzip"))
+        assert exc_info.value.error_code == "DECOMPRESSION_FAILED"
+
+    async def test_corrupted_data(self):
+        with pytest.raises(StorageException) as exc_info:
+            await _collect(decompress_stream(_chunks(os.urandom(2048), 512), "brotli"))
+        assert exc_info.value.error_code == "DECOMPRESSION_FAILED"
+
+
+# ==========================================
+# Test FileAttributes compression fields
+# ==========================================
+
+class TestFileAttributesCompression:
+    """Поля сжатия в attr.json"""
+
+    def _attributes(self, **kwargs) -> FileAttributes:
+        now = datetime.now(timezone.utc)
+        return FileAttributes(
+            file_id=uuid4(),
+            original_filename="archive.txt",
+            storage_filename="archive_user_20260101T000000_uuid.txt",
+            file_size=1000,
+            content_type="text/plain",
+            created_at=now,
+            updated_at=now,
+            created_by_id="user-1",
+            created_by_username="user",
+            storage_path="2026/01/01/00/",
+            checksum="a" * 64,
+            **kwargs
+        )
+
+    def test_defaults_uncompressed(self):
+        attrs = self._attributes()
+        assert attrs.compressed is False
+        assert attrs.compression_algorithm is None
+        assert attrs.original_size is None
+        assert attrs.compression_ratio is None
+
+    def test_compressed_roundtrip(self):
+        attrs = self._attributes(
+            compressed=True,
+            compression_algorithm="brotli",
+            original_size=8000,
+            compression_ratio=8.0,
+        )
+        restored = FileAttributes.model_validate_json(attrs.model_dump_json())
+        assert restored.compressed is True
+        assert restored.compression_algorithm == "brotli"
+        assert restored.original_size == 8000
+        assert restored.compression_ratio == 8.0
+
+
+# ==========================================
+# upload_file: параметры сжатия
+# ==========================================
+
+@pytest.mark.asyncio
+class TestUploadCompressionParams:
+    """Тесты параметров сжатия при загрузке файла"""
+
+    async def test_compressed_without_algorithm_rejected(self):
+        with patch("app.api.v1.endpoints.files.settings") as mock_settings, \
+                patch("app.api.v1.endpoints.files.FileService") as file_service:
+            mock_settings.app.mode = StorageMode.EDIT
+            with pytest.raises(HTTPException) as exc_info:
+                await upload_file(
+                    file=MagicMock(),
+                    description=None,
+                    version=None,
+                    file_id=None,
+                    finalize_transaction_id=None,
+                    retention_policy=None,
+                    compressed=True,
+                    compression_algorithm=None,
+                    original_size=len(CONTENT),
+                    db=AsyncMock(),
+                    user=MagicMock()
+                )
+
+        assert exc_info.value.status_code == 400
+        file_service.assert_not_called()
@@ -0,0 +1,140 @@
+"""
+Unit tests для подписанных токенов скачивания (redirect из Query Module)
+
+Тестируемые компоненты:
+- verify_download_token(): подпись, срок, file_id, диапазон
+- get_download_access(): токен без JWT, JWT без токена, отсутствие ключа
+- _slice_stream(): диапазон потока для S3 и распаковки на лету
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.deps.auth import get_download_access
+from app.api.v1.endpoints.files import _slice_stream
+from app.core.config import settings
+from app.core.download_token import verify_download_token
+from app.core.exceptions import StorageException
+
+SIGNING_KEY = "test-signing-key"
+NOW = 1_700_000_000
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _sign(file_id: str, expires_at: int = NOW + 60, byte_range=None, key: str = SIGNING_KEY) -> str:
+    """Токен в формате Query Module (app/core/download_token.py)."""
+    payload = _b64(json.dumps(
+        {"fid": file_id, "exp": expires_at, "rng": list(byte_range) if byte_range else None},
+        separators=(",", ":"),
+    ).encode())
+    signature = hmac.new(key.encode(), payload.encode(), hashlib.sha256).digest()
+    return f"{payload}.{_b64(signature)}"
+
+
+class TestVerifyDownloadToken:
+    """Тесты проверки токена"""
+
+    def test_valid_token(self):
+        file_id = str(uuid4())
+
+        grant = verify_download_token(_sign(file_id), file_id, SIGNING_KEY, now=NOW)
+
+        assert grant.file_id == file_id
+        assert grant.byte_range is None
+        assert grant.range_header() is None
+
+    def test_range_is_preserved(self):
+        file_id = str(uuid4())
+
+        grant = verify_download_token(_sign(file_id, byte_range=(100, None)), file_id, SIGNING_KEY, now=NOW)
+
+        assert grant.byte_range == (100, None)
+        assert grant.range_header() == "bytes=100-"
+
+    @pytest.mark.parametrize(
+        "token_kwargs, reason",
+        [
+            ({"expires_at": NOW - 1}, "expired"),
+            ({"key": "other-key"}, "signature"),
+        ],
+    )
+    def test_rejected_token(self, token_kwargs, reason):
+        file_id = str(uuid4())
+
+        with pytest.raises(StorageException) as exc_info:
+            verify_download_token(_sign(file_id, **token_kwargs), file_id, SIGNING_KEY, now=NOW)
+
+        assert exc_info.value.error_code == "INVALID_DOWNLOAD_TOKEN"
+        assert exc_info.value.details["reason"] == reason
+
+    def test_token_is_scoped_to_file(self):
+        with pytest.raises(StorageException) as exc_info:
+            verify_download_token(_sign(str(uuid4())), str(uuid4()), SIGNING_KEY, now=NOW)
+
+        assert exc_info.value.details["reason"] == "file_id"
+
+    def test_malformed_token(self):
+        with pytest.raises(StorageException) as exc_info:
+            verify_download_token("not-a-token", str(uuid4()), SIGNING_KEY, now=NOW)
+
+        assert exc_info.value.details["reason"] == "malformed"
+
+
+@pytest.mark.asyncio
+class TestGetDownloadAccess:
+    """Тесты dependency доступа к скачиванию"""
+
+    async def test_token_grants_access_without_jwt(self, monkeypatch):
+        monkeypatch.setattr(settings.jwt, "download_signing_key", SIGNING_KEY)
+        file_id = uuid4()
+
+        access = await get_download_access(file_id=file_id, credentials=None, token=_sign(str(file_id), expires_at=2**40))
+
+        assert access.user is None
+        assert access.grant.file_id == str(file_id)
+
+    async def test_invalid_token_is_rejected(self, monkeypatch):
+        monkeypatch.setattr(settings.jwt, "download_signing_key", SIGNING_KEY)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_download_access(file_id=uuid4(), credentials=None, token=_sign(str(uuid4()), expires_at=2**40))
+
+        assert exc_info.value.status_code == 401
+
+    async def test_token_ignored_without_signing_key(self, monkeypatch):
+        monkeypatch.setattr(settings.jwt, "download_signing_key", None)
+        file_id = uuid4()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_download_access(file_id=file_id, credentials=None, token=_sign(str(file_id), expires_at=2**40))
+
+        assert exc_info.value.status_code == 401
+
+
+@pytest.mark.asyncio
+class TestSliceStream:
+    """Тесты диапазона потока"""
+
+    @staticmethod
+    async def _chunks():
+        for chunk in (b"0123", b"4567", b"89ab"):
+            yield chunk
+
+    async def test_slice_across_chunks(self):
+        result = b"".join([chunk async for chunk in _slice_stream(self._chunks(), 3, 6)])
+
+        assert result == b"345678"
+
+    async def test_slice_to_end(self):
+        result = b"".join([chunk async for chunk in _slice_stream(self._chunks(), 10, 2)])
+
+        assert result == b"ab"
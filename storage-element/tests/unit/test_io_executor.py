@@ -0,0 +1,133 @@
+"""
+Unit tests для app/core/io_executor.py
+
+Тестируемые компоненты:
+- DiskIOExecutor.run(): результат и исключения блокирующей функции
+- queue_depth / active: учёт очереди и выполняющихся операций
+- backpressure: ограничение очереди max_queue_size
+- отмена вызывающей корутины: учёт очереди и слот до завершения операции
+- LocalStorageService.write_file(): медленный fsync не блокирует event loop
+"""
+
+import asyncio
+import io
+import os
+import threading
+import time
+
+import pytest
+
+from app.core.io_executor import DiskIOExecutor
+from app.services.storage_service import LocalStorageService
+
+
+@pytest.fixture
+def executor():
+    executor = DiskIOExecutor(max_workers=1, max_queue_size=2)
+    yield executor
+    executor.shutdown()
+
+
+async def _wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+class TestDiskIOExecutor:
+    """Тесты DiskIOExecutor"""
+
+    async def test_run_returns_result(self, executor):
+        assert await executor.run(sum, [1, 2, 3]) == 6
+
+    async def test_run_propagates_exception(self, executor):
+        with pytest.raises(FileNotFoundError):
+            await executor.run(open, "/nonexistent/file", "rb")
+        assert executor.active == 0
+
+    async def test_queue_depth_and_backpressure(self, executor):
+        release = threading.Event()
+
+        tasks = [asyncio.create_task(executor.run(release.wait)) for _ in range(4)]
+        await _wait_for(lambda: executor.active == 1 and executor.queue_depth == 2)
+
+        # 4-я операция ждёт в event loop (очередь executor ограничена)
+        assert executor.active + executor.queue_depth == 3
+
+        release.set()
+        await asyncio.gather(*tasks)
+        await _wait_for(lambda: executor.active == 0 and executor.queue_depth == 0)
+
+    async def test_cancelled_queued_operation_leaves_queue(self, executor):
+        release = threading.Event()
+        running = asyncio.create_task(executor.run(release.wait))
+        queued = asyncio.create_task(executor.run(release.wait))
+        await _wait_for(lambda: executor.active == 1 and executor.queue_depth == 1)
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        await _wait_for(lambda: executor.queue_depth == 0)
+
+        release.set()
+        await running
+        await _wait_for(lambda: executor.active == 0)
+
+    async def test_cancelled_running_operation_keeps_slot(self):
+        executor = DiskIOExecutor(max_workers=1, max_queue_size=0)
+        release = threading.Event()
+        try:
+            running = asyncio.create_task(executor.run(release.wait))
+            await _wait_for(lambda: executor.active == 1)
+
+            running.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await running
+
+            # Поток ещё занят: следующая операция ждёт слот
+            waiting = asyncio.create_task(executor.run(sum, [1, 2]))
+            await asyncio.sleep(0.05)
+            assert not waiting.done()
+            assert executor.active == 1
+
+            release.set()
+            assert await waiting == 3
+            await _wait_for(lambda: executor.active == 0 and executor.queue_depth == 0)
+        finally:
+            release.set()
+            executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_slow_fsync_does_not_block_event_loop(tmp_path, monkeypatch):
+    """Event loop остаётся отзывчивым, пока write_file ждёт медленный fsync."""
+    real_fsync = os.fsync
+
+    def slow_fsync(fd):
+        time.sleep(0.3)
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", slow_fsync)
+    storage = LocalStorageService(base_path=tmp_path)
+
+    max_lag = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal max_lag
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            max_lag = max(max_lag, time.perf_counter() - started - 0.01)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.gather(*(
+        storage.write_file(f"2026/01/01/00/file{i}.bin", io.BytesIO(os.urandom(1024)))
+        for i in range(4)
+    ))
+    done.set()
+    await ticker_task
+
+    assert max_lag < 0.1
@@ -0,0 +1,115 @@
+"""
+Unit tests для keyset (cursor) пагинации списка файлов
+
+Тестируемые компоненты:
+- encode_cursor()/decode_cursor(): round-trip и повреждённые токены
+- keyset_condition(): row comparison (created_at, file_id)
+- estimate_count(): оценка планировщика через EXPLAIN
+- list_files(): валидация cursor до обращения к БД
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.endpoints.files import list_files
+from app.models.file_metadata import FileMetadata
+from app.utils.pagination import decode_cursor, encode_cursor, estimate_count, keyset_condition
+
+
+def _mock_db(plan) -> MagicMock:
+    """AsyncSession mock: begin_nested() + execute() с результатом EXPLAIN."""
+    db = MagicMock()
+
+    @asynccontextmanager
+    async def begin_nested():
+        yield
+
+    db.begin_nested = begin_nested
+    result = MagicMock()
+    result.scalar.return_value = plan
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+class TestCursor:
+    """Tests для курсора продолжения"""
+
+    def test_round_trip(self):
+        created_at = datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+        file_id = uuid4()
+
+        cursor = encode_cursor("created_at", created_at, file_id)
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor, "created_at", UUID) == (created_at, file_id)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "W10", encode_cursor("created_at", datetime.now(), "x")])
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, "created_at", UUID)
+
+    def test_keyset_condition_is_row_comparison(self):
+        condition = keyset_condition(
+            FileMetadata.created_at, FileMetadata.file_id, datetime.now(timezone.utc), uuid4()
+        )
+
+        sql = str(condition.compile(dialect=postgresql.dialect()))
+
+        assert sql.startswith("(")
+        assert ") < (" in sql
+
+
+@pytest.mark.asyncio
+class TestEstimateCount:
+    """Tests для оценки количества строк"""
+
+    async def test_reads_plan_rows(self):
+        db = _mock_db('[{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 12345}}]')
+
+        assert await estimate_count(db, select(FileMetadata.file_id)) == 12345
+
+        explain = str(db.execute.await_args.args[0])
+        assert explain.startswith("EXPLAIN (FORMAT JSON) SELECT")
+
+    async def test_filter_values_are_bind_params(self):
+        db = _mock_db([{"Plan": {"Plan Rows": 7}}])
+        created_at = datetime(2026, 1, 1, 12, 30, 45)
+        query = select(FileMetadata.file_id).where(
+            keyset_condition(FileMetadata.created_at, FileMetadata.file_id, created_at, uuid4())
+        )
+
+        assert await estimate_count(db, query) == 7
+
+        compiled = db.execute.await_args.args[0].compile(dialect=postgresql.asyncpg.dialect())
+        assert str(compiled).startswith("EXPLAIN (FORMAT JSON) SELECT")
+        assert "12:30:45" not in str(compiled)
+        assert created_at in compiled.params.values()
+
+
+@pytest.mark.asyncio
+class TestListFilesCursorValidation:
+    """Tests для валидации cursor в GET /api/v1/files"""
+
+    async def test_invalid_cursor_returns_400(self):
+        db = AsyncMock()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await list_files(cursor="garbage", user=MagicMock(), db=db)
+
+        assert exc_info.value.status_code == 400
+        db.execute.assert_not_awaited()
+
+    async def test_cursor_with_skip_returns_400(self):
+        cursor = encode_cursor("created_at", datetime.now(timezone.utc), uuid4())
+
+        with pytest.raises(HTTPException) as exc_info:
+            await list_files(skip=10, cursor=cursor, user=MagicMock(), db=AsyncMock())
+
+        assert exc_info.value.status_code == 400
@@ -0,0 +1,101 @@
+"""
+Unit tests для app/core/s3_client.py
+
+Тестируемые компоненты:
+- get_s3_client(): singleton, переиспользование HTTP соединений
+- shared_s3_client(): не закрывает клиент при выходе из блока
+- storage_s3_operation_duration_seconds: латентность по операциям и статусу
+- close_s3_client(): пересоздание клиента после закрытия
+
+S3 endpoint заменён локальным aiohttp сервером.
+"""
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from botocore.exceptions import ClientError
+from prometheus_client import REGISTRY
+
+from app.core import s3_client as s3_client_module
+from app.core.config import settings
+from app.core.s3_client import close_s3_client, get_s3_client, shared_s3_client
+
+
+def _observations(operation: str, status: str) -> float:
+    """Количество наблюдений histogram для операции и статуса."""
+    return REGISTRY.get_sample_value(
+        "storage_s3_operation_duration_seconds_count",
+        {
+            "storage_element_id": settings.storage.element_id,
+            "operation": operation,
+            "status": status,
+        },
+    ) or 0
+
+
+@pytest_asyncio.fixture
+async def s3_endpoint(monkeypatch):
+    """Минимальный S3 endpoint: HEAD bucket → 200, остальное → 404."""
+    connections = set()
+
+    async def handler(request: web.Request) -> web.Response:
+        connections.add(request.transport.get_extra_info("peername"))
+        if request.method == "HEAD" and request.path == "/test-bucket":
+            return web.Response(status=200, headers={"Content-Length": "0"})
+        return web.Response(status=404)
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    monkeypatch.setattr(settings.storage.s3, "endpoint_url", f"http://127.0.0.1:{port}")
+    monkeypatch.setattr(settings.storage.s3, "max_retry_attempts", 0)
+    await close_s3_client()
+
+    yield connections
+
+    await close_s3_client()
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+class TestSharedS3Client:
+    """Тесты shared S3 клиента"""
+
+    async def test_singleton(self, s3_endpoint):
+        first = await get_s3_client()
+        second = await get_s3_client()
+        assert first is second
+
+    async def test_connection_reused_between_operations(self, s3_endpoint):
+        for _ in range(5):
+            async with shared_s3_client() as client:
+                await client.head_bucket(Bucket="test-bucket")
+
+        # Все запросы через одно keep-alive соединение пула
+        assert len(s3_endpoint) == 1
+        assert s3_client_module._s3_client is not None
+
+    async def test_operation_latency_metrics(self, s3_endpoint):
+        success_before = _observations("HeadBucket", "success")
+        error_before = _observations("HeadObject", "error")
+
+        client = await get_s3_client()
+        await client.head_bucket(Bucket="test-bucket")
+        with pytest.raises(ClientError):
+            await client.head_object(Bucket="test-bucket", Key="missing")
+
+        assert _observations("HeadBucket", "success") == success_before + 1
+        assert _observations("HeadObject", "error") == error_before + 1
+
+    async def test_close_and_recreate(self, s3_endpoint):
+        first = await get_s3_client()
+        await close_s3_client()
+        assert s3_client_module._s3_client is None
+
+        second = await get_s3_client()
+        assert second is not first
@@ -0,0 +1,160 @@
+"""
+Unit tests для streaming multipart upload в S3StorageService.write_file()
+
+Тестируемые компоненты:
+- put_object для файлов меньше multipart_threshold
+- multipart upload: размеры частей, порядок, итоговый SHA-256
+- ограничение окна одновременно загружаемых частей
+- abort multipart upload при ошибке части и несовпадении размера
+- original_size в Metadata и checksum тегом у multipart объекта
+
+S3 заменён in-memory stand-in с API aiobotocore клиента.
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import StorageException
+from app.services.storage_service import S3StorageService
+
+PART_SIZE = 64 * 1024
+
+
+class FakeS3Client:
+    """In-memory stand-in S3 клиента (put_object + multipart API)."""
+
+    def __init__(self, fail_part: int = None):
+        self.objects: dict[str, bytes] = {}
+        self.metadata: dict[str, dict] = {}
+        self.tags: dict[str, list] = {}
+        self.upload_metadata: dict[str, dict] = {}
+        self.uploads: dict[str, dict[int, bytes]] = {}
+        self.aborted: list[str] = []
+        self.fail_part = fail_part
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def put_object(self, Bucket, Key, Body, Metadata=None):
+        self.objects[Key] = Body
+
+    async def create_multipart_upload(self, Bucket, Key, Metadata=None):
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = {}
+        self.upload_metadata[upload_id] = Metadata or {}
+        return {"UploadId": upload_id}
+
+    async def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            if PartNumber == self.fail_part:
+                raise ConnectionError("connection reset")
+            self.uploads[UploadId][PartNumber] = Body
+            return {"ETag": f'"{hashlib.md5(Body).hexdigest()}"'}
+        finally:
+            self.in_flight -= 1
+
+    async def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        numbers = [p["PartNumber"] for p in MultipartUpload["Parts"]]
+        assert numbers == sorted(numbers)
+        parts = self.uploads.pop(UploadId)
+        self.objects[Key] = b"".join(parts[n] for n in numbers)
+        self.metadata[Key] = self.upload_metadata.pop(UploadId)
+
+    async def put_object_tagging(self, Bucket, Key, Tagging):
+        self.tags[Key] = Tagging["TagSet"]
+
+    async def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId, None)
+        self.aborted.append(UploadId)
+
+
+@pytest.fixture
+def s3_settings(monkeypatch):
+    s3 = settings.storage.s3
+    monkeypatch.setattr(s3, "multipart_threshold", PART_SIZE)
+    monkeypatch.setattr(s3, "multipart_part_size", PART_SIZE)
+    monkeypatch.setattr(s3, "multipart_concurrency", 3)
+    return s3
+
+
+def _service(client: FakeS3Client) -> S3StorageService:
+    service = S3StorageService(bucket_name="test-bucket")
+    service._s3_client = lambda: client
+    return service
+
+
+@pytest.mark.asyncio
+class TestS3MultipartUpload:
+    """Тесты streaming multipart upload"""
+
+    async def test_small_file_single_put(self, s3_settings):
+        client = FakeS3Client()
+        content = os.urandom(PART_SIZE - 1)
+
+        size, checksum = await _service(client).write_file("a/small.bin", io.BytesIO(content))
+
+        assert (size, checksum) == (len(content), hashlib.sha256(content).hexdigest())
+        assert client.uploads == {}
+        assert list(client.objects.values()) == [content]
+
+    async def test_large_file_multipart(self, s3_settings):
+        client = FakeS3Client()
+        content = os.urandom(PART_SIZE * 10 + 123)
+
+        size, checksum = await _service(client).write_file(
+            "a/large.bin", io.BytesIO(content), expected_size=len(content)
+        )
+
+        key = f"{s3_settings.app_folder}/a/large.bin"
+        assert (size, checksum) == (len(content), hashlib.sha256(content).hexdigest())
+        assert client.objects[key] == content
+        assert client.metadata[key] == {"original_size": str(size)}
+        assert client.tags[key] == [{"Key": "checksum", "Value": checksum}]
+        assert 1 < client.max_in_flight <= 3
+
+    async def test_threshold_larger_than_part_size(self, s3_settings, monkeypatch):
+        monkeypatch.setattr(s3_settings, "multipart_threshold", PART_SIZE * 3 + 7)
+        client = FakeS3Client()
+        content = os.urandom(PART_SIZE * 5)
+
+        size, checksum = await _service(client).write_file("a/large.bin", io.BytesIO(content))
+
+        assert checksum == hashlib.sha256(content).hexdigest()
+        assert client.objects[f"{s3_settings.app_folder}/a/large.bin"] == content
+
+    async def test_part_failure_aborts_upload(self, s3_settings):
+        client = FakeS3Client(fail_part=4)
+        content = os.urandom(PART_SIZE * 10)
+
+        with pytest.raises(StorageException) as exc_info:
+            await _service(client).write_file("a/large.bin", io.BytesIO(content))
+
+        assert exc_info.value.error_code == "S3_WRITE_FAILED"
+        assert client.aborted == ["upload-1"]
+        assert client.objects == {}
+
+    async def test_size_mismatch_aborts_upload(self, s3_settings):
+        client = FakeS3Client()
+        content = os.urandom(PART_SIZE * 4)
+
+        with pytest.raises(StorageException) as exc_info:
+            await _service(client).write_file(
+                "a/large.bin", io.BytesIO(content), expected_size=PART_SIZE * 2
+            )
+
+        assert exc_info.value.error_code == "SIZE_MISMATCH"
+        assert client.aborted == ["upload-1"]
+        assert client.objects == {}
@@ -0,0 +1,201 @@
+"""
+Unit tests для zero-copy отдачи файлов
+
+Тестируемые компоненты:
+- SendfileResponse: полный файл, диапазон, fallback без расширения сервера
+- ZeroCopyHttpToolsProtocol: http.response.zerocopysend через os.sendfile
+  (реальный uvicorn сервер на случайном порту, asyncio и uvloop event loop)
+- Fallback на http.response.body: непроверенная версия uvicorn,
+  непустой буфер транспорта
+"""
+
+import asyncio
+import contextlib
+import os
+import socket
+
+import httpx
+import pytest
+import uvicorn
+import uvloop
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import zerocopy_http
+from app.core.zerocopy_http import ZeroCopyHttpToolsProtocol, uvicorn_supported
+from app.utils.sendfile_response import SendfileResponse
+
+CONTENT = os.urandom(3 * 1024 * 1024 + 17)
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(CONTENT)
+    return path
+
+
+def _app(path) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/full")
+    async def full():
+        return SendfileResponse(path, length=len(CONTENT), media_type="application/octet-stream")
+
+    @app.get("/range")
+    async def partial():
+        return SendfileResponse(
+            path,
+            offset=1000,
+            length=5000,
+            status_code=206,
+            headers={"Content-Range": f"bytes 1000-5999/{len(CONTENT)}"}
+        )
+
+    @app.get("/auto-length")
+    async def auto_length():
+        return SendfileResponse(path, offset=len(CONTENT) - 10)
+
+    return app
+
+
+def test_uvicorn_supported():
+    assert uvicorn_supported(uvicorn.__version__)
+    assert uvicorn_supported("0.32.0")
+    assert not uvicorn_supported("0.99.0")
+    assert not uvicorn_supported("dev")
+
+
+class TestSendfileResponseFallback:
+    """Без расширения zerocopysend (TestClient) - чтение через pread"""
+
+    def test_full_file(self, data_file):
+        response = TestClient(_app(data_file)).get("/full")
+
+        assert response.status_code == 200
+        assert response.headers["content-length"] == str(len(CONTENT))
+        assert response.content == CONTENT
+
+    def test_single_range(self, data_file):
+        response = TestClient(_app(data_file)).get("/range")
+
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 1000-5999/{len(CONTENT)}"
+        assert response.content == CONTENT[1000:6000]
+
+    def test_length_from_file_size(self, data_file):
+        response = TestClient(_app(data_file)).get("/auto-length")
+
+        assert response.headers["content-length"] == "10"
+        assert response.content == CONTENT[-10:]
+
+
+@contextlib.asynccontextmanager
+async def _serve(path):
+    """Uvicorn с ZeroCopyHttpToolsProtocol на случайном порту."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+
+    config = uvicorn.Config(
+        _app(path),
+        http=ZeroCopyHttpToolsProtocol,
+        lifespan="off",
+        log_config=None,
+        access_log=False
+    )
+    server = uvicorn.Server(config)
+    task = asyncio.create_task(server.serve(sockets=[sock]))
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        await task
+
+
+@pytest.mark.asyncio
+class TestZeroCopyProtocol:
+    """Uvicorn с ZeroCopyHttpToolsProtocol отдаёт тело через os.sendfile"""
+
+    @pytest.fixture(params=["asyncio", "uvloop"])
+    def event_loop_policy(self, request):
+        # uvicorn[standard] по умолчанию выбирает uvloop (без loop.sendfile)
+        if request.param == "uvloop":
+            return uvloop.EventLoopPolicy()
+        return asyncio.DefaultEventLoopPolicy()
+
+    @pytest.fixture
+    async def server_url(self, data_file):
+        async with _serve(data_file) as url:
+            yield url
+
+    @pytest.fixture
+    def sendfile_calls(self, monkeypatch):
+        calls = []
+        original = os.sendfile
+
+        def counting_sendfile(*args):
+            calls.append(args)
+            return original(*args)
+
+        monkeypatch.setattr(os, "sendfile", counting_sendfile)
+        return calls
+
+    async def test_full_file_zero_copy(self, server_url, sendfile_calls):
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"{server_url}/full")
+
+        assert response.status_code == 200
+        assert response.content == CONTENT
+        assert sendfile_calls
+
+    async def test_range_and_keep_alive(self, server_url, sendfile_calls):
+        async with httpx.AsyncClient() as client:
+            first = await client.get(f"{server_url}/range")
+            second = await client.get(f"{server_url}/auto-length")
+
+        assert first.status_code == 206
+        assert first.content == CONTENT[1000:6000]
+        assert second.content == CONTENT[-10:]
+        # Оба ответа - через os.sendfile, соединение переиспользуется
+        assert {call[2] for call in sendfile_calls} >= {1000, len(CONTENT) - 10}
+
+    async def test_unsupported_uvicorn_version_falls_back(self, monkeypatch, data_file, sendfile_calls):
+        # Протокол создаётся на соединение: проверка версии при подключении
+        monkeypatch.setattr(zerocopy_http, "uvicorn_supported", lambda: False)
+
+        async with _serve(data_file) as server_url, httpx.AsyncClient() as client:
+            response = await client.get(f"{server_url}/full")
+
+        assert response.content == CONTENT
+        assert not sendfile_calls
+
+    async def test_nonempty_transport_buffer_falls_back(self, monkeypatch, data_file, sendfile_calls):
+        class BufferedTransport:
+            """Транспорт cycle, в буфере которого остались данные."""
+
+            def __init__(self, transport):
+                self._transport = transport
+
+            def get_write_buffer_size(self):
+                return 1
+
+            def __getattr__(self, name):
+                return getattr(self._transport, name)
+
+        async def no_flush(cycle):
+            cycle.transport = BufferedTransport(cycle.transport)
+
+        monkeypatch.setattr(zerocopy_http, "_flush_transport", no_flush)
+
+        async with _serve(data_file) as server_url, httpx.AsyncClient() as client:
+            first = await client.get(f"{server_url}/range")
+            second = await client.get(f"{server_url}/full")
+
+        assert first.content == CONTENT[1000:6000]
+        assert second.content == CONTENT
+        assert not sendfile_calls
@@ -0,0 +1,215 @@
+"""
+Unit tests для загрузки одним commit (DB_WAL_SINGLE_COMMIT)
+
+Тестируемые компоненты:
+- IntentJournal: durable begin, group commit (общий fsync), компактизация
+- recover_intents(): удаление данных без attr.json, журналы живых процессов не трогаются
+- WALService(deferred=True): без commit PENDING записи, rollback отменяет изменения
+- FileService.create_file(): один commit на загрузку
+
+PostgreSQL сессия заменена MagicMock (подсчёт commit).
+"""
+
+import asyncio
+import io
+import os
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.core.config import settings
+from app.models.wal import WALStatus, WALOperationType
+from app.services import intent_journal as intent_journal_module
+from app.services.file_service import FileService
+from app.services.intent_journal import IntentJournal, recover_intents
+from app.services.storage_service import LocalStorageService
+from app.services.wal_service import WALService
+
+
+def _mock_db() -> MagicMock:
+    """Session stand-in: add() синхронный, commit/rollback считаются."""
+    db = MagicMock()
+    db.commit = AsyncMock()
+    db.rollback = AsyncMock()
+    db.refresh = AsyncMock()
+    db.execute = AsyncMock()
+    return db
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    base_path = tmp_path / "storage"
+    base_path.mkdir()
+    monkeypatch.setattr(settings.storage.local, "base_path", base_path)
+    return LocalStorageService(base_path=base_path)
+
+
+@pytest.mark.asyncio
+class TestIntentJournal:
+    """Тесты журнала намерений"""
+
+    async def test_concurrent_begins_share_fsync(self, tmp_path, monkeypatch):
+        journal = IntentJournal(tmp_path / "wal")
+        fsync_calls = []
+        real_fdatasync = os.fdatasync
+
+        def slow_fdatasync(fd):
+            fsync_calls.append(fd)
+            real_fdatasync(fd)
+
+        monkeypatch.setattr(intent_journal_module.os, "fdatasync", slow_fdatasync)
+
+        await asyncio.gather(*(journal.begin(uuid4(), f"2026/{i}.bin") for i in range(32)))
+
+        assert len(journal.open_intents) == 32
+        # Group commit: заметно меньше fsync, чем записей
+        assert 1 <= journal.sync_count == len(fsync_calls) < 32
+        journal.close()
+
+    async def test_end_and_clean_close_removes_journal(self, tmp_path):
+        journal = IntentJournal(tmp_path / "wal")
+        tx = uuid4()
+
+        await journal.begin(tx, "2026/a.bin")
+        await journal.end(tx)
+        journal.close()
+
+        assert journal.open_intents == {}
+        assert not journal.path.exists()
+
+    async def test_compaction_truncates_idle_journal(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(intent_journal_module, "COMPACT_THRESHOLD", 100)
+        journal = IntentJournal(tmp_path / "wal")
+
+        for i in range(5):
+            tx = uuid4()
+            await journal.begin(tx, f"2026/{i}.bin")
+            await journal.end(tx)
+
+        assert journal.path.stat().st_size < 100
+        journal.close()
+
+
+@pytest.mark.asyncio
+class TestRecoverIntents:
+    """Тесты recovery после сбоя процесса"""
+
+    async def test_removes_data_without_attr(self, tmp_path, storage):
+        journal_dir = tmp_path / "wal"
+        crashed = IntentJournal(journal_dir)
+        await storage.write_file("2026/incomplete.bin", io.BytesIO(b"data"))
+        await storage.write_file("2026/committed.bin", io.BytesIO(b"data"))
+        await storage.write_file("2026/committed.bin.attr.json", io.BytesIO(b"{}"))
+        await crashed.begin(uuid4(), "2026/incomplete.bin")
+        await crashed.begin(uuid4(), "2026/committed.bin")
+        # Сбой процесса: fd закрыт (flock снят), намерения открыты
+        os.close(crashed._fd)
+
+        removed = await recover_intents(journal_dir, storage)
+
+        assert removed == 1
+        assert not await storage.file_exists("2026/incomplete.bin")
+        assert await storage.file_exists("2026/committed.bin")
+        assert not crashed.path.exists()
+
+    async def test_skips_journal_of_live_process(self, tmp_path, storage):
+        journal_dir = tmp_path / "wal"
+        live = IntentJournal(journal_dir)
+        await storage.write_file("2026/in_flight.bin", io.BytesIO(b"data"))
+        await live.begin(uuid4(), "2026/in_flight.bin")
+
+        assert await recover_intents(journal_dir, storage) == 0
+        assert await storage.file_exists("2026/in_flight.bin")
+        live.close()
+
+
+@pytest.mark.asyncio
+class TestDeferredWAL:
+    """Тесты отложенной WAL транзакции"""
+
+    async def test_commit_is_single_round_trip(self):
+        db = _mock_db()
+        wal = WALService(db)
+
+        tx = await wal.start_transaction(WALOperationType.FILE_CREATE, {"path": "a"}, deferred=True)
+        db.commit.assert_not_called()
+
+        await wal.commit(tx, result_data={"file_size": 1})
+
+        db.commit.assert_awaited_once()
+        db.execute.assert_not_called()
+        transaction = db.add.call_args.args[0]
+        assert transaction.status == WALStatus.COMMITTED.value
+
+    async def test_rollback_discards_session_changes(self):
+        db = _mock_db()
+        wal = WALService(db)
+
+        tx = await wal.start_transaction(WALOperationType.FILE_CREATE, {"path": "a"}, deferred=True)
+        await wal.rollback(tx, "storage error")
+
+        db.rollback.assert_awaited_once()
+        db.commit.assert_awaited_once()
+        transaction = db.add.call_args.args[0]
+        assert transaction.status == WALStatus.ROLLED_BACK.value
+        assert transaction.error_message == "storage error"
+
+    async def test_failed_commit_can_be_rolled_back(self):
+        db = _mock_db()
+        db.commit.side_effect = [RuntimeError("connection lost"), None]
+        wal = WALService(db)
+
+        tx = await wal.start_transaction(WALOperationType.FILE_CREATE, {"path": "a"}, deferred=True)
+        with pytest.raises(Exception):
+            await wal.commit(tx)
+        await wal.rollback(tx, "connection lost")
+
+        assert db.add.call_args.args[0].status == WALStatus.ROLLED_BACK.value
+
+
+@pytest.mark.asyncio
+class TestSingleCommitUpload:
+    """Тесты FileService.create_file в режиме single commit"""
+
+    @pytest.fixture
+    def journal(self, tmp_path, monkeypatch):
+        journal = IntentJournal(tmp_path / "wal")
+        monkeypatch.setattr(settings.database, "wal_single_commit", True)
+        monkeypatch.setattr(settings.storage, "dedup_enabled", False)
+        monkeypatch.setattr("app.services.file_service.get_intent_journal", lambda: journal)
+        yield journal
+        journal.close()
+
+    async def test_upload_commits_once(self, storage, journal):
+        db = _mock_db()
+        service = FileService(db=db, storage=storage)
+
+        await service.create_file(
+            file_data=io.BytesIO(b"x" * 4096),
+            original_filename="small.txt",
+            content_type="text/plain",
+            user_id="user-1",
+            username="tester",
+        )
+
+        db.commit.assert_awaited_once()
+        assert journal.open_intents == {}
+
+    async def test_failed_upload_closes_intent(self, storage, journal):
+        db = _mock_db()
+        db.commit.side_effect = [RuntimeError("connection lost"), None]
+        service = FileService(db=db, storage=storage)
+
+        with pytest.raises(Exception):
+            await service.create_file(
+                file_data=io.BytesIO(b"x" * 4096),
+                original_filename="small.txt",
+                content_type="text/plain",
+                user_id="user-1",
+                username="tester",
+            )
+
+        # Данные и attr.json удалены при rollback - намерение закрыто
+        assert journal.open_intents == {}
+        assert not any(p.is_file() for p in storage.base_path.rglob("*"))
@@ -0,0 +1,281 @@
+"""
+Unit tests для app/services/upload_staging_service.py
+
+Тестируемые компоненты:
+- initiate(): создание staging области (идемпотентность, конфликт параметров)
+- write_part(): запись частей по offset, контроль размера
+- list_parts() / complete(): сборка файла и итоговый SHA-256
+- running hash: части в произвольном порядке и параллельно, retry частей
+- abort(): очистка staging
+- владелец загрузки: операции другого principal отклоняются
+- sweep_expired(): удаление брошенных загрузок
+- LocalStorageService.import_file(): перенос staging файла без копирования
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+import pytest
+
+from app.core.exceptions import StorageException
+from app.services.storage_service import LocalStorageService
+from app.services.upload_staging_service import UploadStagingService
+
+PART_SIZE = 1000
+CONTENT = os.urandom(PART_SIZE * 4 + 321)  # 5 частей, последняя неполная
+UPLOAD_ID = "session-0123456789"
+
+
+async def _stream(data: bytes, chunk_size: int = 256):
+    for i in range(0, len(data), chunk_size):
+        yield data[i:i + chunk_size]
+
+
+def _part(n: int) -> bytes:
+    return CONTENT[(n - 1) * PART_SIZE:n * PART_SIZE]
+
+
+@pytest.fixture
+def staging(tmp_path):
+    UploadStagingService._running_hashes.clear()
+    service = UploadStagingService(staging_path=tmp_path / "staging")
+    yield service
+    UploadStagingService._running_hashes.clear()
+
+
+@pytest.mark.asyncio
+class TestUploadStagingService:
+    """Тесты UploadStagingService"""
+
+    async def test_initiate(self, staging):
+        manifest = await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-1")
+
+        assert manifest["total_parts"] == 5
+        data_path = staging.staging_path / UPLOAD_ID / "data.bin"
+        assert data_path.stat().st_size == len(CONTENT)
+
+    async def test_initiate_idempotent_and_conflict(self, staging):
+        first = await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-1")
+        second = await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-1")
+        assert first == second
+
+        with pytest.raises(StorageException) as exc_info:
+            await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE * 2, "user-1")
+        assert exc_info.value.error_code == "UPLOAD_CONFLICT"
+
+    async def test_invalid_upload_id(self, staging):
+        with pytest.raises(StorageException) as exc_info:
+            await staging.initiate("../escape", 10, 10, "user-1")
+        assert exc_info.value.error_code == "INVALID_UPLOAD_ID"
+
+    async def test_parts_out_of_order(self, staging):
+        """Части в произвольном порядке собираются в корректный файл."""
+        await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-1")
+
+        for n in [3, 5, 1, 4, 2]:
+            marker = await staging.write_part(UPLOAD_ID, n, _stream(_part(n)))
+            assert marker["checksum"] == hashlib.sha256(_part(n)).hexdigest()
+
+        parts = await staging.list_parts(UPLOAD_ID)
+        assert [p["part_number"] for p in parts] == [1, 2, 3, 4, 5]
+        assert parts[-1]["size"] == 321
+
+        staged = await staging.complete(UPLOAD_ID)
+        assert staged.checksum == hashlib.sha256(CONTENT).hexdigest()
+        assert staged.path.read_bytes() == CONTENT
+
+    async def test_parts_in_parallel(self, staging):
+        await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-1")
+
+        await asyncio.gather(*(
+            staging.write_part(UPLOAD_ID, n, _stream(_part(n), chunk_size=100))
+            for n in range(1, 6)
+        ))
+
+        staged = await staging.complete(UPLOAD_ID)
+        assert staged.checksum == hashlib.sha256(CONTENT).hexdigest()
+
+    async def test_running_hash_advanced_before_complete(self, staging):
+        """Последовательные части учитываются в hash до complete."""
+        await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-1")
+
+        for n in range(1, 6):
+            await staging.write_part(UPLOAD_ID, n, _stream(_part(n)))
+
+        assert UploadStagingService._running_hashes[UPLOAD_ID].next_part == 6
+
+    async def test_running_hash_rebuilt_after_restart(self, staging):
+        """Без running hash в памяти checksum пересчитывается."""
+        await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-1")
+        for n in range(1, 6):
+            await staging.write_part(UPLOAD_ID, n, _stream(_part(n)))
+
+        UploadStagingService._running_hashes.clear()
+
+        staged = await staging.complete(UPLOAD_ID)
+        assert staged.checksum == hashlib.sha256(CONTENT).hexdigest()
+
+    async def test_rewritten_part_invalidates_running_hash(self, staging):
+        """Перезапись учтённой части другим содержимым сбрасывает running hash."""
+        await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-1")
+        await staging.write_part(UPLOAD_ID, 1, _stream(b"x" * PART_SIZE))
+        for n in range(1, 6):
+            await staging.write_part(UPLOAD_ID, n, _stream(_part(n)))
+
+        staged = await staging.complete(UPLOAD_ID)
+        assert staged.checksum == hashlib.sha256(CONTENT).hexdigest()
+
+    async def test_failed_retry_of_recorded_part(self, staging):
+        """Оборванный retry учтённой части не оставляет прежний маркер."""
+        await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-1")
+        for n in range(1, 6):
+            await staging.write_part(UPLOAD_ID, n, _stream(_part(n)))
+
+        with pytest.raises(StorageException):
+            await staging.write_part(UPLOAD_ID, 2, _stream(b"y" * (PART_SIZE - 1)))
+
+        with pytest.raises(StorageException) as exc_info:
+            await staging.complete(UPLOAD_ID)
+        assert exc_info.value.details["missing_parts"] == [2]
+
+        await staging.write_part(UPLOAD_ID, 2, _stream(_part(2)))
+        staged = await staging.complete(UPLOAD_ID)
+        assert staged.checksum == hashlib.sha256(CONTENT).hexdigest()
+
+    async def test_part_rewritten_by_other_worker(self, staging):
+        """Running hash другого процесса, не совпадающий с маркерами, пересчитывается."""
+        await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-1")
+        await staging.write_part(UPLOAD_ID, 1, _stream(b"x" * PART_SIZE))
+        for n in range(2, 6):
+            await staging.write_part(UPLOAD_ID, n, _stream(_part(n)))
+        stale = UploadStagingService._running_hashes[UPLOAD_ID]
+
+        # Retry части 1 обработан другим worker: его running hash здесь не сброшен
+        await staging.write_part(UPLOAD_ID, 1, _stream(_part(1)))
+        UploadStagingService._running_hashes[UPLOAD_ID] = stale
+
+        staged = await staging.complete(UPLOAD_ID)
+        assert staged.checksum == hashlib.sha256(CONTENT).hexdigest()
+
+    async def test_part_size_mismatch(self, staging):
+        await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-1")
+
+        with pytest.raises(StorageException) as exc_info:
+            await staging.write_part(UPLOAD_ID, 1, _stream(_part(1)[:-1]))
+        assert exc_info.value.error_code == "PART_SIZE_MISMATCH"
+
+        with pytest.raises(StorageException) as exc_info:
+            await staging.write_part(UPLOAD_ID, 5, _stream(_part(5) + b"extra"))
+        assert exc_info.value.error_code == "PART_SIZE_MISMATCH"
+
+        assert await staging.list_parts(UPLOAD_ID) == []
+
+    async def test_part_number_out_of_range(self, staging):
+        await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-1")
+
+        with pytest.raises(StorageException) as exc_info:
+            await staging.write_part(UPLOAD_ID, 6, _stream(b"x"))
+        assert exc_info.value.error_code == "INVALID_PART_NUMBER"
+
+    async def test_complete_incomplete_upload(self, staging):
+        await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-1")
+        await staging.write_part(UPLOAD_ID, 1, _stream(_part(1)))
+
+        with pytest.raises(StorageException) as exc_info:
+            await staging.complete(UPLOAD_ID)
+        assert exc_info.value.error_code == "UPLOAD_INCOMPLETE"
+        assert exc_info.value.details["missing_parts"] == [2, 3, 4, 5]
+
+    async def test_upload_not_found(self, staging):
+        with pytest.raises(StorageException) as exc_info:
+            await staging.list_parts(UPLOAD_ID)
+        assert exc_info.value.error_code == "UPLOAD_NOT_FOUND"
+
+    async def test_abort(self, staging):
+        await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-1")
+        await staging.abort(UPLOAD_ID)
+
+        assert not (staging.staging_path / UPLOAD_ID).exists()
+        # Идемпотентно
+        await staging.abort(UPLOAD_ID)
+
+    async def test_other_principal_rejected(self, staging):
+        await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-1")
+
+        for call in (
+            staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-2"),
+            staging.write_part(UPLOAD_ID, 1, _stream(_part(1)), user_id="user-2"),
+            staging.list_parts(UPLOAD_ID, user_id="user-2"),
+            staging.complete(UPLOAD_ID, user_id="user-2"),
+            staging.abort(UPLOAD_ID, user_id="user-2"),
+        ):
+            with pytest.raises(StorageException) as exc_info:
+                await call
+            assert exc_info.value.error_code == "UPLOAD_FORBIDDEN"
+
+        assert (staging.staging_path / UPLOAD_ID).exists()
+        await staging.write_part(UPLOAD_ID, 1, _stream(_part(1)), user_id="user-1")
+        await staging.abort(UPLOAD_ID, user_id="user-1")
+        assert not (staging.staging_path / UPLOAD_ID).exists()
+
+    async def test_sweep_expired(self, staging):
+        stale_id, active_id = "session-stale-000", "session-active-00"
+        for upload_id in (stale_id, active_id):
+            await staging.initiate(upload_id, len(CONTENT), PART_SIZE, "user-1")
+            await staging.write_part(upload_id, 1, _stream(_part(1)))
+
+        # Брошенная загрузка: создана и последний раз дописана 2 часа назад
+        stale_dir = staging.staging_path / stale_id
+        manifest = json.loads((stale_dir / "manifest.json").read_text())
+        manifest["created_at"] = "2026-01-01T00:00:00+00:00"
+        (stale_dir / "manifest.json").write_text(json.dumps(manifest))
+        old = time.time() - 7200
+        os.utime(stale_dir / "data.bin", (old, old))
+
+        removed = await staging.sweep_expired(ttl_seconds=3600)
+
+        assert removed == 1
+        assert not stale_dir.exists()
+        assert stale_id not in UploadStagingService._running_hashes
+        assert (staging.staging_path / active_id).exists()
+        assert active_id in UploadStagingService._running_hashes
+
+    async def test_temp_marker_ignored_and_swept(self, staging):
+        """Temp файл atomic записи рядом с маркерами не мешает complete."""
+        await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-1")
+        for n in range(1, 6):
+            await staging.write_part(UPLOAD_ID, n, _stream(_part(n)))
+        temp_path = staging.staging_path / UPLOAD_ID / "parts" / ".tmp_000001.json"
+        temp_path.write_text("")
+
+        assert [part["part_number"] for part in await staging.list_parts(UPLOAD_ID)] == [1, 2, 3, 4, 5]
+        staged = await staging.complete(UPLOAD_ID)
+        assert staged.checksum == hashlib.sha256(CONTENT).hexdigest()
+
+        old = time.time() - 7200
+        os.utime(temp_path, (old, old))
+        assert await staging.sweep_expired(ttl_seconds=3600) == 0
+        assert not temp_path.exists()
+        assert (staging.staging_path / UPLOAD_ID / "parts" / "000001.json").exists()
+
+    async def test_import_file_moves_staged_file(self, staging, tmp_path):
+        """Local storage: staging файл переносится rename без копирования."""
+        storage = LocalStorageService(base_path=tmp_path / "storage")
+        await staging.initiate(UPLOAD_ID, len(CONTENT), PART_SIZE, "user-1")
+        for n in range(1, 6):
+            await staging.write_part(UPLOAD_ID, n, _stream(_part(n)))
+        staged = await staging.complete(UPLOAD_ID)
+        inode = staged.path.stat().st_ino
+
+        size, checksum = await storage.import_file(
+            "2026/01/01/00/file.bin", staged.path, staged.file_size, staged.checksum
+        )
+
+        target = tmp_path / "storage" / "2026/01/01/00/file.bin"
+        assert (size, checksum) == (len(CONTENT), hashlib.sha256(CONTENT).hexdigest())
+        assert target.read_bytes() == CONTENT
+        assert target.stat().st_ino == inode
+        assert not staged.path.exists()
@@ -0,0 +1,42 @@
+"""
+Проверка vendored модулей: общий код модулей хранится побайтными копиями.
+
+Модули собираются в отдельных Docker context и не могут импортировать
+общий пакет. Копии должны совпадать с эталонной (admin-module), иначе
+исправление в одном модуле молча не попадает в остальные.
+См. DEVELOPMENT-GUIDE.md → "Общие модули (vendoring)".
+"""
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Эталонная копия → копии в других модулях
+VENDORED_MODULES = {
+    "admin-module/app/core/rate_limiter.py": [
+        "ingester-module/app/core/rate_limiter.py",
+        "query-module/app/core/rate_limiter.py",
+    ],
+    "admin-module/app/utils/pagination.py": [
+        "query-module/app/utils/pagination.py",
+        "storage-element/app/utils/pagination.py",
+    ],
+}
+
+
+def _sha256(relative_path: str) -> str:
+    return hashlib.sha256((ROOT / relative_path).read_bytes()).hexdigest()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "canonical,copy",
+    [(canonical, copy) for canonical, copies in VENDORED_MODULES.items() for copy in copies]
+)
+def test_vendored_copy_matches_canonical(canonical, copy):
+    assert _sha256(copy) == _sha256(canonical), (
+        f"{copy} differs from {canonical}: change the canonical copy and copy it unchanged"
+    )